@@ -17,6 +17,8 @@ def register_blueprints(app: Flask) -> None:
     from .group_chat import group_chat_bp
     from .group_feed import group_feed_bp
     from .admin_users import admin_users_bp
+    from .admin_llm_clients import admin_llm_clients_bp
+    from .admin_outbound_http import admin_outbound_http_bp
     from .knowledge_base import knowledge_base_bp
     from .me import me_bp
     from .steve_chat import steve_chat_bp
@@ -50,6 +52,9 @@ def register_blueprints(app: Flask) -> None:
     from .owner_upgrade import owner_upgrade_bp
     from .lifecycle_emails import lifecycle_emails_bp
     from .community_placement import community_placement_bp
+    from .message_outbox import message_outbox_bp
+    from .scheduled_work import scheduled_work_bp
+    from .steve_tool_router import steve_tool_router_bp
 
     app.register_blueprint(public_bp)
     app.register_blueprint(auth_bp)
@@ -61,6 +66,8 @@ def register_blueprints(app: Flask) -> None:
     app.register_blueprint(group_chat_bp)
     app.register_blueprint(group_feed_bp)
     app.register_blueprint(admin_users_bp)
+    app.register_blueprint(admin_llm_clients_bp)
+    app.register_blueprint(admin_outbound_http_bp)
     app.register_blueprint(knowledge_base_bp)
     app.register_blueprint(me_bp)
     app.register_blueprint(steve_chat_bp)
@@ -94,6 +101,9 @@ def register_blueprints(app: Flask) -> None:
     app.register_blueprint(owner_upgrade_bp)
     app.register_blueprint(lifecycle_emails_bp)
     app.register_blueprint(community_placement_bp)
+    app.register_blueprint(message_outbox_bp)
+    app.register_blueprint(scheduled_work_bp)
+    app.register_blueprint(steve_tool_router_bp)
 
     # Make sure the Stripe/community-billing columns exist before the
     # first webhook fires. Each service's ensure_tables() is already
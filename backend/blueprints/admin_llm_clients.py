@@ -0,0 +1,27 @@
+"""Admin view of the shared LLM client registry.
+
+    GET /api/admin/llm_clients
+
+Returns per-provider in-flight calls, concurrency caps, latency
+percentiles, SDK retries and 429 counts for this instance
+(:mod:`backend.services.llm_clients`).
+"""
+
+from __future__ import annotations
+
+from flask import Blueprint, jsonify, session
+
+from backend.services.content_generation.permissions import is_app_admin
+from backend.services.llm_clients import llm_client_metrics
+
+
+admin_llm_clients_bp = Blueprint("admin_llm_clients", __name__)
+
+
+@admin_llm_clients_bp.route("/api/admin/llm_clients", methods=["GET"])
+def admin_llm_client_metrics():
+    if "username" not in session:
+        return jsonify({"success": False, "error": "Authentication required"}), 401
+    if not is_app_admin(session.get("username")):
+        return jsonify({"success": False, "error": "Admin access required"}), 403
+    return jsonify({"success": True, **llm_client_metrics()})
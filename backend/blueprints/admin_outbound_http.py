@@ -0,0 +1,27 @@
+"""Admin view of the shared outbound HTTP layer.
+
+    GET /api/admin/outbound_http
+
+Returns per-host (and per-lookup namespace) in-flight calls, cache hits,
+negative hits, revalidations, stale serves, errors, slot timeouts and
+latency percentiles for this instance (:mod:`backend.services.outbound_http`).
+"""
+
+from __future__ import annotations
+
+from flask import Blueprint, jsonify, session
+
+from backend.services.content_generation.permissions import is_app_admin
+from backend.services.outbound_http import outbound_http_metrics
+
+
+admin_outbound_http_bp = Blueprint("admin_outbound_http", __name__)
+
+
+@admin_outbound_http_bp.route("/api/admin/outbound_http", methods=["GET"])
+def admin_outbound_http_metrics():
+    if "username" not in session:
+        return jsonify({"success": False, "error": "Authentication required"}), 401
+    if not is_app_admin(session.get("username")):
+        return jsonify({"success": False, "error": "Admin access required"}), 403
+    return jsonify({"success": True, **outbound_http_metrics()})
@@ -28,6 +28,7 @@ from backend.services import community_admin_notifications
 from backend.services import community_lifecycle
 from backend.services import session_identity
 from backend.services.database import get_db_connection, get_sql_placeholder
+from backend.services.feature_flags import dashboard_root_summary_enabled
 from redis_cache import (
     CACHE_TTL_USER_PARENT_DASHBOARD,
     cache,
@@ -428,6 +429,10 @@ def api_user_parent_community():
     username = session.get("username") or ""
     bypass_cache = bool(request.args.get("_nocache") or request.args.get("refresh"))
     cache_key = user_parent_dashboard_cache_key(username) if username else None
+    if dashboard_root_summary_enabled():
+        # Shared per-root summaries already make this cheap, and skipping the
+        # per-user snapshot means writes do not have to fan out to members.
+        cache_key = None
 
     if cache_key and not bypass_cache:
         cached = cache.get(cache_key)
@@ -580,7 +580,17 @@ def api_process_due_content_generation_jobs():
         logger.warning("Content generation due-jobs cron rejected: missing/invalid cron auth")
         return jsonify({"success": False, "error": "unauthorized"}), 401
 
+    from backend.services.feature_flags import scheduled_work_enabled
+
     try:
+        if scheduled_work_enabled():
+            # Only jobs whose scheduled_work row is due; per-kind concurrency.
+            from backend.services.scheduled_work import KIND_CONTENT_JOB, dispatch_due_work
+
+            result = dispatch_due_work(kinds=[KIND_CONTENT_JOB])
+            processed = result["handled"].get(KIND_CONTENT_JOB, 0)
+            return jsonify({"success": True, "processed": processed, "due": result["claimed"], "queue": result})
+
         due_jobs = get_due_jobs(limit=5)
         processed = 0
         for job in due_jobs:
@@ -11,6 +11,7 @@ from backend.services import api_errors, auth_session, session_identity
 from backend.services.basic_profile_gate import require_basic_profile_payload
 from backend.services.database import USE_MYSQL, get_db_connection, get_sql_placeholder
 from backend.services.dm_chat_threads import build_chat_threads_payload
+from backend.services.chat_recent_window import drop_dm_window, sync_dm_window
 from backend.services.dm_chats_tables import ensure_deleted_chat_threads_table
 from backend.services.dm_active_chat import record_active_chat
 from backend.services.dm_audio_summary import update_dm_audio_summary
@@ -30,6 +31,7 @@ from backend.services.dm_send_media import (
 from backend.services.dm_send_message import send_dm_text_message
 from backend.services.dm_thread_archive import archive_dm_thread, list_archived_dm_threads, unarchive_dm_thread
 from backend.services.dm_thread_preferences import apply_dm_thread_mute
+from backend.services.dm_thread_summary import record_dm_cleared, refresh_dm_thread_pair
 from backend.services.dm_unread import (
     count_dm_unread_excluding_cleared,
     count_group_unread_excluding_cleared,
@@ -37,6 +39,7 @@ from backend.services.dm_unread import (
     mark_dm_received_before_clear_as_read,
 )
 from backend.services.http_conditional import json_with_etag
+from backend.services.steve_dm_stream import dm_stream_state_for_viewer
 from redis_cache import cache, invalidate_message_cache
 
 logger = logging.getLogger(__name__)
@@ -166,7 +169,9 @@ def clear_chat_history():
                     (username, other_username),
                 )
             mark_dm_received_before_clear_as_read(c, username, other_username)
+            record_dm_cleared(c, username=username, peer=other_username)
             conn.commit()
+            drop_dm_window(username, other_username)
             try:
                 invalidate_message_cache(username, other_username)
             except Exception:
@@ -212,7 +217,9 @@ def delete_chat_thread():
                     (username, other_username),
                 )
             mark_dm_received_before_clear_as_read(c, username, other_username)
+            record_dm_cleared(c, username=username, peer=other_username)
             conn.commit()
+            drop_dm_window(username, other_username)
             try:
                 invalidate_message_cache(username, other_username)
             except Exception:
@@ -290,9 +297,10 @@ def remove_dm_message_media():
             if not paths:
                 if text_empty:
                     c.execute(f"DELETE FROM messages WHERE id = {ph}", (mid,))
+                    refresh_dm_thread_pair(c, sender, receiver)
                     conn.commit()
                     try:
-                        invalidate_message_cache(sender, receiver)
+                        invalidate_message_cache(sender, receiver, message_ids=[mid])
                     except Exception:
                         pass
                     try:
@@ -311,7 +319,7 @@ def remove_dm_message_media():
                 )
                 conn.commit()
                 try:
-                    invalidate_message_cache(sender, receiver)
+                    invalidate_message_cache(sender, receiver, message_ids=[mid])
                 except Exception:
                     pass
                 try:
@@ -332,7 +340,7 @@ def remove_dm_message_media():
             )
             conn.commit()
             try:
-                invalidate_message_cache(sender, receiver)
+                invalidate_message_cache(sender, receiver, message_ids=[mid])
             except Exception:
                 pass
             try:
@@ -346,7 +354,9 @@ def remove_dm_message_media():
         return api_errors.error_response("chat.dm.failed_to_update_message", 500)
 
 
-def _remove_dm_media_item(c, ph: str, username: str, mid: int, media_url: str) -> tuple[bool, str | None]:
+def _remove_dm_media_item(
+    c, ph: str, username: str, mid: int, media_url: str, touched: list | None = None
+) -> tuple[bool, str | None]:
     from backend.services.message_media_utils import (
         find_media_index,
         first_image_and_video,
@@ -393,6 +403,7 @@ def _remove_dm_media_item(c, ph: str, username: str, mid: int, media_url: str) -
     if not paths:
         if text_empty:
             c.execute(f"DELETE FROM messages WHERE id = {ph}", (mid,))
+            refresh_dm_thread_pair(c, sender, receiver)
             try:
                 delete_dm_message(sender, receiver, mid)
             except Exception:
@@ -426,6 +437,8 @@ def _remove_dm_media_item(c, ph: str, username: str, mid: int, media_url: str) -
         except Exception:
             pass
 
+    if touched is not None:
+        touched.append((sender, receiver, mid))
     try:
         invalidate_message_cache(sender, receiver)
     except Exception:
@@ -444,6 +457,7 @@ def remove_dm_media_bulk():
 
     removed_items: list[dict] = []
     failed_items: list[dict] = []
+    touched: list = []
     try:
         with get_db_connection() as conn:
             c = conn.cursor()
@@ -454,7 +468,7 @@ def remove_dm_media_bulk():
                     media_url = (item.get("media_url") or "").strip()
                     if not media_url:
                         raise ValueError("media_url required")
-                    ok, reason = _remove_dm_media_item(c, ph, username, mid, media_url)
+                    ok, reason = _remove_dm_media_item(c, ph, username, mid, media_url, touched)
                     if ok:
                         removed_items.append({"message_id": mid, "media_url": media_url})
                     else:
@@ -462,6 +476,8 @@ def remove_dm_media_bulk():
                 except Exception as item_err:
                     failed_items.append({"message_id": item.get("message_id"), "media_url": item.get("media_url"), "reason": str(item_err)})
             conn.commit()
+        for sender, receiver, mid in touched:
+            sync_dm_window(sender, receiver, message_ids=[mid])
         return jsonify({
             "success": True,
             "removed": len(removed_items),
@@ -640,6 +656,12 @@ def get_messages():
         payload["peer_is_typing"] = peer_is_typing_for_viewer(
             username, request.form.get("other_user_id")
         )
+    # Streaming Steve replies: the growing text of a row the client may already
+    # hold (delta polls only return ids > since_id).
+    if request.form.get("include_stream") == "1" and payload.get("success"):
+        stream_state = dm_stream_state_for_viewer(username, request.form.get("other_user_id"))
+        if stream_state:
+            payload["steve_stream"] = stream_state
     return jsonify(payload)
 
 
@@ -16,12 +16,24 @@ from werkzeug.utils import secure_filename
 
 from backend.services.chat_message_preview import format_chat_message_preview
 from backend.services.basic_profile_gate import require_basic_profile_payload
-from backend.services.database import get_db_connection, get_sql_placeholder
+from backend.services.database import begin_transaction, get_db_connection, get_sql_placeholder
 from backend.services.media import save_uploaded_file
-from backend.services import ai_usage, api_errors, auth_session, session_identity
+from backend.services import ai_usage, api_errors, auth_session, chat_recent_window, presence, session_identity
 from backend.services.entitlements_gate import gate_or_reason, check_steve_access
-from backend.services.feature_flags import entitlements_enforcement_enabled
+from backend.services.feature_flags import (
+    cache_presence_enabled,
+    entitlements_enforcement_enabled,
+    message_outbox_enabled,
+)
+from backend.services.message_outbox import (
+    KIND_GROUP_NOTIFY,
+    enqueue_outbox_events,
+    ensure_message_outbox_table,
+    firestore_event,
+    kick_outbox_dispatcher,
+)
 from backend.services.steve_community_config import get_paid_steve_package_config
+from backend.services.steve_context_assembly import ContextSource, assemble_context
 from backend.services.steve_dm_typing import clear_group_typing, is_group_typing, mark_group_typing
 from backend.services.steve_tool_policy import steve_tool_names_for_log
 from backend.services.group_chat_messages import fetch_group_messages
@@ -399,8 +411,15 @@ def _ensure_steve_suppressed_topics_table(cursor):
 
 
 def _ensure_group_chat_tables(cursor):
-    """Ensure group chat tables exist."""
-    from backend.services.database import USE_MYSQL
+    """Ensure group chat tables exist.
+
+    Gated by schema migration 4, which is frozen: a column or table added
+    here must also ship as a new migration in ``schema_migrations``.
+    """
+    from backend.services.schema_migrations import schema_is_current
+
+    if schema_is_current():
+        return
     
     # Check if table exists
     try:
@@ -420,7 +439,19 @@ def _ensure_group_chat_tables(cursor):
         return  # Table exists, no need to create
     except Exception:
         pass  # Table doesn't exist, create it
+
+    _create_group_chat_base_tables(cursor)
+    
+    # Ensure reactions table exists after creating other tables
+    _ensure_group_message_reactions_table(cursor)
     
+    logger.info("Created group chat tables")
+
+
+def _create_group_chat_base_tables(cursor):
+    """CREATE TABLE IF NOT EXISTS for the four core group chat tables; raises on failure."""
+    from backend.services.database import USE_MYSQL
+
     # Use appropriate syntax for MySQL vs SQLite
     if USE_MYSQL:
         cursor.execute("""
@@ -520,11 +551,6 @@ def _ensure_group_chat_tables(cursor):
                 UNIQUE(group_id, username)
             )
         """)
-    
-    # Ensure reactions table exists after creating other tables
-    _ensure_group_message_reactions_table(cursor)
-    
-    logger.info("Created group chat tables")
 
 
 @group_chat_bp.route("/api/upload_chat_media", methods=["POST"])
@@ -912,6 +938,9 @@ def get_group_chat(group_id: int):
 def update_group_presence(group_id: int):
     """Update user's active presence in a group chat (suppresses notifications while viewing)."""
     username = session["username"]
+    if cache_presence_enabled():
+        presence.touch_group_presence(username, group_id)
+        return jsonify({"success": True})
     
     try:
         with get_db_connection() as conn:
@@ -945,9 +974,20 @@ def update_group_presence(group_id: int):
         return jsonify({"success": True})  # Don't fail - this is optional
 
 
+def _members_viewing_group(group_id: int, members):
+    """Members with the group open right now, or None to check per recipient in SQL."""
+    if not cache_presence_enabled():
+        return None
+    return presence.viewing_group(group_id, members)
+
+
 def _ensure_group_presence_table(cursor):
     """Ensure group_chat_presence table exists for active chat tracking."""
     from backend.services.database import USE_MYSQL
+    from backend.services.schema_migrations import schema_is_current
+
+    if schema_is_current():
+        return
     try:
         cursor.execute("SELECT 1 FROM group_chat_presence LIMIT 1")
         return  # Table exists
@@ -1333,6 +1373,7 @@ def send_group_media(group_id: int):
                 """, (group_id, username, message_id, now, message_id, now))
             
             conn.commit()
+            chat_recent_window.sync_group_window(group_id)
 
             # Dual-write media to Firestore
             try:
@@ -1370,9 +1411,11 @@ def send_group_media(group_id: int):
                 else:
                     preview = "📷 Photo"
                 
+                viewing = _members_viewing_group(group_id, other_members)
                 for member in other_members:
                     try:
-                        _send_group_message_notification(c, ph, member, username, group_id, group_name, preview, is_mention=False)
+                        _send_group_message_notification(c, ph, member, username, group_id, group_name, preview, is_mention=False,
+                                                         is_viewing=None if viewing is None else member in viewing)
                     except Exception as notif_err:
                         logger.warning(f"Failed to send media notification to {member}: {notif_err}")
                 
@@ -1460,10 +1503,12 @@ def send_group_document(group_id: int):
                 )
                 other_members = [r["username"] if hasattr(r, "keys") else r[0] for r in c.fetchall()]
                 preview = f"📄 {file_name}"
+                viewing = _members_viewing_group(group_id, other_members)
                 for member in other_members:
                     try:
                         _send_group_message_notification(
-                            c, ph, member, username, group_id, group_name, preview, is_mention=False
+                            c, ph, member, username, group_id, group_name, preview, is_mention=False,
+                            is_viewing=None if viewing is None else member in viewing,
                         )
                     except Exception as notif_err:
                         logger.warning("Failed to send document notification to %s: %s", member, notif_err)
@@ -1555,6 +1600,12 @@ def send_group_message(group_id: int):
                 except Exception as ik_err:
                     logger.warning(f"client_key idempotency check failed (non-fatal): {ik_err}")
             
+            use_outbox = message_outbox_enabled()
+            if use_outbox:
+                # Message, receipts and outbox rows commit together.
+                ensure_message_outbox_table()
+                begin_transaction(conn)
+
             now = datetime.now().isoformat()
             c.execute(f"""
                 INSERT INTO group_chat_messages (group_id, sender_username, message_text, image_path, voice_path, video_path, audio_summary, client_key, created_at)
@@ -1585,18 +1636,37 @@ def send_group_message(group_id: int):
                         last_read_at = {ph}
                 """, (group_id, username, message_id, now, message_id, now))
             
+            if use_outbox:
+                enqueue_outbox_events(c, [
+                    (KIND_GROUP_NOTIFY, {
+                        "group_id": group_id, "message_id": message_id, "sender": username,
+                        "text": message_text, "image_path": image_path, "voice_path": voice_path,
+                        "video_path": video_path, "audio_summary": audio_summary,
+                    }),
+                    firestore_event(
+                        "group_chat_message",
+                        group_id=group_id, message_id=message_id, sender=username,
+                        text=message_text, image_path=image_path, voice_path=voice_path,
+                        video_path=video_path, audio_summary=audio_summary, client_key=client_key,
+                        timestamp=now,
+                    ),
+                ])
             conn.commit()
+            chat_recent_window.sync_group_window(group_id)
 
-            # Dual-write to Firestore
-            try:
-                from backend.services.firestore_writes import write_group_chat_message
-                write_group_chat_message(
-                    group_id=group_id, message_id=message_id, sender=username,
-                    text=message_text, image_path=image_path, voice_path=voice_path,
-                    video_path=video_path, audio_summary=audio_summary, client_key=client_key,
-                )
-            except Exception as fs_err:
-                logger.warning(f"Firestore group chat dual-write failed (non-fatal): {fs_err}")
+            if use_outbox:
+                kick_outbox_dispatcher()
+            else:
+                # Dual-write to Firestore
+                try:
+                    from backend.services.firestore_writes import write_group_chat_message
+                    write_group_chat_message(
+                        group_id=group_id, message_id=message_id, sender=username,
+                        text=message_text, image_path=image_path, voice_path=voice_path,
+                        video_path=video_path, audio_summary=audio_summary, client_key=client_key,
+                    )
+                except Exception as fs_err:
+                    logger.warning(f"Firestore group chat dual-write failed (non-fatal): {fs_err}")
 
             # Get sender's profile picture
             c.execute(f"SELECT profile_picture FROM user_profiles WHERE username = {ph}", (username,))
@@ -1606,57 +1676,16 @@ def send_group_message(group_id: int):
                 profile_picture = pp_row["profile_picture"] if hasattr(pp_row, "keys") else pp_row[0]
             
             # Send notifications to other group members
-            try:
-                # Get group name and other members
-                c.execute(f"SELECT name FROM group_chats WHERE id = {ph}", (group_id,))
-                group_row = c.fetchone()
-                group_name = group_row["name"] if hasattr(group_row, "keys") else group_row[0] if group_row else "Group"
-                
-                c.execute(f"SELECT username FROM group_chat_members WHERE group_id = {ph} AND username != {ph}", (group_id, username))
-                other_members = [r["username"] if hasattr(r, "keys") else r[0] for r in c.fetchall()]
-                
-                # Determine message preview
-                preview = format_chat_message_preview(
-                    message_text,
-                    image_path=image_path,
-                    video_path=video_path,
-                    audio_path=voice_path,
-                    audio_summary=audio_summary,
-                )
-                if not preview:
-                    if voice_path:
-                        preview = "Voice message"
-                    elif video_path:
-                        preview = "Video"
-                    elif image_path:
-                        preview = "Photo"
-                    else:
-                        preview = message_text[:50] + "..." if len(message_text) > 50 else message_text
-                
-                # Detect @mentions in the message (case-insensitive)
-                mentioned_users = set()
-                if message_text:
-                    # Find all @username patterns
-                    mention_pattern = r'@(\w+)'
-                    mentions = re.findall(mention_pattern, message_text, re.IGNORECASE)
-                    # Check which mentions are actual group members
-                    for mention in mentions:
-                        mention_lower = mention.lower()
-                        for member in other_members:
-                            if member.lower() == mention_lower:
-                                mentioned_users.add(member)
-                                break
-                
-                for member in other_members:
-                    try:
-                        is_mention = member in mentioned_users
-                        _send_group_message_notification(c, ph, member, username, group_id, group_name, preview, is_mention=is_mention)
-                    except Exception as notif_err:
-                        logger.warning(f"Failed to send message notification to {member}: {notif_err}")
-                
-                conn.commit()
-            except Exception as notif_batch_err:
-                logger.warning(f"Failed to send group message notifications: {notif_batch_err}")
+            if not use_outbox:
+                try:
+                    _fanout_group_message_notifications(
+                        c, ph, group_id, username,
+                        message_text=message_text, image_path=image_path, voice_path=voice_path,
+                        video_path=video_path, audio_summary=audio_summary,
+                    )
+                    conn.commit()
+                except Exception as notif_batch_err:
+                    logger.warning(f"Failed to send group message notifications: {notif_batch_err}")
 
             try:
                 c.execute(f"SELECT name FROM group_chats WHERE id = {ph}", (group_id,))
@@ -1743,11 +1772,73 @@ def send_group_message(group_id: int):
         return jsonify({"success": False, "error": "Failed to send message"})
 
 
-def _send_group_message_notification(cursor, ph, recipient_username: str, sender_username: str, group_id: int, group_name: str, message_preview: str, is_mention: bool = False):
+def _fanout_group_message_notifications(cursor, ph, group_id: int, sender_username: str, *,
+                                        message_text: str = "", image_path=None, voice_path=None,
+                                        video_path=None, audio_summary=None, mention_text=None):
+    """Push a new group message to every other member (mentions get their own copy).
+
+    ``mention_text`` lets the outbox dispatcher detect @mentions across a
+    coalesced burst while previewing only the latest message. Caller commits.
+    """
+    # Get group name and other members
+    cursor.execute(f"SELECT name FROM group_chats WHERE id = {ph}", (group_id,))
+    group_row = cursor.fetchone()
+    group_name = group_row["name"] if hasattr(group_row, "keys") else group_row[0] if group_row else "Group"
+
+    cursor.execute(f"SELECT username FROM group_chat_members WHERE group_id = {ph} AND username != {ph}", (group_id, sender_username))
+    other_members = [r["username"] if hasattr(r, "keys") else r[0] for r in cursor.fetchall()]
+
+    message_text = message_text or ""
+    # Determine message preview
+    preview = format_chat_message_preview(
+        message_text,
+        image_path=image_path,
+        video_path=video_path,
+        audio_path=voice_path,
+        audio_summary=audio_summary,
+    )
+    if not preview:
+        if voice_path:
+            preview = "Voice message"
+        elif video_path:
+            preview = "Video"
+        elif image_path:
+            preview = "Photo"
+        else:
+            preview = message_text[:50] + "..." if len(message_text) > 50 else message_text
+
+    # Detect @mentions in the message (case-insensitive)
+    mentioned_users = set()
+    scan_text = mention_text if mention_text is not None else message_text
+    if scan_text:
+        # Find all @username patterns
+        mention_pattern = r'@(\w+)'
+        mentions = re.findall(mention_pattern, scan_text, re.IGNORECASE)
+        # Check which mentions are actual group members
+        for mention in mentions:
+            mention_lower = mention.lower()
+            for member in other_members:
+                if member.lower() == mention_lower:
+                    mentioned_users.add(member)
+                    break
+
+    viewing = _members_viewing_group(group_id, other_members)
+    for member in other_members:
+        try:
+            is_mention = member in mentioned_users
+            _send_group_message_notification(cursor, ph, member, sender_username, group_id, group_name, preview, is_mention=is_mention,
+                                             is_viewing=None if viewing is None else member in viewing)
+        except Exception as notif_err:
+            logger.warning(f"Failed to send message notification to {member}: {notif_err}")
+
+
+def _send_group_message_notification(cursor, ph, recipient_username: str, sender_username: str, group_id: int, group_name: str, message_preview: str, is_mention: bool = False,
+                                     is_viewing=None):
     """Send push notification for a new group message.
     
     Note: Group chat notifications do NOT go to the notifications table/bell icon.
     They only appear as push notifications and affect the chat icon unread count.
+    ``is_viewing`` is the caller's bulk presence answer; None checks SQL here.
     """
     from backend.services.database import USE_MYSQL
     from backend.services.notifications import push_privacy_summary, send_push_to_user
@@ -1774,28 +1865,31 @@ def _send_group_message_notification(cursor, ph, recipient_username: str, sender
     
     # Check if recipient is actively viewing this group chat (suppress push if so)
     should_push = True
-    try:
-        _ensure_group_presence_table(cursor)
-        if USE_MYSQL:
-            cursor.execute(f"""
-                SELECT 1 FROM group_chat_presence 
-                WHERE username = {ph} AND group_id = {ph} 
-                AND updated_at > DATE_SUB(NOW(), INTERVAL 20 SECOND)
-                LIMIT 1
-            """, (recipient_username, group_id))
-        else:
-            cursor.execute(f"""
-                SELECT 1 FROM group_chat_presence 
-                WHERE username = {ph} AND group_id = {ph} 
-                AND datetime(updated_at) > datetime('now', '-20 seconds')
-                LIMIT 1
-            """, (recipient_username, group_id))
+    if is_viewing is not None:
+        should_push = not is_viewing
+    else:
+        try:
+            _ensure_group_presence_table(cursor)
+            if USE_MYSQL:
+                cursor.execute(f"""
+                    SELECT 1 FROM group_chat_presence 
+                    WHERE username = {ph} AND group_id = {ph} 
+                    AND updated_at > DATE_SUB(NOW(), INTERVAL 20 SECOND)
+                    LIMIT 1
+                """, (recipient_username, group_id))
+            else:
+                cursor.execute(f"""
+                    SELECT 1 FROM group_chat_presence 
+                    WHERE username = {ph} AND group_id = {ph} 
+                    AND datetime(updated_at) > datetime('now', '-20 seconds')
+                    LIMIT 1
+                """, (recipient_username, group_id))
         
-        if cursor.fetchone():
-            should_push = False
-            logger.debug(f"Suppressing push for {recipient_username} - actively viewing group {group_id}")
-    except Exception as presence_err:
-        logger.warning(f"Could not check group presence: {presence_err}")
+            if cursor.fetchone():
+                should_push = False
+                logger.debug(f"Suppressing push for {recipient_username} - actively viewing group {group_id}")
+        except Exception as presence_err:
+            logger.warning(f"Could not check group presence: {presence_err}")
     
     # Send push notification only (no bell icon notification)
     if should_push:
@@ -1880,6 +1974,7 @@ def leave_group_chat(group_id: int):
                 c.execute(f"UPDATE group_chat_members SET is_admin = 1 WHERE group_id = {ph} AND username = {ph}", (group_id, new_admin))
             
             conn.commit()
+            chat_recent_window.drop_group_window(group_id)
             
             return jsonify({"success": True})
             
@@ -1925,6 +2020,7 @@ def delete_group_chat(group_id: int):
             c.execute(f"UPDATE group_chats SET is_active = 0 WHERE id = {ph}", (group_id,))
             
             conn.commit()
+            chat_recent_window.drop_group_window(group_id)
             
             return jsonify({"success": True})
             
@@ -1986,6 +2082,7 @@ def clear_group_chat_history(group_id: int):
             else:
                 c.execute(f"UPDATE group_chats SET updated_at = {ph} WHERE id = {ph}", (now, group_id))
             conn.commit()
+            chat_recent_window.drop_group_window(group_id)
             return jsonify({"success": True})
     except Exception as e:
         logger.error(f"Error clearing group {group_id} history: {e}")
@@ -2035,6 +2132,7 @@ def remove_group_member(group_id: int):
             # Remove the member
             c.execute(f"DELETE FROM group_chat_members WHERE group_id = {ph} AND username = {ph}", (group_id, target_username))
             conn.commit()
+            chat_recent_window.drop_group_window(group_id)
             
             return jsonify({"success": True})
     except Exception as e:
@@ -2210,6 +2308,7 @@ def delete_group_message(group_id: int, message_id: int):
             c.execute(f"UPDATE group_chat_messages SET is_deleted = 1 WHERE id = {ph}", (message_id,))
             
             conn.commit()
+            chat_recent_window.remove_group_window_messages(group_id, [message_id])
             try:
                 from backend.services.message_media_utils import parse_media_paths, purge_media_file
                 for media_path in dict.fromkeys(parse_media_paths(media_raw) + [p for p in (image_path, video_path, audio_path) if p]):
@@ -2303,6 +2402,7 @@ def remove_group_message_media(group_id: int):
                 if text_empty:
                     c.execute(f"UPDATE group_chat_messages SET is_deleted = 1 WHERE id = {ph}", (mid,))
                     conn.commit()
+                    chat_recent_window.remove_group_window_messages(group_id, [mid])
                     try:
                         delete_group_chat_message(group_id, mid)
                     except Exception:
@@ -2318,6 +2418,7 @@ def remove_group_message_media(group_id: int):
                     (mid,),
                 )
                 conn.commit()
+                chat_recent_window.sync_group_window(group_id, [mid])
                 try:
                     update_group_chat_media(group_id, mid, None, None, None)
                 except Exception:
@@ -2335,6 +2436,7 @@ def remove_group_message_media(group_id: int):
                 (mp_json, first_img, first_vid, mid),
             )
             conn.commit()
+            chat_recent_window.sync_group_window(group_id, [mid])
             try:
                 update_group_chat_media(group_id, mid, paths, first_img, first_vid)
             except Exception:
@@ -2463,6 +2565,8 @@ def remove_group_media_bulk(group_id: int):
                 except Exception as item_err:
                     failed_items.append({"message_id": item.get("message_id"), "media_url": item.get("media_url"), "reason": str(item_err)})
             conn.commit()
+        if removed_items:
+            chat_recent_window.sync_group_window(group_id, [i["message_id"] for i in removed_items])
         return jsonify({
             "success": True,
             "removed": len(removed_items),
@@ -2506,6 +2610,7 @@ def update_group_audio_summary(group_id: int, message_id: int):
             
             c.execute(f"UPDATE group_chat_messages SET audio_summary = {ph} WHERE id = {ph}", (new_summary, message_id))
             conn.commit()
+            chat_recent_window.patch_group_window_message(group_id, message_id, audio_summary=new_summary)
             
             return jsonify({"success": True, "summary": new_summary})
             
@@ -2558,6 +2663,8 @@ def bulk_delete_group_messages(group_id: int):
                         deleted_ids.append(msg_id)
             
             conn.commit()
+            if deleted_ids:
+                chat_recent_window.remove_group_window_messages(group_id, deleted_ids)
 
             # Bulk delete from Firestore
             try:
@@ -2618,6 +2725,7 @@ def edit_group_message(group_id: int, message_id: int):
             c.execute(f"UPDATE group_chat_messages SET message_text = {ph}, is_edited = 1 WHERE id = {ph}", (new_text, message_id))
             
             conn.commit()
+            chat_recent_window.patch_group_window_message(group_id, message_id, text=new_text, is_edited=True)
 
             # Update in Firestore too
             try:
@@ -2690,6 +2798,7 @@ def react_to_group_message(group_id: int, message_id: int):
                     """, (message_id, username, reaction, now, reaction, now))
             
             conn.commit()
+            chat_recent_window.set_group_window_reaction(group_id, message_id, username, reaction or None)
             
             return jsonify({"success": True, "reaction": reaction if reaction else None})
             
@@ -2861,6 +2970,8 @@ def add_members_to_group(group_id: int):
                         logger.warning(f"Failed to send add notification to {member}: {notif_err}")
             
             conn.commit()
+            if added_members:
+                chat_recent_window.drop_group_window(group_id)
             
             return jsonify({
                 "success": True,
@@ -3090,6 +3201,219 @@ def _build_community_intelligence(group_id: int, sender_username: str = "") -> s
         return ""
 
 
+def _load_steve_group_history(group_id: int, max_context_messages: int, reset_dt):
+    """Recent group lines for Steve's prompt: Firestore first, MySQL fallback.
+
+    Returns ``(recent_messages, image_urls, fs_client_or_None)``.
+    """
+    from backend.services.steve_chat_images import append_image_from_row
+    from backend.services.steve_chat_memory import parse_memory_datetime
+
+    recent_messages = []
+    image_urls = []
+    fs = None
+    try:
+        FIRESTORE_DATABASE = os.environ.get('FIRESTORE_DATABASE', 'cpoint')
+        from google.cloud import firestore as _firestore
+        project = os.environ.get('GOOGLE_CLOUD_PROJECT') or os.environ.get('GCP_PROJECT')
+        fs = _firestore.Client(project=project, database=FIRESTORE_DATABASE) if project else _firestore.Client(database=FIRESTORE_DATABASE)
+
+        msgs_ref = fs.collection('group_chats').document(str(group_id)).collection('messages')
+        docs = list(
+            msgs_ref.order_by('created_at', direction='DESCENDING')
+            .limit(max_context_messages)
+            .stream()
+        )
+        docs.reverse()
+        from backend.services.steve_thread_memory import (
+            format_msg_timestamp,
+            is_unsafe_context_message,
+        )
+
+        for doc in docs:
+            d = doc.to_dict()
+            if is_unsafe_context_message(d):
+                continue
+            msg_ts = parse_memory_datetime(d.get('created_at'))
+            if reset_dt and msg_ts and msg_ts < reset_dt:
+                continue
+            append_image_from_row(
+                {
+                    "image_path": d.get("image_path"),
+                    "media_paths": d.get("media_paths"),
+                },
+                image_urls,
+            )
+            sender = d.get('sender', '')
+            text = d.get('text', '')
+            ts_prefix = format_msg_timestamp(d.get('created_at'))
+            if text and sender:
+                recent_messages.append(f"{ts_prefix}{sender}: {text}")
+            elif sender and (d.get("image_path") or d.get("media_paths")):
+                recent_messages.append(f"{ts_prefix}{sender}: [shared a photo]")
+
+        logger.info(f"Steve context from Firestore: {len(recent_messages)} messages, {len(image_urls)} images for group {group_id}")
+    except Exception as fs_err:
+        logger.warning(f"Steve Firestore context failed, falling back to MySQL: {fs_err}")
+        recent_messages = []
+
+    if recent_messages:
+        return recent_messages, image_urls, fs
+
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        ph = get_sql_placeholder()
+        c.execute(f"""
+            SELECT sender_username, message_text, image_path, media_paths, created_at
+            FROM group_chat_messages
+            WHERE group_id = {ph} AND is_deleted = 0
+            ORDER BY created_at DESC
+            LIMIT {int(max_context_messages)}
+        """, (group_id,))
+        rows = list(c.fetchall())
+        rows.reverse()
+        from backend.services.steve_thread_memory import format_msg_timestamp as _fmt_ts
+
+        for row in rows:
+            sender = row["sender_username"] if hasattr(row, "keys") else row[0]
+            text = row["message_text"] if hasattr(row, "keys") else row[1]
+            ts_raw = row["created_at"] if hasattr(row, "keys") else (row[4] if len(row) > 4 else None)
+            row_ts = parse_memory_datetime(ts_raw)
+            if reset_dt and row_ts and row_ts < reset_dt:
+                continue
+            ts_prefix = _fmt_ts(ts_raw)
+            if text:
+                recent_messages.append(f"{ts_prefix}{sender}: {text}")
+            elif sender and (
+                (row["image_path"] if hasattr(row, "keys") else (row[2] if len(row) > 2 else None))
+                or (row["media_paths"] if hasattr(row, "keys") else (row[3] if len(row) > 3 else None))
+            ):
+                recent_messages.append(f"{ts_prefix}{sender}: [shared a photo]")
+            img = row["image_path"] if hasattr(row, "keys") else row[2]
+            mp_raw = row["media_paths"] if hasattr(row, "keys") else row[3]
+            append_image_from_row({"image_path": img, "media_paths": mp_raw}, image_urls)
+    return recent_messages, image_urls, fs
+
+
+def _load_steve_suppressed_topics(group_id: int) -> list:
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        ph = get_sql_placeholder()
+        c.execute(f"SELECT topic FROM steve_suppressed_topics WHERE group_id = {ph}", (group_id,))
+        return [
+            (row["topic"] if hasattr(row, "keys") else row[0])
+            for row in c.fetchall()
+        ]
+
+
+def _load_steve_group_member_pool(group_id: int) -> set:
+    pool: set = set()
+    with get_db_connection() as conn:
+        _c = conn.cursor()
+        _ph = get_sql_placeholder()
+        _c.execute(
+            f"SELECT username FROM group_chat_members WHERE group_id = {_ph}",
+            (group_id,),
+        )
+        for _row in _c.fetchall():
+            _u = _row["username"] if hasattr(_row, "keys") else _row[0]
+            if isinstance(_u, str) and _u.strip():
+                pool.add(_u)
+    return pool
+
+
+def _steve_group_mention_candidates(
+    sender_username: str,
+    user_message: str,
+    recent_messages: list,
+    member_pool: set,
+) -> set:
+    """Usernames the message refers to: explicit @mentions plus natural-language references.
+
+    Pure string matching (no DB), so the caller can compute it before the
+    deadline-bound profile load and fail closed on exactly this set.
+    """
+    from backend.services.steve_profiling_gates import extract_candidate_usernames
+
+    # 1. Explicit @mentions in the current message.
+    explicit_mentions = set(re.findall(r'@(\w+)', user_message)) if user_message else set()
+    explicit_mentions = {m for m in explicit_mentions if m.lower() not in ('steve',)}
+    explicit_mentions.discard(sender_username)
+
+    # 2. Natural-language references: any known platform user whose
+    #    username appears in the message counts, even without the `@`.
+    #    Candidate pool = group members + senders in recent chat window.
+    candidate_pool_set: set = set(member_pool or ())
+    # Senders from recent messages (last 100) — covers users discussed
+    # recently who may no longer be in the group.
+    try:
+        for _m in (recent_messages or [])[-100:]:
+            if isinstance(_m, str) and ':' in _m:
+                _name = _m.split(':', 1)[0].strip()
+                if _name and _name.lower() not in ('steve',):
+                    candidate_pool_set.add(_name)
+    except Exception:
+        pass
+
+    nl_usernames = extract_candidate_usernames(user_message or "", sorted(candidate_pool_set))
+
+    # Combine both sources, normalize to lowercase for dedup
+    all_candidates = {m.lower() for m in explicit_mentions} | nl_usernames
+    all_candidates.discard('steve')
+    all_candidates.discard((sender_username or '').lower())
+    return all_candidates
+
+
+def _load_steve_group_mention_profiles(
+    group_id: int,
+    sender_username: str,
+    all_candidates: set,
+):
+    """Privacy-gate the referenced usernames, then load profiles for the allowed ones.
+
+    Privacy gate BEFORE any KB fetch (per docs/STEVE_PRIVACY_GATE.md).
+    Returns ``(mentioned_profiles_text, blocked_users)``; the blocked list
+    lets the system prompt hard-refuse any leak via chat history,
+    web_search, or x_search.
+    """
+    from backend.services.steve_profiling_gates import (
+        user_can_access_steve_kb,
+        filter_usernames_for_group,
+    )
+    from bodybuilding_app import get_steve_context_for_user
+
+    mentioned_profiles_text = ""
+
+    allowed_users: set = set()
+    blocked_users: set = set()
+    if all_candidates:
+        try:
+            allowed_users, blocked_users = filter_usernames_for_group(
+                sender_username, group_id, sorted(all_candidates)
+            )
+        except Exception as gate_err:
+            logger.warning(f"Group privacy gate batch failed (non-fatal): {gate_err}")
+            # Fail closed: treat everyone as blocked on error.
+            blocked_users = set(all_candidates)
+
+    # Load KB only for users that pass the gate.
+    if allowed_users:
+        try:
+            for m_user in sorted(allowed_users):
+                if m_user in ('steve', (sender_username or '').lower()):
+                    continue
+                # Double-check with the authoritative per-user gate.
+                if not user_can_access_steve_kb(sender_username, m_user, {"group_id": group_id}):
+                    blocked_users.add(m_user)
+                    continue
+                profile_ctx = get_steve_context_for_user(m_user, viewer_username=sender_username)
+                if profile_ctx:
+                    mentioned_profiles_text += f"\n\nWHAT YOU KNOW ABOUT @{m_user} (referenced in conversation):\n{profile_ctx}\nOnly share this if asked. Be factual — do not embellish or invent details beyond what is listed here."
+        except Exception as mention_err:
+            logger.warning(f"Could not load referenced user profiles: {mention_err}")
+    return mentioned_profiles_text, blocked_users
+
+
 def _trigger_steve_group_reply(group_id: int, group_name: str, user_message: str, sender_username: str, reply_to_message_id: int):
     """
     Generate and post Steve's AI reply to a group chat message.
@@ -3139,6 +3463,7 @@ def _trigger_steve_group_reply(group_id: int, group_name: str, user_message: str
                 steve_msg_id = c.lastrowid
                 c.execute(f"UPDATE group_chats SET updated_at = {ph} WHERE id = {ph}", (now, group_id))
                 conn.commit()
+                chat_recent_window.sync_group_window(group_id)
                 try:
                     from backend.services.firestore_writes import write_group_chat_message
                     write_group_chat_message(group_id=group_id, message_id=steve_msg_id, sender=AI_USERNAME, text=confirm_text)
@@ -3180,6 +3505,7 @@ def _trigger_steve_group_reply(group_id: int, group_name: str, user_message: str
                 steve_msg_id = c.lastrowid
                 c.execute(f"UPDATE group_chats SET updated_at = {ph} WHERE id = {ph}", (now, group_id))
                 conn.commit()
+                chat_recent_window.sync_group_window(group_id)
                 try:
                     from backend.services.firestore_writes import write_group_chat_message
                     write_group_chat_message(group_id=group_id, message_id=steve_msg_id, sender=AI_USERNAME, text=confirm_text)
@@ -3252,6 +3578,7 @@ def _trigger_steve_group_reply(group_id: int, group_name: str, user_message: str
                 steve_msg_id = c.lastrowid
                 c.execute(f"UPDATE group_chats SET updated_at = {ph} WHERE id = {ph}", (now_iso, group_id))
                 conn.commit()
+                chat_recent_window.sync_group_window(group_id)
                 try:
                     from backend.services.firestore_writes import write_group_chat_message
                     write_group_chat_message(group_id=group_id, message_id=steve_msg_id, sender=AI_USERNAME, text=blocked_text)
@@ -3292,19 +3619,6 @@ def _trigger_steve_group_reply(group_id: int, group_name: str, user_message: str
             should_include_user_profile,
         )
 
-        # Build community intelligence only for people/network/resource
-        # requests; avoid injecting profile-heavy context into generic chat.
-        community_context = ""
-        if should_include_user_profile(user_message) or should_include_community_resources(user_message):
-            community_context = _build_community_intelligence(group_id, sender_username)
-            if community_context:
-                logger.info(f"Steve community intelligence loaded for group {group_id} ({len(community_context)} chars)")
-        
-        # Load full conversation context from Firestore (fall back to MySQL)
-        recent_messages = []
-        image_urls = []
-        fs = None
-
         from backend.services.steve_model_config import (
             context_limit,
             estimate_response_cost_usd,
@@ -3313,90 +3627,86 @@ def _trigger_steve_group_reply(group_id: int, group_name: str, user_message: str
         )
         model_config = get_steve_model_config()
         max_context_messages = context_limit(_ent, fallback=model_config.max_context_messages)
-        
+
+        platform_manual_prompt = ""
+        safety_prompt = ""
+        platform_question_grp = False
+        professional_grp = False
         try:
-            import os
-            from backend.services.steve_chat_images import append_image_from_row
-
-            FIRESTORE_DATABASE = os.environ.get('FIRESTORE_DATABASE', 'cpoint')
-            from google.cloud import firestore as _firestore
-            project = os.environ.get('GOOGLE_CLOUD_PROJECT') or os.environ.get('GCP_PROJECT')
-            fs = _firestore.Client(project=project, database=FIRESTORE_DATABASE) if project else _firestore.Client(database=FIRESTORE_DATABASE)
-            
-            msgs_ref = fs.collection('group_chats').document(str(group_id)).collection('messages')
-            docs = list(
-                msgs_ref.order_by('created_at', direction='DESCENDING')
-                .limit(max_context_messages)
-                .stream()
+            from backend.services.steve_platform_manual import (
+                SURFACE_GROUP,
+                is_professional_advice_intent,
+                is_platform_question,
+                render_global_steve_safety_prompt,
+                render_platform_manual_prompt,
+                select_platform_manual_cards,
             )
-            docs.reverse()
-            from backend.services.steve_thread_memory import (
-                format_msg_timestamp,
-                is_unsafe_context_message,
+
+            platform_question_grp = bool(is_platform_question(user_message))
+            professional_grp = bool(is_professional_advice_intent(user_message))
+            platform_manual_prompt = render_platform_manual_prompt(
+                select_platform_manual_cards(user_message, surface=SURFACE_GROUP)
             )
+            safety_prompt = render_global_steve_safety_prompt(user_message, surface=SURFACE_GROUP)
+        except Exception as manual_err:
+            logger.warning("Steve group platform manual load failed (non-fatal): %s", manual_err)
 
-            for doc in docs:
-                d = doc.to_dict()
-                if is_unsafe_context_message(d):
-                    continue
-                msg_ts = parse_memory_datetime(d.get('created_at'))
-                if reset_dt and msg_ts and msg_ts < reset_dt:
-                    continue
-                append_image_from_row(
-                    {
-                        "image_path": d.get("image_path"),
-                        "media_paths": d.get("media_paths"),
-                    },
-                    image_urls,
-                )
-                sender = d.get('sender', '')
-                text = d.get('text', '')
-                ts_prefix = format_msg_timestamp(d.get('created_at'))
-                if text and sender:
-                    recent_messages.append(f"{ts_prefix}{sender}: {text}")
-                elif sender and (d.get("image_path") or d.get("media_paths")):
-                    recent_messages.append(f"{ts_prefix}{sender}: [shared a photo]")
-            
-            logger.info(f"Steve context from Firestore: {len(recent_messages)} messages, {len(image_urls)} images for group {group_id}")
-        except Exception as fs_err:
-            logger.warning(f"Steve Firestore context failed, falling back to MySQL: {fs_err}")
-            recent_messages = []
-        
-        if not recent_messages:
-            from backend.services.steve_chat_images import append_image_from_row
+        # Build community intelligence only for people/network/resource
+        # requests; avoid injecting profile-heavy context into generic chat.
+        want_community_context = (
+            should_include_user_profile(user_message) or should_include_community_resources(user_message)
+        )
 
-            with get_db_connection() as conn:
-                c = conn.cursor()
-                ph = get_sql_placeholder()
-                c.execute(f"""
-                    SELECT sender_username, message_text, image_path, media_paths, created_at
-                    FROM group_chat_messages
-                    WHERE group_id = {ph} AND is_deleted = 0
-                    ORDER BY created_at DESC
-                    LIMIT {int(max_context_messages)}
-                """, (group_id,))
-                rows = list(c.fetchall())
-                rows.reverse()
-                from backend.services.steve_thread_memory import format_msg_timestamp as _fmt_ts
-
-                for row in rows:
-                    sender = row["sender_username"] if hasattr(row, "keys") else row[0]
-                    text = row["message_text"] if hasattr(row, "keys") else row[1]
-                    ts_raw = row["created_at"] if hasattr(row, "keys") else (row[4] if len(row) > 4 else None)
-                    row_ts = parse_memory_datetime(ts_raw)
-                    if reset_dt and row_ts and row_ts < reset_dt:
-                        continue
-                    ts_prefix = _fmt_ts(ts_raw)
-                    if text:
-                        recent_messages.append(f"{ts_prefix}{sender}: {text}")
-                    elif sender and (
-                        (row["image_path"] if hasattr(row, "keys") else (row[2] if len(row) > 2 else None))
-                        or (row["media_paths"] if hasattr(row, "keys") else (row[3] if len(row) > 3 else None))
-                    ):
-                        recent_messages.append(f"{ts_prefix}{sender}: [shared a photo]")
-                    img = row["image_path"] if hasattr(row, "keys") else row[2]
-                    mp_raw = row["media_paths"] if hasattr(row, "keys") else row[3]
-                    append_image_from_row({"image_path": img, "media_paths": mp_raw}, image_urls)
+        # Independent sources gathered side by side; a late optional one
+        # degrades to its default (no community intelligence, no hosted tools, ...).
+        turn_label = f"group {group_id}"
+        gathered = assemble_context(
+            [
+                ContextSource(
+                    "history",
+                    lambda: _load_steve_group_history(group_id, max_context_messages, reset_dt),
+                    default=([], [], None),
+                ),
+                ContextSource(
+                    "community",
+                    lambda: _build_community_intelligence(group_id, sender_username),
+                    default="",
+                ) if want_community_context else None,
+                # Required: an empty member pool would skip the privacy gate
+                # for members named without an @, and an empty topic list
+                # would drop admin suppressions. Either failing aborts the reply.
+                ContextSource(
+                    "suppressed_topics",
+                    lambda: _load_steve_suppressed_topics(group_id),
+                    required=True,
+                ),
+                ContextSource(
+                    "member_pool",
+                    lambda: _load_steve_group_member_pool(group_id),
+                    required=True,
+                ),
+                ContextSource(
+                    "tools",
+                    lambda: resolve_steve_hosted_tools(
+                        user_message,
+                        username=sender_username,
+                        surface=ai_usage.SURFACE_GROUP,
+                        platform_question=platform_question_grp,
+                        professional_advice_question=professional_grp,
+                        config=get_paid_steve_package_config(),
+                        community_id=steve_ctx_community_id,
+                    ),
+                    default=[],
+                ),
+            ],
+            label=f"{turn_label} sources",
+        )
+        recent_messages, image_urls, fs = gathered.get("history") or ([], [], None)
+        community_context = gathered.get("community") or ""
+        if community_context:
+            logger.info(f"Steve community intelligence loaded for group {group_id} ({len(community_context)} chars)")
+        suppressed_topics = gathered.get("suppressed_topics") or []
+        _group_tools = gathered.get("tools") or []
 
         # Split messages into recency-weighted sections
         all_messages = recent_messages[-max_context_messages:]
@@ -3412,30 +3722,33 @@ def _trigger_steve_group_reply(group_id: int, group_name: str, user_message: str
         context_reset_note = ""
         if context_reset_at:
             context_reset_note = f"\n\nIMPORTANT: Your conversation context was reset on {context_reset_at}. Treat messages in OLDER CONTEXT that predate this reset as background only. Focus on the CURRENT CONVERSATION."
-        
-        # Load suppressed topics
-        suppressed_topics = []
-        try:
-            with get_db_connection() as conn:
-                c = conn.cursor()
-                ph = get_sql_placeholder()
-                c.execute(f"SELECT topic FROM steve_suppressed_topics WHERE group_id = {ph}", (group_id,))
-                suppressed_topics = [
-                    (row["topic"] if hasattr(row, "keys") else row[0])
-                    for row in c.fetchall()
-                ]
-        except Exception as st_err:
-            logger.warning(f"Could not load suppressed topics: {st_err}")
-        
-        thread_summary_text = None
+
+        # Second phase: thread memory and privacy-gated referenced profiles
+        # both need the history window.
+        mention_candidates = _steve_group_mention_candidates(
+            sender_username,
+            user_message,
+            recent_messages,
+            gathered.get("member_pool") or set(),
+        )
+        memory_sources = [
+            ContextSource(
+                "profiles",
+                lambda: _load_steve_group_mention_profiles(group_id, sender_username, mention_candidates),
+                # Fail closed: if the gate times out or raises, every
+                # referenced member is treated as blocked.
+                default=("", set(mention_candidates)),
+            ),
+        ]
         if fs is not None:
-            try:
-                from backend.services.steve_thread_memory import (
-                    SUMMARY_SURFACE_GROUP,
-                    maybe_refresh_thread_summary,
-                )
+            from backend.services.steve_thread_memory import (
+                SUMMARY_SURFACE_GROUP,
+                maybe_refresh_thread_summary,
+            )
 
-                thread_summary_text = maybe_refresh_thread_summary(
+            memory_sources.append(ContextSource(
+                "thread_summary",
+                lambda: maybe_refresh_thread_summary(
                     fs_client=fs,
                     collection="group_chats",
                     doc_id=str(group_id),
@@ -3445,9 +3758,11 @@ def _trigger_steve_group_reply(group_id: int, group_name: str, user_message: str
                     sender_username=sender_username,
                     surface=SUMMARY_SURFACE_GROUP,
                     reset_dt=reset_dt,
-                )
-            except Exception as ts_err:
-                logger.warning("Group thread summary failed (non-fatal): %s", ts_err)
+                ),
+            ))
+        memory = assemble_context(memory_sources, label=f"{turn_label} memory")
+        thread_summary_text = memory.get("thread_summary")
+        mentioned_profiles_text, blocked_users = memory.get("profiles") or ("", set(mention_candidates))
 
         context = f"Group chat: {group_name}\n"
         if thread_summary_text:
@@ -3471,88 +3786,6 @@ def _trigger_steve_group_reply(group_id: int, group_name: str, user_message: str
         if community_context:
             context += f"\n\n{community_context}"
         
-        # ── Detect @mentions AND natural-language references, then privacy-gate ──
-        # Privacy gate BEFORE any KB fetch (per docs/STEVE_PRIVACY_GATE.md).
-        # We also build a blocked-users list so the system prompt can hard-refuse
-        # any leak via chat history, web_search, or x_search.
-        from backend.services.steve_profiling_gates import (
-            user_can_access_steve_kb,
-            filter_usernames_for_group,
-            extract_candidate_usernames,
-        )
-        from bodybuilding_app import get_steve_context_for_user
-
-        mentioned_profiles_text = ""
-
-        # 1. Explicit @mentions in the current message.
-        explicit_mentions = set(re.findall(r'@(\w+)', user_message)) if user_message else set()
-        explicit_mentions = {m for m in explicit_mentions if m.lower() not in ('steve',)}
-        explicit_mentions.discard(sender_username)
-
-        # 2. Natural-language references: any known platform user whose
-        #    username appears in the message counts, even without the `@`.
-        #    Candidate pool = group members + senders in recent chat window.
-        candidate_pool_set: set = set()
-        try:
-            with get_db_connection() as conn:
-                _c = conn.cursor()
-                _ph = get_sql_placeholder()
-                _c.execute(
-                    f"SELECT username FROM group_chat_members WHERE group_id = {_ph}",
-                    (group_id,),
-                )
-                for _row in _c.fetchall():
-                    _u = _row["username"] if hasattr(_row, "keys") else _row[0]
-                    if isinstance(_u, str) and _u.strip():
-                        candidate_pool_set.add(_u)
-        except Exception as _pool_err:
-            logger.debug(f"Could not load group member pool: {_pool_err}")
-        # Senders from recent messages (last 100) — covers users discussed
-        # recently who may no longer be in the group.
-        try:
-            for _m in (recent_messages or [])[-100:]:
-                if isinstance(_m, str) and ':' in _m:
-                    _name = _m.split(':', 1)[0].strip()
-                    if _name and _name.lower() not in ('steve',):
-                        candidate_pool_set.add(_name)
-        except Exception:
-            pass
-
-        nl_usernames = extract_candidate_usernames(user_message or "", sorted(candidate_pool_set))
-
-        # Combine both sources, normalize to lowercase for dedup
-        all_candidates = {m.lower() for m in explicit_mentions} | nl_usernames
-        all_candidates.discard('steve')
-        all_candidates.discard((sender_username or '').lower())
-
-        allowed_users: set = set()
-        blocked_users: set = set()
-        if all_candidates:
-            try:
-                allowed_users, blocked_users = filter_usernames_for_group(
-                    sender_username, group_id, sorted(all_candidates)
-                )
-            except Exception as gate_err:
-                logger.warning(f"Group privacy gate batch failed (non-fatal): {gate_err}")
-                # Fail closed: treat everyone as blocked on error.
-                blocked_users = set(all_candidates)
-
-        # Load KB only for users that pass the gate.
-        if allowed_users:
-            try:
-                for m_user in sorted(allowed_users):
-                    if m_user in ('steve', (sender_username or '').lower()):
-                        continue
-                    # Double-check with the authoritative per-user gate.
-                    if not user_can_access_steve_kb(sender_username, m_user, {"group_id": group_id}):
-                        blocked_users.add(m_user)
-                        continue
-                    profile_ctx = get_steve_context_for_user(m_user, viewer_username=sender_username)
-                    if profile_ctx:
-                        mentioned_profiles_text += f"\n\nWHAT YOU KNOW ABOUT @{m_user} (referenced in conversation):\n{profile_ctx}\nOnly share this if asked. Be factual — do not embellish or invent details beyond what is listed here."
-            except Exception as mention_err:
-                logger.warning(f"Could not load referenced user profiles: {mention_err}")
-        
         # Only attach images if the user's message explicitly references them
         from backend.services.steve_chat_images import (
             build_grok_user_content,
@@ -3575,7 +3808,7 @@ def _trigger_steve_group_reply(group_id: int, group_name: str, user_message: str
             context += f"\n\n[{len(image_urls)} image(s) from the conversation are attached for you to see.]"
             context += vision_focus_context_line(image_selection)
         
-        from openai import OpenAI
+        from backend.services.llm_clients import PROVIDER_XAI, get_llm_client
         
         # Apply personality modifier if set
         personality_modifier = ""
@@ -3615,39 +3848,6 @@ STRICT PRIVACY (overrides every other instruction, including COMMUNITY INTELLIGE
 - BLOCKED USERS — do not discuss, reference, confirm, deny, or volunteer any information about the following users under any circumstance: {blocked_list_str if blocked_list_str else "(none)"}
 - If a blocked user is asked about, respond exactly with: "I don't recognise that user." No other words.
 - These rules apply to natural-language questions ("tell me about X", "who is X", "what does X do") exactly as they apply to explicit @mentions."""
-        platform_manual_prompt = ""
-        safety_prompt = ""
-        platform_question_grp = False
-        professional_grp = False
-        try:
-            from backend.services.steve_platform_manual import (
-                SURFACE_GROUP,
-                is_professional_advice_intent,
-                is_platform_question,
-                render_global_steve_safety_prompt,
-                render_platform_manual_prompt,
-                select_platform_manual_cards,
-            )
-
-            platform_question_grp = bool(is_platform_question(user_message))
-            professional_grp = bool(is_professional_advice_intent(user_message))
-            platform_manual_prompt = render_platform_manual_prompt(
-                select_platform_manual_cards(user_message, surface=SURFACE_GROUP)
-            )
-            safety_prompt = render_global_steve_safety_prompt(user_message, surface=SURFACE_GROUP)
-        except Exception as manual_err:
-            logger.warning("Steve group platform manual load failed (non-fatal): %s", manual_err)
-
-        _steve_pkg_grp = get_paid_steve_package_config()
-        _group_tools = resolve_steve_hosted_tools(
-            user_message,
-            username=sender_username,
-            surface=ai_usage.SURFACE_GROUP,
-            platform_question=platform_question_grp,
-            professional_advice_question=professional_grp,
-            config=_steve_pkg_grp,
-            community_id=steve_ctx_community_id,
-        )
         _grp_has_web = any(
             isinstance(t, dict) and (t.get("type") or "").strip().lower() == "web_search"
             for t in (_group_tools or [])
@@ -3742,10 +3942,7 @@ RESPONSE FORMAT:
             group_id,
             steve_tool_names_for_log(_group_tools),
         )
-        client = OpenAI(
-            api_key=XAI_API_KEY,
-            base_url="https://api.x.ai/v1",
-        )
+        client = get_llm_client(PROVIDER_XAI, api_key=XAI_API_KEY)
 
         try:
             # Apply entitlement caps resolved earlier in this function.
@@ -3826,6 +4023,7 @@ RESPONSE FORMAT:
             c.execute(f"UPDATE group_chats SET updated_at = {ph} WHERE id = {ph}", (now, group_id))
             
             conn.commit()
+            chat_recent_window.sync_group_window(group_id)
 
             # Dual-write Steve reply to Firestore
             try:
@@ -0,0 +1,34 @@
+"""Message outbox drain route (cron-only).
+
+Each instance drains ``message_outbox`` from an in-process dispatcher woken
+by the send paths; this endpoint is the safety net for rows left behind by a
+scaled-down instance or a backoff window. Auth is via the shared
+``X-Cron-Secret`` header (docs/cloud-scheduler-cron.md).
+"""
+
+from __future__ import annotations
+
+import logging
+
+from flask import Blueprint, jsonify, request
+
+from backend.services import message_outbox
+from backend.services.cron_auth import cron_authed
+
+message_outbox_bp = Blueprint("message_outbox", __name__)
+logger = logging.getLogger(__name__)
+
+
+@message_outbox_bp.route("/api/cron/outbox/drain", methods=["POST"])
+def api_cron_outbox_drain():
+    """Drain ready outbox rows and report queue depth / lag."""
+    if not cron_authed(request):
+        return jsonify({"success": False, "error": "Unauthorized"}), 403
+    try:
+        max_batches = max(1, min(int(request.args.get("max_batches") or 50), 500))
+    except ValueError:
+        max_batches = 50
+    result = message_outbox.drain_outbox(max_batches=max_batches)
+    stats = message_outbox.outbox_stats()
+    logger.info("cron outbox drain: %s pending=%s dead=%s", result, stats.get("pending"), stats.get("dead"))
+    return jsonify({"success": True, **result, "stats": stats})
@@ -21,6 +21,7 @@ from flask import (
 
 from backend.services import auth_session, session_identity
 from backend.services.database import USE_MYSQL, get_db_connection
+from backend.services.feature_flags import scheduled_work_enabled
 from backend.services.http_conditional import json_with_etag
 from backend.services.notifications import (
     check_single_event_notifications,
@@ -1187,6 +1188,13 @@ def api_poll_notification_check():
         return jsonify({"success": False, "error": "Invalid API key"}), 401
 
     try:
+        if scheduled_work_enabled():
+            from backend.services.scheduled_work import KIND_POLL_REMINDER, dispatch_due_work
+
+            result = dispatch_due_work(kinds=[KIND_POLL_REMINDER])
+            sent = result["handled"].get(KIND_POLL_REMINDER, 0)
+            return jsonify({"success": True, "notifications_sent": sent, "queue": result})
+
         now = datetime.utcnow()
         logger = current_app.logger
         logger.info("🔍 Poll notification check starting - USE_MYSQL=%s", USE_MYSQL)
@@ -1261,6 +1269,13 @@ def api_event_notification_check():
         logger.info("🔍 Event notification check starting - USE_MYSQL=%s", USE_MYSQL)
         dry_run = _bool_arg("dry_run")
 
+        if scheduled_work_enabled() and not dry_run:
+            from backend.services.scheduled_work import KIND_EVENT_REMINDER, dispatch_due_work
+
+            result = dispatch_due_work(kinds=[KIND_EVENT_REMINDER])
+            sent = result["handled"].get(KIND_EVENT_REMINDER, 0)
+            return jsonify({"success": True, "notifications_sent": sent, "queue": result})
+
         with get_db_connection() as conn:
             c = conn.cursor()
             if USE_MYSQL:
@@ -1326,6 +1341,14 @@ def api_cron_steve_reminder_vault_dispatch():
     if not _cron_authed():
         return jsonify({"success": False, "error": "forbidden"}), 403
     try:
+        if scheduled_work_enabled():
+            from backend.services.scheduled_work import KIND_STEVE_REMINDER, dispatch_due_work
+
+            result = dispatch_due_work(kinds=[KIND_STEVE_REMINDER])
+            sent = result["handled"].get(KIND_STEVE_REMINDER, 0)
+            return jsonify({"success": True, "sent": sent, "errors": result["retried"] + result["dead_lettered"],
+                            "candidates": result["claimed"], "queue": result})
+
         from backend.services.steve_reminder_vault import dispatch_due_reminders
 
         out = dispatch_due_reminders()
@@ -1177,7 +1177,9 @@ def onboarding_compose_bio():
                 )
                 intel_rt_ms = int((time.perf_counter() - intel_t0) * 1000)
                 cit, cout = onboarding_ci.usage_from_responses_api(ci_resp)
-                if company_intel:
+                if company_intel and ci_resp is None:
+                    pass  # served from the shared company-intel cache; no model call to log
+                elif company_intel:
                     ai_usage.log_usage(
                         username,
                         surface=ai_usage.SURFACE_ONBOARDING_AI,
@@ -0,0 +1,38 @@
+"""Shared due-time queue dispatch route (cron-only).
+
+One Cloud Scheduler job can drive every ``scheduled_work`` kind; the legacy
+per-feature cron URLs keep working and dispatch only their own kind when
+``SCHEDULED_WORK_QUEUE`` is on. Auth is via the shared ``X-Cron-Secret``
+header (docs/cloud-scheduler-cron.md).
+"""
+
+from __future__ import annotations
+
+import logging
+
+from flask import Blueprint, jsonify, request
+
+from backend.services import scheduled_work
+from backend.services.cron_auth import cron_authed
+
+scheduled_work_bp = Blueprint("scheduled_work", __name__)
+logger = logging.getLogger(__name__)
+
+
+@scheduled_work_bp.route("/api/cron/scheduled-work/dispatch", methods=["POST"])
+def api_cron_scheduled_work_dispatch():
+    """Run due rows (optionally ``kind=a,b``); ``seed=1`` backfills existing rows first."""
+    if not cron_authed(request):
+        return jsonify({"success": False, "error": "Unauthorized"}), 403
+    kinds = [k.strip() for k in (request.args.get("kind") or "").split(",") if k.strip()] or None
+    try:
+        max_batches = max(1, min(int(request.args.get("max_batches") or 20), 200))
+    except ValueError:
+        max_batches = 20
+    seeded = None
+    if request.args.get("seed") in ("1", "true", "yes"):
+        seeded = scheduled_work.seed_scheduled_work()
+    result = scheduled_work.dispatch_due_work(kinds=kinds, max_batches=max_batches)
+    stats = scheduled_work.scheduled_work_stats()
+    logger.info("cron scheduled_work dispatch: %s seeded=%s", result, seeded)
+    return jsonify({"success": True, **result, "seeded": seeded, "stats": stats})
@@ -0,0 +1,33 @@
+"""Steve tool-router classifier training route (cron-only).
+
+Refits the local tool-router classifier from ``steve_tool_router_decisions``
+and publishes it through the shared cache. Auth is via the shared
+``X-Cron-Secret`` header (docs/cloud-scheduler-cron.md).
+"""
+
+from __future__ import annotations
+
+import logging
+
+from flask import Blueprint, jsonify, request
+
+from backend.services import steve_tool_router_cache
+from backend.services.cron_auth import cron_authed
+
+steve_tool_router_bp = Blueprint("steve_tool_router", __name__)
+logger = logging.getLogger(__name__)
+
+
+@steve_tool_router_bp.route("/api/cron/steve/tool-router/train", methods=["POST"])
+def api_cron_steve_tool_router_train():
+    """Retrain the router classifier and report this instance's hit rates."""
+    if not cron_authed(request):
+        return jsonify({"success": False, "error": "Unauthorized"}), 403
+    try:
+        result = steve_tool_router_cache.train_router_classifier()
+    except Exception as exc:
+        logger.error("cron tool router train failed: %s", exc)
+        return jsonify({"success": False, "error": "training failed"}), 500
+    stats = steve_tool_router_cache.router_stats()
+    logger.info("cron tool router train: %s stats=%s", result, stats)
+    return jsonify({"success": True, **result, "stats": stats})
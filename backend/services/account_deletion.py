@@ -10,7 +10,9 @@ from enum import Enum
 from typing import Any, List, Optional, Sequence
 
 from backend.services import remember_tokens
+from backend.services.community_unread import note_posts_deleted
 from backend.services.database import USE_MYSQL, get_sql_placeholder
+from backend.services.dm_thread_summary import forget_user_dm_threads
 
 logger = logging.getLogger(__name__)
 
@@ -150,12 +152,17 @@ def delete_firestore_user_state(username: str, db: Optional[Any] = None) -> int:
 
 def _purge_user_posts_admin(c, ph: str, username: str) -> None:
     """Remove posts authored by ``username`` and dependent rows (no ON DELETE CASCADE on replies)."""
-    c.execute(f"SELECT id FROM posts WHERE username={ph}", (username,))
+    c.execute(f"SELECT id, community_id FROM posts WHERE username={ph}", (username,))
     post_ids: List[int] = []
+    community_posts = []
     for row in c.fetchall() or []:
         pid = row["id"] if hasattr(row, "keys") else row[0]
+        cid = row["community_id"] if hasattr(row, "keys") else row[1]
         if pid is not None:
             post_ids.append(int(pid))
+            community_posts.append((cid, int(pid)))
+    # Other members' unread badges still count these posts until told.
+    note_posts_deleted(c, community_posts, username)
     for pid in post_ids:
         try:
             c.execute(
@@ -288,6 +295,7 @@ def delete_user_in_connection(conn, username: str, mode: AccountDeletionMode) ->
         f"DELETE FROM messages WHERE sender={ph} OR receiver={ph}",
         (username, username),
     )
+    forget_user_dm_threads(c, username)
     _exec_optional(
         c,
         f"DELETE FROM typing_status WHERE user={ph} OR peer={ph}",
@@ -392,6 +400,13 @@ def delete_user_in_connection(conn, username: str, mode: AccountDeletionMode) ->
             ("admin", username),
         )
 
+    # Tallies for every event this user responded to or was invited to are rebuilt on next read.
+    _exec_optional(
+        c,
+        f"DELETE FROM event_rsvp_counters WHERE event_id IN (SELECT event_id FROM event_rsvps WHERE username={ph}) "
+        f"OR event_id IN (SELECT event_id FROM event_invitations WHERE invited_username={ph} OR invited_by={ph})",
+        (username, username, username),
+    )
     try:
         c.execute(f"DELETE FROM event_rsvps WHERE username={ph}", (username,))
         c.execute(
@@ -403,6 +418,7 @@ def delete_user_in_connection(conn, username: str, mode: AccountDeletionMode) ->
         logger.warning("calendar/event cleanup for %s: %s", username, e)
 
     _exec_optional(c, f"DELETE FROM user_profiles WHERE username={ph}", (username,))
+    _exec_optional(c, f"DELETE FROM community_unread_marks WHERE username={ph}", (username,))
 
     try:
         c.execute(f"DELETE FROM exercises WHERE username={ph}", (username,))
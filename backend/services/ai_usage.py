@@ -25,6 +25,8 @@ Schema additions (all nullable, so old rows keep working):
     response_time_ms  INT
     community_id      INT               (for community-pool accounting later)
     model             VARCHAR(64)       (e.g. grok-4.3, grok-4.20-non-reasoning)
+    ttft_ms           INT               (streamed replies — time to first token)
+    tokens_per_second DECIMAL(10, 2)    (streamed replies — decode rate after TTFT)
 
 Counter semantics:
     * :func:`daily_count` — personal Steve rows in the last 24h, used for
@@ -195,6 +197,8 @@ def ensure_tables() -> None:
         _ensure_column(c, "model", "VARCHAR(64) NULL")
         _ensure_column(c, "credits_debited", "DECIMAL(6, 2) NULL")
         _ensure_column(c, "credits_meta", "VARCHAR(512) NULL")
+        _ensure_column(c, "ttft_ms", "INT NULL")
+        _ensure_column(c, "tokens_per_second", "DECIMAL(10, 2) NULL")
 
         # Indexes for the hot queries (counter helpers below).
         _ensure_index(c, "idx_ai_usage_user_surface", "username, surface")
@@ -248,6 +252,8 @@ def log_usage(
     tools_web_search: bool = False,
     tools_x_search: bool = False,
     router_pass_in_turn: bool = False,
+    ttft_ms: Optional[int] = None,
+    tokens_per_second: Optional[float] = None,
 ) -> None:
     """Insert one row into ``ai_usage_log``.
 
@@ -269,6 +275,8 @@ def log_usage(
         response_time_ms: latency of the upstream call.
         community_id: community the action took place in (for pool accounting).
         model: provider model id.
+        ttft_ms / tokens_per_second: streaming latency metrics (time to first
+            token, decode rate after it). ``None`` for blocking calls.
     """
     if not username or not surface:
         # Defensive — never silently log garbage.
@@ -322,9 +330,9 @@ def log_usage(
                     (username, request_type, surface, tokens_in, tokens_out,
                      cost_usd, duration_seconds, success, reason_blocked,
                      response_time_ms, community_id, model, credits_debited,
-                     credits_meta, created_at)
+                     credits_meta, ttft_ms, tokens_per_second, created_at)
                 VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph},
-                        {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})
+                        {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})
                 """,
                 (
                     username,
@@ -341,6 +349,8 @@ def log_usage(
                     model,
                     deb,
                     meta_str,
+                    ttft_ms,
+                    tokens_per_second,
                     now,
                 ),
             )
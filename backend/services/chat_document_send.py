@@ -11,6 +11,7 @@ from werkzeug.utils import secure_filename
 
 from backend.services.database import USE_MYSQL, get_sql_placeholder
 from backend.services.dm_chats_tables import ensure_messages_document_columns
+from backend.services.dm_thread_summary import record_dm_message
 from backend.services.media import save_uploaded_file
 
 logger = logging.getLogger(__name__)
@@ -210,8 +211,9 @@ def send_dm_pdf(
             """,
             (sender, recipient_username, message_text, stored_path, file_name),
         )
-    conn.commit()
     message_id = getattr(cursor, "lastrowid", None)
+    record_dm_message(cursor, sender=sender, receiver=recipient_username, message_id=message_id)
+    conn.commit()
 
     inserted_time = None
     if message_id:
@@ -335,6 +337,10 @@ def send_group_pdf(
 
     conn.commit()
 
+    from backend.services.chat_recent_window import sync_group_window
+
+    sync_group_window(group_id)
+
     try:
         from backend.services.firestore_writes import write_group_chat_message
 
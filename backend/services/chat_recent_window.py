@@ -0,0 +1,615 @@
+"""Per-thread recent-message windows shared by every poller of a chat.
+
+Open chat screens poll ``/get_messages`` (DM) and
+``/api/group_chat/<id>/messages`` every few seconds, mostly with ``since_id``
+and mostly getting nothing back. Each poll used to run a Firestore query or a
+MySQL window read. With ``CHAT_RECENT_WINDOW`` on, the last
+``CHAT_RECENT_WINDOW_SIZE`` messages of a thread live in one shared cache
+entry (Redis, or the in-process cache locally):
+
+* Polls are answered from the window — a ``since_id`` delta is a slice of it,
+  an empty poll touches no backend at all. Only a miss (cold window, or a
+  ``since_id`` older than the window covers) reads MySQL, once per thread
+  rather than once per open screen.
+* Send / edit / delete / react paths update the window **in place** (append
+  the new rows, patch or drop the changed one) instead of invalidating it.
+
+Viewer-specific parts are kept inside the window and applied at read time:
+the DM ``sent`` flag and one-sided clear cutoff, a group member's own
+reaction and ``clear_history`` boundary, and group membership itself (a
+viewer missing from the window's member map falls through to the regular,
+fail-closed gate).
+
+Consistency: every write bumps a per-thread counter (``cache.incr``) before
+touching the window, and a window is only served while its ``seq`` equals the
+counter. A write that races another write, or lands while the window is being
+rebuilt, leaves the counters apart and the next poll rebuilds from MySQL.
+Writes always bump the counter, even with the flag off, so a window can never
+outlive a write it missed.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from backend.services.database import get_db_connection, get_sql_placeholder
+from backend.services.feature_flags import chat_recent_window_enabled
+from redis_cache import (
+    cache,
+    chat_window_dm_key,
+    chat_window_dm_seq_key,
+    chat_window_group_key,
+    chat_window_group_seq_key,
+    user_id_username_key,
+)
+
+logger = logging.getLogger(__name__)
+
+CHAT_RECENT_WINDOW_SIZE = int(os.environ.get("CHAT_RECENT_WINDOW_SIZE", "150") or 150)
+CHAT_RECENT_WINDOW_TTL = int(os.environ.get("CHAT_RECENT_WINDOW_TTL", "900") or 900)
+_SEQ_TTL = 24 * 3600
+_USER_ID_TTL = 600
+
+
+# ── Shared window mechanics ────────────────────────────────────────────
+
+
+def _current_seq(seq_key: str) -> int:
+    try:
+        return int(cache.get(seq_key) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _valid_window(key: str, seq_key: str) -> Optional[dict]:
+    window = cache.get(key)
+    if not isinstance(window, dict):
+        return None
+    if int(window.get("seq", -1)) != _current_seq(seq_key):
+        return None
+    return window
+
+
+def _get_or_build(key: str, seq_key: str, loader: Callable[[], Optional[dict]]) -> Optional[dict]:
+    window = _valid_window(key, seq_key)
+    if window is not None:
+        return window
+    # Read the counter before loading so a write landing mid-load leaves the
+    # stored window one behind (and therefore unserved) instead of silently stale.
+    seq = _current_seq(seq_key)
+    try:
+        window = loader()
+    except Exception as exc:
+        logger.warning("chat recent window build failed for %s: %s", key, exc)
+        return None
+    if window is None:
+        return None
+    window["seq"] = seq
+    cache.set(key, window, CHAT_RECENT_WINDOW_TTL)
+    return window
+
+
+def _apply_write(key: str, seq_key: str, mutate: Optional[Callable[[dict], None]]) -> None:
+    """Bump the thread's write counter, then update its window in place.
+
+    ``mutate=None`` drops the window (visibility / membership changes).
+    Never raises: a failed update drops the window instead.
+    """
+    try:
+        seq = cache.incr(seq_key, _SEQ_TTL)
+        window = cache.get(key)
+        if not isinstance(window, dict):
+            return
+        if mutate is None or seq is None or int(window.get("seq", -1)) != seq - 1:
+            cache.delete(key)
+            return
+        window = copy.deepcopy(window)
+        mutate(window)
+        window["seq"] = seq
+        cache.set(key, window, CHAT_RECENT_WINDOW_TTL)
+    except Exception as exc:
+        logger.warning("chat recent window update failed for %s: %s", key, exc)
+        try:
+            cache.delete(key)
+        except Exception:
+            pass
+
+
+def _merge_rows(window: dict, rows: list, removed_ids: Iterable[int] = ()) -> None:
+    """Upsert ``rows`` by id, drop ``removed_ids`` and re-trim to the window size."""
+    removed = {int(i) for i in removed_ids}
+    by_id = {int(m["id"]): m for m in window.get("messages") or [] if int(m["id"]) not in removed}
+    for row in rows:
+        by_id[int(row["id"])] = row
+    ordered = [by_id[i] for i in sorted(by_id)]
+    if len(ordered) > CHAT_RECENT_WINDOW_SIZE:
+        cut = len(ordered) - CHAT_RECENT_WINDOW_SIZE
+        window["floor_id"] = max(int(window.get("floor_id") or 0), int(ordered[cut - 1]["id"]))
+        ordered = ordered[cut:]
+    window["messages"] = ordered
+
+
+def _newest_id(window: dict) -> int:
+    msgs = window.get("messages") or []
+    return int(msgs[-1]["id"]) if msgs else int(window.get("floor_id") or 0)
+
+
+def _row_get(row: Any, key: str) -> Any:
+    try:
+        return row[key]
+    except (KeyError, IndexError, TypeError):
+        return None
+
+
+def _json_field(raw: Any) -> Any:
+    if not raw:
+        return None
+    if not isinstance(raw, str):
+        return raw
+    try:
+        return json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return None
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    try:
+        return datetime.strptime(str(value)[:19].replace("T", " "), "%Y-%m-%d %H:%M:%S")
+    except (TypeError, ValueError):
+        return None
+
+
+def username_for_user_id(user_id: Any) -> Optional[str]:
+    """``users.username`` for ``user_id``, cached so polls skip the lookup."""
+    if not user_id:
+        return None
+    key = user_id_username_key(user_id)
+    hit = cache.get(key)
+    if hit:
+        return str(hit)
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute("SELECT username FROM users WHERE id = ?", (user_id,))
+        row = c.fetchone()
+    if not row:
+        return None
+    name = row["username"] if hasattr(row, "keys") else row[0]
+    cache.set(key, name, _USER_ID_TTL)
+    return name
+
+
+# ── DM windows ─────────────────────────────────────────────────────────
+
+_DM_COLUMNS = (
+    "id, sender, receiver, message, image_path, video_path, audio_path, audio_duration_seconds, "
+    "audio_mime, is_encrypted, encrypted_body, encrypted_body_for_sender, timestamp, edited_at, "
+    "audio_summary, reaction, reaction_by, media_paths, media_dims, file_path, file_name"
+)
+
+
+def _dm_where(ph: str, user_a: str, user_b: str) -> tuple:
+    from backend.services.dm_human_thread import (
+        dm_messages_where_clause,
+        human_pair_thread_key,
+        is_private_steve_dm_peer,
+    )
+
+    # Private Steve threads are scoped from the human side; human pairs are symmetric.
+    viewer, peer = (user_b, user_a) if is_private_steve_dm_peer(user_a) else (user_a, user_b)
+    return dm_messages_where_clause(
+        ph, viewer=viewer, peer=peer, thr_key=human_pair_thread_key(user_a, user_b)
+    )
+
+
+def _dm_message_from_row(row: Any) -> dict:
+    raw_time = _row_get(row, "timestamp")
+    if raw_time and isinstance(raw_time, str) and not raw_time.endswith("Z") and "+" not in raw_time[-6:]:
+        utc_time = raw_time.replace(" ", "T") + "Z"
+    else:
+        utc_time = str(raw_time) if raw_time else None
+    is_encrypted = _row_get(row, "is_encrypted")
+    encrypted_body = _row_get(row, "encrypted_body")
+    msg = {
+        "id": int(_row_get(row, "id")),
+        "sender": _row_get(row, "sender"),
+        "text": _row_get(row, "message"),
+        "image_path": _row_get(row, "image_path"),
+        "video_path": _row_get(row, "video_path"),
+        "audio_path": _row_get(row, "audio_path"),
+        "audio_duration_seconds": _row_get(row, "audio_duration_seconds"),
+        "audio_mime": _row_get(row, "audio_mime"),
+        "audio_summary": _row_get(row, "audio_summary"),
+        "time": utc_time,
+        "edited_at": str(_row_get(row, "edited_at")) if _row_get(row, "edited_at") else None,
+        "reaction": _row_get(row, "reaction"),
+        "reaction_by": _row_get(row, "reaction_by"),
+        "media_paths": _json_field(_row_get(row, "media_paths")),
+        "file_path": _row_get(row, "file_path"),
+        "file_name": _row_get(row, "file_name"),
+        "is_encrypted": is_encrypted,
+        "encrypted_body": encrypted_body,
+        "encrypted_body_for_sender": _row_get(row, "encrypted_body_for_sender"),
+    }
+    if is_encrypted and not encrypted_body:
+        msg["signal_protocol"] = True
+    dims = _json_field(_row_get(row, "media_dims"))
+    if dims:
+        msg["media_dims"] = dims
+    return msg
+
+
+def _load_dm_deleted_at(c, ph: str, user_a: str, user_b: str) -> Dict[str, str]:
+    out: Dict[str, str] = {}
+    try:
+        c.execute(
+            f"SELECT username, deleted_at FROM deleted_chat_threads "
+            f"WHERE (username = {ph} AND other_username = {ph}) OR (username = {ph} AND other_username = {ph})",
+            (user_a, user_b, user_b, user_a),
+        )
+        for row in c.fetchall() or []:
+            name = row["username"] if hasattr(row, "keys") else row[0]
+            val = row["deleted_at"] if hasattr(row, "keys") else row[1]
+            if name and val:
+                out[str(name).lower()] = str(val)
+    except Exception:
+        pass
+    return out
+
+
+def _load_dm_window(user_a: str, user_b: str) -> dict:
+    ph = get_sql_placeholder()
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        from backend.services.dm_human_thread import ensure_human_dm_thread_column
+
+        ensure_human_dm_thread_column(c)
+        where, params = _dm_where(ph, user_a, user_b)
+        c.execute(
+            f"SELECT {_DM_COLUMNS} FROM messages WHERE {where} ORDER BY id DESC LIMIT {ph}",
+            params + (CHAT_RECENT_WINDOW_SIZE + 1,),
+        )
+        rows = [_dm_message_from_row(r) for r in c.fetchall() or []]
+        deleted_at = _load_dm_deleted_at(c, ph, user_a, user_b)
+    floor_id = 0
+    if len(rows) > CHAT_RECENT_WINDOW_SIZE:
+        floor_id = rows[CHAT_RECENT_WINDOW_SIZE]["id"]
+        rows = rows[:CHAT_RECENT_WINDOW_SIZE]
+    rows.reverse()
+    return {"messages": rows, "floor_id": floor_id, "deleted_at": deleted_at}
+
+
+def _dm_sync_mutator(user_a: str, user_b: str, message_ids: Iterable[int]) -> Callable[[dict], None]:
+    changed = sorted({int(i) for i in message_ids or () if i})
+
+    def _mutate(window: dict) -> None:
+        ph = get_sql_placeholder()
+        in_clause = ""
+        params: tuple = (_newest_id(window),)
+        if changed:
+            in_clause = f" OR id IN ({','.join([ph] * len(changed))})"
+            params += tuple(changed)
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            where, where_params = _dm_where(ph, user_a, user_b)
+            c.execute(
+                f"SELECT {_DM_COLUMNS} FROM messages WHERE {where} AND (id > {ph}{in_clause}) ORDER BY id",
+                where_params + params,
+            )
+            rows = [_dm_message_from_row(r) for r in c.fetchall() or []]
+        returned = {m["id"] for m in rows}
+        _merge_rows(window, rows, removed_ids=[i for i in changed if i not in returned])
+
+    return _mutate
+
+
+def sync_dm_window(user_a: str, user_b: str, message_ids: Optional[Iterable[int]] = None) -> None:
+    """After a DM write commits: append new rows and re-read ``message_ids``."""
+    if not user_a or not user_b:
+        return
+    _apply_write(
+        chat_window_dm_key(user_a, user_b),
+        chat_window_dm_seq_key(user_a, user_b),
+        _dm_sync_mutator(user_a, user_b, message_ids or ()),
+    )
+
+
+def patch_dm_window_message(user_a: str, user_b: str, message_id: int, **fields: Any) -> None:
+    """Overwrite fields of one windowed DM message (no backend read)."""
+
+    def _mutate(window: dict) -> None:
+        for msg in window.get("messages") or []:
+            if int(msg["id"]) == int(message_id):
+                msg.update(fields)
+                break
+
+    _apply_write(chat_window_dm_key(user_a, user_b), chat_window_dm_seq_key(user_a, user_b), _mutate)
+
+
+def remove_dm_window_message(user_a: str, user_b: str, message_id: int) -> None:
+    _apply_write(
+        chat_window_dm_key(user_a, user_b),
+        chat_window_dm_seq_key(user_a, user_b),
+        lambda window: _merge_rows(window, [], removed_ids=[message_id]),
+    )
+
+
+def drop_dm_window(user_a: str, user_b: str) -> None:
+    """One-sided clear / delete moved a visibility cutoff: rebuild on next poll."""
+    _apply_write(chat_window_dm_key(user_a, user_b), chat_window_dm_seq_key(user_a, user_b), None)
+
+
+def dm_window_messages(viewer: str, peer: str, *, since_id: Optional[int] = None) -> Optional[list]:
+    """Viewer-shaped DM messages from the shared window, or ``None`` to fall back.
+
+    A full load is served only when the window holds the whole thread (the
+    MySQL path returns everything); a ``since_id`` delta whenever the window
+    reaches back past ``since_id``.
+    """
+    if not chat_recent_window_enabled() or not viewer or not peer:
+        return None
+    window = _get_or_build(
+        chat_window_dm_key(viewer, peer),
+        chat_window_dm_seq_key(viewer, peer),
+        lambda: _load_dm_window(viewer, peer),
+    )
+    if window is None:
+        return None
+    floor_id = int(window.get("floor_id") or 0)
+    if since_id:
+        if since_id < floor_id:
+            return None
+        source = [m for m in window["messages"] if m["id"] > since_id]
+    else:
+        if floor_id:
+            return None
+        source = window["messages"]
+    cutoff = _parse_time((window.get("deleted_at") or {}).get(viewer.lower()))
+    viewer_l = viewer.lower()
+    out = []
+    for msg in source:
+        if cutoff is not None:
+            sent_at = _parse_time(msg.get("time"))
+            if sent_at is None or sent_at <= cutoff:
+                continue
+        shaped = dict(msg)
+        shaped["sent"] = str(shaped.pop("sender", "") or "").lower() == viewer_l
+        out.append(shaped)
+    return out
+
+
+# ── Group windows ──────────────────────────────────────────────────────
+
+_GROUP_COLUMNS = (
+    "m.id, m.sender_username, m.message_text, m.image_path, m.voice_path, m.video_path, m.media_paths, "
+    "m.client_key, m.created_at, up.profile_picture, m.is_edited, m.audio_summary, m.file_path, m.file_name"
+)
+
+
+def _group_message_from_row(row: Any) -> dict:
+    from backend.blueprints import group_chat as gc
+
+    file_path = _row_get(row, "file_path")
+    created_at = _row_get(row, "created_at")
+    return {
+        "id": int(_row_get(row, "id")),
+        "sender": _row_get(row, "sender_username"),
+        "text": _row_get(row, "message_text"),
+        "image": _row_get(row, "image_path"),
+        "voice": _row_get(row, "voice_path"),
+        "video": _row_get(row, "video_path"),
+        "media_paths": _json_field(_row_get(row, "media_paths")),
+        "file_path": file_path,
+        "file_name": _row_get(row, "file_name"),
+        "document": file_path,
+        "client_key": _row_get(row, "client_key"),
+        "created_at": created_at if isinstance(created_at, str) or created_at is None else str(created_at),
+        "profile_picture": gc._public_profile_picture_url(_row_get(row, "profile_picture")),
+        "is_edited": bool(_row_get(row, "is_edited")),
+        "audio_summary": _row_get(row, "audio_summary"),
+    }
+
+
+def _load_group_reactions(c, ph: str, message_ids: list) -> Dict[str, Dict[str, str]]:
+    out: Dict[str, Dict[str, str]] = {}
+    if not message_ids:
+        return out
+    c.execute(
+        f"SELECT message_id, username, reaction FROM group_message_reactions "
+        f"WHERE message_id IN ({','.join([ph] * len(message_ids))})",
+        tuple(message_ids),
+    )
+    for row in c.fetchall() or []:
+        mid = row["message_id"] if hasattr(row, "keys") else row[0]
+        user = row["username"] if hasattr(row, "keys") else row[1]
+        emoji = row["reaction"] if hasattr(row, "keys") else row[2]
+        if user and emoji:
+            out.setdefault(str(int(mid)), {})[str(user).lower()] = emoji
+    return out
+
+
+def _load_group_window(group_id: int) -> dict:
+    from backend.blueprints import group_chat as gc
+
+    ph = get_sql_placeholder()
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        gc._ensure_group_chat_tables(c)
+        gc._ensure_cleared_before_message_id_column(c)
+        gc._ensure_group_message_reactions_table(c)
+        c.execute(
+            f"""
+            SELECT gm.username, rr.cleared_before_message_id
+            FROM group_chat_members gm
+            LEFT JOIN group_chat_read_receipts rr
+              ON rr.group_id = gm.group_id AND rr.username = gm.username
+            WHERE gm.group_id = {ph}
+            """,
+            (group_id,),
+        )
+        members: Dict[str, int] = {}
+        for row in c.fetchall() or []:
+            name = row["username"] if hasattr(row, "keys") else row[0]
+            cleared = row["cleared_before_message_id"] if hasattr(row, "keys") else row[1]
+            if name:
+                members[str(name).lower()] = max(0, int(cleared or 0))
+        c.execute(
+            f"""
+            SELECT {_GROUP_COLUMNS}
+            FROM group_chat_messages m
+            LEFT JOIN user_profiles up ON m.sender_username = up.username
+            WHERE m.group_id = {ph} AND m.is_deleted = 0
+            ORDER BY m.id DESC
+            LIMIT {ph}
+            """,
+            (group_id, CHAT_RECENT_WINDOW_SIZE + 1),
+        )
+        rows = [_group_message_from_row(r) for r in c.fetchall() or []]
+        floor_id = 0
+        if len(rows) > CHAT_RECENT_WINDOW_SIZE:
+            floor_id = rows[CHAT_RECENT_WINDOW_SIZE]["id"]
+            rows = rows[:CHAT_RECENT_WINDOW_SIZE]
+        rows.reverse()
+        reactions = _load_group_reactions(c, ph, [m["id"] for m in rows])
+    rows = gc._enrich_group_message_profile_pictures(rows)
+    return {"messages": rows, "floor_id": floor_id, "members": members, "reactions": reactions}
+
+
+def _group_sync_mutator(group_id: int, message_ids: Iterable[int]) -> Callable[[dict], None]:
+    changed = sorted({int(i) for i in message_ids or () if i})
+
+    def _mutate(window: dict) -> None:
+        from backend.blueprints import group_chat as gc
+
+        ph = get_sql_placeholder()
+        in_clause = ""
+        params: tuple = (group_id, _newest_id(window))
+        if changed:
+            in_clause = f" OR m.id IN ({','.join([ph] * len(changed))})"
+            params += tuple(changed)
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            c.execute(
+                f"""
+                SELECT {_GROUP_COLUMNS}
+                FROM group_chat_messages m
+                LEFT JOIN user_profiles up ON m.sender_username = up.username
+                WHERE m.group_id = {ph} AND m.is_deleted = 0 AND (m.id > {ph}{in_clause})
+                ORDER BY m.id
+                """,
+                params,
+            )
+            rows = [_group_message_from_row(r) for r in c.fetchall() or []]
+        rows = gc._enrich_group_message_profile_pictures(rows)
+        returned = {m["id"] for m in rows}
+        removed = [i for i in changed if i not in returned]
+        _merge_rows(window, rows, removed_ids=removed)
+        reactions = window.setdefault("reactions", {})
+        for mid in removed:
+            reactions.pop(str(mid), None)
+
+    return _mutate
+
+
+def sync_group_window(group_id: int, message_ids: Optional[Iterable[int]] = None) -> None:
+    """After a group write commits: append new rows and re-read ``message_ids``."""
+    if not group_id:
+        return
+    _apply_write(
+        chat_window_group_key(group_id),
+        chat_window_group_seq_key(group_id),
+        _group_sync_mutator(int(group_id), message_ids or ()),
+    )
+
+
+def patch_group_window_message(group_id: int, message_id: int, **fields: Any) -> None:
+    """Overwrite fields of one windowed group message (no backend read)."""
+
+    def _mutate(window: dict) -> None:
+        for msg in window.get("messages") or []:
+            if int(msg["id"]) == int(message_id):
+                msg.update(fields)
+                break
+
+    _apply_write(chat_window_group_key(group_id), chat_window_group_seq_key(group_id), _mutate)
+
+
+def remove_group_window_messages(group_id: int, message_ids: Iterable[int]) -> None:
+    ids = [int(i) for i in message_ids if i]
+
+    def _mutate(window: dict) -> None:
+        _merge_rows(window, [], removed_ids=ids)
+        for mid in ids:
+            (window.get("reactions") or {}).pop(str(mid), None)
+
+    _apply_write(chat_window_group_key(group_id), chat_window_group_seq_key(group_id), _mutate)
+
+
+def set_group_window_reaction(group_id: int, message_id: int, username: str, reaction: Optional[str]) -> None:
+    """Record (or clear, with ``reaction=None``) one member's reaction in place."""
+
+    def _mutate(window: dict) -> None:
+        per_msg = window.setdefault("reactions", {}).setdefault(str(int(message_id)), {})
+        if reaction:
+            per_msg[(username or "").lower()] = reaction
+        else:
+            per_msg.pop((username or "").lower(), None)
+
+    _apply_write(chat_window_group_key(group_id), chat_window_group_seq_key(group_id), _mutate)
+
+
+def drop_group_window(group_id: int) -> None:
+    """Membership or a member's clear boundary changed: rebuild on next poll."""
+    if not group_id:
+        return
+    _apply_write(chat_window_group_key(group_id), chat_window_group_seq_key(group_id), None)
+
+
+def group_window_messages(
+    viewer: str,
+    group_id: int,
+    *,
+    since_id: Optional[int] = None,
+    limit: int = 50,
+) -> Optional[tuple]:
+    """``(messages, has_more)`` for a group member from the shared window.
+
+    ``None`` means fall back to the regular read: flag off, window cold and
+    unbuildable, viewer not in the window's member map, or the request
+    reaches further back than the window covers.
+    """
+    if not chat_recent_window_enabled() or not viewer or not group_id:
+        return None
+    window = _get_or_build(
+        chat_window_group_key(group_id),
+        chat_window_group_seq_key(group_id),
+        lambda: _load_group_window(int(group_id)),
+    )
+    if window is None:
+        return None
+    viewer_l = viewer.lower()
+    members = window.get("members") or {}
+    if viewer_l not in members:
+        return None
+    cleared = int(members.get(viewer_l) or 0)
+    floor_id = int(window.get("floor_id") or 0)
+    visible = [m for m in window["messages"] if m["id"] > cleared]
+    if since_id:
+        if max(since_id, cleared) < floor_id:
+            return None
+        picked = [m for m in visible if m["id"] > since_id][:limit]
+    else:
+        if len(visible) < limit and cleared < floor_id:
+            return None
+        picked = visible[-limit:] if limit else []
+    reactions = window.get("reactions") or {}
+    out = []
+    for msg in picked:
+        shaped = dict(msg)
+        shaped["reaction"] = (reactions.get(str(msg["id"])) or {}).get(viewer_l)
+        out.append(shaped)
+    return out, len(out) == limit
@@ -6,9 +6,13 @@ browser). These columns back /api/profile_me and explicit mark-* endpoints.
 
 from __future__ import annotations
 
+from backend.services.schema_migrations import schema_is_current
+
 
 def ensure_user_ui_columns(cursor) -> None:
     """Idempotent schema for per-user tour flags."""
+    if schema_is_current():
+        return
     for stmt in (
         "ALTER TABLE users ADD COLUMN communities_spotlight_tour_seen TINYINT(1) DEFAULT 0",
     ):
@@ -20,6 +24,8 @@ def ensure_user_ui_columns(cursor) -> None:
 
 def ensure_community_ui_columns(cursor) -> None:
     """Idempotent schema for per-community owner UX flags."""
+    if schema_is_current():
+        return
     for stmt in (
         "ALTER TABLE communities ADD COLUMN owner_feed_setup_intro_seen TINYINT(1) DEFAULT 0",
         # Owner tapped "don't show again" on the upgrade interstitial —
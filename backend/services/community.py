@@ -40,6 +40,10 @@ _COMMUNITY_DEPENDENT_TABLES: List[Tuple[str, str]] = [
         "event_rsvps",
         "event_id IN (SELECT id FROM calendar_events WHERE community_id = {ph})",
     ),
+    (
+        "event_rsvp_counters",
+        "event_id IN (SELECT id FROM calendar_events WHERE community_id = {ph})",
+    ),
     (
         "event_invitations",
         "event_id IN (SELECT id FROM calendar_events WHERE community_id = {ph})",
@@ -1172,6 +1176,15 @@ def count_unread_posts_by_community_ids(
         return {}
     if not ids:
         return {}
+    from backend.services.feature_flags import community_unread_marks_enabled
+
+    if community_unread_marks_enabled():
+        from backend.services.community_unread import unread_counts_by_community
+
+        try:
+            return unread_counts_by_community(cursor, ids, username)
+        except Exception as exc:
+            logger.warning("unread marks read failed, using post scan: %s", exc)
     ph = get_sql_placeholder()
     placeholders = ",".join([ph] * len(ids))
     try:
@@ -1216,6 +1229,10 @@ def count_unread_posts_in_community_ids(
         return 0
     if not ids:
         return 0
+    from backend.services.feature_flags import community_unread_marks_enabled
+
+    if community_unread_marks_enabled():
+        return sum(count_unread_posts_by_community_ids(cursor, ids, username).values())
     ph = get_sql_placeholder()
     placeholders = ",".join([ph] * len(ids))
     try:
@@ -1251,6 +1268,13 @@ def get_user_dashboard_communities(username: str) -> List[Dict[str, Any]]:
     if not username:
         return []
 
+    from backend.services.feature_flags import dashboard_root_summary_enabled
+
+    if dashboard_root_summary_enabled():
+        from backend.services.community_dashboard_summary import get_user_dashboard_communities_shared
+
+        return get_user_dashboard_communities_shared(username)
+
     ph = get_sql_placeholder()
 
     with get_db_connection() as conn:
@@ -1533,6 +1557,7 @@ def invalidate_dashboard_caches_for_community_subtree(
     community_id: int,
     *,
     cursor: Optional[Any] = None,
+    member_username: Optional[str] = None,
 ) -> None:
     """Invalidate Redis dashboard snapshot keys for everyone tied to this tree.
 
@@ -1541,6 +1566,11 @@ def invalidate_dashboard_caches_for_community_subtree(
     owner, or ``community_admins`` row — so descriptions and rolled-up member
     counts refresh without waiting for TTL.
 
+    With ``DASHBOARD_ROOT_SUMMARY`` on, those values live in one shared
+    summary per root: it is dropped and the per-user walk is skipped
+    (``member_username``, when given, is still invalidated so their own
+    membership caches refresh).
+
     When ``cursor`` is provided (same DB transaction), membership rows not yet
     committed to other connections are visible for the queries.
     """
@@ -1566,6 +1596,15 @@ def invalidate_dashboard_caches_for_community_subtree(
         else:
             root_id = cid_int
 
+        from backend.services.community_dashboard_summary import drop_root_summary
+        from backend.services.feature_flags import dashboard_root_summary_enabled
+
+        drop_root_summary(root_id)
+        if dashboard_root_summary_enabled():
+            if member_username:
+                invalidate_user_cache(member_username)
+            return
+
         tree_ids = get_descendant_community_ids(c, root_id)
         if not tree_ids:
             tree_ids = [root_id]
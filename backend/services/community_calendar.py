@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+import logging
 import os
 import re
 from typing import Any
@@ -95,6 +96,16 @@ from backend.services.group_feed_access import check_group_feed_access
 GROUPS_TBL_CAL = "`groups`" if USE_MYSQL else "groups"
 GROUP_MEMBERS_TBL = "`group_members`" if USE_MYSQL else "group_members"
 from backend.services.notifications import create_notification, send_push_to_user
+from backend.services.feature_flags import calendar_batched_events_enabled, scheduled_work_enabled
+from backend.services.schema_migrations import schema_is_current
+from backend.services.scheduled_work import KIND_EVENT_REMINDER, cancel_work, schedule_event_reminders
+
+logger = logging.getLogger(__name__)
+
+RSVP_RESPONSES = ("going", "maybe", "not_going")
+_RSVP_CAS_ATTEMPTS = 3
+# Event ids per ``IN (...)`` list when hydrating a page of events.
+_EVENT_ID_CHUNK = 500
 
 _calendar_event_columns_ensured = False
 
@@ -143,10 +154,51 @@ def ensure_calendar_event_columns() -> None:
             for col_name, col_def in required_columns:
                 if col_name not in existing:
                     cursor.execute(f"ALTER TABLE calendar_events ADD COLUMN {col_name} {col_def}")
+        ensure_event_rsvp_counters_table(cursor)
         conn.commit()
     _calendar_event_columns_ensured = True
 
 
+def ensure_event_rsvp_counters_table(cursor) -> None:
+    """Per-event RSVP / invitation tallies, written at event creation and then
+    moved by relative increments on every RSVP change.
+
+    Rows are a cache of ``event_rsvps`` / ``event_invitations``: a missing row
+    is recomputed (and backfilled) on read, so writers outside this module
+    only need to delete the rows they invalidate.
+    """
+    if schema_is_current():
+        return
+    if USE_MYSQL:
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS event_rsvp_counters (
+                event_id INT PRIMARY KEY,
+                going INT NOT NULL DEFAULT 0,
+                maybe INT NOT NULL DEFAULT 0,
+                not_going INT NOT NULL DEFAULT 0,
+                responded INT NOT NULL DEFAULT 0,
+                invited INT NOT NULL DEFAULT 0,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            )
+            """
+        )
+    else:
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS event_rsvp_counters (
+                event_id INTEGER PRIMARY KEY,
+                going INTEGER NOT NULL DEFAULT 0,
+                maybe INTEGER NOT NULL DEFAULT 0,
+                not_going INTEGER NOT NULL DEFAULT 0,
+                responded INTEGER NOT NULL DEFAULT 0,
+                invited INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+
+
 @dataclass
 class EventInput:
     title: str
@@ -313,10 +365,237 @@ def _user_rsvp(cursor, event_id: int, username: str | None) -> str | None:
     return row_value(row, "response", 0)
 
 
+def _counts_payload(tally: dict[str, int]) -> dict[str, int]:
+    counts = {response: int(tally.get(response) or 0) for response in RSVP_RESPONSES}
+    total_invited = int(tally.get("invited") or 0) + 1
+    counts["no_response"] = max(0, total_invited - int(tally.get("responded") or 0))
+    counts["total_invited"] = total_invited
+    return counts
+
+
+def _id_chunks(event_ids: list[int]):
+    for start in range(0, len(event_ids), _EVENT_ID_CHUNK):
+        yield event_ids[start:start + _EVENT_ID_CHUNK]
+
+
+def _live_rsvp_tallies(cursor, event_ids: list[int]) -> dict[int, dict[str, int]]:
+    """Aggregate RSVP / invitation tallies for ``event_ids`` (two grouped queries per chunk)."""
+    ph = get_sql_placeholder()
+    tallies = {
+        eid: {"going": 0, "maybe": 0, "not_going": 0, "responded": 0, "invited": 0}
+        for eid in event_ids
+    }
+    for chunk in _id_chunks(event_ids):
+        marks = ", ".join([ph] * len(chunk))
+        cursor.execute(
+            f"""
+            SELECT event_id, response, COUNT(*) AS count
+            FROM event_rsvps
+            WHERE event_id IN ({marks})
+            GROUP BY event_id, response
+            """,
+            tuple(chunk),
+        )
+        # (event_id, username) is unique, so summing every response counts distinct responders.
+        for row in cursor.fetchall() or []:
+            tally = tallies.get(int(row_value(row, "event_id", 0)))
+            if tally is None:
+                continue
+            n = int(row_value(row, "count", 2, 0) or 0)
+            tally["responded"] += n
+            response = row_value(row, "response", 1)
+            if response in RSVP_RESPONSES:
+                tally[response] = n
+        cursor.execute(
+            f"""
+            SELECT event_id, COUNT(DISTINCT invited_username) AS cnt
+            FROM event_invitations
+            WHERE event_id IN ({marks})
+            GROUP BY event_id
+            """,
+            tuple(chunk),
+        )
+        for row in cursor.fetchall() or []:
+            tally = tallies.get(int(row_value(row, "event_id", 0)))
+            if tally is not None:
+                tally["invited"] = int(row_value(row, "cnt", 1, 0) or 0)
+    return tallies
+
+
+def _store_rsvp_counters(cursor, tallies: dict[int, dict[str, int]], *, overwrite: bool = True) -> None:
+    """Write aggregated tallies. ``overwrite=False`` only fills missing rows, so a
+    read-side backfill never clobbers a row that RSVPs have since incremented."""
+    if not tallies:
+        return
+    ph = get_sql_placeholder()
+    cols = ("event_id", "going", "maybe", "not_going", "responded", "invited")
+    if not overwrite:
+        verb = "INSERT IGNORE" if USE_MYSQL else "INSERT OR IGNORE"
+        sql = f"{verb} INTO event_rsvp_counters ({', '.join(cols)}) VALUES ({', '.join([ph] * len(cols))})"
+    elif USE_MYSQL:
+        sql = f"""
+            INSERT INTO event_rsvp_counters ({", ".join(cols)})
+            VALUES ({", ".join([ph] * len(cols))})
+            ON DUPLICATE KEY UPDATE going=VALUES(going), maybe=VALUES(maybe), not_going=VALUES(not_going),
+                responded=VALUES(responded), invited=VALUES(invited)
+        """
+    else:
+        sql = f"""
+            INSERT INTO event_rsvp_counters ({", ".join(cols)})
+            VALUES ({", ".join([ph] * len(cols))})
+            ON CONFLICT(event_id) DO UPDATE SET going=excluded.going, maybe=excluded.maybe,
+                not_going=excluded.not_going, responded=excluded.responded, invited=excluded.invited
+        """
+    try:
+        cursor.executemany(sql, [(eid, *(t[c] for c in cols[1:])) for eid, t in tallies.items()])
+    except Exception as exc:
+        logger.debug("event_rsvp_counters write skipped: %s", exc)
+
+
+def _refresh_rsvp_counters(cursor, event_id: int) -> dict[str, int]:
+    """Recompute one event's tallies, store them, and return the ``rsvp_counts`` payload."""
+    tallies = _live_rsvp_tallies(cursor, [int(event_id)])
+    _store_rsvp_counters(cursor, tallies)
+    return _counts_payload(tallies[int(event_id)])
+
+
+def _bump_rsvp_counters(cursor, event_id: int, *, added: str | None = None, removed: str | None = None) -> None:
+    """Apply one responder's change to the stored row as relative increments.
+
+    Connections autocommit, so concurrent RSVPs cannot serialize on a row lock;
+    increments commute where re-aggregating and overwriting would lose one of
+    them. A missing row is left missing — the next read aggregates it.
+    """
+    delta = {"going": 0, "maybe": 0, "not_going": 0, "responded": 0}
+    for response, step in ((added, 1), (removed, -1)):
+        if response is None:
+            continue
+        delta["responded"] += step
+        if response in RSVP_RESPONSES:
+            delta[response] += step
+    if not any(delta.values()):
+        return
+    ph = get_sql_placeholder()
+    try:
+        cursor.execute(
+            f"""
+            UPDATE event_rsvp_counters
+            SET going = going + {ph}, maybe = maybe + {ph}, not_going = not_going + {ph},
+                responded = responded + {ph}
+            WHERE event_id = {ph}
+            """,
+            (delta["going"], delta["maybe"], delta["not_going"], delta["responded"], event_id),
+        )
+    except Exception as exc:
+        logger.debug("event_rsvp_counters increment failed, dropping row: %s", exc)
+        _drop_rsvp_counters(cursor, event_id)
+
+
+def _event_rsvp_counts(cursor, event_id: int) -> dict[str, int]:
+    return _counts_payload(_load_rsvp_tallies(cursor, [int(event_id)])[int(event_id)])
+
+
+def _drop_rsvp_counters(cursor, event_id: int) -> None:
+    ph = get_sql_placeholder()
+    try:
+        cursor.execute(f"DELETE FROM event_rsvp_counters WHERE event_id = {ph}", (event_id,))
+    except Exception as exc:
+        logger.debug("event_rsvp_counters delete skipped: %s", exc)
+
+
+def _load_rsvp_tallies(cursor, event_ids: list[int]) -> dict[int, dict[str, int]]:
+    """Stored counters for ``event_ids``; missing ones are aggregated in bulk and backfilled."""
+    ph = get_sql_placeholder()
+    tallies: dict[int, dict[str, int]] = {}
+    counters_ok = True
+    try:
+        for chunk in _id_chunks(event_ids):
+            cursor.execute(
+                f"""
+                SELECT event_id, going, maybe, not_going, responded, invited
+                FROM event_rsvp_counters
+                WHERE event_id IN ({", ".join([ph] * len(chunk))})
+                """,
+                tuple(chunk),
+            )
+            for row in cursor.fetchall() or []:
+                tallies[int(row_value(row, "event_id", 0))] = {
+                    key: int(row_value(row, key, idx, 0) or 0)
+                    for idx, key in enumerate(("going", "maybe", "not_going", "responded", "invited"), start=1)
+                }
+    except Exception as exc:
+        logger.debug("event_rsvp_counters read failed, aggregating live: %s", exc)
+        tallies, counters_ok = {}, False
+    missing = [eid for eid in event_ids if eid not in tallies]
+    if missing:
+        live = _live_rsvp_tallies(cursor, missing)
+        if counters_ok:
+            _store_rsvp_counters(cursor, live, overwrite=False)
+        tallies.update(live)
+    return tallies
+
+
+def _user_rsvps(cursor, event_ids: list[int], username: str | None) -> dict[int, str]:
+    if not username or not event_ids:
+        return {}
+    ph = get_sql_placeholder()
+    out: dict[int, str] = {}
+    for chunk in _id_chunks(event_ids):
+        cursor.execute(
+            f"""
+            SELECT event_id, response FROM event_rsvps
+            WHERE username = {ph} AND event_id IN ({", ".join([ph] * len(chunk))})
+            """,
+            (username, *chunk),
+        )
+        for row in cursor.fetchall() or []:
+            out[int(row_value(row, "event_id", 0))] = row_value(row, "response", 1)
+    return out
+
+
 def shape_event(row: Any, cursor, username: str | None, *, include_community_name: bool = False) -> dict[str, Any]:
     event_id = int(row_value(row, "id", 0))
     counts = _rsvp_counts(cursor, event_id)
     user_rsvp = _user_rsvp(cursor, event_id, username)
+    return _shape_event_row(row, username, counts, user_rsvp, include_community_name=include_community_name)
+
+
+def shape_events(
+    rows: list[Any], cursor, username: str | None, *, include_community_name: bool = False
+) -> list[dict[str, Any]]:
+    """Shape a page of event rows like :func:`shape_event`, in a fixed number of queries.
+
+    RSVP tallies come from ``event_rsvp_counters`` (missing rows aggregated in
+    bulk and backfilled) and the viewer's own RSVPs from one lookup, instead
+    of four queries per event.
+    """
+    rows = list(rows or [])
+    event_ids = list(dict.fromkeys(int(row_value(row, "id", 0)) for row in rows))
+    if not event_ids:
+        return []
+    tallies = _load_rsvp_tallies(cursor, event_ids)
+    mine = _user_rsvps(cursor, event_ids, username)
+    return [
+        _shape_event_row(
+            row,
+            username,
+            _counts_payload(tallies[int(row_value(row, "id", 0))]),
+            mine.get(int(row_value(row, "id", 0))),
+            include_community_name=include_community_name,
+        )
+        for row in rows
+    ]
+
+
+def _shape_event_row(
+    row: Any,
+    username: str | None,
+    counts: dict[str, int],
+    user_rsvp: str | None,
+    *,
+    include_community_name: bool = False,
+) -> dict[str, Any]:
+    event_id = int(row_value(row, "id", 0))
     creator = row_value(row, "username", 1)
     event = {
         "id": event_id,
@@ -369,7 +648,10 @@ def list_visible_events(username: str | None, *, upcoming_only: bool = False) ->
             ORDER BY ce.date ASC, COALESCE(ce.start_time, ce.time) ASC
         """
         cursor.execute(query, (username, username))
-        return [shape_event(row, cursor, username) for row in cursor.fetchall() or []]
+        rows = cursor.fetchall() or []
+        if calendar_batched_events_enabled():
+            return shape_events(rows, cursor, username)
+        return [shape_event(row, cursor, username) for row in rows]
 
 
 def list_all_member_events(username: str) -> list[dict[str, Any]]:
@@ -616,7 +898,10 @@ def get_event(event_id: int, username: str | None, *, mark_viewed: bool = False)
         row = cursor.fetchone()
         if not row:
             raise CalendarError("Event not found", 404, message_key="calendar.errors.event_not_found")
-        event = shape_event(row, cursor, username, include_community_name=True)
+        if calendar_batched_events_enabled():
+            event = shape_events([row], cursor, username, include_community_name=True)[0]
+        else:
+            event = shape_event(row, cursor, username, include_community_name=True)
         event["can_edit"] = can_manage_event(cursor, username, event_id)
         if mark_viewed and username:
             cursor.execute(
@@ -765,6 +1050,10 @@ def create_event(username: str, data: EventInput) -> dict[str, Any]:
             ),
         )
         event_id = int(cursor.lastrowid)
+        try:
+            schedule_event_reminders(cursor, event_id)
+        except Exception as sched_err:
+            logger.warning("Event %s reminder scheduling failed: %s", event_id, sched_err)
         data_with_comm = EventInput(
             title=data.title,
             date=data.date,
@@ -817,6 +1106,7 @@ def create_event(username: str, data: EventInput) -> dict[str, Any]:
                     pass
             except Exception:
                 continue
+        _refresh_rsvp_counters(cursor, event_id)
         conn.commit()
     return {"event_id": event_id, "invited_count": len(invited_users)}
 
@@ -870,6 +1160,10 @@ def update_event(username: str, event_id: int, data: EventInput) -> None:
                 event_id,
             ),
         )
+        try:
+            schedule_event_reminders(cursor, event_id)
+        except Exception as sched_err:
+            logger.warning("Event %s reminder scheduling failed: %s", event_id, sched_err)
         conn.commit()
 
 
@@ -891,6 +1185,9 @@ def delete_event(username: str, event_id: int) -> None:
             (f"/event/{event_id}",),
         )
         cursor.execute(f"DELETE FROM calendar_events WHERE id = {ph}", (event_id,))
+        _drop_rsvp_counters(cursor, event_id)
+        if scheduled_work_enabled():
+            cancel_work(cursor, KIND_EVENT_REMINDER, event_id)
         conn.commit()
 
 
@@ -916,26 +1213,42 @@ def rsvp_event(username: str, event_id: int, response: str, note: str = "") -> d
                     403,
                     message_key="calendar.errors.not_invited",
                 )
-        if USE_MYSQL:
-            cursor.execute(
-                f"""
-                INSERT INTO event_rsvps (event_id, username, response, note, responded_at)
-                VALUES ({ph}, {ph}, {ph}, {ph}, {ph})
-                ON DUPLICATE KEY UPDATE response=VALUES(response), note=VALUES(note), responded_at=VALUES(responded_at)
-                """,
-                (event_id, username, response, note, datetime.utcnow().isoformat()),
-            )
+        responded_at = datetime.utcnow().isoformat()
+        verb = "INSERT IGNORE" if USE_MYSQL else "INSERT OR IGNORE"
+        insert_sql = f"""
+            {verb} INTO event_rsvps (event_id, username, response, note, responded_at)
+            VALUES ({ph}, {ph}, {ph}, {ph}, {ph})
+        """
+        # Compare-and-set on the previous response, so each transition is
+        # counted exactly once even when the same user double-submits.
+        for _attempt in range(_RSVP_CAS_ATTEMPTS):
+            previous = _user_rsvp(cursor, event_id, username)
+            if previous is None:
+                cursor.execute(insert_sql, (event_id, username, response, note, responded_at))
+            else:
+                cursor.execute(
+                    f"""
+                    UPDATE event_rsvps SET response = {ph}, note = {ph}, responded_at = {ph}
+                    WHERE event_id = {ph} AND username = {ph} AND response = {ph}
+                    """,
+                    (response, note, responded_at, event_id, username, previous),
+                )
+            if cursor.rowcount:
+                if previous != response:
+                    _bump_rsvp_counters(cursor, event_id, added=response, removed=previous)
+                break
         else:
+            # Still racing: write unconditionally and let the next read re-aggregate.
+            cursor.execute(insert_sql, (event_id, username, response, note, responded_at))
             cursor.execute(
                 f"""
-                INSERT INTO event_rsvps (event_id, username, response, note, responded_at)
-                VALUES ({ph}, {ph}, {ph}, {ph}, {ph})
-                ON CONFLICT(event_id, username)
-                DO UPDATE SET response=excluded.response, note=excluded.note, responded_at=excluded.responded_at
+                UPDATE event_rsvps SET response = {ph}, note = {ph}, responded_at = {ph}
+                WHERE event_id = {ph} AND username = {ph}
                 """,
-                (event_id, username, response, note, datetime.utcnow().isoformat()),
+                (response, note, responded_at, event_id, username),
             )
-        counts = _rsvp_counts(cursor, event_id)
+            _drop_rsvp_counters(cursor, event_id)
+        counts = _event_rsvp_counts(cursor, event_id)
         conn.commit()
     return {"counts": counts, "user_rsvp": response}
 
@@ -944,13 +1257,27 @@ def cancel_rsvp(username: str, event_id: int) -> dict[str, Any]:
     with get_db_connection() as conn:
         cursor = conn.cursor()
         ph = get_sql_placeholder()
-        cursor.execute(
-            f"DELETE FROM event_rsvps WHERE event_id = {ph} AND username = {ph}",
-            (event_id, username),
-        )
-        if cursor.rowcount == 0:
-            raise CalendarError("No RSVP found", 404, message_key="calendar.errors.no_rsvp")
-        counts = _rsvp_counts(cursor, event_id)
+        for _attempt in range(_RSVP_CAS_ATTEMPTS):
+            previous = _user_rsvp(cursor, event_id, username)
+            if previous is None:
+                raise CalendarError("No RSVP found", 404, message_key="calendar.errors.no_rsvp")
+            cursor.execute(
+                f"DELETE FROM event_rsvps WHERE event_id = {ph} AND username = {ph} AND response = {ph}",
+                (event_id, username, previous),
+            )
+            if cursor.rowcount:
+                _bump_rsvp_counters(cursor, event_id, removed=previous)
+                break
+        else:
+            cursor.execute(
+                f"DELETE FROM event_rsvps WHERE event_id = {ph} AND username = {ph}",
+                (event_id, username),
+            )
+            removed = cursor.rowcount
+            _drop_rsvp_counters(cursor, event_id)
+            if not removed:
+                raise CalendarError("No RSVP found", 404, message_key="calendar.errors.no_rsvp")
+        counts = _event_rsvp_counts(cursor, event_id)
         conn.commit()
     return {"counts": counts}
 
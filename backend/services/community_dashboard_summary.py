@@ -0,0 +1,358 @@
+"""Shared per-root-community summaries for the dashboard community tree.
+
+``get_user_dashboard_communities`` used to recompute, for every user and every
+root network they belong to, the rolled-up member count, last activity and
+descendant walk — with ``LOWER(username) = LOWER(?)`` lookups that skip the
+username indexes. Every membership or description change then had to find and
+bust every affected user's dashboard cache.
+
+With ``DASHBOARD_ROOT_SUMMARY`` on:
+
+* Each root network has one cached **summary record** (name, type,
+  description, tier, member count, last activity, descendant ids) shared by
+  all of its members. Misses are built in batched queries for all missing
+  roots at once; writes (``invalidate_community_cache`` /
+  ``invalidate_dashboard_caches_for_community_subtree``) drop the record and
+  the next reader rebuilds it.
+* Per request only the viewer's **membership set** (member / creator / admin
+  rows, resolved to roots level by level) and **unread counts** (one grouped
+  query across every tree) are computed.
+
+So a dashboard load costs a fixed handful of queries regardless of how many
+networks the user is in, and writes no longer fan out per user.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from backend.services.database import USE_MYSQL, get_db_connection, get_sql_placeholder
+from redis_cache import cache, community_root_key, dashboard_root_summary_key
+
+logger = logging.getLogger(__name__)
+
+ROOT_SUMMARY_TTL = 600
+# Outlives the summaries it points at so a write can always find its root.
+_COMMUNITY_ROOT_TTL = 24 * 3600
+_MAX_DEPTH = 16
+
+
+def _row_get(row: Any, key: str, idx: int) -> Any:
+    if row is None:
+        return None
+    if hasattr(row, "keys"):
+        try:
+            return row[key]
+        except (KeyError, IndexError):
+            return None
+    try:
+        return row[idx]
+    except (IndexError, TypeError):
+        return None
+
+
+def _username_eq(column: str, ph: str) -> str:
+    """Case-insensitive username match that can still use the column index.
+
+    MySQL columns use a ``_ci`` collation, so plain ``=`` already ignores
+    case; only SQLite (local dev) needs ``LOWER()`` on both sides.
+    """
+    if USE_MYSQL:
+        return f"{column} = {ph}"
+    return f"LOWER({column}) = LOWER({ph})"
+
+
+def _in(ph: str, values: Iterable[Any]) -> str:
+    return ",".join([ph] * len(list(values)))
+
+
+# ── Tree resolution ────────────────────────────────────────────────────
+
+
+def resolve_root_ids(c, community_ids: Iterable[int]) -> Dict[int, int]:
+    """Map each community id to its top-level root, one query per tree level."""
+    ph = get_sql_placeholder()
+    parent_of: Dict[int, Optional[int]] = {}
+    frontier = {int(cid) for cid in community_ids if cid}
+    for _ in range(_MAX_DEPTH):
+        frontier = {cid for cid in frontier if cid not in parent_of}
+        if not frontier:
+            break
+        ids = sorted(frontier)
+        c.execute(f"SELECT id, parent_community_id FROM communities WHERE id IN ({_in(ph, ids)})", tuple(ids))
+        next_frontier: Set[int] = set()
+        for row in c.fetchall() or []:
+            cid = int(_row_get(row, "id", 0))
+            parent = _row_get(row, "parent_community_id", 1)
+            parent_of[cid] = int(parent) if parent else None
+            if parent:
+                next_frontier.add(int(parent))
+        frontier = next_frontier
+
+    roots: Dict[int, int] = {}
+    for cid in {int(x) for x in community_ids if x}:
+        if cid not in parent_of:
+            continue
+        current, seen = cid, {cid}
+        while True:
+            parent = parent_of.get(current)
+            # A missing parent row ends the walk at the last community found.
+            if parent is None or parent not in parent_of or parent in seen:
+                break
+            seen.add(parent)
+            current = parent
+        roots[cid] = current
+    return roots
+
+
+def _trees_for_roots(c, root_ids: List[int]) -> Dict[int, Dict[str, List[int]]]:
+    """``{root: {"tree": [...all descendants incl. root], "direct": [root + children]}}``."""
+    ph = get_sql_placeholder()
+    owner: Dict[int, int] = {rid: rid for rid in root_ids}
+    out = {rid: {"tree": [rid], "direct": [rid]} for rid in root_ids}
+    frontier = list(root_ids)
+    depth = 0
+    while frontier and depth < _MAX_DEPTH:
+        c.execute(
+            f"SELECT id, parent_community_id FROM communities WHERE parent_community_id IN ({_in(ph, frontier)})",
+            tuple(frontier),
+        )
+        next_frontier: List[int] = []
+        for row in c.fetchall() or []:
+            cid = int(_row_get(row, "id", 0))
+            parent = int(_row_get(row, "parent_community_id", 1))
+            if cid in owner:
+                continue
+            root = owner[parent]
+            owner[cid] = root
+            out[root]["tree"].append(cid)
+            if depth == 0:
+                out[root]["direct"].append(cid)
+            next_frontier.append(cid)
+        frontier = next_frontier
+        depth += 1
+    return out
+
+
+# ── Shared summaries ───────────────────────────────────────────────────
+
+
+def build_root_summaries(c, root_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """Summary records for ``root_ids`` (missing communities are skipped)."""
+    if not root_ids:
+        return {}
+    ph = get_sql_placeholder()
+    try:
+        c.execute(
+            f"SELECT id, name, type, description, tier FROM communities WHERE id IN ({_in(ph, root_ids)})",
+            tuple(root_ids),
+        )
+    except Exception:
+        # ``tier`` is added lazily (enterprise_membership); older trees lack it.
+        c.execute(
+            f"SELECT id, name, type, description FROM communities WHERE id IN ({_in(ph, root_ids)})",
+            tuple(root_ids),
+        )
+    summaries: Dict[int, Dict[str, Any]] = {}
+    for row in c.fetchall() or []:
+        rid = int(_row_get(row, "id", 0))
+        summaries[rid] = {
+            "id": rid,
+            "name": _row_get(row, "name", 1),
+            "type": _row_get(row, "type", 2),
+            "description": _row_get(row, "description", 3),
+            "tier": _row_get(row, "tier", 4),
+            "member_count": 0,
+            "last_activity": None,
+        }
+    if not summaries:
+        return {}
+
+    trees = _trees_for_roots(c, sorted(summaries))
+    direct_owner = {cid: rid for rid, t in trees.items() for cid in t["direct"]}
+    direct_ids = sorted(direct_owner)
+
+    # Member counts roll up the root and its direct children, excluding the
+    # global ``admin`` user (same rule as the community members modal).
+    try:
+        c.execute(
+            f"""
+            SELECT uc.community_id, uc.user_id
+            FROM user_communities uc
+            JOIN users u ON uc.user_id = u.id
+            WHERE uc.community_id IN ({_in(ph, direct_ids)})
+              AND LOWER(u.username) <> 'admin'
+            """,
+            tuple(direct_ids),
+        )
+        members: Dict[int, Set[Any]] = {rid: set() for rid in summaries}
+        for row in c.fetchall() or []:
+            rid = direct_owner.get(int(_row_get(row, "community_id", 0)))
+            if rid is not None:
+                members[rid].add(_row_get(row, "user_id", 1))
+        for rid, users in members.items():
+            summaries[rid]["member_count"] = len(users)
+    except Exception as exc:
+        logger.warning("dashboard summary member counts failed: %s", exc)
+
+    try:
+        c.execute(
+            f"""
+            SELECT community_id, MAX(timestamp) AS last_post
+            FROM posts
+            WHERE community_id IN ({_in(ph, direct_ids)})
+            GROUP BY community_id
+            """,
+            tuple(direct_ids),
+        )
+        for row in c.fetchall() or []:
+            rid = direct_owner.get(int(_row_get(row, "community_id", 0)))
+            last = _row_get(row, "last_post", 1)
+            if rid is None or last is None:
+                continue
+            current = summaries[rid]["last_activity"]
+            if current is None or str(last) > str(current):
+                summaries[rid]["last_activity"] = last
+    except Exception as exc:
+        logger.warning("dashboard summary last activity failed: %s", exc)
+
+    for rid, summary in summaries.items():
+        summary["tree_ids"] = trees[rid]["tree"]
+    return summaries
+
+
+def get_root_summaries(c, root_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+    """Cached summaries for ``root_ids``; all misses are built in one batch."""
+    wanted = sorted({int(r) for r in root_ids if r})
+    found: Dict[int, Dict[str, Any]] = {}
+    missing: List[int] = []
+    for rid in wanted:
+        try:
+            hit = cache.get(dashboard_root_summary_key(rid))
+        except Exception:
+            hit = None
+        if isinstance(hit, dict):
+            found[rid] = hit
+        else:
+            missing.append(rid)
+    if missing:
+        built = build_root_summaries(c, missing)
+        for rid, summary in built.items():
+            try:
+                cache.set(dashboard_root_summary_key(rid), summary, ROOT_SUMMARY_TTL)
+                for cid in summary.get("tree_ids") or []:
+                    cache.set(community_root_key(cid), rid, _COMMUNITY_ROOT_TTL)
+            except Exception as exc:
+                logger.warning("dashboard summary cache set failed for %s: %s", rid, exc)
+        found.update(built)
+    return found
+
+
+def drop_root_summary(root_id: Optional[int]) -> None:
+    if not root_id:
+        return
+    try:
+        cache.delete(dashboard_root_summary_key(int(root_id)))
+    except Exception as exc:
+        logger.warning("drop_root_summary(%s) failed: %s", root_id, exc)
+
+
+def drop_root_summary_for_community(community_id: Optional[int]) -> None:
+    """Drop the summary of whichever root ``community_id`` was last seen under.
+
+    No database access: if no summary was ever built for the tree there is
+    nothing to drop.
+    """
+    if not community_id:
+        return
+    try:
+        root_id = cache.get(community_root_key(int(community_id)))
+    except Exception:
+        root_id = None
+    drop_root_summary(int(root_id) if root_id else int(community_id))
+
+
+# ── Per-user assembly ──────────────────────────────────────────────────
+
+
+def _user_community_sets(c, username: str) -> Dict[str, Set[int]]:
+    ph = get_sql_placeholder()
+    out: Dict[str, Set[int]] = {"member": set(), "owned": set(), "admin": set(), "user_id": set()}
+    c.execute(f"SELECT id FROM users WHERE {_username_eq('username', ph)}", (username,))
+    user_row = c.fetchone()
+    user_id = _row_get(user_row, "id", 0) if user_row else None
+    if user_id:
+        out["user_id"].add(user_id)
+        c.execute(f"SELECT community_id FROM user_communities WHERE user_id = {ph}", (user_id,))
+        out["member"] = {int(_row_get(r, "community_id", 0)) for r in c.fetchall() or [] if _row_get(r, "community_id", 0)}
+    c.execute(f"SELECT id FROM communities WHERE {_username_eq('creator_username', ph)}", (username,))
+    out["owned"] = {int(_row_get(r, "id", 0)) for r in c.fetchall() or [] if _row_get(r, "id", 0)}
+    c.execute(f"SELECT community_id FROM community_admins WHERE {_username_eq('username', ph)}", (username,))
+    out["admin"] = {int(_row_get(r, "community_id", 0)) for r in c.fetchall() or [] if _row_get(r, "community_id", 0)}
+    return out
+
+
+def _gym_community_ids(c, username: str, user_ids: Set[Any]) -> List[int]:
+    """Gym communities surfaced for users with gym access (legacy rule)."""
+    ph = get_sql_placeholder()
+    has_gym_access = (username or "").lower() == "paulo"
+    if not has_gym_access and user_ids:
+        c.execute(
+            f"""
+            SELECT 1
+            FROM user_communities uc
+            JOIN communities cm ON cm.id = uc.community_id
+            WHERE uc.user_id = {ph} AND LOWER(cm.type) = 'gym'
+            LIMIT 1
+            """,
+            (next(iter(user_ids)),),
+        )
+        has_gym_access = c.fetchone() is not None
+    if not has_gym_access:
+        return []
+    c.execute("SELECT id FROM communities WHERE LOWER(type) = 'gym'")
+    return [int(_row_get(r, "id", 0)) for r in c.fetchall() or [] if _row_get(r, "id", 0)]
+
+
+def get_user_dashboard_communities_shared(username: str) -> List[Dict[str, Any]]:
+    """Same payload as ``community.get_user_dashboard_communities``, from shared summaries."""
+    from backend.services.community import count_unread_posts_by_community_ids, is_app_admin
+
+    if not username:
+        return []
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        sets = _user_community_sets(c, username)
+
+        app_admin = is_app_admin(username)
+        if app_admin:
+            c.execute("SELECT id FROM communities WHERE parent_community_id IS NULL ORDER BY name")
+            root_order = [int(_row_get(r, "id", 0)) for r in c.fetchall() or []]
+        else:
+            related = sets["member"] | sets["owned"] | sets["admin"]
+            try:
+                related |= set(_gym_community_ids(c, username, sets["user_id"]))
+            except Exception as exc:
+                logger.warning("dashboard gym surface failed for %s: %s", username, exc)
+            root_order = sorted(set(resolve_root_ids(c, related).values()))
+        if not root_order:
+            return []
+
+        summaries = get_root_summaries(c, root_order)
+        all_tree_ids = sorted({cid for s in summaries.values() for cid in s.get("tree_ids") or []})
+        unread_by_community = count_unread_posts_by_community_ids(c, all_tree_ids, username)
+
+    communities_list: List[Dict[str, Any]] = []
+    for rid in root_order:
+        summary = summaries.get(rid)
+        if not summary:
+            continue
+        comm = {k: v for k, v in summary.items() if k != "tree_ids"}
+        comm["unread_posts_count"] = sum(unread_by_community.get(cid, 0) for cid in summary.get("tree_ids") or [])
+        comm["is_owner"] = rid in sets["owned"]
+        comm["is_admin"] = rid in sets["admin"]
+        communities_list.append(comm)
+    if not app_admin:
+        communities_list.sort(key=lambda x: (x.get("name") or "").lower())
+    return communities_list
@@ -0,0 +1,507 @@
+"""Community feed served as one shared payload plus a per-viewer overlay.
+
+``/api/community_feed/<id>`` used to cache the whole response per
+``(community_id, username)``: N members opening the same feed built N
+near-identical payloads, and every post change had to delete N keys. With
+``COMMUNITY_FEED_SHARED_PAYLOAD`` on the response is assembled from:
+
+* a **shared payload** per community — community header, parent / root ids,
+  the newest posts with replies, reaction / view / reply counts, active polls
+  with tallies, author avatars — cached under a versioned key
+  (``community_feed_shared:{id}:v{n}``);
+* a **viewer overlay** computed per request — access gate, frozen gate, the
+  viewer's hidden posts and blocked authors, own post / reply reactions,
+  stars, poll votes, ``has_viewed`` (unread marker), admin flag and the
+  viewer's own name / avatar.
+
+Writes call ``invalidate_community_cache``, which bumps the community's
+version counter instead of deleting per-user keys; superseded payloads simply
+age out. The version is read *before* a payload is built, so a write landing
+mid-build leaves that payload under a version nobody reads any more.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from backend.services.database import get_db_connection, get_sql_placeholder
+from backend.services.profile_pictures import fetch_profile_picture_map
+from redis_cache import (
+    COMMUNITY_CACHE_TTL,
+    cache,
+    community_feed_shared_key,
+    community_feed_version_key,
+)
+
+logger = logging.getLogger(__name__)
+
+FEED_POST_LIMIT = 100
+# The shared payload keeps a few posts beyond the page so a viewer who hid
+# (or blocked the authors of) some of the newest posts still gets a full page.
+FEED_SHARED_SPARE = 20
+_VERSION_TTL = 7 * 24 * 3600
+
+
+# ── Versioning ─────────────────────────────────────────────────────────
+
+
+def community_feed_version(community_id: int) -> int:
+    try:
+        return int(cache.get(community_feed_version_key(community_id)) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def bump_community_feed_version(community_id: int) -> None:
+    """Retire the community's shared payload (every viewer sees the next build)."""
+    try:
+        cache.incr(community_feed_version_key(community_id), _VERSION_TTL)
+    except Exception as e:
+        logger.warning("community feed version bump failed for %s: %s", community_id, e)
+
+
+# ── Shared payload ─────────────────────────────────────────────────────
+
+
+def _display_timestamp(post: Dict[str, Any]) -> str:
+    try:
+        raw_ts = (post.get("timestamp") or post.get("created_at") or "").strip()
+        if not raw_ts or raw_ts.startswith("0000-00-00"):
+            return ""
+        dt = None
+        try:
+            dt = datetime.strptime(raw_ts[:19].replace("T", " "), "%Y-%m-%d %H:%M:%S")
+        except Exception:
+            for fmt in ("%d-%m-%Y %H:%M:%S", "%d-%m-%Y %H:%M", "%Y-%m-%d %H:%M", "%m.%d.%y %H:%M", "%Y-%m-%d", "%Y-%m-%dT%H:%M:%S"):
+                try:
+                    dt = datetime.strptime(raw_ts.replace("T", " "), fmt)
+                    break
+                except Exception:
+                    continue
+        return dt.strftime("%Y-%m-%d %H:%M:%S") if dt else raw_ts[:19].replace("T", " ")
+    except Exception:
+        return ""
+
+
+def _load_community_header(c, community_id: int) -> Optional[Dict[str, Any]]:
+    from backend.services import client_ui_flags
+    from backend.services.community import get_community_ancestors
+
+    client_ui_flags.ensure_community_ui_columns(c)
+    c.execute("SELECT * FROM communities WHERE id = ?", (community_id,))
+    row = c.fetchone()
+    if not row:
+        return None
+    community = dict(row)
+    community["recommended_profile_mode"] = community.get("recommended_profile_mode") or "none"
+    community["allow_nsfw_imagine"] = (
+        bool(community.get("allow_nsfw_imagine")) if community.get("allow_nsfw_imagine") is not None else False
+    )
+    community["owner_feed_setup_intro_seen"] = bool(int(community.get("owner_feed_setup_intro_seen") or 0))
+
+    parent_community = None
+    root_parent_id = None
+    if community.get("parent_community_id"):
+        c.execute("SELECT id, name, type FROM communities WHERE id = ?", (community["parent_community_id"],))
+        parent_row = c.fetchone()
+        if parent_row:
+            parent_community = dict(parent_row)
+        for anc in reversed(get_community_ancestors(c, community_id) or []):
+            if anc.get("parent_community_id") is None:
+                root_parent_id = anc.get("id")
+                break
+    else:
+        root_parent_id = community_id
+
+    try:
+        c.execute("SELECT COUNT(*) AS cnt FROM communities WHERE parent_community_id = ?", (community_id,))
+        child_row = c.fetchone()
+        cnt = (child_row["cnt"] if hasattr(child_row, "keys") else child_row[0]) if child_row else 0
+        community["child_community_count"] = int(cnt or 0)
+    except Exception:
+        community["child_community_count"] = 0
+
+    return {"community": community, "parent_community": parent_community, "root_parent_id": root_parent_id}
+
+
+def _load_shared_posts(c, community_id: int) -> List[Dict[str, Any]]:
+    ph = get_sql_placeholder()
+    c.execute(
+        f"""
+        SELECT p.* FROM posts p
+        WHERE p.community_id = {ph}
+        AND (p.video_path IS NULL OR p.video_path != 'pending')
+        ORDER BY p.id DESC
+        LIMIT {ph}
+        """,
+        (community_id, FEED_POST_LIMIT + FEED_SHARED_SPARE),
+    )
+    posts = [dict(row) for row in c.fetchall() or []]
+    post_ids = [post["id"] for post in posts]
+    if not post_ids:
+        return []
+    placeholders = ",".join([ph] * len(post_ids))
+    profile_pics = fetch_profile_picture_map(c, (p["username"] for p in posts))
+
+    view_counts: Dict[int, int] = {}
+    try:
+        c.execute(
+            f"SELECT post_id, COUNT(*) as cnt FROM post_views WHERE post_id IN ({placeholders}) AND LOWER(username) <> LOWER({ph}) GROUP BY post_id",
+            tuple(post_ids) + ("admin",),
+        )
+        for row in c.fetchall() or []:
+            pid = row["post_id"] if hasattr(row, "keys") else row[0]
+            cnt = row["cnt"] if hasattr(row, "keys") else row[1]
+            view_counts[int(pid)] = int(cnt or 0)
+    except Exception as e:
+        logger.warning("Failed to fetch post view counts: %s", e)
+
+    post_reactions: Dict[int, Dict[str, int]] = {pid: {} for pid in post_ids}
+    try:
+        c.execute(
+            f"SELECT post_id, reaction_type, COUNT(*) as count FROM reactions WHERE post_id IN ({placeholders}) GROUP BY post_id, reaction_type",
+            tuple(post_ids),
+        )
+        for row in c.fetchall() or []:
+            pid = row["post_id"] if hasattr(row, "keys") else row[0]
+            if pid in post_reactions:
+                post_reactions[pid][row["reaction_type"] if hasattr(row, "keys") else row[1]] = (
+                    row["count"] if hasattr(row, "keys") else row[2]
+                )
+    except Exception as e:
+        logger.warning("Failed to batch fetch reactions: %s", e)
+
+    community_starred: Set[int] = set()
+    try:
+        c.execute(
+            f"SELECT post_id FROM community_key_posts WHERE post_id IN ({placeholders}) AND community_id = {ph}",
+            tuple(post_ids) + (community_id,),
+        )
+        for row in c.fetchall() or []:
+            community_starred.add(row["post_id"] if hasattr(row, "keys") else row[0])
+    except Exception:
+        pass
+
+    polls_by_post: Dict[int, dict] = {}
+    try:
+        c.execute(f"SELECT * FROM polls WHERE post_id IN ({placeholders}) AND is_active = 1", tuple(post_ids))
+        for row in c.fetchall() or []:
+            poll = dict(row)
+            polls_by_post[poll["post_id"]] = poll
+    except Exception:
+        pass
+    if polls_by_post:
+        poll_ids = [p["id"] for p in polls_by_post.values()]
+        options_by_poll: Dict[int, list] = {pid: [] for pid in poll_ids}
+        try:
+            c.execute(
+                f"SELECT * FROM poll_options WHERE poll_id IN ({','.join([ph] * len(poll_ids))}) ORDER BY id",
+                tuple(poll_ids),
+            )
+            for row in c.fetchall() or []:
+                opt = dict(row)
+                opt.setdefault("text", opt.get("option_text", ""))
+                opt.setdefault("votes", 0)
+                options_by_poll[opt["poll_id"]].append(opt)
+        except Exception:
+            pass
+        for poll in polls_by_post.values():
+            poll["options"] = options_by_poll.get(poll["id"], [])
+            poll["total_votes"] = sum(int(opt.get("votes", 0) or 0) for opt in poll["options"])
+
+    replies_by_post: Dict[int, list] = {pid: [] for pid in post_ids}
+    all_reply_ids: list = []
+    try:
+        c.execute(f"SELECT * FROM replies WHERE post_id IN ({placeholders}) ORDER BY timestamp DESC", tuple(post_ids))
+        for row in c.fetchall() or []:
+            reply = dict(row)
+            replies_by_post[reply["post_id"]].append(reply)
+            all_reply_ids.append(reply["id"])
+    except Exception:
+        pass
+    reply_profile_pics = fetch_profile_picture_map(
+        c, (r["username"] for rs in replies_by_post.values() for r in rs)
+    )
+
+    reply_reactions: Dict[int, Dict[str, int]] = {rid: {} for rid in all_reply_ids}
+    reply_counts: Dict[int, int] = {rid: 0 for rid in all_reply_ids}
+    reply_view_counts: Dict[int, int] = {rid: 0 for rid in all_reply_ids}
+    if all_reply_ids:
+        reply_placeholders = ",".join([ph] * len(all_reply_ids))
+        try:
+            c.execute(
+                f"SELECT reply_id, reaction_type, COUNT(*) as count FROM reply_reactions WHERE reply_id IN ({reply_placeholders}) GROUP BY reply_id, reaction_type",
+                tuple(all_reply_ids),
+            )
+            for row in c.fetchall() or []:
+                rid = row["reply_id"] if hasattr(row, "keys") else row[0]
+                if rid in reply_reactions:
+                    reply_reactions[rid][row["reaction_type"] if hasattr(row, "keys") else row[1]] = (
+                        row["count"] if hasattr(row, "keys") else row[2]
+                    )
+        except Exception:
+            pass
+        try:
+            c.execute(
+                f"SELECT parent_reply_id, COUNT(*) as cnt FROM replies WHERE parent_reply_id IN ({reply_placeholders}) GROUP BY parent_reply_id",
+                tuple(all_reply_ids),
+            )
+            for row in c.fetchall() or []:
+                parent_id = row["parent_reply_id"] if hasattr(row, "keys") else row[0]
+                if parent_id in reply_counts:
+                    reply_counts[parent_id] = row["cnt"] if hasattr(row, "keys") else row[1]
+        except Exception as e:
+            logger.warning("Failed to batch fetch reply counts: %s", e)
+        try:
+            import bodybuilding_app as _ba
+
+            _ba.ensure_reply_views_table(c)
+            c.execute(
+                f"SELECT reply_id, COUNT(*) as cnt FROM reply_views WHERE reply_id IN ({reply_placeholders}) AND LOWER(username) <> LOWER({ph}) GROUP BY reply_id",
+                tuple(all_reply_ids) + ("admin",),
+            )
+            for row in c.fetchall() or []:
+                rid = row["reply_id"] if hasattr(row, "keys") else row[0]
+                if rid in reply_view_counts:
+                    reply_view_counts[rid] = int((row["cnt"] if hasattr(row, "keys") else row[1]) or 0)
+        except Exception as e:
+            logger.warning("Failed to batch fetch reply view counts: %s", e)
+
+    for post in posts:
+        post_id = post["id"]
+        try:
+            lu = post.get("link_urls")
+            if isinstance(lu, str) and lu.strip():
+                post["link_urls"] = json.loads(lu)
+        except Exception:
+            post["link_urls"] = None
+        post["display_timestamp"] = _display_timestamp(post)
+        post["profile_picture"] = profile_pics.get(post["username"])
+        post["reactions"] = post_reactions.get(post_id, {})
+        post["is_community_starred"] = post_id in community_starred
+        post["view_count"] = view_counts.get(post_id, 0)
+        post["poll"] = polls_by_post.get(post_id)
+        post_replies = replies_by_post.get(post_id, [])
+        for reply in post_replies:
+            reply["profile_picture"] = reply_profile_pics.get(reply["username"])
+            reply["reactions"] = reply_reactions.get(reply["id"], {})
+            reply["reply_count"] = reply_counts.get(reply["id"], 0)
+            reply["view_count"] = reply_view_counts.get(reply["id"], 0)
+        post["replies"] = post_replies
+    return posts
+
+
+def build_shared_feed_payload(community_id: int) -> Optional[Dict[str, Any]]:
+    """Viewer-independent part of the feed, or ``None`` if the community is gone."""
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        header = _load_community_header(c, community_id)
+        if header is None:
+            return None
+        header["posts"] = _load_shared_posts(c, community_id)
+    return header
+
+
+def get_shared_feed_payload(community_id: int) -> Optional[Dict[str, Any]]:
+    """Shared payload for the community's current version, building it on a miss."""
+    version = community_feed_version(community_id)
+    key = community_feed_shared_key(community_id, version)
+    try:
+        cached = cache.get(key)
+    except Exception as e:
+        logger.warning("community feed shared cache get failed for %s: %s", key, e)
+        cached = None
+    if cached is not None:
+        return cached
+    shared = build_shared_feed_payload(community_id)
+    if shared is not None:
+        try:
+            cache.set(key, shared, COMMUNITY_CACHE_TTL)
+        except Exception as e:
+            logger.warning("community feed shared cache set failed for %s: %s", key, e)
+    return shared
+
+
+# ── Viewer overlay ─────────────────────────────────────────────────────
+
+
+def _id_set(c, sql: str, params: tuple, column: str) -> Set[Any]:
+    out: Set[Any] = set()
+    try:
+        c.execute(sql, params)
+        for row in c.fetchall() or []:
+            out.add(row[column] if hasattr(row, "keys") else row[0])
+    except Exception as e:
+        logger.warning("community feed overlay query failed: %s", e)
+    return out
+
+
+def _id_map(c, sql: str, params: tuple, key_column: str, value_column: str) -> Dict[Any, Any]:
+    out: Dict[Any, Any] = {}
+    try:
+        c.execute(sql, params)
+        for row in c.fetchall() or []:
+            if hasattr(row, "keys"):
+                out[row[key_column]] = row[value_column]
+            else:
+                out[row[0]] = row[1]
+    except Exception as e:
+        logger.warning("community feed overlay query failed: %s", e)
+    return out
+
+
+def apply_feed_viewer_overlay(conn, shared: Dict[str, Any], community_id: int, username: str) -> Dict[str, Any]:
+    """Merge one viewer's state into a copy of ``shared`` (never mutated)."""
+    from backend.services.community import is_community_admin
+
+    c = conn.cursor()
+    ph = get_sql_placeholder()
+    payload = copy.deepcopy(shared)
+
+    candidates = payload.get("posts") or []
+    post_ids = [p["id"] for p in candidates]
+    if post_ids:
+        placeholders = ",".join([ph] * len(post_ids))
+        hidden = _id_set(
+            c,
+            f"SELECT post_id FROM hidden_posts WHERE username = {ph} AND post_id IN ({placeholders})",
+            (username,) + tuple(post_ids),
+            "post_id",
+        )
+        blocked = {
+            str(u).lower()
+            for u in _id_set(
+                c,
+                f"SELECT blocked_username FROM blocked_users WHERE blocker_username = {ph}",
+                (username,),
+                "blocked_username",
+            )
+        }
+        candidates = [
+            p for p in candidates
+            if p["id"] not in hidden and str(p.get("username") or "").lower() not in blocked
+        ]
+    posts = candidates[:FEED_POST_LIMIT]
+    post_ids = [p["id"] for p in posts]
+
+    if post_ids:
+        placeholders = ",".join([ph] * len(post_ids))
+        user_viewed = {
+            int(pid)
+            for pid in _id_set(
+                c,
+                f"SELECT post_id FROM post_views WHERE post_id IN ({placeholders}) AND LOWER(username) = LOWER({ph})",
+                tuple(post_ids) + (username,),
+                "post_id",
+            )
+        }
+        user_reactions = _id_map(
+            c,
+            f"SELECT post_id, reaction_type FROM reactions WHERE post_id IN ({placeholders}) AND username = {ph}",
+            tuple(post_ids) + (username,),
+            "post_id",
+            "reaction_type",
+        )
+        user_starred = _id_set(
+            c,
+            f"SELECT post_id FROM key_posts WHERE post_id IN ({placeholders}) AND username = {ph}",
+            tuple(post_ids) + (username,),
+            "post_id",
+        )
+        reply_ids = [r["id"] for p in posts for r in p.get("replies") or []]
+        user_reply_reactions: Dict[Any, Any] = {}
+        if reply_ids:
+            user_reply_reactions = _id_map(
+                c,
+                f"SELECT reply_id, reaction_type FROM reply_reactions WHERE reply_id IN ({','.join([ph] * len(reply_ids))}) AND username = {ph}",
+                tuple(reply_ids) + (username,),
+                "reply_id",
+                "reaction_type",
+            )
+        poll_ids = [p["poll"]["id"] for p in posts if p.get("poll")]
+        user_poll_votes: Dict[Any, Set[Any]] = {pid: set() for pid in poll_ids}
+        if poll_ids:
+            try:
+                c.execute(
+                    f"SELECT poll_id, option_id FROM poll_votes WHERE poll_id IN ({','.join([ph] * len(poll_ids))}) AND username = {ph}",
+                    tuple(poll_ids) + (username,),
+                )
+                for row in c.fetchall() or []:
+                    poll_id = row["poll_id"] if hasattr(row, "keys") else row[0]
+                    if poll_id in user_poll_votes:
+                        user_poll_votes[poll_id].add(row["option_id"] if hasattr(row, "keys") else row[1])
+            except Exception:
+                pass
+
+        for post in posts:
+            post_id = post["id"]
+            post["user_reaction"] = user_reactions.get(post_id)
+            post["is_starred"] = post_id in user_starred
+            post["has_viewed"] = post_id in user_viewed
+            poll = post.get("poll")
+            if poll:
+                voted_ids = user_poll_votes.get(poll["id"], set())
+                for opt in poll.get("options") or []:
+                    opt["user_voted"] = opt["id"] in voted_ids
+                poll["user_vote"] = next(iter(voted_ids)) if voted_ids else None
+            for reply in post.get("replies") or []:
+                reply["user_reaction"] = user_reply_reactions.get(reply["id"])
+
+    try:
+        c.execute("SELECT display_name, profile_picture FROM user_profiles WHERE username = ?", (username,))
+        cupp = c.fetchone()
+        current_user_profile_picture = cupp["profile_picture"] if cupp and "profile_picture" in cupp.keys() else None
+        current_user_display_name = (
+            cupp["display_name"] if cupp and "display_name" in cupp.keys() and cupp["display_name"] else username
+        )
+    except Exception:
+        current_user_profile_picture = None
+        current_user_display_name = username
+
+    return {
+        "success": True,
+        "community": payload["community"],
+        "parent_community": payload["parent_community"],
+        "root_parent_id": payload["root_parent_id"],
+        "username": username,
+        "is_community_admin": is_community_admin(username, community_id),
+        "current_user_profile_picture": current_user_profile_picture,
+        "current_user_display_name": current_user_display_name,
+        "posts": posts,
+    }
+
+
+# ── Entry point ────────────────────────────────────────────────────────
+
+
+def read_community_feed(community_id: int, username: str) -> Tuple[Dict[str, Any], int]:
+    """``(body, status)`` for ``/api/community_feed/<id>`` from the shared payload."""
+    from backend.services import community_lifecycle
+    from backend.services.community_access import can_view_community_content
+    from backend.services.user_activity_tables import record_community_feed_visit
+
+    try:
+        shared = get_shared_feed_payload(community_id)
+        if shared is None:
+            return {"success": False, "error": "Community not found"}, 404
+        frozen_payload = community_lifecycle.frozen_access_payload(username or "", shared["community"])
+        if frozen_payload:
+            return frozen_payload, 423
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            try:
+                allowed, _ = can_view_community_content(c, get_sql_placeholder(), username, community_id)
+                if not allowed:
+                    return {"success": False, "error": "Forbidden"}, 403
+            except Exception as me:
+                logger.error("membership check failed on api_community_feed: %s", me)
+                return {"success": False, "error": "Access check failed"}, 500
+            record_community_feed_visit(conn, username, community_id)
+            return apply_feed_viewer_overlay(conn, shared, community_id, username), 200
+    except Exception as e:
+        logger.error("Error in shared community feed for %s: %s", community_id, e)
+        return {"success": False, "error": "Server error"}, 500
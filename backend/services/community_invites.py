@@ -14,7 +14,7 @@ from typing import Any, Dict, List, Optional, Tuple
 
 from redis_cache import invalidate_user_cache
 
-from backend.services import community_invite_emails, i18n, user_locale
+from backend.services import community_invite_emails, i18n, transactional_email, user_locale
 from backend.services.community import (
     CommunityMembershipLimitError,
     ensure_community_tier_member_capacity,
@@ -27,6 +27,7 @@ from backend.services.community import (
 from backend.services.community_placement import open_pending_placement_if_active
 from backend.services.database import get_db_connection, get_sql_placeholder
 from backend.services.email_normalization import canonicalize_with_policy
+from backend.services.feature_flags import batched_email_enabled
 from backend.services.notifications import create_notification, send_push_to_user
 from backend.services.steve_community_welcome import (
     ensure_introduce_yourself_thread,
@@ -1321,6 +1322,42 @@ def invite_bulk(username: str, data: Dict[str, Any], host_url: str) -> Tuple[Dic
                 payload["requested_invites"] = len(emails)
                 return payload, status_code
 
+            def _settle(email: str, token: str, existing_username: Optional[str], delivered: bool, send_error: str) -> None:
+                nonlocal sent, failed
+                if existing_username:
+                    # Existing accounts also get the in-app invite, which
+                    # delivers even when the email bounces — keep the row.
+                    try:
+                        create_notification(
+                            existing_username,
+                            username,
+                            "community_invite",
+                            community_id=community_id,
+                            message=f"{username} invited you to {community_name}",
+                            link="/notifications?tab=invites",
+                        )
+                    except Exception:
+                        logger.warning("invite_bulk: in-app notification failed for %s", existing_username)
+                    sent += 1
+                    if not delivered:
+                        errors.append({"email": email, "error": "Invited in-app; email delivery failed"})
+                elif delivered:
+                    sent += 1
+                else:
+                    # No account and no email: the invitee can never see
+                    # the token. Drop the row so a retry can re-create it.
+                    c.execute(
+                        f"DELETE FROM community_invitations WHERE community_id = {ph} AND invited_email = {ph} AND token = {ph}",
+                        (community_id, email, token),
+                    )
+                    conn.commit()
+                    errors.append({"email": email, "error": send_error})
+                    failed += 1
+
+            # Batched mode inserts every invitation first, then hands the
+            # emails to one provider batch (no per-send pacing needed).
+            batched = batched_email_enabled()
+            queued: List[Tuple[str, str, Optional[str], Any]] = []
             for email in emails:
                 try:
                     c.execute(
@@ -1367,58 +1404,51 @@ def invite_bulk(username: str, data: Dict[str, Any], host_url: str) -> Tuple[Dic
                         logo_url=logo_url,
                         expires_at=expires_at,
                     )
+                    subject = community_invite_emails.invite_subject(
+                        kind="new",
+                        inviter_username=username,
+                        community_name=community_name,
+                    )
+                    if batched:
+                        queued.append((email, token, existing_username, transactional_email.OutboundEmail(
+                            to_email=email, subject=subject, html=html, text=text,
+                        )))
+                        continue
                     delivered = False
                     send_error = "Email send failed"
                     try:
                         delivered = bool(
                             send_email(
                                 to_email=email,
-                                subject=community_invite_emails.invite_subject(
-                                    kind="new",
-                                    inviter_username=username,
-                                    community_name=community_name,
-                                ),
+                                subject=subject,
                                 html=html,
                                 text=text,
                             )
                         )
                     except Exception as send_exc:  # Resend errors must not abort the batch
                         send_error = str(send_exc) or send_error
-                    if existing_username:
-                        # Existing accounts also get the in-app invite, which
-                        # delivers even when the email bounces — keep the row.
-                        try:
-                            create_notification(
-                                existing_username,
-                                username,
-                                "community_invite",
-                                community_id=community_id,
-                                message=f"{username} invited you to {community_name}",
-                                link="/notifications?tab=invites",
-                            )
-                        except Exception:
-                            logger.warning("invite_bulk: in-app notification failed for %s", existing_username)
-                        sent += 1
-                        if not delivered:
-                            errors.append({"email": email, "error": "Invited in-app; email delivery failed"})
-                    elif delivered:
-                        sent += 1
-                    else:
-                        # No account and no email: the invitee can never see
-                        # the token. Drop the row so a retry can re-create it.
-                        c.execute(
-                            f"DELETE FROM community_invitations WHERE community_id = {ph} AND invited_email = {ph} AND token = {ph}",
-                            (community_id, email, token),
-                        )
-                        conn.commit()
-                        errors.append({"email": email, "error": send_error})
-                        failed += 1
+                    _settle(email, token, existing_username, delivered, send_error)
                     if BULK_SEND_DELAY_SECONDS:
                         time.sleep(BULK_SEND_DELAY_SECONDS)
                 except Exception as exc:
                     logger.error("invite_bulk: failed for %s: %s", email, exc, exc_info=True)
                     errors.append({"email": email, "error": str(exc)})
                     failed += 1
+
+            if queued:
+                statuses = transactional_email.send_batch([item[3] for item in queued])
+                for (email, token, existing_username, _message), status in zip(queued, statuses):
+                    try:
+                        _settle(
+                            email, token, existing_username,
+                            status == transactional_email.STATUS_SENT,
+                            "Email service busy, try again" if status == transactional_email.STATUS_RETRYABLE
+                            else "Email send failed",
+                        )
+                    except Exception as exc:
+                        logger.error("invite_bulk: failed for %s: %s", email, exc, exc_info=True)
+                        errors.append({"email": email, "error": str(exc)})
+                        failed += 1
     except Exception as exc:
         logger.error("Error in bulk invite: %s", exc, exc_info=True)
         return {"success": False, "error": "Server error"}, 500
@@ -0,0 +1,99 @@
+"""Daily per-community post counts, keyed by normalized author.
+
+``community_daily_post_counts`` holds one row per (community, UTC day,
+author) with ``author_norm`` lower-cased once at rollup time, so weekly
+sweeps can compare it with plain ``=`` against ``_ci`` username columns
+instead of wrapping both sides in ``LOWER()``. Member digests read
+"posts by other people this week" from here rather than joining
+``user_communities × posts``.
+
+Rows are rebuilt for a trailing window by :func:`refresh_post_count_rollups`
+(one grouped scan of the window's posts); deletions inside the window are
+picked up on the next refresh.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from backend.services.database import USE_MYSQL, get_sql_placeholder
+
+logger = logging.getLogger(__name__)
+
+_table_ready = False
+
+
+def ensure_post_rollups_table(cursor) -> None:
+    global _table_ready
+    if _table_ready:
+        return
+    if USE_MYSQL:
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS community_daily_post_counts (
+                community_id INT NOT NULL,
+                day CHAR(10) NOT NULL,
+                author_norm VARCHAR(191) NOT NULL,
+                posts INT NOT NULL DEFAULT 0,
+                PRIMARY KEY (community_id, day, author_norm),
+                INDEX idx_post_rollups_day (day, community_id)
+            )
+            """
+        )
+    else:
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS community_daily_post_counts (
+                community_id INTEGER NOT NULL,
+                day TEXT NOT NULL,
+                author_norm TEXT NOT NULL,
+                posts INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (community_id, day, author_norm)
+            )
+            """
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_post_rollups_day "
+            "ON community_daily_post_counts (day, community_id)"
+        )
+    _table_ready = True
+
+
+def window_start_day(days: int = 7, now: Optional[datetime] = None) -> str:
+    """First UTC day (``YYYY-MM-DD``) of a ``days``-day window ending today."""
+    now = now or datetime.now(timezone.utc)
+    return (now - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def username_norm_sql(column: str) -> str:
+    """``column`` in a form comparable with ``author_norm``.
+
+    MySQL username columns use ``_ci`` collations, so the bare column already
+    compares case-insensitively and keeps its index; SQLite needs ``LOWER``.
+    """
+    return column if USE_MYSQL else f"LOWER({column})"
+
+
+def refresh_post_count_rollups(cursor, since_day: str) -> int:
+    """Rebuild rollup rows for ``day >= since_day``. Returns rows written."""
+    ensure_post_rollups_table(cursor)
+    ph = get_sql_placeholder()
+    cursor.execute(
+        f"DELETE FROM community_daily_post_counts WHERE day >= {ph}",
+        (since_day,),
+    )
+    cursor.execute(
+        f"""
+        INSERT INTO community_daily_post_counts (community_id, day, author_norm, posts)
+        SELECT p.community_id, SUBSTR(p.timestamp, 1, 10), LOWER(COALESCE(p.username, '')), COUNT(*)
+        FROM posts p
+        WHERE p.timestamp >= {ph} AND p.community_id IS NOT NULL
+        GROUP BY p.community_id, SUBSTR(p.timestamp, 1, 10), LOWER(COALESCE(p.username, ''))
+        """,
+        (f"{since_day} 00:00:00",),
+    )
+    written = int(getattr(cursor, "rowcount", 0) or 0)
+    logger.info("post count rollups refreshed from %s: %d rows", since_day, written)
+    return written
@@ -6,14 +6,17 @@ import json
 import logging
 import os
 import tempfile
+import time
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
-from redis_cache import invalidate_community_cache
+from redis_cache import cache, invalidate_community_cache, story_seen_key, story_tray_snapshot_key
 
 from backend.services.community import get_parent_chain_ids, is_community_owner
 from backend.services.database import USE_MYSQL, get_db_connection, get_sql_placeholder
+from backend.services.feature_flags import story_tray_snapshot_enabled
+from backend.services.schema_migrations import schema_is_current
 from backend.services import media_assets
 from backend.services.media import (
     get_public_upload_url,
@@ -38,6 +41,10 @@ STORY_MAX_DESCRIPTION_LENGTH = 2000
 STORY_MAX_COMMENT_LENGTH = 2000
 STORY_VIDEO_MAX_SECONDS = 15
 STORY_ALLOWED_REACTIONS: Set[str] = {"❤️", "🔥", "👏", "😂", "😮", "👍"}
+# Upper bound on a cached tray: view counts and out-of-band deletes (account
+# deletion) converge within it even when no story expires sooner.
+STORY_TRAY_MAX_TTL = int(os.environ.get("CACHE_TTL_STORY_TRAY", "120"))
+STORY_SEEN_TTL = STORY_DEFAULT_LIFESPAN_HOURS * 3600
 
 
 def _row_value(row: Any, key: str, index: int, default: Any = None) -> Any:
@@ -70,8 +77,14 @@ def _coerce_timestamp(value: Any) -> Optional[str]:
     return str(value)
 
 
+_story_tables_ready = False
+
+
 def ensure_story_tables(c) -> bool:
-    """Ensure community story tables exist."""
+    """Ensure community story tables exist (once per process)."""
+    global _story_tables_ready
+    if _story_tables_ready or schema_is_current():
+        return True
     try:
         if USE_MYSQL:
             c.execute("SHOW TABLES LIKE 'community_stories'")
@@ -235,6 +248,7 @@ def ensure_story_tables(c) -> bool:
             )
             c.execute("CREATE INDEX IF NOT EXISTS idx_csc_story ON community_story_comments (story_id)")
             c.execute("CREATE INDEX IF NOT EXISTS idx_csc_user ON community_story_comments (username)")
+        _story_tables_ready = True
         return True
     except Exception as exc:
         logger.error("Could not ensure community story tables: %s", exc)
@@ -395,99 +409,236 @@ def record_story_view(c, story_id: int, username: str) -> Optional[int]:
         return None
 
 
+def _expiry_epoch(value: Any) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        if not isinstance(value, datetime):
+            value = datetime.fromisoformat(str(value).replace(" ", "T")[:19])
+        return value.replace(tzinfo=timezone.utc).timestamp()
+    except Exception:
+        return None
+
+
+def _build_story_tray(c, community_id: int) -> Optional[Dict[str, Any]]:
+    """Viewer-independent tray for ``community_id``; None when it doesn't exist.
+
+    Stories carry their reaction tallies plus a ``reactors`` map (lower-cased
+    username → reaction) so the viewer's own reaction is an overlay lookup.
+    ``valid_until`` is the earliest story expiry: past it the tray is stale.
+    """
+    ph = get_sql_placeholder()
+    c.execute(
+        f"SELECT id, name, creator_username, parent_community_id FROM communities WHERE id = {ph}",
+        (community_id,),
+    )
+    community_row = c.fetchone()
+    if not community_row:
+        return None
+
+    now_str = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+    c.execute(
+        f"""
+        SELECT cs.id, cs.community_id, cs.username, cs.media_path, cs.media_type,
+               cs.caption, cs.duration_seconds, cs.status, cs.created_at,
+               cs.expires_at, cs.view_count, cs.last_viewed_at, up.profile_picture,
+               cs.text_overlays, cs.story_group_id, cs.description
+        FROM community_stories cs
+        LEFT JOIN user_profiles up ON up.username = cs.username
+        WHERE cs.community_id = {ph}
+          AND cs.status = 'active'
+          AND cs.expires_at > {ph}
+        ORDER BY cs.created_at DESC
+        LIMIT 200
+        """,
+        (community_id, now_str),
+    )
+    rows = c.fetchall() or []
+    story_ids = [int(_row_value(row, "id", 0)) for row in rows if _row_value(row, "id", 0)]
+
+    reaction_counts: Dict[int, Dict[str, int]] = {}
+    reactors: Dict[int, Dict[str, str]] = {}
+    if story_ids:
+        placeholders = ",".join([ph] * len(story_ids))
+        try:
+            c.execute(
+                f"SELECT story_id, username, reaction FROM community_story_reactions WHERE story_id IN ({placeholders})",
+                tuple(story_ids),
+            )
+            for row in c.fetchall() or []:
+                story_id = _row_value(row, "story_id", 0)
+                reactor = _row_value(row, "username", 1)
+                reaction = _row_value(row, "reaction", 2)
+                if story_id is None or reaction is None:
+                    continue
+                counts = reaction_counts.setdefault(int(story_id), {})
+                counts[reaction] = counts.get(reaction, 0) + 1
+                if reactor:
+                    reactors.setdefault(int(story_id), {})[str(reactor).lower()] = reaction
+        except Exception as exc:
+            logger.warning("Failed to aggregate story reactions: %s", exc)
+
+    stories: List[Dict[str, Any]] = []
+    valid_until: Optional[float] = None
+    for row in rows:
+        story_id_raw = _row_value(row, "id", 0)
+        author = _row_value(row, "username", 2)
+        if not story_id_raw or not author:
+            continue
+        story_id = int(story_id_raw)
+        media_path = _row_value(row, "media_path", 3)
+        text_overlays_raw = _row_value(row, "text_overlays", 13)
+        text_overlays = None
+        if text_overlays_raw:
+            try:
+                text_overlays = json.loads(text_overlays_raw) if isinstance(text_overlays_raw, str) else text_overlays_raw
+            except Exception:
+                pass
+        expires_raw = _row_value(row, "expires_at", 9)
+        expiry = _expiry_epoch(expires_raw)
+        if expiry is not None and (valid_until is None or expiry < valid_until):
+            valid_until = expiry
+        stories.append({
+            "id": story_id,
+            "community_id": community_id,
+            "username": author,
+            "media_type": _row_value(row, "media_type", 4) or "image",
+            "media_path": media_path,
+            "media_url": _public_url(media_path),
+            "caption": _row_value(row, "caption", 5),
+            "duration_seconds": _row_value(row, "duration_seconds", 6),
+            "created_at": _coerce_timestamp(_row_value(row, "created_at", 8)),
+            "expires_at": _coerce_timestamp(expires_raw),
+            "view_count": int(_row_value(row, "view_count", 10, 0) or 0),
+            "profile_picture": _public_url(_row_value(row, "profile_picture", 12)),
+            "reactions": reaction_counts.get(story_id, {}),
+            "reactors": reactors.get(story_id, {}),
+            "text_overlays": text_overlays,
+            "story_group_id": _row_value(row, "story_group_id", 14),
+            "description": _row_value(row, "description", 15),
+        })
+    return {
+        "community": {"id": community_id, "name": _row_value(community_row, "name", 1)},
+        "creator_username": _row_value(community_row, "creator_username", 2),
+        "stories": stories,
+        "valid_until": valid_until,
+    }
+
+
+def _cached_story_tray(c, community_id: int) -> Optional[Dict[str, Any]]:
+    """Snapshot of :func:`_build_story_tray`, cached until the earliest story
+    expiry (capped at ``STORY_TRAY_MAX_TTL``); create / delete / react drop
+    it via :func:`invalidate_story_tray`."""
+    key = story_tray_snapshot_key(community_id)
+    now = time.time()
+    try:
+        hit = cache.get(key)
+    except Exception:
+        hit = None
+    if hit and (hit.get("valid_until") is None or hit["valid_until"] > now):
+        return hit
+    tray = _build_story_tray(c, community_id)
+    if tray is None:
+        return None
+    ttl = STORY_TRAY_MAX_TTL
+    if tray["valid_until"] is not None:
+        ttl = min(ttl, int(tray["valid_until"] - now))
+    if ttl >= 1:
+        try:
+            cache.set(key, tray, ttl)
+        except Exception as exc:
+            logger.warning("story tray cache set failed for %s: %s", community_id, exc)
+    return tray
+
+
+def invalidate_story_tray(community_id: Any) -> None:
+    try:
+        cache.delete(story_tray_snapshot_key(int(community_id)))
+    except Exception as exc:
+        logger.warning("story tray invalidation failed for %s: %s", community_id, exc)
+
+
+def _query_seen_story_ids(c, username: str, story_ids: Sequence[int]) -> Set[int]:
+    if not story_ids:
+        return set()
+    ph = get_sql_placeholder()
+    placeholders = ",".join([ph] * len(story_ids))
+    c.execute(
+        f"""
+        SELECT story_id FROM community_story_views
+        WHERE story_id IN ({placeholders}) AND LOWER(username) = LOWER({ph})
+        """,
+        tuple(list(story_ids) + [username]),
+    )
+    seen: Set[int] = set()
+    for row in c.fetchall() or []:
+        story_id = _row_value(row, "story_id", 0)
+        if story_id is not None:
+            seen.add(int(story_id))
+    return seen
+
+
+def _seen_story_ids(c, username: str, community_id: int, story_ids: Sequence[int]) -> Set[int]:
+    """The viewer's seen set for this tray, from the cache when present.
+
+    The cached set holds only ids still in the tray, so it stays at most the
+    size of the tray; :func:`_remember_story_seen` adds to it on view.
+    """
+    key = story_seen_key(username, community_id)
+    try:
+        hit = cache.get(key)
+    except Exception:
+        hit = None
+    if hit is not None:
+        return set(hit) & set(story_ids)
+    seen = _query_seen_story_ids(c, username, story_ids)
+    try:
+        cache.set(key, sorted(seen), STORY_SEEN_TTL)
+    except Exception as exc:
+        logger.warning("story seen cache set failed for %s: %s", community_id, exc)
+    return seen
+
+
+def _remember_story_seen(username: str, community_id: Any, story_id: int) -> None:
+    """Add ``story_id`` to a cached seen set; a missing set is rebuilt from
+    ``community_story_views`` on the next tray read."""
+    key = story_seen_key(username, community_id)
+    try:
+        hit = cache.get(key)
+        if hit is not None and story_id not in hit:
+            cache.set(key, sorted(set(hit) | {story_id}), STORY_SEEN_TTL)
+    except Exception as exc:
+        logger.warning("story seen cache update failed for %s: %s", community_id, exc)
+
+
 def list_community_stories(username: str, community_id: int) -> Tuple[Dict[str, Any], int]:
     try:
         with get_db_connection() as conn:
             c = conn.cursor()
             ensure_story_tables(c)
-            ph = get_sql_placeholder()
-            c.execute(
-                f"SELECT id, name, creator_username, parent_community_id FROM communities WHERE id = {ph}",
-                (community_id,),
-            )
-            community_row = c.fetchone()
-            if not community_row:
+            snapshot = story_tray_snapshot_enabled()
+            tray = _cached_story_tray(c, community_id) if snapshot else _build_story_tray(c, community_id)
+            if tray is None:
                 return {"success": False, "error": "Community not found"}, 404
-            community_name = _row_value(community_row, "name", 1)
-            creator_username = _row_value(community_row, "creator_username", 2)
-            if not user_has_story_access(c, username, community_id, creator_username):
+            if not user_has_story_access(c, username, community_id, tray["creator_username"]):
                 return {"success": False, "error": "Forbidden"}, 403
 
-            now_str = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
-            c.execute(
-                f"""
-                SELECT cs.id, cs.community_id, cs.username, cs.media_path, cs.media_type,
-                       cs.caption, cs.duration_seconds, cs.status, cs.created_at,
-                       cs.expires_at, cs.view_count, cs.last_viewed_at, up.profile_picture,
-                       cs.text_overlays, cs.story_group_id, cs.description
-                FROM community_stories cs
-                LEFT JOIN user_profiles up ON up.username = cs.username
-                WHERE cs.community_id = {ph}
-                  AND cs.status = 'active'
-                  AND cs.expires_at > {ph}
-                ORDER BY cs.created_at DESC
-                LIMIT 200
-                """,
-                (community_id, now_str),
-            )
-            rows = c.fetchall() or []
-            story_ids = [int(_row_value(row, "id", 0)) for row in rows if _row_value(row, "id", 0)]
-
-            viewed_ids: Set[int] = set()
-            if story_ids:
-                placeholders = ",".join([ph] * len(story_ids))
-                c.execute(
-                    f"""
-                    SELECT story_id FROM community_story_views
-                    WHERE story_id IN ({placeholders}) AND LOWER(username) = LOWER({ph})
-                    """,
-                    tuple(list(story_ids) + [username]),
-                )
-                for row in c.fetchall() or []:
-                    story_id = _row_value(row, "story_id", 0)
-                    if story_id is not None:
-                        viewed_ids.add(int(story_id))
+            story_ids = [story["id"] for story in tray["stories"]]
+            if snapshot:
+                viewed_ids = _seen_story_ids(c, username, community_id, story_ids)
+            else:
+                viewed_ids = _query_seen_story_ids(c, username, story_ids)
+            viewer_key = str(username or "").lower()
 
-            reaction_counts, user_reactions = fetch_story_reaction_maps(c, story_ids, username)
             groups_map: Dict[str, Dict[str, Any]] = {}
             stories_payload: List[Dict[str, Any]] = []
-            for row in rows:
-                story_id_raw = _row_value(row, "id", 0)
-                author = _row_value(row, "username", 2)
-                if not story_id_raw or not author:
-                    continue
-                story_id = int(story_id_raw)
-                media_path = _row_value(row, "media_path", 3)
-                text_overlays_raw = _row_value(row, "text_overlays", 13)
-                text_overlays = None
-                if text_overlays_raw:
-                    try:
-                        text_overlays = json.loads(text_overlays_raw) if isinstance(text_overlays_raw, str) else text_overlays_raw
-                    except Exception:
-                        pass
-
-                has_viewed = story_id in viewed_ids
-                story_payload = {
-                    "id": story_id,
-                    "community_id": community_id,
-                    "username": author,
-                    "media_type": _row_value(row, "media_type", 4) or "image",
-                    "media_path": media_path,
-                    "media_url": _public_url(media_path),
-                    "caption": _row_value(row, "caption", 5),
-                    "duration_seconds": _row_value(row, "duration_seconds", 6),
-                    "created_at": _coerce_timestamp(_row_value(row, "created_at", 8)),
-                    "expires_at": _coerce_timestamp(_row_value(row, "expires_at", 9)),
-                    "view_count": int(_row_value(row, "view_count", 10, 0) or 0),
-                    "has_viewed": has_viewed,
-                    "profile_picture": _public_url(_row_value(row, "profile_picture", 12)),
-                    "reactions": reaction_counts.get(story_id, {}),
-                    "user_reaction": user_reactions.get(story_id),
-                    "text_overlays": text_overlays,
-                    "story_group_id": _row_value(row, "story_group_id", 14),
-                    "description": _row_value(row, "description", 15),
-                }
+            for story in tray["stories"]:
+                has_viewed = story["id"] in viewed_ids
+                story_payload = {k: v for k, v in story.items() if k != "reactors"}
+                story_payload["has_viewed"] = has_viewed
+                story_payload["user_reaction"] = story["reactors"].get(viewer_key)
                 stories_payload.append(story_payload)
+                author = story["username"]
                 group = groups_map.setdefault(
                     author,
                     {
@@ -505,7 +656,7 @@ def list_community_stories(username: str, community_id: int) -> Tuple[Dict[str,
             groups.sort(key=lambda g: g["stories"][0]["created_at"] if g["stories"] else "", reverse=True)
             return {
                 "success": True,
-                "community": {"id": community_id, "name": community_name},
+                "community": tray["community"],
                 "has_new": any(not story["has_viewed"] for story in stories_payload),
                 "groups": groups,
                 "stories": stories_payload,
@@ -747,6 +898,7 @@ def create_community_story(username: str, form: Any, files: Any) -> Tuple[Dict[s
             error_detail = "; ".join(upload_errors) if upload_errors else "No valid media files were uploaded"
             return {"success": False, "error": error_detail}, 400
         invalidate_community_cache(community_id)
+        invalidate_story_tray(community_id)
         _notify_story_created(username, community_id, created_stories)
         response = {
             "success": True,
@@ -844,6 +996,7 @@ def mark_story_view(username: str, story_id: int) -> Tuple[Dict[str, Any], int]:
                 return {"success": False, "error": "Forbidden"}, 403
             view_count = record_story_view(c, story_id, username)
             conn.commit()
+            _remember_story_seen(username, community_id, story_id)
             return {"success": True, "story_id": story_id, "view_count": view_count}, 200
     except Exception as exc:
         logger.error("Error recording view for story %s: %s", story_id, exc)
@@ -972,6 +1125,7 @@ def delete_story(username: str, story_id: int) -> Tuple[Dict[str, Any], int]:
             c.execute(f"DELETE FROM community_story_comments WHERE story_id = {ph}", (story_id,))
             c.execute(f"DELETE FROM community_stories WHERE id = {ph}", (story_id,))
             conn.commit()
+            invalidate_story_tray(_row_value(row, "community_id", 2))
             return {"success": True, "message": "Story deleted"}, 200
     except Exception as exc:
         logger.error("Error deleting story %s: %s", story_id, exc)
@@ -1017,6 +1171,7 @@ def delete_story_group(username: str, story_group_id: str) -> Tuple[Dict[str, An
                 c.execute(f"DELETE FROM community_story_comments WHERE story_id IN ({placeholders})", tuple(story_ids))
                 c.execute(f"DELETE FROM community_stories WHERE story_group_id = {ph}", (story_group_id,))
             conn.commit()
+            invalidate_story_tray(_row_value(row, "community_id", 2))
             return {"success": True, "message": f"Deleted {len(story_ids)} stories", "deleted_ids": story_ids}, 200
     except Exception as exc:
         logger.error("Error deleting story group %s: %s", story_group_id, exc)
@@ -1087,6 +1242,7 @@ def react_to_story(username: str, story_id: int, reaction: Optional[str]) -> Tup
                     )
                 should_notify_author = True
             conn.commit()
+            invalidate_story_tray(community_id)
             if should_notify_author and story_author and story_author.lower() != username.lower():
                 _notify_story_interaction(
                     story_author,
@@ -0,0 +1,470 @@
+"""Per-user unread post counters for community badges.
+
+The legacy badge query counted every post in the user's communities with a
+``NOT EXISTS`` probe into ``post_views`` wrapped in ``LOWER()``, so its cost
+grew with total community history. This module keeps one row per
+``(username, community_id)`` in ``community_unread_marks``:
+
+* ``seen_through`` — high-water mark: every post by someone else with
+  ``id <= seen_through`` has been seen (or predates the row).
+* ``seen_above`` — compact JSON list of post ids above the mark that were
+  viewed out of order; folded into the mark as the gap below them closes.
+* ``unread_count`` — maintained counter for posts in
+  ``(seen_through, counted_through]`` that are neither authored by the user
+  nor in ``seen_above``.
+* ``counted_through`` — highest post id the counter accounts for.
+
+Counters move on post create (:func:`note_post_created`), post delete
+(:func:`note_post_deleted`, :func:`note_posts_deleted` for account purges) and new views (:func:`note_post_viewed`, called
+from ``post_views.upsert_post_view``). Badge reads
+(:func:`unread_counts_by_community`) are two O(communities) index lookups;
+a create path that skipped the hook only leaves ``counted_through`` behind,
+and the read catches that community up with a primary-key range scan.
+
+Rows are created lazily the first time a user's badge is read, using the
+legacy query once for that community. The table itself comes from schema
+migration 7.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from backend.services.database import USE_MYSQL, get_sql_placeholder
+from backend.services.schema_migrations import schema_is_current
+
+logger = logging.getLogger(__name__)
+
+# Out-of-order views kept above the mark before compaction is attempted on
+# every view; compaction itself is a bounded primary-key range scan.
+SEEN_ABOVE_COMPACT_SCAN = 64
+# Bulk deletes (account purge) above this many posts in one community drop
+# that community's rows instead; the next badge read rebuilds them.
+BULK_DELETE_RESET_THRESHOLD = 50
+
+_table_ready = False
+
+
+def _row_get(row: Any, key: str, idx: int, default: Any = None) -> Any:
+    if row is None:
+        return default
+    if hasattr(row, "keys"):
+        return row.get(key, default) if hasattr(row, "get") else row[key]
+    try:
+        return row[idx]
+    except (IndexError, TypeError):
+        return default
+
+
+def _user_eq(column: str) -> str:
+    """Case-insensitive equality that still uses the column's index.
+
+    MySQL columns use ``_ci`` collations already; SQLite needs ``NOCASE``.
+    """
+    ph = get_sql_placeholder()
+    if USE_MYSQL:
+        return f"{column} = {ph}"
+    return f"{column} = {ph} COLLATE NOCASE"
+
+
+def _user_ne(column: str) -> str:
+    ph = get_sql_placeholder()
+    if USE_MYSQL:
+        return f"{column} <> {ph}"
+    return f"{column} <> {ph} COLLATE NOCASE"
+
+
+def ensure_unread_marks_table(c) -> None:
+    """Create ``community_unread_marks`` (schema migration 7; badge reads until then).
+
+    Never called from the write hooks: with the outbox on, the post create path
+    runs them inside an explicit transaction (``begin_transaction``) that DDL
+    would implicitly commit on MySQL. Before the table exists the hooks fail
+    softly and reads catch up.
+    """
+    global _table_ready
+    if _table_ready or schema_is_current():
+        return
+    if USE_MYSQL:
+        c.execute(
+            """
+            CREATE TABLE IF NOT EXISTS community_unread_marks (
+                username VARCHAR(191) NOT NULL,
+                community_id INT NOT NULL,
+                seen_through BIGINT NOT NULL DEFAULT 0,
+                seen_above TEXT NULL,
+                unread_count INT NOT NULL DEFAULT 0,
+                counted_through BIGINT NOT NULL DEFAULT 0,
+                updated_at DATETIME NOT NULL,
+                PRIMARY KEY (username, community_id),
+                INDEX idx_unread_marks_community (community_id, counted_through)
+            )
+            """
+        )
+    else:
+        c.execute(
+            """
+            CREATE TABLE IF NOT EXISTS community_unread_marks (
+                username TEXT NOT NULL COLLATE NOCASE,
+                community_id INTEGER NOT NULL,
+                seen_through INTEGER NOT NULL DEFAULT 0,
+                seen_above TEXT,
+                unread_count INTEGER NOT NULL DEFAULT 0,
+                counted_through INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (username, community_id)
+            )
+            """
+        )
+        c.execute(
+            "CREATE INDEX IF NOT EXISTS idx_unread_marks_community "
+            "ON community_unread_marks (community_id, counted_through)"
+        )
+    _table_ready = True
+
+
+def _now() -> str:
+    return datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _load_seen(raw: Any) -> Set[int]:
+    if not raw:
+        return set()
+    try:
+        return {int(x) for x in json.loads(raw)}
+    except (TypeError, ValueError):
+        return set()
+
+
+def _dump_seen(seen: Iterable[int]) -> Optional[str]:
+    ids = sorted(seen)
+    return json.dumps(ids, separators=(",", ":")) if ids else None
+
+
+def compact_marks(seen_through: int, seen_above: Set[int], next_ids: List[int]) -> Tuple[int, Set[int]]:
+    """Fold the contiguous run of viewed ids at the bottom of ``seen_above``.
+
+    ``next_ids`` are the ascending ids of other users' posts above
+    ``seen_through``. Also drops stale entries at or below the new mark.
+    """
+    remaining = set(seen_above)
+    for pid in next_ids:
+        if pid not in remaining:
+            break
+        seen_through = pid
+        remaining.discard(pid)
+    return seen_through, {pid for pid in remaining if pid > seen_through}
+
+
+def _is_unread(post_id: int, seen_through: int, seen_above: Set[int]) -> bool:
+    return post_id > seen_through and post_id not in seen_above
+
+
+# ── Lazy initialisation / catch-up ────────────────────────────────────────
+
+
+def _others_posts_above(c, community_id: int, username: str, after_id: int, limit: Optional[int] = None) -> List[Tuple[int, bool]]:
+    """``(post_id, viewed)`` for other users' posts with ``id > after_id``."""
+    ph = get_sql_placeholder()
+    sql = (
+        f"SELECT p.id AS id, "
+        f"EXISTS (SELECT 1 FROM post_views pv WHERE pv.post_id = p.id AND {_user_eq('pv.username')}) AS viewed "
+        f"FROM posts p WHERE p.community_id = {ph} AND p.id > {ph} AND {_user_ne('p.username')} "
+        f"ORDER BY p.id"
+    )
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+    c.execute(sql, (username, community_id, after_id, username))
+    out: List[Tuple[int, bool]] = []
+    for row in c.fetchall() or []:
+        out.append((int(_row_get(row, "id", 0)), bool(_row_get(row, "viewed", 1))))
+    return out
+
+
+def _initial_marks(c, community_id: int, username: str, max_id: int) -> Dict[str, Any]:
+    """Build a row for a user seen for the first time (legacy cost, once)."""
+    posts = _others_posts_above(c, community_id, username, 0)
+    unread = [pid for pid, viewed in posts if not viewed]
+    seen_through = (min(unread) - 1) if unread else max_id
+    seen_above = {pid for pid, viewed in posts if viewed and pid > seen_through}
+    return {
+        "seen_through": seen_through,
+        "seen_above": seen_above,
+        "unread_count": len(unread),
+        "counted_through": max_id,
+    }
+
+
+def _catch_up(c, community_id: int, username: str, marks: Dict[str, Any], max_id: int) -> Dict[str, Any]:
+    """Count posts that landed after ``counted_through`` without a create hook."""
+    added = 0
+    seen_above = marks["seen_above"]
+    for pid, viewed in _others_posts_above(c, community_id, username, marks["counted_through"]):
+        if viewed:
+            seen_above.add(pid)
+        else:
+            added += 1
+    marks["unread_count"] += added
+    marks["counted_through"] = max_id
+    return marks
+
+
+def _save_marks(
+    c,
+    community_id: int,
+    username: str,
+    marks: Dict[str, Any],
+    *,
+    insert: bool,
+    expect_counted_through: Optional[int] = None,
+) -> None:
+    """Read-path write of a whole row.
+
+    Updates are conditional on ``counted_through`` still matching what was
+    read, so a create hook that ran in between is never overwritten; the
+    next read simply catches up again.
+    """
+    ph = get_sql_placeholder()
+    params = (
+        marks["seen_through"],
+        _dump_seen(marks["seen_above"]),
+        max(0, int(marks["unread_count"])),
+        marks["counted_through"],
+        _now(),
+    )
+    if insert:
+        verb = "INSERT IGNORE" if USE_MYSQL else "INSERT OR IGNORE"
+        c.execute(
+            f"""
+            {verb} INTO community_unread_marks
+                (seen_through, seen_above, unread_count, counted_through, updated_at, username, community_id)
+            VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})
+            """,
+            params + (username, community_id),
+        )
+    else:
+        c.execute(
+            f"""
+            UPDATE community_unread_marks
+            SET seen_through = {ph}, seen_above = {ph}, unread_count = {ph},
+                counted_through = {ph}, updated_at = {ph}
+            WHERE {_user_eq('username')} AND community_id = {ph} AND counted_through = {ph}
+            """,
+            params + (username, community_id, expect_counted_through),
+        )
+
+
+def _save_seen(c, community_id: int, username: str, seen_through: int, seen_above: Set[int], decrement: int) -> None:
+    """Hook-side write: mark fields plus an atomic counter decrement.
+
+    Leaves ``counted_through`` alone so a concurrent create hook is not lost.
+    """
+    ph = get_sql_placeholder()
+    c.execute(
+        f"""
+        UPDATE community_unread_marks
+        SET seen_through = {ph}, seen_above = {ph},
+            unread_count = CASE WHEN unread_count > {ph} THEN unread_count - {ph} ELSE 0 END,
+            updated_at = {ph}
+        WHERE {_user_eq('username')} AND community_id = {ph}
+        """,
+        (seen_through, _dump_seen(seen_above), decrement, decrement, _now(), username, community_id),
+    )
+
+
+def unread_counts_by_community(c, community_ids: List[int], username: str) -> Dict[int, int]:
+    """Unread counts keyed by community id (only communities with unread > 0)."""
+    if not username or not community_ids:
+        return {}
+    ensure_unread_marks_table(c)
+    ph = get_sql_placeholder()
+    placeholders = ",".join([ph] * len(community_ids))
+
+    c.execute(
+        f"""
+        SELECT community_id, seen_through, seen_above, unread_count, counted_through
+        FROM community_unread_marks
+        WHERE {_user_eq('username')} AND community_id IN ({placeholders})
+        """,
+        (username,) + tuple(community_ids),
+    )
+    marks_by_cid: Dict[int, Dict[str, Any]] = {}
+    for row in c.fetchall() or []:
+        marks_by_cid[int(_row_get(row, "community_id", 0))] = {
+            "seen_through": int(_row_get(row, "seen_through", 1) or 0),
+            "seen_above": _load_seen(_row_get(row, "seen_above", 2)),
+            "unread_count": int(_row_get(row, "unread_count", 3) or 0),
+            "counted_through": int(_row_get(row, "counted_through", 4) or 0),
+        }
+
+    c.execute(
+        f"""
+        SELECT community_id, MAX(id) AS max_id
+        FROM posts
+        WHERE community_id IN ({placeholders})
+        GROUP BY community_id
+        """,
+        tuple(community_ids),
+    )
+    max_by_cid = {
+        int(_row_get(row, "community_id", 0)): int(_row_get(row, "max_id", 1) or 0)
+        for row in c.fetchall() or []
+    }
+
+    out: Dict[int, int] = {}
+    for cid in community_ids:
+        max_id = max_by_cid.get(cid, 0)
+        marks = marks_by_cid.get(cid)
+        try:
+            if marks is None:
+                marks = _initial_marks(c, cid, username, max_id)
+                _save_marks(c, cid, username, marks, insert=True)
+            elif max_id > marks["counted_through"]:
+                previous = marks["counted_through"]
+                marks = _catch_up(c, cid, username, marks, max_id)
+                _save_marks(c, cid, username, marks, insert=False, expect_counted_through=previous)
+        except Exception as exc:
+            logger.warning("unread marks refresh failed for %s/%s: %s", username, cid, exc)
+            if marks is None:
+                continue
+        if marks["unread_count"] > 0:
+            out[cid] = int(marks["unread_count"])
+    return out
+
+
+# ── Write hooks ───────────────────────────────────────────────────────────
+
+
+def note_post_created(c, community_id: Optional[int], post_id: Optional[int], author: str) -> None:
+    """Bump every up-to-date counter in the community for a new post.
+
+    Rows whose ``counted_through`` is behind the previous newest post were
+    missed by an earlier create path; they are left for the read-time
+    catch-up rather than skipping a post here.
+    """
+    if not community_id or not post_id:
+        return
+    ph = get_sql_placeholder()
+    try:
+        c.execute(
+            f"SELECT MAX(id) AS max_id FROM posts WHERE community_id = {ph} AND id < {ph}",
+            (community_id, post_id),
+        )
+        prev_max = int(_row_get(c.fetchone(), "max_id", 0) or 0)
+        author_eq = "username = " + ph + ("" if USE_MYSQL else " COLLATE NOCASE")
+        c.execute(
+            f"""
+            UPDATE community_unread_marks
+            SET unread_count = unread_count + CASE WHEN {author_eq} THEN 0 ELSE 1 END,
+                counted_through = {ph}, updated_at = {ph}
+            WHERE community_id = {ph} AND counted_through >= {ph} AND counted_through < {ph}
+            """,
+            (author, post_id, _now(), community_id, prev_max, post_id),
+        )
+    except Exception as exc:
+        logger.warning("unread marks create hook failed for post %s: %s", post_id, exc)
+
+
+def note_post_deleted(c, community_id: Optional[int], post_id: Optional[int], author: str) -> None:
+    """Decrement counters of users for whom the deleted post was still unread."""
+    if not community_id or not post_id:
+        return
+    ph = get_sql_placeholder()
+    try:
+        c.execute(
+            f"""
+            SELECT username, seen_through, seen_above
+            FROM community_unread_marks
+            WHERE community_id = {ph} AND counted_through >= {ph} AND seen_through < {ph}
+              AND {_user_ne('username')}
+            """,
+            (community_id, post_id, post_id, author),
+        )
+        rows = c.fetchall() or []
+        for row in rows:
+            seen_above = _load_seen(_row_get(row, "seen_above", 2))
+            decrement = 0 if post_id in seen_above else 1
+            seen_above.discard(post_id)
+            _save_seen(
+                c,
+                community_id,
+                _row_get(row, "username", 0),
+                int(_row_get(row, "seen_through", 1) or 0),
+                seen_above,
+                decrement,
+            )
+    except Exception as exc:
+        logger.warning("unread marks delete hook failed for post %s: %s", post_id, exc)
+
+
+def note_posts_deleted(c, posts: Iterable[Tuple[int, int]], author: str) -> None:
+    """Bulk form of :func:`note_post_deleted` for ``(community_id, post_id)`` pairs.
+
+    Call before the rows are deleted. Communities losing more than
+    ``BULK_DELETE_RESET_THRESHOLD`` posts have their rows dropped instead.
+    """
+    by_community: Dict[int, List[int]] = {}
+    for community_id, post_id in posts:
+        if community_id and post_id:
+            by_community.setdefault(int(community_id), []).append(int(post_id))
+    ph = get_sql_placeholder()
+    for community_id, post_ids in by_community.items():
+        if len(post_ids) > BULK_DELETE_RESET_THRESHOLD:
+            try:
+                c.execute(f"DELETE FROM community_unread_marks WHERE community_id = {ph}", (community_id,))
+            except Exception as exc:
+                logger.warning("unread marks reset failed for community %s: %s", community_id, exc)
+            continue
+        for post_id in post_ids:
+            note_post_deleted(c, community_id, post_id, author)
+
+
+def note_post_viewed(c, post_id: int, username: str) -> None:
+    """First view of ``post_id`` by ``username``: advance their marks."""
+    if not username or not post_id:
+        return
+    ph = get_sql_placeholder()
+    try:
+        c.execute(f"SELECT community_id, username FROM posts WHERE id = {ph}", (post_id,))
+        post = c.fetchone()
+        community_id = _row_get(post, "community_id", 0)
+        author = _row_get(post, "username", 1) or ""
+        if not community_id or author.lower() == username.lower():
+            return
+        c.execute(
+            f"""
+            SELECT seen_through, seen_above, counted_through
+            FROM community_unread_marks
+            WHERE {_user_eq('username')} AND community_id = {ph}
+            """,
+            (username, community_id),
+        )
+        row = c.fetchone()
+        if not row:
+            return
+        seen_through = int(_row_get(row, "seen_through", 0) or 0)
+        seen_above = _load_seen(_row_get(row, "seen_above", 1))
+        # Posts above counted_through are picked up (as viewed) by the
+        # read-time catch-up; nothing to do until then.
+        if post_id > int(_row_get(row, "counted_through", 2) or 0):
+            return
+        if not _is_unread(post_id, seen_through, seen_above):
+            return
+        seen_above.add(post_id)
+        next_ids = [
+            pid
+            for pid, _ in _others_posts_above(
+                c,
+                community_id,
+                username,
+                seen_through,
+                limit=min(len(seen_above), SEEN_ABOVE_COMPACT_SCAN) + 1,
+            )
+        ]
+        seen_through, seen_above = compact_marks(seen_through, seen_above, next_ids)
+        _save_seen(c, community_id, username, seen_through, seen_above, 1)
+    except Exception as exc:
+        logger.warning("unread marks view hook failed for %s/%s: %s", username, post_id, exc)
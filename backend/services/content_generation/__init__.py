@@ -1,6 +1,6 @@
 """Steve content generation package."""
 
-from backend.services.content_generation.registry import execute_job, get_descriptor, list_ideas
+from backend.services.content_generation.registry import execute_job, get_descriptor, list_ideas, process_due_job
 from backend.services.content_generation.storage import (
     create_job,
     delete_all_jobs,
@@ -36,6 +36,7 @@ __all__ = [
     "list_ideas",
     "list_jobs",
     "list_runs",
+    "process_due_job",
     "update_job",
     "update_job_next_run",
 ]
@@ -9,7 +9,10 @@ from urllib.parse import urlparse
 
 from redis_cache import cache, invalidate_community_cache, invalidate_message_cache
 
+from backend.services import presence
 from backend.services.database import USE_MYSQL, get_db_connection, get_sql_placeholder
+from backend.services.dm_thread_summary import record_dm_message
+from backend.services.feature_flags import cache_presence_enabled
 from backend.services.firestore_writes import write_dm_message, write_post
 from backend.services.notifications import fanout_community_post_notifications
 
@@ -84,31 +87,34 @@ def _notify_steve_dm_recipient_push(
                 logger.warning("Steve DM notification insert failed: %s", notif_e)
 
         should_push = True
-        try:
-            with get_db_connection() as conn2:
-                c2 = conn2.cursor()
-                if USE_MYSQL:
-                    c2.execute(
-                        """
-                        SELECT 1 FROM active_chat_status
-                        WHERE user=%s AND peer=%s AND updated_at > DATE_SUB(NOW(), INTERVAL 20 SECOND)
-                        LIMIT 1
-                        """,
-                        (receiver, "steve"),
-                    )
-                else:
-                    c2.execute(
-                        """
-                        SELECT 1 FROM active_chat_status
-                        WHERE user=? AND peer=? AND datetime(updated_at) > datetime('now','-20 seconds')
-                        LIMIT 1
-                        """,
-                        (receiver, "steve"),
-                    )
-                if c2.fetchone():
-                    should_push = False
-        except Exception as pe:
-            logger.warning("active_chat_status for Steve DM push failed: %s", pe)
+        if cache_presence_enabled():
+            should_push = not presence.is_viewing_dm(receiver, "steve")
+        else:
+            try:
+                with get_db_connection() as conn2:
+                    c2 = conn2.cursor()
+                    if USE_MYSQL:
+                        c2.execute(
+                            """
+                            SELECT 1 FROM active_chat_status
+                            WHERE user=%s AND peer=%s AND updated_at > DATE_SUB(NOW(), INTERVAL 20 SECOND)
+                            LIMIT 1
+                            """,
+                            (receiver, "steve"),
+                        )
+                    else:
+                        c2.execute(
+                            """
+                            SELECT 1 FROM active_chat_status
+                            WHERE user=? AND peer=? AND datetime(updated_at) > datetime('now','-20 seconds')
+                            LIMIT 1
+                            """,
+                            (receiver, "steve"),
+                        )
+                    if c2.fetchone():
+                        should_push = False
+            except Exception as pe:
+                logger.warning("active_chat_status for Steve DM push failed: %s", pe)
 
         if should_push:
             try:
@@ -288,6 +294,7 @@ def send_steve_dm(
                 ("steve", receiver, content, timestamp_str),
             )
         message_id = c.lastrowid
+        record_dm_message(c, sender="steve", receiver=receiver, message_id=message_id)
         try:
             conn.commit()
         except Exception:
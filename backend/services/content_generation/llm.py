@@ -11,7 +11,12 @@ from contextlib import contextmanager
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
 from urllib.parse import urlparse
 
-from openai import OpenAI
+from backend.services.llm_clients import (
+    PROVIDER_ANTHROPIC,
+    PROVIDER_OPENAI,
+    PROVIDER_XAI,
+    get_llm_client,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -195,10 +200,10 @@ OPINION_PUBLIC_DOMAINS = {
 } | set(_EXPANDED_ROUNDUP_DOMAINS)
 
 
-def _require_client() -> OpenAI:
+def _require_client() -> Any:
     if not XAI_API_KEY:
         raise RuntimeError("XAI_API_KEY is not configured")
-    return OpenAI(api_key=XAI_API_KEY, base_url="https://api.x.ai/v1")
+    return get_llm_client(PROVIDER_XAI, api_key=XAI_API_KEY)
 
 
 def _is_openai_model(model: str) -> bool:
@@ -437,7 +442,7 @@ def web_search_json(system_prompt: str, user_prompt: str, *, max_output_tokens:
     grounding. Best-effort: returns {} if the key/tool/model is unavailable."""
     if not OPENAI_API_KEY:
         raise RuntimeError("OPENAI_API_KEY is not configured")
-    oai = OpenAI(api_key=OPENAI_API_KEY)
+    oai = get_llm_client(PROVIDER_OPENAI, api_key=OPENAI_API_KEY)
     base = dict(
         model=_RESEARCH_MODEL,
         input=[
@@ -504,8 +509,7 @@ def vision_json(
     gracefully."""
     if not ANTHROPIC_API_KEY:
         raise RuntimeError("ANTHROPIC_API_KEY is not configured")
-    import anthropic
-    aclient = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+    aclient = get_llm_client(PROVIDER_ANTHROPIC, api_key=ANTHROPIC_API_KEY)
     images = [image_b64_png] if isinstance(image_b64_png, str) else list(image_b64_png)
     content: List[Dict[str, Any]] = [
         {"type": "image", "source": {"type": "base64",
@@ -564,8 +568,7 @@ def generate_text(
         # header/body (not typed SDK params) so any anthropic>=0.40 works.
         if not ANTHROPIC_API_KEY:
             raise RuntimeError("ANTHROPIC_API_KEY is not configured")
-        import anthropic
-        aclient = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+        aclient = get_llm_client(PROVIDER_ANTHROPIC, api_key=ANTHROPIC_API_KEY)
         extra: Dict[str, Any] = {}
         if mdl.startswith(("claude-fable", "claude-mythos")):
             extra = {
@@ -595,7 +598,7 @@ def generate_text(
         # max_tokens and a non-default temperature, so we omit temperature.
         if not OPENAI_API_KEY:
             raise RuntimeError("OPENAI_API_KEY is not configured")
-        oai = OpenAI(api_key=OPENAI_API_KEY)
+        oai = get_llm_client(PROVIDER_OPENAI, api_key=OPENAI_API_KEY)
         response = oai.responses.create(
             model=mdl,
             input=messages,
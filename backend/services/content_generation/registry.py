@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import logging
 from typing import Any, Callable, Dict, List, Optional
 
 from backend.services.content_generation.delivery import create_steve_feed_post, send_steve_dm
-from backend.services.content_generation.storage import create_run, finish_run
+from backend.services.content_generation.storage import create_run, finish_run, update_job_next_run
 from backend.services.content_generation.types import IdeaDescriptor, IdeaExecutionResult
 
 from .ideas.daily_motivation_dm import DESCRIPTOR as DAILY_MOTIVATION_DESCRIPTOR, execute as execute_daily_motivation
@@ -13,6 +14,8 @@ from .ideas.member_compliment_feed import DESCRIPTOR as COMPLIMENT_DESCRIPTOR, e
 from .ideas.news_roundup import DESCRIPTOR as NEWS_DESCRIPTOR, execute as execute_news_roundup
 from .ideas.opinion_roundup import DESCRIPTOR as OPINION_DESCRIPTOR, execute as execute_opinion_roundup
 
+logger = logging.getLogger(__name__)
+
 
 IDEAS: Dict[str, Dict[str, Any]] = {
     NEWS_DESCRIPTOR.idea_id: {"descriptor": NEWS_DESCRIPTOR, "execute": execute_news_roundup},
@@ -110,3 +113,32 @@ def execute_job(job: Dict[str, Any], *, triggered_by_username: str) -> Dict[str,
         )
         raise
 
+
+def process_due_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a due job as ``system-cron`` and advance its schedule (queue path).
+
+    Mirrors the legacy loop in the content-generation cron route: the
+    schedule is advanced on failure too. Leaving next_run_at untouched
+    keeps the job "due" forever, so the cron re-executes it every cycle — a
+    weekly web-search job became a 10-minute job and burned ~4.6k paid grok
+    calls before exhausting the xAI credits (July 2026). A failed weekly run
+    waits for its next scheduled slot instead. Re-raises the run error.
+    """
+    cadence = str((job.get("schedule") or {}).get("cadence") or "").strip().lower()
+    try:
+        result = execute_job(job, triggered_by_username="system-cron")
+    except Exception:
+        try:
+            update_job_next_run(job["id"], cadence)
+        except Exception as adv_err:
+            logger.error("Could not advance schedule for failed job %s: %s", job.get("id"), adv_err)
+        raise
+    update_job_next_run(job["id"], cadence)
+    logger.info(
+        "Processed due job %s (%s): run_id=%s output_post_id=%s",
+        job.get("id"),
+        cadence,
+        result.get("run_id"),
+        result.get("output_post_id"),
+    )
+    return result
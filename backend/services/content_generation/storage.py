@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import logging
 from datetime import datetime
 from typing import Any, Dict, Iterable, List, Optional
 
@@ -13,6 +14,8 @@ from backend.services.content_generation.job_schedule import (
 )
 from backend.services.database import USE_MYSQL, db_backend_is_mysql, get_db_connection
 
+logger = logging.getLogger(__name__)
+
 
 def _utc_now_str() -> str:
     return datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
@@ -320,6 +323,7 @@ def create_job(
     job = get_job(job_id)
     if not job:
         raise RuntimeError("Failed to create content generation job")
+    _schedule_job_run(job)
     return job
 
 
@@ -379,7 +383,10 @@ def update_job(job_id: int, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]
             conn.commit()
         except Exception:
             pass
-    return get_job(job_id)
+    job = get_job(job_id)
+    if "next_run_at" in updates or "status" in updates:
+        _schedule_job_run(job)
+    return job
 
 
 def list_jobs(*, community_id: Optional[int] = None, include_all: bool = False) -> List[Dict[str, Any]]:
@@ -676,4 +683,15 @@ def update_job_next_run(job_id: int, cadence: str) -> None:
             conn.commit()
         except Exception:
             pass
+    _schedule_job_run({**job, "next_run_at": next_run})
+
+
+def _schedule_job_run(job: Optional[Dict[str, Any]]) -> None:
+    """Queue the job's next run in ``scheduled_work`` (no-op while the queue is off)."""
+    try:
+        from backend.services.scheduled_work import schedule_content_job
+
+        schedule_content_job(job)
+    except Exception as exc:
+        logger.warning("content job %s schedule enqueue failed: %s", (job or {}).get("id"), exc)
 
@@ -31,6 +31,18 @@ def get_sql_placeholder() -> str:
     return "%s" if USE_MYSQL else "?"
 
 
+def begin_transaction(conn) -> None:
+    """Start an explicit transaction on ``conn``; it ends at ``commit()``.
+
+    MySQL connections are opened with ``autocommit=True``, so without this each
+    statement commits on its own. Closing the connection before ``commit()``
+    rolls the transaction back. SQLite already opens a transaction at the
+    first write, so this is a no-op there.
+    """
+    if USE_MYSQL:
+        conn.begin()
+
+
 def _load_sqlite_bootstrap() -> Optional[Callable[[], None]]:
     try:
         from bodybuilding_app import ensure_database_exists  # type: ignore
@@ -6,7 +6,9 @@ import logging
 from datetime import datetime
 from typing import Tuple
 
+from backend.services import presence
 from backend.services.database import USE_MYSQL, get_db_connection
+from backend.services.feature_flags import cache_presence_enabled
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +17,9 @@ def record_active_chat(username: str, *, peer: str) -> Tuple[dict, int]:
     """Record that the current user is actively viewing a chat with peer."""
     if not peer:
         return {"success": False, "error": "peer required"}, 400
+    if cache_presence_enabled():
+        presence.touch_dm_presence(username, peer)
+        return {"success": True}, 200
     try:
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         with get_db_connection() as conn:
@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 from typing import Any, Tuple
 
+from backend.services.chat_recent_window import patch_dm_window_message
 from backend.services.database import get_db_connection, get_sql_placeholder
 
 logger = logging.getLogger(__name__)
@@ -25,11 +26,12 @@ def update_dm_audio_summary(
         ph = get_sql_placeholder()
         with get_db_connection() as conn:
             c = conn.cursor()
-            c.execute(f"SELECT sender FROM messages WHERE id = {ph}", (message_id,))
+            c.execute(f"SELECT sender, receiver FROM messages WHERE id = {ph}", (message_id,))
             row = c.fetchone()
             if not row:
                 return {"success": False, "error": "Message not found"}, 404
             sender = row["sender"] if hasattr(row, "keys") else row[0]
+            receiver = row["receiver"] if hasattr(row, "keys") else row[1]
             if sender != username:
                 return {"success": False, "error": "You can only edit your own summaries"}, 403
             c.execute(
@@ -37,7 +39,8 @@ def update_dm_audio_summary(
                 (new_summary, message_id),
             )
             conn.commit()
-            return {"success": True, "summary": new_summary}, 200
+        patch_dm_window_message(sender, receiver, int(message_id), audio_summary=new_summary)
+        return {"success": True, "summary": new_summary}, 200
     except Exception as e:
         logger.error("update_dm_audio_summary error: %s", e)
         return {"success": False, "error": "Failed to update summary"}, 500
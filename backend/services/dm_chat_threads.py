@@ -14,8 +14,11 @@ from backend.services.dm_chats_tables import ensure_archived_chats_table
 from backend.services.dm_human_thread import (
     dm_last_message_where_clause,
     ensure_human_dm_thread_column,
+    human_pair_thread_key,
     is_private_steve_dm_peer,
 )
+from backend.services.dm_thread_summary import load_dm_thread_list
+from backend.services.feature_flags import dm_threads_summary_reads_enabled
 from backend.services.profile_pictures import CaseInsensitiveUserMap
 from redis_cache import CHAT_THREADS_TTL, cache
 
@@ -224,6 +227,113 @@ def _batch_thread_stats(
     return last_by_peer, unread_by_peer
 
 
+def _load_blocked_set(c, ph: str, username: str) -> set[str]:
+    """Usernames the viewer blocked or was blocked by (hidden from the list)."""
+    try:
+        c.execute(
+            f"""
+            SELECT blocked_username FROM blocked_users WHERE blocker_username = {ph}
+            UNION
+            SELECT blocker_username FROM blocked_users WHERE blocked_username = {ph}
+            """,
+            (username, username),
+        )
+        return set(r["blocked_username"] if hasattr(r, "keys") else r[0] for r in c.fetchall())
+    except Exception as blocked_err:
+        logger.warning("Could not get blocked users for chat threads: %s", blocked_err)
+        return set()
+
+
+def _load_profile_map(c, ph: str, usernames: list[str]) -> CaseInsensitiveUserMap:
+    """Display name + avatar per counterpart in one query.
+
+    Case-insensitive map: messages store the session spelling, which can differ
+    from user_profiles.username.
+    """
+    profile_map = CaseInsensitiveUserMap()
+    if not usernames:
+        return profile_map
+    try:
+        placeholders = ",".join([ph] * len(usernames))
+        c.execute(
+            f"SELECT username, display_name, profile_picture FROM user_profiles WHERE username IN ({placeholders})",
+            tuple(usernames),
+        )
+        for profile_row in c.fetchall():
+            profile_username = profile_row["username"] if hasattr(profile_row, "keys") else profile_row[0]
+            display_name = profile_row["display_name"] if hasattr(profile_row, "keys") else profile_row[1]
+            profile_picture_rel = profile_row["profile_picture"] if hasattr(profile_row, "keys") else profile_row[2]
+            pic_url = None
+            if profile_picture_rel:
+                pr = str(profile_picture_rel).strip()
+                if pr.startswith("http://") or pr.startswith("https://"):
+                    pic_url = pr
+                else:
+                    pic_url = url_for("static", filename=pr)
+            profile_map.set(profile_username, {
+                "display_name": display_name,
+                "profile_picture_url": pic_url,
+            })
+    except Exception as profile_err:
+        logger.warning("Could not batch fetch chat thread profiles: %s", profile_err)
+    return profile_map
+
+
+def _threads_from_summary(username: str) -> list[dict]:
+    """Thread list from the maintained ``dm_threads`` summary (one range read).
+
+    Same payload shape and skip rules as the legacy scan: blocked peers are
+    hidden, the private Steve thread needs a visible row, and a cleared thread
+    with nothing newer shows its clear time as activity.
+    """
+    ph = get_sql_placeholder()
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        rows = load_dm_thread_list(c, username)
+        if not rows:
+            return []
+        blocked_set = _load_blocked_set(c, ph, username)
+        rows = [r for r in rows if r.get("peer") and r["peer"] not in blocked_set]
+        profile_map = _load_profile_map(c, ph, [r["peer"] for r in rows])
+
+    threads: list[dict] = []
+    for r in rows:
+        other_username = r["peer"]
+        has_last = r.get("last_message_id") and r.get("timestamp") is not None
+        if is_private_steve_dm_peer(other_username) and not has_last:
+            continue
+        last_message_text = None
+        last_activity_time = None
+        last_sender = None
+        if has_last:
+            last_activity_time = r.get("timestamp")
+            last_sender = r.get("sender")
+            preview = preview_from_message_row(r)
+            last_message_text = preview or None
+            if bool(r.get("is_encrypted")) and not preview:
+                last_message_text = "Encrypted message"
+        cleared_at = r.get("cleared_at")
+        if cleared_at and not last_activity_time:
+            da = _ts_norm(cleared_at)
+            last_activity_time = da[:10] + "T" + da[11:19] + "Z" if len(da) >= 19 else da
+
+        profile = profile_map.get(other_username) or {}
+        threads.append(
+            {
+                "other_username": other_username,
+                "display_name": profile.get("display_name") or other_username,
+                "profile_picture_url": profile.get("profile_picture_url"),
+                "last_message_text": last_message_text,
+                "last_activity_time": _normalize_last_activity_time(last_activity_time),
+                "last_sender": last_sender,
+                "unread_count": int(r.get("unread_count") or 0),
+                "muted": bool(r.get("muted")),
+            }
+        )
+    threads.sort(key=lambda t: (t.get("last_activity_time") or ""), reverse=True)
+    return threads
+
+
 def build_chat_threads_payload(username: str) -> dict:
     """
     Return { success, threads } or { success, error }.
@@ -235,6 +345,18 @@ def build_chat_threads_payload(username: str) -> dict:
         logger.debug("Cache hit: chat_threads for %s", username)
         return {"success": True, "threads": cached_threads}
 
+    if dm_threads_summary_reads_enabled():
+        try:
+            threads = _threads_from_summary(username)
+            cache.set(cache_key, threads, CHAT_THREADS_TTL)
+            return {"success": True, "threads": threads}
+        except Exception as summary_err:
+            logger.warning(
+                "chat_threads summary read failed for %s; using message scan: %s",
+                username,
+                summary_err,
+            )
+
     ph = get_sql_placeholder()
 
     try:
@@ -285,53 +407,13 @@ def build_chat_threads_payload(username: str) -> dict:
             )
             counterpart_rows = c.fetchall()
 
-            blocked_set: set[str] = set()
-            try:
-                c.execute(
-                    f"""
-                    SELECT blocked_username FROM blocked_users WHERE blocker_username = {ph}
-                    UNION
-                    SELECT blocker_username FROM blocked_users WHERE blocked_username = {ph}
-                    """,
-                    (username, username),
-                )
-                blocked_set = set(
-                    r["blocked_username"] if hasattr(r, "keys") else r[0] for r in c.fetchall()
-                )
-            except Exception as blocked_err:
-                logger.warning("Could not get blocked users for chat threads: %s", blocked_err)
+            blocked_set = _load_blocked_set(c, ph, username)
 
             counterpart_usernames = [
                 row["other_username"] if isinstance(row, dict) or hasattr(row, "keys") else row[0]
                 for row in counterpart_rows
             ]
-            # Case-insensitive map: messages store the session spelling, which
-            # can differ from user_profiles.username.
-            profile_map = CaseInsensitiveUserMap()
-            if counterpart_usernames:
-                try:
-                    placeholders = ",".join([ph] * len(counterpart_usernames))
-                    c.execute(
-                        f"SELECT username, display_name, profile_picture FROM user_profiles WHERE username IN ({placeholders})",
-                        tuple(counterpart_usernames),
-                    )
-                    for profile_row in c.fetchall():
-                        profile_username = profile_row["username"] if hasattr(profile_row, "keys") else profile_row[0]
-                        display_name = profile_row["display_name"] if hasattr(profile_row, "keys") else profile_row[1]
-                        profile_picture_rel = profile_row["profile_picture"] if hasattr(profile_row, "keys") else profile_row[2]
-                        pic_url = None
-                        if profile_picture_rel:
-                            pr = str(profile_picture_rel).strip()
-                            if pr.startswith("http://") or pr.startswith("https://"):
-                                pic_url = pr
-                            else:
-                                pic_url = url_for("static", filename=pr)
-                        profile_map.set(profile_username, {
-                            "display_name": display_name,
-                            "profile_picture_url": pic_url,
-                        })
-                except Exception as profile_err:
-                    logger.warning("Could not batch fetch chat thread profiles: %s", profile_err)
+            profile_map = _load_profile_map(c, ph, counterpart_usernames)
 
             # Batched last-message + unread stats (2N+1 queries → 3). Any failure
             # falls back to the legacy per-thread queries below.
@@ -118,3 +118,59 @@ def ensure_fulltext_search_indexes(cursor) -> None:
             logger.warning(
                 "Could not ensure FULLTEXT index %s on %s: %s", idx_name, table, e
             )
+
+
+_DM_THREADS_TABLE_READY = False
+
+
+def ensure_dm_threads_table(cursor) -> None:
+    """Create the denormalized ``dm_threads`` summary table (one row per viewer × peer).
+
+    Process-level memo: the probe runs once per worker, not on every send.
+    """
+    global _DM_THREADS_TABLE_READY  # pylint: disable=global-statement
+    if _DM_THREADS_TABLE_READY:
+        return
+    try:
+        if USE_MYSQL:
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS dm_threads (
+                    username VARCHAR(191) NOT NULL,
+                    peer VARCHAR(191) NOT NULL,
+                    last_message_id INT NULL,
+                    last_activity DATETIME NULL,
+                    unread_count INT NOT NULL DEFAULT 0,
+                    cleared_at DATETIME NULL,
+                    archived TINYINT(1) NOT NULL DEFAULT 0,
+                    muted TINYINT(1) NOT NULL DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                    PRIMARY KEY (username, peer),
+                    INDEX idx_dm_threads_list (username, archived, last_activity)
+                )
+                """
+            )
+        else:
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS dm_threads (
+                    username TEXT NOT NULL,
+                    peer TEXT NOT NULL,
+                    last_message_id INTEGER NULL,
+                    last_activity TEXT NULL,
+                    unread_count INTEGER NOT NULL DEFAULT 0,
+                    cleared_at TEXT NULL,
+                    archived INTEGER NOT NULL DEFAULT 0,
+                    muted INTEGER NOT NULL DEFAULT 0,
+                    updated_at TEXT DEFAULT (datetime('now')),
+                    PRIMARY KEY (username, peer)
+                )
+                """
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_dm_threads_list "
+                "ON dm_threads(username, archived, last_activity)"
+            )
+        _DM_THREADS_TABLE_READY = True
+    except Exception as e:
+        logger.warning("Could not create dm_threads table: %s", e)
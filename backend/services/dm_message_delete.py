@@ -5,7 +5,9 @@ from __future__ import annotations
 import logging
 from typing import Any, Tuple
 
+from backend.services.chat_recent_window import remove_dm_window_message
 from backend.services.database import get_db_connection, get_sql_placeholder
+from backend.services.dm_thread_summary import refresh_dm_thread_pair
 from backend.services.message_media_utils import parse_media_paths, purge_media_file
 
 logger = logging.getLogger(__name__)
@@ -42,7 +44,9 @@ def delete_dm_message(
             media_raw = row["media_paths"] if hasattr(row, "keys") else row[5]
             media_paths = list(dict.fromkeys(parse_media_paths(media_raw) + [p for p in (image_path, video_path, audio_path) if p]))
             c.execute(f"DELETE FROM messages WHERE id={ph}", (message_id,))
+            refresh_dm_thread_pair(c, sender, receiver)
             conn.commit()
+            remove_dm_window_message(sender, receiver, int(message_id))
             for media_path in media_paths:
                 purge_media_file(media_path)
 
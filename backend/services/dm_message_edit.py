@@ -89,7 +89,7 @@ def edit_dm_message(
             conn.commit()
 
         try:
-            invalidate_message_cache(username, receiver)
+            invalidate_message_cache(username, receiver, message_ids=[message_id])
         except Exception:
             pass
         try:
@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 from typing import Any, Optional, Tuple
 
+from backend.services.chat_recent_window import sync_dm_window
 from backend.services.database import get_db_connection, get_sql_placeholder
 from backend.services.notifications import (
     create_notification,
@@ -74,6 +75,7 @@ def apply_dm_message_reaction(
                     (message_id, username),
                 )
             conn.commit()
+            sync_dm_window(sender, receiver, message_ids=[int(message_id)])
 
             try:
                 from backend.services.firestore_writes import write_dm_reaction
@@ -6,6 +6,8 @@ import json
 import logging
 
 from backend.services.database import USE_MYSQL, get_db_connection, get_sql_placeholder
+from backend.services.dm_thread_summary import record_dm_read
+from backend.services.feature_flags import chat_recent_window_enabled
 from redis_cache import cache, invalidate_message_cache
 
 logger = logging.getLogger(__name__)
@@ -15,6 +17,33 @@ def _payload(data: dict) -> dict:
     return data
 
 
+def _mark_dm_thread_read(username: str, peer_username: str) -> None:
+    """Mark the peer's messages read and refresh the badge (window-served polls)."""
+    try:
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            c.execute(
+                "UPDATE messages SET is_read=1 WHERE sender=? AND receiver=? AND is_read=0",
+                (peer_username, username),
+            )
+            marked_read = c.rowcount or 0
+            record_dm_read(c, reader=username, peer=peer_username)
+            conn.commit()
+    except Exception as mr_err:
+        logger.warning(f"Failed to mark DM messages as read: {mr_err}")
+        return
+    if marked_read > 0:
+        try:
+            from backend.services.firebase_notifications import send_fcm_to_user_badge_only, get_total_badge_count
+            send_fcm_to_user_badge_only(username, badge_count=get_total_badge_count(username))
+        except Exception:
+            pass
+        try:
+            invalidate_message_cache(username, peer_username)
+        except Exception:
+            pass
+
+
 def fetch_dm_messages(
     viewer_username: str,
     other_user_id_param: str | None,
@@ -52,6 +81,29 @@ def fetch_dm_messages(
         except Exception:
             return False
     
+    # Shared per-thread recent window: polls are sliced from it without a
+    # Firestore / MySQL read while it is warm (see chat_recent_window).
+    if not before_id_int and chat_recent_window_enabled():
+        window_messages = None
+        try:
+            from backend.services.chat_recent_window import dm_window_messages, username_for_user_id
+
+            window_peer = username_for_user_id(other_user_id)
+            if window_peer:
+                window_messages = dm_window_messages(username, window_peer, since_id=since_id_int)
+        except Exception as win_err:
+            logger.warning("DM recent window read failed, falling back: %s", win_err)
+        if window_messages is not None:
+            if any(not m.get('sent') for m in window_messages):
+                _mark_dm_thread_read(username, window_peer)
+            return _payload({
+                'success': True,
+                'messages': window_messages,
+                'is_delta': bool(since_id_int),
+                'has_more': False,
+                'steve_is_typing': _steve_dm_typing_for(window_peer),
+            })
+
     # Short-lived cache to reduce DB latency (viewer-specific; invalidated on write)
     # PERFORMANCE: Skip cache for delta fetches - they need fresh data
     cache_key = None
@@ -140,6 +192,7 @@ def fetch_dm_messages(
                                     _mr_c = _mr_conn.cursor()
                                     _mr_c.execute("UPDATE messages SET is_read=1 WHERE sender=%s AND receiver=%s AND is_read=0" if USE_MYSQL else "UPDATE messages SET is_read=1 WHERE sender=? AND receiver=? AND is_read=0", (peer_username, username))
                                     dm_marked_read = _mr_c.rowcount or 0
+                                    record_dm_read(_mr_c, reader=username, peer=peer_username)
                                     _mr_conn.commit()
                                     if dm_marked_read > 0:
                                         try:
@@ -441,6 +494,7 @@ def fetch_dm_messages(
             # Mark messages from other user as read
             c.execute("UPDATE messages SET is_read=1 WHERE sender=? AND receiver=? AND is_read=0", (other_username, username))
             marked_read = c.rowcount
+            record_dm_read(c, reader=username, peer=other_username)
             conn.commit()
             
             # Update badge if any messages were marked as read
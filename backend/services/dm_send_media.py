@@ -7,8 +7,11 @@ import logging
 import time
 from typing import Any, Optional, Tuple
 
+from backend.services import presence
 from backend.services.chat_message_preview import format_chat_message_preview
 from backend.services.database import USE_MYSQL, get_db_connection, get_sql_placeholder
+from backend.services.dm_thread_summary import record_dm_message
+from backend.services.feature_flags import cache_presence_enabled
 from backend.services.media import save_uploaded_file
 from backend.services.notifications import push_privacy_summary, send_push_to_user
 from backend.services.steve_dm_reply import start_steve_dm_reply_if_allowed
@@ -96,31 +99,34 @@ def _upsert_dm_notification(
 
 def _should_push_dm(recipient_username: str, sender_username: str, *, check_mute: bool = True) -> bool:
     should_push = True
-    try:
-        with get_db_connection() as conn2:
-            c2 = conn2.cursor()
-            if USE_MYSQL:
-                c2.execute(
-                    """
-                    SELECT 1 FROM active_chat_status
-                    WHERE user=? AND peer=? AND updated_at > DATE_SUB(NOW(), INTERVAL 20 SECOND)
-                    LIMIT 1
-                """,
-                    (recipient_username, sender_username),
-                )
-            else:
-                c2.execute(
-                    """
-                    SELECT 1 FROM active_chat_status
-                    WHERE user=? AND peer=? AND datetime(updated_at) > datetime('now','-20 seconds')
-                    LIMIT 1
-                """,
-                    (recipient_username, sender_username),
-                )
-            if c2.fetchone():
-                should_push = False
-    except Exception as pe:
-        logger.warning("active chat presence check failed: %s", pe)
+    if cache_presence_enabled():
+        should_push = not presence.is_viewing_dm(recipient_username, sender_username)
+    else:
+        try:
+            with get_db_connection() as conn2:
+                c2 = conn2.cursor()
+                if USE_MYSQL:
+                    c2.execute(
+                        """
+                        SELECT 1 FROM active_chat_status
+                        WHERE user=? AND peer=? AND updated_at > DATE_SUB(NOW(), INTERVAL 20 SECOND)
+                        LIMIT 1
+                    """,
+                        (recipient_username, sender_username),
+                    )
+                else:
+                    c2.execute(
+                        """
+                        SELECT 1 FROM active_chat_status
+                        WHERE user=? AND peer=? AND datetime(updated_at) > datetime('now','-20 seconds')
+                        LIMIT 1
+                    """,
+                        (recipient_username, sender_username),
+                    )
+                if c2.fetchone():
+                    should_push = False
+        except Exception as pe:
+            logger.warning("active chat presence check failed: %s", pe)
 
     if should_push and check_mute:
         try:
@@ -200,8 +206,9 @@ def send_dm_photo_message(
                 (username, recipient_username, message, relative_path),
             )
 
-            conn.commit()
             inserted_id = getattr(c, "lastrowid", None)
+            record_dm_message(c, sender=username, receiver=recipient_username, message_id=inserted_id)
+            conn.commit()
             inserted_time = None
             if inserted_id:
                 try:
@@ -414,8 +421,9 @@ def send_dm_grouped_media(
                     (username, recipient_username, "", first_image, first_video, media_paths_json, media_dims_json, client_key),
                 )
 
-            conn.commit()
             inserted_id = getattr(c, "lastrowid", None)
+            record_dm_message(c, sender=username, receiver=recipient_username, message_id=inserted_id)
+            conn.commit()
             inserted_time = None
             if inserted_id:
                 try:
@@ -597,9 +605,10 @@ def send_dm_video_message(
             """,
                 (username, recipient_username, message, relative_path, client_key),
             )
+            inserted_id = getattr(c, "lastrowid", None)
+            record_dm_message(c, sender=username, receiver=recipient_username, message_id=inserted_id)
             conn.commit()
 
-            inserted_id = getattr(c, "lastrowid", None)
             inserted_time = None
             if inserted_id:
                 try:
@@ -808,9 +817,9 @@ def send_dm_audio_message(
             """,
                 (username, recipient_username, "", rel_path, duration_seconds, mime, audio_summary, client_key),
             )
-            conn.commit()
-
             message_id = c.lastrowid
+            record_dm_message(c, sender=username, receiver=recipient_username, message_id=message_id)
+            conn.commit()
 
             try:
                 from backend.services.firestore_writes import write_dm_message
@@ -6,15 +6,122 @@ import logging
 from datetime import datetime
 from typing import Any, Optional
 
+from backend.services import presence
 from backend.services.chat_message_preview import format_chat_message_preview
-from backend.services.database import USE_MYSQL, get_db_connection, get_sql_placeholder
+from backend.services.chat_recent_window import sync_dm_window
+from backend.services.database import USE_MYSQL, begin_transaction, get_db_connection, get_sql_placeholder
+from backend.services.dm_chats_tables import ensure_dm_threads_table
+from backend.services.dm_thread_summary import record_dm_message
+from backend.services.feature_flags import cache_presence_enabled, message_outbox_enabled
+from backend.services.message_outbox import (
+    KIND_DM_NOTIFY,
+    enqueue_outbox_events,
+    ensure_message_outbox_table,
+    firestore_event,
+    kick_outbox_dispatcher,
+)
 from backend.services.notifications import push_privacy_summary, send_push_to_user
 from backend.services.steve_dm_reply import start_steve_dm_reply_if_allowed
-from redis_cache import cache, invalidate_message_cache
+from redis_cache import cache, invalidate_message_cache, messages_cache_key, messages_view_cache_key
 
 logger = logging.getLogger(__name__)
 
 
+def deliver_dm_notification(
+    c,
+    *,
+    sender: str,
+    recipient: str,
+    preview: str,
+    message_id: Any = None,
+) -> None:
+    """Upsert the recipient's 'new messages' bell row and push unless suppressed.
+
+    Push is skipped while the recipient is viewing the thread or has muted it.
+    Runs inline on the send path, or from the message outbox dispatcher (one
+    call per coalesced burst). Caller commits.
+    """
+    _dm_link = f"/user_chat/chat/{sender}"
+    try:
+        if USE_MYSQL:
+            c.execute(
+                """
+                INSERT INTO notifications (user_id, from_user, type, post_id, community_id, message, created_at, is_read, link, preview_text)
+                VALUES (?, ?, 'message', NULL, NULL, ?, NOW(), 0, ?, ?)
+                ON DUPLICATE KEY UPDATE
+                    created_at = NOW(),
+                    message = VALUES(message),
+                    is_read = 0,
+                    link = VALUES(link),
+                    preview_text = VALUES(preview_text)
+            """,
+                (recipient, sender, f"You have new messages from {sender}", _dm_link, preview),
+            )
+        else:
+            c.execute(
+                """
+                INSERT INTO notifications (user_id, from_user, type, post_id, community_id, message, created_at, is_read, link, preview_text)
+                VALUES (?, ?, 'message', NULL, NULL, ?, datetime('now'), 0, ?, ?)
+                ON CONFLICT(user_id, from_user, type, post_id, community_id)
+                DO UPDATE SET created_at = datetime('now'), is_read = 0, message = excluded.message, link = excluded.link, preview_text = excluded.preview_text
+            """,
+                (recipient, sender, f"You have new messages from {sender}", _dm_link, preview),
+            )
+    except Exception as notif_e:
+        logger.warning("Could not create/update message notification: %s", notif_e)
+
+    should_push = True
+    if cache_presence_enabled():
+        should_push = not presence.is_viewing_dm(recipient, sender)
+    else:
+        try:
+            if USE_MYSQL:
+                c.execute(
+                    """
+                    SELECT 1 FROM active_chat_status
+                    WHERE user=? AND peer=? AND updated_at > DATE_SUB(NOW(), INTERVAL 20 SECOND)
+                    LIMIT 1
+                """,
+                    (recipient, sender),
+                )
+            else:
+                c.execute(
+                    """
+                    SELECT 1 FROM active_chat_status
+                    WHERE user=? AND peer=? AND datetime(updated_at) > datetime('now','-20 seconds')
+                    LIMIT 1
+                """,
+                    (recipient, sender),
+                )
+            if c.fetchone():
+                should_push = False
+        except Exception as pe:
+            logger.warning("active chat presence check failed: %s", pe)
+    if should_push:
+        try:
+            _mute_ph = get_sql_placeholder()
+            c.execute(
+                f"SELECT 1 FROM user_muted_chats WHERE username={_mute_ph} AND chat_key={_mute_ph}",
+                (recipient, f"dm:{sender}"),
+            )
+            if c.fetchone():
+                should_push = False
+                logger.debug("Suppressing push for %s - DM with %s is muted", recipient, sender)
+        except Exception as mute_err:
+            logger.warning("Mute check failed: %s", mute_err)
+    if should_push:
+        send_push_to_user(
+            recipient,
+            {
+                "title": f"Message from {sender}",
+                "body": preview,
+                "summary_body": push_privacy_summary(recipient, "dm_message", author=sender),
+                "url": f"/user_chat/chat/{sender}",
+                "tag": f"message-{sender}-{message_id}",
+            },
+        )
+
+
 def send_dm_text_message(
     username: str,
     *,
@@ -114,6 +221,13 @@ def send_dm_text_message(
                     "time": dup_time,
                 }
 
+            use_outbox = message_outbox_enabled()
+            if use_outbox:
+                # Message, thread summary and outbox rows commit together; the
+                # DDL probes run first because DDL would commit the transaction.
+                ensure_dm_threads_table(c)
+                ensure_message_outbox_table()
+                begin_transaction(conn)
             if USE_MYSQL:
                 c.execute(
                     """
@@ -149,11 +263,41 @@ def send_dm_text_message(
                     ),
                 )
 
+            inserted_id = getattr(c, "lastrowid", None)
+            record_dm_message(c, sender=username, receiver=recipient_username, message_id=inserted_id)
+
+            if is_encrypted:
+                _dm_preview = "Encrypted message"
+            else:
+                _dm_preview = format_chat_message_preview(message) or f"Message from {username}"
+
+            use_outbox = use_outbox and bool(inserted_id)
+            if use_outbox:
+                enqueue_outbox_events(
+                    c,
+                    [
+                        (
+                            KIND_DM_NOTIFY,
+                            {
+                                "sender": username,
+                                "receiver": recipient_username,
+                                "message_id": inserted_id,
+                                "preview": _dm_preview,
+                            },
+                        ),
+                        firestore_event(
+                            "dm_message",
+                            sender=username,
+                            receiver=recipient_username,
+                            message_id=inserted_id,
+                            text=message if not is_encrypted else "",
+                            is_encrypted=is_encrypted,
+                        ),
+                    ],
+                )
             conn.commit()
-            inserted_id = None
             inserted_time = None
             try:
-                inserted_id = getattr(c, "lastrowid", None)
                 if inserted_id:
                     if USE_MYSQL:
                         c.execute("SELECT timestamp FROM messages WHERE id = %s", (inserted_id,))
@@ -166,118 +310,37 @@ def send_dm_text_message(
                 inserted_id = None
                 inserted_time = None
 
-            invalidate_message_cache(username, recipient_username)
-
-            try:
-                cache.delete(f"chat_threads:{username}")
-                cache.delete(f"chat_threads:{recipient_username}")
-            except Exception:
-                pass
-
-            _dm_link = f"/user_chat/chat/{username}"
-            if is_encrypted:
-                _dm_preview = "Encrypted message"
+            if use_outbox:
+                # Notifications and the recipient's caches wait for the outbox;
+                # the sender's own thread, thread list and window must not.
+                try:
+                    cache.delete(messages_cache_key(username, recipient_username))
+                    cache.delete(messages_view_cache_key(username, recipient_username))
+                    cache.delete(f"chat_threads:{username}")
+                except Exception:
+                    pass
+                sync_dm_window(username, recipient_username)
+                kick_outbox_dispatcher()
             else:
-                _dm_preview = format_chat_message_preview(message) or f"Message from {username}"
-            try:
-                if USE_MYSQL:
-                    c.execute(
-                        """
-                        INSERT INTO notifications (user_id, from_user, type, post_id, community_id, message, created_at, is_read, link, preview_text)
-                        VALUES (?, ?, 'message', NULL, NULL, ?, NOW(), 0, ?, ?)
-                        ON DUPLICATE KEY UPDATE
-                            created_at = NOW(),
-                            message = VALUES(message),
-                            is_read = 0,
-                            link = VALUES(link),
-                            preview_text = VALUES(preview_text)
-                    """,
-                        (
-                            recipient_username,
-                            username,
-                            f"You have new messages from {username}",
-                            _dm_link,
-                            _dm_preview,
-                        ),
-                    )
-                else:
-                    c.execute(
-                        """
-                        INSERT INTO notifications (user_id, from_user, type, post_id, community_id, message, created_at, is_read, link, preview_text)
-                        VALUES (?, ?, 'message', NULL, NULL, ?, datetime('now'), 0, ?, ?)
-                        ON CONFLICT(user_id, from_user, type, post_id, community_id)
-                        DO UPDATE SET created_at = datetime('now'), is_read = 0, message = excluded.message, link = excluded.link, preview_text = excluded.preview_text
-                    """,
-                        (
-                            recipient_username,
-                            username,
-                            f"You have new messages from {username}",
-                            _dm_link,
-                            _dm_preview,
-                        ),
-                    )
-                conn.commit()
-            except Exception as notif_e:
-                logger.warning("Could not create/update message notification: %s", notif_e)
+                invalidate_message_cache(username, recipient_username)
 
-            try:
-                should_push = True
                 try:
-                    with get_db_connection() as conn2:
-                        c2 = conn2.cursor()
-                        if USE_MYSQL:
-                            c2.execute(
-                                """
-                                SELECT 1 FROM active_chat_status
-                                WHERE user=? AND peer=? AND updated_at > DATE_SUB(NOW(), INTERVAL 20 SECOND)
-                                LIMIT 1
-                            """,
-                                (recipient_username, username),
-                            )
-                        else:
-                            c2.execute(
-                                """
-                                SELECT 1 FROM active_chat_status
-                                WHERE user=? AND peer=? AND datetime(updated_at) > datetime('now','-20 seconds')
-                                LIMIT 1
-                            """,
-                                (recipient_username, username),
-                            )
-                        if c2.fetchone():
-                            should_push = False
-                except Exception as pe:
-                    logger.warning("active chat presence check failed: %s", pe)
-                if should_push:
-                    try:
-                        _mute_ph = get_sql_placeholder()
-                        c.execute(
-                            f"SELECT 1 FROM user_muted_chats WHERE username={_mute_ph} AND chat_key={_mute_ph}",
-                            (recipient_username, f"dm:{username}"),
-                        )
-                        if c.fetchone():
-                            should_push = False
-                            logger.debug(
-                                "Suppressing push for %s - DM with %s is muted",
-                                recipient_username,
-                                username,
-                            )
-                    except Exception as mute_err:
-                        logger.warning("Mute check failed: %s", mute_err)
-                if should_push:
-                    send_push_to_user(
-                        recipient_username,
-                        {
-                            "title": f"Message from {username}",
-                            "body": _dm_preview,
-                            "summary_body": push_privacy_summary(
-                                recipient_username, "dm_message", author=username
-                            ),
-                            "url": f"/user_chat/chat/{username}",
-                            "tag": f"message-{username}-{inserted_id}",
-                        },
+                    cache.delete(f"chat_threads:{username}")
+                    cache.delete(f"chat_threads:{recipient_username}")
+                except Exception:
+                    pass
+
+                try:
+                    deliver_dm_notification(
+                        c,
+                        sender=username,
+                        recipient=recipient_username,
+                        preview=_dm_preview,
+                        message_id=inserted_id,
                     )
-            except Exception as _e:
-                logger.warning("push send_message warn: %s", _e)
+                    conn.commit()
+                except Exception as _e:
+                    logger.warning("push send_message warn: %s", _e)
 
             dm_success_payload = {
                 "success": True,
@@ -297,21 +360,22 @@ def send_dm_text_message(
             if steve_started:
                 dm_success_payload["steve_is_typing"] = True
 
-            try:
-                from backend.services.firestore_writes import write_dm_message
+            if not use_outbox:
+                try:
+                    from backend.services.firestore_writes import write_dm_message
 
-                write_dm_message(
-                    sender=username,
-                    receiver=recipient_username,
-                    message_id=inserted_id,
-                    text=message if not is_encrypted else "",
-                    is_encrypted=is_encrypted,
-                    timestamp=datetime.strptime(str(inserted_time), "%Y-%m-%d %H:%M:%S")
-                    if inserted_time
-                    else None,
-                )
-            except Exception as fs_err:
-                logger.warning("Firestore DM dual-write failed (non-fatal): %s", fs_err)
+                    write_dm_message(
+                        sender=username,
+                        receiver=recipient_username,
+                        message_id=inserted_id,
+                        text=message if not is_encrypted else "",
+                        is_encrypted=is_encrypted,
+                        timestamp=datetime.strptime(str(inserted_time), "%Y-%m-%d %H:%M:%S")
+                        if inserted_time
+                        else None,
+                    )
+                except Exception as fs_err:
+                    logger.warning("Firestore DM dual-write failed (non-fatal): %s", fs_err)
 
             return dm_success_payload
 
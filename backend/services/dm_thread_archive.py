@@ -9,6 +9,7 @@ from backend.services.chat_message_preview import preview_from_message_row
 from backend.services.database import get_db_connection, get_sql_placeholder
 from backend.services.dm_chats_tables import ensure_archived_chats_table
 from backend.services.dm_chat_threads import _fetch_last_message_row
+from backend.services.dm_thread_summary import set_dm_thread_flag
 from redis_cache import cache
 
 logger = logging.getLogger(__name__)
@@ -31,6 +32,7 @@ def archive_dm_thread(username: str, *, other_username: Optional[str] = None) ->
                 )
             except Exception:
                 pass
+            set_dm_thread_flag(c, username=username, peer=other_username, flag="archived", value=True)
             conn.commit()
             try:
                 cache.delete(f"chat_threads:{username}")
@@ -55,6 +57,7 @@ def unarchive_dm_thread(username: str, *, other_username: Optional[str] = None)
                 f"DELETE FROM archived_chats WHERE username = {ph} AND other_username = {ph}",
                 (username, other_username),
             )
+            set_dm_thread_flag(c, username=username, peer=other_username, flag="archived", value=False)
             conn.commit()
             try:
                 cache.delete(f"chat_threads:{username}")
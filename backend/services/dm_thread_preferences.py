@@ -6,6 +6,7 @@ import logging
 from typing import Any, Optional, Tuple
 
 from backend.services.database import USE_MYSQL, get_db_connection, get_sql_placeholder
+from backend.services.dm_thread_summary import set_dm_thread_flag
 
 logger = logging.getLogger(__name__)
 
@@ -68,6 +69,8 @@ def apply_dm_thread_mute(
                     f"DELETE FROM user_muted_chats WHERE username={ph} AND chat_key={ph}",
                     (username, chat_key),
                 )
+            if other_username:
+                set_dm_thread_flag(c, username=username, peer=other_username, flag="muted", value=bool(muted))
             conn.commit()
             return {"success": True, "muted": bool(muted)}, 200
     except Exception as e:
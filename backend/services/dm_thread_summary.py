@@ -0,0 +1,472 @@
+"""Maintained DM thread summary (``dm_threads``) backing /api/chat_threads.
+
+One row per ``(username, peer)`` holds what the thread list needs: the newest
+visible message id + time, the viewer's unread count, the one-sided clear
+cutoff and the archived / muted flags. Write paths call the ``record_*``
+helpers on the SAME cursor as their own ``messages`` write, before their
+commit, so the summary moves with the message row.
+
+Visibility rules are identical to :mod:`backend.services.dm_human_thread`:
+Steve rows tagged with ``human_dm_thread`` belong to that human pair (they
+update both humans' previews but never count as unread) and are hidden from
+the private Steve thread.
+
+Every helper is best-effort — a summary failure is logged and must never fail
+the send / read / delete that triggered it. ``rebuild_dm_threads_for_user`` and
+``verify_dm_threads_for_user`` recompute rows from ``messages`` (see
+``scripts/rebuild_dm_threads.py``); reads switch over only once
+``DM_THREADS_SUMMARY_READS`` is enabled.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+from backend.services.database import USE_MYSQL, get_db_connection, get_sql_placeholder
+from backend.services.dm_chats_tables import (
+    ensure_archived_chats_table,
+    ensure_deleted_chat_threads_table,
+    ensure_dm_threads_table,
+)
+from backend.services.dm_human_thread import (
+    dm_last_message_where_clause,
+    ensure_human_dm_thread_column,
+    is_private_steve_dm_peer,
+)
+
+logger = logging.getLogger(__name__)
+
+_SUMMARY_FIELDS = ("last_message_id", "last_activity", "unread_count", "cleared_at", "archived", "muted")
+
+
+def _col(row: Any, key: str, idx: int) -> Any:
+    if row is None:
+        return None
+    return row[key] if hasattr(row, "keys") else row[idx]
+
+
+def _ts_str(value: object) -> Optional[str]:
+    """Second-precision ``YYYY-MM-DD HH:MM:SS`` (matches DATETIME + SQLite text)."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    s = str(value).strip().replace("T", " ")[:19]
+    return s or None
+
+
+def _upsert_message_sql(ph: str) -> str:
+    # Only advance the preview when the new id is newer; the unread delta is
+    # always applied. MySQL evaluates ON DUPLICATE KEY assignments left to right,
+    # so ``last_activity`` must read the OLD ``last_message_id`` before it moves.
+    if USE_MYSQL:
+        return f"""
+            INSERT INTO dm_threads (username, peer, last_message_id, last_activity, unread_count)
+            SELECT {ph}, {ph}, id, timestamp, {ph} FROM messages WHERE id = {ph}
+            ON DUPLICATE KEY UPDATE
+                last_activity = IF(VALUES(last_message_id) >= COALESCE(last_message_id, 0),
+                                   VALUES(last_activity), last_activity),
+                unread_count = unread_count + VALUES(unread_count),
+                last_message_id = GREATEST(COALESCE(last_message_id, 0), VALUES(last_message_id))
+        """
+    return f"""
+        INSERT INTO dm_threads (username, peer, last_message_id, last_activity, unread_count)
+        SELECT {ph}, {ph}, id, timestamp, {ph} FROM messages WHERE id = {ph}
+        ON CONFLICT(username, peer) DO UPDATE SET
+            last_activity = CASE WHEN excluded.last_message_id >= COALESCE(dm_threads.last_message_id, 0)
+                                 THEN excluded.last_activity ELSE dm_threads.last_activity END,
+            unread_count = dm_threads.unread_count + excluded.unread_count,
+            last_message_id = MAX(COALESCE(dm_threads.last_message_id, 0), excluded.last_message_id)
+    """
+
+
+def record_dm_message(cursor, *, sender: str, receiver: str, message_id: Any) -> None:
+    """A plain DM row was inserted: advance both previews, bump the receiver's unread."""
+    if not sender or not receiver or not message_id:
+        return
+    try:
+        ensure_dm_threads_table(cursor)
+        ph = get_sql_placeholder()
+        sql = _upsert_message_sql(ph)
+        cursor.execute(sql, (sender, receiver, 0, int(message_id)))
+        cursor.execute(sql, (receiver, sender, 1, int(message_id)))
+    except Exception as e:
+        logger.warning("dm_threads record_dm_message failed for %s->%s: %s", sender, receiver, e)
+
+
+def record_steve_thread_message(cursor, *, peer_a: str, peer_b: str, message_id: Any) -> None:
+    """A Steve row tagged for the ``peer_a``/``peer_b`` pair: preview only, never unread."""
+    if not peer_a or not peer_b or not message_id:
+        return
+    try:
+        ensure_dm_threads_table(cursor)
+        ph = get_sql_placeholder()
+        sql = _upsert_message_sql(ph)
+        cursor.execute(sql, (peer_a, peer_b, 0, int(message_id)))
+        cursor.execute(sql, (peer_b, peer_a, 0, int(message_id)))
+    except Exception as e:
+        logger.warning("dm_threads record_steve_thread_message failed for %s/%s: %s", peer_a, peer_b, e)
+
+
+def record_dm_read(cursor, *, reader: str, peer: str) -> None:
+    """``reader`` marked everything from ``peer`` as read."""
+    try:
+        ensure_dm_threads_table(cursor)
+        ph = get_sql_placeholder()
+        cursor.execute(
+            f"UPDATE dm_threads SET unread_count = 0 WHERE username = {ph} AND peer = {ph} AND unread_count <> 0",
+            (reader, peer),
+        )
+    except Exception as e:
+        logger.warning("dm_threads record_dm_read failed for %s<-%s: %s", reader, peer, e)
+
+
+def set_dm_thread_flag(cursor, *, username: str, peer: str, flag: str, value: bool) -> None:
+    """Mirror ``archived_chats`` / ``user_muted_chats`` into the summary row."""
+    if flag not in ("archived", "muted"):
+        raise ValueError(f"unknown dm_threads flag: {flag}")
+    try:
+        ensure_dm_threads_table(cursor)
+        ph = get_sql_placeholder()
+        cursor.execute(
+            f"UPDATE dm_threads SET {flag} = {ph} WHERE username = {ph} AND peer = {ph}",
+            (1 if value else 0, username, peer),
+        )
+        if not getattr(cursor, "rowcount", 1):
+            # No summary row yet (or the flag already matched): derive it from
+            # the source tables the caller just wrote.
+            refresh_dm_thread(cursor, username, peer)
+    except Exception as e:
+        logger.warning("dm_threads %s flag update failed for %s/%s: %s", flag, username, peer, e)
+
+
+def refresh_dm_thread_pair(cursor, user_a: str, user_b: str) -> None:
+    """Recompute both directions of a pair (delete / clear paths: rare, pair-scoped)."""
+    for viewer, peer in ((user_a, user_b), (user_b, user_a)):
+        if not viewer or not peer:
+            continue
+        try:
+            refresh_dm_thread(cursor, viewer, peer)
+        except Exception as e:
+            logger.warning("dm_threads refresh failed for %s/%s: %s", viewer, peer, e)
+
+
+def record_dm_cleared(cursor, *, username: str, peer: str) -> None:
+    """One-sided clear / delete-thread: ``deleted_chat_threads`` moved, recompute the viewer's row."""
+    try:
+        refresh_dm_thread(cursor, username, peer)
+    except Exception as e:
+        logger.warning("dm_threads record_dm_cleared failed for %s/%s: %s", username, peer, e)
+
+
+def forget_user_dm_threads(cursor, username: str) -> None:
+    """Account deletion: drop every summary row the user owns or appears in."""
+    try:
+        ensure_dm_threads_table(cursor)
+        ph = get_sql_placeholder()
+        cursor.execute(f"DELETE FROM dm_threads WHERE username = {ph} OR peer = {ph}", (username, username))
+    except Exception as e:
+        logger.warning("dm_threads forget failed for %s: %s", username, e)
+
+
+# ── Recompute from source tables ────────────────────────────────────────
+
+
+def compute_dm_thread_row(cursor, username: str, peer: str) -> Optional[dict]:
+    """Derive the summary row from ``messages`` + side tables (legacy semantics).
+
+    Returns ``None`` when the pair has no direct messages at all, or when the
+    private Steve thread has no visible row (the legacy scan would not list
+    either).
+    """
+    ph = get_sql_placeholder()
+    try:
+        ensure_human_dm_thread_column(cursor)
+    except Exception:
+        pass
+
+    cursor.execute(
+        f"""
+        SELECT 1 FROM messages
+        WHERE (sender = {ph} AND receiver = {ph}) OR (sender = {ph} AND receiver = {ph})
+        LIMIT 1
+        """,
+        (username, peer, peer, username),
+    )
+    if not cursor.fetchone():
+        return None
+
+    cleared_at = None
+    try:
+        cursor.execute(
+            f"SELECT deleted_at FROM deleted_chat_threads WHERE username = {ph} AND other_username = {ph}",
+            (username, peer),
+        )
+        cleared_at = _ts_str(_col(cursor.fetchone(), "deleted_at", 0))
+    except Exception:
+        cleared_at = None
+
+    where, params = dm_last_message_where_clause(ph, viewer=username, peer=peer)
+    if cleared_at:
+        where = f"{where} AND timestamp > {ph}"
+        params = params + (cleared_at,)
+    cursor.execute(
+        f"SELECT id, timestamp FROM messages WHERE {where} ORDER BY timestamp DESC, id DESC LIMIT 1",
+        params,
+    )
+    last = cursor.fetchone()
+    if last is None and is_private_steve_dm_peer(peer):
+        # Only @Steve in-thread rows (or a clear with nothing newer): the legacy
+        # list skips the private Steve thread in that case, so no row.
+        return None
+
+    if is_private_steve_dm_peer(peer):
+        unread_sql = (
+            f"SELECT COUNT(*) AS cnt FROM messages WHERE sender = {ph} AND receiver = {ph} AND is_read = 0 "
+            f"AND (human_dm_thread IS NULL OR human_dm_thread = '')"
+        )
+        unread_params: tuple = ("steve", username)
+    else:
+        unread_sql = f"SELECT COUNT(*) AS cnt FROM messages WHERE sender = {ph} AND receiver = {ph} AND is_read = 0"
+        unread_params = (peer, username)
+    if cleared_at:
+        unread_sql += f" AND timestamp > {ph}"
+        unread_params = unread_params + (cleared_at,)
+    cursor.execute(unread_sql, unread_params)
+    unread = int(_col(cursor.fetchone(), "cnt", 0) or 0)
+
+    archived = False
+    try:
+        cursor.execute(
+            f"SELECT 1 FROM archived_chats WHERE username = {ph} AND other_username = {ph} LIMIT 1",
+            (username, peer),
+        )
+        archived = cursor.fetchone() is not None
+    except Exception:
+        archived = False
+
+    muted = False
+    try:
+        cursor.execute(
+            f"SELECT 1 FROM user_muted_chats WHERE username = {ph} AND chat_key = {ph} LIMIT 1",
+            (username, f"dm:{peer}"),
+        )
+        muted = cursor.fetchone() is not None
+    except Exception:
+        muted = False
+
+    return {
+        "last_message_id": int(_col(last, "id", 0)) if last else None,
+        "last_activity": _ts_str(_col(last, "timestamp", 1)) if last else None,
+        "unread_count": unread,
+        "cleared_at": cleared_at,
+        "archived": archived,
+        "muted": muted,
+    }
+
+
+def refresh_dm_thread(cursor, username: str, peer: str) -> Optional[dict]:
+    """Overwrite one summary row from source tables (delete when the pair is empty)."""
+    ensure_dm_threads_table(cursor)
+    ph = get_sql_placeholder()
+    row = compute_dm_thread_row(cursor, username, peer)
+    if row is None:
+        cursor.execute(f"DELETE FROM dm_threads WHERE username = {ph} AND peer = {ph}", (username, peer))
+        return None
+    values = (
+        username,
+        peer,
+        row["last_message_id"],
+        row["last_activity"],
+        row["unread_count"],
+        row["cleared_at"],
+        1 if row["archived"] else 0,
+        1 if row["muted"] else 0,
+    )
+    cols = "username, peer, last_message_id, last_activity, unread_count, cleared_at, archived, muted"
+    marks = ", ".join([ph] * len(values))
+    if USE_MYSQL:
+        cursor.execute(
+            f"""
+            INSERT INTO dm_threads ({cols}) VALUES ({marks})
+            ON DUPLICATE KEY UPDATE
+                last_message_id = VALUES(last_message_id),
+                last_activity = VALUES(last_activity),
+                unread_count = VALUES(unread_count),
+                cleared_at = VALUES(cleared_at),
+                archived = VALUES(archived),
+                muted = VALUES(muted)
+            """,
+            values,
+        )
+    else:
+        cursor.execute(
+            f"""
+            INSERT INTO dm_threads ({cols}) VALUES ({marks})
+            ON CONFLICT(username, peer) DO UPDATE SET
+                last_message_id = excluded.last_message_id,
+                last_activity = excluded.last_activity,
+                unread_count = excluded.unread_count,
+                cleared_at = excluded.cleared_at,
+                archived = excluded.archived,
+                muted = excluded.muted
+            """,
+            values,
+        )
+    return row
+
+
+def _counterparts(cursor, username: str) -> list[str]:
+    ph = get_sql_placeholder()
+    cursor.execute(
+        f"""
+        SELECT DISTINCT receiver AS other_username FROM messages WHERE sender = {ph}
+        UNION
+        SELECT DISTINCT sender AS other_username FROM messages WHERE receiver = {ph}
+        """,
+        (username, username),
+    )
+    return [str(_col(r, "other_username", 0)) for r in cursor.fetchall() if _col(r, "other_username", 0)]
+
+
+def _stored_rows(cursor, username: str) -> dict[str, dict]:
+    ph = get_sql_placeholder()
+    cursor.execute(
+        f"""
+        SELECT peer, last_message_id, last_activity, unread_count, cleared_at, archived, muted
+        FROM dm_threads WHERE username = {ph}
+        """,
+        (username,),
+    )
+    out: dict[str, dict] = {}
+    for r in cursor.fetchall():
+        peer = str(_col(r, "peer", 0))
+        lmid = _col(r, "last_message_id", 1)
+        out[peer] = {
+            "last_message_id": int(lmid) if lmid else None,
+            "last_activity": _ts_str(_col(r, "last_activity", 2)),
+            "unread_count": int(_col(r, "unread_count", 3) or 0),
+            "cleared_at": _ts_str(_col(r, "cleared_at", 4)),
+            "archived": bool(_col(r, "archived", 5)),
+            "muted": bool(_col(r, "muted", 6)),
+        }
+    return out
+
+
+def rebuild_dm_threads_for_user(username: str) -> dict:
+    """Recompute every summary row for ``username`` and drop rows with no messages."""
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        ensure_dm_threads_table(c)
+        ensure_archived_chats_table(c)
+        ensure_deleted_chat_threads_table(c)
+        peers = _counterparts(c, username)
+        written = 0
+        for peer in peers:
+            if refresh_dm_thread(c, username, peer) is not None:
+                written += 1
+        peer_set = set(peers)
+        stale = [p for p in _stored_rows(c, username) if p not in peer_set]
+        ph = get_sql_placeholder()
+        for peer in stale:
+            c.execute(f"DELETE FROM dm_threads WHERE username = {ph} AND peer = {ph}", (username, peer))
+        conn.commit()
+    return {"username": username, "threads": written, "removed": len(stale)}
+
+
+def verify_dm_threads_for_user(username: str) -> list[dict]:
+    """Return ``[{peer, field, stored, expected}]`` for every drifted summary field."""
+    mismatches: list[dict] = []
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        ensure_dm_threads_table(c)
+        stored = _stored_rows(c, username)
+        peers = set(_counterparts(c, username)) | set(stored)
+        for peer in sorted(peers):
+            expected = compute_dm_thread_row(c, username, peer)
+            have = stored.get(peer)
+            if expected is None and have is None:
+                continue
+            if expected is None or have is None:
+                mismatches.append({"peer": peer, "field": "row", "stored": have, "expected": expected})
+                continue
+            for field in _SUMMARY_FIELDS:
+                if have.get(field) != expected.get(field):
+                    mismatches.append(
+                        {"peer": peer, "field": field, "stored": have.get(field), "expected": expected.get(field)}
+                    )
+    return mismatches
+
+
+def iter_dm_usernames(*, after: str = "", limit: int = 500) -> list[str]:
+    """Page through every username that appears in ``messages`` (rebuild driver)."""
+    ph = get_sql_placeholder()
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            f"""
+            SELECT u FROM (
+                SELECT DISTINCT sender AS u FROM messages
+                UNION
+                SELECT DISTINCT receiver AS u FROM messages
+            ) everyone
+            WHERE u > {ph}
+            ORDER BY u
+            LIMIT {int(limit)}
+            """,
+            (after,),
+        )
+        return [str(_col(r, "u", 0)) for r in c.fetchall() if _col(r, "u", 0)]
+
+
+def rebuild_dm_threads(usernames: Iterable[str]) -> dict:
+    """Rebuild a batch of users; returns aggregate counts (script entry point)."""
+    users = 0
+    threads = 0
+    failed: list[str] = []
+    for username in usernames:
+        try:
+            res = rebuild_dm_threads_for_user(username)
+            users += 1
+            threads += int(res.get("threads") or 0)
+        except Exception as e:
+            logger.warning("dm_threads rebuild failed for %s: %s", username, e)
+            failed.append(username)
+    return {"users": users, "threads": threads, "failed": failed}
+
+
+# ── Read path ───────────────────────────────────────────────────────────
+
+
+_LIST_COLS = (
+    "peer", "unread_count", "cleared_at", "muted", "last_message_id",
+    "message", "timestamp", "sender", "is_encrypted",
+    "image_path", "video_path", "audio_path", "audio_summary", "media_paths",
+)
+
+
+def load_dm_thread_list(cursor, username: str) -> list[dict]:
+    """Single indexed range read: the viewer's non-archived summary rows + preview row."""
+    ensure_dm_threads_table(cursor)
+    ph = get_sql_placeholder()
+    cursor.execute(
+        f"""
+        SELECT t.peer, t.unread_count, t.cleared_at, t.muted, t.last_message_id,
+               m.message, m.timestamp, m.sender, m.is_encrypted,
+               m.image_path, m.video_path, m.audio_path, m.audio_summary, m.media_paths
+        FROM dm_threads t
+        LEFT JOIN messages m ON m.id = t.last_message_id
+        WHERE t.username = {ph} AND t.archived = 0
+        ORDER BY t.last_activity DESC
+        """,
+        (username,),
+    )
+    out: list[dict] = []
+    for r in cursor.fetchall():
+        if hasattr(r, "keys"):
+            out.append({k: r[k] for k in _LIST_COLS})
+        else:
+            out.append(dict(zip(_LIST_COLS, r)))
+    return out
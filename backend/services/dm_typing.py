@@ -1,4 +1,4 @@
-"""Human-peer DM typing reads (``typing_status`` table).
+"""Human-peer DM typing reads (``typing_status`` table, or presence keys).
 
 Steve's typing indicator is separate (``steve_dm_typing.py``, Redis flags).
 The freshness TTL mirrors the monolith ``GET /api/typing`` handler
@@ -7,7 +7,8 @@ The freshness TTL mirrors the monolith ``GET /api/typing`` handler
 
 Used to piggyback ``peer_is_typing`` onto the ``/get_messages`` poll response
 so chat clients see typing state on every poll instead of a separate,
-lower-cadence ``/api/typing`` request.
+lower-cadence ``/api/typing`` request. With ``PRESENCE_CACHE`` on the typing
+signal lives in ``backend.services.presence`` TTL keys instead of the table.
 """
 
 from __future__ import annotations
@@ -15,7 +16,9 @@ from __future__ import annotations
 import logging
 from datetime import datetime
 
+from backend.services import presence
 from backend.services.database import get_db_connection
+from backend.services.feature_flags import cache_presence_enabled
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +59,8 @@ def peer_is_typing_for_viewer(viewer_username: str, other_user_id: object) -> bo
             if not row:
                 return False
             peer_username = row["username"] if hasattr(row, "keys") else row[0]
+            if cache_presence_enabled():
+                return presence.is_typing(peer_username, viewer_username)
             c.execute(
                 "SELECT is_typing, updated_at FROM typing_status WHERE user = ? AND peer = ?",
                 (peer_username, viewer_username),
@@ -0,0 +1,444 @@
+"""Content-addressed cache of extracted PDF text.
+
+Steve's legacy resource context, ``steve_document_memory`` indexing and
+onboarding CV import all run ``pypdf`` over uploaded PDFs. Parsing is slow
+and CPU-bound, and the legacy path used to repeat it on every Steve turn that
+touched an unindexed document. :func:`extract_pages` parses each distinct PDF
+once:
+
+* Records are keyed by the SHA-256 of the PDF bytes. R2 documents also get an
+  alias keyed by object key + ETag (one ``HEAD`` instead of a download), and
+  local uploads an alias keyed by path + mtime + size.
+* Records hold raw per-page text. They live in a local disk directory
+  (``DOC_TEXT_CACHE_DIR``, pruned to ``DOC_TEXT_CACHE_DISK_MAX_MB``) and in
+  private R2 objects under :data:`R2_PREFIX`, so other instances and later
+  deploys reuse them.
+* Misses are parsed in a process pool (``DOC_TEXT_POOL_WORKERS``; 0 parses
+  inline) under a page budget (``DOC_TEXT_MAX_PAGES``) and a time budget
+  (``DOC_TEXT_EXTRACT_SECONDS``) that starts when a worker picks the PDF up —
+  callers first wait for a free worker, and a caller that cannot get one gets
+  a transient failure that is not cached. Past either budget the pages read
+  so far are kept and the record is marked ``truncated``. A worker stuck
+  inside a single page is killed, the pool rebuilt and the document recorded
+  as failed so it is not retried on every turn.
+* Failure records stay on local disk only and expire after
+  ``DOC_TEXT_FAILED_TTL_SECONDS``, so a bad parse is retried eventually and
+  never pinned in R2 for every instance.
+
+Status strings match ``steve_document_memory.TEXT_STATUS_*``.
+
+Warm the cache for existing documents with
+``python scripts/warm_document_text_cache.py``.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+STATUS_READABLE = "readable"
+STATUS_EMPTY = "empty"
+STATUS_SCANNED = "scanned_pdf"
+STATUS_FAILED = "extraction_failed"
+
+RECORD_VERSION = 1
+R2_PREFIX = "private/doc-text/v1"
+CACHE_DIR = os.environ.get("DOC_TEXT_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "doc_text_cache")
+DISK_MAX_BYTES = int(os.environ.get("DOC_TEXT_CACHE_DISK_MAX_MB", "256")) * 1024 * 1024
+MAX_PAGES = int(os.environ.get("DOC_TEXT_MAX_PAGES", "300"))
+EXTRACT_SECONDS = float(os.environ.get("DOC_TEXT_EXTRACT_SECONDS", "20"))
+POOL_WORKERS = int(os.environ.get("DOC_TEXT_POOL_WORKERS", "2"))
+FAILED_TTL_SECONDS = float(os.environ.get("DOC_TEXT_FAILED_TTL_SECONDS", "86400"))
+# Extra wait past the worker's own deadline before it is treated as stuck.
+_POOL_GRACE_SECONDS = 5.0
+# How long a caller waits for a free worker before giving up (not cached).
+_SLOT_WAIT_SECONDS = EXTRACT_SECONDS + _POOL_GRACE_SECONDS
+_PRUNE_EVERY_WRITES = 50
+
+
+@dataclass
+class ExtractedText:
+    """Per-page text for one PDF (``pages`` items are ``{"page", "text"}``)."""
+
+    status: str
+    pages: List[Dict[str, Any]] = field(default_factory=list)
+    page_count: int = 0
+    truncated: bool = False
+    error: Optional[str] = None
+    cache_key: Optional[str] = None
+    from_cache: bool = False
+
+    def normalized_pages(self, max_pages: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Pages with whitespace collapsed, as the Steve indexers store them."""
+        pages = self.pages if max_pages is None else self.pages[:max_pages]
+        return [{"page": p["page"], "text": " ".join((p.get("text") or "").split())} for p in pages]
+
+
+# ── Extraction (runs in pool workers) ───────────────────────────────────
+
+
+def _extract_worker(data: bytes, max_pages: int, budget_seconds: float) -> Dict[str, Any]:
+    """Parse ``data`` page by page until done or out of page / time budget."""
+    deadline = time.monotonic() + budget_seconds
+    try:
+        from pypdf import PdfReader
+
+        reader = PdfReader(io.BytesIO(data))
+        page_count = len(reader.pages)
+        pages: List[Dict[str, Any]] = []
+        truncated = False
+        for idx in range(page_count):
+            if idx >= max_pages or time.monotonic() > deadline:
+                truncated = True
+                break
+            try:
+                text = reader.pages[idx].extract_text() or ""
+            except Exception:
+                text = ""
+            pages.append({"page": idx + 1, "text": text})
+    except Exception as exc:
+        return {"status": STATUS_FAILED, "pages": [], "page_count": 0,
+                "truncated": False, "error": f"extract_failed:{exc!s}"[:180]}
+    if any(p["text"].strip() for p in pages):
+        status = STATUS_READABLE
+    else:
+        status = STATUS_SCANNED if page_count else STATUS_EMPTY
+    return {"status": status, "pages": pages, "page_count": page_count,
+            "truncated": truncated, "error": None}
+
+
+_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+# One slot per worker: a submitted PDF never sits in the executor's queue, so
+# the result timeout measures the parse alone.
+_slots: Optional[threading.BoundedSemaphore] = None
+
+
+def _get_pool() -> Optional[concurrent.futures.ProcessPoolExecutor]:
+    global _pool, _slots
+    if POOL_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _slots is None:
+            _slots = threading.BoundedSemaphore(POOL_WORKERS)
+        if _pool is None:
+            # spawn: forking a threaded web worker can inherit held locks.
+            _pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _discard_pool(pool: concurrent.futures.ProcessPoolExecutor) -> None:
+    """Kill ``pool``'s workers (one is stuck) so the next call starts a fresh pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    procs = list((getattr(pool, "_processes", None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for proc in procs:
+        try:
+            proc.terminate()
+        except Exception:
+            pass
+
+
+def _run_extraction(data: bytes, max_pages: int) -> Dict[str, Any]:
+    pool = _get_pool()
+    if pool is None:
+        return _extract_worker(data, max_pages, EXTRACT_SECONDS)
+    slots = _slots
+    if slots is None or not slots.acquire(timeout=_SLOT_WAIT_SECONDS):
+        logger.warning("PDF extraction pool busy for %.0fs; not parsing now", _SLOT_WAIT_SECONDS)
+        return {"status": STATUS_FAILED, "pages": [], "page_count": 0,
+                "truncated": False, "error": "extract_busy", "transient": True}
+    try:
+        future = pool.submit(_extract_worker, data, max_pages, EXTRACT_SECONDS)
+        return future.result(timeout=EXTRACT_SECONDS + _POOL_GRACE_SECONDS)
+    except concurrent.futures.TimeoutError:
+        logger.warning("PDF extraction exceeded %.0fs; restarting extraction pool", EXTRACT_SECONDS)
+        _discard_pool(pool)
+        return {"status": STATUS_FAILED, "pages": [], "page_count": 0,
+                "truncated": True, "error": "extract_timeout"}
+    except Exception as exc:
+        # BrokenProcessPool etc. — transient, so the result is not cached.
+        _discard_pool(pool)
+        return {"status": STATUS_FAILED, "pages": [], "page_count": 0,
+                "truncated": False, "error": f"extract_pool_failed:{exc!s}"[:180], "transient": True}
+    finally:
+        slots.release()
+
+
+# ── Storage ─────────────────────────────────────────────────────────────
+
+
+_writes = 0
+_writes_lock = threading.Lock()
+
+
+def content_key(data: bytes) -> str:
+    return "sha256-" + hashlib.sha256(data).hexdigest()
+
+
+def _alias_key(kind: str, value: str) -> str:
+    return f"{kind}-" + hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def _disk_path(key: str) -> str:
+    return os.path.join(CACHE_DIR, key[-2:], f"{key}.json")
+
+
+def _read_disk(key: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(_disk_path(key), "rb") as fh:
+            return json.loads(fh.read())
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        logger.debug("doc text disk read failed for %s: %s", key, exc)
+        return None
+
+
+def _write_disk(key: str, body: bytes) -> None:
+    global _writes
+    path = _disk_path(key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(body)
+        os.replace(tmp, path)
+    except Exception as exc:
+        logger.debug("doc text disk write failed for %s: %s", key, exc)
+        return
+    with _writes_lock:
+        _writes += 1
+        due = _writes % _PRUNE_EVERY_WRITES == 0
+    if due:
+        _prune_disk()
+
+
+def _prune_disk() -> None:
+    """Drop least recently written records until under ``DISK_MAX_BYTES``."""
+    entries = []
+    total = 0
+    for root, _dirs, files in os.walk(CACHE_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+    if total <= DISK_MAX_BYTES:
+        return
+    for _mtime, size, path in sorted(entries):
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        if total <= DISK_MAX_BYTES * 0.8:
+            break
+
+
+def _read_r2(key: str) -> Optional[Dict[str, Any]]:
+    try:
+        from backend.services.r2_storage import R2_ENABLED, download_bytes_from_r2
+
+        if not R2_ENABLED:
+            return None
+        body = download_bytes_from_r2(f"{R2_PREFIX}/{key}.json", missing_ok=True)
+        return json.loads(body) if body else None
+    except Exception as exc:
+        logger.debug("doc text R2 read failed for %s: %s", key, exc)
+        return None
+
+
+def _write_r2(key: str, body: bytes) -> None:
+    try:
+        from backend.services.r2_storage import R2_ENABLED, upload_private_bytes_to_r2
+
+        if R2_ENABLED:
+            upload_private_bytes_to_r2(body, f"{R2_PREFIX}/{key}.json", "application/json")
+    except Exception as exc:
+        logger.debug("doc text R2 write failed for %s: %s", key, exc)
+
+
+def _load(key: str) -> Optional[Dict[str, Any]]:
+    record = _read_disk(key)
+    if record is None:
+        record = _read_r2(key)
+        if record is not None:
+            _write_disk(key, json.dumps(record).encode("utf-8"))
+    if not record or record.get("v") != RECORD_VERSION:
+        return None
+    if record.get("status") == STATUS_FAILED:
+        # Records written before failures carried a timestamp count as expired.
+        if time.time() - float(record.get("failed_at") or 0) > FAILED_TTL_SECONDS:
+            return None
+    return record
+
+
+def _store(key: str, record: Dict[str, Any]) -> None:
+    failed = record.get("status") == STATUS_FAILED
+    if failed:
+        record = dict(record, failed_at=time.time())
+    body = json.dumps(dict(record, v=RECORD_VERSION)).encode("utf-8")
+    _write_disk(key, body)
+    if not failed:
+        _write_r2(key, body)
+
+
+def _resolve(key: str) -> Optional[Dict[str, Any]]:
+    """Load ``key``, following one alias hop to the content record."""
+    record = _load(key)
+    if record and record.get("alias_of"):
+        record = _load(str(record["alias_of"]))
+    return record
+
+
+# ── Source aliases ──────────────────────────────────────────────────────
+
+
+def _source_alias(file_path: str) -> Optional[str]:
+    """Cheap identity for ``file_path`` that changes whenever its bytes do."""
+    value = str(file_path or "").strip()
+    if not value:
+        return None
+    if value.startswith("http://") or value.startswith("https://"):
+        from backend.services.r2_storage import R2_PUBLIC_URL, head_object
+
+        if not R2_PUBLIC_URL or not value.startswith(R2_PUBLIC_URL):
+            return None
+        object_key = value[len(R2_PUBLIC_URL):].lstrip("/").split("?", 1)[0]
+        meta = head_object(object_key) or {}
+        etag = str(meta.get("ETag") or "").strip('"')
+        return _alias_key("r2", f"{object_key}|{etag}") if etag else None
+    from backend.services.steve_document_memory import _normalize_local_candidates
+
+    for path in _normalize_local_candidates(value):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        return _alias_key("file", f"{os.path.realpath(path)}|{st.st_mtime_ns}|{st.st_size}")
+    return None
+
+
+# ── Public API ──────────────────────────────────────────────────────────
+
+
+_key_locks: Dict[str, threading.Lock] = {}
+_key_locks_guard = threading.Lock()
+
+
+def _key_lock(key: str) -> threading.Lock:
+    with _key_locks_guard:
+        lock = _key_locks.get(key)
+        if lock is None:
+            if len(_key_locks) > 1024:
+                _key_locks.clear()
+            lock = _key_locks[key] = threading.Lock()
+        return lock
+
+
+def _from_record(record: Dict[str, Any], key: Optional[str], *, from_cache: bool) -> ExtractedText:
+    return ExtractedText(
+        status=str(record.get("status") or STATUS_FAILED),
+        pages=list(record.get("pages") or []),
+        page_count=int(record.get("page_count") or 0),
+        truncated=bool(record.get("truncated")),
+        error=record.get("error"),
+        cache_key=key,
+        from_cache=from_cache,
+    )
+
+
+def extract_pages(
+    file_path: Optional[str] = None,
+    *,
+    data: Optional[bytes] = None,
+    max_pages: Optional[int] = None,
+    persist: bool = True,
+) -> ExtractedText:
+    """Per-page text for a PDF given by ``file_path`` (URL / upload path) or raw ``data``.
+
+    ``persist=False`` parses in the pool without reading or writing the cache
+    (CVs and other private uploads). ``max_pages`` only lowers the parse
+    budget for unpersisted calls; cached records always cover
+    ``DOC_TEXT_MAX_PAGES`` so they serve every caller.
+    """
+    if not persist:
+        if not data:
+            return ExtractedText(status=STATUS_FAILED, error="missing_data")
+        budget = min(MAX_PAGES, max_pages) if max_pages else MAX_PAGES
+        return _from_record(_run_extraction(data, budget), None, from_cache=False)
+
+    alias = None
+    if data is None:
+        try:
+            alias = _source_alias(file_path or "")
+        except Exception as exc:
+            logger.debug("doc text alias lookup failed for %s: %s", file_path, exc)
+        if alias:
+            record = _resolve(alias)
+            if record:
+                return _from_record(record, alias, from_cache=True)
+        from backend.services.steve_document_memory import load_pdf_bytes
+
+        data, err = load_pdf_bytes(file_path or "")
+        if not data:
+            return ExtractedText(status=STATUS_FAILED, error=err)
+
+    key = content_key(data)
+    with _key_lock(key):
+        record = _load(key)
+        hit = record is not None
+        if record is None:
+            record = _run_extraction(data, MAX_PAGES)
+            if record.pop("transient", False):
+                return _from_record(record, None, from_cache=False)
+            _store(key, record)
+    if alias:
+        _store(alias, {"alias_of": key})
+    return _from_record(record, key, from_cache=hit)
+
+
+def warm_useful_docs(*, limit: int = 500) -> Dict[str, Any]:
+    """Extract and cache text for the newest ``limit`` useful_docs rows."""
+    from backend.services.database import get_db_connection
+
+    out: Dict[str, Any] = {"scanned": 0, "cached": 0, "extracted": 0, "failed": 0, "errors": []}
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(f"SELECT id, file_path FROM useful_docs ORDER BY created_at DESC LIMIT {int(limit)}")
+        rows = c.fetchall() or []
+    for row in rows:
+        doc_id = row["id"] if hasattr(row, "keys") else row[0]
+        file_path = row["file_path"] if hasattr(row, "keys") else row[1]
+        out["scanned"] += 1
+        result = extract_pages(file_path)
+        if result.status == STATUS_FAILED:
+            out["failed"] += 1
+            out["errors"].append({"doc_id": doc_id, "error": result.error})
+        elif result.from_cache:
+            out["cached"] += 1
+        else:
+            out["extracted"] += 1
+    return out
@@ -70,8 +70,8 @@ _openai_client = None
 def _get_openai_client():
     global _openai_client
     if _openai_client is None:
-        from openai import OpenAI
-        _openai_client = OpenAI(api_key=OPENAI_API_KEY)
+        from backend.services.llm_clients import PROVIDER_OPENAI, get_llm_client
+        _openai_client = get_llm_client(PROVIDER_OPENAI, api_key=OPENAI_API_KEY)
     return _openai_client
 
 
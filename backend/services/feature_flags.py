@@ -51,3 +51,235 @@ def entitlements_enforcement_enabled() -> bool:
     behaviour in production. Staging sets the env var to ``true``.
     """
     return is_enabled("ENTITLEMENTS_ENFORCEMENT_ENABLED", default=False)
+
+
+def dm_threads_summary_reads_enabled() -> bool:
+    """When on, /api/chat_threads reads the maintained ``dm_threads`` summary.
+
+    Writes keep the summary current regardless; flip this only after
+    ``scripts/rebuild_dm_threads.py --verify`` reports no drift.
+    """
+    return is_enabled("DM_THREADS_SUMMARY_READS", default=False)
+
+
+def message_outbox_enabled() -> bool:
+    """When on, DM / group / post sends hand side effects to the message outbox.
+
+    Push, notification rows, cache invalidation and Firestore dual-writes are
+    enqueued in the send transaction and applied by the outbox dispatcher
+    instead of inline in the request.
+    """
+    return is_enabled("MESSAGE_OUTBOX_ENABLED", default=False)
+
+
+def steve_dm_streaming_enabled() -> bool:
+    """When on, Steve DM replies stream from Grok and grow in place.
+
+    The reply row appears at the first token and is rewritten as text
+    arrives; clients read the partial text from ``steve_stream`` on
+    ``/get_messages``. Off keeps the single blocking call.
+    """
+    return is_enabled("STEVE_DM_STREAMING", default=False)
+
+
+def steve_parallel_context_enabled() -> bool:
+    """When on, Steve turns gather their context sources concurrently.
+
+    History, profile/KB context, thread memory, chat memory, counters and
+    tool routing run side by side with per-source deadlines; a late source is
+    skipped rather than delaying the reply. Off runs them one after another.
+    """
+    return is_enabled("STEVE_PARALLEL_CONTEXT", default=False)
+
+
+def steve_tool_router_local_classifier_enabled() -> bool:
+    """When on, confident local-classifier predictions replace router LLM calls.
+
+    The classifier is fitted from logged router decisions by the
+    ``/api/cron/steve/tool-router/train`` job; uncertain messages still go to
+    the LLM. The exact-text decision cache is used regardless of this flag.
+    """
+    return is_enabled("STEVE_TOOL_ROUTER_LOCAL_CLASSIFIER", default=False)
+
+
+def chat_recent_window_enabled() -> bool:
+    """When on, DM and group chat polls are served from a shared per-thread window.
+
+    ``since_id`` polls slice the cached last-N messages instead of querying
+    Firestore / MySQL; writes update the window in place. Off keeps every
+    poll on the backend read path.
+    """
+    return is_enabled("CHAT_RECENT_WINDOW", default=False)
+
+
+def post_detail_single_source_enabled() -> bool:
+    """When on, community post detail reads MySQL only and shares the viewer-independent part.
+
+    The post, reply tree, reaction counts, view counts and poll tallies are
+    built in a fixed number of batched queries and cached once per post; each
+    viewer only computes a small overlay (own reactions, stars, admin flag,
+    poll vote). Firestore is read only if MySQL fails. Off keeps the
+    Firestore-then-MySQL-hydration path.
+    """
+    return is_enabled("POST_DETAIL_SINGLE_SOURCE", default=False)
+
+
+def community_feed_shared_payload_enabled() -> bool:
+    """When on, community feeds are one shared payload per community plus a viewer overlay.
+
+    Writes bump a per-community version instead of deleting one cached feed
+    per member. Off keeps the per-``(community, viewer)`` response cache.
+    """
+    return is_enabled("COMMUNITY_FEED_SHARED_PAYLOAD", default=False)
+
+
+def dashboard_root_summary_enabled() -> bool:
+    """When on, the dashboard community list reads shared per-root summaries.
+
+    Member counts, last activity and descendant trees are cached once per root
+    network and dropped on writes; only the viewer's membership set and unread
+    counts are computed per request, and the per-user dashboard payload cache
+    (with its per-member invalidation fan-out) is bypassed.
+    """
+    return is_enabled("DASHBOARD_ROOT_SUMMARY", default=False)
+
+
+def scheduled_work_enabled() -> bool:
+    """When on, cron sweeps read due rows from the shared ``scheduled_work`` queue.
+
+    Poll / event reminders, Reminder Vault DMs and content generation jobs
+    enqueue their deadlines on write; the cron endpoints then claim only due
+    rows under a lease instead of scanning and parsing every source row.
+    Run ``POST /api/cron/scheduled-work/dispatch?seed=1`` once after turning
+    it on to enqueue rows that predate the flag.
+    """
+    return is_enabled("SCHEDULED_WORK_QUEUE", default=False)
+
+
+def community_unread_marks_enabled() -> bool:
+    """When on, community unread badges read maintained per-user counters.
+
+    ``community_unread_marks`` keeps a high-water mark, out-of-order views and
+    an unread counter per ``(user, community)``, updated on post create /
+    delete and first view, so badge reads are O(communities) instead of a
+    ``NOT EXISTS`` probe over every post in the user's communities. The write
+    hooks run regardless of the flag so counters stay current if it flips.
+    """
+    return is_enabled("COMMUNITY_UNREAD_MARKS", default=False)
+
+
+def batched_email_enabled() -> bool:
+    """When on, lifecycle sweeps and bulk invites send email in batches.
+
+    Candidates come back with their reservation / last-contact state in one
+    query, reservations are inserted in bulk, and messages go out through
+    ``transactional_email.send_batch`` (Resend batch API over a pooled
+    session) instead of one reservation, lookup and HTTP call per recipient.
+    """
+    return is_enabled("EMAIL_BATCH_SEND", default=False)
+
+
+def set_based_weekly_digests_enabled() -> bool:
+    """When on, the member digest and owner pulse sweeps run set-based.
+
+    Member candidates are ranked in one query over
+    ``community_daily_post_counts`` rollups, reservations go in as one
+    ``INSERT … SELECT`` / multi-row insert per run, and pushes are delivered
+    from ``weekly_push`` outbox rows instead of inline in the cron request.
+    """
+    return is_enabled("WEEKLY_DIGEST_SET_BASED", default=False)
+
+
+def story_tray_snapshot_enabled() -> bool:
+    """When on, community story trays are served from a cached snapshot.
+
+    The viewer-independent tray (stories, authors, reaction tallies) is cached
+    per community until its earliest ``expires_at`` or the next create /
+    delete / react; each request only overlays the viewer's seen set, itself
+    cached per ``(community, viewer)``. Off rebuilds the tray per request.
+    """
+    return is_enabled("STORY_TRAY_SNAPSHOT", default=False)
+
+
+def schema_version_gate_enabled() -> bool:
+    """When on, gated ``ensure_*`` helpers are no-ops once the schema is current.
+
+    ``schema_migrations`` records applied versions; after the database reports
+    ``schema_migrations.SCHEMA_VERSION`` the helpers stop issuing their
+    ``ALTER`` / ``SHOW TABLES`` / ``SELECT 1`` probes for the process lifetime.
+    Off keeps the per-call self-healing DDL.
+    """
+    return is_enabled("SCHEMA_VERSION_GATE", default=False)
+
+
+def cache_presence_enabled() -> bool:
+    """When on, presence and typing heartbeats live in TTL cache keys.
+
+    Group / DM "chat open" heartbeats and typing signals go through
+    ``backend.services.presence`` instead of upserting ``group_chat_presence``,
+    ``active_chat_status`` and ``typing_status``; push suppression asks for
+    every recipient in one multi-get. Off keeps the SQL tables.
+    """
+    return is_enabled("PRESENCE_CACHE", default=False)
+
+
+def document_text_cache_enabled() -> bool:
+    """When on, PDF text comes from the content-addressed ``document_text_cache``.
+
+    Steve's legacy resource context, document-memory indexing and CV import
+    parse each distinct PDF once, in a process pool with page / time budgets,
+    and reuse the stored per-page text afterwards. Off parses inline per call.
+    """
+    return is_enabled("DOC_TEXT_CACHE", default=False)
+
+
+def steve_doc_hybrid_index_enabled() -> bool:
+    """When on, Steve document excerpts come from an in-process hybrid chunk index.
+
+    ``steve_doc_chunk_index`` keeps every chunk of a scope in memory and ranks
+    them with BM25 plus embedding similarity fused by reciprocal rank, instead
+    of streaming the first 80 chunks per document from Firestore each turn.
+    """
+    return is_enabled("STEVE_DOC_HYBRID_INDEX", default=False)
+
+
+def outbound_http_cache_enabled() -> bool:
+    """When on, third-party lookups go through ``outbound_http``.
+
+    Giphy search, article reader / enrichment fetches, HEAD size probes,
+    YouTube transcripts and onboarding company intel share a pooled session,
+    per-host concurrency caps and a response cache with revalidation,
+    negative caching and stale-if-error. Off keeps the direct calls.
+    """
+    return is_enabled("OUTBOUND_HTTP_CACHE", default=False)
+
+
+def steve_url_enrichment_store_enabled() -> bool:
+    """When on, Steve profile link enrichment is shared across the community.
+
+    Extracted article text and transcripts are stored per canonical URL
+    (``url_enrichment_store``) and fetches / Whisper jobs run in staged,
+    process-wide pools. Off keeps the per-run fetch of every link.
+    """
+    return is_enabled("STEVE_URL_ENRICHMENT_STORE", default=False)
+
+
+def calendar_batched_events_enabled() -> bool:
+    """When on, calendar event lists and event detail / ICS hydrate in bulk.
+
+    RSVP tallies come from the maintained ``event_rsvp_counters`` rows and the
+    viewer's RSVPs from one lookup per page, instead of four queries per event
+    in ``community_calendar.shape_event``.
+    """
+    return is_enabled("CALENDAR_BATCHED_EVENTS", default=False)
+
+
+def rate_limit_sliding_window_enabled() -> bool:
+    """When on, ``rate_limit.allow`` uses the sliding-window log.
+
+    Decisions run in one server-side Redis script (``cache.sliding_window``)
+    instead of fixed-window counters, so no span of the window admits more
+    than the limit, and limited routes can return ``RateLimit-*`` /
+    ``Retry-After`` headers.
+    """
+    return is_enabled("RATE_LIMIT_SLIDING_WINDOW", default=False)
@@ -96,32 +96,25 @@ def write_steves_message_human_pair_thread(
         logger.warning("Firestore DM write (Steve human pair) failed (non-fatal): %s", e)
 
 
-def write_dm_message(sender: str, receiver: str, message_id: int, text: str = '',
-                     image_path: str = None, video_path: str = None,
-                     audio_path: str = None, audio_duration_seconds=None,
-                     audio_mime: str = None, audio_summary: str = None,
-                     media_paths=None, file_path: str = None, file_name: str = None,
-                     is_encrypted: bool = False, timestamp=None, client_key: str = None):
-    """Write a DM message to Firestore after MySQL insert.
-    Now includes media_paths array for grouped/multi-media (matches write_group_chat_message
-    and write_post; fixes DM Firestore read gap for send_dm_media calls)."""
-    if not USE_FIRESTORE_WRITES:
-        return
-    try:
-        fs = _get_client()
-        conv_id = _dm_conv_id(sender, receiver)
-        ts = timestamp if isinstance(timestamp, datetime) else datetime.utcnow()
-
-        conv_ref = fs.collection('dm_conversations').document(conv_id)
-        conv_ref.set({
+def _dm_message_ops(fs, sender: str, receiver: str, message_id: int, text: str = '',
+                    image_path: str = None, video_path: str = None,
+                    audio_path: str = None, audio_duration_seconds=None,
+                    audio_mime: str = None, audio_summary: str = None,
+                    media_paths=None, file_path: str = None, file_name: str = None,
+                    is_encrypted: bool = False, timestamp=None, client_key: str = None):
+    """``(ref, data, merge)`` writes for one DM message (shared by single + batch paths)."""
+    conv_id = _dm_conv_id(sender, receiver)
+    ts = timestamp if isinstance(timestamp, datetime) else datetime.utcnow()
+    conv_ref = fs.collection('dm_conversations').document(conv_id)
+    msg_ref = conv_ref.collection('messages').document(str(message_id))
+    return [
+        (conv_ref, {
             'participants': sorted([sender, receiver]),
             'last_message': (text or '')[:200],
             'last_sender': sender,
             'updated_at': ts,
-        }, merge=True)
-
-        msg_ref = conv_ref.collection('messages').document(str(message_id))
-        msg_ref.set({
+        }, True),
+        (msg_ref, {
             'mysql_id': message_id,
             'sender': sender,
             'receiver': receiver,
@@ -141,8 +134,40 @@ def write_dm_message(sender: str, receiver: str, message_id: int, text: str = ''
             'edited_at': None,
             'reaction': None,
             'reaction_by': None,
-        })
-        logger.debug(f"Firestore DM write: msg {message_id} in {conv_id}")
+        }, False),
+    ]
+
+
+def _apply_ops(ops) -> None:
+    for ref, data, merge in ops:
+        if merge:
+            ref.set(data, merge=True)
+        else:
+            ref.set(data)
+
+
+def write_dm_message(sender: str, receiver: str, message_id: int, text: str = '',
+                     image_path: str = None, video_path: str = None,
+                     audio_path: str = None, audio_duration_seconds=None,
+                     audio_mime: str = None, audio_summary: str = None,
+                     media_paths=None, file_path: str = None, file_name: str = None,
+                     is_encrypted: bool = False, timestamp=None, client_key: str = None):
+    """Write a DM message to Firestore after MySQL insert.
+    Now includes media_paths array for grouped/multi-media (matches write_group_chat_message
+    and write_post; fixes DM Firestore read gap for send_dm_media calls)."""
+    if not USE_FIRESTORE_WRITES:
+        return
+    try:
+        fs = _get_client()
+        _apply_ops(_dm_message_ops(
+            fs, sender, receiver, message_id, text=text,
+            image_path=image_path, video_path=video_path, audio_path=audio_path,
+            audio_duration_seconds=audio_duration_seconds, audio_mime=audio_mime,
+            audio_summary=audio_summary, media_paths=media_paths, file_path=file_path,
+            file_name=file_name, is_encrypted=is_encrypted, timestamp=timestamp,
+            client_key=client_key,
+        ))
+        logger.debug(f"Firestore DM write: msg {message_id} in {_dm_conv_id(sender, receiver)}")
     except Exception as e:
         logger.warning(f"Firestore DM write failed (non-fatal): {e}")
 
@@ -166,6 +191,24 @@ def edit_dm_message(sender: str, receiver: str, message_id: int, new_text: str,
         logger.warning(f"Firestore DM edit failed (non-fatal): {e}")
 
 
+def update_dm_message_stream(participant_a: str, participant_b: str, message_id: int,
+                             text: str, streaming: bool):
+    """Update a streaming Steve bubble's text in place (``streaming`` False on the final write)."""
+    if not USE_FIRESTORE_WRITES:
+        return
+    try:
+        fs = _get_client()
+        conv_ref = fs.collection('dm_conversations').document(_dm_conv_id(participant_a, participant_b))
+        conv_ref.collection('messages').document(str(message_id)).update({
+            'text': text or '',
+            'streaming': bool(streaming),
+        })
+        if not streaming:
+            conv_ref.set({'last_message': (text or '')[:200], 'updated_at': datetime.utcnow()}, merge=True)
+    except Exception as e:
+        logger.warning(f"Firestore DM stream update failed (non-fatal): {e}")
+
+
 def write_dm_reaction(sender: str, receiver: str, message_id: int,
                       reaction: str = None, reaction_by: str = None):
     """Update a DM message reaction in Firestore."""
@@ -180,25 +223,18 @@ def write_dm_reaction(sender: str, receiver: str, message_id: int,
         logger.warning(f"Firestore DM reaction write failed (non-fatal): {e}")
 
 
-def write_group_chat_message(group_id: int, message_id: int, sender: str,
-                             text: str = None, image_path: str = None,
-                             voice_path: str = None, video_path: str = None,
-                             audio_summary: str = None, media_paths=None,
-                             file_path: str = None, file_name: str = None,
-                             timestamp=None,
-                             client_key: str = None):
-    """Write a group chat message to Firestore after MySQL insert."""
-    if not USE_FIRESTORE_WRITES:
-        return
-    try:
-        fs = _get_client()
-        ts = timestamp if isinstance(timestamp, datetime) else datetime.utcnow()
-
-        group_ref = fs.collection('group_chats').document(str(group_id))
-        group_ref.set({'updated_at': ts}, merge=True)
-
-        msg_ref = group_ref.collection('messages').document(str(message_id))
-        msg_ref.set({
+def _group_chat_message_ops(fs, group_id: int, message_id: int, sender: str,
+                            text: str = None, image_path: str = None,
+                            voice_path: str = None, video_path: str = None,
+                            audio_summary: str = None, media_paths=None,
+                            file_path: str = None, file_name: str = None,
+                            timestamp=None, client_key: str = None):
+    ts = timestamp if isinstance(timestamp, datetime) else datetime.utcnow()
+    group_ref = fs.collection('group_chats').document(str(group_id))
+    msg_ref = group_ref.collection('messages').document(str(message_id))
+    return [
+        (group_ref, {'updated_at': ts}, True),
+        (msg_ref, {
             'mysql_id': message_id,
             'sender': sender,
             'text': text or '',
@@ -211,7 +247,28 @@ def write_group_chat_message(group_id: int, message_id: int, sender: str,
             'file_name': file_name,
             'client_key': client_key,
             'created_at': ts,
-        })
+        }, False),
+    ]
+
+
+def write_group_chat_message(group_id: int, message_id: int, sender: str,
+                             text: str = None, image_path: str = None,
+                             voice_path: str = None, video_path: str = None,
+                             audio_summary: str = None, media_paths=None,
+                             file_path: str = None, file_name: str = None,
+                             timestamp=None,
+                             client_key: str = None):
+    """Write a group chat message to Firestore after MySQL insert."""
+    if not USE_FIRESTORE_WRITES:
+        return
+    try:
+        fs = _get_client()
+        _apply_ops(_group_chat_message_ops(
+            fs, group_id, message_id, sender, text=text, image_path=image_path,
+            voice_path=voice_path, video_path=video_path, audio_summary=audio_summary,
+            media_paths=media_paths, file_path=file_path, file_name=file_name,
+            timestamp=timestamp, client_key=client_key,
+        ))
         logger.debug(f"Firestore group chat write: msg {message_id} in group {group_id}")
     except Exception as e:
         logger.warning(f"Firestore group chat write failed (non-fatal): {e}")
@@ -292,6 +349,32 @@ def update_group_chat_media(group_id: int, message_id: int,
         logger.warning("Firestore group media update failed (non-fatal): %s", e)
 
 
+def _post_ops(fs, post_id: int, username: str, content: str = '', community_id=None,
+              group_id=None, image_path: str = None, video_path: str = None,
+              audio_path: str = None, audio_summary: str = None,
+              post_type: str = 'community', timestamp=None, media_paths=None,
+              link_urls=None):
+    doc_id = f"gp_{post_id}" if post_type == 'group' else str(post_id)
+    ts = timestamp if isinstance(timestamp, datetime) else datetime.utcnow()
+    doc = {
+        'mysql_id': post_id,
+        'type': post_type,
+        'username': username,
+        'content': content or '',
+        'community_id': community_id,
+        'group_id': group_id,
+        'image_path': image_path,
+        'video_path': video_path,
+        'audio_path': audio_path,
+        'audio_summary': audio_summary,
+        'media_paths': media_paths,
+        'created_at': ts,
+    }
+    if link_urls:
+        doc['link_urls'] = link_urls
+    return [(fs.collection('posts').document(doc_id), doc, False)]
+
+
 def write_post(post_id: int, username: str, content: str = '', community_id=None,
                group_id=None, image_path: str = None, video_path: str = None,
                audio_path: str = None, audio_summary: str = None,
@@ -302,29 +385,63 @@ def write_post(post_id: int, username: str, content: str = '', community_id=None
         return
     try:
         fs = _get_client()
-        doc_id = f"gp_{post_id}" if post_type == 'group' else str(post_id)
-        ts = timestamp if isinstance(timestamp, datetime) else datetime.utcnow()
-        doc = {
-            'mysql_id': post_id,
-            'type': post_type,
-            'username': username,
-            'content': content or '',
-            'community_id': community_id,
-            'group_id': group_id,
-            'image_path': image_path,
-            'video_path': video_path,
-            'audio_path': audio_path,
-            'audio_summary': audio_summary,
-            'media_paths': media_paths,
-            'created_at': ts,
-        }
-        if link_urls:
-            doc['link_urls'] = link_urls
-        fs.collection('posts').document(doc_id).set(doc)
+        _apply_ops(_post_ops(
+            fs, post_id, username, content=content, community_id=community_id,
+            group_id=group_id, image_path=image_path, video_path=video_path,
+            audio_path=audio_path, audio_summary=audio_summary, post_type=post_type,
+            timestamp=timestamp, media_paths=media_paths, link_urls=link_urls,
+        ))
     except Exception as e:
         logger.warning(f"Firestore post write failed (non-fatal): {e}")
 
 
+# Firestore caps a WriteBatch at 500 operations.
+FIRESTORE_BATCH_MAX_OPS = 500
+
+_BATCH_OP_BUILDERS = {
+    'dm_message': _dm_message_ops,
+    'group_chat_message': _group_chat_message_ops,
+    'post': _post_ops,
+}
+
+
+def write_batch(items) -> int:
+    """Apply many dual-writes through ``WriteBatch`` commits (outbox dispatcher).
+
+    ``items`` is an iterable of ``(op, kwargs)`` with ``op`` in
+    ``_BATCH_OP_BUILDERS``; callers pass the row's stored ``timestamp`` so
+    ``created_at`` is the send time, not the drain time. Message / post docs
+    are *created*, never overwritten: a doc that already exists (an earlier
+    attempt got through, then edits or reactions landed on it) is left
+    alone. Unlike the single-write helpers this RAISES on a failed commit so
+    the caller can retry. Returns the number of items written.
+    """
+    if not USE_FIRESTORE_WRITES:
+        return 0
+    fs = _get_client()
+    ops = []
+    count = 0
+    for op, kwargs in items:
+        builder = _BATCH_OP_BUILDERS.get(op)
+        if builder is None:
+            raise ValueError(f"unknown Firestore batch op: {op}")
+        ops.extend(builder(fs, **kwargs))
+        count += 1
+    create_refs = [ref for ref, _data, merge in ops if not merge]
+    existing = set()
+    if create_refs:
+        existing = {snap.reference.path for snap in fs.get_all(create_refs) if snap.exists}
+    for start in range(0, len(ops), FIRESTORE_BATCH_MAX_OPS):
+        batch = fs.batch()
+        for ref, data, merge in ops[start:start + FIRESTORE_BATCH_MAX_OPS]:
+            if merge:
+                batch.set(ref, data, merge=True)
+            elif ref.path not in existing:
+                batch.create(ref, data)
+        batch.commit()
+    return count
+
+
 def update_post(post_id: int, content: str = None, image_path: str = None,
                 video_path: str = None, remove_media: bool = False,
                 post_type: str = 'community'):
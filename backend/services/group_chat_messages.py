@@ -8,11 +8,46 @@ from datetime import datetime
 from typing import Optional, Tuple
 
 from backend.services.database import USE_MYSQL, get_db_connection, get_sql_placeholder
+from backend.services.feature_flags import chat_recent_window_enabled
 from backend.services.steve_dm_typing import is_group_typing
 
 logger = logging.getLogger(__name__)
 
 
+def _record_group_read_receipt(group_id: int, username: str, max_id: int) -> None:
+    """Advance the member's read receipt to ``max_id`` (window-served polls)."""
+    now_str = datetime.now().isoformat()
+    ph = get_sql_placeholder()
+    try:
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            if USE_MYSQL:
+                c.execute(
+                    f"""
+                    INSERT INTO group_chat_read_receipts (group_id, username, last_read_message_id, last_read_at)
+                    VALUES ({ph}, {ph}, {ph}, {ph})
+                    ON DUPLICATE KEY UPDATE
+                        last_read_message_id = GREATEST(last_read_message_id, VALUES(last_read_message_id)),
+                        last_read_at = VALUES(last_read_at)
+                """,
+                    (group_id, username, max_id, now_str),
+                )
+            else:
+                c.execute(
+                    f"""
+                    INSERT INTO group_chat_read_receipts (group_id, username, last_read_message_id, last_read_at)
+                    VALUES ({ph}, {ph}, {ph}, {ph})
+                    ON CONFLICT(group_id, username) DO UPDATE SET
+                        last_read_message_id = MAX(last_read_message_id, {ph}),
+                        last_read_at = {ph}
+                """,
+                    (group_id, username, max_id, now_str, max_id, now_str),
+                )
+            conn.commit()
+    except Exception as rr_err:
+        logger.warning("Failed to update read receipt on recent-window path: %s", rr_err)
+
+
 def fetch_group_messages(
     username: str,
     group_id: int,
@@ -28,6 +63,30 @@ def fetch_group_messages(
         since_id = None
     limit = min(limit, 100)
 
+    # Shared per-thread recent window. Members are checked against the
+    # window's member map; anyone else falls through to the fail-closed gate.
+    if not before_id and chat_recent_window_enabled():
+        served = None
+        try:
+            from backend.services.chat_recent_window import group_window_messages
+
+            served = group_window_messages(username, group_id, since_id=since_id, limit=limit)
+        except Exception as win_err:
+            logger.warning("Group recent window read failed, falling back: %s", win_err)
+        if served is not None:
+            messages, has_more = served
+            if messages:
+                _record_group_read_receipt(group_id, username, max(m["id"] for m in messages))
+            return (
+                {
+                    "success": True,
+                    "messages": messages,
+                    "steve_is_typing": is_group_typing(group_id),
+                    "has_more": has_more,
+                },
+                200,
+            )
+
     # SECURITY (privacy IDOR): verify the requester is a member of this group
     # BEFORE reading any messages, regardless of backend. The Firestore read
     # branch below performs no authorization of its own, so without this gate
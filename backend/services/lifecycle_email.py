@@ -27,7 +27,7 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from backend.services import i18n
 from backend.services import email_preferences
@@ -100,6 +100,54 @@ def user_email_and_locale(username: str) -> tuple[Optional[str], str]:
     return (str(email).strip() if email else None), locale
 
 
+def users_email_and_locale(usernames: Iterable[str]) -> Dict[str, Tuple[Optional[str], str]]:
+    """Bulk :func:`user_email_and_locale`: one query for a sweep's recipients.
+
+    Keys are the usernames as passed in; unknown users are omitted.
+    """
+    names = list(dict.fromkeys(u for u in usernames if u))
+    if not names:
+        return {}
+    ph = get_sql_placeholder()
+    out: Dict[str, Tuple[Optional[str], str]] = {}
+    for start in range(0, len(names), 500):
+        chunk = names[start:start + 500]
+        placeholders = ",".join([ph] * len(chunk))
+        rows = None
+        n_cols = 0
+        for cols in ("email, preferred_locale, signup_locale", "email, preferred_locale", "email"):
+            try:
+                with get_db_connection() as conn:
+                    c = conn.cursor()
+                    c.execute(
+                        f"SELECT username, {cols} FROM users WHERE username IN ({placeholders})",
+                        tuple(chunk),
+                    )
+                    rows = c.fetchall() or []
+                n_cols = cols.count(",") + 1
+                break
+            except Exception:
+                continue
+        if rows is None:
+            logger.warning("users_email_and_locale lookup failed for %d users", len(chunk))
+            continue
+        by_lower = {u.lower(): u for u in chunk}
+        for row in rows:
+            if hasattr(row, "keys"):
+                vals = [row.get(k) for k in ("username", "email", "preferred_locale", "signup_locale")]
+            else:
+                vals = list(row) + [None] * 3
+            uname, email = vals[0], vals[1]
+            preferred = vals[2] if n_cols >= 2 else None
+            signup = vals[3] if n_cols >= 3 else None
+            key = by_lower.get(str(uname or "").lower())
+            if key is None:
+                continue
+            locale = i18n.match_locale(preferred) or i18n.match_locale(signup) or i18n.DEFAULT_LOCALE
+            out[key] = ((str(email).strip() if email else None), locale)
+    return out
+
+
 def render_footer(locale: str, token: str) -> tuple[str, str]:
     """(html, text) unsubscribe + legal footer in the recipient's locale.
 
@@ -124,7 +172,7 @@ def render_footer(locale: str, token: str) -> tuple[str, str]:
     return html, text
 
 
-def send(
+def prepare(
     username: str,
     *,
     kind: str,
@@ -132,36 +180,40 @@ def send(
     html: str,
     text: Optional[str] = None,
     category: str = CATEGORY_LIFECYCLE,
-) -> str:
-    """Send one lifecycle/marketing email to ``username``.
+    email: Optional[str] = None,
+    locale: Optional[str] = None,
+) -> Tuple[str, Optional[transactional_email.OutboundEmail]]:
+    """Consent checks + footer/headers for one recipient, without sending.
 
-    Returns a status string for cron counters:
-    ``"sent" | "disabled" | "suppressed" | "no_email" | "error"``.
+    Returns ``("ready", message)`` or ``(status, None)`` with ``status`` one
+    of ``"disabled" | "suppressed" | "no_email" | "error"``. ``email`` /
+    ``locale`` may be passed when the caller already bulk-loaded them.
     """
     if category not in (CATEGORY_LIFECYCLE, CATEGORY_MARKETING):
         raise ValueError(f"lifecycle_email.send got non-lifecycle category {category!r}")
     if not _enabled():
-        return "disabled"
+        return "disabled", None
 
-    email, _locale = user_email_and_locale(username)
+    if email is None or locale is None:
+        email, locale = user_email_and_locale(username)
     if not email:
-        return "no_email"
+        return "no_email", None
     if not email_preferences.may_send(username, category=category):
-        return "suppressed"
+        return "suppressed", None
     prefs = email_preferences.get_or_create(username, email)
     if not prefs:
-        return "error"
+        return "error", None
     # Re-check on the fresh row: get_or_create may have surfaced a
     # concurrent opt-out the earlier read missed.
     if int(prefs.get("hard_suppressed") or 0):
-        return "suppressed"
+        return "suppressed", None
     if category == CATEGORY_LIFECYCLE and int(prefs.get("lifecycle_optout") or 0):
-        return "suppressed"
+        return "suppressed", None
     if category == CATEGORY_MARKETING and not int(prefs.get("marketing_optin") or 0):
-        return "suppressed"
+        return "suppressed", None
 
     token = prefs["unsubscribe_token"]
-    footer_html, footer_text = render_footer(_locale, token)
+    footer_html, footer_text = render_footer(locale, token)
     if FOOTER_PLACEHOLDER in html:
         html = html.replace(FOOTER_PLACEHOLDER, footer_html)
     else:
@@ -179,9 +231,12 @@ def send(
         "List-Unsubscribe": f"<{unsubscribe_url(token)}>",
         "List-Unsubscribe-Post": "List-Unsubscribe=One-Click",
     }
-    ok = transactional_email.send(email, subject, html, text=text, headers=headers)
-    if not ok:
-        return "error"
+    return "ready", transactional_email.OutboundEmail(
+        to_email=email, subject=subject, html=html, text=text, headers=headers,
+    )
+
+
+def _record_sent(username: str, kind: str) -> None:
     try:
         from backend.services import retention_events
 
@@ -193,4 +248,70 @@ def send(
         )
     except Exception:
         logger.warning("lifecycle send instrumentation failed for %s", username, exc_info=True)
+
+
+def send(
+    username: str,
+    *,
+    kind: str,
+    subject: str,
+    html: str,
+    text: Optional[str] = None,
+    category: str = CATEGORY_LIFECYCLE,
+) -> str:
+    """Send one lifecycle/marketing email to ``username``.
+
+    Returns a status string for cron counters:
+    ``"sent" | "disabled" | "suppressed" | "no_email" | "error"``.
+    """
+    status, message = prepare(
+        username, kind=kind, subject=subject, html=html, text=text, category=category,
+    )
+    if message is None:
+        return status
+    ok = transactional_email.send(
+        message.to_email, message.subject, message.html,
+        text=message.text, headers=message.headers,
+    )
+    if not ok:
+        return "error"
+    _record_sent(username, kind)
     return "sent"
+
+
+def send_many(items: List[Dict[str, Any]], *, category: str = CATEGORY_LIFECYCLE) -> List[str]:
+    """Batched :func:`send`: same consent rules, one provider batch per 100.
+
+    Each item carries ``username``, ``kind``, ``subject``, ``html`` and
+    optionally ``text`` / ``email`` / ``locale``. Returns one status per
+    item in order, using :func:`send`'s vocabulary plus ``"retryable"``
+    when the provider stayed throttled/unavailable after retries.
+    """
+    if category not in (CATEGORY_LIFECYCLE, CATEGORY_MARKETING):
+        raise ValueError(f"lifecycle_email.send_many got non-lifecycle category {category!r}")
+    statuses: List[str] = []
+    ready: List[int] = []
+    messages: List[transactional_email.OutboundEmail] = []
+    for idx, item in enumerate(items):
+        try:
+            status, message = prepare(
+                item["username"], kind=item["kind"], subject=item["subject"],
+                html=item["html"], text=item.get("text"), category=category,
+                email=item.get("email"), locale=item.get("locale"),
+            )
+        except Exception:
+            logger.warning("lifecycle prepare failed for %s", item.get("username"), exc_info=True)
+            status, message = "error", None
+        statuses.append(status)
+        if message is not None:
+            ready.append(idx)
+            messages.append(message)
+    for idx, outcome in zip(ready, transactional_email.send_batch(messages)):
+        if outcome == transactional_email.STATUS_SENT:
+            statuses[idx] = "sent"
+            _record_sent(items[idx]["username"], items[idx]["kind"])
+        elif outcome == transactional_email.STATUS_RETRYABLE:
+            statuses[idx] = "retryable"
+        else:
+            statuses[idx] = "error"
+    return statuses
@@ -26,8 +26,9 @@ from __future__ import annotations
 
 import logging
 import os
+import uuid
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from backend.services import lifecycle_email
 from backend.services import lifecycle_email_templates as templates
@@ -36,6 +37,8 @@ from backend.services.database import USE_MYSQL, get_db_connection, get_sql_plac
 logger = logging.getLogger(__name__)
 
 DEFAULT_MAX_SENDS = 200
+# Recipients per reservation insert / provider batch in the batched stage.
+SEND_BATCH_SIZE = 100
 
 KIND_WELCOME = "welcome"
 KIND_NO_COMMUNITY = "no_community_nudge"
@@ -59,6 +62,7 @@ CREATE TABLE IF NOT EXISTS lifecycle_email_sends (
     recipient VARCHAR(191) NOT NULL,
     kind VARCHAR(32) NOT NULL,
     sent_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    batch_id VARCHAR(32) NULL,
     UNIQUE KEY uq_lifecycle_send (recipient, kind)
 )
 """
@@ -68,6 +72,7 @@ CREATE TABLE IF NOT EXISTS lifecycle_email_sends (
     recipient TEXT NOT NULL,
     kind TEXT NOT NULL,
     sent_at TEXT DEFAULT (datetime('now')),
+    batch_id TEXT,
     UNIQUE (recipient, kind)
 )
 """
@@ -123,6 +128,96 @@ def _try_reserve(conn, cursor, recipient: str, kind: str) -> bool:
         return False
 
 
+_batch_column_ready = False
+
+
+def _ensure_batch_column(cursor) -> None:
+    """``batch_id`` tags the rows one bulk reservation actually inserted."""
+    global _batch_column_ready
+    if _batch_column_ready:
+        return
+    try:
+        cursor.execute("SELECT batch_id FROM lifecycle_email_sends LIMIT 1")
+        cursor.fetchall()
+    except Exception:
+        try:
+            cursor.execute(
+                "ALTER TABLE lifecycle_email_sends ADD COLUMN batch_id "
+                + ("VARCHAR(32) NULL" if USE_MYSQL else "TEXT")
+            )
+        except Exception:  # pragma: no cover - concurrent ALTER / limited env
+            logger.warning("could not add lifecycle_email_sends.batch_id", exc_info=True)
+            return
+    _batch_column_ready = True
+
+
+def _reserve_many(conn, cursor, recipients: List[str], kind: str) -> Set[str]:
+    """Bulk INSERT-first reservation; returns the recipients this call won.
+
+    One multi-row ``INSERT IGNORE`` tagged with a fresh ``batch_id``, then
+    one read-back of the tag — rows that already existed (earlier send or a
+    concurrent sweep) keep their old tag and are reported as lost.
+    """
+    if not recipients:
+        return set()
+    ph = get_sql_placeholder()
+    batch_id = uuid.uuid4().hex
+    now = _fmt(_now())
+    verb = "INSERT IGNORE" if USE_MYSQL else "INSERT OR IGNORE"
+    values = ",".join([f"({ph}, {ph}, {ph}, {ph})"] * len(recipients))
+    params: List[Any] = []
+    for recipient in recipients:
+        params.extend((recipient, kind, now, batch_id))
+    cursor.execute(
+        f"{verb} INTO lifecycle_email_sends (recipient, kind, sent_at, batch_id) VALUES {values}",
+        tuple(params),
+    )
+    try:
+        conn.commit()
+    except Exception:
+        pass
+    cursor.execute(
+        f"SELECT recipient FROM lifecycle_email_sends WHERE kind = {ph} AND batch_id = {ph}",
+        (kind, batch_id),
+    )
+    won = {
+        (r["recipient"] if hasattr(r, "keys") else r[0]) for r in cursor.fetchall() or []
+    }
+    return {recipient for recipient in recipients if recipient in won}
+
+
+def _release_many(conn, cursor, recipients: List[str], kind: str) -> None:
+    """Bulk :func:`_release_reservation` for skips known before sending."""
+    if not recipients:
+        return
+    ph = get_sql_placeholder()
+    placeholders = ",".join([ph] * len(recipients))
+    try:
+        cursor.execute(
+            f"DELETE FROM lifecycle_email_sends WHERE kind = {ph} AND recipient IN ({placeholders})",
+            (kind,) + tuple(recipients),
+        )
+        try:
+            conn.commit()
+        except Exception:
+            pass
+    except Exception:
+        logger.warning("bulk reservation release failed for kind %s", kind, exc_info=True)
+
+
+def _chunks(items: List[Any], size: int) -> List[List[Any]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _contacted_since(last_contacted_at: Any, *, within_hours: int = MIN_GAP_HOURS) -> bool:
+    """``_recently_contacted`` on a value the candidate query already joined."""
+    if not last_contacted_at:
+        return False
+    if isinstance(last_contacted_at, datetime):
+        last_contacted_at = _fmt(last_contacted_at)
+    return str(last_contacted_at) >= _fmt(_now() - timedelta(hours=within_hours))
+
+
 def _already_sent(cursor, recipient: str, kind: str) -> bool:
     ph = get_sql_placeholder()
     try:
@@ -200,6 +295,37 @@ def _first_community_name(cursor, username: str) -> Optional[str]:
     return row["name"] if hasattr(row, "keys") else row[0]
 
 
+def _first_community_names(cursor, usernames: List[str]) -> Dict[str, str]:
+    """Bulk :func:`_first_community_name` for one batch of recipients."""
+    if not usernames:
+        return {}
+    ph = get_sql_placeholder()
+    placeholders = ",".join([ph] * len(usernames))
+    try:
+        cursor.execute(
+            f"""
+            SELECT u.username, co.name
+            FROM user_communities uc
+            JOIN users u ON u.id = uc.user_id
+            JOIN communities co ON co.id = uc.community_id
+            WHERE u.username IN ({placeholders})
+            ORDER BY uc.joined_at ASC, uc.id ASC
+            """,
+            tuple(usernames),
+        )
+        rows = cursor.fetchall() or []
+    except Exception:
+        return {}
+    by_lower = {u.lower(): u for u in usernames}
+    out: Dict[str, str] = {}
+    for r in rows:
+        uname = r["username"] if hasattr(r, "keys") else r[0]
+        key = by_lower.get(str(uname or "").lower())
+        if key and key not in out:
+            out[key] = r["name"] if hasattr(r, "keys") else r[1]
+    return out
+
+
 def _verified_filter_sql() -> str:
     # OAuth users skip email verification; their rows carry provider ids.
     return (
@@ -271,6 +397,12 @@ def run_welcome_sweep(*, dry_run: bool = False, max_sends: int = DEFAULT_MAX_SEN
             result["error"] = "WELCOME_EMAIL_ENABLED is off"
             return result
 
+        from backend.services.feature_flags import batched_email_enabled
+
+        if batched_email_enabled():
+            _send_welcome_batched(conn, c, candidates[: max(0, int(max_sends))], result)
+            return result
+
         for cand in candidates[: max(0, int(max_sends))]:
             username = cand["username"]
             try:
@@ -310,12 +442,68 @@ def run_welcome_sweep(*, dry_run: bool = False, max_sends: int = DEFAULT_MAX_SEN
     return result
 
 
+def _send_welcome_batched(conn, cursor, candidates: List[Dict[str, Any]], result: Dict[str, Any]) -> None:
+    """Batched stage of :func:`run_welcome_sweep`: reserve, render, send per 100."""
+    _ensure_batch_column(cursor)
+    for chunk in _chunks([cand["username"] for cand in candidates], SEND_BATCH_SIZE):
+        try:
+            won = _reserve_many(conn, cursor, chunk, KIND_WELCOME)
+        except Exception as exc:
+            logger.error("welcome sweep reservation failed: %s", exc, exc_info=True)
+            result["errors"] += len(chunk)
+            continue
+        result["skipped_dedup"] += len(chunk) - len(won)
+        names = [u for u in chunk if u in won]
+        communities = _first_community_names(cursor, names)
+        contacts = lifecycle_email.users_email_and_locale(names)
+        items: List[Dict[str, Any]] = []
+        for username in names:
+            community = communities.get(username)
+            variant = "welcome_member" if community else "welcome_owner"
+            email, locale = contacts.get(username, (None, None))
+            cta_url = _cta_url(variant)
+            if community:
+                subject, html, text = templates.render_welcome_member(
+                    community_name=community, logo_url=_logo_url(),
+                    cta_url=cta_url, locale=locale,
+                )
+            else:
+                subject, html, text = templates.render_welcome_owner(
+                    logo_url=_logo_url(), cta_url=cta_url, locale=locale,
+                )
+            items.append({
+                "username": username, "kind": variant, "subject": subject,
+                "html": html, "text": text, "email": email or "",
+                "locale": locale or "en",
+            })
+        release: List[str] = []
+        for item, status in zip(items, lifecycle_email.send_many(items)):
+            if status == "sent":
+                result["sent"] += 1
+            elif status in ("suppressed", "no_email"):
+                result["skipped_suppressed"] += 1
+                release.append(item["username"])
+            elif status == "disabled":
+                result["skipped_disabled"] += 1
+                release.append(item["username"])
+            elif status == "retryable":
+                # Provider never accepted it: free the slot for the next sweep.
+                result["errors"] += 1
+                release.append(item["username"])
+            else:
+                # Real send failure: reservation stands (at-most-once).
+                result["errors"] += 1
+        _release_many(conn, cursor, release, KIND_WELCOME)
+
+
 def _no_community_candidates(cursor) -> List[Dict[str, Any]]:
     ph = get_sql_placeholder()
     newest = _fmt(_now() - timedelta(hours=NO_COMMUNITY_MIN_AGE_HOURS))
     oldest = _fmt(_now() - timedelta(hours=NO_COMMUNITY_MAX_AGE_HOURS))
     base = f"""
-        SELECT u.username
+        SELECT u.username,
+               (SELECT MAX(s2.sent_at) FROM lifecycle_email_sends s2
+                WHERE s2.recipient = u.username) AS last_contacted_at
         FROM users u
         WHERE u.created_at <= {ph} AND u.created_at >= {ph}
         {_EXCLUDED_EMAIL_SQL}
@@ -340,7 +528,10 @@ def _no_community_candidates(cursor) -> List[Dict[str, Any]]:
         )
     rows = cursor.fetchall() or []
     return [
-        {"username": (r["username"] if hasattr(r, "keys") else r[0])}
+        {
+            "username": (r["username"] if hasattr(r, "keys") else r[0]),
+            "last_contacted_at": (r["last_contacted_at"] if hasattr(r, "keys") else r[1]),
+        }
         for r in rows
     ]
 
@@ -352,7 +543,9 @@ def _empty_community_candidates(cursor) -> List[Dict[str, Any]]:
     oldest = _fmt(_now() - timedelta(hours=EMPTY_COMMUNITY_MAX_AGE_HOURS))
     cursor.execute(
         f"""
-        SELECT co.id, co.name, co.creator_username
+        SELECT co.id, co.name, co.creator_username,
+               (SELECT MAX(s2.sent_at) FROM lifecycle_email_sends s2
+                WHERE s2.recipient = co.creator_username) AS last_contacted_at
         FROM communities co
         JOIN users u ON u.username = co.creator_username
         WHERE co.created_at <= {ph} AND co.created_at >= {ph}
@@ -382,6 +575,7 @@ def _empty_community_candidates(cursor) -> List[Dict[str, Any]]:
             "community_id": int(r["id"] if hasattr(r, "keys") else r[0]),
             "community": r["name"] if hasattr(r, "keys") else r[1],
             "owner": owner,
+            "last_contacted_at": r["last_contacted_at"] if hasattr(r, "keys") else r[3],
         })
     return out
 
@@ -436,6 +630,31 @@ def run_activation_nudge_sweep(
             result["error"] = "ACTIVATION_NUDGE_EMAIL_ENABLED is off"
             return result
 
+        from backend.services.feature_flags import batched_email_enabled
+
+        if batched_email_enabled():
+            queue: List[Tuple[str, Dict[str, Any], str, Callable[[str], Tuple[str, str, str]]]] = [
+                (
+                    "no_community", cand, KIND_NO_COMMUNITY,
+                    lambda locale: templates.render_no_community_nudge(
+                        logo_url=_logo_url(), cta_url=_cta_url(KIND_NO_COMMUNITY),
+                        locale=locale,
+                    ),
+                )
+                for cand in no_comm
+            ] + [
+                (
+                    "empty_community", cand, KIND_EMPTY_COMMUNITY,
+                    lambda locale, _cand=cand: templates.render_empty_community_nudge(
+                        community_name=_cand["community"], logo_url=_logo_url(),
+                        cta_url=_cta_url(KIND_EMPTY_COMMUNITY), locale=locale,
+                    ),
+                )
+                for cand in empty_comm
+            ]
+            _send_nudges_batched(conn, c, queue, result, sends_budget)
+            return result
+
         def _dispatch(bucket: str, recipient: str, kind: str, render) -> None:
             nonlocal sends_budget
             counters = result[bucket]
@@ -487,6 +706,87 @@ def run_activation_nudge_sweep(
     return result
 
 
+def _send_nudges_batched(
+    conn,
+    cursor,
+    queue: List[Tuple[str, Dict[str, Any], str, Callable[[str], Tuple[str, str, str]]]],
+    result: Dict[str, Any],
+    sends_budget: int,
+) -> None:
+    """Batched stage of :func:`run_activation_nudge_sweep`.
+
+    Contact spacing comes from the candidates' joined ``last_contacted_at``
+    plus the recipients this run already mailed, instead of one lookup per
+    recipient. Each round takes at most ``sends_budget`` fresh candidates, so
+    the budget holds exactly as in the one-at-a-time loop.
+    """
+    _ensure_batch_column(cursor)
+    contacted: Set[str] = set()
+    pos = 0
+    while sends_budget > 0 and pos < len(queue):
+        round_items: List[Tuple[str, str, str, Callable[[str], Tuple[str, str, str]]]] = []
+        while pos < len(queue) and len(round_items) < min(sends_budget, SEND_BATCH_SIZE):
+            bucket, cand, kind, render = queue[pos]
+            pos += 1
+            recipient = cand.get("owner") or cand.get("username")
+            key = str(recipient or "").lower()
+            if key in contacted or _contacted_since(cand.get("last_contacted_at")):
+                result[bucket]["skipped"] += 1
+                continue
+            contacted.add(key)
+            round_items.append((bucket, recipient, kind, render))
+
+        won_by_kind: Dict[str, Set[str]] = {}
+        failed_kinds: Set[str] = set()
+        for kind in {item[2] for item in round_items}:
+            recipients = [item[1] for item in round_items if item[2] == kind]
+            try:
+                won_by_kind[kind] = _reserve_many(conn, cursor, recipients, kind)
+            except Exception as exc:
+                logger.error("activation nudge (%s) reservation failed: %s", kind, exc, exc_info=True)
+                failed_kinds.add(kind)
+
+        contacts = lifecycle_email.users_email_and_locale([item[1] for item in round_items])
+        batch: List[Tuple[str, str, str]] = []
+        items: List[Dict[str, Any]] = []
+        for bucket, recipient, kind, render in round_items:
+            if kind in failed_kinds:
+                result[bucket]["errors"] += 1
+                continue
+            if recipient not in won_by_kind[kind]:
+                result[bucket]["skipped"] += 1
+                continue
+            email, locale = contacts.get(recipient, (None, None))
+            try:
+                subject, html, text = render(locale)
+            except Exception as exc:
+                logger.error("activation nudge (%s) render failed for %s: %s", kind, recipient, exc, exc_info=True)
+                result[bucket]["errors"] += 1
+                continue
+            batch.append((bucket, recipient, kind))
+            items.append({
+                "username": recipient, "kind": kind, "subject": subject, "html": html,
+                "text": text, "email": email or "", "locale": locale or "en",
+            })
+
+        release: Dict[str, List[str]] = {}
+        for (bucket, recipient, kind), status in zip(batch, lifecycle_email.send_many(items)):
+            counters = result[bucket]
+            if status == "sent":
+                counters["sent"] += 1
+                sends_budget -= 1
+            elif status in ("suppressed", "no_email", "disabled"):
+                counters["skipped"] += 1
+                release.setdefault(kind, []).append(recipient)
+            elif status == "retryable":
+                counters["errors"] += 1
+                release.setdefault(kind, []).append(recipient)
+            else:
+                counters["errors"] += 1
+        for kind, recipients in release.items():
+            _release_many(conn, cursor, recipients, kind)
+
+
 def _verification_candidates(cursor) -> List[Dict[str, Any]]:
     ph = get_sql_placeholder()
     # pending_signups timestamps are isoformat ('T' separator) — build both
@@ -563,6 +863,14 @@ def run_verification_reminder_sweep(
             from bodybuilding_app import generate_pending_signup_token
             token_factory = generate_pending_signup_token
 
+        from backend.services.feature_flags import batched_email_enabled
+
+        if batched_email_enabled():
+            _send_verification_batched(
+                conn, c, candidates[: max(0, int(max_sends))], result, token_factory,
+            )
+            return result
+
         for cand in candidates[: max(0, int(max_sends))]:
             recipient_key = cand["email"].strip().lower()
             if not recipient_key:
@@ -588,3 +896,52 @@ def run_verification_reminder_sweep(
                 )
                 result["errors"] += 1
     return result
+
+
+def _send_verification_batched(
+    conn, cursor, candidates: List[Dict[str, Any]], result: Dict[str, Any], token_factory,
+) -> None:
+    """Batched stage of :func:`run_verification_reminder_sweep`."""
+    from backend.services import transactional_email
+
+    _ensure_batch_column(cursor)
+    keyed = [(cand["email"].strip().lower(), cand) for cand in candidates if cand["email"].strip()]
+    for chunk in _chunks(keyed, SEND_BATCH_SIZE):
+        try:
+            won = _reserve_many(conn, cursor, [key for key, _ in chunk], KIND_VERIFICATION_REMINDER)
+        except Exception as exc:
+            logger.error("verification reminder reservation failed: %s", exc, exc_info=True)
+            result["errors"] += len(chunk)
+            continue
+        messages: List[transactional_email.OutboundEmail] = []
+        message_keys: List[str] = []
+        for key, cand in chunk:
+            if key not in won:
+                result["skipped_dedup"] += 1
+                continue
+            try:
+                token = token_factory(cand["pending_id"], cand["email"])
+                verify_url = f"{lifecycle_email.public_base_url()}/verify_email?token={token}"
+                subject, html, text = templates.render_verification_reminder(
+                    verify_url=verify_url, logo_url=_logo_url(), locale=None,
+                )
+            except Exception as exc:
+                logger.error(
+                    "verification reminder failed for pending id %s: %s",
+                    cand.get("pending_id"), exc, exc_info=True,
+                )
+                result["errors"] += 1
+                continue
+            messages.append(transactional_email.OutboundEmail(
+                to_email=cand["email"], subject=subject, html=html, text=text,
+            ))
+            message_keys.append(key)
+        retry_later: List[str] = []
+        for key, status in zip(message_keys, transactional_email.send_batch(messages)):
+            if status == transactional_email.STATUS_SENT:
+                result["sent"] += 1
+            else:
+                result["errors"] += 1
+                if status == transactional_email.STATUS_RETRYABLE:
+                    retry_later.append(key)
+        _release_many(conn, cursor, retry_later, KIND_VERIFICATION_REMINDER)
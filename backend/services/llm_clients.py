@@ -0,0 +1,475 @@
+"""Process-wide LLM / embedding client registry.
+
+Every xAI, OpenAI and Anthropic call goes through :func:`get_llm_client`
+instead of constructing an SDK client per call. Clients are cached per
+(provider, base URL, key, timeout, retries) and all clients for one
+provider + base URL share a single keep-alive ``httpx`` pool, so TLS and
+connection setup happen once per process rather than once per Steve turn.
+
+The shared pool's transport also enforces a per-provider concurrency cap
+(``LLM_<PROVIDER>_MAX_CONCURRENCY``) and records per-provider metrics —
+in-flight calls, latency percentiles, SDK retries and 429s — readable via
+:func:`llm_client_metrics` (``GET /api/admin/llm_clients``).
+
+``LLM_STUB_PROVIDER=1`` (or :func:`set_stub_client` in tests) makes every
+lookup return :class:`StubLLMClient`, a canned offline responder for local
+runs without provider keys.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import logging
+import os
+import threading
+import time
+from collections import deque
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PROVIDER_XAI = "xai"
+PROVIDER_OPENAI = "openai"
+PROVIDER_ANTHROPIC = "anthropic"
+
+XAI_BASE_URL = "https://api.x.ai/v1"
+
+_DEFAULT_BASE_URLS = {
+    PROVIDER_XAI: XAI_BASE_URL,
+    PROVIDER_OPENAI: None,
+    PROVIDER_ANTHROPIC: None,
+}
+_API_KEY_ENV = {
+    PROVIDER_XAI: "XAI_API_KEY",
+    PROVIDER_OPENAI: "OPENAI_API_KEY",
+    PROVIDER_ANTHROPIC: "ANTHROPIC_API_KEY",
+}
+_DEFAULT_MAX_CONCURRENCY = {
+    PROVIDER_XAI: 32,
+    PROVIDER_OPENAI: 32,
+    PROVIDER_ANTHROPIC: 8,
+}
+# Seconds a call may wait for a concurrency slot before failing as a pool
+# timeout (the SDK then applies its normal retry policy).
+SLOT_WAIT_SECONDS = float(os.environ.get("LLM_SLOT_WAIT_SECONDS", "30") or 30)
+POOL_MAX_CONNECTIONS = int(os.environ.get("LLM_POOL_MAX_CONNECTIONS", "64") or 64)
+POOL_MAX_KEEPALIVE = int(os.environ.get("LLM_POOL_MAX_KEEPALIVE", "20") or 20)
+POOL_KEEPALIVE_EXPIRY_SECONDS = 60.0
+LATENCY_SAMPLE_SIZE = 512
+
+RETRY_COUNT_HEADER = "x-stainless-retry-count"
+
+
+def _env_number(name: str, default: float) -> float:
+    raw = os.environ.get(name)
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def provider_max_concurrency(provider: str) -> int:
+    default = _DEFAULT_MAX_CONCURRENCY.get(provider, 16)
+    return max(1, int(_env_number(f"LLM_{provider.upper()}_MAX_CONCURRENCY", default)))
+
+
+def provider_timeout_seconds(provider: str) -> Optional[float]:
+    """Default per-provider request timeout; ``None`` keeps the SDK default."""
+    value = _env_number(f"LLM_{provider.upper()}_TIMEOUT_SECONDS", 0)
+    return value if value > 0 else None
+
+
+# ── Metrics ────────────────────────────────────────────────────────────
+
+
+class ProviderMetrics:
+    def __init__(self, provider: str, max_concurrency: int) -> None:
+        self.provider = provider
+        self.max_concurrency = max_concurrency
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.slot_timeouts = 0
+        self._latencies_ms: deque = deque(maxlen=LATENCY_SAMPLE_SIZE)
+
+    def start(self, *, retry: bool) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.calls += 1
+            if retry:
+                self.retries += 1
+
+    def finish(self, elapsed_ms: float, *, status_code: Optional[int], error: bool) -> None:
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._latencies_ms.append(elapsed_ms)
+            if status_code == 429:
+                self.rate_limited += 1
+            if error or (status_code is not None and status_code >= 500):
+                self.errors += 1
+
+    def slot_timeout(self) -> None:
+        with self._lock:
+            self.slot_timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = sorted(self._latencies_ms)
+            return {
+                "provider": self.provider,
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self.in_flight,
+                "calls": self.calls,
+                "errors": self.errors,
+                "retries": self.retries,
+                "rate_limited": self.rate_limited,
+                "slot_timeouts": self.slot_timeouts,
+                "latency_ms": {
+                    "p50": _percentile(samples, 50),
+                    "p90": _percentile(samples, 90),
+                    "p99": _percentile(samples, 99),
+                    "samples": len(samples),
+                },
+            }
+
+
+def _percentile(sorted_samples: list, pct: float) -> Optional[int]:
+    if not sorted_samples:
+        return None
+    idx = min(len(sorted_samples) - 1, max(0, int(round(pct / 100.0 * len(sorted_samples))) - 1))
+    return int(sorted_samples[idx])
+
+
+# ── Shared pools ───────────────────────────────────────────────────────
+
+
+class _ProviderState:
+    def __init__(self, provider: str) -> None:
+        limit = provider_max_concurrency(provider)
+        self.provider = provider
+        self.semaphore = threading.BoundedSemaphore(limit)
+        self.metrics = ProviderMetrics(provider, limit)
+
+
+_lock = threading.RLock()
+_providers: Dict[str, _ProviderState] = {}
+_http_clients: Dict[tuple, Any] = {}
+_sdk_clients: Dict[tuple, Any] = {}
+_transport_classes: Dict[str, tuple] = {}
+_stub_client: Any = None
+
+
+def _provider_state(provider: str) -> _ProviderState:
+    with _lock:
+        state = _providers.get(provider)
+        if state is None:
+            state = _ProviderState(provider)
+            _providers[provider] = state
+        return state
+
+
+def _httpx_module_for(sdk_module: Any) -> Any:
+    """The httpx distribution the SDK was built against (its ``http_client``
+    must be an instance of that package's ``Client``)."""
+    default_client = getattr(sdk_module, "DefaultHttpxClient", None)
+    for base in getattr(default_client, "__mro__", ())[1:]:
+        if base.__name__ == "Client":
+            return importlib.import_module(base.__module__.split(".")[0])
+    return importlib.import_module("httpx")
+
+
+def _metered_classes(httpx_mod: Any) -> tuple:
+    key = httpx_mod.__name__
+    cached = _transport_classes.get(key)
+    if cached:
+        return cached
+
+    class _ReleasingStream(httpx_mod.SyncByteStream):
+        def __init__(self, inner: Any, on_close: Any) -> None:
+            self._inner = inner
+            self._on_close = on_close
+            self._closed = False
+
+        def __iter__(self):
+            for chunk in self._inner:
+                yield chunk
+
+        def close(self) -> None:
+            try:
+                close = getattr(self._inner, "close", None)
+                if callable(close):
+                    close()
+            finally:
+                if not self._closed:
+                    self._closed = True
+                    self._on_close()
+
+    class _MeteredTransport(httpx_mod.BaseTransport):
+        """Wraps the pool transport with the provider slot + metrics.
+
+        The slot is held until the response body is closed so a streamed
+        completion counts as in flight for its whole duration.
+        """
+
+        def __init__(self, inner: Any, state: _ProviderState) -> None:
+            self._inner = inner
+            self._state = state
+
+        def handle_request(self, request: Any) -> Any:
+            state = self._state
+            if not state.semaphore.acquire(timeout=SLOT_WAIT_SECONDS):
+                state.metrics.slot_timeout()
+                raise httpx_mod.PoolTimeout(
+                    f"{state.provider} concurrency limit reached", request=request
+                )
+            try:
+                retry = int(request.headers.get(RETRY_COUNT_HEADER) or 0) > 0
+            except ValueError:
+                retry = False
+            state.metrics.start(retry=retry)
+            t0 = time.perf_counter()
+            try:
+                response = self._inner.handle_request(request)
+            except BaseException:
+                state.metrics.finish((time.perf_counter() - t0) * 1000, status_code=None, error=True)
+                state.semaphore.release()
+                raise
+            status = response.status_code
+
+            def _done() -> None:
+                state.metrics.finish((time.perf_counter() - t0) * 1000, status_code=status, error=False)
+                state.semaphore.release()
+
+            return httpx_mod.Response(
+                status_code=status,
+                headers=response.headers,
+                stream=_ReleasingStream(response.stream, _done),
+                extensions=response.extensions,
+            )
+
+        def close(self) -> None:
+            self._inner.close()
+
+    _transport_classes[key] = (_MeteredTransport, _ReleasingStream)
+    return _transport_classes[key]
+
+
+def _shared_http_client(provider: str, base_url: Optional[str], sdk_module: Any) -> Any:
+    key = (provider, base_url or "", sdk_module.__name__)
+    with _lock:
+        client = _http_clients.get(key)
+        if client is not None and not getattr(client, "is_closed", False):
+            return client
+        httpx_mod = _httpx_module_for(sdk_module)
+        transport_cls, _ = _metered_classes(httpx_mod)
+        limits = httpx_mod.Limits(
+            max_connections=POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=POOL_MAX_KEEPALIVE,
+            keepalive_expiry=POOL_KEEPALIVE_EXPIRY_SECONDS,
+        )
+        inner = httpx_mod.HTTPTransport(limits=limits)
+        client = sdk_module.DefaultHttpxClient(
+            transport=transport_cls(inner, _provider_state(provider)),
+        )
+        _http_clients[key] = client
+        return client
+
+
+def _sdk_class(provider: str) -> tuple:
+    if provider == PROVIDER_ANTHROPIC:
+        import anthropic
+
+        return anthropic, anthropic.Anthropic
+    import openai
+
+    return openai, openai.OpenAI
+
+
+def _is_real_sdk_class(cls: Any) -> bool:
+    # Tests monkeypatch ``openai.OpenAI`` with fakes; those are built per
+    # call so a cached fake never leaks into the next test.
+    return isinstance(cls, type) and (getattr(cls, "__module__", "") or "").startswith(("openai", "anthropic"))
+
+
+def get_llm_client(
+    provider: str,
+    *,
+    api_key: Optional[str] = None,
+    base_url: Optional[str] = None,
+    timeout: Optional[float] = None,
+    max_retries: Optional[int] = None,
+) -> Any:
+    """Shared SDK client for ``provider`` (``xai`` / ``openai`` / ``anthropic``).
+
+    ``api_key`` defaults to the provider's env var and ``base_url`` to the
+    provider's endpoint (xAI's OpenAI-compatible ``/v1`` for ``xai``).
+    """
+    if _stub_client is not None:
+        return _stub_client
+    if os.environ.get("LLM_STUB_PROVIDER", "").strip().lower() in {"1", "true", "yes"}:
+        return _default_stub()
+
+    if base_url is None:
+        base_url = _DEFAULT_BASE_URLS.get(provider)
+    if api_key is None:
+        api_key = os.environ.get(_API_KEY_ENV.get(provider, ""), "")
+    if timeout is None:
+        timeout = provider_timeout_seconds(provider)
+
+    sdk_module, cls = _sdk_class(provider)
+    kwargs: Dict[str, Any] = {"api_key": api_key}
+    if base_url:
+        kwargs["base_url"] = base_url
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+    if max_retries is not None:
+        kwargs["max_retries"] = max_retries
+
+    if not _is_real_sdk_class(cls):
+        return cls(**kwargs)
+
+    key_digest = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+    cache_key = (provider, base_url or "", key_digest, timeout, max_retries)
+    with _lock:
+        client = _sdk_clients.get(cache_key)
+        if client is not None:
+            return client
+        try:
+            kwargs["http_client"] = _shared_http_client(provider, base_url, sdk_module)
+        except Exception as exc:
+            logger.warning("LLM shared pool unavailable for %s, using SDK default: %s", provider, exc)
+        client = cls(**kwargs)
+        _sdk_clients[cache_key] = client
+        return client
+
+
+def llm_client_metrics() -> Dict[str, Any]:
+    with _lock:
+        states = list(_providers.values())
+        pools = len(_http_clients)
+        clients = len(_sdk_clients)
+    return {
+        "providers": {s.provider: s.metrics.snapshot() for s in states},
+        "http_pools": pools,
+        "sdk_clients": clients,
+        "stub": _stub_client is not None,
+    }
+
+
+def reset_llm_clients() -> None:
+    """Close shared pools and forget cached clients and metrics."""
+    global _stub_client
+    with _lock:
+        for client in _http_clients.values():
+            try:
+                client.close()
+            except Exception:
+                pass
+        _http_clients.clear()
+        _sdk_clients.clear()
+        _providers.clear()
+        _stub_client = None
+
+
+# ── Stub provider ──────────────────────────────────────────────────────
+
+
+STUB_EMBEDDING_DIMENSIONS = 1536
+
+
+def _stub_vector(text: str, dims: int) -> list:
+    digest = hashlib.sha256((text or "").encode("utf-8")).digest()
+    return [((digest[i % len(digest)] / 255.0) * 2.0) - 1.0 for i in range(dims)]
+
+
+class StubLLMClient:
+    """Offline stand-in exposing the SDK surfaces this codebase calls.
+
+    ``responses.create`` (incl. ``stream=True``), ``chat.completions.create``,
+    ``embeddings.create`` and Anthropic-style ``messages.create`` all return
+    ``reply`` (default ``LLM_STUB_REPLY``) with small fake usage numbers.
+    Every call is appended to ``calls`` as ``(surface, kwargs)``.
+    """
+
+    def __init__(self, reply: Optional[str] = None) -> None:
+        self.reply = reply if reply is not None else os.environ.get("LLM_STUB_REPLY", "Stub reply.")
+        self.calls: list = []
+        self.responses = SimpleNamespace(create=self._responses_create)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._chat_create))
+        self.embeddings = SimpleNamespace(create=self._embeddings_create)
+        self.messages = SimpleNamespace(create=self._messages_create)
+
+    def _responses_create(self, **kwargs: Any) -> Any:
+        self.calls.append(("responses", kwargs))
+        response = SimpleNamespace(
+            output_text=self.reply,
+            output=[],
+            usage=SimpleNamespace(input_tokens=10, output_tokens=max(1, len(self.reply) // 4)),
+        )
+        if kwargs.get("stream"):
+            return iter([
+                SimpleNamespace(type="response.output_text.delta", delta=self.reply),
+                SimpleNamespace(type="response.completed", response=response),
+            ])
+        return response
+
+    def _chat_create(self, **kwargs: Any) -> Any:
+        self.calls.append(("chat", kwargs))
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=self.reply), finish_reason="stop")],
+            usage=SimpleNamespace(prompt_tokens=10, completion_tokens=max(1, len(self.reply) // 4)),
+        )
+
+    def _embeddings_create(self, **kwargs: Any) -> Any:
+        self.calls.append(("embeddings", kwargs))
+        inputs = kwargs.get("input")
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        dims = int(kwargs.get("dimensions") or STUB_EMBEDDING_DIMENSIONS)
+        return SimpleNamespace(
+            data=[SimpleNamespace(embedding=_stub_vector(str(t), dims), index=i) for i, t in enumerate(inputs or [])],
+            usage=SimpleNamespace(prompt_tokens=len(inputs or []), total_tokens=len(inputs or [])),
+        )
+
+    def _messages_create(self, **kwargs: Any) -> Any:
+        self.calls.append(("messages", kwargs))
+        return SimpleNamespace(
+            content=[SimpleNamespace(type="text", text=self.reply)],
+            stop_reason="end_turn",
+            usage=SimpleNamespace(input_tokens=10, output_tokens=max(1, len(self.reply) // 4)),
+        )
+
+
+_env_stub: Optional[StubLLMClient] = None
+
+
+def _default_stub() -> StubLLMClient:
+    global _env_stub
+    if _env_stub is None:
+        _env_stub = StubLLMClient()
+    return _env_stub
+
+
+def set_stub_client(client: Any = None) -> Any:
+    """Route every :func:`get_llm_client` call to ``client``.
+
+    With no argument a fresh :class:`StubLLMClient` is installed. Returns
+    the installed client; undo with :func:`clear_stub_client`.
+    """
+    global _stub_client
+    if client is None:
+        client = StubLLMClient()
+    _stub_client = client
+    return client
+
+
+def clear_stub_client() -> None:
+    global _stub_client
+    _stub_client = None
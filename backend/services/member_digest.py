@@ -25,16 +25,20 @@ Rules:
   measurable against sends.
 * ``max_sends`` caps one run (default 500) so the first enabled run on a
   large instance can be throttled and observed.
+* ``WEEKLY_DIGEST_SET_BASED`` switches to the set-based sweep: candidates
+  ranked in SQL over ``community_daily_post_counts``, one ``INSERT … SELECT``
+  reservation per run, pushes delivered from ``weekly_push`` outbox rows.
 """
 
 from __future__ import annotations
 
 import logging
 import os
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List
 
-from backend.services.database import get_db_connection, get_sql_placeholder
+from backend.services.database import USE_MYSQL, get_db_connection, get_sql_placeholder
 from backend.services.owner_pulse import week_key
 
 logger = logging.getLogger(__name__)
@@ -53,6 +57,17 @@ CREATE TABLE IF NOT EXISTS member_digest_sends (
 )
 """
 
+_DEDUP_DDL_SQLITE = """
+CREATE TABLE IF NOT EXISTS member_digest_sends (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    community_id INTEGER NOT NULL,
+    week_key TEXT NOT NULL,
+    sent_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (username, week_key)
+)
+"""
+
 
 def _enabled() -> bool:
     return (os.environ.get("MEMBER_DIGEST_ENABLED") or "").strip().lower() in {"1", "true", "yes", "on"}
@@ -60,7 +75,7 @@ def _enabled() -> bool:
 
 def _ensure_dedup_table(cursor) -> None:
     try:
-        cursor.execute(_DEDUP_DDL)
+        cursor.execute(_DEDUP_DDL if USE_MYSQL else _DEDUP_DDL_SQLITE)
     except Exception:  # pragma: no cover - table exists / limited env
         pass
 
@@ -116,11 +131,235 @@ def _try_reserve(cursor, username: str, community_id: int, wk: str) -> bool:
         return False
 
 
-def run_weekly_digest(*, dry_run: bool = False, max_sends: int = DEFAULT_MAX_SENDS) -> Dict[str, Any]:
-    """Send this week's member digests. Returns send/skip counters."""
+def _deliver(cand: Dict[str, Any], wk: str) -> None:
+    """Push + in-app row + ``digest_sent`` event for one reserved member."""
     from backend.services import notification_copy, retention_events
     from backend.services.notifications import create_notification, send_push_to_user
 
+    member = cand["username"]
+    locale = notification_copy.recipient_locale(member)
+    params = {"community": cand["name"], "posts": cand["new_posts"]}
+    url = (
+        f"/community_feed_react/{cand['community_id']}"
+        f"?source=weekly_digest_push"
+    )
+
+    payload = notification_copy.push_payload("member_digest", locale, **params)
+    send_push_to_user(member, {
+        "title": payload["title"],
+        "body": payload["body"],
+        "url": url,
+        "tag": f"member-digest-{cand['community_id']}-{wk}",
+    })
+    create_notification(
+        user_id=member,
+        from_user="steve",
+        notification_type="member_digest",
+        community_id=cand["community_id"],
+        message=notification_copy.in_app_text("member_digest", locale, **params),
+        link=url,
+    )
+    retention_events.record_event(
+        member,
+        event_type="digest_sent",
+        source="weekly_digest_cron",
+        community_id=cand["community_id"],
+    )
+
+
+def deliver_queued_digest(payload: Dict[str, Any]) -> bool:
+    """Outbox entry point for a digest reserved by the set-based sweep.
+
+    At-most-once like the inline path: failures are logged, never retried.
+    """
+    try:
+        _deliver(payload, payload["week_key"])
+        return True
+    except Exception as exc:
+        logger.error("member digest failed for %s: %s", payload.get("username"), exc, exc_info=True)
+        return False
+
+
+# ── Set-based sweep (WEEKLY_DIGEST_SET_BASED) ───────────────────────────
+
+
+_batch_columns_ready = False
+
+
+def _ensure_batch_columns(cursor) -> None:
+    global _batch_columns_ready
+    if _batch_columns_ready:
+        return
+    for ddl in (
+        "ALTER TABLE member_digest_sends ADD COLUMN batch_id CHAR(32) NULL",
+        "ALTER TABLE member_digest_sends ADD COLUMN new_posts INT NULL",
+        "ALTER TABLE member_digest_sends ADD INDEX idx_member_digest_batch (batch_id)"
+        if USE_MYSQL
+        else "CREATE INDEX IF NOT EXISTS idx_member_digest_batch ON member_digest_sends (batch_id)",
+    ):
+        try:
+            cursor.execute(ddl)
+        except Exception:
+            pass  # already migrated
+    _batch_columns_ready = True
+
+
+def _ranked_candidates_sql(ph: str) -> str:
+    """Derived table: one row per member (``rn = 1``) with their best
+    community by posts from OTHER people since ``{ph}`` (rollup day).
+
+    Community totals and per-author counts come from
+    ``community_daily_post_counts``; the member's own posts are subtracted
+    via an equality join on the pre-normalized author, so no ``LOWER()``
+    wraps an indexed column on MySQL.
+    """
+    from backend.services.community_post_rollups import username_norm_sql
+
+    uname = username_norm_sql("u.username")
+    creator = username_norm_sql("COALESCE(co.creator_username, '')")
+    return f"""
+        SELECT ranked.username, ranked.community_id, ranked.name, ranked.new_posts
+        FROM (
+            SELECT scored.*, ROW_NUMBER() OVER (
+                PARTITION BY scored.user_id
+                ORDER BY scored.new_posts DESC, scored.community_id ASC
+            ) AS rn
+            FROM (
+                SELECT u.id AS user_id, u.username, co.id AS community_id, co.name,
+                       totals.posts - COALESCE(own.posts, 0) AS new_posts
+                FROM (
+                    SELECT community_id, SUM(posts) AS posts
+                    FROM community_daily_post_counts
+                    WHERE day >= {ph}
+                    GROUP BY community_id
+                    HAVING SUM(posts) >= {MIN_NEW_POSTS}
+                ) totals
+                JOIN communities co ON co.id = totals.community_id
+                JOIN user_communities uc ON uc.community_id = totals.community_id
+                JOIN users u ON u.id = uc.user_id
+                LEFT JOIN (
+                    SELECT community_id, author_norm, SUM(posts) AS posts
+                    FROM community_daily_post_counts
+                    WHERE day >= {ph}
+                    GROUP BY community_id, author_norm
+                ) own ON own.community_id = totals.community_id AND own.author_norm = {uname}
+                WHERE {uname} <> 'admin'
+                  AND {creator} <> {uname}
+            ) scored
+            WHERE scored.new_posts >= {MIN_NEW_POSTS}
+        ) ranked
+        WHERE ranked.rn = 1
+    """
+
+
+def _row_val(row: Any, key: str, idx: int) -> Any:
+    return row[key] if hasattr(row, "keys") else row[idx]
+
+
+def _run_set_based(conn, c, ph: str, wk: str, result: Dict[str, Any], *, dry_run: bool, max_sends: int) -> None:
+    """Rollup refresh, one ranked candidate query, one INSERT…SELECT
+    reservation for the whole run and one outbox enqueue for delivery."""
+    from backend.services.community_post_rollups import refresh_post_count_rollups, window_start_day
+    from backend.services.message_outbox import enqueue_weekly_pushes
+
+    since_day = window_start_day(7)
+    refresh_post_count_rollups(c, since_day)
+    try:
+        conn.commit()
+    except Exception:
+        pass
+    ranked = _ranked_candidates_sql(ph)
+
+    if dry_run:
+        c.execute(f"SELECT COUNT(*) AS total FROM ({ranked}) cands", (since_day, since_day))
+        row = c.fetchone()
+        result["candidates"] = int(_row_val(row, "total", 0) or 0) if row else 0
+        c.execute(
+            f"SELECT username, community_id, new_posts FROM ({ranked}) cands "
+            f"ORDER BY new_posts DESC LIMIT 100",
+            (since_day, since_day),
+        )
+        result["preview"] = [
+            {"username": _row_val(r, "username", 0), "community_id": int(_row_val(r, "community_id", 1)),
+             "new_posts": int(_row_val(r, "new_posts", 2) or 0)}
+            for r in c.fetchall() or []
+        ]
+        return
+
+    if not _enabled():
+        result["success"] = False
+        result["error"] = "MEMBER_DIGEST_ENABLED is off"
+        return
+
+    _ensure_batch_columns(c)
+    not_reserved = (
+        f"NOT EXISTS (SELECT 1 FROM member_digest_sends s "
+        f"WHERE s.username = cands.username AND s.week_key = {ph})"
+    )
+    c.execute(
+        f"SELECT COUNT(*) AS total, "
+        f"COALESCE(SUM(CASE WHEN {not_reserved} THEN 1 ELSE 0 END), 0) AS fresh "
+        f"FROM ({ranked}) cands",
+        (wk, since_day, since_day),
+    )
+    row = c.fetchone()
+    total = int(_row_val(row, "total", 0) or 0) if row else 0
+    fresh = int(_row_val(row, "fresh", 1) or 0) if row else 0
+    result["candidates"] = total
+
+    cap = max(0, int(max_sends))
+    batch_id = uuid.uuid4().hex
+    if cap and fresh:
+        verb = "INSERT IGNORE" if USE_MYSQL else "INSERT OR IGNORE"
+        c.execute(
+            f"""
+            {verb} INTO member_digest_sends (username, community_id, week_key, batch_id, new_posts)
+            SELECT cands.username, cands.community_id, {ph}, {ph}, cands.new_posts
+            FROM ({ranked}) cands
+            WHERE {not_reserved}
+            ORDER BY cands.new_posts DESC, cands.username ASC
+            LIMIT {cap}
+            """,
+            (wk, batch_id, since_day, since_day, wk),
+        )
+        try:
+            conn.commit()
+        except Exception:
+            pass
+
+    c.execute(
+        f"""
+        SELECT s.username, s.community_id, co.name, s.new_posts
+        FROM member_digest_sends s
+        JOIN communities co ON co.id = s.community_id
+        WHERE s.week_key = {ph} AND s.batch_id = {ph}
+        """,
+        (wk, batch_id),
+    )
+    reserved = [
+        {
+            "username": _row_val(r, "username", 0),
+            "community_id": int(_row_val(r, "community_id", 1)),
+            "name": _row_val(r, "name", 2),
+            "new_posts": int(_row_val(r, "new_posts", 3) or 0),
+        }
+        for r in c.fetchall() or []
+    ]
+    result["skipped_cap"] = max(0, fresh - cap)
+    result["skipped_dedup"] = max(0, total - len(reserved) - result["skipped_cap"])
+    result["queued"] = enqueue_weekly_pushes(conn, c, "member_digest", wk, reserved)
+    result["errors"] = len(reserved) - result["queued"]
+
+
+def run_weekly_digest(*, dry_run: bool = False, max_sends: int = DEFAULT_MAX_SENDS) -> Dict[str, Any]:
+    """Send this week's member digests. Returns send/skip counters.
+
+    With ``WEEKLY_DIGEST_SET_BASED`` on, candidates come from the daily post
+    rollups, reservation is one statement and delivery is queued on the
+    outbox: the result reports ``queued`` instead of ``sent``.
+    """
+    from backend.services.feature_flags import set_based_weekly_digests_enabled
+
     result = {
         "success": True,
         "dry_run": dry_run,
@@ -137,6 +376,10 @@ def run_weekly_digest(*, dry_run: bool = False, max_sends: int = DEFAULT_MAX_SEN
         c = conn.cursor()
         ph = get_sql_placeholder()
         _ensure_dedup_table(c)
+        if set_based_weekly_digests_enabled():
+            _run_set_based(conn, c, ph, wk, result, dry_run=dry_run, max_sends=max_sends)
+            return result
+
         candidates = _candidates(c, ph)
         result["candidates"] = len(candidates)
 
@@ -165,36 +408,7 @@ def run_weekly_digest(*, dry_run: bool = False, max_sends: int = DEFAULT_MAX_SEN
                     conn.commit()
                 except Exception:
                     pass
-
-                member = cand["username"]
-                locale = notification_copy.recipient_locale(member)
-                params = {"community": cand["name"], "posts": cand["new_posts"]}
-                url = (
-                    f"/community_feed_react/{cand['community_id']}"
-                    f"?source=weekly_digest_push"
-                )
-
-                payload = notification_copy.push_payload("member_digest", locale, **params)
-                send_push_to_user(member, {
-                    "title": payload["title"],
-                    "body": payload["body"],
-                    "url": url,
-                    "tag": f"member-digest-{cand['community_id']}-{wk}",
-                })
-                create_notification(
-                    user_id=member,
-                    from_user="steve",
-                    notification_type="member_digest",
-                    community_id=cand["community_id"],
-                    message=notification_copy.in_app_text("member_digest", locale, **params),
-                    link=url,
-                )
-                retention_events.record_event(
-                    member,
-                    event_type="digest_sent",
-                    source="weekly_digest_cron",
-                    community_id=cand["community_id"],
-                )
+                _deliver(cand, wk)
                 result["sent"] += 1
             except Exception as exc:
                 # At-most-once by design: the reservation stands, the miss is
@@ -0,0 +1,657 @@
+"""Transactional outbox for message / post side effects.
+
+Send paths open an explicit transaction (``database.begin_transaction`` —
+MySQL connections otherwise autocommit every statement), insert the message
+and its side effects as ``message_outbox`` rows, and commit once, so the
+events commit (or roll back) with the message. A background dispatcher —
+and ``POST /api/cron/outbox/drain`` as a safety net — claims rows under a
+lease and applies them in batches:
+
+* ``firestore`` rows are written through one ``WriteBatch`` per drain.
+* ``dm_notify`` rows are coalesced per (recipient, sender): one notification
+  upsert, one push and one cache invalidation for a burst of messages. Each
+  burst is settled as soon as its push is sent, so only failed bursts retry.
+* ``group_notify`` rows are coalesced per (group, sender) before fan-out.
+* ``post_notify`` rows run the community member fan-out.
+* ``weekly_push`` rows deliver member digests / owner pulses reserved by the
+  set-based weekly sweeps, on a small worker pool. Delivery is at-most-once:
+  rows are deleted under their lease before sending, and failures are
+  logged by the delivering module and never retried.
+
+Failed rows are retried with exponential backoff and parked as dead letters
+after ``OUTBOX_MAX_ATTEMPTS``. Successful rows are deleted. Settling is
+guarded by the claim's lease token, so a row re-claimed after its lease
+lapsed belongs to the new dispatcher only.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from backend.services.database import USE_MYSQL, get_db_connection, get_sql_placeholder
+
+logger = logging.getLogger(__name__)
+
+KIND_FIRESTORE = "firestore"
+KIND_DM_NOTIFY = "dm_notify"
+KIND_GROUP_NOTIFY = "group_notify"
+KIND_POST_NOTIFY = "post_notify"
+KIND_WEEKLY_PUSH = "weekly_push"
+
+OUTBOX_BATCH_SIZE = int(os.environ.get("OUTBOX_BATCH_SIZE", "200"))
+OUTBOX_LEASE_SECONDS = int(os.environ.get("OUTBOX_LEASE_SECONDS", "60"))
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_POLL_SECONDS = float(os.environ.get("OUTBOX_POLL_SECONDS", "2"))
+OUTBOX_BACKOFF_CAP_SECONDS = 600
+OUTBOX_WEEKLY_PUSH_WORKERS = int(os.environ.get("OUTBOX_WEEKLY_PUSH_WORKERS", "8"))
+
+_TS_FMT = "%Y-%m-%d %H:%M:%S"
+
+_OUTBOX_TABLE_READY = False
+
+_metrics_lock = threading.Lock()
+_metrics: Dict[str, Any] = {
+    "claimed": 0,
+    "delivered": 0,
+    "retried": 0,
+    "dead_lettered": 0,
+    "batches": 0,
+    "last_batch_lag_seconds": None,
+    "max_batch_lag_seconds": 0.0,
+    "last_drain_at": None,
+}
+
+
+def _now() -> datetime:
+    return datetime.utcnow().replace(microsecond=0)
+
+
+def _fmt(ts: datetime) -> str:
+    return ts.strftime(_TS_FMT)
+
+
+def _parse_ts(raw: Any) -> Optional[datetime]:
+    if isinstance(raw, datetime):
+        return raw
+    if not raw:
+        return None
+    try:
+        return datetime.strptime(str(raw)[:19].replace("T", " "), _TS_FMT)
+    except Exception:
+        return None
+
+
+def _row_get(row: Any, key: str, idx: int) -> Any:
+    if row is None:
+        return None
+    return row[key] if hasattr(row, "keys") else row[idx]
+
+
+def ensure_message_outbox_table() -> None:
+    """Create ``message_outbox`` if missing (memoized per process)."""
+    global _OUTBOX_TABLE_READY
+    if _OUTBOX_TABLE_READY:
+        return
+    try:
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            if USE_MYSQL:
+                c.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS message_outbox (
+                        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                        kind VARCHAR(32) NOT NULL,
+                        payload MEDIUMTEXT NOT NULL,
+                        attempts INT NOT NULL DEFAULT 0,
+                        available_at DATETIME NOT NULL,
+                        lease_token VARCHAR(64) NULL,
+                        lease_until DATETIME NULL,
+                        dead TINYINT(1) NOT NULL DEFAULT 0,
+                        last_error TEXT NULL,
+                        created_at DATETIME NOT NULL,
+                        INDEX idx_outbox_ready (dead, available_at, id),
+                        INDEX idx_outbox_lease (lease_token)
+                    )
+                    """
+                )
+            else:
+                c.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS message_outbox (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        kind TEXT NOT NULL,
+                        payload TEXT NOT NULL,
+                        attempts INTEGER NOT NULL DEFAULT 0,
+                        available_at TEXT NOT NULL,
+                        lease_token TEXT,
+                        lease_until TEXT,
+                        dead INTEGER NOT NULL DEFAULT 0,
+                        last_error TEXT,
+                        created_at TEXT NOT NULL
+                    )
+                    """
+                )
+                c.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_outbox_ready ON message_outbox (dead, available_at, id)"
+                )
+                c.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_outbox_lease ON message_outbox (lease_token)"
+                )
+            conn.commit()
+        _OUTBOX_TABLE_READY = True
+    except Exception as exc:
+        logger.error("ensure_message_outbox_table error: %s", exc)
+
+
+# ── Enqueue (inside the sender's transaction) ──────────────────────────
+
+
+def enqueue_outbox_events(cursor, events: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+    """Insert ``(kind, payload)`` events on ``cursor`` with one multi-row INSERT.
+
+    The caller opens the transaction with ``begin_transaction`` before its
+    message INSERT and commits after this call, so the events share the
+    message's transaction. Raises on failure — the uncommitted message rolls
+    back with it rather than being saved without its side effects.
+    """
+    events = list(events)
+    if not events:
+        return 0
+    ensure_message_outbox_table()
+    ph = get_sql_placeholder()
+    now = _fmt(_now())
+    values_sql = ", ".join([f"({ph}, {ph}, {ph}, {ph})"] * len(events))
+    params: List[Any] = []
+    for kind, payload in events:
+        params.extend([kind, json.dumps(payload, default=str), now, now])
+    cursor.execute(
+        f"INSERT INTO message_outbox (kind, payload, available_at, created_at) VALUES {values_sql}",
+        tuple(params),
+    )
+    return len(events)
+
+
+def enqueue_weekly_pushes(conn, cursor, event: str, week_key: str,
+                          rows: List[Dict[str, Any]]) -> int:
+    """Queue one ``weekly_push`` row per reserved recipient and wake the
+    dispatcher. Returns rows queued; 0 when the insert fails (the caller's
+    reservations stand — weekly sends are at-most-once)."""
+    if not rows:
+        return 0
+    try:
+        queued = enqueue_outbox_events(
+            cursor, [(KIND_WEEKLY_PUSH, {"event": event, "week_key": week_key, **row}) for row in rows]
+        )
+        conn.commit()
+    except Exception as exc:
+        logger.error("%s enqueue failed for %d reservations: %s", event, len(rows), exc, exc_info=True)
+        return 0
+    kick_outbox_dispatcher()
+    return queued
+
+
+def firestore_event(op: str, **kwargs: Any) -> Tuple[str, Dict[str, Any]]:
+    """Outbox event for one ``firestore_writes.write_batch`` item."""
+    return KIND_FIRESTORE, {"op": op, "kwargs": kwargs}
+
+
+# ── Claim / settle ─────────────────────────────────────────────────────
+
+
+def claim_outbox_batch(limit: int = OUTBOX_BATCH_SIZE,
+                       lease_seconds: int = OUTBOX_LEASE_SECONDS) -> List[Dict[str, Any]]:
+    """Lease up to ``limit`` ready rows for this worker and return them.
+
+    Candidates are read first, then leased with a guarded UPDATE so two
+    dispatchers racing on the same ids only ever get disjoint rows.
+    """
+    ensure_message_outbox_table()
+    ph = get_sql_placeholder()
+    now = _now()
+    token = uuid.uuid4().hex
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            f"""
+            SELECT id FROM message_outbox
+            WHERE dead = 0 AND available_at <= {ph}
+              AND (lease_until IS NULL OR lease_until < {ph})
+            ORDER BY id
+            LIMIT {int(limit)}
+            """,
+            (_fmt(now), _fmt(now)),
+        )
+        ids = [int(_row_get(r, "id", 0)) for r in c.fetchall() or []]
+        if not ids:
+            return []
+        id_ph = ", ".join([ph] * len(ids))
+        c.execute(
+            f"""
+            UPDATE message_outbox
+            SET lease_token = {ph}, lease_until = {ph}, attempts = attempts + 1
+            WHERE id IN ({id_ph}) AND (lease_until IS NULL OR lease_until < {ph})
+            """,
+            (token, _fmt(now + timedelta(seconds=lease_seconds)), *ids, _fmt(now)),
+        )
+        conn.commit()
+        c.execute(
+            f"""
+            SELECT id, kind, payload, attempts, created_at
+            FROM message_outbox WHERE lease_token = {ph} ORDER BY id
+            """,
+            (token,),
+        )
+        rows = c.fetchall() or []
+    claimed: List[Dict[str, Any]] = []
+    for r in rows:
+        try:
+            payload = json.loads(_row_get(r, "payload", 2) or "{}")
+        except Exception:
+            payload = {}
+        claimed.append({
+            "id": int(_row_get(r, "id", 0)),
+            "kind": _row_get(r, "kind", 1),
+            "payload": payload,
+            "attempts": int(_row_get(r, "attempts", 3) or 0),
+            "created_at": _parse_ts(_row_get(r, "created_at", 4)),
+            "lease_token": token,
+        })
+    return claimed
+
+
+def _backoff_seconds(attempts: int) -> int:
+    return min(OUTBOX_BACKOFF_CAP_SECONDS, 2 ** max(0, attempts))
+
+
+def _settle(rows: List[Dict[str, Any]], failures: Dict[int, str]) -> Dict[str, int]:
+    """Delete delivered rows; reschedule or dead-letter failed ones.
+
+    Every write is guarded by the row's ``lease_token``: if the lease
+    expired and another dispatcher re-claimed the row, that dispatcher owns
+    it now and this one leaves it alone.
+    """
+    ph = get_sql_placeholder()
+    now = _now()
+    delivered = retried = dead = 0
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        for r in rows:
+            err = failures.get(r["id"])
+            if err is None:
+                c.execute(
+                    f"DELETE FROM message_outbox WHERE id = {ph} AND lease_token = {ph}",
+                    (r["id"], r["lease_token"]),
+                )
+                delivered += 1
+            elif r["attempts"] >= OUTBOX_MAX_ATTEMPTS:
+                c.execute(
+                    f"""
+                    UPDATE message_outbox
+                    SET dead = 1, lease_token = NULL, lease_until = NULL, last_error = {ph}
+                    WHERE id = {ph} AND lease_token = {ph}
+                    """,
+                    (err[:2000], r["id"], r["lease_token"]),
+                )
+                if c.rowcount:
+                    dead += 1
+                    logger.error("outbox row %s (%s) dead-lettered: %s", r["id"], r["kind"], err)
+            else:
+                retry_at = now + timedelta(seconds=_backoff_seconds(r["attempts"]))
+                c.execute(
+                    f"""
+                    UPDATE message_outbox
+                    SET available_at = {ph}, lease_token = NULL, lease_until = NULL, last_error = {ph}
+                    WHERE id = {ph} AND lease_token = {ph}
+                    """,
+                    (_fmt(retry_at), err[:2000], r["id"], r["lease_token"]),
+                )
+                if c.rowcount:
+                    retried += 1
+        conn.commit()
+    return {"delivered": delivered, "retried": retried, "dead_lettered": dead}
+
+
+def _take_leased_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Delete ``rows`` under their lease and return the ones this worker removed.
+
+    Used by at-most-once kinds before delivering: a row whose lease lapsed and
+    was re-claimed elsewhere is skipped here, so a slow batch can never send
+    the same push twice. Deleting up front means a crash mid-send drops the
+    remaining pushes instead of repeating them.
+    """
+    ph = get_sql_placeholder()
+    taken: List[Dict[str, Any]] = []
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        for r in rows:
+            c.execute(
+                f"DELETE FROM message_outbox WHERE id = {ph} AND lease_token = {ph}",
+                (r["id"], r["lease_token"]),
+            )
+            if c.rowcount:
+                taken.append(r)
+        conn.commit()
+    return taken
+
+
+# ── Handlers ───────────────────────────────────────────────────────────
+
+
+def _resolve_dm_timestamps(items: List[Dict[str, Any]]) -> None:
+    """Fill missing DM ``timestamp`` kwargs from ``messages`` in one query."""
+    missing = [
+        it["payload"]["kwargs"] for it in items
+        if it["payload"].get("op") == "dm_message"
+        and not it["payload"]["kwargs"].get("timestamp")
+        and it["payload"]["kwargs"].get("message_id")
+    ]
+    if not missing:
+        return
+    ids = sorted({int(k["message_id"]) for k in missing})
+    ph = get_sql_placeholder()
+    try:
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            c.execute(
+                f"SELECT id, timestamp FROM messages WHERE id IN ({', '.join([ph] * len(ids))})",
+                tuple(ids),
+            )
+            stamps = {
+                int(_row_get(r, "id", 0)): _row_get(r, "timestamp", 1)
+                for r in c.fetchall() or []
+            }
+    except Exception as exc:
+        logger.warning("outbox DM timestamp lookup failed: %s", exc)
+        return
+    for kwargs in missing:
+        kwargs["timestamp"] = stamps.get(int(kwargs["message_id"]))
+
+
+def _handle_firestore(rows: List[Dict[str, Any]]) -> Dict[int, str]:
+    from backend.services.firestore_writes import write_batch
+
+    _resolve_dm_timestamps(rows)
+    items = []
+    for r in rows:
+        kwargs = dict(r["payload"].get("kwargs") or {})
+        if "timestamp" in kwargs:
+            kwargs["timestamp"] = _parse_ts(kwargs["timestamp"])
+        items.append((r["payload"].get("op"), kwargs))
+    try:
+        write_batch(items)
+    except Exception as exc:
+        return {r["id"]: f"firestore: {exc}" for r in rows}
+    return {}
+
+
+def _coalesce(rows: List[Dict[str, Any]], key: Callable[[Dict[str, Any]], Any]) -> Dict[Any, List[Dict[str, Any]]]:
+    groups: Dict[Any, List[Dict[str, Any]]] = {}
+    for r in rows:
+        groups.setdefault(key(r["payload"]), []).append(r)
+    return groups
+
+
+def _handle_dm_notify(rows: List[Dict[str, Any]]) -> Dict[int, str]:
+    from backend.services.dm_send_message import deliver_dm_notification
+    from redis_cache import cache, invalidate_message_cache
+
+    failures: Dict[int, str] = {}
+    groups = _coalesce(rows, lambda p: (p.get("receiver"), p.get("sender")))
+
+    threads_users = set()
+    for receiver, sender in groups:
+        try:
+            invalidate_message_cache(sender, receiver)
+        except Exception:
+            pass
+        threads_users.update((sender, receiver))
+    for user in threads_users:
+        try:
+            cache.delete(f"chat_threads:{user}")
+        except Exception:
+            pass
+
+    ph = get_sql_placeholder()
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        for (receiver, sender), group in groups.items():
+            try:
+                latest = max(group, key=lambda r: int(r["payload"].get("message_id") or 0))["payload"]
+                deliver_dm_notification(
+                    c,
+                    sender=sender,
+                    recipient=receiver,
+                    preview=latest.get("preview") or f"Message from {sender}",
+                    message_id=latest.get("message_id"),
+                )
+            except Exception as exc:
+                for r in group:
+                    failures[r["id"]] = f"dm_notify: {exc}"
+                continue
+            # The push is out: settle this burst now, so neither a failed
+            # commit nor a later group can get it retried and pushed again.
+            try:
+                for r in group:
+                    c.execute(
+                        f"DELETE FROM message_outbox WHERE id = {ph} AND lease_token = {ph}",
+                        (r["id"], r["lease_token"]),
+                    )
+                conn.commit()
+            except Exception as exc:
+                logger.warning("dm_notify %s->%s delivered but not settled: %s", sender, receiver, exc)
+    return failures
+
+
+def _handle_group_notify(rows: List[Dict[str, Any]]) -> Dict[int, str]:
+    from backend.blueprints.group_chat import _fanout_group_message_notifications
+
+    failures: Dict[int, str] = {}
+    groups = _coalesce(rows, lambda p: (p.get("group_id"), p.get("sender")))
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        ph = get_sql_placeholder()
+        for (group_id, sender), group in groups.items():
+            group.sort(key=lambda r: int(r["payload"].get("message_id") or 0))
+            latest = group[-1]["payload"]
+            mention_text = " ".join((r["payload"].get("text") or "") for r in group)
+            try:
+                _fanout_group_message_notifications(
+                    c, ph, int(group_id), sender,
+                    message_text=latest.get("text") or "",
+                    image_path=latest.get("image_path"),
+                    voice_path=latest.get("voice_path"),
+                    video_path=latest.get("video_path"),
+                    audio_summary=latest.get("audio_summary"),
+                    mention_text=mention_text,
+                )
+                conn.commit()
+            except Exception as exc:
+                for r in group:
+                    failures[r["id"]] = f"group_notify: {exc}"
+    return failures
+
+
+def _handle_post_notify(rows: List[Dict[str, Any]]) -> Dict[int, str]:
+    from backend.services.notifications import fanout_community_post_notifications
+
+    failures: Dict[int, str] = {}
+    for r in rows:
+        p = r["payload"]
+        try:
+            fanout_community_post_notifications(
+                community_id=p.get("community_id"),
+                post_id=p.get("post_id"),
+                author_username=p.get("author"),
+                content=p.get("content") or "",
+            )
+        except Exception as exc:
+            failures[r["id"]] = f"post_notify: {exc}"
+    return failures
+
+
+def _handle_weekly_push(rows: List[Dict[str, Any]]) -> Dict[int, str]:
+    from backend.services.member_digest import deliver_queued_digest
+    from backend.services.owner_pulse import deliver_queued_pulse
+
+    deliver = {"member_digest": deliver_queued_digest, "owner_pulse": deliver_queued_pulse}
+
+    def _one(r: Dict[str, Any]) -> None:
+        p = r["payload"]
+        fn = deliver.get(p.get("event"))
+        if fn is None:
+            logger.warning("weekly_push row %s has unknown event %r", r["id"], p.get("event"))
+            return
+        fn(p)
+
+    rows = _take_leased_rows(rows)
+    if not rows:
+        return {}
+    workers = max(1, min(OUTBOX_WEEKLY_PUSH_WORKERS, len(rows)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="weekly-push") as pool:
+        list(pool.map(_one, rows))
+    # At-most-once: delivery failures were logged; nothing is retried.
+    return {}
+
+
+_HANDLERS: Dict[str, Callable[[List[Dict[str, Any]]], Dict[int, str]]] = {
+    KIND_FIRESTORE: _handle_firestore,
+    KIND_DM_NOTIFY: _handle_dm_notify,
+    KIND_GROUP_NOTIFY: _handle_group_notify,
+    KIND_POST_NOTIFY: _handle_post_notify,
+    KIND_WEEKLY_PUSH: _handle_weekly_push,
+}
+
+
+# ── Dispatch ───────────────────────────────────────────────────────────
+
+
+def dispatch_outbox_batch(rows: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Apply claimed rows kind by kind, then settle them."""
+    if not rows:
+        return {"delivered": 0, "retried": 0, "dead_lettered": 0}
+    failures: Dict[int, str] = {}
+    by_kind: Dict[str, List[Dict[str, Any]]] = {}
+    for r in rows:
+        by_kind.setdefault(r["kind"], []).append(r)
+    for kind, kind_rows in by_kind.items():
+        handler = _HANDLERS.get(kind)
+        if handler is None:
+            failures.update({r["id"]: f"unknown outbox kind: {kind}" for r in kind_rows})
+            continue
+        try:
+            failures.update(handler(kind_rows))
+        except Exception as exc:
+            logger.warning("outbox %s handler failed: %s", kind, exc)
+            failures.update({r["id"]: f"{kind}: {exc}" for r in kind_rows})
+
+    result = _settle(rows, failures)
+
+    now = _now()
+    oldest = min((r["created_at"] for r in rows if r["created_at"]), default=None)
+    lag = max(0.0, (now - oldest).total_seconds()) if oldest else None
+    with _metrics_lock:
+        _metrics["claimed"] += len(rows)
+        _metrics["batches"] += 1
+        for key in ("delivered", "retried", "dead_lettered"):
+            _metrics[key] += result[key]
+        _metrics["last_batch_lag_seconds"] = lag
+        if lag is not None and lag > _metrics["max_batch_lag_seconds"]:
+            _metrics["max_batch_lag_seconds"] = lag
+        _metrics["last_drain_at"] = _fmt(now)
+    return result
+
+
+def drain_outbox(max_batches: int = 50, batch_size: int = OUTBOX_BATCH_SIZE) -> Dict[str, int]:
+    """Claim and dispatch batches until the ready queue is empty."""
+    totals = {"batches": 0, "delivered": 0, "retried": 0, "dead_lettered": 0}
+    for _ in range(max_batches):
+        rows = claim_outbox_batch(limit=batch_size)
+        if not rows:
+            break
+        result = dispatch_outbox_batch(rows)
+        totals["batches"] += 1
+        for key in ("delivered", "retried", "dead_lettered"):
+            totals[key] += result[key]
+        if len(rows) < batch_size:
+            break
+    return totals
+
+
+def outbox_stats() -> Dict[str, Any]:
+    """Queue depth, dead letters and lag (oldest ready row age) plus counters."""
+    with _metrics_lock:
+        stats: Dict[str, Any] = dict(_metrics)
+    stats.update({"pending": None, "dead": None, "oldest_pending_lag_seconds": None})
+    try:
+        ensure_message_outbox_table()
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            c.execute(
+                """
+                SELECT
+                    SUM(CASE WHEN dead = 0 THEN 1 ELSE 0 END) AS pending,
+                    SUM(CASE WHEN dead = 1 THEN 1 ELSE 0 END) AS dead,
+                    MIN(CASE WHEN dead = 0 THEN created_at END) AS oldest
+                FROM message_outbox
+                """
+            )
+            row = c.fetchone()
+        stats["pending"] = int(_row_get(row, "pending", 0) or 0)
+        stats["dead"] = int(_row_get(row, "dead", 1) or 0)
+        oldest = _parse_ts(_row_get(row, "oldest", 2))
+        if oldest:
+            stats["oldest_pending_lag_seconds"] = max(0.0, (_now() - oldest).total_seconds())
+    except Exception as exc:
+        logger.warning("outbox_stats query failed: %s", exc)
+    return stats
+
+
+class _OutboxDispatcher:
+    """In-process drain loop; ``kick()`` wakes it right after a send commits."""
+
+    def __init__(self) -> None:
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def kick(self) -> None:
+        self._ensure_started()
+        self._wake.set()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._loop, name="message-outbox", daemon=True)
+            self._thread.start()
+
+    def _loop(self) -> None:
+        while True:
+            self._wake.wait(OUTBOX_POLL_SECONDS)
+            self._wake.clear()
+            try:
+                drain_outbox()
+            except Exception as exc:
+                logger.warning("outbox dispatcher drain failed: %s", exc)
+                time.sleep(OUTBOX_POLL_SECONDS)
+
+
+_dispatcher = _OutboxDispatcher()
+
+
+def kick_outbox_dispatcher() -> None:
+    """Wake the background dispatcher (starting it on first use)."""
+    try:
+        _dispatcher.kick()
+    except Exception as exc:
+        logger.warning("outbox dispatcher kick failed: %s", exc)
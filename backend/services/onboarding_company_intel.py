@@ -7,7 +7,8 @@ import logging
 import os
 from typing import Any, Dict, Optional, Tuple
 
-from openai import OpenAI
+from backend.services.feature_flags import outbound_http_cache_enabled
+from backend.services.llm_clients import PROVIDER_OPENAI, PROVIDER_XAI, get_llm_client
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,8 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 GROK_MODEL = os.getenv("ONBOARDING_GROK_MODEL", "grok-4.3")
 OPENAI_COMPANY_INTEL_MODEL = os.getenv("ONBOARDING_OPENAI_COMPANY_INTEL_MODEL", "gpt-5.5")
 XAI_CHAT_BASE = "https://api.x.ai/v1"
+# Web-search blurbs about a company go stale slowly; shared across users when OUTBOUND_HTTP_CACHE is on.
+COMPANY_INTEL_CACHE_TTL = int(os.getenv("ONBOARDING_COMPANY_INTEL_CACHE_TTL", str(7 * 24 * 3600)))
 
 
 def _extract_json(raw_text: str) -> Dict[str, Any]:
@@ -69,7 +72,7 @@ def _fetch_via_xai(company_clean: str, role: str) -> Tuple[Optional[str], Option
     if not XAI_API_KEY:
         return None, None
     system_prompt, user_prompt = _intel_prompts(company_clean, role)
-    client = OpenAI(api_key=XAI_API_KEY, base_url=XAI_CHAT_BASE)
+    client = get_llm_client(PROVIDER_XAI, api_key=XAI_API_KEY, base_url=XAI_CHAT_BASE)
     try:
         response = client.responses.create(
             model=GROK_MODEL,
@@ -106,7 +109,7 @@ def _fetch_via_openai_responses(company_clean: str, role: str) -> Tuple[Optional
     if not OPENAI_API_KEY:
         return None, None
     system_prompt, user_prompt = _intel_prompts(company_clean, role)
-    client = OpenAI(api_key=OPENAI_API_KEY)
+    client = get_llm_client(PROVIDER_OPENAI, api_key=OPENAI_API_KEY)
     base_kwargs = _openai_responses_create_kwargs(system_prompt, user_prompt)
     try:
         response = client.responses.create(**base_kwargs, temperature=0.3)
@@ -133,6 +136,42 @@ def fetch_company_intel_blurb(company: str, *, role: str = "") -> Tuple[str, Opt
     if not company_clean:
         return "", None, ""
 
+    if outbound_http_cache_enabled():
+        return _fetch_company_intel_shared(company_clean, role)
+    return _fetch_company_intel_uncached(company_clean, role)
+
+
+def _fetch_company_intel_shared(company_clean: str, role: str) -> Tuple[str, Optional[Any], str]:
+    """Share blurbs across users onboarding with the same company / role.
+
+    A cache hit returns ``response_obj=None`` with a non-empty blurb, so
+    callers can tell no model call (and no token spend) happened.
+    """
+    from backend.services import outbound_http
+
+    fresh: Dict[str, Any] = {}
+
+    def _lookup() -> Tuple[Any, Optional[str]]:
+        text, resp, model = _fetch_company_intel_uncached(company_clean, role)
+        fresh["resp"] = resp
+        if not text:
+            return None, "company_intel_failed"
+        return [text, model], None
+
+    identity = f"{company_clean.lower()}|{(role or '').strip().lower()}"
+    value, _error = outbound_http.cached_lookup(
+        "company_intel",
+        identity,
+        _lookup,
+        ttl=COMPANY_INTEL_CACHE_TTL,
+        negative_ttl=600,
+    )
+    if not value:
+        return "", fresh.get("resp"), ""
+    return value[0], fresh.get("resp"), value[1]
+
+
+def _fetch_company_intel_uncached(company_clean: str, role: str) -> Tuple[str, Optional[Any], str]:
     if XAI_API_KEY:
         text, resp = _fetch_via_xai(company_clean, role)
         if text:
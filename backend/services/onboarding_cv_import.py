@@ -66,6 +66,17 @@ def extract_pdf_text_from_bytes(data: bytes) -> str:
     if len(data) > MAX_CV_UPLOAD_BYTES:
         raise ValueError("file_too_large")
 
+    from backend.services.feature_flags import document_text_cache_enabled
+
+    if document_text_cache_enabled():
+        # Parsed in the extraction pool under its budgets; CV text is never persisted.
+        from backend.services.document_text_cache import STATUS_FAILED, extract_pages
+
+        extracted = extract_pages(data=bytes(data), max_pages=MAX_PDF_PAGES, persist=False)
+        if extracted.status == STATUS_FAILED:
+            raise ValueError(extracted.error or "extract_failed")
+        return _clean_cv_text([p["text"] for p in extracted.pages if (p.get("text") or "").strip()])
+
     try:
         from pypdf import PdfReader
     except ImportError as exc:  # pragma: no cover
@@ -82,6 +93,10 @@ def extract_pdf_text_from_bytes(data: bytes) -> str:
                 parts.append(t)
         except Exception as page_err:
             logger.debug("pdf page %s extract failed: %s", i, page_err)
+    return _clean_cv_text(parts)
+
+
+def _clean_cv_text(parts: List[str]) -> str:
     full = "\n\n".join(parts).strip()
     if len(full) > MAX_CV_TEXT_CHARS:
         full = full[:MAX_CV_TEXT_CHARS]
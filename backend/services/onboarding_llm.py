@@ -7,7 +7,7 @@ import logging
 import os
 from typing import Any, List
 
-from openai import OpenAI
+from backend.services.llm_clients import PROVIDER_OPENAI, PROVIDER_XAI, get_llm_client
 
 logger = logging.getLogger(__name__)
 
@@ -77,7 +77,7 @@ def run_onboarding_chat_completion(
 
     if XAI_API_KEY:
         try:
-            client = OpenAI(api_key=XAI_API_KEY, base_url=XAI_CHAT_BASE)
+            client = get_llm_client(PROVIDER_XAI, api_key=XAI_API_KEY, base_url=XAI_CHAT_BASE)
             response = client.chat.completions.create(
                 model=primary_model,
                 messages=messages,
@@ -91,7 +91,7 @@ def run_onboarding_chat_completion(
 
     if OPENAI_API_KEY:
         try:
-            client = OpenAI(api_key=OPENAI_API_KEY)
+            client = get_llm_client(PROVIDER_OPENAI, api_key=OPENAI_API_KEY)
             response = client.chat.completions.create(
                 model=ONBOARDING_OPENAI_FALLBACK_MODEL,
                 messages=messages,
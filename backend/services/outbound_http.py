@@ -0,0 +1,358 @@
+"""Shared outbound fetch layer for third-party lookups on request paths.
+
+Giphy search, article reader / enrichment fetches, HEAD size probes,
+YouTube transcripts and onboarding company intel used to call out per
+request with their own ad-hoc caching (or none). This module gives them:
+
+- one keep-alive ``requests`` session (``OUTBOUND_HTTP_POOL_SIZE``);
+- a per-host concurrency cap (``OUTBOUND_HTTP_PER_HOST``) — a call that
+  cannot get a slot within ``OUTBOUND_HTTP_SLOT_WAIT_SECONDS`` fails fast;
+- a response cache in the shared ``redis_cache.cache``: fresh for ``ttl``,
+  then revalidated with ``If-None-Match`` / ``If-Modified-Since``; kept for
+  ``stale_ttl`` more and served when the upstream errors (stale-if-error);
+- negative caching of 4xx / failures for ``negative_ttl`` so a dead URL is
+  not re-fetched on every request;
+- per-host metrics (:func:`outbound_http_metrics`,
+  ``GET /api/admin/outbound_http``).
+
+:func:`fetch` wraps HTTP calls; :func:`cached_lookup` applies the same
+cache / negative-cache / stale rules to lookups made through SDKs
+(transcripts, LLM web search), metered under a namespace instead of a host.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (compatible; CPointBot/1.0; +https://c-point.co)"
+POOL_SIZE = int(os.environ.get("OUTBOUND_HTTP_POOL_SIZE", "32") or 32)
+PER_HOST_CONCURRENCY = int(os.environ.get("OUTBOUND_HTTP_PER_HOST", "8") or 8)
+SLOT_WAIT_SECONDS = float(os.environ.get("OUTBOUND_HTTP_SLOT_WAIT_SECONDS", "5") or 5)
+# Bodies larger than this are returned but not cached.
+MAX_CACHED_BYTES = int(os.environ.get("OUTBOUND_HTTP_MAX_CACHED_BYTES", str(512 * 1024)))
+LATENCY_SAMPLE_SIZE = 256
+
+_KEY_PREFIX = "outbound:v1"
+
+
+@dataclass
+class OutboundResponse:
+    status_code: int
+    text: str = ""
+    headers: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+    from_cache: bool = False
+    stale: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and 200 <= self.status_code < 400
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+# ── Metrics ─────────────────────────────────────────────────────────────
+
+
+class HostMetrics:
+    def __init__(self, host: str) -> None:
+        self.host = host
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {
+            "requests": 0, "hits": 0, "negative_hits": 0, "revalidated": 0,
+            "stale_served": 0, "errors": 0, "slot_timeouts": 0,
+        }
+        self.in_flight = 0
+        self._latencies_ms: deque = deque(maxlen=LATENCY_SAMPLE_SIZE)
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.counts[name] += 1
+
+    def start(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.counts["requests"] += 1
+
+    def finish(self, elapsed_ms: float, *, error: bool) -> None:
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._latencies_ms.append(elapsed_ms)
+            if error:
+                self.counts["errors"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = sorted(self._latencies_ms)
+            return {
+                "host": self.host,
+                "in_flight": self.in_flight,
+                **self.counts,
+                "latency_ms": {
+                    "p50": _percentile(samples, 50),
+                    "p90": _percentile(samples, 90),
+                    "p99": _percentile(samples, 99),
+                    "samples": len(samples),
+                },
+            }
+
+
+def _percentile(sorted_samples: list, pct: float) -> Optional[int]:
+    if not sorted_samples:
+        return None
+    idx = min(len(sorted_samples) - 1, max(0, int(round(pct / 100.0 * len(sorted_samples))) - 1))
+    return int(sorted_samples[idx])
+
+
+class _HostState:
+    def __init__(self, host: str) -> None:
+        self.semaphore = threading.BoundedSemaphore(max(1, PER_HOST_CONCURRENCY))
+        self.metrics = HostMetrics(host)
+
+
+_lock = threading.Lock()
+_hosts: Dict[str, _HostState] = {}
+_session: Optional[requests.Session] = None
+
+
+def _host_state(host: str) -> _HostState:
+    with _lock:
+        state = _hosts.get(host)
+        if state is None:
+            state = _hosts[host] = _HostState(host)
+        return state
+
+
+def _http() -> requests.Session:
+    """Process-wide keep-alive session for third-party fetches."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["User-Agent"] = DEFAULT_USER_AGENT
+                _session = session
+    return _session
+
+
+def outbound_http_metrics() -> Dict[str, Any]:
+    with _lock:
+        states = list(_hosts.values())
+    return {
+        "per_host_concurrency": PER_HOST_CONCURRENCY,
+        "hosts": {s.metrics.host: s.metrics.snapshot() for s in states},
+    }
+
+
+def reset_outbound_http() -> None:
+    """Close the shared session and forget host slots and metrics."""
+    global _session
+    with _lock:
+        if _session is not None:
+            try:
+                _session.close()
+            except Exception:
+                pass
+        _session = None
+        _hosts.clear()
+
+
+# ── Cache entries ───────────────────────────────────────────────────────
+
+
+def _cache_key(kind: str, identity: str) -> str:
+    return f"{_KEY_PREFIX}:{kind}:" + hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+def _load(key: str) -> Optional[Dict[str, Any]]:
+    from redis_cache import cache
+
+    try:
+        entry = cache.get(key)
+    except Exception:
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+def _save(key: str, entry: Dict[str, Any], keep_seconds: float) -> None:
+    from redis_cache import cache
+
+    try:
+        cache.set(key, entry, max(1, int(keep_seconds)))
+    except Exception as exc:
+        logger.debug("outbound cache write failed: %s", exc)
+
+
+def _response_from(entry: Dict[str, Any], *, stale: bool = False) -> OutboundResponse:
+    return OutboundResponse(
+        status_code=int(entry.get("status") or 0),
+        text=entry.get("body") or "",
+        headers=dict(entry.get("headers") or {}),
+        error=entry.get("error"),
+        from_cache=True,
+        stale=stale,
+    )
+
+
+_KEPT_HEADERS = ("Content-Type", "Content-Length", "ETag", "Last-Modified")
+
+
+def fetch(
+    url: str,
+    *,
+    method: str = "GET",
+    ttl: float = 300,
+    stale_ttl: float = 3600,
+    negative_ttl: float = 60,
+    timeout: float = 10,
+    headers: Optional[Dict[str, str]] = None,
+    allow_redirects: bool = True,
+) -> OutboundResponse:
+    """Fetch ``url`` through the shared session, cache and host limits.
+
+    ``ttl=0`` disables caching (pooling, host limits and metrics still
+    apply). Upstream 4xx responses are returned (and negatively cached) with
+    their body; transport errors, 429 and 5xx return ``error`` set, or the
+    last good copy with ``stale=True`` while it is within ``stale_ttl``.
+    """
+    method = method.upper()
+    host = (urlparse(url).hostname or "unknown").lower()
+    state = _host_state(host)
+    key = _cache_key(method, url) if ttl > 0 else None
+    now = time.time()
+
+    entry = _load(key) if key else None
+    if entry and now < float(entry.get("fresh_until") or 0):
+        state.metrics.count("negative_hits" if entry.get("negative") else "hits")
+        return _response_from(entry)
+    good = entry if entry and not entry.get("negative") else None
+
+    req_headers = dict(headers or {})
+    if good:
+        if good.get("headers", {}).get("ETag"):
+            req_headers["If-None-Match"] = good["headers"]["ETag"]
+        if good.get("headers", {}).get("Last-Modified"):
+            req_headers["If-Modified-Since"] = good["headers"]["Last-Modified"]
+
+    if not state.semaphore.acquire(timeout=SLOT_WAIT_SECONDS):
+        state.metrics.count("slot_timeouts")
+        return _failed(state, good, f"{host} busy", status=503)
+    state.metrics.start()
+    t0 = time.perf_counter()
+    try:
+        resp = _http().request(method, url, headers=req_headers, timeout=timeout,
+                               allow_redirects=allow_redirects)
+        body = resp.text if method != "HEAD" else ""
+    except Exception as exc:
+        state.metrics.finish((time.perf_counter() - t0) * 1000, error=True)
+        state.semaphore.release()
+        if key:
+            _save_negative(key, good, negative_ttl, stale_ttl, str(exc)[:200], 0)
+        return _failed(state, good, f"{type(exc).__name__}: {exc!s}"[:200], status=0)
+    state.metrics.finish((time.perf_counter() - t0) * 1000,
+                         error=resp.status_code == 429 or resp.status_code >= 500)
+    state.semaphore.release()
+
+    if resp.status_code == 304 and good:
+        state.metrics.count("revalidated")
+        good["fresh_until"] = time.time() + ttl
+        _save(key, good, ttl + stale_ttl)
+        return _response_from(good)
+    if resp.status_code == 429 or resp.status_code >= 500:
+        if key:
+            _save_negative(key, good, negative_ttl, stale_ttl, f"HTTP {resp.status_code}", resp.status_code)
+        served = _failed(state, good, f"HTTP {resp.status_code}", status=resp.status_code)
+        if not served.stale:
+            served.text = body
+        return served
+
+    kept = {h: resp.headers[h] for h in _KEPT_HEADERS if resp.headers.get(h)}
+    result = OutboundResponse(status_code=resp.status_code, text=body, headers=kept)
+    if key and len(body.encode("utf-8", "ignore")) <= MAX_CACHED_BYTES:
+        negative = resp.status_code >= 400
+        fresh_for = negative_ttl if negative else ttl
+        _save(key, {
+            "status": resp.status_code,
+            "body": body,
+            "headers": kept,
+            "negative": negative,
+            "fresh_until": time.time() + fresh_for,
+        }, fresh_for + (0 if negative else stale_ttl))
+    return result
+
+
+def _save_negative(key: str, good: Optional[Dict[str, Any]], negative_ttl: float,
+                   stale_ttl: float, error: str, status: int) -> None:
+    """Remember a failure; a still-usable good copy is kept for stale-if-error instead."""
+    if good:
+        return
+    _save(key, {"status": status or 502, "error": error, "negative": True,
+                "fresh_until": time.time() + negative_ttl}, negative_ttl)
+
+
+def _failed(state: _HostState, good: Optional[Dict[str, Any]], error: str, *, status: int) -> OutboundResponse:
+    if good:
+        state.metrics.count("stale_served")
+        return _response_from(good, stale=True)
+    return OutboundResponse(status_code=status or 502, error=error)
+
+
+def cached_lookup(
+    namespace: str,
+    identity: str,
+    fn: Callable[[], Tuple[Any, Optional[str]]],
+    *,
+    ttl: float,
+    negative_ttl: float = 600,
+    stale_ttl: float = 0,
+) -> Tuple[Any, Optional[str]]:
+    """Cache ``fn() -> (value, error)`` under ``namespace`` / ``identity``.
+
+    Errors are cached for ``negative_ttl``; when ``fn`` fails and a previous
+    value is still within ``stale_ttl`` past its ``ttl``, that value is
+    returned instead. Values must be JSON-serialisable.
+    """
+    state = _host_state(namespace)
+    key = _cache_key(namespace, identity)
+    entry = _load(key)
+    now = time.time()
+    if entry and now < float(entry.get("fresh_until") or 0):
+        state.metrics.count("negative_hits" if entry.get("negative") else "hits")
+        return entry.get("value"), entry.get("error")
+    good = entry if entry and not entry.get("negative") else None
+
+    state.metrics.start()
+    t0 = time.perf_counter()
+    try:
+        value, error = fn()
+    except Exception as exc:
+        value, error = None, f"{type(exc).__name__}: {exc!s}"[:200]
+    state.metrics.finish((time.perf_counter() - t0) * 1000, error=error is not None)
+
+    if error is None:
+        _save(key, {"value": value, "error": None, "fresh_until": time.time() + ttl}, ttl + stale_ttl)
+        return value, None
+    if good:
+        state.metrics.count("stale_served")
+        return good.get("value"), None
+    _save(key, {"value": None, "error": error, "negative": True,
+                "fresh_until": time.time() + negative_ttl}, negative_ttl)
+    return None, error
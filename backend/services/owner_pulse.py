@@ -23,10 +23,11 @@ from __future__ import annotations
 
 import logging
 import os
+import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
-from backend.services.database import get_db_connection, get_sql_placeholder
+from backend.services.database import USE_MYSQL, get_db_connection, get_sql_placeholder
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +42,17 @@ CREATE TABLE IF NOT EXISTS owner_pulse_sends (
 )
 """
 
+_DEDUP_DDL_SQLITE = """
+CREATE TABLE IF NOT EXISTS owner_pulse_sends (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    community_id INTEGER NOT NULL,
+    week_key TEXT NOT NULL,
+    sent_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (username, week_key)
+)
+"""
+
 
 def _enabled() -> bool:
     return (os.environ.get("OWNER_PULSE_ENABLED") or "").strip().lower() in {"1", "true", "yes", "on"}
@@ -54,7 +66,7 @@ def week_key(now: Optional[datetime] = None) -> str:
 
 def _ensure_dedup_table(cursor) -> None:
     try:
-        cursor.execute(_DEDUP_DDL)
+        cursor.execute(_DEDUP_DDL if USE_MYSQL else _DEDUP_DDL_SQLITE)
     except Exception:  # pragma: no cover - table exists / limited env
         pass
 
@@ -124,11 +136,207 @@ def _try_reserve(cursor, owner: str, community_id: int, wk: str) -> bool:
         return False
 
 
-def run_weekly_pulse(*, dry_run: bool = False) -> Dict[str, Any]:
-    """Send this week's owner pulses. Returns send/skip counters."""
+def _deliver(cand: Dict[str, Any], numbers: Dict[str, int], wk: str) -> None:
+    """Push + in-app row for one reserved owner."""
     from backend.services import notification_copy
     from backend.services.notifications import create_notification, send_push_to_user
 
+    owner = cand["owner"]
+    locale = notification_copy.recipient_locale(owner)
+    delta = numbers["wau"] - numbers["wau_prev"]
+    event = "owner_pulse_up" if delta > 0 else "owner_pulse"
+    params = {"community": cand["name"], "wau": numbers["wau"], "delta": delta}
+    # ?source= feeds the retention_events sink client-side, so
+    # pulse tap-through is measurable against sends.
+    url = f"/community/{cand['community_id']}/owner?source=owner_pulse_push"
+
+    payload = notification_copy.push_payload(event, locale, **params)
+    send_push_to_user(owner, {
+        "title": payload["title"],
+        "body": payload["body"],
+        "url": url,
+        "tag": f"owner-pulse-{cand['community_id']}-{wk}",
+    })
+    create_notification(
+        user_id=owner,
+        from_user="steve",
+        notification_type="owner_pulse",
+        community_id=cand["community_id"],
+        message=notification_copy.in_app_text(event, locale, **params),
+        link=url,
+    )
+
+
+def deliver_queued_pulse(payload: Dict[str, Any]) -> bool:
+    """Outbox entry point for a pulse reserved by the set-based sweep.
+
+    Week numbers are computed here, off the cron request; at-most-once like
+    the inline path.
+    """
+    try:
+        with get_db_connection() as conn:
+            numbers = _week_numbers(conn.cursor(), get_sql_placeholder(), int(payload["community_id"]))
+        if numbers["wau"] <= 0:
+            return True
+        _deliver(payload, numbers, payload["week_key"])
+        return True
+    except Exception as exc:
+        logger.error("owner pulse failed for %s: %s", payload.get("owner"), exc, exc_info=True)
+        return False
+
+
+# ── Set-based sweep (WEEKLY_DIGEST_SET_BASED) ───────────────────────────
+
+
+_batch_column_ready = False
+
+
+def _ensure_batch_column(cursor) -> None:
+    global _batch_column_ready
+    if _batch_column_ready:
+        return
+    for ddl in (
+        "ALTER TABLE owner_pulse_sends ADD COLUMN batch_id CHAR(32) NULL",
+        "ALTER TABLE owner_pulse_sends ADD INDEX idx_owner_pulse_batch (batch_id)"
+        if USE_MYSQL
+        else "CREATE INDEX IF NOT EXISTS idx_owner_pulse_batch ON owner_pulse_sends (batch_id)",
+    ):
+        try:
+            cursor.execute(ddl)
+        except Exception:
+            pass  # already migrated
+    _batch_column_ready = True
+
+
+def _ranked_candidates(cursor) -> List[Dict[str, Any]]:
+    """Same selection as :func:`_candidates`, ranked in SQL: one row per
+    owner via ``ROW_NUMBER()`` instead of a Python pass over every root."""
+    from backend.services.community_post_rollups import username_norm_sql
+
+    owner = username_norm_sql("co.creator_username")
+    member = username_norm_sql("u.username")
+    cursor.execute(
+        f"""
+        SELECT ranked.id, ranked.name, ranked.creator_username, ranked.member_count
+        FROM (
+            SELECT co.id, co.name, co.creator_username, COUNT(uc.id) AS member_count,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY {owner}
+                       ORDER BY COUNT(uc.id) DESC, co.id ASC
+                   ) AS rn
+            FROM communities co
+            JOIN user_communities uc ON uc.community_id = co.id
+            JOIN users u ON u.id = uc.user_id
+                AND {member} <> 'admin'
+                AND {member} <> {owner}
+            WHERE co.parent_community_id IS NULL
+              AND co.creator_username IS NOT NULL
+              AND co.creator_username <> ''
+              AND {owner} <> 'admin'
+            GROUP BY co.id, co.name, co.creator_username
+        ) ranked
+        WHERE ranked.rn = 1
+        """,
+    )
+    return [
+        {
+            "community_id": int(r["id"] if hasattr(r, "keys") else r[0]),
+            "name": r["name"] if hasattr(r, "keys") else r[1],
+            "owner": (r["creator_username"] if hasattr(r, "keys") else r[2]) or "",
+            "members": int((r["member_count"] if hasattr(r, "keys") else r[3]) or 0),
+        }
+        for r in cursor.fetchall() or []
+    ]
+
+
+def _active_roots(cursor, ph: str, root_ids: List[int]) -> Set[int]:
+    """Roots whose subtree had any activity this week: one parent-map read
+    plus one grouped activity query for every subtree at once."""
+    from backend.services.community_analytics import _active_users_by_community
+
+    cursor.execute("SELECT id, parent_community_id FROM communities WHERE parent_community_id IS NOT NULL")
+    children: Dict[int, List[int]] = {}
+    for r in cursor.fetchall() or []:
+        cid = int(r["id"] if hasattr(r, "keys") else r[0])
+        parent = int(r["parent_community_id"] if hasattr(r, "keys") else r[1])
+        children.setdefault(parent, []).append(cid)
+
+    root_of: Dict[int, int] = {}
+    for root in root_ids:
+        stack = [root]
+        while stack:
+            cid = stack.pop()
+            if cid in root_of:
+                continue
+            root_of[cid] = root
+            stack.extend(children.get(cid, ()))
+
+    week_ago = (datetime.now(timezone.utc) - timedelta(days=7)).strftime("%Y-%m-%d %H:%M:%S")
+    counts = _active_users_by_community(cursor, ph, list(root_of), week_ago)
+    return {root_of[cid] for cid, n in counts.items() if n > 0 and cid in root_of}
+
+
+def _run_set_based(conn, c, ph: str, wk: str, result: Dict[str, Any], *, dry_run: bool) -> None:
+    """Ranked candidates, a set-based quiet filter, one multi-row
+    reservation and one outbox enqueue for delivery."""
+    from backend.services.message_outbox import enqueue_weekly_pushes
+
+    candidates = _ranked_candidates(c)
+    result["candidates"] = len(candidates)
+
+    if dry_run:
+        result["preview"] = [
+            {"owner": cand["owner"], "community_id": cand["community_id"],
+             "members": cand["members"], **_week_numbers(c, ph, cand["community_id"])}
+            for cand in candidates[:100]
+        ]
+        return
+
+    if not _enabled():
+        result["success"] = False
+        result["error"] = "OWNER_PULSE_ENABLED is off"
+        return
+
+    active = _active_roots(c, ph, [cand["community_id"] for cand in candidates])
+    live = [cand for cand in candidates if cand["community_id"] in active]
+    result["skipped_quiet"] = len(candidates) - len(live)
+    if not live:
+        return
+
+    _ensure_batch_column(c)
+    batch_id = uuid.uuid4().hex
+    values = ", ".join([f"({ph}, {ph}, {ph}, {ph})"] * len(live))
+    params: List[Any] = []
+    for cand in live:
+        params.extend((cand["owner"], cand["community_id"], wk, batch_id))
+    verb = "INSERT IGNORE" if USE_MYSQL else "INSERT OR IGNORE"
+    c.execute(
+        f"{verb} INTO owner_pulse_sends (username, community_id, week_key, batch_id) VALUES {values}",
+        tuple(params),
+    )
+    try:
+        conn.commit()
+    except Exception:
+        pass
+    c.execute(
+        f"SELECT community_id FROM owner_pulse_sends WHERE week_key = {ph} AND batch_id = {ph}",
+        (wk, batch_id),
+    )
+    reserved_ids = {int(r["community_id"] if hasattr(r, "keys") else r[0]) for r in c.fetchall() or []}
+    reserved = [cand for cand in live if cand["community_id"] in reserved_ids]
+    result["skipped_dedup"] = len(live) - len(reserved)
+    result["queued"] = enqueue_weekly_pushes(conn, c, "owner_pulse", wk, reserved)
+    result["errors"] = len(reserved) - result["queued"]
+
+
+def run_weekly_pulse(*, dry_run: bool = False) -> Dict[str, Any]:
+    """Send this week's owner pulses. Returns send/skip counters.
+
+    With ``WEEKLY_DIGEST_SET_BASED`` on, delivery is queued on the outbox and
+    the result reports ``queued`` instead of ``sent``.
+    """
+    from backend.services.feature_flags import set_based_weekly_digests_enabled
+
     result = {
         "success": True,
         "dry_run": dry_run,
@@ -145,6 +353,10 @@ def run_weekly_pulse(*, dry_run: bool = False) -> Dict[str, Any]:
         c = conn.cursor()
         ph = get_sql_placeholder()
         _ensure_dedup_table(c)
+        if set_based_weekly_digests_enabled():
+            _run_set_based(conn, c, ph, wk, result, dry_run=dry_run)
+            return result
+
         candidates = _candidates(c, ph)
         result["candidates"] = len(candidates)
 
@@ -174,31 +386,7 @@ def run_weekly_pulse(*, dry_run: bool = False) -> Dict[str, Any]:
                     conn.commit()
                 except Exception:
                     pass
-
-                owner = cand["owner"]
-                locale = notification_copy.recipient_locale(owner)
-                delta = numbers["wau"] - numbers["wau_prev"]
-                event = "owner_pulse_up" if delta > 0 else "owner_pulse"
-                params = {"community": cand["name"], "wau": numbers["wau"], "delta": delta}
-                # ?source= feeds the retention_events sink client-side, so
-                # pulse tap-through is measurable against sends.
-                url = f"/community/{cand['community_id']}/owner?source=owner_pulse_push"
-
-                payload = notification_copy.push_payload(event, locale, **params)
-                send_push_to_user(owner, {
-                    "title": payload["title"],
-                    "body": payload["body"],
-                    "url": url,
-                    "tag": f"owner-pulse-{cand['community_id']}-{wk}",
-                })
-                create_notification(
-                    user_id=owner,
-                    from_user="steve",
-                    notification_type="owner_pulse",
-                    community_id=cand["community_id"],
-                    message=notification_copy.in_app_text(event, locale, **params),
-                    link=url,
-                )
+                _deliver(cand, numbers, wk)
                 result["sent"] += 1
             except Exception as exc:
                 # At-most-once by design: the reservation stands, the miss is
@@ -510,9 +510,9 @@ def _grok_digest_intent_confirm(
     """Second gate: LLM confirms digest vs false positive. Returns (proceed, window_hours, tin, tout)."""
     if not XAI_API_KEY:
         return True, suggested_window_hours, None, None
-    from openai import OpenAI
+    from backend.services.llm_clients import PROVIDER_XAI, get_llm_client
 
-    client = OpenAI(api_key=XAI_API_KEY, base_url="https://api.x.ai/v1")
+    client = get_llm_client(PROVIDER_XAI, api_key=XAI_API_KEY)
     sys = (
         "You classify whether the user is asking for a **platform activity recap** "
         "(communities + group chats they belong to, not private DMs). "
@@ -582,9 +582,9 @@ def _grok_compose_digest_from_facts(
     """Grounded narrative + required path links. No invention beyond JSON facts."""
     if not XAI_API_KEY:
         return None, None, None
-    from openai import OpenAI
+    from backend.services.llm_clients import PROVIDER_XAI, get_llm_client
 
-    client = OpenAI(api_key=XAI_API_KEY, base_url="https://api.x.ai/v1")
+    client = get_llm_client(PROVIDER_XAI, api_key=XAI_API_KEY)
     system = (
         "You are Steve on C-Point. You receive **only** JSON facts (`FACTS_JSON`): communities and group chats "
         "with activity from **other members** (the viewer’s own posts/messages are excluded).\n"
@@ -282,6 +282,45 @@ def _hydrate_options(
         poll["user_vote"] = user_vote if single_vote else None
 
 
+def apply_viewer_poll_votes(
+    cursor: Any,
+    ph: str,
+    username: str | None,
+    posts: Iterable[Dict[str, Any]],
+    *,
+    votes_table: str = "poll_votes",
+) -> None:
+    """Set ``user_voted`` / ``user_vote`` on polls hydrated with ``username=None``.
+
+    Lets a viewer-independent payload (shared across viewers) pick up one
+    viewer's votes with a single query.
+    """
+    polls = [p["poll"] for p in posts if p and isinstance(p.get("poll"), dict)]
+    option_ids = [_int(o.get("id")) for poll in polls for o in poll.get("options") or []]
+    option_ids = [oid for oid in option_ids if oid]
+    voted: set = set()
+    if username and option_ids:
+        opt_ph = ",".join([ph] * len(option_ids))
+        cursor.execute(
+            f"""
+            SELECT option_id
+            FROM {votes_table}
+            WHERE option_id IN ({opt_ph}) AND username = {ph}
+            """,
+            tuple(option_ids) + (username,),
+        )
+        for row in cursor.fetchall() or []:
+            voted.add(_int(row["option_id"] if hasattr(row, "keys") else row[0]))
+    for poll in polls:
+        single_vote = not (poll.get("single_vote") in (False, 0, "0", "false"))
+        user_vote = None
+        for option in poll.get("options") or []:
+            option["user_voted"] = _int(option.get("id")) in voted
+            if option["user_voted"] and single_vote:
+                user_vote = option.get("id")
+        poll["user_vote"] = user_vote if single_vote else None
+
+
 def invalidate_community_poll_post_detail(cursor: Any, poll_id: Any) -> int | None:
     """Invalidate cached community post detail for a poll mutation."""
     try:
@@ -230,6 +230,9 @@ def delete_post_cascade(
                         "could not delete %s rows for post %s: %s", key_table, post_id, exc
                     )
             c.execute(f"DELETE FROM posts WHERE id = {ph}", (post_id,))
+            from backend.services.community_unread import note_post_deleted
+
+            note_post_deleted(c, community_id, post_id, post.get("username") or "")
             conn.commit()
     except Exception as exc:
         logger.error("delete_post_cascade failed for post %s: %s", post_id, exc, exc_info=True)
@@ -15,6 +15,16 @@ Viewer-scoping is required because the payload includes per-viewer flags
 ``can_toggle_community_key``). Sharing a single key across viewers would leak
 or mis-report these.
 
+With ``POST_DETAIL_SINGLE_SOURCE`` on, a viewer-key miss no longer rebuilds
+the whole post: the viewer-independent body lives once per post under
+
+```
+post_detail:v1:community:{post_id}:shared
+```
+
+and only the viewer overlay (gate, own reactions, star, admin flag, poll
+vote) is computed per viewer on top of it.
+
 TTL is intentionally tight (``CACHE_TTL_POST_DETAIL``, default 60s); the cache
 is **not** the source of truth — it is a hot-window accelerator for the
 repeat-open and SWR client patterns landing in PR 5. Explicit invalidation
@@ -31,6 +41,7 @@ from redis_cache import (
     cache,
     post_detail_community_cache_key,
     post_detail_community_cache_pattern,
+    post_detail_community_shared_key,
     post_detail_group_cache_key,
     post_detail_group_cache_pattern,
 )
@@ -65,7 +76,16 @@ def get_cached_community_post_detail(
         logger.debug("post_detail cache hit: %s", key)
         return cached, 200
 
-    body, status = read_community_post_detail(post_id, username)
+    from backend.services.feature_flags import post_detail_single_source_enabled
+
+    if post_detail_single_source_enabled():
+        from backend.services.post_detail_read import read_community_post_detail_single_source
+
+        body, status = read_community_post_detail_single_source(
+            post_id, username, load_shared=get_shared_community_post
+        )
+    else:
+        body, status = read_community_post_detail(post_id, username)
     if status == 200 and isinstance(body, dict) and body.get("success"):
         try:
             cache.set(key, body, CACHE_TTL_POST_DETAIL)
@@ -74,6 +94,32 @@ def get_cached_community_post_detail(
     return body, status
 
 
+def get_shared_community_post(post_id: int) -> Optional[Dict[str, Any]]:
+    """Viewer-independent community post body, built once and shared by every viewer.
+
+    ``None`` (post missing) is not cached. Build errors propagate so the
+    caller can fall back to Firestore.
+    """
+    from backend.services.post_detail_read import build_community_post_shared
+
+    key = post_detail_community_shared_key(post_id)
+    try:
+        cached = cache.get(key)
+    except Exception as e:
+        logger.warning("post_detail shared cache get failed for %s: %s", key, e)
+        cached = None
+    if cached is not None:
+        return cached
+
+    shared = build_community_post_shared(post_id)
+    if shared is not None:
+        try:
+            cache.set(key, shared, CACHE_TTL_POST_DETAIL)
+        except Exception as e:
+            logger.warning("post_detail shared cache set failed for %s: %s", key, e)
+    return shared
+
+
 def get_cached_group_post_detail(
     post_id: int, username: str
 ) -> Tuple[Dict[str, Any], int]:
@@ -121,6 +167,8 @@ def invalidate_post_detail(post_id: Optional[int], scope: str = "community") ->
             else post_detail_community_cache_pattern(post_id)
         )
         cache.delete_pattern(pattern)
+        if scope != "group":
+            cache.delete(post_detail_community_shared_key(post_id))
         logger.debug("post_detail cache invalidated (%s): %s", scope, pattern)
     except Exception as e:
         logger.warning(
@@ -135,7 +183,8 @@ def invalidate_post_detail_viewer(
     """Bust the cached blob for a single ``(post_id, viewer)`` pair.
 
     Used for viewer-only changes (star toggle, viewer reaction) so we don't
-    take out every other viewer's hot cache.
+    take out every other viewer's hot cache. The shared body is left alone:
+    it carries no viewer fields.
     """
     if not post_id or not username:
         return
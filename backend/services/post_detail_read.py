@@ -13,11 +13,17 @@ so the same callable is reusable from background workers and tests.
 
 from __future__ import annotations
 
+import copy
 import json
 import logging
-from typing import Any, Dict, Tuple
-
-from backend.services.poll_hydration import attach_group_polls_to_posts, attach_polls_to_posts
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from backend.services.feature_flags import post_detail_single_source_enabled
+from backend.services.poll_hydration import (
+    apply_viewer_poll_votes,
+    attach_group_polls_to_posts,
+    attach_polls_to_posts,
+)
 from backend.services.profile_pictures import fetch_profile_picture_map
 
 logger = logging.getLogger(__name__)
@@ -34,11 +40,15 @@ def read_community_post_detail(post_id: int, username: str) -> Tuple[Dict[str, A
     """Read a community/general post detail (matches the legacy ``/get_post`` body).
 
     Tries Firestore + MySQL hydration first (when ``USE_FIRESTORE_READS`` is on),
-    falls back to a full MySQL read.
+    falls back to a full MySQL read. With ``POST_DETAIL_SINGLE_SOURCE`` on,
+    see ``read_community_post_detail_single_source`` instead.
     """
     if not post_id:
         return {"success": False, "error": "Post ID is required"}, 400
 
+    if post_detail_single_source_enabled():
+        return read_community_post_detail_single_source(post_id, username)
+
     import bodybuilding_app as _ba  # lazy import; runtime resolves to loaded module
 
     get_db_connection = _ba.get_db_connection
@@ -271,6 +281,307 @@ def read_community_post_detail(post_id: int, username: str) -> Tuple[Dict[str, A
         return {"success": False, "error": "Server error"}, 500
 
 
+# --- Single-source read (POST_DETAIL_SINGLE_SOURCE) -------------------------
+
+
+def read_community_post_detail_single_source(
+    post_id: int,
+    username: str,
+    *,
+    load_shared: Optional[Callable[[int], Optional[Dict[str, Any]]]] = None,
+) -> Tuple[Dict[str, Any], int]:
+    """Community post detail from one backend per request.
+
+    MySQL is authoritative: the viewer-independent body comes from
+    ``load_shared`` (``build_community_post_shared`` by default; the cache
+    layer passes its shared-blob loader) and only the viewer overlay is
+    computed here. Firestore is consulted only when the MySQL read fails, and
+    is then served as-is rather than re-hydrated from the backend that just
+    failed.
+    """
+    loader = load_shared or build_community_post_shared
+    try:
+        shared = loader(post_id)
+    except Exception as e:
+        logger.warning("MySQL post detail read failed for %s, trying Firestore: %s", post_id, e)
+        return _read_community_post_detail_firestore_only(post_id, username)
+    if shared is None:
+        return {"success": False, "error": "Post not found"}, 404
+    try:
+        return apply_community_viewer_overlay(shared, username)
+    except Exception as e:
+        logger.error("Error applying viewer overlay for post %s: %s", post_id, e)
+        return {"success": False, "error": "Server error"}, 500
+
+
+def build_community_post_shared(post_id: int) -> Optional[Dict[str, Any]]:
+    """Viewer-independent community post detail, or ``None`` when the post is gone.
+
+    Same body as the legacy MySQL read minus the viewer fields
+    (``user_reaction`` on the post and replies, ``is_starred``,
+    ``is_community_admin``, poll ``user_vote``). Reply profile pictures,
+    reaction counts, view counts and child counts are batched per post, so
+    the query count does not grow with the number of replies. Raises on
+    database errors.
+    """
+    import bodybuilding_app as _ba
+
+    get_db_connection = _ba.get_db_connection
+    get_sql_placeholder = _ba.get_sql_placeholder
+    ensure_reply_views_table = _ba.ensure_reply_views_table
+    get_post_reaction_summary = _ba.get_post_reaction_summary
+
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        ph = get_sql_placeholder()
+
+        c.execute(f"SELECT * FROM posts WHERE id = {ph}", (post_id,))
+        post_raw = c.fetchone()
+        if not post_raw:
+            return None
+        post: Dict[str, Any] = dict(post_raw)
+        try:
+            lu = post.get("link_urls")
+            if isinstance(lu, str) and lu.strip():
+                post["link_urls"] = json.loads(lu)
+        except Exception:
+            pass
+
+        community_id = post.get("community_id")
+        allow_nsfw_imagine = False
+        if community_id:
+            try:
+                c.execute(f"SELECT allow_nsfw_imagine FROM communities WHERE id = {ph}", (community_id,))
+                allow_row = c.fetchone()
+                if allow_row is not None:
+                    allow_nsfw_imagine = bool(
+                        allow_row["allow_nsfw_imagine"] if hasattr(allow_row, "keys") else allow_row[0]
+                    )
+            except Exception as allow_err:
+                logger.warning("Failed to fetch allow_nsfw_imagine for community %s: %s", community_id, allow_err)
+        post["allow_nsfw_imagine"] = allow_nsfw_imagine
+
+        c.execute(f"SELECT * FROM replies WHERE post_id = {ph} ORDER BY timestamp DESC", (post_id,))
+        replies_raw = [dict(row) for row in c.fetchall()]
+
+        pp_map = fetch_profile_picture_map(
+            c, [post.get("username")] + [r.get("username") for r in replies_raw]
+        )
+        post["profile_picture"] = pp_map.get(post.get("username"))
+
+        reply_rxs: Dict[int, Dict[str, int]] = {}
+        reply_vcs: Dict[int, int] = {}
+        if replies_raw:
+            try:
+                c.execute(
+                    f"""
+                    SELECT rr.reply_id, rr.reaction_type, COUNT(*) as count
+                    FROM reply_reactions rr
+                    JOIN replies r ON r.id = rr.reply_id
+                    WHERE r.post_id = {ph}
+                    GROUP BY rr.reply_id, rr.reaction_type
+                    """,
+                    (post_id,),
+                )
+                for row in c.fetchall() or []:
+                    rid = row["reply_id"] if hasattr(row, "keys") else row[0]
+                    rtype = row["reaction_type"] if hasattr(row, "keys") else row[1]
+                    cnt = row["count"] if hasattr(row, "keys") else row[2]
+                    if rtype:
+                        reply_rxs.setdefault(int(rid), {})[rtype] = cnt
+            except Exception as rx_err:
+                logger.warning("Batched reply reactions failed for post %s: %s", post_id, rx_err)
+            try:
+                ensure_reply_views_table(c)
+                c.execute(
+                    f"""
+                    SELECT rv.reply_id, COUNT(*) as cnt
+                    FROM reply_views rv
+                    JOIN replies r ON r.id = rv.reply_id
+                    WHERE r.post_id = {ph} AND LOWER(rv.username) <> LOWER({ph})
+                    GROUP BY rv.reply_id
+                    """,
+                    (post_id, "admin"),
+                )
+                for row in c.fetchall() or []:
+                    rid = row["reply_id"] if hasattr(row, "keys") else row[0]
+                    cnt = row["cnt"] if hasattr(row, "keys") else row[1]
+                    reply_vcs[int(rid)] = int(cnt or 0)
+            except Exception as vc_err:
+                logger.warning("Batched reply view counts failed for post %s: %s", post_id, vc_err)
+
+        children_map: Dict[Any, list] = {}
+        for r in replies_raw:
+            children_map.setdefault(r.get("parent_reply_id"), []).append(r)
+        for r in replies_raw:
+            rid = int(r["id"])
+            r["children"] = children_map.get(r["id"], [])
+            r["profile_picture"] = pp_map.get(r.get("username"))
+            r["reactions"] = reply_rxs.get(rid, {})
+            r["view_count"] = reply_vcs.get(rid, 0)
+            r["reply_count"] = len(r["children"])
+        post["replies"] = children_map.get(None, [])
+
+        reaction_counts, _ = get_post_reaction_summary(c, post_id, None)
+        post["reactions"] = reaction_counts
+
+        c.execute(
+            f"""
+            SELECT ij.result_path, ij.created_by, ij.created_at, ij.style
+            FROM imagine_jobs ij
+            WHERE ij.target_type = 'post'
+              AND ij.target_id = {ph}
+              AND ij.status = 'completed'
+              AND ij.result_path IS NOT NULL
+            ORDER BY ij.created_at ASC
+            """,
+            (post_id,),
+        )
+        post["ai_videos"] = [
+            {
+                "video_path": row["result_path"],
+                "generated_by": row["created_by"],
+                "created_at": row["created_at"],
+                "style": row["style"],
+            }
+            for row in c.fetchall()
+        ]
+
+        try:
+            c.execute(f"SELECT COUNT(*) as cnt FROM post_views WHERE post_id = {ph}", (post_id,))
+            view_row = c.fetchone()
+            post["view_count"] = (
+                view_row["cnt"] if view_row and hasattr(view_row, "keys") else (view_row[0] if view_row else 0)
+            )
+        except Exception as view_err:
+            logger.warning("Failed to get view count for post %s: %s", post_id, view_err)
+            post["view_count"] = 0
+
+        post["is_community_starred"] = False
+        if community_id:
+            try:
+                c.execute(
+                    f"SELECT id FROM community_key_posts WHERE community_id = {ph} AND post_id = {ph}",
+                    (community_id, post_id),
+                )
+                post["is_community_starred"] = c.fetchone() is not None
+            except Exception:
+                pass
+
+        attach_polls_to_posts(c, ph, None, [post], include_inactive=True, include_expired=True)
+    return post
+
+
+def apply_community_viewer_overlay(
+    shared_post: Dict[str, Any], username: str
+) -> Tuple[Dict[str, Any], int]:
+    """Gate ``username`` on the shared body and add their viewer-specific fields.
+
+    ``shared_post`` is never mutated (it may be the cached blob every viewer
+    shares).
+    """
+    import bodybuilding_app as _ba
+    from backend.services.community_access import can_view_community_content
+
+    is_app_admin, is_community_owner, is_community_admin = _community_admin_helpers()
+    post = copy.deepcopy(shared_post)
+    post_id = post["id"]
+    community_id = post.get("community_id")
+
+    with _ba.get_db_connection() as conn:
+        c = conn.cursor()
+        ph = _ba.get_sql_placeholder()
+
+        # SECURITY (privacy IDOR): same membership gate as the legacy reads —
+        # evaluated per viewer, never cached with the shared body.
+        allowed, _ = can_view_community_content(c, ph, username, community_id)
+        if not allowed:
+            return {"success": False, "error": "Post not found"}, 404
+
+        post["user_reaction"] = None
+        if username:
+            c.execute(
+                f"SELECT reaction_type FROM reactions WHERE post_id = {ph} AND username = {ph}",
+                (post_id, username),
+            )
+            row = c.fetchone()
+            if row:
+                post["user_reaction"] = row["reaction_type"] if hasattr(row, "keys") else row[0]
+
+        user_reply_rxs: Dict[int, str] = {}
+        if username and post.get("replies"):
+            c.execute(
+                f"""
+                SELECT rr.reply_id, rr.reaction_type
+                FROM reply_reactions rr
+                JOIN replies r ON r.id = rr.reply_id
+                WHERE r.post_id = {ph} AND rr.username = {ph}
+                """,
+                (post_id, username),
+            )
+            for row in c.fetchall() or []:
+                rid = row["reply_id"] if hasattr(row, "keys") else row[0]
+                user_reply_rxs[int(rid)] = row["reaction_type"] if hasattr(row, "keys") else row[1]
+
+        def _overlay(replies):
+            for r in replies:
+                r["user_reaction"] = user_reply_rxs.get(int(r["id"]))
+                _overlay(r.get("children", []))
+
+        _overlay(post.get("replies", []))
+
+        post["is_starred"] = False
+        if community_id:
+            try:
+                c.execute(
+                    f"SELECT id FROM key_posts WHERE username = {ph} AND post_id = {ph}",
+                    (username, post_id),
+                )
+                post["is_starred"] = c.fetchone() is not None
+            except Exception:
+                pass
+
+        apply_viewer_poll_votes(c, ph, username, [post])
+
+    post["is_community_admin"] = bool(
+        community_id
+        and (
+            is_app_admin(username)
+            or is_community_owner(username, community_id)
+            or is_community_admin(username, community_id)
+        )
+    )
+    return {"success": True, "post": post}, 200
+
+
+def _read_community_post_detail_firestore_only(post_id: int, username: str) -> Tuple[Dict[str, Any], int]:
+    """Fallback when MySQL failed: the Firestore body, gated, without hydration."""
+    try:
+        from backend.services.firestore_reads import USE_FIRESTORE_READS
+
+        if USE_FIRESTORE_READS:
+            import bodybuilding_app as _ba
+            from backend.services.community_access import can_view_community_content
+            from backend.services.firestore_reads import get_post_detail as fs_get_post
+
+            fs_post = fs_get_post(post_id, username)
+            if fs_post:
+                fs_comm = fs_post.get("community_id") if isinstance(fs_post, dict) else None
+                if fs_comm:
+                    # Fail closed: no membership answer, no community post.
+                    with _ba.get_db_connection() as gconn:
+                        allowed, _ = can_view_community_content(
+                            gconn.cursor(), _ba.get_sql_placeholder(), username, fs_comm
+                        )
+                    if not allowed:
+                        return {"success": False, "error": "Post not found"}, 404
+                logger.info("Firestore fallback post read: post %s", post_id)
+                return {"success": True, "post": fs_post}, 200
+    except Exception as fs_err:
+        logger.warning("Firestore fallback post read failed for %s: %s", post_id, fs_err)
+    return {"success": False, "error": "Server error"}, 500
+
+
 def _hydrate_fs_post_with_mysql(
     *,
     fs_post: Dict[str, Any],
@@ -621,6 +932,44 @@ def read_group_post_detail(post_id: int, username: str) -> Tuple[Dict[str, Any],
                 (pid,),
             )
             rep_rows = c.fetchall() or []
+
+            # Reply reactions, the viewer's own reaction and child counts are
+            # read once per post, not once per reply.
+            reply_rxs: Dict[int, Dict[str, Any]] = {}
+            user_reply_rxs: Dict[int, Any] = {}
+            child_counts: Dict[Any, int] = {}
+            if rep_rows:
+                c.execute(
+                    f"""
+                    SELECT grr.group_reply_id, grr.reaction, COUNT(*) as c
+                    FROM {grr_table} grr
+                    JOIN {gr_table} gr ON gr.id = grr.group_reply_id
+                    WHERE gr.group_post_id = {ph}
+                    GROUP BY grr.group_reply_id, grr.reaction
+                    """,
+                    (pid,),
+                )
+                for r3 in c.fetchall() or []:
+                    rid3 = r3["group_reply_id"] if hasattr(r3, "keys") else r3[0]
+                    reaction3 = r3["reaction"] if hasattr(r3, "keys") else r3[1]
+                    reply_rxs.setdefault(rid3, {})[reaction3] = r3["c"] if hasattr(r3, "keys") else r3[2]
+                c.execute(
+                    f"""
+                    SELECT grr.group_reply_id, grr.reaction
+                    FROM {grr_table} grr
+                    JOIN {gr_table} gr ON gr.id = grr.group_reply_id
+                    WHERE gr.group_post_id = {ph} AND grr.username = {ph}
+                    """,
+                    (pid, username),
+                )
+                for r3 in c.fetchall() or []:
+                    rid3 = r3["group_reply_id"] if hasattr(r3, "keys") else r3[0]
+                    user_reply_rxs[rid3] = r3["reaction"] if hasattr(r3, "keys") else r3[1]
+                for rr in rep_rows:
+                    parent_rid = rr["parent_reply_id"] if hasattr(rr, "keys") else rr[5]
+                    if parent_rid is not None:
+                        child_counts[parent_rid] = child_counts.get(parent_rid, 0) + 1
+
             all_replies = []
             for rr in rep_rows:
                 if hasattr(rr, "keys"):
@@ -643,21 +992,9 @@ def read_group_post_detail(post_id: int, username: str) -> Tuple[Dict[str, Any],
                     rpp = rr[6] if len(rr) > 6 else None
                     apath = rr[7] if len(rr) > 7 else None
                     asum = rr[8] if len(rr) > 8 else None
-                c.execute(
-                    f"SELECT reaction, COUNT(*) as c FROM {grr_table} WHERE group_reply_id = {ph} GROUP BY reaction",
-                    (rid,),
-                )
-                rrx = c.fetchall() or []
-                rreactions = {(r3["reaction"] if hasattr(r3, "keys") else r3[0]): (r3["c"] if hasattr(r3, "keys") else r3[1]) for r3 in rrx}
-                c.execute(
-                    f"SELECT reaction FROM {grr_table} WHERE group_reply_id = {ph} AND username = {ph}",
-                    (rid, username),
-                )
-                rur = c.fetchone()
-                reply_user_reaction = rur["reaction"] if hasattr(rur, "keys") else (rur[0] if rur else None)
-                c.execute(f"SELECT COUNT(*) as cnt FROM {gr_table} WHERE parent_reply_id = {ph}", (rid,))
-                cnt_row = c.fetchone()
-                reply_count = (cnt_row["cnt"] if hasattr(cnt_row, "keys") else cnt_row[0]) if cnt_row else 0
+                rreactions = reply_rxs.get(rid, {})
+                reply_user_reaction = user_reply_rxs.get(rid)
+                reply_count = child_counts.get(rid, 0)
                 all_replies.append(
                     {
                         "id": rid,
@@ -288,9 +288,9 @@ def generate_post_summary(username: str, post_id: int) -> Tuple[Dict[str, Any],
     except Exception:
         pass
 
-    from openai import OpenAI
+    from backend.services.llm_clients import PROVIDER_XAI, get_llm_client
 
-    client = OpenAI(api_key=XAI_API_KEY, base_url="https://api.x.ai/v1")
+    client = get_llm_client(PROVIDER_XAI, api_key=XAI_API_KEY)
     started = time.perf_counter()
     try:
         response = client.chat.completions.create(
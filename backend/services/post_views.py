@@ -88,6 +88,10 @@ def upsert_post_view(c, post_id: int, username: Optional[str]) -> Optional[int]:
                 "INSERT OR IGNORE INTO post_views (post_id, username, viewed_at) VALUES (?,?,?)",
                 (post_id, username, now_str),
             )
+        if getattr(c, "rowcount", 0) and c.rowcount > 0:
+            from backend.services.community_unread import note_post_viewed
+
+            note_post_viewed(c, post_id, username)
     except Exception as insert_err:
         logger.warning(
             "Failed inserting post_view for post %s and user %s: %s",
@@ -100,6 +104,7 @@ def upsert_post_view(c, post_id: int, username: Optional[str]) -> Optional[int]:
 
 def record_community_post_view(username: str, post_id: int) -> Dict[str, Any]:
     """Membership check, persist view, clear related notifications, invalidate feed cache."""
+    from backend.services.feature_flags import community_feed_shared_payload_enabled
     from redis_cache import invalidate_community_cache, invalidate_user_parent_dashboard
 
     try:
@@ -154,7 +159,11 @@ def record_community_post_view(username: str, post_id: int) -> Dict[str, Any]:
                 )
 
             try:
-                if community_id:
+                # With the shared feed payload, ``has_viewed`` comes from the
+                # per-viewer overlay and ``view_count`` refreshes on the payload
+                # TTL, so one member's view must not rebuild the feed (and the
+                # root dashboard summary) for everyone.
+                if community_id and not community_feed_shared_payload_enabled():
                     invalidate_community_cache(community_id)
                 if username:
                     invalidate_user_parent_dashboard(username)
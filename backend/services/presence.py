@@ -0,0 +1,177 @@
+"""Ephemeral presence and typing signals over the cache layer.
+
+Heartbeats ("viewing group X", "viewing the DM with Y", "typing to Y") used
+to be SQL upserts read back through freshness windows. They only matter for
+a few seconds, so with ``PRESENCE_CACHE`` on they live in TTL keys instead:
+
+* ``presence:group:{group_id}:{user}`` — group chat open (``PRESENCE_TTL_SECONDS``).
+* ``presence:dm:{user}:{peer}`` — DM with ``peer`` open (same TTL).
+* ``typing:dm:{user}:{peer}`` — typing to ``peer`` (``TYPING_TTL_SECONDS``).
+
+Values are the heartbeat's epoch seconds, re-checked on read because Redis
+TTLs are whole seconds. Fan-out asks once per message via
+:func:`viewing_group` / :func:`viewing_dm` (one ``MGET`` for every
+recipient) instead of one presence query per member.
+
+When the shared cache is Redis (or caching is disabled), every write is mirrored into a small
+in-process store that reads fall back to for keys Redis doesn't return. A
+Redis outage then degrades to "presence seen by this instance" instead of
+losing presence entirely. Missing presence only means a push that would have
+been suppressed is sent, never the reverse.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from redis_cache import RedisCache, cache
+
+# Mirrors the SQL freshness windows these replace (group_chat / dm_send_message
+# used 20 s; GET /api/typing used 5 s).
+PRESENCE_TTL_SECONDS = 20
+TYPING_TTL_SECONDS = 5
+
+_LOCAL_MAX_KEYS = 50_000
+
+
+class _LocalTTLStore:
+    """Thread-safe in-process ``key -> (expires_at, value)`` map."""
+
+    def __init__(self, max_keys: int = _LOCAL_MAX_KEYS) -> None:
+        self._data: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._max_keys = max_keys
+
+    def set(self, key: str, value: float, ttl: int) -> None:
+        now = time.time()
+        with self._lock:
+            if len(self._data) >= self._max_keys:
+                self._data = {k: v for k, v in self._data.items() if v[0] > now}
+                if len(self._data) >= self._max_keys:
+                    self._data.clear()
+            self._data[key] = (now + ttl, value)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, float]:
+        now = time.time()
+        with self._lock:
+            out = {}
+            for key in keys:
+                hit = self._data.get(key)
+                if hit and hit[0] > now:
+                    out[key] = hit[1]
+            return out
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_local = _LocalTTLStore()
+
+
+def _norm(username: Optional[str]) -> str:
+    return str(username or "").strip().lower()
+
+
+def group_presence_key(group_id: int, username: str) -> str:
+    return f"presence:group:{int(group_id)}:{_norm(username)}"
+
+
+def dm_presence_key(username: str, peer: str) -> str:
+    return f"presence:dm:{_norm(username)}:{_norm(peer)}"
+
+
+def dm_typing_key(username: str, peer: str) -> str:
+    return f"typing:dm:{_norm(username)}:{_norm(peer)}"
+
+
+def _mirrored() -> bool:
+    return isinstance(cache, RedisCache) or not getattr(cache, "enabled", True)
+
+
+def _put(key: str, ttl: int) -> None:
+    now = time.time()
+    cache.set(key, now, ttl)
+    if _mirrored():
+        _local.set(key, now, ttl)
+
+
+def _drop(key: str) -> None:
+    cache.delete(key)
+    if _mirrored():
+        _local.delete(key)
+
+
+def _fresh_keys(keys: List[str], ttl: int) -> Set[str]:
+    if not keys:
+        return set()
+    found = dict(cache.get_many(keys))
+    if _mirrored() and len(found) < len(keys):
+        found.update(_local.get_many([k for k in keys if k not in found]))
+    cutoff = time.time() - ttl
+    fresh = set()
+    for key, stamp in found.items():
+        try:
+            if float(stamp) >= cutoff:
+                fresh.add(key)
+        except (TypeError, ValueError):
+            continue
+    return fresh
+
+
+# ── Writes (heartbeats) ─────────────────────────────────────────────────
+
+
+def touch_group_presence(username: str, group_id: int) -> None:
+    _put(group_presence_key(group_id, username), PRESENCE_TTL_SECONDS)
+
+
+def touch_dm_presence(username: str, peer: str) -> None:
+    _put(dm_presence_key(username, peer), PRESENCE_TTL_SECONDS)
+
+
+def set_typing(username: str, peer: str, is_typing: bool) -> None:
+    key = dm_typing_key(username, peer)
+    if is_typing:
+        _put(key, TYPING_TTL_SECONDS)
+    else:
+        _drop(key)
+
+
+# ── Reads ───────────────────────────────────────────────────────────────
+
+
+def viewing_group(group_id: int, usernames: Iterable[str]) -> Set[str]:
+    """Which of ``usernames`` have group ``group_id`` open right now (one MGET)."""
+    names = [u for u in usernames if u]
+    keys = [group_presence_key(group_id, u) for u in names]
+    fresh = _fresh_keys(keys, PRESENCE_TTL_SECONDS)
+    return {u for u, k in zip(names, keys) if k in fresh}
+
+
+def viewing_dm(peer: str, usernames: Iterable[str]) -> Set[str]:
+    """Which of ``usernames`` have their DM with ``peer`` open right now."""
+    names = [u for u in usernames if u]
+    keys = [dm_presence_key(u, peer) for u in names]
+    fresh = _fresh_keys(keys, PRESENCE_TTL_SECONDS)
+    return {u for u, k in zip(names, keys) if k in fresh}
+
+
+def is_viewing_group(username: str, group_id: int) -> bool:
+    return bool(viewing_group(group_id, [username]))
+
+
+def is_viewing_dm(username: str, peer: str) -> bool:
+    return bool(viewing_dm(peer, [username]))
+
+
+def is_typing(username: str, peer: str) -> bool:
+    """True when ``username`` is typing to ``peer`` right now."""
+    key = dm_typing_key(username, peer)
+    return key in _fresh_keys([key], TYPING_TTL_SECONDS)
@@ -211,8 +211,11 @@ def upload_public_bytes_to_r2(
         return False
 
 
-def download_bytes_from_r2(key: str) -> Optional[bytes]:
-    """Read full object body from R2. Returns None if missing or error."""
+def download_bytes_from_r2(key: str, *, missing_ok: bool = False) -> Optional[bytes]:
+    """Read full object body from R2. Returns None if missing or error.
+
+    ``missing_ok`` logs a missing key at debug level (cache lookups expect misses).
+    """
     if not R2_ENABLED or not key:
         return None
     client = get_s3_client()
@@ -230,6 +233,10 @@ def download_bytes_from_r2(key: str) -> Optional[bytes]:
             pass
         return data
     except Exception as e:
+        code = ((getattr(e, "response", None) or {}).get("Error") or {}).get("Code")
+        if missing_ok and code in ("NoSuchKey", "404"):
+            logger.debug("R2 key not found: %s", key)
+            return None
         logger.error("Failed to download from R2 key=%s: %s", key, e)
         return None
 
@@ -1,9 +1,24 @@
-"""Shared fixed-window rate limiter over the app cache (Redis in prod).
+"""Shared rate limiter over the app cache (Redis in prod).
 
 The platform has had no UGC rate limiting at all; this is the one primitive
 every abuse-facing surface should reuse (reporting now; posting/messaging in
-the moderation Phase 3). Fixed window on ``redis_cache.cache.incr`` — atomic
-in Redis, best-effort in the in-process fallback.
+the moderation Phase 3). Two modes:
+
+- :func:`allow` — the original fixed window on ``redis_cache.cache.incr``
+  (atomic in Redis, best-effort in the in-process fallback). A fixed window
+  lets a client spend ``2 * max_events`` across a window edge.
+- :func:`check` — a sliding-window log (``cache.sliding_window``, a ZSET per
+  key evaluated in one server-side Redis script on the Redis clock): no span
+  of ``window_seconds`` ever admits more than ``max_events``. Returns a
+  :class:`RateLimitResult` with remaining budget and retry-after for
+  ``RateLimit-*`` / ``Retry-After`` headers. With ``RATE_LIMIT_SLIDING_WINDOW``
+  on, :func:`allow` uses it too.
+
+Hot actions can pass ``lease=N`` to :func:`check`: the process takes up to N
+units from the shared budget in one round-trip and spends them locally for
+``RATE_LIMIT_LEASE_SECONDS``. Leased units are logged up front and stamped at
+the end of the lease, so they count against every window a local spend can
+fall in — leasing can only make the limit stricter, never looser.
 
 Fail-open by design: when the cache is unavailable the action is allowed.
 A limiter must degrade to "the feature works" rather than "nobody can
@@ -13,10 +28,38 @@ report content because Redis blipped".
 from __future__ import annotations
 
 import logging
+import math
+import os
+import threading
 import time
+from dataclasses import dataclass
+from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+LEASE_SECONDS = float(os.environ.get("RATE_LIMIT_LEASE_SECONDS", "1.0"))
+_MAX_LEASES = 10000
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float = 0.0  # seconds until the request would be admitted
+    reset_after: float = 0.0  # seconds until the full budget is available again
+
+    def headers(self) -> Dict[str, str]:
+        """``RateLimit-*`` response headers, plus ``Retry-After`` when denied."""
+        out = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(max(0, self.remaining)),
+            "RateLimit-Reset": str(int(math.ceil(max(0.0, self.reset_after)))),
+        }
+        if not self.allowed:
+            out["Retry-After"] = str(max(1, int(math.ceil(self.retry_after))))
+        return out
+
 
 def allow(action: str, identity: str, *, max_events: int, window_seconds: int) -> bool:
     """True when ``identity`` may perform ``action`` in the current window.
@@ -24,6 +67,10 @@ def allow(action: str, identity: str, *, max_events: int, window_seconds: int) -
     Counts the call (a denied call still consumes nothing extra — the
     counter only ticks past ``max_events`` while the window lasts).
     """
+    from backend.services.feature_flags import rate_limit_sliding_window_enabled
+
+    if rate_limit_sliding_window_enabled():
+        return check(action, identity, max_events=max_events, window_seconds=window_seconds).allowed
     if max_events <= 0 or window_seconds <= 0:
         return True
     identity = (identity or "").strip().lower()
@@ -41,3 +88,96 @@ def allow(action: str, identity: str, *, max_events: int, window_seconds: int) -
     except Exception as exc:  # pragma: no cover - defensive
         logger.warning("rate_limit.allow failed for %s/%s: %s", action, identity, exc)
         return True
+
+
+# ── Sliding window ───────────────────────────────────────────────────
+
+
+@dataclass
+class _Lease:
+    units: int
+    expires_at: float
+    shared_remaining: int
+    reset_after: float
+
+
+_leases: Dict[str, _Lease] = {}
+_lease_lock = threading.Lock()
+
+
+def _spend_lease(key: str, cost: int, limit: int) -> Optional[RateLimitResult]:
+    now = time.monotonic()
+    with _lease_lock:
+        held = _leases.get(key)
+        if held is None or held.expires_at <= now or held.units < cost:
+            return None
+        held.units -= cost
+        return RateLimitResult(True, limit, held.shared_remaining + held.units, 0.0, held.reset_after)
+
+
+def _store_lease(key: str, lease: _Lease) -> None:
+    now = time.monotonic()
+    with _lease_lock:
+        if len(_leases) >= _MAX_LEASES:
+            for stale in [k for k, v in _leases.items() if v.expires_at <= now]:
+                del _leases[stale]
+        _leases[key] = lease
+
+
+def reset_leases() -> None:
+    with _lease_lock:
+        _leases.clear()
+
+
+def check(
+    action: str,
+    identity: str,
+    *,
+    max_events: int,
+    window_seconds: int,
+    cost: int = 1,
+    lease: int = 0,
+) -> RateLimitResult:
+    """Spend ``cost`` from ``identity``'s sliding window of ``max_events`` per ``window_seconds``.
+
+    ``lease`` > ``cost`` takes that many units in one round-trip and serves
+    the following calls in this process from them (see module docstring).
+    """
+    open_result = RateLimitResult(True, max(0, int(max_events)), max(0, int(max_events)))
+    if max_events <= 0 or window_seconds <= 0:
+        return open_result
+    identity = (identity or "").strip().lower()
+    if not identity:
+        return open_result
+    cost = max(1, int(cost))
+    key = f"rl:sw:{action}:{identity}"
+    if lease > cost:
+        local = _spend_lease(key, cost, max_events)
+        if local is not None:
+            return local
+    try:
+        from redis_cache import cache
+
+        period_ms = int(window_seconds * 1000)
+        grant = max(cost, min(int(lease), int(max_events)))
+        # The local lease clock starts before the round-trip so it always ends
+        # before the server-side hold does.
+        started = time.monotonic()
+        hold_ms = int(LEASE_SECONDS * 1000) if grant > cost else 0
+        outcome = cache.sliding_window(key, max_events, period_ms, grant, hold_ms)
+        if outcome is not None and not outcome[0] and grant > cost:
+            grant = cost
+            outcome = cache.sliding_window(key, max_events, period_ms, cost)
+        if outcome is None:  # cache disabled/unreachable — fail open
+            return open_result
+    except Exception as exc:  # pragma: no cover - defensive
+        logger.warning("rate_limit.check failed for %s/%s: %s", action, identity, exc)
+        return open_result
+
+    allowed, remaining, retry_ms, reset_ms = outcome
+    if not allowed:
+        return RateLimitResult(False, max_events, remaining, retry_ms / 1000.0, reset_ms / 1000.0)
+    spare = grant - cost
+    if spare > 0:
+        _store_lease(key, _Lease(spare, started + LEASE_SECONDS, remaining, reset_ms / 1000.0))
+    return RateLimitResult(True, max_events, remaining + spare, 0.0, reset_ms / 1000.0)
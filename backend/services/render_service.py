@@ -13,12 +13,21 @@ Auth is two-layer, matching how the service is deployed:
   Google-signed ID token for the worker's URL (audience), fetched from the
   instance metadata server. Only works on Cloud Run; ``None`` locally.
 - A shared secret header (`X-Render-Secret`) as defence in depth.
+
+Backpressure: the worker renders on a bounded pool of warm browsers and answers
+503 ``busy`` (with ``Retry-After``) when its queue is full. That marks the
+service saturated for the retry window, during which :func:`render` returns
+``None`` without calling out; :func:`is_saturated` / :func:`pool_status` let
+callers skip optional renders up front. The last ``X-Render-Pool-*`` headers
+seen are kept in :func:`pool_status`.
 """
 
 from __future__ import annotations
 
 import logging
 import os
+import threading
+import time
 from typing import Any, Dict, Optional
 
 import requests
@@ -35,6 +44,14 @@ _METADATA_IDENTITY_URL = (
 )
 
 
+# Upper bound on how long one 503 can switch renders off.
+_MAX_SHED_SECONDS = 60.0
+
+_pool_lock = threading.Lock()
+_saturated_until = 0.0
+_last_pool: Dict[str, int] = {}
+
+
 def _service_url() -> str:
     return (os.environ.get("RENDER_SERVICE_URL") or "").rstrip("/")
 
@@ -44,6 +61,49 @@ def is_configured() -> bool:
     return bool(_service_url())
 
 
+def is_saturated() -> bool:
+    """True while the worker's last ``busy`` answer is inside its ``Retry-After`` window."""
+    return time.monotonic() < _saturated_until
+
+
+def pool_status() -> Dict[str, Any]:
+    """Last pool occupancy reported by the worker, plus the local shed state."""
+    with _pool_lock:
+        status: Dict[str, Any] = dict(_last_pool)
+    status["saturated"] = is_saturated()
+    return status
+
+
+def _record_pool(resp: Any) -> None:
+    global _saturated_until
+    headers = getattr(resp, "headers", None) or {}
+    seen: Dict[str, int] = {}
+    for name, key in (("X-Render-Pool-Size", "size"), ("X-Render-Pool-Busy", "busy"),
+                      ("X-Render-Pool-Queued", "queued")):
+        raw = headers.get(name)
+        if raw is not None and str(raw).isdigit():
+            seen[key] = int(raw)
+    shed_for = 0.0
+    if resp.status_code == 503:
+        try:
+            shed_for = float(headers.get("Retry-After") or 5)
+        except (TypeError, ValueError):
+            shed_for = 5.0
+    with _pool_lock:
+        if seen:
+            _last_pool.clear()
+            _last_pool.update(seen)
+        if shed_for:
+            _saturated_until = time.monotonic() + min(_MAX_SHED_SECONDS, max(1.0, shed_for))
+
+
+def _reset_pool_state() -> None:
+    global _saturated_until
+    with _pool_lock:
+        _saturated_until = 0.0
+        _last_pool.clear()
+
+
 def _id_token(audience: str) -> Optional[str]:
     """Google-signed ID token for ``audience`` via the metadata server.
 
@@ -75,6 +135,9 @@ def render(html: str, *, width: int = 420, height: int = 760,
     url = _service_url()
     if not url or not html:
         return None
+    if is_saturated():
+        logger.info("render_service: worker saturated, shedding render")
+        return None
 
     headers = {"Content-Type": "application/json"}
     secret = os.environ.get("RENDER_SHARED_SECRET")
@@ -99,6 +162,7 @@ def render(html: str, *, width: int = 420, height: int = 760,
         logger.warning("render_service: request to %s failed", url, exc_info=True)
         return None
 
+    _record_pool(resp)
     if resp.status_code != 200:
         logger.warning("render_service: %s/render -> HTTP %s", url, resp.status_code)
         return None
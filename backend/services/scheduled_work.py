@@ -0,0 +1,643 @@
+"""Shared due-time queue for cron sweeps (``scheduled_work``).
+
+Poll reminders, event reminders, Steve Reminder Vault DMs and content
+generation jobs used to be found by scanning their source tables on every
+Cloud Scheduler tick and filtering in Python (``strptime`` per poll/event).
+With ``SCHEDULED_WORK_QUEUE`` on, writers instead enqueue one row per
+deadline — ``(kind, ref_id, due_at)`` — and a sweep reads only rows whose
+``due_at`` has passed, via the ``(dead, due_at, id)`` index:
+
+* **Claiming** follows ``message_outbox``: candidates are read, then leased
+  with a guarded UPDATE (``lease_token`` / ``lease_until``), so overlapping
+  Scheduler invocations or instances only ever get disjoint rows. A crashed
+  worker's rows become claimable again when the lease expires.
+* **Dispatch** drains each kind side by side on its own thread pool sized
+  by ``KIND_CONCURRENCY``, claiming at most a few pool-fulls at a time
+  (``KIND_CLAIM_WAVES``) so claimed rows start well within their lease;
+  rows for the same ``(kind, ref_id)`` are coalesced into one handler call.
+* Handlers are **idempotent re-checks** of the source row (the existing
+  per-item helpers with their notification logs), so stale rows left by an
+  edit or delete are harmless no-ops.
+
+Successful rows are deleted; failures back off and are parked as dead
+letters after ``SCHEDULED_WORK_MAX_ATTEMPTS``. ``seed_scheduled_work`` fills
+the queue from existing rows when the flag is first turned on.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from backend.services.database import USE_MYSQL, get_db_connection, get_sql_placeholder
+
+logger = logging.getLogger(__name__)
+
+KIND_POLL_REMINDER = "poll_reminder"
+KIND_EVENT_REMINDER = "event_reminder"
+KIND_STEVE_REMINDER = "steve_reminder"
+KIND_CONTENT_JOB = "content_job"
+
+# Max handler calls in flight per kind. Content jobs make paid LLM calls, so
+# they stay narrow; reminder fan-outs are mostly push/DB I/O.
+KIND_CONCURRENCY: Dict[str, int] = {
+    KIND_POLL_REMINDER: 4,
+    KIND_EVENT_REMINDER: 4,
+    KIND_STEVE_REMINDER: 8,
+    KIND_CONTENT_JOB: 2,
+}
+
+# Rows leased per kind per claim, as a multiple of the kind's pool size: a
+# claim only covers what the pool can start within one lease, so rows never
+# wait behind a busy pool until their lease runs out and get claimed twice.
+# Content jobs are leased one wave at a time.
+KIND_CLAIM_WAVES: Dict[str, int] = {
+    KIND_CONTENT_JOB: 1,
+}
+_DEFAULT_CLAIM_WAVES = 4
+
+SCHEDULED_WORK_BATCH_SIZE = int(os.environ.get("SCHEDULED_WORK_BATCH_SIZE", "200"))
+# Long enough to cover a content-generation run; only matters after a crash.
+SCHEDULED_WORK_LEASE_SECONDS = int(os.environ.get("SCHEDULED_WORK_LEASE_SECONDS", "900"))
+SCHEDULED_WORK_MAX_ATTEMPTS = int(os.environ.get("SCHEDULED_WORK_MAX_ATTEMPTS", "5"))
+_BACKOFF_CAP_SECONDS = 1800
+
+# Poll reminder windows as fractions of the poll's lifetime (see
+# ``notifications.check_single_poll_notifications``); the legacy sweep only
+# looked at polls within 24h of their deadline.
+_POLL_WINDOWS: Tuple[Tuple[float, float], ...] = ((0.20, 0.35), (0.45, 0.60), (0.75, 0.90))
+_POLL_HORIZON = timedelta(hours=24)
+# Event reminder lead times (hours before start) and the preference that enables each.
+_EVENT_LEADS: Tuple[Tuple[str, int, int], ...] = (("1_week", 168, 24), ("1_day", 24, 1), ("1_hour", 1, 0))
+
+_TS_FMT = "%Y-%m-%d %H:%M:%S"
+
+_TABLE_READY = False
+
+
+def _now() -> datetime:
+    return datetime.utcnow().replace(microsecond=0)
+
+
+def _fmt(ts: datetime) -> str:
+    return ts.strftime(_TS_FMT)
+
+
+def _parse_ts(raw: Any) -> Optional[datetime]:
+    if isinstance(raw, datetime):
+        return raw.replace(tzinfo=None)
+    if not raw:
+        return None
+    s = str(raw).strip().replace("T", " ").replace("Z", "")
+    for fmt, width in ((_TS_FMT, 19), ("%Y-%m-%d %H:%M", 16), ("%Y-%m-%d", 10)):
+        try:
+            return datetime.strptime(s[:width], fmt)
+        except Exception:
+            continue
+    return None
+
+
+def _row_get(row: Any, key: str, idx: int) -> Any:
+    if row is None:
+        return None
+    return row[key] if hasattr(row, "keys") else row[idx]
+
+
+def _enabled() -> bool:
+    from backend.services.feature_flags import scheduled_work_enabled
+
+    return scheduled_work_enabled()
+
+
+def ensure_scheduled_work_table() -> None:
+    """Create ``scheduled_work`` if missing (memoized per process)."""
+    global _TABLE_READY
+    if _TABLE_READY:
+        return
+    try:
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            if USE_MYSQL:
+                c.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS scheduled_work (
+                        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                        kind VARCHAR(32) NOT NULL,
+                        ref_id BIGINT NOT NULL,
+                        due_at DATETIME NOT NULL,
+                        attempts INT NOT NULL DEFAULT 0,
+                        lease_token VARCHAR(64) NULL,
+                        lease_until DATETIME NULL,
+                        dead TINYINT(1) NOT NULL DEFAULT 0,
+                        last_error TEXT NULL,
+                        created_at DATETIME NOT NULL,
+                        UNIQUE KEY uq_scheduled_work (kind, ref_id, due_at),
+                        INDEX idx_scheduled_work_due (dead, due_at, id),
+                        INDEX idx_scheduled_work_lease (lease_token)
+                    )
+                    """
+                )
+            else:
+                c.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS scheduled_work (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        kind TEXT NOT NULL,
+                        ref_id INTEGER NOT NULL,
+                        due_at TEXT NOT NULL,
+                        attempts INTEGER NOT NULL DEFAULT 0,
+                        lease_token TEXT,
+                        lease_until TEXT,
+                        dead INTEGER NOT NULL DEFAULT 0,
+                        last_error TEXT,
+                        created_at TEXT NOT NULL,
+                        UNIQUE (kind, ref_id, due_at)
+                    )
+                    """
+                )
+                c.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_scheduled_work_due ON scheduled_work (dead, due_at, id)"
+                )
+                c.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_scheduled_work_lease ON scheduled_work (lease_token)"
+                )
+            conn.commit()
+        _TABLE_READY = True
+    except Exception as exc:
+        logger.error("ensure_scheduled_work_table error: %s", exc)
+
+
+# ── Enqueue ────────────────────────────────────────────────────────────
+
+
+def schedule_work(cursor, items: Iterable[Tuple[str, int, datetime]]) -> int:
+    """Insert ``(kind, ref_id, due_at)`` rows; duplicates are ignored.
+
+    With a ``cursor`` the rows join the caller's transaction (call before its
+    ``commit()``); with ``None`` they are written on a fresh connection.
+    """
+    rows = [(k, int(r), _fmt(d.replace(microsecond=0))) for k, r, d in items if r and d]
+    if not rows:
+        return 0
+    ensure_scheduled_work_table()
+    ph = get_sql_placeholder()
+    verb = "INSERT IGNORE" if USE_MYSQL else "INSERT OR IGNORE"
+    values_sql = ", ".join([f"({ph}, {ph}, {ph}, {ph})"] * len(rows))
+    now = _fmt(_now())
+    params: List[Any] = []
+    for kind, ref_id, due in rows:
+        params.extend([kind, ref_id, due, now])
+    sql = f"{verb} INTO scheduled_work (kind, ref_id, due_at, created_at) VALUES {values_sql}"
+    if cursor is not None:
+        cursor.execute(sql, tuple(params))
+        return len(rows)
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(sql, tuple(params))
+        conn.commit()
+    return len(rows)
+
+
+def cancel_work(cursor, kind: str, ref_id: int) -> None:
+    """Drop pending rows for one source row (e.g. the event was deleted)."""
+    ensure_scheduled_work_table()
+    ph = get_sql_placeholder()
+    cursor.execute(
+        f"DELETE FROM scheduled_work WHERE kind = {ph} AND ref_id = {ph} AND lease_token IS NULL",
+        (kind, int(ref_id)),
+    )
+
+
+def poll_reminder_due_times(created_at: Any, expires_at: Any) -> List[datetime]:
+    """When a poll's progress reminders may fire (start of each window)."""
+    created, expires = _parse_ts(created_at), _parse_ts(expires_at)
+    if not created or not expires or expires <= created:
+        return []
+    span = expires - created
+    horizon = expires - _POLL_HORIZON
+    out: List[datetime] = []
+    for lo, hi in _POLL_WINDOWS:
+        due = max(created + span * lo, horizon)
+        if due < created + span * hi:
+            out.append(due)
+    return out
+
+
+def event_reminder_due_times(
+    created_at: Any, starts_at: Any, prefs: Optional[str], now: Optional[datetime] = None,
+) -> List[datetime]:
+    """When an event's reminders may fire, per its notification preference."""
+    start = _parse_ts(starts_at)
+    now = now or _now()
+    if not start or start <= now:
+        return []
+    prefs = (prefs or "all").strip().lower()
+    if prefs == "none":
+        return []
+    out: List[datetime] = []
+    for pref, lead_hours, lower_hours in _EVENT_LEADS:
+        if prefs not in (pref, "all"):
+            continue
+        # Windows already closed need no row; ones already open fire at once.
+        if start - timedelta(hours=lower_hours) <= now:
+            continue
+        out.append(start - timedelta(hours=lead_hours))
+    if prefs == "all":
+        created = _parse_ts(created_at) or now
+        if start > created:
+            out.append(created + (start - created) * 0.75)
+    return out
+
+
+def _event_start(row: Any) -> Optional[datetime]:
+    """UTC start instant, falling back like ``check_single_event_notifications``."""
+    return (
+        _parse_ts(_row_get(row, "starts_at_utc", 3))
+        or _parse_ts(_row_get(row, "start_time", 2))
+        or _parse_ts(_row_get(row, "date", 1))
+    )
+
+
+def schedule_poll_reminders(cursor, poll_id: int) -> int:
+    """Enqueue reminder deadlines for one poll (no-op unless the queue is on)."""
+    if not _enabled() or not poll_id:
+        return 0
+    ph = get_sql_placeholder()
+    cursor.execute(f"SELECT created_at, expires_at FROM polls WHERE id = {ph}", (int(poll_id),))
+    row = cursor.fetchone()
+    if not row:
+        return 0
+    due = poll_reminder_due_times(_row_get(row, "created_at", 0), _row_get(row, "expires_at", 1))
+    return schedule_work(cursor, [(KIND_POLL_REMINDER, poll_id, d) for d in due])
+
+
+def schedule_event_reminders(cursor, event_id: int) -> int:
+    """Enqueue reminder deadlines for one calendar event."""
+    if not _enabled() or not event_id:
+        return 0
+    ph = get_sql_placeholder()
+    cursor.execute(
+        f"""
+        SELECT id, date, start_time, starts_at_utc, created_at, notification_preferences
+        FROM calendar_events WHERE id = {ph}
+        """,
+        (int(event_id),),
+    )
+    row = cursor.fetchone()
+    if not row:
+        return 0
+    due = event_reminder_due_times(
+        _row_get(row, "created_at", 4), _event_start(row), _row_get(row, "notification_preferences", 5)
+    )
+    return schedule_work(cursor, [(KIND_EVENT_REMINDER, event_id, d) for d in due])
+
+
+def schedule_steve_reminder(cursor, reminder_id: Optional[int], fire_at: Any) -> int:
+    """Enqueue one Reminder Vault DM at its fire time."""
+    due = _parse_ts(fire_at)
+    if not _enabled() or not reminder_id or not due:
+        return 0
+    return schedule_work(cursor, [(KIND_STEVE_REMINDER, reminder_id, due)])
+
+
+def schedule_content_job(job: Optional[Dict[str, Any]]) -> int:
+    """Enqueue the next run of an active content generation job."""
+    if not _enabled() or not job or str(job.get("status") or "") != "active":
+        return 0
+    due = _parse_ts(job.get("next_run_at")) or _now()
+    return schedule_work(None, [(KIND_CONTENT_JOB, job["id"], due)])
+
+
+# ── Claim / settle ─────────────────────────────────────────────────────
+
+
+def claim_due_work(
+    limit: int = SCHEDULED_WORK_BATCH_SIZE,
+    *,
+    kinds: Optional[Sequence[str]] = None,
+    lease_seconds: int = SCHEDULED_WORK_LEASE_SECONDS,
+) -> List[Dict[str, Any]]:
+    """Lease up to ``limit`` due rows for this worker and return them."""
+    ensure_scheduled_work_table()
+    ph = get_sql_placeholder()
+    now = _now()
+    token = uuid.uuid4().hex
+    kind_sql = ""
+    kind_params: Tuple[Any, ...] = ()
+    if kinds:
+        kind_sql = f" AND kind IN ({', '.join([ph] * len(kinds))})"
+        kind_params = tuple(kinds)
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            f"""
+            SELECT id FROM scheduled_work
+            WHERE dead = 0 AND due_at <= {ph}
+              AND (lease_until IS NULL OR lease_until < {ph}){kind_sql}
+            ORDER BY due_at, id
+            LIMIT {int(limit)}
+            """,
+            (_fmt(now), _fmt(now), *kind_params),
+        )
+        ids = [int(_row_get(r, "id", 0)) for r in c.fetchall() or []]
+        if not ids:
+            return []
+        c.execute(
+            f"""
+            UPDATE scheduled_work
+            SET lease_token = {ph}, lease_until = {ph}, attempts = attempts + 1
+            WHERE id IN ({', '.join([ph] * len(ids))}) AND (lease_until IS NULL OR lease_until < {ph})
+            """,
+            (token, _fmt(now + timedelta(seconds=lease_seconds)), *ids, _fmt(now)),
+        )
+        conn.commit()
+        c.execute(
+            f"SELECT id, kind, ref_id, due_at, attempts FROM scheduled_work WHERE lease_token = {ph} ORDER BY id",
+            (token,),
+        )
+        rows = c.fetchall() or []
+    return [
+        {
+            "id": int(_row_get(r, "id", 0)),
+            "kind": _row_get(r, "kind", 1),
+            "ref_id": int(_row_get(r, "ref_id", 2)),
+            "due_at": _parse_ts(_row_get(r, "due_at", 3)),
+            "attempts": int(_row_get(r, "attempts", 4) or 0),
+        }
+        for r in rows
+    ]
+
+
+def _settle(rows: List[Dict[str, Any]], failures: Dict[int, str]) -> Dict[str, int]:
+    """Delete finished rows; back off or dead-letter failed ones."""
+    ph = get_sql_placeholder()
+    now = _now()
+    done_ids = [r["id"] for r in rows if r["id"] not in failures]
+    retried = dead = 0
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        if done_ids:
+            c.execute(
+                f"DELETE FROM scheduled_work WHERE id IN ({', '.join([ph] * len(done_ids))})",
+                tuple(done_ids),
+            )
+        for r in rows:
+            err = failures.get(r["id"])
+            if err is None:
+                continue
+            if r["attempts"] >= SCHEDULED_WORK_MAX_ATTEMPTS:
+                c.execute(
+                    f"""
+                    UPDATE scheduled_work
+                    SET dead = 1, lease_token = NULL, lease_until = NULL, last_error = {ph}
+                    WHERE id = {ph}
+                    """,
+                    (err[:2000], r["id"]),
+                )
+                dead += 1
+                logger.error("scheduled_work %s (%s #%s) dead-lettered: %s", r["id"], r["kind"], r["ref_id"], err)
+            else:
+                # Push lease_until out instead of due_at so the unique
+                # (kind, ref_id, due_at) key and ordering are preserved.
+                retry_at = now + timedelta(seconds=min(_BACKOFF_CAP_SECONDS, 30 * 2 ** r["attempts"]))
+                c.execute(
+                    f"""
+                    UPDATE scheduled_work
+                    SET lease_token = NULL, lease_until = {ph}, last_error = {ph}
+                    WHERE id = {ph}
+                    """,
+                    (_fmt(retry_at), err[:2000], r["id"]),
+                )
+                retried += 1
+        conn.commit()
+    return {"done": len(done_ids), "retried": retried, "dead_lettered": dead}
+
+
+# ── Handlers (one call per (kind, ref_id); raise to retry) ─────────────
+
+
+def _handle_poll_reminder(poll_id: int) -> int:
+    from backend.services.notifications import check_single_poll_notifications
+
+    ph = get_sql_placeholder()
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(f"SELECT expires_at FROM polls WHERE id = {ph} AND is_active = 1", (poll_id,))
+        row = c.fetchone()
+        expires = _parse_ts(_row_get(row, "expires_at", 0)) if row else None
+        # Same horizon as the legacy sweep: only polls closing within 24h.
+        if not expires or not (_now() < expires < _now() + _POLL_HORIZON):
+            return 0
+        sent = check_single_poll_notifications(poll_id, conn)
+        conn.commit()
+    return sent
+
+
+def _handle_event_reminder(event_id: int) -> int:
+    from backend.services.notifications import check_single_event_notifications
+
+    with get_db_connection() as conn:
+        sent = check_single_event_notifications(event_id, conn)
+        conn.commit()
+    return sent
+
+
+def _handle_steve_reminder(reminder_id: int) -> int:
+    from backend.services.steve_reminder_vault import fire_scheduled_reminder
+
+    return 1 if fire_scheduled_reminder(reminder_id) else 0
+
+
+def _handle_content_job(job_id: int) -> int:
+    from backend.services.content_generation import get_job, process_due_job
+
+    job = get_job(job_id)
+    if not job or str(job.get("status") or "") != "active":
+        return 0
+    next_run = _parse_ts(job.get("next_run_at"))
+    # A reschedule moved the run later; the newer row will pick it up.
+    if next_run and next_run > _now():
+        return 0
+    process_due_job(job)
+    return 1
+
+
+_HANDLERS: Dict[str, Callable[[int], int]] = {
+    KIND_POLL_REMINDER: _handle_poll_reminder,
+    KIND_EVENT_REMINDER: _handle_event_reminder,
+    KIND_STEVE_REMINDER: _handle_steve_reminder,
+    KIND_CONTENT_JOB: _handle_content_job,
+}
+
+
+# ── Dispatch ───────────────────────────────────────────────────────────
+
+
+def _run_kind(kind: str, rows: List[Dict[str, Any]]) -> Tuple[Dict[int, str], int]:
+    """Run one kind's rows on its own pool; returns ``(failures, handled)``."""
+    handler = _HANDLERS.get(kind)
+    if handler is None:
+        return {r["id"]: f"unknown scheduled_work kind: {kind}" for r in rows}, 0
+    by_ref: Dict[int, List[Dict[str, Any]]] = {}
+    for r in rows:
+        by_ref.setdefault(r["ref_id"], []).append(r)
+
+    def _one(ref_id: int) -> Tuple[int, Optional[str], int]:
+        try:
+            return ref_id, None, int(handler(ref_id) or 0)
+        except Exception as exc:
+            logger.warning("scheduled_work %s #%s failed: %s", kind, ref_id, exc)
+            return ref_id, f"{kind}: {exc}", 0
+
+    failures: Dict[int, str] = {}
+    handled = 0
+    workers = max(1, min(KIND_CONCURRENCY.get(kind, 1), len(by_ref)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"sw-{kind}") as pool:
+        for ref_id, err, count in pool.map(_one, list(by_ref)):
+            handled += count
+            if err:
+                failures.update({r["id"]: err for r in by_ref[ref_id]})
+    return failures, handled
+
+
+def _kind_claim_limit(kind: str, batch_size: int) -> int:
+    waves = KIND_CLAIM_WAVES.get(kind, _DEFAULT_CLAIM_WAVES)
+    return max(1, min(int(batch_size), KIND_CONCURRENCY.get(kind, 1) * waves))
+
+
+def _drain_kind(kind: str, *, max_batches: int, batch_size: int) -> Dict[str, int]:
+    """Claim, run and settle one kind's due rows, a pool-sized batch at a time."""
+    totals = {"batches": 0, "claimed": 0, "done": 0, "retried": 0, "dead_lettered": 0, "handled": 0}
+    limit = _kind_claim_limit(kind, batch_size)
+    for _ in range(max_batches):
+        rows = claim_due_work(limit, kinds=[kind])
+        if not rows:
+            break
+        failures, handled = _run_kind(kind, rows)
+        settled = _settle(rows, failures)
+        totals["batches"] += 1
+        totals["claimed"] += len(rows)
+        totals["handled"] += handled
+        for key in ("done", "retried", "dead_lettered"):
+            totals[key] += settled[key]
+        if len(rows) < limit:
+            break
+    return totals
+
+
+def dispatch_due_work(
+    *,
+    kinds: Optional[Sequence[str]] = None,
+    max_batches: int = 20,
+    batch_size: int = SCHEDULED_WORK_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """Claim and run due rows until none are left (or ``max_batches`` per kind)."""
+    totals: Dict[str, Any] = {"batches": 0, "claimed": 0, "done": 0, "retried": 0, "dead_lettered": 0, "handled": {}}
+    run_kinds = list(dict.fromkeys(kinds or _HANDLERS))
+    # Kinds drain side by side; each claims only what its own pool can run.
+    with ThreadPoolExecutor(max_workers=len(run_kinds), thread_name_prefix="sw-kind") as pool:
+        results = list(pool.map(
+            lambda kind: (kind, _drain_kind(kind, max_batches=max_batches, batch_size=batch_size)),
+            run_kinds,
+        ))
+    for kind, kind_totals in results:
+        if kind_totals["handled"] or kind_totals["claimed"]:
+            totals["handled"][kind] = kind_totals["handled"]
+        for key in ("batches", "claimed", "done", "retried", "dead_lettered"):
+            totals[key] += kind_totals[key]
+    return totals
+
+
+def scheduled_work_stats() -> Dict[str, Any]:
+    """Pending / due / dead counts per kind for cron logs."""
+    ensure_scheduled_work_table()
+    ph = get_sql_placeholder()
+    stats: Dict[str, Any] = {}
+    try:
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            c.execute(
+                f"""
+                SELECT kind,
+                       SUM(CASE WHEN dead = 0 THEN 1 ELSE 0 END) AS pending,
+                       SUM(CASE WHEN dead = 0 AND due_at <= {ph} THEN 1 ELSE 0 END) AS due,
+                       SUM(CASE WHEN dead = 1 THEN 1 ELSE 0 END) AS dead
+                FROM scheduled_work
+                GROUP BY kind
+                """,
+                (_fmt(_now()),),
+            )
+            for r in c.fetchall() or []:
+                stats[_row_get(r, "kind", 0)] = {
+                    "pending": int(_row_get(r, "pending", 1) or 0),
+                    "due": int(_row_get(r, "due", 2) or 0),
+                    "dead": int(_row_get(r, "dead", 3) or 0),
+                }
+    except Exception as exc:
+        logger.warning("scheduled_work_stats failed: %s", exc)
+    return stats
+
+
+# ── Seeding (first switch-on) ──────────────────────────────────────────
+
+
+def seed_scheduled_work() -> Dict[str, int]:
+    """Enqueue deadlines for rows that predate the queue. Safe to re-run."""
+    ensure_scheduled_work_table()
+    ph = get_sql_placeholder()
+    now = _now()
+    out = {KIND_POLL_REMINDER: 0, KIND_EVENT_REMINDER: 0, KIND_STEVE_REMINDER: 0, KIND_CONTENT_JOB: 0}
+    items: List[Tuple[str, int, datetime]] = []
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            f"SELECT id, created_at, expires_at FROM polls WHERE is_active = 1 AND expires_at > {ph}",
+            (_fmt(now),),
+        )
+        for r in c.fetchall() or []:
+            for due in poll_reminder_due_times(_row_get(r, "created_at", 1), _row_get(r, "expires_at", 2)):
+                items.append((KIND_POLL_REMINDER, int(_row_get(r, "id", 0)), due))
+                out[KIND_POLL_REMINDER] += 1
+
+        c.execute(
+            f"""
+            SELECT id, date, start_time, starts_at_utc, created_at, notification_preferences
+            FROM calendar_events WHERE date >= {ph}
+            """,
+            ((now - timedelta(days=1)).strftime("%Y-%m-%d"),),
+        )
+        for r in c.fetchall() or []:
+            due_times = event_reminder_due_times(
+                _row_get(r, "created_at", 4), _event_start(r), _row_get(r, "notification_preferences", 5), now
+            )
+            for due in due_times:
+                items.append((KIND_EVENT_REMINDER, int(_row_get(r, "id", 0)), due))
+                out[KIND_EVENT_REMINDER] += 1
+
+        try:
+            c.execute("SELECT id, fire_at_utc FROM steve_reminder_vault WHERE status = 'scheduled'")
+            for r in c.fetchall() or []:
+                due = _parse_ts(_row_get(r, "fire_at_utc", 1))
+                if due:
+                    items.append((KIND_STEVE_REMINDER, int(_row_get(r, "id", 0)), due))
+                    out[KIND_STEVE_REMINDER] += 1
+        except Exception as exc:
+            logger.warning("scheduled_work seed: reminder vault skipped: %s", exc)
+
+        try:
+            c.execute("SELECT id, next_run_at FROM content_generation_jobs WHERE status = 'active'")
+            for r in c.fetchall() or []:
+                due = _parse_ts(_row_get(r, "next_run_at", 1)) or now
+                items.append((KIND_CONTENT_JOB, int(_row_get(r, "id", 0)), due))
+                out[KIND_CONTENT_JOB] += 1
+        except Exception as exc:
+            logger.warning("scheduled_work seed: content jobs skipped: %s", exc)
+
+        for start in range(0, len(items), 500):
+            schedule_work(c, items[start:start + 500])
+        conn.commit()
+    return out
@@ -0,0 +1,389 @@
+"""Versioned schema migrations for DDL that used to run on request paths.
+
+Many services create their tables / columns lazily through ``ensure_*``
+helpers called on every request — failing ``ALTER TABLE`` attempts,
+``SHOW TABLES`` and ``SELECT 1`` probes that take metadata locks on hot
+tables under load. :data:`MIGRATIONS` registers those helpers as numbered
+migrations; :func:`apply_migrations` runs the pending ones once (at deploy
+via ``python -m backend.services.schema_migrations``, or from the startup
+thread) and records each version in ``schema_migrations``.
+
+Gated helpers start with ``if schema_is_current(): return``. Once the
+database reports :data:`SCHEMA_VERSION` (and ``SCHEMA_VERSION_GATE`` is on)
+that check is a module-level boolean for the rest of the process; until then
+the helpers keep their old self-healing behaviour, re-checking the recorded
+version at most every ``SCHEMA_VERSION_RECHECK_SECONDS``.
+
+Adding a migration: append ``Migration(<next version>, "<name>", fn)`` —
+never renumber or edit an applied one — and gate the helper it covers.
+Migration functions issue their DDL themselves and let errors propagate: a
+version is recorded only when its DDL really ran, because recording it turns
+the helpers' self-healing off for good. They must not call ``ensure_*``
+helpers that swallow errors, nor helpers that grow over time — a version
+recorded before a helper gained a column never applies that column. Any edit
+to a gated helper's DDL therefore needs a new migration version too.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set
+
+from backend.services.database import USE_MYSQL, get_db_connection, get_sql_placeholder
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    apply: Callable[[object], None]
+
+
+def _existing_columns(cursor, table: str) -> Set[str]:
+    if USE_MYSQL:
+        cursor.execute(f"SHOW COLUMNS FROM {table}")
+        return {str(r["Field"] if hasattr(r, "keys") else r[0]) for r in cursor.fetchall() or []}
+    cursor.execute(f"PRAGMA table_info({table})")
+    return {str(r["name"] if hasattr(r, "keys") else r[1]) for r in cursor.fetchall() or []}
+
+
+def _add_columns(cursor, table: str, columns) -> None:
+    """``ALTER TABLE … ADD COLUMN`` for each ``(name, mysql_def, sqlite_def)``
+    the table lacks. Errors propagate so the version is not recorded."""
+    existing = _existing_columns(cursor, table)
+    for name, mysql_def, sqlite_def in columns:
+        if name not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {mysql_def if USE_MYSQL else sqlite_def}")
+
+
+def _add_index(cursor, table: str, index: str, columns_sql: str) -> None:
+    if not USE_MYSQL:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {table} ({columns_sql})")
+        return
+    cursor.execute(f"SHOW INDEX FROM {table} WHERE Key_name = '{index}'")
+    if not cursor.fetchall():
+        cursor.execute(f"CREATE INDEX {index} ON {table} ({columns_sql})")
+
+
+def _community_ui_columns(cursor) -> None:
+    _add_columns(cursor, "communities", (
+        ("owner_feed_setup_intro_seen", "TINYINT(1) DEFAULT 0", "TINYINT(1) DEFAULT 0"),
+        ("owner_upgrade_prompt_dismissed_at", "DATETIME NULL", "DATETIME NULL"),
+    ))
+
+
+def _user_ui_columns(cursor) -> None:
+    _add_columns(cursor, "users", (
+        ("communities_spotlight_tour_seen", "TINYINT(1) DEFAULT 0", "TINYINT(1) DEFAULT 0"),
+    ))
+
+
+def _community_story_tables(cursor) -> None:
+    from backend.services.community_stories import ensure_story_tables
+
+    if not ensure_story_tables(cursor):
+        raise RuntimeError("community story tables could not be created")
+    # The helper's upgrade path for pre-existing MySQL tables swallows errors.
+    _add_columns(cursor, "community_stories", (
+        ("story_group_id", "VARCHAR(64)", "TEXT"),
+        ("description", "TEXT", "TEXT"),
+    ))
+    _add_index(cursor, "community_stories", "idx_cs_group", "story_group_id")
+
+
+def _group_chat_tables(cursor) -> None:
+    from backend.blueprints.group_chat import _create_group_chat_base_tables
+
+    _create_group_chat_base_tables(cursor)
+    _add_columns(cursor, "group_chat_messages", (
+        ("voice_path", "VARCHAR(500)", "TEXT"),
+        ("video_path", "VARCHAR(500)", "TEXT"),
+        ("media_paths", "TEXT", "TEXT"),
+        ("file_path", "VARCHAR(500)", "TEXT"),
+        ("file_name", "VARCHAR(255)", "TEXT"),
+        ("is_edited", "TINYINT DEFAULT 0", "INTEGER DEFAULT 0"),
+        ("audio_summary", "TEXT", "TEXT"),
+        ("client_key", "VARCHAR(100)", "TEXT"),
+    ))
+    if USE_MYSQL:
+        _add_index(cursor, "group_chat_messages", "idx_gcm_client_key", "client_key")
+    _add_columns(cursor, "group_chats", (
+        ("community_id", "INT DEFAULT NULL", "INTEGER DEFAULT NULL"),
+        ("steve_personality", "VARCHAR(50) DEFAULT NULL", "VARCHAR(50) DEFAULT NULL"),
+        ("steve_context_reset_at", "DATETIME DEFAULT NULL", "TEXT DEFAULT NULL"),
+    ))
+    _add_columns(cursor, "group_chat_read_receipts", (
+        ("cleared_before_message_id", "INT DEFAULT NULL", "INTEGER DEFAULT NULL"),
+    ))
+    if USE_MYSQL:
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS group_message_reactions (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                message_id INT NOT NULL,
+                username VARCHAR(100) NOT NULL,
+                reaction VARCHAR(10) NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE KEY unique_reaction (message_id, username)
+            )
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS steve_suppressed_topics (
+                id INT PRIMARY KEY AUTO_INCREMENT,
+                group_id INT NOT NULL,
+                topic VARCHAR(255) NOT NULL,
+                suppressed_by VARCHAR(100),
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                INDEX idx_sst_group (group_id)
+            )
+            """
+        )
+    else:
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS group_message_reactions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                message_id INTEGER NOT NULL,
+                username TEXT NOT NULL,
+                reaction TEXT NOT NULL,
+                created_at TEXT,
+                UNIQUE(message_id, username)
+            )
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS steve_suppressed_topics (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                group_id INTEGER NOT NULL,
+                topic TEXT NOT NULL,
+                suppressed_by TEXT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+
+
+def _group_chat_presence(cursor) -> None:
+    if USE_MYSQL:
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS group_chat_presence (
+                username VARCHAR(191) NOT NULL,
+                group_id INT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (username, group_id)
+            )
+            """
+        )
+    else:
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS group_chat_presence (
+                username TEXT NOT NULL,
+                group_id INTEGER NOT NULL,
+                updated_at TEXT DEFAULT (datetime('now')),
+                PRIMARY KEY (username, group_id)
+            )
+            """
+        )
+
+
+def _event_rsvp_counters(cursor) -> None:
+    from backend.services.community_calendar import ensure_event_rsvp_counters_table
+
+    ensure_event_rsvp_counters_table(cursor)
+
+
+def _community_unread_marks(cursor) -> None:
+    from backend.services.community_unread import ensure_unread_marks_table
+
+    ensure_unread_marks_table(cursor)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "community_ui_columns", _community_ui_columns),
+    Migration(2, "user_ui_columns", _user_ui_columns),
+    Migration(3, "community_story_tables", _community_story_tables),
+    Migration(4, "group_chat_tables", _group_chat_tables),
+    Migration(5, "group_chat_presence", _group_chat_presence),
+    Migration(6, "event_rsvp_counters", _event_rsvp_counters),
+    Migration(7, "community_unread_marks", _community_unread_marks),
+]
+
+SCHEMA_VERSION = max(m.version for m in MIGRATIONS)
+
+_LOCK_NAME = "schema_migrations"
+_LOCK_TIMEOUT_SECONDS = 60
+_RECHECK_SECONDS = float(os.environ.get("SCHEMA_VERSION_RECHECK_SECONDS", "60"))
+
+_state_lock = threading.Lock()
+_schema_current = False
+_last_check = float("-inf")
+_applying = threading.local()
+
+
+def _ensure_versions_table(cursor) -> None:
+    if USE_MYSQL:
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INT PRIMARY KEY,
+                name VARCHAR(191) NOT NULL,
+                applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+    else:
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                applied_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+
+
+def _applied_versions(cursor) -> Set[int]:
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {int(r["version"] if hasattr(r, "keys") else r[0]) for r in cursor.fetchall() or []}
+
+
+def recorded_version() -> int:
+    """Highest applied version, or 0 when nothing has been recorded."""
+    try:
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            c.execute("SELECT MAX(version) AS version FROM schema_migrations")
+            row = c.fetchone()
+    except Exception:
+        return 0
+    if not row:
+        return 0
+    return int((row["version"] if hasattr(row, "keys") else row[0]) or 0)
+
+
+def schema_is_current() -> bool:
+    """True once the database is known to be at :data:`SCHEMA_VERSION`.
+
+    Gated ``ensure_*`` helpers return immediately when this is True. Always
+    False while :func:`apply_migrations` runs in this thread, so migrations
+    can call the helpers they wrap.
+    """
+    global _schema_current, _last_check
+    from backend.services.feature_flags import schema_version_gate_enabled
+
+    if getattr(_applying, "active", False) or not schema_version_gate_enabled():
+        return False
+    if _schema_current:
+        return True
+    now = time.monotonic()
+    with _state_lock:
+        if _schema_current or now - _last_check < _RECHECK_SECONDS:
+            return _schema_current
+        _last_check = now
+    current = recorded_version() >= SCHEMA_VERSION
+    if current:
+        _schema_current = True
+    return current
+
+
+def reset_schema_state() -> None:
+    """Forget the cached version (tests, or after restoring a database)."""
+    global _schema_current, _last_check
+    with _state_lock:
+        _schema_current = False
+        _last_check = float("-inf")
+
+
+def _acquire_lock(cursor) -> bool:
+    if not USE_MYSQL:
+        return True
+    ph = get_sql_placeholder()
+    cursor.execute(f"SELECT GET_LOCK({ph}, {ph}) AS locked", (_LOCK_NAME, _LOCK_TIMEOUT_SECONDS))
+    row = cursor.fetchone()
+    if not row:
+        return False
+    return int((row["locked"] if hasattr(row, "keys") else row[0]) or 0) == 1
+
+
+def _release_lock(cursor) -> None:
+    if not USE_MYSQL:
+        return
+    try:
+        ph = get_sql_placeholder()
+        cursor.execute(f"SELECT RELEASE_LOCK({ph})", (_LOCK_NAME,))
+        cursor.fetchone()
+    except Exception:
+        pass
+
+
+def apply_migrations(migrations: Optional[List[Migration]] = None) -> Dict[str, object]:
+    """Apply pending migrations in version order; returns what ran.
+
+    Concurrent instances serialize on a MySQL named lock, so only one of them
+    runs the DDL during a rollout. A failing migration stops the run (later
+    versions may depend on it) and leaves the gate closed.
+    """
+    global _schema_current
+    migrations = sorted(migrations if migrations is not None else MIGRATIONS, key=lambda m: m.version)
+    target = max((m.version for m in migrations), default=0)
+    result: Dict[str, object] = {"applied": [], "version": 0, "target": target, "error": None}
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        _ensure_versions_table(c)
+        if not _acquire_lock(c):
+            result["error"] = "could not acquire schema_migrations lock"
+            return result
+        _applying.active = True
+        try:
+            done = _applied_versions(c)
+            ph = get_sql_placeholder()
+            for migration in migrations:
+                if migration.version in done:
+                    continue
+                started = time.monotonic()
+                try:
+                    migration.apply(c)
+                    c.execute(
+                        f"INSERT INTO schema_migrations (version, name) VALUES ({ph}, {ph})",
+                        (migration.version, migration.name),
+                    )
+                    conn.commit()
+                except Exception as exc:
+                    logger.error("schema migration %s (%s) failed: %s",
+                                 migration.version, migration.name, exc, exc_info=True)
+                    result["error"] = f"{migration.version} {migration.name}: {exc}"
+                    break
+                done.add(migration.version)
+                result["applied"].append(migration.version)
+                logger.info("schema migration %s (%s) applied in %.2fs",
+                            migration.version, migration.name, time.monotonic() - started)
+            result["version"] = max(done, default=0)
+        finally:
+            _applying.active = False
+            _release_lock(c)
+    if result["error"] is None and result["version"] >= SCHEMA_VERSION:
+        with _state_lock:
+            _schema_current = True
+    return result
+
+
+if __name__ == "__main__":  # pragma: no cover - deploy entry point
+    import json
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    outcome = apply_migrations()
+    print(json.dumps(outcome))
+    sys.exit(1 if outcome["error"] else 0)
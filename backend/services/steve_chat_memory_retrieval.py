@@ -107,14 +107,15 @@ def embed_text(
     Logs exactly one ``ai_usage`` row on success or failure. Raises on
     API errors so the caller can fall back gracefully.
     """
-    from openai import OpenAI
+    from backend.services.llm_clients import PROVIDER_OPENAI, PROVIDER_XAI, get_llm_client
 
     api_key, base_url = _get_embedding_api_config()
     if not api_key:
         logger.warning("No embedding API key configured (OPENAI_API_KEY / XAI_API_KEY) - using zero vector for local testing")
         return [0.0] * 1536  # dummy vector for local testing (text-embedding-3-small dim)
 
-    client = OpenAI(api_key=api_key, base_url=base_url)
+    provider = PROVIDER_XAI if base_url and "x.ai" in base_url else PROVIDER_OPENAI
+    client = get_llm_client(provider, api_key=api_key, base_url=base_url)
 
     import time as _time
 
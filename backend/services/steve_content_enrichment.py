@@ -12,13 +12,20 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import re
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Dict, List, Optional, Set, Tuple
 from urllib.parse import parse_qs, urlparse
 
 import requests
 
+from backend.services.feature_flags import (
+    outbound_http_cache_enabled,
+    steve_url_enrichment_store_enabled,
+)
+
 logger = logging.getLogger(__name__)
 
 # Rolling window matches _fetch_user_recent_activity (12 months, posts only)
@@ -29,6 +36,9 @@ MAX_CHARS_PER_SOURCE = 8000
 MAX_TOTAL_ENRICHMENT_CHARS = 24000
 FETCH_TIMEOUT_SEC = 15
 MAX_PARALLEL_FETCHES = 4
+# With STEVE_URL_ENRICHMENT_STORE on, fetches and Whisper jobs run on process-wide pools instead.
+MAX_SHARED_FETCHES = int(os.getenv("STEVE_ENRICH_FETCH_WORKERS", "8"))
+MAX_PARALLEL_TRANSCRIPTIONS = int(os.getenv("STEVE_ENRICH_TRANSCRIBE_WORKERS", "2"))
 MAX_AUDIO_BYTES_WHISPER = 24 * 1024 * 1024  # under OpenAI ~25MB limit
 
 _YT_VIDEO_RE = re.compile(
@@ -36,6 +46,9 @@ _YT_VIDEO_RE = re.compile(
 )
 _AUDIO_EXT_RE = re.compile(r"\.(mp3|m4a|wav|aac|ogg|webm)(\?|$)", re.I)
 
+_pools: Dict[str, ThreadPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
 # Hosts where we do not attempt generic HTML extraction (handled elsewhere or unsupported)
 _SKIP_HTML_HOSTS = frozenset(
     {
@@ -80,7 +93,25 @@ def extract_youtube_video_id(url: str) -> Optional[str]:
     return None
 
 
+YOUTUBE_TRANSCRIPT_CACHE_TTL = 7 * 24 * 3600
+ARTICLE_READER_CACHE_TTL = 6 * 3600
+
+
 def _fetch_youtube_transcript(video_id: str) -> Tuple[Optional[str], Optional[str]]:
+    if outbound_http_cache_enabled():
+        from backend.services import outbound_http
+
+        return outbound_http.cached_lookup(
+            "youtube_transcript",
+            video_id,
+            lambda: _fetch_youtube_transcript_uncached(video_id),
+            ttl=YOUTUBE_TRANSCRIPT_CACHE_TTL,
+            negative_ttl=3600,
+        )
+    return _fetch_youtube_transcript_uncached(video_id)
+
+
+def _fetch_youtube_transcript_uncached(video_id: str) -> Tuple[Optional[str], Optional[str]]:
     try:
         from youtube_transcript_api import YouTubeTranscriptApi
     except ImportError as e:
@@ -117,14 +148,26 @@ def _fetch_article_text(url: str) -> Tuple[Optional[str], Optional[str]]:
         return None, "trafilatura package not installed"
 
     try:
-        r = requests.get(
-            url,
-            timeout=FETCH_TIMEOUT_SEC,
-            headers={"User-Agent": "Mozilla/5.0 (compatible; CPointBot/1.0; +https://c-point.co)"},
-        )
-        r.raise_for_status()
+        if outbound_http_cache_enabled():
+            from backend.services import outbound_http
+
+            # Extracted text is cached by the callers; this only shares the pool and host caps.
+            resp = outbound_http.fetch(url, ttl=0, timeout=FETCH_TIMEOUT_SEC)
+            if resp.error:
+                return None, f"Article fetch/extract error: {resp.error}"
+            if resp.status_code >= 400:
+                return None, f"Article fetch/extract error: HTTP {resp.status_code}"
+            html = resp.text
+        else:
+            r = requests.get(
+                url,
+                timeout=FETCH_TIMEOUT_SEC,
+                headers={"User-Agent": "Mozilla/5.0 (compatible; CPointBot/1.0; +https://c-point.co)"},
+            )
+            r.raise_for_status()
+            html = r.text
         text = trafilatura.extract(
-            r.text,
+            html,
             url=url,
             include_comments=False,
             include_tables=False,
@@ -138,6 +181,12 @@ def _fetch_article_text(url: str) -> Tuple[Optional[str], Optional[str]]:
 
 
 def _head_content_length(url: str) -> Optional[int]:
+    if outbound_http_cache_enabled():
+        from backend.services import outbound_http
+
+        resp = outbound_http.fetch(url, method="HEAD", ttl=3600, timeout=min(10, FETCH_TIMEOUT_SEC))
+        cl = resp.headers.get("Content-Length") or ""
+        return int(cl) if cl.isdigit() else None
     try:
         r = requests.head(
             url,
@@ -217,79 +266,66 @@ def _source_record(
     }
 
 
-def _enrich_single_url(
-    url: str, user_caption: str, post_date: str
-) -> Tuple[str, Optional[Dict[str, str]], Dict[str, Any]]:
-    """
-    Returns (block_text_for_prompt, error_record_or_none, source_record_for_firestore).
-    error_record: {"url", "error"}
-    """
-    kind = _classify_url(url)
-    headline = f"[Shared link — {post_date}] {url}"
-    cap = f' User caption: "{user_caption[:300]}"' if user_caption else ""
+_KIND_SECTIONS = {
+    "youtube": ("YouTube transcript (excerpt)", "YouTube transcript retrieved"),
+    "direct_audio": ("Audio transcription (Whisper excerpt)", "Audio transcribed (Whisper)"),
+    "article": ("Article text (excerpt)", "Article text retrieved"),
+}
+
 
+def _extract_url_text(url: str, kind: str) -> Tuple[Optional[str], Optional[str]]:
+    """``(text, error)`` for one classified URL; exactly one of the two is set."""
     if kind == "youtube":
         vid = extract_youtube_video_id(url)
         if not vid:
-            return (
-                "",
-                {"url": url, "error": "Could not parse YouTube video id"},
-                _source_record(url, kind, post_date, success=False, detail="Could not parse YouTube video id"),
-            )
+            return None, "Could not parse YouTube video id"
         text, err = _fetch_youtube_transcript(vid)
-        if err or not text:
-            return (
-                "",
-                {"url": url, "error": err or "No transcript"},
-                _source_record(url, kind, post_date, success=False, detail=err or "No transcript"),
-            )
-        body = _truncate(text, MAX_CHARS_PER_SOURCE)
-        block = f"{headline}{cap}\n--- YouTube transcript (excerpt) ---\n{body}\n"
-        return (
-            block,
-            None,
-            _source_record(url, kind, post_date, success=True, detail="YouTube transcript retrieved"),
-        )
-
-    if kind == "podcast_platform":
-        msg = "Podcast page — automatic transcript not available for this host (not a direct audio file)"
-        return (
-            "",
-            {"url": url, "error": msg},
-            _source_record(url, kind, post_date, success=False, detail=msg),
-        )
-
-    if kind == "direct_audio":
+        fallback = "No transcript"
+    elif kind == "podcast_platform":
+        return None, "Podcast page — automatic transcript not available for this host (not a direct audio file)"
+    elif kind == "direct_audio":
         text, err = _whisper_direct_audio_url(url)
-        if err or not text:
-            return (
-                "",
-                {"url": url, "error": err or "Whisper failed"},
-                _source_record(url, kind, post_date, success=False, detail=err or "Whisper failed"),
-            )
-        body = _truncate(text, MAX_CHARS_PER_SOURCE)
-        block = f"{headline}{cap}\n--- Audio transcription (Whisper excerpt) ---\n{body}\n"
-        return (
-            block,
-            None,
-            _source_record(url, kind, post_date, success=True, detail="Audio transcribed (Whisper)"),
-        )
+        fallback = "Whisper failed"
+    else:
+        text, err = _fetch_article_text(url)
+        fallback = "Article extraction failed"
+    if err or not text:
+        return None, err or fallback
+    return text, None
+
 
-    # article / generic HTML
-    text, err = _fetch_article_text(url)
+def _render_url_result(
+    url: str,
+    kind: str,
+    user_caption: str,
+    post_date: str,
+    text: Optional[str],
+    err: Optional[str],
+) -> Tuple[str, Optional[Dict[str, str]], Dict[str, Any]]:
     if err or not text:
         return (
             "",
-            {"url": url, "error": err or "Article extraction failed"},
-            _source_record(url, kind, post_date, success=False, detail=err or "Article extraction failed"),
+            {"url": url, "error": err},
+            _source_record(url, kind, post_date, success=False, detail=err),
         )
+    section, detail = _KIND_SECTIONS[kind]
+    headline = f"[Shared link — {post_date}] {url}"
+    cap = f' User caption: "{user_caption[:300]}"' if user_caption else ""
     body = _truncate(text, MAX_CHARS_PER_SOURCE)
-    block = f"{headline}{cap}\n--- Article text (excerpt) ---\n{body}\n"
-    return (
-        block,
-        None,
-        _source_record(url, kind, post_date, success=True, detail="Article text retrieved"),
-    )
+    block = f"{headline}{cap}\n--- {section} ---\n{body}\n"
+    return block, None, _source_record(url, kind, post_date, success=True, detail=detail)
+
+
+def _enrich_single_url(
+    url: str, user_caption: str, post_date: str
+) -> Tuple[str, Optional[Dict[str, str]], Dict[str, Any]]:
+    """
+    Returns (block_text_for_prompt, error_record_or_none, source_record_for_firestore).
+    error_record: {"url", "error"}
+    """
+    kind = _classify_url(url)
+    text, err = _extract_url_text(url, kind)
+    return _render_url_result(url, kind, user_caption, post_date, text, err)
 
 
 def _collect_urls_from_activity(activity: Dict[str, Any]) -> List[Tuple[str, str, str]]:
@@ -318,6 +354,81 @@ def _collect_urls_from_activity(activity: Dict[str, Any]) -> List[Tuple[str, str
     return out
 
 
+def _shared_pool(name: str, workers: int) -> ThreadPoolExecutor:
+    """Process-wide worker pool, so the budget holds across concurrent profile runs."""
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = _pools[name] = ThreadPoolExecutor(
+                max_workers=max(1, workers), thread_name_prefix=f"steve-enrich-{name}"
+            )
+        return pool
+
+
+def _store_url(url: str, kind: str) -> str:
+    """Enrichment store identity: every YouTube link form collapses to the video id."""
+    if kind == "youtube":
+        vid = extract_youtube_video_id(url)
+        if vid:
+            return f"https://youtube.com/watch?v={vid}"
+    return url
+
+
+def _extract_for_store(url: str, kind: str) -> Tuple[Optional[str], Optional[str]]:
+    text, err = _extract_url_text(url, kind)
+    return (_truncate(text, MAX_CHARS_PER_SOURCE) if text else None), err
+
+
+def _enrich_urls_staged(
+    items: List[Tuple[str, str, str]],
+) -> Dict[str, Tuple[str, Optional[Dict[str, str]], Dict[str, Any]]]:
+    """Classify and answer from the community enrichment store first, then fetch the rest.
+
+    Stage 1 (inline): classification plus one bulk store lookup; podcast pages
+    resolve immediately. Stage 2: article / transcript fetches on the shared
+    fetch pool, Whisper transcriptions on their own smaller pool so slow audio
+    never holds up cheap links. Results are written back to the store for the
+    next member who shared the same link.
+    """
+    from backend.services import url_enrichment_store
+
+    classified = [(u, c, d, _classify_url(u)) for u, c, d in items]
+    stored = url_enrichment_store.lookup_many(
+        _store_url(u, kind) for u, _c, _d, kind in classified if kind in _KIND_SECTIONS
+    )
+    results: Dict[str, Tuple[str, Optional[Dict[str, str]], Dict[str, Any]]] = {}
+    pending = {}
+    for u, c, d, kind in classified:
+        key_url = _store_url(u, kind)
+        if kind not in _KIND_SECTIONS:
+            text, err = _extract_url_text(u, kind)
+        elif key_url in stored:
+            text, err = stored[key_url]
+        else:
+            if kind == "direct_audio":
+                pool = _shared_pool("transcribe", MAX_PARALLEL_TRANSCRIPTIONS)
+            else:
+                pool = _shared_pool("fetch", MAX_SHARED_FETCHES)
+            fut = pool.submit(
+                url_enrichment_store.enrich,
+                key_url,
+                kind,
+                lambda u=u, kind=kind: _extract_for_store(u, kind),
+            )
+            pending[fut] = (u, c, d, kind)
+            continue
+        results[u] = _render_url_result(u, kind, c, d, text, err)
+
+    for fut in as_completed(pending):
+        u, c, d, kind = pending[fut]
+        try:
+            text, err = fut.result()
+        except Exception as e:
+            text, err = None, f"Unexpected: {e!s}"
+        results[u] = _render_url_result(u, kind, c, d, text, err)
+    return results
+
+
 def enrich_shared_activity_for_profile(
     activity: Optional[Dict[str, Any]],
     depth: str,
@@ -353,24 +464,27 @@ def enrich_shared_activity_for_profile(
         return "", [], []
 
     results_by_url: Dict[str, Tuple[str, Optional[Dict[str, str]], Dict[str, Any]]] = {}
-    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_FETCHES) as ex:
-        fmap = {ex.submit(_enrich_single_url, u, c, d): u for u, c, d in items}
-        for fut in as_completed(fmap):
-            u = fmap[fut]
-            try:
-                results_by_url[u] = fut.result()
-            except Exception as e:
-                results_by_url[u] = (
-                    "",
-                    {"url": u, "error": f"Unexpected: {e!s}"},
-                    _source_record(
-                        u,
-                        _classify_url(u),
+    if steve_url_enrichment_store_enabled():
+        results_by_url = _enrich_urls_staged(items)
+    else:
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_FETCHES) as ex:
+            fmap = {ex.submit(_enrich_single_url, u, c, d): u for u, c, d in items}
+            for fut in as_completed(fmap):
+                u = fmap[fut]
+                try:
+                    results_by_url[u] = fut.result()
+                except Exception as e:
+                    results_by_url[u] = (
                         "",
-                        success=False,
-                        detail=f"Unexpected: {e!s}",
-                    ),
-                )
+                        {"url": u, "error": f"Unexpected: {e!s}"},
+                        _source_record(
+                            u,
+                            _classify_url(u),
+                            "",
+                            success=False,
+                            detail=f"Unexpected: {e!s}",
+                        ),
+                    )
 
     ordered_blocks: List[str] = []
     errors: List[Dict[str, str]] = []
@@ -426,6 +540,8 @@ def fetch_article_for_reader(url: str) -> Dict[str, Any]:
     and reuses the private _fetch_article_text for trafilatura-based extraction.
     """
     from typing import Any, Dict  # for runtime
+    if outbound_http_cache_enabled():
+        return _fetch_article_for_reader_shared(url)
     try:
         from redis_cache import get_redis_client
         cache_key = f"article:reader:{hash(url)}"
@@ -454,3 +570,29 @@ def fetch_article_for_reader(url: str) -> Dict[str, Any]:
             pass  # non-critical
 
     return result
+
+
+def _fetch_article_for_reader_shared(url: str) -> Dict[str, Any]:
+    """Reader fetch through ``outbound_http.cached_lookup``.
+
+    Keyed by a digest of the URL (the legacy key used ``hash(url)``, which
+    differs per process), with failures negatively cached and the last good
+    text served if the site later errors.
+    """
+    from backend.services import outbound_http
+
+    text, error = outbound_http.cached_lookup(
+        "article_reader",
+        url,
+        lambda: _fetch_article_text(url),
+        ttl=ARTICLE_READER_CACHE_TTL,
+        negative_ttl=600,
+        stale_ttl=ARTICLE_READER_CACHE_TTL,
+    )
+    return {
+        "url": url,
+        "title": "Article Reader",
+        "content": text or "",
+        "error": str(error) if error else None,
+        "success": error is None,
+    }
@@ -0,0 +1,213 @@
+"""Concurrent context assembly for Steve DM and group turns.
+
+Before the main Grok call a turn gathers several independent sources —
+chat history, profile / KB context, thread memory, chat-memory retrieval,
+counters, hosted-tool routing. Each is declared as a :class:`ContextSource`
+and :func:`assemble_context` runs them together on a shared pool, so the
+pre-generation latency is the slowest source rather than the sum.
+
+Every source has its own deadline measured from the start of the phase. A
+source that misses it (or raises) contributes its ``default`` and the turn
+carries on with what arrived in time; the late task is left to finish in
+the background (e.g. a thread-summary refresh still persists for the next
+turn). The per-source timing breakdown is logged once per phase and kept on
+the returned :class:`ContextAssembly`.
+
+A ``required`` source has no deadline and no default: the phase waits for it
+and re-raises its error, so the turn is aborted rather than answered without
+it (privacy gates and moderation inputs, where "empty" is not a safe answer).
+
+``STEVE_PARALLEL_CONTEXT`` off runs the same sources sequentially on the
+calling thread (no deadlines), matching the pre-assembly behaviour.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from backend.services.feature_flags import steve_parallel_context_enabled
+
+logger = logging.getLogger(__name__)
+
+STATUS_OK = "ok"
+STATUS_TIMEOUT = "timeout"
+STATUS_ERROR = "error"
+
+CONTEXT_ASSEMBLY_WORKERS = int(os.environ.get("STEVE_CONTEXT_WORKERS", "16") or 16)
+
+# Per-source deadlines (seconds from phase start). Override one with
+# ``STEVE_CONTEXT_DEADLINE_<NAME>`` (e.g. ``STEVE_CONTEXT_DEADLINE_HISTORY=6``).
+DEFAULT_SOURCE_DEADLINES: Dict[str, float] = {
+    "history": 6.0,
+    "profiles": 3.0,
+    "community": 4.0,
+    "tools": 4.0,
+    "admin": 1.5,
+    "thread_summary": 6.0,
+    "chat_memory": 4.0,
+    "counters": 3.0,
+}
+FALLBACK_SOURCE_DEADLINE = 3.0
+
+
+def source_deadline(name: str) -> float:
+    raw = os.environ.get(f"STEVE_CONTEXT_DEADLINE_{name.upper()}")
+    if raw:
+        try:
+            return max(0.05, float(raw))
+        except ValueError:
+            pass
+    return DEFAULT_SOURCE_DEADLINES.get(name, FALLBACK_SOURCE_DEADLINE)
+
+
+@dataclass
+class ContextSource:
+    """One independent input to a Steve turn."""
+
+    name: str
+    fn: Callable[[], Any]
+    default: Any = None
+    deadline_seconds: Optional[float] = None
+    required: bool = False
+
+    def deadline(self) -> float:
+        if self.required:
+            return float("inf")
+        if self.deadline_seconds is not None:
+            return self.deadline_seconds
+        return source_deadline(self.name)
+
+
+@dataclass
+class ContextAssembly:
+    values: Dict[str, Any] = field(default_factory=dict)
+    timings: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    total_ms: int = 0
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.values.get(name, default)
+
+    def degraded(self) -> list:
+        return sorted(n for n, t in self.timings.items() if t.get("status") != STATUS_OK)
+
+    def summary(self) -> str:
+        parts = []
+        for name, t in self.timings.items():
+            suffix = "" if t["status"] == STATUS_OK else f"({t['status']})"
+            parts.append(f"{name}={t['ms']}ms{suffix}")
+        return " ".join(parts)
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=CONTEXT_ASSEMBLY_WORKERS,
+                    thread_name_prefix="steve-ctx",
+                )
+    return _executor
+
+
+def _timed_call(fn: Callable[[], Any]) -> tuple:
+    t0 = time.perf_counter()
+    value = fn()
+    return value, int((time.perf_counter() - t0) * 1000)
+
+
+def _run_sequential(sources: list, out: ContextAssembly) -> None:
+    for src in sources:
+        t0 = time.perf_counter()
+        try:
+            out.values[src.name] = src.fn()
+            status = STATUS_OK
+        except Exception as exc:
+            if src.required:
+                raise
+            logger.warning("Steve context source %s failed (non-fatal): %s", src.name, exc)
+            out.values[src.name] = src.default
+            status = STATUS_ERROR
+        out.timings[src.name] = {"ms": int((time.perf_counter() - t0) * 1000), "status": status}
+
+
+def _run_parallel(sources: list, out: ContextAssembly, started: float) -> None:
+    pool = _get_executor()
+    futures: Dict[str, Future] = {src.name: pool.submit(_timed_call, src.fn) for src in sources}
+    # Wait in deadline order so each wait is bounded by its own remaining budget.
+    for src in sorted(sources, key=lambda s: s.deadline()):
+        fut = futures[src.name]
+        if src.required:
+            value, ms = fut.result()  # no deadline; errors abort the phase
+            out.values[src.name] = value
+            out.timings[src.name] = {"ms": ms, "status": STATUS_OK}
+            continue
+        remaining = started + src.deadline() - time.perf_counter()
+        try:
+            value, ms = fut.result(timeout=max(0.0, remaining))
+            out.values[src.name] = value
+            out.timings[src.name] = {"ms": ms, "status": STATUS_OK}
+        except FuturesTimeoutError:
+            fut.cancel()
+            out.values[src.name] = src.default
+            out.timings[src.name] = {
+                "ms": int((time.perf_counter() - started) * 1000),
+                "status": STATUS_TIMEOUT,
+            }
+            logger.warning(
+                "Steve context source %s missed its %.1fs deadline; continuing without it",
+                src.name, src.deadline(),
+            )
+        except Exception as exc:
+            out.values[src.name] = src.default
+            out.timings[src.name] = {
+                "ms": int((time.perf_counter() - started) * 1000),
+                "status": STATUS_ERROR,
+            }
+            logger.warning("Steve context source %s failed (non-fatal): %s", src.name, exc)
+
+
+def assemble_context(
+    sources: Iterable[ContextSource],
+    *,
+    label: str,
+    parallel: Optional[bool] = None,
+) -> ContextAssembly:
+    """Run ``sources`` and return their values keyed by name.
+
+    A failing optional source contributes its ``default``; a failing
+    ``required`` source raises.
+    """
+    srcs = [s for s in sources if s is not None]
+    out = ContextAssembly()
+    if not srcs:
+        return out
+    if parallel is None:
+        parallel = steve_parallel_context_enabled()
+    started = time.perf_counter()
+    if parallel and len(srcs) > 1:
+        _run_parallel(srcs, out, started)
+    else:
+        _run_sequential(srcs, out)
+    # Report in declaration order regardless of completion order.
+    out.timings = {s.name: out.timings[s.name] for s in srcs if s.name in out.timings}
+    out.total_ms = int((time.perf_counter() - started) * 1000)
+    logger.info(
+        "Steve context %s total=%dms %s%s",
+        label,
+        out.total_ms,
+        out.summary(),
+        f" degraded={','.join(out.degraded())}" if out.degraded() else "",
+    )
+    return out
+
@@ -12,11 +12,13 @@ import os
 import re
 import time
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Optional, Tuple
 
 from backend.services.content_generation.llm import XAI_API_KEY
 from backend.services.database import USE_MYSQL, get_db_connection
+from backend.services.dm_thread_summary import record_dm_message, record_steve_thread_message
 from backend.services.dm_human_thread import (
     ensure_human_dm_thread_column,
     human_pair_thread_key,
@@ -25,6 +27,8 @@ from backend.services import ai_usage
 from backend.services import entitlements_errors as _errs
 from backend.services.entitlements_gate import gate_or_reason
 from backend.services.feature_flags import entitlements_enforcement_enabled as _enforce
+from backend.services.feature_flags import steve_dm_streaming_enabled
+from backend.services.steve_context_assembly import ContextSource, assemble_context
 
 logger = logging.getLogger(__name__)
 
@@ -364,85 +368,51 @@ def _insert_steves_mysql_row_human_thread(
                 (peer_username, body, ts, th),
             )
         msg_id = getattr(c, "lastrowid", None)
+        record_steve_thread_message(c, peer_a=sender_username, peer_b=peer_username, message_id=msg_id)
         conn.commit()
     return int(msg_id) if msg_id else None
 
 
-def _run_grok_dm_turn(
-    *,
-    sender_username: str,
-    user_message: str,
-    other_username: Optional[str],
-    entitlements: Optional[dict] = None,
-) -> None:
-    from backend.services.community import is_app_admin
-    from backend.services.steve_model_config import (
-        context_limit,
-        estimate_response_cost_usd,
-        get_steve_model_config,
-        output_cap_for_surface,
-        peer_context_limit,
-        response_usage_tokens,
-    )
-    from backend.services.steve_prompt_policy import (
-        append_response_policy,
-        should_include_user_profile,
-    )
-    from backend.services.steve_profiling_gates import user_can_access_steve_kb
-    from openai import OpenAI
+def _steve_parse_dt(val):
+    from datetime import datetime as _dt, timezone as _tz
 
-    if other_username:
-        chat_user_a = sender_username
-        chat_user_b = other_username
-    else:
-        chat_user_a = sender_username
-        chat_user_b = "steve"
-
-    def _steve_parse_dt(val):
-        from datetime import datetime as _dt, timezone as _tz
-
-        if val is None:
-            return None
-        try:
-            if hasattr(val, "timestamp") and callable(getattr(val, "timestamp")):
-                return _dt.utcfromtimestamp(val.timestamp())
-            if isinstance(val, _dt):
-                if val.tzinfo is not None:
-                    return val.astimezone(_tz.utc).replace(tzinfo=None)
-                return val
-            if isinstance(val, str):
-                s = val.strip().replace("Z", "+00:00")
-                dt = _dt.fromisoformat(s)
-                if dt.tzinfo is not None:
-                    return dt.astimezone(_tz.utc).replace(tzinfo=None)
-                return dt
-        except Exception:
-            pass
+    if val is None:
         return None
+    try:
+        if hasattr(val, "timestamp") and callable(getattr(val, "timestamp")):
+            return _dt.utcfromtimestamp(val.timestamp())
+        if isinstance(val, _dt):
+            if val.tzinfo is not None:
+                return val.astimezone(_tz.utc).replace(tzinfo=None)
+            return val
+        if isinstance(val, str):
+            s = val.strip().replace("Z", "+00:00")
+            dt = _dt.fromisoformat(s)
+            if dt.tzinfo is not None:
+                return dt.astimezone(_tz.utc).replace(tzinfo=None)
+            return dt
+    except Exception:
+        pass
+    return None
 
-    recent_messages: List[str] = []
-    image_urls_collected: List[str] = []
-    context_reset_at = None
-    reset_dt = None
-    firestore_context_ok = False
-    fs = None
-    conv_id = None
 
-    is_peer = bool(other_username)
-    from backend.services.steve_thread_memory import dm_context_read_limit
+@dataclass
+class _DmHistory:
+    recent_messages: List[str] = field(default_factory=list)
+    image_urls: List[str] = field(default_factory=list)
+    context_reset_at: object = None
+    reset_dt: Optional[datetime] = None
+    firestore_ok: bool = False
+    fs: object = None
+    conv_id: Optional[str] = None
 
-    _peer_window = peer_context_limit(entitlements, fallback=PEER_DM_CONTEXT_LINES)
-    _max_ctx = context_limit(entitlements, fallback=200)
-    _read_limit = dm_context_read_limit(
-        entitlements,
-        is_peer=is_peer,
-        peer_window=_peer_window,
-        max_context=_max_ctx,
-    )
 
+def _load_dm_history(chat_user_a: str, chat_user_b: str, read_limit: int) -> _DmHistory:
+    """Recent DM lines for the prompt: Firestore first, MySQL fallback."""
+    hist = _DmHistory()
+    recent_messages = hist.recent_messages
+    image_urls_collected = hist.image_urls
     try:
-        import os
-
         from backend.services.steve_chat_images import append_image_from_row
 
         FIRESTORE_DATABASE = os.environ.get("FIRESTORE_DATABASE", "cpoint")
@@ -450,24 +420,27 @@ def _run_grok_dm_turn(
 
         project = os.environ.get("GOOGLE_CLOUD_PROJECT") or os.environ.get("GCP_PROJECT")
         fs = _firestore.Client(project=project, database=FIRESTORE_DATABASE) if project else _firestore.Client(database=FIRESTORE_DATABASE)
+        hist.fs = fs
 
         from backend.services.firestore_reads import _find_dm_conv_id
 
         conv_id = _find_dm_conv_id(fs, chat_user_a, chat_user_b)
+        hist.conv_id = conv_id
         if conv_id:
             try:
                 conv_doc = fs.collection("dm_conversations").document(conv_id).get()
                 if conv_doc.exists:
                     cd = conv_doc.to_dict() or {}
-                    context_reset_at = cd.get("steve_context_reset_at")
-                    reset_dt = _steve_parse_dt(context_reset_at)
+                    hist.context_reset_at = cd.get("steve_context_reset_at")
+                    hist.reset_dt = _steve_parse_dt(hist.context_reset_at)
             except Exception as reset_err:
                 logger.warning("Failed to load DM conversation reset timestamp: %s", reset_err)
+            reset_dt = hist.reset_dt
 
             msgs_ref = fs.collection("dm_conversations").document(conv_id).collection("messages")
             docs = list(
                 msgs_ref.order_by("created_at", direction="DESCENDING")
-                .limit(_read_limit)
+                .limit(read_limit)
                 .stream()
             )
             docs.reverse()
@@ -491,65 +464,72 @@ def _run_grok_dm_turn(
                     recent_messages.append(f"{ts_prefix}{snd}: {text}")
                 elif snd and (d.get("image_path") or d.get("media_paths")):
                     recent_messages.append(f"{ts_prefix}{snd}: [shared a photo]")
-            firestore_context_ok = True
+            hist.firestore_ok = True
     except Exception as fs_err:
         logger.warning("Steve DM Firestore context failed: %s", fs_err)
 
-    if not firestore_context_ok:
-        from backend.services.steve_chat_images import append_image_from_row
-        from backend.services.steve_thread_memory import format_msg_timestamp as _fmt_ts
+    if hist.firestore_ok:
+        return hist
 
-        with get_db_connection() as conn:
-            c = conn.cursor()
-            from backend.services.database import get_sql_placeholder
+    from backend.services.steve_chat_images import append_image_from_row
+    from backend.services.steve_thread_memory import format_msg_timestamp as _fmt_ts
 
-            ph = get_sql_placeholder()
-            c.execute(
-                f"""
-                SELECT sender, message, image_path, media_paths, timestamp, is_encrypted FROM messages
-                WHERE (sender = {ph} AND receiver = {ph})
-                   OR (sender = {ph} AND receiver = {ph})
-                ORDER BY timestamp DESC
-                LIMIT {int(_read_limit)}
-                """,
-                (chat_user_a, chat_user_b, chat_user_b, chat_user_a),
-            )
-            rows = list(c.fetchall())
-            rows.reverse()
-            for row in rows:
-                if hasattr(row, "keys"):
-                    row_dict = {
-                        "image_path": row.get("image_path"),
-                        "media_paths": row.get("media_paths"),
-                    }
-                    s = row["sender"]
-                    m = row.get("message")
-                    ts_raw = row.get("timestamp")
-                    is_encrypted = bool(row.get("is_encrypted", False))
-                else:
-                    row_dict = {
-                        "image_path": row[2] if len(row) > 2 else None,
-                        "media_paths": row[3] if len(row) > 3 else None,
-                    }
-                    s = row[0]
-                    m = row[1]
-                    ts_raw = row[4] if len(row) > 4 else None
-                    is_encrypted = bool(row[5]) if len(row) > 5 else False
-                append_image_from_row(row_dict, image_urls_collected)
-                if not s or is_encrypted:
-                    continue
-                row_ts = _steve_parse_dt(ts_raw) if ts_raw is not None else None
-                if reset_dt and row_ts and row_ts < reset_dt:
-                    continue
-                ts_prefix = _fmt_ts(ts_raw)
-                text = (m or "").strip() if m is not None else ""
-                if text:
-                    recent_messages.append(f"{ts_prefix}{s}: {text}")
-                elif row_dict.get("image_path") or row_dict.get("media_paths"):
-                    recent_messages.append(f"{ts_prefix}{s}: [shared a photo]")
-
-    current_date = datetime.now().strftime("%A, %B %d, %Y at %H:%M UTC")
+    reset_dt = hist.reset_dt
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        from backend.services.database import get_sql_placeholder
 
+        ph = get_sql_placeholder()
+        c.execute(
+            f"""
+            SELECT sender, message, image_path, media_paths, timestamp, is_encrypted FROM messages
+            WHERE (sender = {ph} AND receiver = {ph})
+               OR (sender = {ph} AND receiver = {ph})
+            ORDER BY timestamp DESC
+            LIMIT {int(read_limit)}
+            """,
+            (chat_user_a, chat_user_b, chat_user_b, chat_user_a),
+        )
+        rows = list(c.fetchall())
+        rows.reverse()
+        for row in rows:
+            if hasattr(row, "keys"):
+                row_dict = {
+                    "image_path": row.get("image_path"),
+                    "media_paths": row.get("media_paths"),
+                }
+                s = row["sender"]
+                m = row.get("message")
+                ts_raw = row.get("timestamp")
+                is_encrypted = bool(row.get("is_encrypted", False))
+            else:
+                row_dict = {
+                    "image_path": row[2] if len(row) > 2 else None,
+                    "media_paths": row[3] if len(row) > 3 else None,
+                }
+                s = row[0]
+                m = row[1]
+                ts_raw = row[4] if len(row) > 4 else None
+                is_encrypted = bool(row[5]) if len(row) > 5 else False
+            append_image_from_row(row_dict, image_urls_collected)
+            if not s or is_encrypted:
+                continue
+            row_ts = _steve_parse_dt(ts_raw) if ts_raw is not None else None
+            if reset_dt and row_ts and row_ts < reset_dt:
+                continue
+            ts_prefix = _fmt_ts(ts_raw)
+            text = (m or "").strip() if m is not None else ""
+            if text:
+                recent_messages.append(f"{ts_prefix}{s}: {text}")
+            elif row_dict.get("image_path") or row_dict.get("media_paths"):
+                recent_messages.append(f"{ts_prefix}{s}: [shared a photo]")
+    return hist
+
+
+def _load_dm_profiles(sender_username: str, user_message: str) -> Tuple[str, List[Tuple[str, str]]]:
+    """Sender's own KB context (when asked for) plus privacy-gated @mentions."""
+    from backend.services.steve_profiling_gates import user_can_access_steve_kb
+    from backend.services.steve_prompt_policy import should_include_user_profile
     from bodybuilding_app import get_steve_context_for_user
 
     include_own_profile = should_include_user_profile(user_message)
@@ -558,7 +538,7 @@ def _run_grok_dm_turn(
     else:
         user_profile_ctx = ""
 
-    mentioned_profiles = []
+    mentioned_profiles: List[Tuple[str, str]] = []
     mentioned_usernames = set(re.findall(r"@(\w+)", user_message)) if user_message else set()
     mentioned_usernames.discard("steve")
     mentioned_usernames.discard("Steve")
@@ -569,6 +549,121 @@ def _run_grok_dm_turn(
             profile_ctx = get_steve_context_for_user(mentioned_user, viewer_username=sender_username)
             if profile_ctx:
                 mentioned_profiles.append((mentioned_user, profile_ctx))
+    return user_profile_ctx or "", mentioned_profiles
+
+
+def _resolve_dm_tools(
+    user_message: str,
+    sender_username: str,
+    *,
+    platform_question: bool,
+    professional_advice_question: bool,
+) -> list:
+    from backend.services.steve_community_config import get_paid_steve_package_config
+    from backend.services.steve_tool_router import resolve_steve_hosted_tools
+
+    return resolve_steve_hosted_tools(
+        user_message,
+        username=sender_username,
+        surface=ai_usage.SURFACE_DM,
+        platform_question=platform_question,
+        professional_advice_question=professional_advice_question,
+        config=get_paid_steve_package_config(),
+    )
+
+
+def _run_grok_dm_turn(
+    *,
+    sender_username: str,
+    user_message: str,
+    other_username: Optional[str],
+    entitlements: Optional[dict] = None,
+) -> None:
+    from backend.services.community import is_app_admin
+    from backend.services.steve_model_config import (
+        context_limit,
+        estimate_response_cost_usd,
+        get_steve_model_config,
+        output_cap_for_surface,
+        peer_context_limit,
+        response_usage_tokens,
+    )
+    from backend.services.llm_clients import PROVIDER_XAI, get_llm_client
+    from backend.services.steve_prompt_policy import append_response_policy
+
+    if other_username:
+        chat_user_a = sender_username
+        chat_user_b = other_username
+    else:
+        chat_user_a = sender_username
+        chat_user_b = "steve"
+
+    is_peer = bool(other_username)
+    from backend.services.steve_thread_memory import dm_context_read_limit
+
+    _peer_window = peer_context_limit(entitlements, fallback=PEER_DM_CONTEXT_LINES)
+    _max_ctx = context_limit(entitlements, fallback=200)
+    _read_limit = dm_context_read_limit(
+        entitlements,
+        is_peer=is_peer,
+        peer_window=_peer_window,
+        max_context=_max_ctx,
+    )
+
+    platform_question_dm = False
+    professional_dm = False
+    try:
+        from backend.services.steve_platform_manual import (
+            is_professional_advice_intent,
+            is_platform_question,
+        )
+
+        platform_question_dm = bool(is_platform_question(user_message))
+        professional_dm = bool(is_professional_advice_intent(user_message))
+    except Exception as manual_gate_err:
+        logger.warning("Steve DM platform/manual gate failed (non-fatal): %s", manual_gate_err)
+
+    # Independent sources gathered side by side; a late one degrades to its
+    # default instead of holding up the reply (no hosted tools, no profile).
+    turn_label = f"dm {sender_username}->{chat_user_b}"
+    gathered = assemble_context(
+        [
+            ContextSource(
+                "history",
+                lambda: _load_dm_history(chat_user_a, chat_user_b, _read_limit),
+                default=_DmHistory(),
+            ),
+            ContextSource(
+                "profiles",
+                lambda: _load_dm_profiles(sender_username, user_message),
+                default=("", []),
+            ),
+            ContextSource(
+                "tools",
+                lambda: _resolve_dm_tools(
+                    user_message,
+                    sender_username,
+                    platform_question=platform_question_dm,
+                    professional_advice_question=professional_dm,
+                ),
+                default=[],
+            ),
+            ContextSource("admin", lambda: bool(is_app_admin(sender_username)), default=False),
+        ],
+        label=f"{turn_label} sources",
+    )
+    history = gathered.get("history") or _DmHistory()
+    recent_messages = history.recent_messages
+    image_urls_collected = history.image_urls
+    context_reset_at = history.context_reset_at
+    reset_dt = history.reset_dt
+    fs = history.fs
+    conv_id = history.conv_id
+    firestore_context_ok = history.firestore_ok
+    user_profile_ctx, mentioned_profiles = gathered.get("profiles") or ("", [])
+    dm_tools = gathered.get("tools") or []
+
+    current_date = datetime.now().strftime("%A, %B %d, %Y at %H:%M UTC")
 
     max_context = context_limit(entitlements, fallback=200)
     verbatim_window = _peer_window if is_peer else 30
@@ -580,15 +675,18 @@ def _run_grok_dm_turn(
         older_messages: List[str] = []
         current_messages = all_messages
 
-    thread_summary_text = None
+    # Second phase: sources that need the history (thread memory, Phase 3
+    # chat memory: semantic retrieval + structured counters for peer DMs).
+    memory_sources: List[ContextSource] = []
     if firestore_context_ok and conv_id:
-        try:
-            from backend.services.steve_thread_memory import (
-                SUMMARY_SURFACE_DM,
-                maybe_refresh_thread_summary,
-            )
+        from backend.services.steve_thread_memory import (
+            SUMMARY_SURFACE_DM,
+            maybe_refresh_thread_summary,
+        )
 
-            thread_summary_text = maybe_refresh_thread_summary(
+        memory_sources.append(ContextSource(
+            "thread_summary",
+            lambda: maybe_refresh_thread_summary(
                 fs_client=fs,
                 collection="dm_conversations",
                 doc_id=conv_id,
@@ -598,13 +696,8 @@ def _run_grok_dm_turn(
                 sender_username=sender_username,
                 surface=SUMMARY_SURFACE_DM,
                 reset_dt=reset_dt,
-            )
-        except Exception as ts_err:
-            logger.warning("Thread summary failed (non-fatal): %s", ts_err)
-
-    # Phase 3 chat memory: semantic retrieval + structured counters for peer DMs
-    chat_memory_section = ""
-    counter_section = ""
+            ),
+        ))
     if is_peer and firestore_context_ok and conv_id:
         try:
             from backend.services.steve_chat_memory import (
@@ -620,25 +713,38 @@ def _run_grok_dm_turn(
 
             _mem_scope = scope_for_peer_dm(conv_id)
             if chat_memory_enabled_for_scope(entitlements, _mem_scope):
-                chat_memory_section = inject_chat_memory_into_context(
-                    fs,
-                    _mem_scope,
-                    user_message,
-                    recent_messages,
-                    entitlements=entitlements,
-                    reset_at=reset_dt,
-                    username=sender_username,
-                )
-                counter_section = inject_counters_into_context(
-                    fs,
-                    _mem_scope,
-                    user_message,
-                    entitlements=entitlements,
-                    reset_at=reset_dt,
-                )
+                memory_sources.append(ContextSource(
+                    "chat_memory",
+                    lambda: inject_chat_memory_into_context(
+                        fs,
+                        _mem_scope,
+                        user_message,
+                        recent_messages,
+                        entitlements=entitlements,
+                        reset_at=reset_dt,
+                        username=sender_username,
+                    ),
+                    default="",
+                ))
+                memory_sources.append(ContextSource(
+                    "counters",
+                    lambda: inject_counters_into_context(
+                        fs,
+                        _mem_scope,
+                        user_message,
+                        entitlements=entitlements,
+                        reset_at=reset_dt,
+                    ),
+                    default="",
+                ))
         except Exception as mem_err:
             logger.warning("Chat memory retrieval/counters failed (non-fatal): %s", mem_err)
 
+    memory = assemble_context(memory_sources, label=f"{turn_label} memory")
+    thread_summary_text = memory.get("thread_summary")
+    chat_memory_section = memory.get("chat_memory") or ""
+    counter_section = memory.get("counters") or ""
+
     context = f"Direct message conversation between {chat_user_a} and {chat_user_b}:\n"
     if thread_summary_text:
         context += "=== THREAD MEMORY (structured summary of earlier conversation) ===\n"
@@ -738,37 +844,13 @@ def _run_grok_dm_turn(
     else:
         history_rule = "- You have access to the conversation excerpts provided below (recent window plus optional older summary).\n"
 
-    platform_question_dm = False
-    professional_dm = False
-    try:
-        from backend.services.steve_platform_manual import (
-            is_professional_advice_intent,
-            is_platform_question,
-        )
-
-        platform_question_dm = bool(is_platform_question(user_message))
-        professional_dm = bool(is_professional_advice_intent(user_message))
-    except Exception as manual_gate_err:
-        logger.warning("Steve DM platform/manual gate failed (non-fatal): %s", manual_gate_err)
-
-    from backend.services.steve_community_config import get_paid_steve_package_config
     from backend.services.steve_prompt_policy import (
         STEVE_EMOJI_RULES,
         STEVE_LANGUAGE_RULES,
         render_steve_external_knowledge_guidance,
     )
     from backend.services.steve_tool_policy import steve_tool_names_for_log
-    from backend.services.steve_tool_router import resolve_steve_hosted_tools
 
-    steve_pkg = get_paid_steve_package_config()
-    dm_tools = resolve_steve_hosted_tools(
-        user_message,
-        username=sender_username,
-        surface=ai_usage.SURFACE_DM,
-        platform_question=platform_question_dm,
-        professional_advice_question=professional_dm,
-        config=steve_pkg,
-    )
     has_web_tools = any(
         isinstance(t, dict) and (t.get("type") or "").strip().lower() == "web_search" for t in (dm_tools or [])
     )
@@ -783,7 +865,7 @@ def _run_grok_dm_turn(
     )
     admin_line = (
         "\n- As an admin, you have full platform access."
-        if is_app_admin(sender_username)
+        if gathered.get("admin")
         else ""
     )
 
@@ -874,7 +956,12 @@ Only share this information if asked. Be factual — do not embellish or invent
         len(image_urls),
     )
 
-    client = OpenAI(api_key=XAI_API_KEY, base_url="https://api.x.ai/v1")
+    streaming = steve_dm_streaming_enabled()
+    client = get_llm_client(
+        PROVIDER_XAI,
+        api_key=XAI_API_KEY,
+        timeout=GROK_DM_TIMEOUT_SECONDS if streaming else None,
+    )
     user_content = build_grok_user_content(context_for_grok, image_urls)
     messages = [
         {"role": "system", "content": system_prompt},
@@ -883,35 +970,96 @@ Only share this information if asked. Be factual — do not embellish or invent
 
     started = time.perf_counter()
     response = None
-    try:
+    writer = None
+    ttft_ms = None
+    if streaming:
         from backend.services.steve_chat_images import create_response_with_image_fallback
+        from backend.services.steve_dm_stream import DmReplyStreamWriter, consume_response_stream
 
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(
-                create_response_with_image_fallback,
+        writer = DmReplyStreamWriter(
+            sender_username=sender_username,
+            peer_username=other_username or "steve",
+            create_row=lambda body: _create_steves_reply(
+                sender_username=sender_username, other_username=other_username, body=body
+            ),
+            publish=lambda mid, body, is_streaming: _publish_steves_reply_text(
+                sender_username=sender_username,
+                other_username=other_username,
+                message_id=mid,
+                body=body,
+                streaming=is_streaming,
+            ),
+            invalidate=lambda: _invalidate_steves_reply_caches(sender_username, other_username),
+        )
+        try:
+            stream = create_response_with_image_fallback(
                 client,
                 model=model_to_use,
                 input=messages,
                 tools=dm_tools,
                 max_output_tokens=max_output_tokens,
                 temperature=0.7,
+                stream=True,
             )
-            response = future.result(timeout=GROK_DM_TIMEOUT_SECONDS)
-    except FuturesTimeoutError:
-        logger.warning("Steve DM reply: Grok timeout after %ss", GROK_DM_TIMEOUT_SECONDS)
-        _persist_grok_steves_reply(
-            sender_username=sender_username,
-            other_username=other_username,
-            body=GROK_TIMEOUT_MESSAGE,
-        )
-        return
-    response_time_ms = int((time.perf_counter() - started) * 1000)
+            result = consume_response_stream(
+                stream,
+                on_delta=writer.feed,
+                deadline=started + GROK_DM_TIMEOUT_SECONDS,
+                started=started,
+            )
+        except Exception as stream_err:
+            logger.warning("Steve DM reply: Grok stream failed: %s", stream_err)
+            _finish_steves_reply(
+                writer,
+                sender_username=sender_username,
+                other_username=other_username,
+                body=writer.text.strip() or GROK_EMPTY_MESSAGE,
+            )
+            return
+        response = result.response
+        ttft_ms = result.ttft_ms
+        response_time_ms = result.elapsed_ms
+        if result.timed_out:
+            logger.warning("Steve DM reply: Grok stream cut at %ss", GROK_DM_TIMEOUT_SECONDS)
+            _finish_steves_reply(
+                writer,
+                sender_username=sender_username,
+                other_username=other_username,
+                body=result.text.strip() or GROK_TIMEOUT_MESSAGE,
+            )
+            return
+        ai_response = result.text.strip() or None
+    else:
+        try:
+            from backend.services.steve_chat_images import create_response_with_image_fallback
+
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                future = executor.submit(
+                    create_response_with_image_fallback,
+                    client,
+                    model=model_to_use,
+                    input=messages,
+                    tools=dm_tools,
+                    max_output_tokens=max_output_tokens,
+                    temperature=0.7,
+                )
+                response = future.result(timeout=GROK_DM_TIMEOUT_SECONDS)
+        except FuturesTimeoutError:
+            logger.warning("Steve DM reply: Grok timeout after %ss", GROK_DM_TIMEOUT_SECONDS)
+            _persist_grok_steves_reply(
+                sender_username=sender_username,
+                other_username=other_username,
+                body=GROK_TIMEOUT_MESSAGE,
+            )
+            return
+        response_time_ms = int((time.perf_counter() - started) * 1000)
 
-    ai_response = response.output_text.strip() if response and hasattr(response, "output_text") and response.output_text else None
+        ai_response = response.output_text.strip() if response and hasattr(response, "output_text") and response.output_text else None
 
     if not ai_response:
         logger.warning("Steve DM reply: empty response from API")
-        _persist_grok_steves_reply(
+        _finish_steves_reply(
+            writer,
             sender_username=sender_username,
             other_username=other_username,
             body=GROK_EMPTY_MESSAGE,
@@ -929,14 +1077,16 @@ Only share this information if asked. Be factual — do not embellish or invent
 
     ai_response = format_steve_response_links(ai_response)
     if not ai_response or not ai_response.strip():
-        _persist_grok_steves_reply(
+        _finish_steves_reply(
+            writer,
             sender_username=sender_username,
             other_username=other_username,
             body=GROK_EMPTY_MESSAGE,
         )
         return
 
-    _persist_grok_steves_reply(
+    _finish_steves_reply(
+        writer,
         sender_username=sender_username,
         other_username=other_username,
         body=ai_response.strip(),
@@ -944,6 +1094,7 @@ Only share this information if asked. Be factual — do not embellish or invent
 
     try:
         from backend.services.steve_credit_weights import tools_flags_from_response
+        from backend.services.steve_dm_stream import tokens_per_second
 
         tokens_in, tokens_out = response_usage_tokens(response)
         web_t, x_t = tools_flags_from_response(response)
@@ -958,77 +1109,163 @@ Only share this information if asked. Be factual — do not embellish or invent
             model=model_to_use,
             tools_web_search=web_t,
             tools_x_search=x_t,
+            ttft_ms=ttft_ms,
+            tokens_per_second=tokens_per_second(tokens_out, ttft_ms, response_time_ms, ai_response)
+            if streaming
+            else None,
         )
     except Exception:
         pass
 
 
-def _persist_grok_steves_reply(
+def _finish_steves_reply(
+    writer,
     *,
     sender_username: str,
     other_username: Optional[str],
     body: str,
 ) -> None:
-    from datetime import datetime
+    """Final write: rewrite the streamed row in place, or insert one row when nothing streamed."""
+    if writer is not None and writer.message_id:
+        writer.finish(body)
+        return
+    _persist_grok_steves_reply(
+        sender_username=sender_username,
+        other_username=other_username,
+        body=body,
+    )
 
-    from backend.services.firestore_writes import (
-        write_dm_message,
-        write_steves_message_human_pair_thread,
+
+def _create_steves_reply(
+    *,
+    sender_username: str,
+    other_username: Optional[str],
+    body: str,
+) -> Optional[int]:
+    """Insert Steve's reply row, write its Firestore doc and drop stale caches."""
+    msg_id = _insert_steves_reply_row(
+        sender_username=sender_username,
+        other_username=other_username,
+        body=body,
     )
-    from redis_cache import cache, invalidate_message_cache
+    if msg_id:
+        _write_steves_reply_firestore(
+            sender_username=sender_username,
+            other_username=other_username,
+            message_id=msg_id,
+            body=body,
+        )
+    _invalidate_steves_reply_caches(sender_username, other_username)
+    return msg_id
+
+
+def _persist_grok_steves_reply(
+    *,
+    sender_username: str,
+    other_username: Optional[str],
+    body: str,
+) -> None:
+    _create_steves_reply(
+        sender_username=sender_username,
+        other_username=other_username,
+        body=body,
+    )
+
 
+def _insert_steves_reply_row(
+    *,
+    sender_username: str,
+    other_username: Optional[str],
+    body: str,
+) -> Optional[int]:
     if other_username:
-        pid = _insert_steves_mysql_row_human_thread(
+        return _insert_steves_mysql_row_human_thread(
             sender_username=sender_username,
             peer_username=other_username,
             body=body,
         )
-        if pid:
-            try:
-                write_steves_message_human_pair_thread(
-                    human_peer_a=sender_username,
-                    human_peer_b=other_username,
-                    message_id=int(pid),
-                    text=body,
-                    mysql_receiver_username=other_username,
-                )
-            except Exception:
-                pass
-        try:
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        if USE_MYSQL:
+            c.execute(
+                """
+                INSERT INTO messages (sender, receiver, message, timestamp)
+                VALUES (%s, %s, %s, NOW())
+                """,
+                ("steve", sender_username, body),
+            )
+        else:
+            ts = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+            c.execute(
+                """
+                INSERT INTO messages (sender, receiver, message, timestamp)
+                VALUES (?, ?, ?, ?)
+                """,
+                ("steve", sender_username, body, ts),
+            )
+        steve_msg_id = getattr(c, "lastrowid", None)
+        record_dm_message(c, sender="steve", receiver=sender_username, message_id=steve_msg_id)
+        conn.commit()
+    return int(steve_msg_id) if steve_msg_id else None
+
+
+def _write_steves_reply_firestore(
+    *,
+    sender_username: str,
+    other_username: Optional[str],
+    message_id: int,
+    body: str,
+) -> None:
+    from backend.services.firestore_writes import (
+        write_dm_message,
+        write_steves_message_human_pair_thread,
+    )
+
+    try:
+        if other_username:
+            write_steves_message_human_pair_thread(
+                human_peer_a=sender_username,
+                human_peer_b=other_username,
+                message_id=int(message_id),
+                text=body,
+                mysql_receiver_username=other_username,
+            )
+        else:
+            write_dm_message(sender="steve", receiver=sender_username, message_id=int(message_id), text=body)
+    except Exception:
+        pass
+
+
+def _publish_steves_reply_text(
+    *,
+    sender_username: str,
+    other_username: Optional[str],
+    message_id: int,
+    body: str,
+    streaming: bool,
+) -> None:
+    from backend.services.firestore_writes import update_dm_message_stream
+
+    update_dm_message_stream(
+        sender_username,
+        other_username or "steve",
+        message_id,
+        body,
+        streaming,
+    )
+
+
+def _invalidate_steves_reply_caches(sender_username: str, other_username: Optional[str]) -> None:
+    from redis_cache import cache, invalidate_message_cache
+
+    try:
+        if other_username:
             invalidate_message_cache(sender_username, other_username)
             cache.delete(f"chat_threads:{sender_username}")
             invalidate_message_cache(other_username, sender_username)
             cache.delete(f"chat_threads:{other_username}")
-        except Exception:
-            pass
-    else:
-        with get_db_connection() as conn:
-            c = conn.cursor()
-            if USE_MYSQL:
-                c.execute(
-                    """
-                    INSERT INTO messages (sender, receiver, message, timestamp)
-                    VALUES (%s, %s, %s, NOW())
-                    """,
-                    ("steve", sender_username, body),
-                )
-            else:
-                ts = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
-                c.execute(
-                    """
-                    INSERT INTO messages (sender, receiver, message, timestamp)
-                    VALUES (?, ?, ?, ?)
-                    """,
-                    ("steve", sender_username, body, ts),
-                )
-            conn.commit()
-            steve_msg_id = getattr(c, "lastrowid", None)
-        try:
-            write_dm_message(sender="steve", receiver=sender_username, message_id=int(steve_msg_id), text=body)
-        except Exception:
-            pass
-        try:
+        else:
             invalidate_message_cache(sender_username, "steve")
             cache.delete(f"chat_threads:{sender_username}")
-        except Exception:
-            pass
+    except Exception:
+        pass
@@ -0,0 +1,251 @@
+"""Streaming Steve DM replies (``STEVE_DM_STREAMING``).
+
+The Grok Responses stream is consumed on the reply thread; the Steve message
+row is created at the first token and then rewritten in place at most every
+``STREAM_FLUSH_INTERVAL_SECONDS`` (MySQL row, Firestore doc, message caches).
+Clients that already hold the row id through ``since_id`` deltas read the
+growing text from the ``steve_stream`` field piggybacked on ``/get_messages``
+(``include_stream=1``), which mirrors a short-lived Redis state per viewer.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from backend.services.chat_recent_window import patch_dm_window_message
+from backend.services.database import get_db_connection, get_sql_placeholder
+from redis_cache import cache, steve_dm_stream_key
+
+logger = logging.getLogger(__name__)
+
+STREAM_FLUSH_INTERVAL_SECONDS = 0.35
+STREAM_FLUSH_MIN_CHARS = 24
+STREAM_STATE_TTL_SECONDS = 120
+
+
+# ── Poll-visible state ─────────────────────────────────────────────────
+
+
+def set_dm_stream_state(sender: str, peer: str, *, message_id: int, text: str, done: bool) -> None:
+    """Publish the current partial text from both participants' perspectives."""
+    state = {"message_id": int(message_id), "text": text or "", "done": bool(done)}
+    for viewer, other in ((sender, peer), (peer, sender)):
+        try:
+            cache.set(steve_dm_stream_key(viewer, other), state, STREAM_STATE_TTL_SECONDS)
+        except Exception as exc:
+            logger.debug("Steve DM stream state set failed: %s", exc)
+
+
+def get_dm_stream_state(viewer: str, peer: str) -> Optional[dict]:
+    if not viewer or not peer:
+        return None
+    try:
+        state = cache.get(steve_dm_stream_key(viewer, peer))
+    except Exception:
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def dm_stream_state_for_viewer(viewer_username: str, other_user_id: object) -> Optional[dict]:
+    """``steve_stream`` poll piggyback for the DM with ``users.id == other_user_id``.
+
+    Never raises — streaming is auxiliary UX and must not break the poll.
+    """
+    if not viewer_username or not other_user_id:
+        return None
+    try:
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            c.execute("SELECT username FROM users WHERE id = ?", (other_user_id,))
+            row = c.fetchone()
+        if not row:
+            return None
+        peer = row["username"] if hasattr(row, "keys") else row[0]
+        return get_dm_stream_state(viewer_username, peer)
+    except Exception as exc:
+        logger.debug("dm_stream_state_for_viewer failed (non-fatal): %s", exc)
+        return None
+
+
+def update_steve_reply_text(message_id: int, body: str) -> None:
+    ph = get_sql_placeholder()
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            f"UPDATE messages SET message = {ph} WHERE id = {ph} AND sender = 'steve'",
+            (body, int(message_id)),
+        )
+        conn.commit()
+
+
+# ── Stream consumption ─────────────────────────────────────────────────
+
+
+@dataclass
+class StreamResult:
+    response: Any
+    text: str
+    ttft_ms: Optional[int]
+    elapsed_ms: int
+    timed_out: bool
+
+
+def consume_response_stream(
+    stream: Any,
+    *,
+    on_delta: Callable[[str], None],
+    deadline: float,
+    started: Optional[float] = None,
+) -> StreamResult:
+    """Drain a Responses API event stream, forwarding text deltas.
+
+    Stops early (``timed_out``) once ``time.perf_counter()`` passes
+    ``deadline``; the text received so far is still returned.
+    """
+    t0 = started if started is not None else time.perf_counter()
+    parts: list[str] = []
+    ttft_ms: Optional[int] = None
+    final_response = None
+    timed_out = False
+    try:
+        for event in stream:
+            etype = getattr(event, "type", "") or ""
+            if etype == "response.output_text.delta":
+                delta = getattr(event, "delta", "") or ""
+                if delta:
+                    if ttft_ms is None:
+                        ttft_ms = int((time.perf_counter() - t0) * 1000)
+                    parts.append(delta)
+                    on_delta(delta)
+            elif etype == "response.completed":
+                final_response = getattr(event, "response", None)
+            elif etype in ("response.failed", "error"):
+                raise RuntimeError(f"Grok stream {etype}: {getattr(event, 'error', None) or event}")
+            if time.perf_counter() > deadline:
+                timed_out = final_response is None
+                break
+    finally:
+        close = getattr(stream, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
+    text = "".join(parts)
+    if final_response is not None and getattr(final_response, "output_text", None):
+        text = final_response.output_text
+    return StreamResult(
+        response=final_response,
+        text=text,
+        ttft_ms=ttft_ms,
+        elapsed_ms=int((time.perf_counter() - t0) * 1000),
+        timed_out=timed_out,
+    )
+
+
+def tokens_per_second(tokens_out: Optional[int], ttft_ms: Optional[int], elapsed_ms: int,
+                      text: str = "") -> Optional[float]:
+    """Decode rate after the first token; falls back to ~4 chars/token."""
+    if ttft_ms is None:
+        return None
+    decode_s = max(0.001, (elapsed_ms - ttft_ms) / 1000.0)
+    tokens = tokens_out if tokens_out else (len(text) // 4 if text else 0)
+    if not tokens:
+        return None
+    return round(tokens / decode_s, 2)
+
+
+# ── In-place persistence ───────────────────────────────────────────────
+
+
+class DmReplyStreamWriter:
+    """Accumulates deltas and rewrites one Steve message row as they arrive.
+
+    ``create_row(text)`` inserts the row (plus its initial Firestore doc) and
+    returns the id; ``publish(message_id, text, streaming)`` pushes a text
+    update to Firestore. Both are supplied by :mod:`steve_dm_reply` so thread
+    routing (private vs @Steve in a human pair) stays in one place.
+    """
+
+    def __init__(
+        self,
+        *,
+        sender_username: str,
+        peer_username: str,
+        create_row: Callable[[str], Optional[int]],
+        publish: Callable[[int, str, bool], None],
+        invalidate: Callable[[], None],
+    ) -> None:
+        self.sender_username = sender_username
+        self.peer_username = peer_username
+        self._create_row = create_row
+        self._publish = publish
+        self._invalidate = invalidate
+        self.message_id: Optional[int] = None
+        self.create_failed = False
+        self.text = ""
+        self._flushed_len = 0
+        self._last_flush = 0.0
+
+    def feed(self, delta: str) -> None:
+        self.text += delta
+        if self.message_id is None:
+            if self.create_failed or not self.text.strip():
+                return
+            try:
+                self.message_id = self._create_row(self.text)
+            except Exception as exc:
+                logger.warning("Steve DM stream row insert failed: %s", exc)
+                self.message_id = None
+            self._mark_flushed()
+            if not self.message_id:
+                # Fall back to one insert of the final text after the stream.
+                self.create_failed = True
+                return
+            set_dm_stream_state(
+                self.sender_username, self.peer_username,
+                message_id=self.message_id, text=self.text, done=False,
+            )
+            return
+        if (
+            len(self.text) - self._flushed_len >= STREAM_FLUSH_MIN_CHARS
+            and time.monotonic() - self._last_flush >= STREAM_FLUSH_INTERVAL_SECONDS
+        ):
+            self._write(self.text, streaming=True)
+
+    def finish(self, final_text: str) -> None:
+        """Write the final (post-processed) text and mark the stream done."""
+        self.text = final_text
+        if self.message_id:
+            self._write(final_text, streaming=False)
+
+    def _mark_flushed(self) -> None:
+        self._flushed_len = len(self.text)
+        self._last_flush = time.monotonic()
+
+    def _write(self, text: str, *, streaming: bool) -> None:
+        if not self.message_id:
+            return
+        try:
+            update_steve_reply_text(self.message_id, text)
+        except Exception as exc:
+            logger.warning("Steve DM stream row update failed: %s", exc)
+        patch_dm_window_message(
+            self.sender_username, self.peer_username or "steve", self.message_id, text=text
+        )
+        try:
+            self._publish(self.message_id, text, streaming)
+        except Exception as exc:
+            logger.warning("Steve DM stream publish failed: %s", exc)
+        set_dm_stream_state(
+            self.sender_username, self.peer_username,
+            message_id=self.message_id, text=text, done=not streaming,
+        )
+        try:
+            self._invalidate()
+        except Exception:
+            pass
+        self._mark_flushed()
@@ -0,0 +1,238 @@
+"""In-process hybrid chunk index for Steve document memory.
+
+``steve_document_memory.retrieve_doc_chunks`` used to stream up to 80
+chunks per manifest document from Firestore on every turn and score them
+with a substring count plus a pure-Python cosine, so excerpts past the 80th
+chunk of a long PDF were never seen. :class:`ScopeChunkIndex` holds every
+chunk of one exact scope (``community:<id>`` / ``group:<id>``) in memory:
+
+- Lexical: BM25 over heading + chunk text, with diacritic-folded tokens and
+  per-term postings held as numpy arrays.
+- Vector: a row-normalised float32 matrix over the stored chunk embeddings,
+  so similarity is one matrix-vector product.
+- Fusion: reciprocal rank fusion of both rankings (same ``k`` as
+  ``networking_retrieval``), plus a small bonus for chunks of documents whose
+  title / details the query names.
+
+Indexes are cached per scope and rebuilt when the manifest's
+``(doc_id, indexed_at, chunk_count)`` signature changes, so a re-index on
+another instance is picked up on the next turn. A document whose stored
+chunks fall short of its manifest ``chunk_count`` is left out and the
+index is not cached, so a half-written re-index is never pinned. ``index_useful_doc`` and
+``purge_useful_doc`` also drop the local entry directly.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RRF_K = 60
+BM25_K1 = 1.2
+BM25_B = 0.75
+# RRF contribution for chunks of documents the query names, relative to rank 1.
+DOC_MATCH_WEIGHT = 0.5
+VECTOR_CANDIDATES = 50
+MAX_SCOPES = int(os.environ.get("STEVE_DOC_INDEX_MAX_SCOPES", "32"))
+
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "de", "do", "da", "das", "dos", "e", "el", "em",
+    "en", "for", "from", "in", "is", "it", "la", "los", "no", "o", "of", "on", "or", "os", "para",
+    "por", "que", "the", "this", "to", "um", "uma", "un", "una", "was", "with", "y",
+}
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: Any) -> List[str]:
+    """Lower-case ASCII-folded terms (same folding as ``document_identity_score``)."""
+    raw = str(text or "")
+    if not raw.isascii():
+        raw = unicodedata.normalize("NFKD", raw).encode("ascii", "ignore").decode("ascii")
+    return [t for t in _TOKEN_RE.findall(raw.lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+class ScopeChunkIndex:
+    """BM25 + embedding index over every readable chunk in one scope."""
+
+    def __init__(self, chunks: Sequence[Dict[str, Any]], signature: Tuple = ()) -> None:
+        self.signature = signature
+        self.chunks: List[Dict[str, Any]] = []
+        vectors: List[List[float]] = []
+        vector_rows: List[int] = []
+        postings: Dict[str, Dict[int, int]] = {}
+        lengths: List[int] = []
+        for chunk in chunks:
+            emb = chunk.get("embedding")
+            meta = {k: v for k, v in chunk.items() if k != "embedding"}
+            idx = len(self.chunks)
+            self.chunks.append(meta)
+            tokens = tokenize(f"{meta.get('heading') or ''} {meta.get('text') or ''}")
+            lengths.append(len(tokens))
+            for token, tf in Counter(tokens).items():
+                postings.setdefault(token, {})[idx] = tf
+            if isinstance(emb, list) and emb:
+                vectors.append(emb)
+                vector_rows.append(idx)
+
+        n = len(self.chunks)
+        self._lengths = np.asarray(lengths, dtype=np.float32)
+        avgdl = float(self._lengths.mean()) if n and self._lengths.sum() else 1.0
+        self._norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths / avgdl) if n else self._lengths
+        self._postings: Dict[str, Tuple[float, np.ndarray, np.ndarray]] = {}
+        for token, row in postings.items():
+            df = len(row)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            self._postings[token] = (
+                idf,
+                np.fromiter(row.keys(), dtype=np.int32, count=df),
+                np.fromiter(row.values(), dtype=np.float32, count=df),
+            )
+
+        self._vector_rows = np.asarray(vector_rows, dtype=np.int32)
+        self._matrix: Optional[np.ndarray] = None
+        dims = {len(v) for v in vectors}
+        if vectors and len(dims) == 1:
+            matrix = np.asarray(vectors, dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self._matrix = matrix / norms
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def lexical_ranking(self, query: str, limit: int) -> List[int]:
+        if not self.chunks:
+            return []
+        scores = np.zeros(len(self.chunks), dtype=np.float32)
+        for token in set(tokenize(query)):
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            idf, rows, tf = posting
+            scores[rows] += idf * tf * (BM25_K1 + 1) / (tf + self._norm[rows])
+        return _top_positive(scores, limit)
+
+    def vector_ranking(self, query_vec: Optional[Sequence[float]], limit: int) -> List[int]:
+        if self._matrix is None or not query_vec or len(query_vec) != self._matrix.shape[1]:
+            return []
+        q = np.asarray(query_vec, dtype=np.float32)
+        norm = float(np.linalg.norm(q))
+        if not norm:
+            return []
+        sims = self._matrix @ (q / norm)
+        return [int(self._vector_rows[i]) for i in _top_positive(sims, limit)]
+
+    def search(
+        self,
+        query: str,
+        query_vec: Optional[Sequence[float]] = None,
+        *,
+        limit: int = 5,
+        matched_doc_ids: Sequence[int] = (),
+    ) -> List[Dict[str, Any]]:
+        """Top ``limit`` chunks by RRF over lexical and vector rankings."""
+        depth = max(VECTOR_CANDIDATES, limit * 4)
+        scores: Dict[int, float] = {}
+        for ranking in (self.lexical_ranking(query, depth), self.vector_ranking(query_vec, depth)):
+            for rank, idx in enumerate(ranking, start=1):
+                scores[idx] = scores.get(idx, 0.0) + 1.0 / (RRF_K + rank)
+        matched = {int(d) for d in matched_doc_ids}
+        if matched:
+            bonus = DOC_MATCH_WEIGHT / (RRF_K + 1)
+            for idx, chunk in enumerate(self.chunks):
+                if int(chunk.get("doc_id") or 0) in matched:
+                    scores[idx] = scores.get(idx, 0.0) + bonus
+        ranked = sorted(scores, key=lambda idx: (-scores[idx], idx))[: max(1, int(limit))]
+        return [dict(self.chunks[idx]) for idx in ranked]
+
+
+def _top_positive(scores: np.ndarray, limit: int) -> List[int]:
+    positive = np.flatnonzero(scores > 0)
+    if not positive.size:
+        return []
+    if positive.size > limit:
+        positive = positive[np.argpartition(-scores[positive], limit - 1)[:limit]]
+    return [int(i) for i in positive[np.argsort(-scores[positive], kind="stable")]]
+
+
+# ── Per-scope cache ─────────────────────────────────────────────────────
+
+
+_indexes: "OrderedDict[str, ScopeChunkIndex]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def manifest_signature(manifest: Sequence[Dict[str, Any]]) -> Tuple:
+    return tuple(sorted(
+        (int(doc.get("doc_id") or 0), str(doc.get("indexed_at") or ""), int(doc.get("chunk_count") or 0))
+        for doc in manifest
+    ))
+
+
+def invalidate_scope(scope_key: str) -> None:
+    with _lock:
+        _indexes.pop(scope_key, None)
+
+
+def clear() -> None:
+    with _lock:
+        _indexes.clear()
+
+
+def get_scope_index(fs: Any, scope_key: str, manifest: Sequence[Dict[str, Any]]) -> ScopeChunkIndex:
+    """Cached index for ``scope_key`` over the readable docs in ``manifest``."""
+    from backend.services.steve_document_memory import COLLECTION, TEXT_STATUS_READABLE
+
+    docs = [d for d in manifest if int(d.get("doc_id") or 0) and d.get("text_status") == TEXT_STATUS_READABLE]
+    signature = manifest_signature(docs)
+    with _lock:
+        index = _indexes.get(scope_key)
+        if index is not None and index.signature == signature:
+            _indexes.move_to_end(scope_key)
+            return index
+
+    chunks: List[Dict[str, Any]] = []
+    complete = True
+    docs_ref = fs.collection(COLLECTION).document(scope_key).collection("docs")
+    for doc in docs:
+        doc_id = int(doc["doc_id"])
+        title = doc.get("title") or f"Document {doc_id}"
+        doc_chunks = []
+        for snap in docs_ref.document(str(doc_id)).collection("chunks").stream():
+            chunk = snap.to_dict() or {}
+            chunk["doc_id"] = doc_id
+            chunk["doc_title"] = title
+            doc_chunks.append(chunk)
+        if len(doc_chunks) < int(doc.get("chunk_count") or 0):
+            # Chunks still being written (or a failed re-index): leave this
+            # doc out and do not cache, so the next turn rebuilds.
+            logger.info(
+                "Steve doc chunk index scope=%s doc_id=%s has %s/%s chunks; skipping",
+                scope_key, doc_id, len(doc_chunks), doc.get("chunk_count"),
+            )
+            complete = False
+            continue
+        chunks.extend(doc_chunks)
+    chunks.sort(key=lambda c: (c["doc_id"], str(c.get("chunk_id") or "")))
+    index = ScopeChunkIndex(chunks, signature)
+    logger.debug("Steve doc chunk index built scope=%s docs=%s chunks=%s", scope_key, len(docs), len(index))
+    if not complete:
+        return index
+    with _lock:
+        _indexes[scope_key] = index
+        _indexes.move_to_end(scope_key)
+        while len(_indexes) > MAX_SCOPES:
+            _indexes.popitem(last=False)
+    return index
@@ -249,6 +249,15 @@ def load_pdf_bytes(file_path: str) -> Tuple[Optional[bytes], Optional[str]]:
 
 def extract_pdf_pages(file_path: str) -> Tuple[List[Dict[str, Any]], str, Optional[str], int]:
     """Return page text records, status, error, page_count."""
+    from backend.services.feature_flags import document_text_cache_enabled
+
+    if document_text_cache_enabled():
+        from backend.services.document_text_cache import extract_pages
+
+        extracted = extract_pages(file_path)
+        if extracted.status == TEXT_STATUS_FAILED:
+            return [], TEXT_STATUS_FAILED, extracted.error, 0
+        return extracted.normalized_pages(), extracted.status, None, extracted.page_count
     data, err = load_pdf_bytes(file_path)
     if not data:
         return [], TEXT_STATUS_FAILED, err, 0
@@ -490,14 +499,16 @@ def index_useful_doc(doc_row: Dict[str, Any], *, force: bool = False, compute_em
         "chunk_count": len(chunks),
         "token_count_estimate": sum(int(c.get("tokens_estimate") or 0) for c in chunks),
     }
-    doc_ref.set(manifest, merge=True)
-
     for chunk in chunks:
         chunk_text = str(chunk.get("text") or "")
         payload = dict(chunk)
         payload["created_at"] = now
         payload["embedding"] = _compute_embedding_safe(chunk_text[:8000]) if compute_embeddings else None
         doc_ref.collection("chunks").document(str(chunk["chunk_id"])).set(payload)
+    # Manifest last: readers key their chunk index on it, so it must not
+    # announce chunks that are not stored yet.
+    doc_ref.set(manifest, merge=True)
+    _invalidate_chunk_index(scope_key)
 
     logger.info(
         "Steve doc indexed doc_id=%s scope=%s status=%s chunks=%s pages=%s",
@@ -518,6 +529,12 @@ def index_useful_doc(doc_row: Dict[str, Any], *, force: bool = False, compute_em
     )
 
 
+def _invalidate_chunk_index(scope_key: str) -> None:
+    from backend.services.steve_doc_chunk_index import invalidate_scope
+
+    invalidate_scope(scope_key)
+
+
 def index_useful_doc_by_id(doc_id: int, *, force: bool = False, compute_embeddings: bool = True) -> IndexedDocument:
     with get_db_connection() as conn:
         cursor = conn.cursor()
@@ -545,6 +562,7 @@ def purge_useful_doc(
         for chunk_snap in chunks_ref.stream():
             chunk_snap.reference.delete()
         doc_ref.delete()
+        _invalidate_chunk_index(scope_key)
         logger.info("Purged Steve doc memory doc_id=%s scope=%s", doc_id, scope_key)
         return True
     except Exception as exc:
@@ -745,6 +763,10 @@ def retrieve_doc_chunks(
     scope_key = scope_key_for_doc(community_id, group_id)
     docs = list(manifest if manifest is not None else load_doc_manifest(community_id=community_id, group_id=group_id))
     query_vec = _compute_embedding_safe(query or "")
+    from backend.services.feature_flags import steve_doc_hybrid_index_enabled
+
+    if steve_doc_hybrid_index_enabled():
+        return _retrieve_from_chunk_index(fs, scope_key, docs, query or "", query_vec, limit)
     scored: List[Tuple[float, Dict[str, Any]]] = []
     query_lower = (query or "").lower()
     matched_ids = set(matched_document_ids(query or "", docs))
@@ -780,6 +802,28 @@ def retrieve_doc_chunks(
         return []
 
 
+def _retrieve_from_chunk_index(
+    fs: Any,
+    scope_key: str,
+    docs: Sequence[Dict[str, Any]],
+    query: str,
+    query_vec: Optional[List[float]],
+    limit: int,
+) -> List[Dict[str, Any]]:
+    from backend.services.steve_doc_chunk_index import get_scope_index
+
+    try:
+        index = get_scope_index(fs, scope_key, docs[:MANIFEST_LIMIT_DEFAULT])
+        chunks = index.search(query, query_vec, limit=limit, matched_doc_ids=matched_document_ids(query, docs))
+        if not chunks and not query_vec:
+            # Same fallback as the scan path: no signal at all -> leading chunks.
+            chunks = [dict(chunk) for chunk in index.chunks[: max(1, int(limit))]]
+        return chunks
+    except Exception as exc:
+        logger.debug("Steve doc chunk index retrieval failed: %s", exc)
+        return []
+
+
 def format_retrieved_doc_context(chunks: Sequence[Dict[str, Any]], *, max_chars: int = 6500) -> str:
     if not chunks:
         return ""
@@ -1184,73 +1184,100 @@ def synthesize_member_knowledge(
         }
 
     try:
-        if profile_data is None:
-            from backend.services.firestore_reads import get_steve_user_profile
-            profile_data = get_steve_user_profile(username)
-        if not profile_data:
-            logger.warning("No profile data for %s, cannot synthesize", username)
-            return False, {
-                "code": "no_profile",
-                "error": (
-                    f"No Firestore steve_user_profiles document for '{username}'. "
-                    "Confirm the username matches the profile document id exactly (including case)."
-                ),
-            }
+        prep, prep_err = _prepare_member_synthesis(username, profile_data)
+        if prep_err:
+            return False, prep_err
+        return _run_prepared_synthesis(username, prep)
+    except Exception as e:
+        logger.error("Knowledge synthesis failed for %s: %s", username, e, exc_info=True)
+        return False, {"code": "exception", "error": str(e)}
 
-        existing_kb = get_member_knowledge(username, note_types=SYNTHESIS_NOTE_TYPES)
 
-        raw_text = _assemble_raw_text_for_synthesis(username, profile_data)
-        if not raw_text:
-            logger.warning("No raw text assembled for %s", username)
-            return False, {
-                "code": "no_input_text",
-                "error": (
-                    "Nothing could be assembled for synthesis (empty analysis, posts, replies, "
-                    "and profiling fields). Run profiling or add manual context first."
-                ),
-            }
+def _prepare_member_synthesis(
+    username: str,
+    profile_data: Optional[Dict[str, Any]] = None,
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, str]]]:
+    """Load everything the Grok call needs, plus the fingerprint of those inputs."""
+    if profile_data is None:
+        from backend.services.firestore_reads import get_steve_user_profile
+        profile_data = get_steve_user_profile(username)
+    if not profile_data:
+        logger.warning("No profile data for %s, cannot synthesize", username)
+        return None, {
+            "code": "no_profile",
+            "error": (
+                f"No Firestore steve_user_profiles document for '{username}'. "
+                "Confirm the username matches the profile document id exactly (including case)."
+            ),
+        }
 
-        prior_synthesis = _format_prior_synthesis(existing_kb)
-        admin_corrections = _extract_admin_corrections(existing_kb)
+    existing_kb = get_member_knowledge(username, note_types=SYNTHESIS_NOTE_TYPES)
 
-        synthesis_json, grok_err = _call_grok_for_synthesis(
-            username, raw_text,
-            prior_synthesis=prior_synthesis,
-            admin_corrections=admin_corrections,
-        )
-        if grok_err:
-            return False, grok_err
-        if not synthesis_json:
-            return False, {
-                "code": "grok_failed",
-                "error": "Grok synthesis returned no usable JSON (see server logs).",
-            }
+    raw_text = _assemble_raw_text_for_synthesis(username, profile_data)
+    if not raw_text:
+        logger.warning("No raw text assembled for %s", username)
+        return None, {
+            "code": "no_input_text",
+            "error": (
+                "Nothing could be assembled for synthesis (empty analysis, posts, replies, "
+                "and profiling fields). Run profiling or add manual context first."
+            ),
+        }
 
-        _save_synthesis_results(username, synthesis_json, existing_kb)
-        _extract_and_save_shared_nodes(username, synthesis_json)
+    admin_corrections = _extract_admin_corrections(existing_kb)
+    return {
+        "existing_kb": existing_kb,
+        "raw_text": raw_text,
+        "admin_corrections": admin_corrections,
+        "fingerprint": synthesis_input_fingerprint(raw_text, admin_corrections),
+    }, None
 
-        try:
-            from backend.services.embedding_service import compute_and_store_embeddings_background
-            compute_and_store_embeddings_background(username)
-            logger.info("Triggered embedding recomputation for %s after KB synthesis", username)
-        except Exception as emb_err:
-            logger.warning("Embedding recomputation failed for %s (non-fatal): %s", username, emb_err)
-
-        # Clear the Steve context cache so the next interaction renders from the fresh KB.
-        # Without this, cached context can serve stale renders for up to STEVE_CTX_CACHE_TTL
-        # (10 min) after synthesis — acceptable on admin triggers, but unwanted when the
-        # weekly cron updates silently in the background.
-        try:
-            from bodybuilding_app import invalidate_steve_context_cache
-            invalidate_steve_context_cache(username)
-        except Exception as cache_err:
-            logger.debug("Steve context cache invalidation skipped for %s: %s", username, cache_err)
 
-        logger.info("Knowledge synthesis complete for %s", username)
-        return True, None
-    except Exception as e:
-        logger.error("Knowledge synthesis failed for %s: %s", username, e, exc_info=True)
-        return False, {"code": "exception", "error": str(e)}
+def _run_prepared_synthesis(
+    username: str,
+    prep: Dict[str, Any],
+    *,
+    usage_out: Optional[Dict[str, Any]] = None,
+) -> Tuple[bool, Optional[Dict[str, str]]]:
+    """Grok call + persistence for inputs from :func:`_prepare_member_synthesis`."""
+    existing_kb = prep["existing_kb"]
+    synthesis_json, grok_err = _call_grok_for_synthesis(
+        username, prep["raw_text"],
+        prior_synthesis=_format_prior_synthesis(existing_kb),
+        admin_corrections=prep["admin_corrections"],
+        usage_out=usage_out,
+    )
+    if grok_err:
+        return False, grok_err
+    if not synthesis_json:
+        return False, {
+            "code": "grok_failed",
+            "error": "Grok synthesis returned no usable JSON (see server logs).",
+        }
+
+    _save_synthesis_results(username, synthesis_json, existing_kb)
+    _extract_and_save_shared_nodes(username, synthesis_json)
+    store_synthesis_fingerprint(username, prep["fingerprint"])
+
+    try:
+        from backend.services.embedding_service import compute_and_store_embeddings_background
+        compute_and_store_embeddings_background(username)
+        logger.info("Triggered embedding recomputation for %s after KB synthesis", username)
+    except Exception as emb_err:
+        logger.warning("Embedding recomputation failed for %s (non-fatal): %s", username, emb_err)
+
+    # Clear the Steve context cache so the next interaction renders from the fresh KB.
+    # Without this, cached context can serve stale renders for up to STEVE_CTX_CACHE_TTL
+    # (10 min) after synthesis — acceptable on admin triggers, but unwanted when the
+    # weekly cron updates silently in the background.
+    try:
+        from bodybuilding_app import invalidate_steve_context_cache
+        invalidate_steve_context_cache(username)
+    except Exception as cache_err:
+        logger.debug("Steve context cache invalidation skipped for %s: %s", username, cache_err)
+
+    logger.info("Knowledge synthesis complete for %s", username)
+    return True, None
 
 
 def _format_prior_synthesis(existing_kb: Dict[str, Any]) -> str:
@@ -1551,9 +1578,13 @@ def _call_grok_for_synthesis(
     *,
     prior_synthesis: str = "",
     admin_corrections: str = "",
+    usage_out: Optional[Dict[str, Any]] = None,
 ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, str]]]:
     """Call Grok to produce the 10-dimension synthesis JSON (with InferredContext as the primary home for nuanced post/comment interpretation).
 
+    When ``usage_out`` is given it receives ``tokens_in``, ``tokens_out`` and
+    ``cost_usd`` for the call (used by the weekly sweep's cost report).
+
     Returns:
         (parsed_dict, None) on success.
         (None, {"code": str, "error": str}) on failure.
@@ -1569,8 +1600,8 @@ def _call_grok_for_synthesis(
         }
 
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=xai_key, base_url="https://api.x.ai/v1")
+        from backend.services.llm_clients import PROVIDER_XAI, get_llm_client
+        client = get_llm_client(PROVIDER_XAI, api_key=xai_key)
 
         # Founder awareness is now handled consistently at both individual and network
         # synthesis levels with proper founderInfo metadata. No special USER_OVERRIDES
@@ -1612,18 +1643,21 @@ def _call_grok_for_synthesis(
                 from backend.services import ai_usage
 
                 tokens_in, tokens_out = usage_tokens(response)
+                cost_usd = estimate_cost_usd(
+                    networking_ai_config,
+                    "kb_synthesis",
+                    tokens_in,
+                    tokens_out,
+                )
+                if usage_out is not None:
+                    usage_out.update(tokens_in=tokens_in, tokens_out=tokens_out, cost_usd=cost_usd)
                 ai_usage.log_usage(
                     username,
                     surface=ai_usage.SURFACE_NETWORKING_STEVE,
                     request_type="networking_kb_synthesis",
                     tokens_in=tokens_in,
                     tokens_out=tokens_out,
-                    cost_usd=estimate_cost_usd(
-                        networking_ai_config,
-                        "kb_synthesis",
-                        tokens_in,
-                        tokens_out,
-                    ),
+                    cost_usd=cost_usd,
                     model=networking_ai_config.kb_synthesis_model,
                 )
             except Exception as usage_err:
@@ -1746,6 +1780,255 @@ def schedule_knowledge_synthesis(username: str) -> None:
     logger.info("Scheduled background knowledge synthesis for %s", username)
 
 
+# ── Weekly sweep: input fingerprints + bounded worker pool ───────────────
+#
+# Most weekly syntheses used to re-run Grok on members whose posts, replies,
+# profile and spotlight answers had not changed since the last run. Each
+# successful synthesis now stores a SHA-256 of its inputs (the assembled raw
+# text plus admin corrections) in ``kb_synthesis_fingerprints``; the sweep
+# skips members whose fingerprint still matches. Bump
+# ``_KB_FINGERPRINT_VERSION`` when the prompt or schema changes so everyone
+# is re-synthesized once.
+_KB_FINGERPRINT_VERSION = "1"
+_KB_SWEEP_WORKERS_DEFAULT = 4
+_KB_SWEEP_XAI_PER_MINUTE_DEFAULT = 20
+
+_kb_fingerprint_table_ready = False
+
+
+def synthesis_input_fingerprint(raw_text: str, admin_corrections: str = "") -> str:
+    """Stable hash of everything that feeds a member synthesis."""
+    import hashlib
+
+    h = hashlib.sha256()
+    h.update(_KB_FINGERPRINT_VERSION.encode("utf-8"))
+    h.update(b"\x00")
+    h.update((raw_text or "").encode("utf-8"))
+    h.update(b"\x00")
+    h.update((admin_corrections or "").encode("utf-8"))
+    return h.hexdigest()
+
+
+def _ensure_kb_fingerprint_table() -> None:
+    global _kb_fingerprint_table_ready
+    if _kb_fingerprint_table_ready:
+        return
+    from backend.services.database import USE_MYSQL, get_db_connection
+
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        if USE_MYSQL:
+            c.execute(
+                """
+                CREATE TABLE IF NOT EXISTS kb_synthesis_fingerprints (
+                    username VARCHAR(191) PRIMARY KEY,
+                    fingerprint CHAR(64) NOT NULL,
+                    synthesized_at DATETIME NOT NULL
+                )
+                """
+            )
+        else:
+            c.execute(
+                """
+                CREATE TABLE IF NOT EXISTS kb_synthesis_fingerprints (
+                    username TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    synthesized_at TEXT NOT NULL
+                )
+                """
+            )
+        conn.commit()
+    _kb_fingerprint_table_ready = True
+
+
+def get_synthesis_fingerprint(username: str) -> Optional[str]:
+    """Fingerprint stored by the last successful synthesis, if any."""
+    from backend.services.database import get_db_connection, get_sql_placeholder
+
+    try:
+        _ensure_kb_fingerprint_table()
+        ph = get_sql_placeholder()
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            c.execute(f"SELECT fingerprint FROM kb_synthesis_fingerprints WHERE username = {ph}", (username,))
+            row = c.fetchone()
+        if not row:
+            return None
+        return row["fingerprint"] if hasattr(row, "keys") else row[0]
+    except Exception as err:
+        logger.debug("KB fingerprint read failed for %s: %s", username, err)
+        return None
+
+
+def store_synthesis_fingerprint(username: str, fingerprint: str) -> None:
+    from backend.services.database import USE_MYSQL, get_db_connection, get_sql_placeholder
+
+    try:
+        _ensure_kb_fingerprint_table()
+        ph = get_sql_placeholder()
+        now = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            if USE_MYSQL:
+                c.execute(
+                    f"""
+                    INSERT INTO kb_synthesis_fingerprints (username, fingerprint, synthesized_at)
+                    VALUES ({ph}, {ph}, {ph})
+                    ON DUPLICATE KEY UPDATE fingerprint = VALUES(fingerprint), synthesized_at = VALUES(synthesized_at)
+                    """,
+                    (username, fingerprint, now),
+                )
+            else:
+                c.execute(
+                    f"""
+                    INSERT OR REPLACE INTO kb_synthesis_fingerprints (username, fingerprint, synthesized_at)
+                    VALUES ({ph}, {ph}, {ph})
+                    """,
+                    (username, fingerprint, now),
+                )
+            conn.commit()
+    except Exception as err:
+        # Worst case the next sweep re-synthesizes this member.
+        logger.warning("KB fingerprint write failed for %s: %s", username, err)
+
+
+def _kb_sweep_env_int(name: str, default: int, hard_cap: int) -> int:
+    try:
+        v = int(os.environ.get(name, str(default)))
+    except ValueError:
+        v = default
+    return max(1, min(v, hard_cap))
+
+
+class _ProviderPacer:
+    """Spaces calls to one provider at ``per_minute`` across sweep workers."""
+
+    def __init__(self, per_minute: int) -> None:
+        self._interval = 60.0 / max(1, per_minute)
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self) -> None:
+        import time
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_at)
+            self._next_at = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def synthesize_member_knowledge_if_changed(
+    username: str,
+    *,
+    pacer: Optional[_ProviderPacer] = None,
+    force: bool = False,
+) -> Dict[str, Any]:
+    """Weekly-sweep unit: skip when inputs are unchanged, else synthesize.
+
+    Returns ``{"username", "status": skipped|synthesized|failed, "code", "cost_usd"}``.
+    """
+    out: Dict[str, Any] = {"username": username, "status": "failed", "code": None, "cost_usd": 0.0}
+    if not USE_KNOWLEDGE_BASE_V1:
+        out["code"] = "kb_disabled"
+        return out
+    try:
+        prep, prep_err = _prepare_member_synthesis(username)
+        if prep_err:
+            out["code"] = prep_err.get("code")
+            return out
+        if not force and get_synthesis_fingerprint(username) == prep["fingerprint"]:
+            out.update(status="skipped", code="unchanged")
+            return out
+        if pacer is not None:
+            pacer.wait()
+        usage: Dict[str, Any] = {}
+        ok, detail = _run_prepared_synthesis(username, prep, usage_out=usage)
+        out["cost_usd"] = float(usage.get("cost_usd") or 0.0)
+        if ok:
+            out["status"] = "synthesized"
+        else:
+            out["code"] = (detail or {}).get("code")
+    except Exception as e:
+        logger.error("KB sweep synthesis failed for %s: %s", username, e, exc_info=True)
+        out["code"] = "exception"
+    return out
+
+
+def run_kb_weekly_sweep(
+    usernames: List[str],
+    *,
+    max_workers: Optional[int] = None,
+    force: bool = False,
+) -> Dict[str, Any]:
+    """Fingerprint-gated synthesis for ``usernames`` on a bounded worker pool.
+
+    Grok calls are paced at ``KB_SWEEP_XAI_PER_MINUTE`` on top of the
+    process-wide xAI concurrency cap in ``llm_clients``.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    workers = max_workers or _kb_sweep_env_int("KB_SWEEP_WORKERS", _KB_SWEEP_WORKERS_DEFAULT, 16)
+    pacer = _ProviderPacer(
+        _kb_sweep_env_int("KB_SWEEP_XAI_PER_MINUTE", _KB_SWEEP_XAI_PER_MINUTE_DEFAULT, 600)
+    )
+    summary: Dict[str, Any] = {
+        "candidates": len(usernames),
+        "skipped": 0,
+        "synthesized": 0,
+        "failed": 0,
+        "cost_usd": 0.0,
+        "failures": {},
+    }
+    if not usernames:
+        return summary
+    with ThreadPoolExecutor(max_workers=min(workers, len(usernames)), thread_name_prefix="kb-sweep") as pool:
+        results = pool.map(
+            lambda u: synthesize_member_knowledge_if_changed(u, pacer=pacer, force=force),
+            usernames,
+        )
+        for res in results:
+            summary[res["status"]] += 1
+            summary["cost_usd"] += res["cost_usd"]
+            if res["status"] == "failed":
+                summary["failures"][res["username"]] = res["code"]
+    summary["cost_usd"] = round(summary["cost_usd"], 6)
+    logger.info(
+        "KB weekly sweep: %d candidates, %d skipped, %d synthesized, %d failed, $%.4f",
+        summary["candidates"], summary["skipped"], summary["synthesized"], summary["failed"], summary["cost_usd"],
+    )
+    return summary
+
+
+def schedule_kb_weekly_sweep(usernames: List[str], *, force: bool = False) -> None:
+    """Run :func:`run_kb_weekly_sweep` in one background thread; the summary is cached."""
+    def _run():
+        try:
+            summary = run_kb_weekly_sweep(usernames, force=force)
+            summary["finished_at"] = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+            from redis_cache import cache
+
+            cache.set(KB_SWEEP_LAST_SUMMARY_KEY, summary, 8 * 24 * 3600)
+        except Exception as e:
+            logger.error("KB weekly sweep failed: %s", e, exc_info=True)
+
+    threading.Thread(target=_run, name="kb-weekly-sweep", daemon=True).start()
+
+
+KB_SWEEP_LAST_SUMMARY_KEY = "kb_weekly_sweep:last_summary"
+
+
+def last_kb_weekly_sweep_summary() -> Optional[Dict[str, Any]]:
+    try:
+        from redis_cache import cache
+
+        summary = cache.get(KB_SWEEP_LAST_SUMMARY_KEY)
+        return summary if isinstance(summary, dict) else None
+    except Exception:
+        return None
+
+
 def _fetch_community_sql_data(network_id: int) -> Dict[str, Any]:
     """Pull community name and current member usernames for this specific community.
 
@@ -19,6 +19,7 @@ from zoneinfo import ZoneInfo
 _USR_TIMEZONE_ENSURED = False
 
 from backend.services.database import USE_MYSQL, get_db_connection, get_sql_placeholder
+from backend.services.scheduled_work import schedule_steve_reminder
 
 from backend.services.steve_reminder_parse import (
     RE_REMINDER_LIST as _RE_LIST,
@@ -535,6 +536,7 @@ def _insert_reminder_and_reply(
                 (now_str, now_str, username, subject, dt_str, tz_label[:64]),
             )
             rid = c.lastrowid
+        schedule_steve_reminder(c, rid, dt_utc)
         conn.commit()
 
     rid_txt = str(rid) if rid else "?"
@@ -730,6 +732,7 @@ def update_reminder_for_user(
     ph = get_sql_placeholder()
     parts = []
     params: list[Any] = []
+    new_fire_at: Optional[datetime] = None
     if reminder_text is not None:
         t = _sanitize_body(reminder_text)
         if len(t.strip()) < 2:
@@ -746,6 +749,7 @@ def update_reminder_for_user(
                 return False, "Pick a time in the future."
             parts.append(f"fire_at_utc = {ph}")
             params.append(dt.strftime("%Y-%m-%d %H:%M:%S"))
+            new_fire_at = dt
         except Exception:
             return False, "Invalid date/time."
     if USE_MYSQL:
@@ -766,6 +770,8 @@ def update_reminder_for_user(
                 tuple(params),
             )
             affected = c.rowcount or 0
+            if affected and new_fire_at:
+                schedule_steve_reminder(c, reminder_id, new_fire_at)
             conn.commit()
     except Exception as exc:
         logger.warning("update reminder failed: %s", exc)
@@ -810,6 +816,96 @@ def delete_reminder_for_user(*, username: str, reminder_id: int) -> Tuple[bool,
     return False, "Reminder not found or already fired."
 
 
+def _lock_and_send_reminder(row_id: Any, uname: str, body_txt: str) -> str:
+    """Flip one row to ``fired`` (guarded on ``status``) and DM it.
+
+    Returns ``"sent"``, ``"skipped"`` (another worker won the row) or ``"error"``.
+    """
+    from backend.services.content_generation.delivery import format_reminder_push_preview, send_steve_dm
+
+    ph = get_sql_placeholder()
+    locked = False
+    try:
+        with get_db_connection() as conn2:
+            c2 = conn2.cursor()
+            if USE_MYSQL:
+                c2.execute(
+                    f"""
+                    UPDATE steve_reminder_vault SET status = 'fired', fired_at = NOW(),
+                        updated_at = NOW()
+                    WHERE id = {ph} AND username = {ph} AND status = 'scheduled'
+                    """,
+                    (row_id, uname),
+                )
+                locked = (c2.rowcount or 0) >= 1
+            else:
+                ts = _sql_now()
+                c2.execute(
+                    f"""
+                    UPDATE steve_reminder_vault SET status = 'fired', fired_at = {ph},
+                        updated_at = {ph}
+                    WHERE id = {ph} AND username = {ph} AND status = 'scheduled'
+                    """,
+                    (ts, ts, row_id, uname),
+                )
+                locked = (c2.rowcount or 0) >= 1
+            conn2.commit()
+    except Exception as exc:
+        logger.warning("Reminder lock row #%s failed: %s", row_id, exc)
+        return "error"
+
+    if not locked:
+        return "skipped"
+
+    msg = (
+        f"Hey — quick nudge: {body_txt}\n\n"
+        f"(Reminder #{row_id}. Say **list my reminders** if you want to tweak what’s queued.)"
+    )
+    try:
+        send_steve_dm(
+            receiver_username=uname,
+            content=msg,
+            push_preview_text=format_reminder_push_preview(body_txt),
+        )
+    except Exception as exc:
+        logger.error("send_steve_dm failed reminder %s: %s", row_id, exc)
+        return "error"
+    return "sent"
+
+
+def fire_scheduled_reminder(reminder_id: int, *, stale_catch_hours: int = 48) -> bool:
+    """Fire one vault row if it is still scheduled and due (``scheduled_work`` handler).
+
+    Same window as :func:`dispatch_due_reminders`: never before ``fire_at_utc``
+    and not more than ``stale_catch_hours`` late. Like the sweep, a failed DM
+    is not retried: the row is already ``fired``.
+    """
+    ensure_reminder_tables()
+    ph = get_sql_placeholder()
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            f"""
+            SELECT id, username, reminder_text, fire_at_utc FROM steve_reminder_vault
+            WHERE id = {ph} AND status = 'scheduled'
+            """,
+            (int(reminder_id),),
+        )
+        row = c.fetchone()
+    if not row:
+        return False
+    fire_at = _parse_fire_datetime_value(row["fire_at_utc"] if hasattr(row, "keys") else row[3])
+    now = _now_utc_naive()
+    if fire_at > now or fire_at < now - timedelta(hours=max(1, stale_catch_hours)):
+        return False
+    outcome = _lock_and_send_reminder(
+        row["id"] if hasattr(row, "keys") else row[0],
+        row["username"] if hasattr(row, "keys") else row[1],
+        row["reminder_text"] if hasattr(row, "keys") else row[2],
+    )
+    return outcome == "sent"
+
+
 def dispatch_due_reminders(*, lookahead_minutes: int = 12, stale_catch_hours: int = 48) -> Dict[str, Any]:
     """Cron: fire pending reminders that are due (``fire_at_utc`` <= now, within stale catch-up window).
 
@@ -818,7 +914,6 @@ def dispatch_due_reminders(*, lookahead_minutes: int = 12, stale_catch_hours: in
     """
     del lookahead_minutes  # upper bound is always "now"; do not fire future rows
     ensure_reminder_tables()
-    from backend.services.content_generation.delivery import format_reminder_push_preview, send_steve_dm
 
     now = _now_utc_naive()
     now_s = now.strftime("%Y-%m-%d %H:%M:%S")
@@ -866,54 +961,10 @@ def dispatch_due_reminders(*, lookahead_minutes: int = 12, stale_catch_hours: in
         row_id = row["id"] if hasattr(row, "keys") else row[0]
         uname = row["username"] if hasattr(row, "keys") else row[1]
         body_txt = row["reminder_text"] if hasattr(row, "keys") else row[2]
-
-        locked = False
-        try:
-            with get_db_connection() as conn2:
-                c2 = conn2.cursor()
-                if USE_MYSQL:
-                    c2.execute(
-                        f"""
-                        UPDATE steve_reminder_vault SET status = 'fired', fired_at = NOW(),
-                            updated_at = NOW()
-                        WHERE id = {ph} AND username = {ph} AND status = 'scheduled'
-                        """,
-                        (row_id, uname),
-                    )
-                    locked = (c2.rowcount or 0) >= 1
-                else:
-                    ts = _sql_now()
-                    c2.execute(
-                        f"""
-                        UPDATE steve_reminder_vault SET status = 'fired', fired_at = {ph},
-                            updated_at = {ph}
-                        WHERE id = {ph} AND username = {ph} AND status = 'scheduled'
-                        """,
-                        (ts, ts, row_id, uname),
-                    )
-                    locked = (c2.rowcount or 0) >= 1
-                conn2.commit()
-        except Exception as exc:
-            logger.warning("Reminder lock row #%s failed: %s", row_id, exc)
-            errors += 1
-            continue
-
-        if not locked:
-            continue
-
-        msg = (
-            f"Hey — quick nudge: {body_txt}\n\n"
-            f"(Reminder #{row_id}. Say **list my reminders** if you want to tweak what’s queued.)"
-        )
-        try:
-            send_steve_dm(
-                receiver_username=uname,
-                content=msg,
-                push_preview_text=format_reminder_push_preview(body_txt),
-            )
+        outcome = _lock_and_send_reminder(row_id, uname, body_txt)
+        if outcome == "sent":
             sent += 1
-        except Exception as exc:
-            logger.error("send_steve_dm failed reminder %s: %s", row_id, exc)
+        elif outcome == "error":
             errors += 1
 
     return {"sent": sent, "errors": errors, "candidates": len(cand_rows)}
@@ -21,6 +21,8 @@ from typing import Any, Iterable, Optional, Sequence
 
 logger = logging.getLogger(__name__)
 
+_LEGACY_PDF_PAGES = 15
+
 
 def scope_has_useful_docs(
     c: Any,
@@ -74,8 +76,24 @@ def extract_pdf_text_for_steve(file_path: str, max_chars: int = 4000) -> Optiona
 
     Kept as a fallback for documents that have not been indexed into the
     Firestore memory (``steve_document_memory``). Returns ``None`` on any
-    failure so callers can skip the document cleanly.
+    failure so callers can skip the document cleanly. With ``DOC_TEXT_CACHE``
+    on the pages come from ``document_text_cache`` instead of a fresh
+    download and parse per turn.
     """
+    from backend.services.feature_flags import document_text_cache_enabled
+
+    if document_text_cache_enabled():
+        try:
+            from backend.services.document_text_cache import STATUS_FAILED, extract_pages
+
+            extracted = extract_pages(file_path)
+            if extracted.status == STATUS_FAILED:
+                return None
+            text = " ".join(p["text"] for p in extracted.normalized_pages(_LEGACY_PDF_PAGES))
+            return text[:max_chars] if text.strip() else None
+        except Exception as e:
+            logger.warning("PDF text cache failed for %s: %s", file_path, e)
+            return None
     try:
         import io
 
@@ -101,7 +119,7 @@ def extract_pdf_text_for_steve(file_path: str, max_chars: int = 4000) -> Optiona
 
         reader = PdfReader(io.BytesIO(pdf_bytes))
         text = ""
-        for i in range(min(len(reader.pages), 15)):
+        for i in range(min(len(reader.pages), _LEGACY_PDF_PAGES)):
             page_text = reader.pages[i].extract_text() or ""
             text += page_text + "\n"
         text = " ".join(text.split())
@@ -399,9 +399,9 @@ def _run_summarize(
 
     start_ms = time.time() * 1000
     try:
-        from openai import OpenAI
+        from backend.services.llm_clients import PROVIDER_XAI, get_llm_client
 
-        client = OpenAI(api_key=XAI_API_KEY, base_url="https://api.x.ai/v1")
+        client = get_llm_client(PROVIDER_XAI, api_key=XAI_API_KEY)
         response = client.chat.completions.create(
             model=model_to_use,
             messages=[
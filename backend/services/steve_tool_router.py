@@ -2,6 +2,10 @@
 
 Runs only on turns that pass heuristic filters, skip platform/professional-only paths,
 and are not profile-intent suppressions. Disabled via ``STEVE_TOOL_ROUTER_DISABLED=1``.
+
+Decisions are answered from :mod:`backend.services.steve_tool_router_cache`
+(decision cache, then the optional local classifier) before paying for the
+router LLM call.
 """
 
 from __future__ import annotations
@@ -12,9 +16,8 @@ import re
 import time
 from typing import Any, Optional
 
-from openai import OpenAI
-
 from backend.services import ai_usage
+from backend.services.llm_clients import PROVIDER_XAI, get_llm_client
 from backend.services.onboarding_company_intel import _extract_json
 from backend.services.steve_model_config import (
     estimate_response_cost_usd,
@@ -27,6 +30,19 @@ from backend.services.steve_tool_policy import (
     steve_tools_for_message,
     steve_x_search_requested,
 )
+from backend.services.feature_flags import steve_tool_router_local_classifier_enabled
+from backend.services.steve_tool_router_cache import (
+    SOURCE_CACHE,
+    SOURCE_CLASSIFIER,
+    SOURCE_LLM,
+    cache_decision,
+    get_cached_decision,
+    get_router_classifier,
+    normalize_router_text,
+    record_router_decision,
+    record_router_outcome,
+    router_stats,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -110,12 +126,16 @@ FALSE for looking up **other C-Point users** or anyone by name/handle to infer p
 When uncertain, prefer false."""
 
 
-def _call_router_llm(user_text: str) -> tuple[dict[str, bool], Any]:
-    """Invoke small Grok call; return (flags dict, raw response for logging)."""
+def _call_router_llm(user_text: str) -> tuple[Optional[dict[str, bool]], Any]:
+    """Invoke small Grok call; return (flags dict, raw response for logging).
+
+    Flags are ``None`` when there was no decision to learn from: no API key,
+    or a reply that did not parse into the expected JSON object.
+    """
     if not XAI_API_KEY:
-        return {"web_search": False, "x_search": False}, None  # type: ignore[return-value]
+        return None, None
 
-    client = OpenAI(api_key=XAI_API_KEY, base_url="https://api.x.ai/v1")
+    client = get_llm_client(PROVIDER_XAI, api_key=XAI_API_KEY)
     clipped = (user_text or "")[:3500]
     response = client.responses.create(
         model=_ROUTER_MODEL,
@@ -127,12 +147,41 @@ def _call_router_llm(user_text: str) -> tuple[dict[str, bool], Any]:
         temperature=0,
     )
     raw = (response.output_text or "").strip() if hasattr(response, "output_text") else ""
-    data = _extract_json(raw)
+    try:
+        data = _extract_json(raw)
+    except Exception as exc:
+        logger.warning("Steve tool router reply did not parse: %s", exc)
+        return None, response
+    if not isinstance(data, dict) or not ({"web_search", "x_search"} & set(data)):
+        logger.warning("Steve tool router reply had no decision: %r", raw[:200])
+        return None, response
     w = bool(data.get("web_search"))
     x = bool(data.get("x_search"))
     return {"web_search": w, "x_search": x}, response
 
 
+def _local_router_decision(
+    normalized: str, *, x_requested: bool
+) -> Optional[tuple[dict[str, bool], str]]:
+    """Cached or locally classified router flags, or ``None`` to ask the LLM."""
+    cached = get_cached_decision(normalized)
+    if cached is not None:
+        return cached, SOURCE_CACHE
+    if not steve_tool_router_local_classifier_enabled():
+        return None
+    model = get_router_classifier()
+    if model is None:
+        return None
+    try:
+        flags = model.classify(normalized, x_requested=x_requested)
+    except Exception as exc:
+        logger.warning("Steve tool router classifier failed: %s", exc)
+        return None
+    if flags is None:
+        return None
+    return flags, SOURCE_CLASSIFIER
+
+
 def resolve_steve_hosted_tools(
     message: str,
     *,
@@ -164,12 +213,45 @@ def resolve_steve_hosted_tools(
     if os.environ.get("STEVE_TOOL_ROUTER_DISABLED", "").strip() in {"1", "true", "yes"}:
         return []
 
+    normalized = normalize_router_text(text)
+    x_requested = steve_x_search_requested(text)
+    local = _local_router_decision(normalized, x_requested=x_requested)
+    if local is not None:
+        flags, source = local
+        if not x_requested:
+            flags = {**flags, "x_search": False}
+        tools = _router_tools_from_flags(
+            web_search=bool(flags.get("web_search")),
+            x_search=bool(flags.get("x_search")),
+            config=config,
+        )
+        record_router_outcome(source)
+        logger.info(
+            "Steve tool router (%s): user=%s surface=%s web=%s x=%s tools=%s stats=%s",
+            source,
+            username,
+            surface,
+            flags.get("web_search"),
+            flags.get("x_search"),
+            [t.get("type") for t in tools],
+            router_stats(),
+        )
+        return tools
+
     started = time.perf_counter()
     try:
         flags, response = _call_router_llm(text)
-        if not steve_x_search_requested(text):
-            flags = {**flags, "x_search": False}
         elapsed_ms = int((time.perf_counter() - started) * 1000)
+        record_router_outcome(SOURCE_LLM, elapsed_ms=elapsed_ms)
+        if flags is not None:
+            # Only parsed replies are decisions; a missing key or garbled JSON
+            # must not be cached or become a negative training row.
+            cache_decision(normalized, flags)
+            record_router_decision(normalized, flags)
+        else:
+            flags = {"web_search": False, "x_search": False}
+        if not x_requested:
+            flags = {**flags, "x_search": False}
         tools = _router_tools_from_flags(
             web_search=bool(flags.get("web_search")),
             x_search=bool(flags.get("x_search")),
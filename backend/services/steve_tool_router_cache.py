@@ -0,0 +1,399 @@
+"""Decision cache and local classifier in front of the Steve tool-router LLM.
+
+:func:`backend.services.steve_tool_router.resolve_steve_hosted_tools` only
+calls the router LLM for messages the static policy leaves ambiguous. This
+module answers most of those without the extra Grok round trip:
+
+1. **Decision cache** — router flags keyed on the normalized message text
+   (Redis / in-process, ``DECISION_CACHE_TTL_SECONDS``). The router runs at
+   temperature 0 so a repeat of the same text gets the same answer.
+2. **Local classifier** (``STEVE_TOOL_ROUTER_LOCAL_CLASSIFIER``) — a token
+   naive-Bayes model fitted on past router decisions. It answers only when
+   its posterior is outside ``[CLASSIFIER_LOW, CLASSIFIER_HIGH]``; anything in
+   between still goes to the LLM.
+
+``ai_usage_log`` rows for ``steve_tool_router`` carry cost and latency but
+not the flags the router returned, so every LLM decision is also written to
+``steve_tool_router_decisions`` (token bag + flags, no raw text) as the
+training set. :func:`train_router_classifier` refits from it
+(``POST /api/cron/steve/tool-router/train``), first purging decisions not
+seen for ``DECISION_RETENTION_DAYS``.
+
+Hit rates and the router latency they saved are kept per process and
+reported by :func:`router_stats`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from backend.services.database import USE_MYSQL, get_db_connection, get_sql_placeholder
+from backend.services.steve_tool_policy import normalize_message_for_live_search_signals
+from redis_cache import cache, steve_tool_router_decision_key, steve_tool_router_model_key
+
+logger = logging.getLogger(__name__)
+
+SOURCE_CACHE = "cache"
+SOURCE_CLASSIFIER = "classifier"
+SOURCE_LLM = "llm"
+
+DECISION_CACHE_TTL_SECONDS = 7 * 24 * 3600
+MODEL_CACHE_TTL_SECONDS = 3 * 24 * 3600
+MODEL_RELOAD_SECONDS = 600
+CLASSIFIER_MIN_SAMPLES = 60
+CLASSIFIER_MIN_CLASS_SAMPLES = 10
+CLASSIFIER_HIGH = 0.92
+CLASSIFIER_LOW = 0.08
+TRAINING_ROW_LIMIT = 20000
+DECISION_RETENTION_DAYS = int(os.environ.get("STEVE_TOOL_ROUTER_DECISION_RETENTION_DAYS", "90"))
+MAX_TOKENS_PER_MESSAGE = 120
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9'.-]*[a-z0-9]|[a-z0-9]")
+_MENTION_RE = re.compile(r"@\w+")
+_URL_RE = re.compile(r"https?://\S+|www\.\S+")
+
+
+# ── Normalization ──────────────────────────────────────────────────────
+
+
+def normalize_router_text(message: str) -> str:
+    """Case/diacritic-folded text with @mentions and URLs collapsed.
+
+    Two messages that differ only in who was tagged or which link was pasted
+    route the same way, so they share a cache entry.
+    """
+    text = normalize_message_for_live_search_signals(message or "")
+    text = _URL_RE.sub(" <url> ", text)
+    text = _MENTION_RE.sub(" ", text)
+    return " ".join(text.split())[:3500]
+
+
+def router_text_hash(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def router_tokens(normalized: str) -> list:
+    seen: list = []
+    for tok in _TOKEN_RE.findall(normalized.replace("<url>", " urltoken ")):
+        if tok not in seen:
+            seen.append(tok)
+        if len(seen) >= MAX_TOKENS_PER_MESSAGE:
+            break
+    return seen
+
+
+# ── Decision cache ─────────────────────────────────────────────────────
+
+
+def get_cached_decision(normalized: str) -> Optional[Dict[str, bool]]:
+    try:
+        hit = cache.get(steve_tool_router_decision_key(router_text_hash(normalized)))
+    except Exception:
+        return None
+    if not isinstance(hit, dict):
+        return None
+    return {"web_search": bool(hit.get("web_search")), "x_search": bool(hit.get("x_search"))}
+
+
+def cache_decision(normalized: str, flags: Dict[str, Any]) -> None:
+    try:
+        cache.set(
+            steve_tool_router_decision_key(router_text_hash(normalized)),
+            {"web_search": bool(flags.get("web_search")), "x_search": bool(flags.get("x_search"))},
+            DECISION_CACHE_TTL_SECONDS,
+        )
+    except Exception as exc:
+        logger.debug("tool router decision cache set failed: %s", exc)
+
+
+# ── Decision log (training set) ────────────────────────────────────────
+
+
+_DECISIONS_TABLE_READY = False
+
+
+def ensure_router_decisions_table(cursor) -> None:
+    global _DECISIONS_TABLE_READY  # pylint: disable=global-statement
+    if _DECISIONS_TABLE_READY:
+        return
+    if USE_MYSQL:
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS steve_tool_router_decisions (
+                text_hash CHAR(40) NOT NULL PRIMARY KEY,
+                tokens TEXT NOT NULL,
+                web_search TINYINT(1) NOT NULL DEFAULT 0,
+                x_search TINYINT(1) NOT NULL DEFAULT 0,
+                seen_count INT NOT NULL DEFAULT 1,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                INDEX idx_tool_router_decisions_updated (updated_at)
+            )
+            """
+        )
+    else:
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS steve_tool_router_decisions (
+                text_hash TEXT NOT NULL PRIMARY KEY,
+                tokens TEXT NOT NULL,
+                web_search INTEGER NOT NULL DEFAULT 0,
+                x_search INTEGER NOT NULL DEFAULT 0,
+                seen_count INTEGER NOT NULL DEFAULT 1,
+                created_at TEXT DEFAULT (datetime('now')),
+                updated_at TEXT DEFAULT (datetime('now'))
+            )
+            """
+        )
+    _DECISIONS_TABLE_READY = True
+
+
+def record_router_decision(normalized: str, flags: Dict[str, Any]) -> None:
+    """Persist one LLM routing decision for classifier training. Never raises."""
+    tokens = " ".join(router_tokens(normalized))
+    if not tokens:
+        return
+    ph = get_sql_placeholder()
+    params = (
+        router_text_hash(normalized),
+        tokens,
+        1 if flags.get("web_search") else 0,
+        1 if flags.get("x_search") else 0,
+    )
+    try:
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            ensure_router_decisions_table(c)
+            if USE_MYSQL:
+                c.execute(
+                    f"""
+                    INSERT INTO steve_tool_router_decisions (text_hash, tokens, web_search, x_search)
+                    VALUES ({ph}, {ph}, {ph}, {ph})
+                    ON DUPLICATE KEY UPDATE web_search = VALUES(web_search),
+                        x_search = VALUES(x_search), seen_count = seen_count + 1
+                    """,
+                    params,
+                )
+            else:
+                c.execute(
+                    f"""
+                    INSERT INTO steve_tool_router_decisions (text_hash, tokens, web_search, x_search)
+                    VALUES ({ph}, {ph}, {ph}, {ph})
+                    ON CONFLICT(text_hash) DO UPDATE SET web_search = excluded.web_search,
+                        x_search = excluded.x_search, seen_count = seen_count + 1,
+                        updated_at = datetime('now')
+                    """,
+                    params,
+                )
+            conn.commit()
+    except Exception as exc:
+        logger.warning("tool router decision log failed (non-fatal): %s", exc)
+
+
+# ── Local classifier ───────────────────────────────────────────────────
+
+
+class RouterClassifier:
+    """Bernoulli-style naive Bayes over message tokens, one model per flag."""
+
+    LABELS = ("web_search", "x_search")
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.samples = int(data.get("samples") or 0)
+        self.labels: Dict[str, Dict[str, Any]] = data.get("labels") or {}
+        self.trained_at = data.get("trained_at")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"samples": self.samples, "labels": self.labels, "trained_at": self.trained_at}
+
+    @classmethod
+    def fit(cls, rows: list) -> "RouterClassifier":
+        labels: Dict[str, Dict[str, Any]] = {}
+        for label in cls.LABELS:
+            pos_docs = neg_docs = 0
+            pos_counts: Dict[str, int] = {}
+            neg_counts: Dict[str, int] = {}
+            for tokens, flags in rows:
+                target = pos_counts if flags.get(label) else neg_counts
+                if flags.get(label):
+                    pos_docs += 1
+                else:
+                    neg_docs += 1
+                for tok in tokens:
+                    target[tok] = target.get(tok, 0) + 1
+            labels[label] = {
+                "pos_docs": pos_docs,
+                "neg_docs": neg_docs,
+                "pos": pos_counts,
+                "neg": neg_counts,
+            }
+        return cls({"samples": len(rows), "labels": labels, "trained_at": int(time.time())})
+
+    def probability(self, label: str, tokens: list) -> Optional[float]:
+        m = self.labels.get(label)
+        if not m:
+            return None
+        pos_docs, neg_docs = int(m["pos_docs"]), int(m["neg_docs"])
+        if min(pos_docs, neg_docs) < CLASSIFIER_MIN_CLASS_SAMPLES:
+            return None
+        pos, neg = m["pos"], m["neg"]
+        log_odds = math.log(pos_docs / neg_docs)
+        known = 0
+        for tok in tokens:
+            p_pos = (pos.get(tok, 0) + 1) / (pos_docs + 2)
+            p_neg = (neg.get(tok, 0) + 1) / (neg_docs + 2)
+            if tok in pos or tok in neg:
+                known += 1
+            log_odds += math.log(p_pos / p_neg)
+        if not known:
+            return None
+        log_odds = max(-30.0, min(30.0, log_odds))
+        return 1.0 / (1.0 + math.exp(-log_odds))
+
+    def classify(self, normalized: str, *, x_requested: bool) -> Optional[Dict[str, bool]]:
+        """Confident flags, or ``None`` when the LLM should decide."""
+        if self.samples < CLASSIFIER_MIN_SAMPLES:
+            return None
+        tokens = router_tokens(normalized)
+        flags: Dict[str, bool] = {}
+        labels = self.LABELS if x_requested else ("web_search",)
+        for label in labels:
+            p = self.probability(label, tokens)
+            if p is None or CLASSIFIER_LOW < p < CLASSIFIER_HIGH:
+                return None
+            flags[label] = p >= CLASSIFIER_HIGH
+        flags.setdefault("x_search", False)
+        return flags
+
+
+_model_lock = threading.Lock()
+_model: Optional[RouterClassifier] = None
+_model_loaded_at = 0.0
+
+
+def get_router_classifier() -> Optional[RouterClassifier]:
+    global _model, _model_loaded_at
+    now = time.monotonic()
+    if _model is not None and now - _model_loaded_at < MODEL_RELOAD_SECONDS:
+        return _model
+    with _model_lock:
+        if _model is not None and now - _model_loaded_at < MODEL_RELOAD_SECONDS:
+            return _model
+        try:
+            data = cache.get(steve_tool_router_model_key())
+        except Exception:
+            data = None
+        if isinstance(data, dict):
+            _model = RouterClassifier(data)
+        _model_loaded_at = now
+        return _model
+
+
+def set_router_classifier(model: Optional[RouterClassifier]) -> None:
+    global _model, _model_loaded_at
+    with _model_lock:
+        _model = model
+        _model_loaded_at = time.monotonic()
+
+
+def purge_router_decisions(retention_days: int = DECISION_RETENTION_DAYS) -> int:
+    """Delete logged decisions not seen for ``retention_days``; returns the count."""
+    ph = get_sql_placeholder()
+    cutoff = (datetime.utcnow() - timedelta(days=max(1, int(retention_days)))).strftime("%Y-%m-%d %H:%M:%S")
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        ensure_router_decisions_table(c)
+        c.execute(f"DELETE FROM steve_tool_router_decisions WHERE updated_at < {ph}", (cutoff,))
+        purged = int(c.rowcount or 0)
+        conn.commit()
+    return purged
+
+
+def train_router_classifier(limit: int = TRAINING_ROW_LIMIT) -> Dict[str, Any]:
+    """Purge expired decisions, refit from the most recent ones and publish the model."""
+    purged = purge_router_decisions()
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        ensure_router_decisions_table(c)
+        c.execute(
+            f"""
+            SELECT tokens, web_search, x_search FROM steve_tool_router_decisions
+            ORDER BY updated_at DESC
+            LIMIT {int(limit)}
+            """
+        )
+        raw_rows = c.fetchall() or []
+    rows = []
+    for r in raw_rows:
+        if hasattr(r, "keys"):
+            tokens, web, x = r["tokens"], r["web_search"], r["x_search"]
+        else:
+            tokens, web, x = r[0], r[1], r[2]
+        rows.append(((tokens or "").split(), {"web_search": bool(web), "x_search": bool(x)}))
+    model = RouterClassifier.fit(rows)
+    try:
+        cache.set(steve_tool_router_model_key(), model.to_dict(), MODEL_CACHE_TTL_SECONDS)
+    except Exception as exc:
+        logger.warning("tool router model publish failed: %s", exc)
+    set_router_classifier(model)
+    web = model.labels.get("web_search", {})
+    x = model.labels.get("x_search", {})
+    return {
+        "samples": model.samples,
+        "active": model.samples >= CLASSIFIER_MIN_SAMPLES,
+        "web_search_positive": web.get("pos_docs", 0),
+        "x_search_positive": x.get("pos_docs", 0),
+        "purged": purged,
+    }
+
+
+# ── Hit-rate / latency accounting ──────────────────────────────────────
+
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, float] = {
+    SOURCE_CACHE: 0,
+    SOURCE_CLASSIFIER: 0,
+    SOURCE_LLM: 0,
+    "llm_ms_total": 0,
+}
+
+
+def record_router_outcome(source: str, *, elapsed_ms: Optional[int] = None) -> None:
+    with _stats_lock:
+        _stats[source] = _stats.get(source, 0) + 1
+        if source == SOURCE_LLM and elapsed_ms is not None:
+            _stats["llm_ms_total"] += elapsed_ms
+
+
+def router_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        cache_hits = int(_stats[SOURCE_CACHE])
+        clf_hits = int(_stats[SOURCE_CLASSIFIER])
+        llm_calls = int(_stats[SOURCE_LLM])
+        llm_ms = float(_stats["llm_ms_total"])
+    total = cache_hits + clf_hits + llm_calls
+    avg_llm_ms = (llm_ms / llm_calls) if llm_calls else None
+    return {
+        "decisions": total,
+        "cache_hits": cache_hits,
+        "classifier_hits": clf_hits,
+        "llm_calls": llm_calls,
+        "hit_rate": round((cache_hits + clf_hits) / total, 4) if total else None,
+        "avg_llm_ms": int(avg_llm_ms) if avg_llm_ms is not None else None,
+        "latency_saved_ms": int((cache_hits + clf_hits) * avg_llm_ms) if avg_llm_ms else 0,
+    }
+
+
+def reset_router_stats() -> None:
+    with _stats_lock:
+        for k in list(_stats):
+            _stats[k] = 0
@@ -1,18 +1,205 @@
-"""Transactional email via Resend API."""
+"""Transactional email via Resend API.
+
+Single sends go through :func:`send`; cron sweeps and bulk invites hand a
+list of :class:`OutboundEmail` to :func:`send_batch`, which posts chunks to
+Resend's batch endpoint over a pooled HTTP session with bounded concurrency
+and retry classification.
+
+``EMAIL_PROVIDER=stub`` swaps the transport for :data:`stub_provider`, an
+in-process recorder used by tests and local development.
+"""
 
 from __future__ import annotations
 
 import logging
 import os
-from typing import Optional
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
 
 import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
 RESEND_API_KEY = os.getenv("RESEND_API_KEY")
 EMAIL_FROM = os.getenv("EMAIL_FROM", "C-Point <no-reply@c-point.co>")
 
+RESEND_EMAILS_URL = "https://api.resend.com/emails"
+RESEND_BATCH_URL = "https://api.resend.com/emails/batch"
+# Resend accepts at most 100 messages per batch call.
+RESEND_BATCH_MAX = 100
+
+# Per-message outcome of :func:`send_batch`.
+STATUS_SENT = "sent"
+STATUS_RETRYABLE = "retryable"  # provider throttled / unavailable after retries
+STATUS_FAILED = "failed"  # rejected (bad request, auth, validation)
+
+
+@dataclass
+class OutboundEmail:
+    to_email: str
+    subject: str
+    html: str
+    text: Optional[str] = None
+    headers: Optional[Dict[str, str]] = None
+
+    def payload(self) -> Dict[str, object]:
+        body: Dict[str, object] = {
+            "from": EMAIL_FROM,
+            "to": [self.to_email],
+            "subject": self.subject,
+            "html": self.html,
+        }
+        if self.text:
+            body["text"] = self.text
+        if self.headers:
+            body["headers"] = dict(self.headers)
+        return body
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(name, str(default))))
+    except ValueError:
+        return default
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _http() -> requests.Session:
+    """Process-wide keep-alive session sized for the batch worker pool."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                pool = _env_int("EMAIL_BATCH_CONCURRENCY", 2) + 2
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def _classify(status_code: int) -> str:
+    if status_code in (200, 201):
+        return STATUS_SENT
+    if status_code in (408, 409, 429) or status_code >= 500:
+        return STATUS_RETRYABLE
+    return STATUS_FAILED
+
+
+def _retry_after(response: Optional[requests.Response], attempt: int) -> float:
+    if response is not None:
+        try:
+            return min(30.0, max(0.0, float(response.headers.get("Retry-After", ""))))
+        except ValueError:
+            pass
+    return min(8.0, 0.5 * (2 ** attempt))
+
+
+class ResendProvider:
+    name = "resend"
+
+    def send_one(self, message: OutboundEmail) -> bool:
+        if not RESEND_API_KEY:
+            logger.error("RESEND_API_KEY not set; skipping email send")
+            return False
+        try:
+            response = _http().post(
+                RESEND_EMAILS_URL,
+                headers={"Authorization": f"Bearer {RESEND_API_KEY}"},
+                json=message.payload(),
+                timeout=15,
+            )
+            if response.status_code in (200, 201):
+                logger.info("Resend email queued successfully to=%s", message.to_email)
+                return True
+            logger.error("Resend send failed: %s %s", response.status_code, response.text)
+            return False
+        except Exception as exc:
+            logger.error("Resend send exception: %s", exc)
+            return False
+
+    def send_chunk(self, messages: List[OutboundEmail]) -> str:
+        """One batch call with retries; the whole chunk shares one outcome.
+
+        The idempotency key is fixed across retries so a 5xx after Resend
+        already accepted the batch never delivers it twice.
+        """
+        if not RESEND_API_KEY:
+            logger.error("RESEND_API_KEY not set; skipping batch send")
+            return STATUS_FAILED
+        headers = {
+            "Authorization": f"Bearer {RESEND_API_KEY}",
+            "Idempotency-Key": uuid.uuid4().hex,
+        }
+        body = [m.payload() for m in messages]
+        max_attempts = _env_int("EMAIL_BATCH_MAX_ATTEMPTS", 3)
+        outcome = STATUS_RETRYABLE
+        for attempt in range(max_attempts):
+            response = None
+            try:
+                response = _http().post(RESEND_BATCH_URL, headers=headers, json=body, timeout=30)
+                outcome = _classify(response.status_code)
+            except requests.RequestException as exc:
+                logger.warning("Resend batch transport error (attempt %d): %s", attempt + 1, exc)
+                outcome = STATUS_RETRYABLE
+            if outcome != STATUS_RETRYABLE:
+                break
+            if attempt + 1 < max_attempts:
+                time.sleep(_retry_after(response, attempt))
+        if outcome == STATUS_SENT:
+            logger.info("Resend batch queued %d emails", len(messages))
+        else:
+            detail = f"{response.status_code} {response.text[:300]}" if response is not None else "no response"
+            logger.error("Resend batch of %d %s: %s", len(messages), outcome, detail)
+        return outcome
+
+
+@dataclass
+class StubProvider:
+    """Records messages instead of sending them (``EMAIL_PROVIDER=stub``)."""
+
+    name: str = "stub"
+    sent: List[OutboundEmail] = field(default_factory=list)
+    fail_for: Set[str] = field(default_factory=set)
+    batch_calls: int = 0
+
+    def reset(self) -> None:
+        self.sent.clear()
+        self.fail_for.clear()
+        self.batch_calls = 0
+
+    def send_one(self, message: OutboundEmail) -> bool:
+        if message.to_email.lower() in self.fail_for:
+            return False
+        self.sent.append(message)
+        return True
+
+    def send_chunk(self, messages: List[OutboundEmail]) -> str:
+        self.batch_calls += 1
+        # Mirrors Resend: one bad recipient rejects the whole batch.
+        if any(m.to_email.lower() in self.fail_for for m in messages):
+            return STATUS_FAILED
+        self.sent.extend(messages)
+        return STATUS_SENT
+
+
+stub_provider = StubProvider()
+_resend_provider = ResendProvider()
+
+
+def _provider():
+    if (os.environ.get("EMAIL_PROVIDER") or "").strip().lower() == "stub":
+        return stub_provider
+    return _resend_provider
+
 
 def send(
     to_email: str,
@@ -29,31 +216,47 @@ def send(
     through :mod:`backend.services.lifecycle_email` — this function performs
     no suppression checks and is reserved for transactional mail.
     """
-    if not RESEND_API_KEY:
-        logger.error("RESEND_API_KEY not set; skipping email send")
-        return False
-    try:
-        payload = {
-            "from": EMAIL_FROM,
-            "to": [to_email],
-            "subject": subject,
-            "html": html,
-        }
-        if text:
-            payload["text"] = text
-        if headers:
-            payload["headers"] = dict(headers)
-        response = requests.post(
-            "https://api.resend.com/emails",
-            headers={"Authorization": f"Bearer {RESEND_API_KEY}"},
-            json=payload,
-            timeout=15,
-        )
-        if response.status_code in (200, 201):
-            logger.info("Resend email queued successfully to=%s", to_email)
-            return True
-        logger.error("Resend send failed: %s %s", response.status_code, response.text)
-        return False
-    except Exception as exc:
-        logger.error("Resend send exception: %s", exc)
-        return False
+    return _provider().send_one(
+        OutboundEmail(to_email=to_email, subject=subject, html=html, text=text, headers=headers)
+    )
+
+
+def _send_chunks(provider, chunks: List[List[OutboundEmail]]) -> List[str]:
+    """Run ``provider.send_chunk`` over ``chunks`` on the bounded worker pool."""
+    workers = min(len(chunks), _env_int("EMAIL_BATCH_CONCURRENCY", 2))
+    if workers <= 1:
+        return [provider.send_chunk(chunk) for chunk in chunks]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="email-batch") as pool:
+        return list(pool.map(provider.send_chunk, chunks))
+
+
+def send_batch(messages: List[OutboundEmail]) -> List[str]:
+    """Send ``messages`` in provider batches; returns one status per message.
+
+    Chunks of up to :data:`RESEND_BATCH_MAX` run on ``EMAIL_BATCH_CONCURRENCY``
+    workers (default 2, Resend's default rate limit is 2 req/s). Throttling
+    and 5xx responses are retried with backoff (``Retry-After`` honoured).
+    A 4xx rejects the whole chunk (one bad address is enough), so a rejected
+    chunk is re-sent as single-message chunks through the same pool and
+    retry path — only the bad addresses fail, and a throttled re-send is
+    reported as :data:`STATUS_RETRYABLE` rather than failed.
+    """
+    if not messages:
+        return []
+    provider = _provider()
+    size = min(RESEND_BATCH_MAX, _env_int("EMAIL_BATCH_SIZE", RESEND_BATCH_MAX))
+    chunks = [messages[i:i + size] for i in range(0, len(messages), size)]
+    outcomes = _send_chunks(provider, chunks)
+
+    statuses: List[str] = []
+    singles: List[int] = []
+    for chunk, outcome in zip(chunks, outcomes):
+        if outcome == STATUS_FAILED and len(chunk) > 1:
+            logger.info("Resend batch of %d rejected; retrying one by one", len(chunk))
+            singles.extend(range(len(statuses), len(statuses) + len(chunk)))
+        statuses.extend([outcome] * len(chunk))
+    if singles:
+        single_outcomes = _send_chunks(provider, [[messages[i]] for i in singles])
+        for i, outcome in zip(singles, single_outcomes):
+            statuses[i] = outcome
+    return statuses
@@ -91,9 +91,10 @@ def _fetch_to_temp(url: str, label: str) -> str:
 
 
 def _transcribe_openai(audio_file_path: str) -> Optional[Dict[str, Any]]:
-    from openai import OpenAI  # lazy
+    from backend.services.llm_clients import PROVIDER_OPENAI, get_llm_client
 
-    client = OpenAI(
+    client = get_llm_client(
+        PROVIDER_OPENAI,
         api_key=OPENAI_API_KEY,
         max_retries=_OPENAI_MAX_RETRIES,
         timeout=_OPENAI_TIMEOUT_SECONDS,
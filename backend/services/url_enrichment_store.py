@@ -0,0 +1,143 @@
+"""Community-wide store of text extracted from shared links.
+
+``steve_content_enrichment.enrich_shared_activity_for_profile`` fetches the
+article text / YouTube transcript / Whisper transcription of every link a
+member shared. The same link is routinely shared by many members, so the
+extraction result is kept here under the canonical URL (tracking params,
+fragment and ``www.`` dropped) in the shared ``redis_cache.cache``:
+
+- successes for ``STEVE_URL_ENRICH_TTL_SECONDS`` (default 7 days);
+- failures for ``STEVE_URL_ENRICH_FAILURE_TTL_SECONDS`` (default 1 hour), so a
+  dead link is not retried on every profile run but does recover.
+
+Concurrent extractions of the same URL within one process are collapsed:
+later callers wait for the first one and read its stored result.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+logger = logging.getLogger(__name__)
+
+STORE_TTL_SECONDS = int(os.getenv("STEVE_URL_ENRICH_TTL_SECONDS", str(7 * 24 * 3600)))
+FAILURE_TTL_SECONDS = int(os.getenv("STEVE_URL_ENRICH_FAILURE_TTL_SECONDS", "3600"))
+# How long a caller waits for another thread already extracting the same URL.
+INFLIGHT_WAIT_SECONDS = 60.0
+
+_KEY_PREFIX = "url_enrich:v1"
+_TRACKING_PARAMS = frozenset({"fbclid", "gclid", "igshid", "mc_cid", "mc_eid", "si", "feature"})
+
+_inflight: Dict[str, threading.Event] = {}
+_inflight_lock = threading.Lock()
+
+
+def canonical_url(url: str) -> str:
+    """Normalise ``url`` so trivially different shares of one link share a record."""
+    raw = (url or "").strip()
+    try:
+        p = urlparse(raw)
+    except Exception:
+        return raw
+    if not p.scheme or not p.netloc:
+        return raw
+    host = p.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(p.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    )
+    path = p.path.rstrip("/") or "/"
+    return urlunparse((p.scheme.lower(), host, path, "", urlencode(query), ""))
+
+
+def _key(url: str) -> str:
+    return f"{_KEY_PREFIX}:" + hashlib.sha256(canonical_url(url).encode("utf-8")).hexdigest()
+
+
+def _record_result(record: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    return record.get("text") or None, record.get("error") or None
+
+
+def lookup_many(urls: Iterable[str]) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+    """Stored ``(text, error)`` for each of ``urls`` that has a record (one cache round-trip)."""
+    from redis_cache import cache
+
+    by_key: Dict[str, str] = {}
+    for url in urls:
+        by_key.setdefault(_key(url), url)
+    if not by_key:
+        return {}
+    try:
+        found = cache.get_many(list(by_key))
+    except Exception as exc:
+        logger.debug("url enrichment store lookup failed: %s", exc)
+        return {}
+    return {
+        by_key[k]: _record_result(record)
+        for k, record in (found or {}).items()
+        if k in by_key and isinstance(record, dict)
+    }
+
+
+def store(url: str, kind: str, text: Optional[str], error: Optional[str]) -> None:
+    from redis_cache import cache
+
+    record = {
+        "url": canonical_url(url),
+        "kind": kind,
+        "text": text or "",
+        "error": error,
+        "fetched_at": int(time.time()),
+    }
+    ttl = FAILURE_TTL_SECONDS if (error or not text) else STORE_TTL_SECONDS
+    try:
+        cache.set(_key(url), record, ttl)
+    except Exception as exc:
+        logger.debug("url enrichment store write failed: %s", exc)
+
+
+def enrich(
+    url: str,
+    kind: str,
+    extract: Callable[[], Tuple[Optional[str], Optional[str]]],
+) -> Tuple[Optional[str], Optional[str]]:
+    """Stored result for ``url``, running ``extract() -> (text, error)`` on a miss."""
+    from redis_cache import cache
+
+    key = _key(url)
+    try:
+        record = cache.get(key)
+    except Exception:
+        record = None
+    if isinstance(record, dict):
+        return _record_result(record)
+
+    with _inflight_lock:
+        event = _inflight.get(key)
+        leader = event is None
+        if leader:
+            event = _inflight[key] = threading.Event()
+    if not leader:
+        event.wait(INFLIGHT_WAIT_SECONDS)
+        stored = lookup_many([url]).get(url)
+        if stored is not None:
+            return stored
+
+    try:
+        text, error = extract()
+        store(url, kind, text, error)
+        return text, error
+    finally:
+        if leader:
+            with _inflight_lock:
+                _inflight.pop(key, None)
+            event.set()
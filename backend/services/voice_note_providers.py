@@ -95,16 +95,18 @@ def is_account_level_error(exc: Exception) -> bool:
 
 
 def make_client(provider: str):
-    from openai import OpenAI  # lazy: keeps module importable without the SDK
+    from backend.services.llm_clients import PROVIDER_OPENAI, PROVIDER_XAI, get_llm_client
 
     if provider == "openai":
-        return OpenAI(
+        return get_llm_client(
+            PROVIDER_OPENAI,
             api_key=OPENAI_API_KEY,
             max_retries=_MAX_RETRIES,
             timeout=_REQUEST_TIMEOUT_SECONDS,
         )
     if provider == "xai":
-        return OpenAI(
+        return get_llm_client(
+            PROVIDER_XAI,
             api_key=XAI_API_KEY,
             base_url=XAI_BASE_URL,
             max_retries=_MAX_RETRIES,
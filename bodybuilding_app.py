@@ -2,6 +2,7 @@ from flask import Flask, render_template, request, jsonify, redirect, url_for, s
 from collections import deque, defaultdict
 # from flask_wtf.csrf import CSRFProtect, generate_csrf, validate_csrf as wtf_validate_csrf
 import errno
+import importlib.util
 import os
 import sys
 import json
@@ -48,6 +49,7 @@ from backend.services.database import USE_MYSQL, get_db_connection, get_sql_plac
 from backend.services.user_activity_tables import ensure_user_activity_tables, record_community_feed_visit
 from backend.services.admin_metrics import compute_admin_metrics
 from backend.services.dm_chats_tables import ensure_archived_chats_table
+from backend.services.llm_clients import PROVIDER_XAI, get_llm_client
 from backend.services import ai_usage as _ai_usage
 from backend.services import api_errors as _api_errors
 from backend.services import template_i18n as _template_i18n
@@ -76,6 +78,7 @@ from backend.services.group_feed_access import (
     fetch_group_id_for_group_reply,
 )
 from backend.services.group_post_views import count_group_post_views_excluding_admin
+from backend.services.community_unread import note_post_created, note_post_deleted
 from backend.services.post_views import (
     ensure_post_views_table,
     upsert_post_view,
@@ -128,13 +131,12 @@ except ImportError:
     PIL_AVAILABLE = False
     print("Warning: PIL not available, image optimization disabled")
 
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-    print("OK OpenAI package imported successfully")
-except ImportError as e:
-    OPENAI_AVAILABLE = False
-    print(f"ERROR OpenAI not available: {e}")
+# Clients come from the LLM client registry; only the SDK's presence is checked here.
+OPENAI_AVAILABLE = importlib.util.find_spec("openai") is not None
+if OPENAI_AVAILABLE:
+    print("OK OpenAI package available")
+else:
+    print("ERROR OpenAI not available")
     print("   Run: pip install openai")
 
 # Hosted Grok Responses API: feed attaches web_search / x_search via steve_tool_policy (KB feed_attach_* kill-switches only).
@@ -717,6 +719,7 @@ app.config['PREFERRED_URL_SCHEME'] = 'https'
 def api_giphy_search():
     """Server-side Giphy proxy - keeps API key server-only."""
     import requests as _requests
+    from backend.services.feature_flags import outbound_http_cache_enabled
     key = os.environ.get('GIPHY_API_KEY') or os.environ.get('VITE_GIPHY_API_KEY')
     if not key:
         return jsonify({'success': False, 'error': 'Giphy not configured'}), 503
@@ -732,7 +735,16 @@ def api_giphy_search():
             if not q:
                 return jsonify({'data': []})
             url = f'https://api.giphy.com/v1/gifs/search?api_key={key}&q={q}&limit={limit}&offset={offset}&rating={rating}'
-        resp = _requests.get(url, timeout=10)
+        if outbound_http_cache_enabled():
+            from backend.services import outbound_http
+
+            # Trending shifts through the day; search results for a term barely move.
+            resp = outbound_http.fetch(url, ttl=300 if endpoint == 'trending' else 3600, timeout=10)
+            if resp.error and not resp.text:
+                logger.warning("Giphy upstream failed: %s", resp.error)
+                return jsonify({'data': [], 'error': 'Giphy request failed'}), 502
+        else:
+            resp = _requests.get(url, timeout=10)
         payload = resp.json()
         if resp.status_code >= 400:
             logger.warning(
@@ -1684,7 +1696,7 @@ def add_user_to_community(cursor, user_id: int, community_id: int, role: Optiona
     # the same transaction/cursor snapshot.
     try:
         invalidate_dashboard_caches_for_community_subtree(
-            int(community_id), cursor=cursor
+            int(community_id), cursor=cursor, member_username=username
         )
     except Exception as subtree_exc:
         logger.warning(
@@ -4335,6 +4347,19 @@ def _deferred_startup_init():
             except Exception:
                 logger.exception("Background: ensure_group_poll_tables failed")
         
+        # 2b. Versioned migrations: once schema_migrations reaches
+        #     SCHEMA_VERSION, gated ensure_* helpers stop probing DDL per request.
+        #     SCHEMA_MIGRATE_ON_STARTUP=false when the deploy step runs them.
+        try:
+            from backend.services.feature_flags import is_enabled as _flag_on
+            from backend.services.schema_migrations import apply_migrations
+
+            if _flag_on("SCHEMA_MIGRATE_ON_STARTUP", default=True):
+                _migrations = apply_migrations()
+                logger.info(f"Background: schema migrations {_migrations}")
+        except Exception:
+            logger.exception("Background: schema migrations failed")
+
         # 3. Phase 2: ensure tenants table
         try:
             _ensure_tenants_table()
@@ -7968,8 +7993,7 @@ def _analyze_profile_with_grok(
         logger.warning("XAI_API_KEY not set, skipping profile analysis")
         return {}
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=XAI_API_KEY, base_url="https://api.x.ai/v1")
+        client = get_llm_client(PROVIDER_XAI, api_key=XAI_API_KEY)
         today_str = datetime.utcnow().strftime('%Y-%m-%d')
 
         # Founder awareness is now handled consistently at BOTH individual profile
@@ -13176,8 +13200,7 @@ def api_networking_steve_match():
                 return jsonify({'success': True, 'response': _fast_text})
 
             retrieval_policy = networking_policy_for_size(len(all_member_usernames))
-            from openai import OpenAI
-            client = OpenAI(api_key=XAI_API_KEY, base_url="https://api.x.ai/v1")
+            client = get_llm_client(PROVIDER_XAI, api_key=XAI_API_KEY)
 
             planner_diagnostics = {}
             query_plan = plan_networking_query(
@@ -13621,8 +13644,7 @@ def api_networking_steve_auto_match():
                 hierarchy_ctx += f"\nSub-communities (cohorts): {', '.join(sub_names)}"
             hierarchy_ctx += f"\n\nSCOPE: Recommendations MUST span the ENTIRE parent network \"{parent_name}\" — consider all members across every cohort/sub-community equally. A shared sub-community is only a minor bonus, never a primary matching reason."
 
-        from openai import OpenAI
-        client = OpenAI(api_key=XAI_API_KEY, base_url="https://api.x.ai/v1")
+        client = get_llm_client(PROVIDER_XAI, api_key=XAI_API_KEY)
         auto_input = [
             {"role": "system", "content": f"""You are Steve, a friendly and helpful networking assistant inside a private professional network. You speak like a knowledgeable friend — warm, concise, and natural. Never sound like a database or a computer.
 
@@ -15787,10 +15809,37 @@ def post_status():
             # Serialize media_paths to JSON if we have multiple media
             media_paths_json = json.dumps(media_paths) if media_paths else None
             
+            from backend.services.feature_flags import message_outbox_enabled
+            use_outbox = message_outbox_enabled()
+            if use_outbox:
+                from backend.services.database import begin_transaction
+                from backend.services.message_outbox import ensure_message_outbox_table
+                # Post, unread marks and outbox rows commit together.
+                ensure_message_outbox_table()
+                begin_transaction(conn)
             c.execute("INSERT INTO posts (username, content, image_path, video_path, audio_path, audio_summary, timestamp, community_id, media_paths, link_urls) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
                       (username, content_clean, image_path, video_path, audio_path, audio_summary, timestamp, community_id, media_paths_json, link_urls_json))
-            conn.commit()
             post_id = c.lastrowid
+            note_post_created(c, community_id, post_id, username)
+            use_outbox = use_outbox and bool(post_id)
+            if use_outbox:
+                from backend.services.message_outbox import KIND_POST_NOTIFY, enqueue_outbox_events, firestore_event
+                enqueue_outbox_events(c, [
+                    (KIND_POST_NOTIFY, {"post_id": post_id, "community_id": community_id,
+                                        "author": username, "content": content_clean or ""}),
+                    firestore_event(
+                        "post", post_id=post_id, username=username, content=content_clean,
+                        community_id=community_id, image_path=image_path, video_path=video_path,
+                        audio_path=audio_path, audio_summary=audio_summary,
+                        media_paths=media_paths if media_paths else None,
+                        link_urls=json.loads(link_urls_json) if link_urls_json else None,
+                        timestamp=timestamp,
+                    ),
+                ])
+            conn.commit()
+            if use_outbox:
+                from backend.services.message_outbox import kick_outbox_dispatcher
+                kick_outbox_dispatcher()
             if community_id:
                 try:
                     from backend.services import media_assets
@@ -15810,20 +15859,21 @@ def post_status():
                     logger.warning(f"post media asset registration failed: {asset_err}")
             logger.info(f"Post added successfully for {username} with ID: {post_id} in community: {community_id}")
 
-            # Dual-write post to Firestore
-            try:
-                from backend.services.firestore_writes import write_post
-                link_urls_for_fs = None
-                if link_urls_json:
-                    try:
-                        link_urls_for_fs = json.loads(link_urls_json)
-                    except Exception:
-                        link_urls_for_fs = None
-                write_post(post_id=post_id, username=username, content=content_clean, community_id=community_id,
-                          image_path=image_path, video_path=video_path, audio_path=audio_path, audio_summary=audio_summary,
-                          media_paths=media_paths if media_paths else None, link_urls=link_urls_for_fs)
-            except Exception:
-                pass
+            # Dual-write post to Firestore (outbox mode already enqueued it)
+            if not use_outbox:
+                try:
+                    from backend.services.firestore_writes import write_post
+                    link_urls_for_fs = None
+                    if link_urls_json:
+                        try:
+                            link_urls_for_fs = json.loads(link_urls_json)
+                        except Exception:
+                            link_urls_for_fs = None
+                    write_post(post_id=post_id, username=username, content=content_clean, community_id=community_id,
+                              image_path=image_path, video_path=video_path, audio_path=audio_path, audio_summary=audio_summary,
+                              media_paths=media_paths if media_paths else None, link_urls=link_urls_for_fs)
+                except Exception:
+                    pass
             try:
                 from backend.services.steve_profiling_snapshot import (
                     schedule_steve_profiling_snapshot_refresh,
@@ -15901,15 +15951,16 @@ def post_status():
                 logger.warning(f"Steve mention check error: {steve_check_err}")
 
             # Notify community members (excluding creator) - push + in-app notification row
-            try:
-                fanout_community_post_notifications(
-                    community_id=community_id,
-                    post_id=post_id,
-                    author_username=username,
-                    content=content_clean or "",
-                )
-            except Exception as notify_err:
-                logger.warning(f"community notify block error: {notify_err}")
+            if not use_outbox:
+                try:
+                    fanout_community_post_notifications(
+                        community_id=community_id,
+                        post_id=post_id,
+                        author_username=username,
+                        content=content_clean or "",
+                    )
+                except Exception as notify_err:
+                    logger.warning(f"community notify block error: {notify_err}")
         
         # Invalidate community feed cache so new post shows immediately
         if community_id:
@@ -16318,6 +16369,7 @@ def create_poll():
             c.execute("INSERT INTO posts (username, content, image_path, timestamp, community_id) VALUES (?, ?, ?, ?, ?)",
                       (username, content, None, timestamp, community_id))
             post_id = c.lastrowid
+            note_post_created(c, community_id, post_id, username)
             
             # Auto-flag content if it contains objectionable material (Apple App Store requirement)
             try:
@@ -16343,6 +16395,11 @@ def create_poll():
                 c.execute("INSERT INTO polls (post_id, question, created_by, created_at, single_vote) VALUES (?, ?, ?, ?, ?)",
                           (post_id, question, username, timestamp, single_vote))
             poll_id = c.lastrowid
+            try:
+                from backend.services.scheduled_work import schedule_poll_reminders
+                schedule_poll_reminders(c, poll_id)
+            except Exception as sched_err:
+                logger.warning(f"Poll {poll_id} reminder scheduling failed: {sched_err}")
             
             # Create poll options
             for option_text in options:
@@ -16668,6 +16725,11 @@ def edit_poll():
             except Exception:
                 # Fallback for schemas without expires_at column
                 c.execute("UPDATE polls SET question = ? WHERE id = ?", (question, poll_id))
+            try:
+                from backend.services.scheduled_work import schedule_poll_reminders
+                schedule_poll_reminders(c, poll_id)
+            except Exception as sched_err:
+                logger.warning(f"Poll {poll_id} reminder scheduling failed: {sched_err}")
             
             # Get existing options
             c.execute("SELECT id, option_text FROM poll_options WHERE poll_id = ? ORDER BY id", (poll_id,))
@@ -17197,6 +17259,7 @@ def delete_poll():
             # Also delete the associated post to completely remove the poll
             # Polls should be independent - deleting a poll removes everything
             c.execute("DELETE FROM posts WHERE id=?", (pr['post_id'],))
+            note_post_deleted(c, community_id, pr['post_id'], created_by)
             conn.commit()
             try:
                 from backend.services.post_detail_cache import invalidate_post_detail
@@ -18065,6 +18128,7 @@ def delete_community_post(post_id):
             
             # Delete the post
             c.execute("DELETE FROM posts WHERE id = ?", (post_id,))
+            note_post_deleted(c, post['community_id'], post_id, post['username'])
             conn.commit()
             
             return jsonify(_api_errors.success_payload('feed.post_deleted'))
@@ -19079,7 +19143,14 @@ def report_post():
     # Flood guard: reporting is deduped per (post, reporter) but was otherwise
     # unlimited. Generous window — a legitimate member never hits this.
     from backend.services import rate_limit as _rate_limit
-    if not _rate_limit.allow('report_post', username, max_events=15, window_seconds=3600):
+    from backend.services.feature_flags import rate_limit_sliding_window_enabled
+    if rate_limit_sliding_window_enabled():
+        rl = _rate_limit.check('report_post', username, max_events=15, window_seconds=3600)
+        if not rl.allowed:
+            resp, status = _api_errors.error_response('feed.report_rate_limited', 429)
+            resp.headers.update(rl.headers())
+            return resp, status
+    elif not _rate_limit.allow('report_post', username, max_events=15, window_seconds=3600):
         return _api_errors.error_response('feed.report_rate_limited', 429)
 
     try:
@@ -20937,7 +21008,7 @@ def trigger_steve_reply_to_post(post_id: int, post_content: str, author_username
                     _steve_tool_names_for_log(_feed_tools),
                     ai_personality,
                 )
-                client = OpenAI(api_key=XAI_API_KEY, base_url="https://api.x.ai/v1")
+                client = get_llm_client(PROVIDER_XAI, api_key=XAI_API_KEY)
                 
                 # Build user content - include images if present (Grok supports vision).
                 # xAI only downloads jpeg/png/webp/ico — a gif/svg/octet-stream URL 400s the whole call.
@@ -21345,7 +21416,7 @@ def _steve_ai_reply_for_group_post(
         system_prompt += mention_apx
     system_prompt = append_response_policy(system_prompt, user_message, surface=_ai_usage.SURFACE_GROUP)
     model_to_use = steve_config.model
-    client = OpenAI(api_key=XAI_API_KEY, base_url="https://api.x.ai/v1")
+    client = get_llm_client(PROVIDER_XAI, api_key=XAI_API_KEY)
     # xAI only downloads jpeg/png/webp/ico — a gif/svg/octet-stream URL 400s the whole call.
     from backend.services.steve_chat_images import (
         create_response_with_image_fallback,
@@ -22213,7 +22284,7 @@ def ai_steve_reply():
                     _steve_tool_names_for_log(_reply_tools),
                     ai_personality,
                 )
-                client = OpenAI(api_key=XAI_API_KEY, base_url="https://api.x.ai/v1")
+                client = get_llm_client(PROVIDER_XAI, api_key=XAI_API_KEY)
                 
                 # Build user content - include images if present (Grok supports vision).
                 # xAI only downloads jpeg/png/webp/ico — a gif/svg/octet-stream URL 400s the whole call.
@@ -24601,6 +24672,11 @@ def serve_uploads(filename):
 def api_community_feed(community_id):
     """JSON API for community feed data (posts, polls, replies, reactions)."""
     username = session.get('username')
+    from backend.services.feature_flags import community_feed_shared_payload_enabled
+    if community_feed_shared_payload_enabled():
+        from backend.services.community_feed_payload import read_community_feed
+        body, status = read_community_feed(community_id, username)
+        return jsonify(body), status
     cache_key = community_feed_user_cache_key(community_id, username or '')
     if cache_key:
         cached_response = cache.get(cache_key)
@@ -31859,6 +31935,11 @@ def api_set_typing():
         is_typing = 1 if data.get('is_typing') else 0
         if not peer:
             return jsonify({ 'success': False, 'error': 'peer required' }), 400
+        from backend.services.feature_flags import cache_presence_enabled
+        if cache_presence_enabled():
+            from backend.services import presence
+            presence.set_typing(me, peer, bool(is_typing))
+            return jsonify({ 'success': True })
         now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         with get_db_connection() as conn:
             c = conn.cursor()
@@ -31882,6 +31963,10 @@ def api_get_typing():
         peer = (request.args.get('peer') or '').strip()
         if not peer:
             return jsonify({ 'success': False, 'error': 'peer required' }), 400
+        from backend.services.feature_flags import cache_presence_enabled
+        if cache_presence_enabled():
+            from backend.services import presence
+            return jsonify({ 'success': True, 'is_typing': presence.is_typing(peer, me) })
         with get_db_connection() as conn:
             c = conn.cursor()
             c.execute("SELECT is_typing, updated_at FROM typing_status WHERE user=? AND peer=?", (peer, me))
@@ -32563,6 +32648,9 @@ def cron_kb_weekly_synthesis():
       ``dry_run`` (``1``/``true``) — list candidates, don't synthesize.
       ``bucket`` — override the computed day-of-week bucket (0..6).
       ``window_days`` — override the active-window size.
+      ``force`` — ignore input fingerprints and re-synthesize everyone.
+      ``wait`` — run the sweep inline and return skipped / synthesized /
+      failed counts and ``cost_usd`` (default: background, summary logged).
     """
     expected = os.environ.get('CRON_SHARED_SECRET') or ''
     provided = request.headers.get('X-Cron-Secret') or ''
@@ -32595,7 +32683,9 @@ def cron_kb_weekly_synthesis():
         from backend.services.steve_knowledge_base import (
             USE_KNOWLEDGE_BASE_V1,
             get_active_usernames_for_kb_sweep,
-            schedule_knowledge_synthesis,
+            last_kb_weekly_sweep_summary,
+            run_kb_weekly_sweep,
+            schedule_kb_weekly_sweep,
         )
         if not USE_KNOWLEDGE_BASE_V1:
             return jsonify({
@@ -32623,23 +32713,32 @@ def cron_kb_weekly_synthesis():
                 'dispatched': 0,
             })
 
-        dispatched = 0
-        for u in usernames:
-            try:
-                schedule_knowledge_synthesis(u)
-                dispatched += 1
-            except Exception as disp_err:
-                logger.warning("KB weekly dispatch failed for %s: %s", u, disp_err)
+        force = (request.args.get('force') or '').strip().lower() in {'1', 'true', 'yes', 'on'}
+        if (request.args.get('wait') or '').strip().lower() in {'1', 'true', 'yes', 'on'}:
+            summary = run_kb_weekly_sweep(usernames, force=force)
+            return jsonify({
+                'success': True,
+                'bucket': bucket,
+                'candidate_count': len(usernames),
+                'dispatched': len(usernames),
+                **summary,
+            })
 
+        # Unchanged members are skipped by fingerprint inside the sweep; the
+        # rest run on a bounded pool. Counts and cost land in the logs and in
+        # ``previous_run`` on the next call.
+        previous_run = last_kb_weekly_sweep_summary()
+        schedule_kb_weekly_sweep(usernames, force=force)
         logger.info(
-            "KB weekly synthesis: dispatched %d/%d for bucket %d (window=%s)",
-            dispatched, len(usernames), bucket, window_days,
+            "KB weekly synthesis: sweep dispatched for %d users in bucket %d (window=%s)",
+            len(usernames), bucket, window_days,
         )
         return jsonify({
             'success': True,
             'bucket': bucket,
             'candidate_count': len(usernames),
-            'dispatched': dispatched,
+            'dispatched': len(usernames),
+            'previous_run': previous_run,
         })
     except Exception as e:
         logger.exception("KB weekly synthesis error: %s", e)
@@ -32897,10 +32996,7 @@ Return ONLY valid JSON matching this schema:
   ]
 }}"""
 
-        client = OpenAI(
-            api_key=XAI_API_KEY,
-            base_url="https://api.x.ai/v1"
-        )
+        client = get_llm_client(PROVIDER_XAI, api_key=XAI_API_KEY)
 
         completion = client.chat.completions.create(
             model=GROK_MODEL_FAST,
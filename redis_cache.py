@@ -81,6 +81,64 @@ POST_DETAIL_CACHE_VERSION = os.environ.get('POST_DETAIL_CACHE_VERSION', 'v2')
 MAX_CACHE_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', '10000'))
 CLEANUP_INTERVAL = int(os.environ.get('CACHE_CLEANUP_INTERVAL', '100'))
 
+# Sliding-window log: one entry (score = epoch ms) per admitted unit, kept for
+# ``period_ms``. A request is admitted only while the entries still inside the
+# window plus ``quantity`` fit in ``limit``, so no window of ``period_ms`` ever
+# holds more than ``limit`` units. ``hold_ms`` scores the new entries that far in
+# the future (used for leased units spent later by the caller). Memory is one
+# entry per unit, so this is meant for per-identity limits in the hundreds, not
+# high-volume counters. Returns (allowed, remaining, retry_after_ms,
+# reset_after_ms, live_entries).
+def _sliding_window_step(entries, now_ms, limit, period_ms, quantity, hold_ms=0):
+    live = sorted(s for s in (entries or ()) if s >= now_ms - period_ms)
+    count = len(live)
+    if count + quantity > limit:
+        if quantity <= limit:
+            retry_ms = live[count + quantity - limit - 1] + period_ms + 1 - now_ms
+        else:
+            retry_ms = period_ms
+        reset_ms = live[-1] + period_ms + 1 - now_ms if live else 0
+        return False, max(0, limit - count), int(max(1, retry_ms)), int(max(0, reset_ms)), live
+    live.extend([now_ms + hold_ms] * quantity)
+    live.sort()
+    return True, limit - count - quantity, 0, int(live[-1] + period_ms + 1 - now_ms), live
+
+
+# Same step as _sliding_window_step, evaluated atomically in Redis (a ZSET per
+# key) on the server clock. Members are "<now>-<index>", unique because the
+# count only grows within one millisecond.
+_SLIDING_WINDOW_LUA = """
+if redis.replicate_commands then redis.replicate_commands() end
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local limit = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local qty = tonumber(ARGV[3])
+local hold = tonumber(ARGV[4])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', '(' .. (now - period))
+local count = redis.call('ZCARD', KEYS[1])
+if count + qty > limit then
+  local retry = period
+  if qty <= limit then
+    local idx = count + qty - limit - 1
+    local oldest = redis.call('ZRANGE', KEYS[1], idx, idx, 'WITHSCORES')
+    retry = tonumber(oldest[2]) + period + 1 - now
+  end
+  local reset = 0
+  local newest = redis.call('ZRANGE', KEYS[1], -1, -1, 'WITHSCORES')
+  if newest[2] then reset = tonumber(newest[2]) + period + 1 - now end
+  return {0, math.max(0, limit - count), math.max(1, retry), math.max(0, reset)}
+end
+for i = 1, qty do
+  redis.call('ZADD', KEYS[1], now + hold, now .. '-' .. (count + i))
+end
+local newest = redis.call('ZRANGE', KEYS[1], -1, -1, 'WITHSCORES')
+local reset = tonumber(newest[2]) + period + 1 - now
+redis.call('PEXPIRE', KEYS[1], reset)
+return {1, limit - count - qty, 0, reset}
+"""
+
+
 class MemoryCache:
     """In-memory cache with TTL support for Cloud Run"""
     def __init__(self):
@@ -116,6 +174,18 @@ class MemoryCache:
             
             return None
     
+    def get_many(self, keys):
+        """Values for the live ``keys`` (missing / expired keys are omitted)."""
+        if not self.enabled:
+            return {}
+        now = time.time()
+        with self.lock:
+            return {
+                key: self.cache[key]
+                for key in keys
+                if key in self.cache and self.expiry.get(key, 0) > now
+            }
+
     def set(self, key, value, ttl=DEFAULT_CACHE_TTL):
         """Set value in cache with TTL"""
         if not self.enabled:
@@ -156,6 +226,26 @@ class MemoryCache:
             self.expiry[key] = time.time() + ttl
             return current
     
+    def sliding_window(self, key, limit, period_ms, quantity=1, hold_ms=0):
+        """Spend ``quantity`` from a sliding window of ``limit`` per ``period_ms``.
+
+        Returns ``(allowed, remaining, retry_after_ms, reset_after_ms)``, or
+        ``None`` when the cache is disabled.
+        """
+        if not self.enabled:
+            return None
+
+        with self.lock:
+            now_ms = int(time.time() * 1000)
+            entries = self.cache.get(key) if self.expiry.get(key, 0) > time.time() else None
+            allowed, remaining, retry_ms, reset_ms, live = _sliding_window_step(
+                entries, now_ms, limit, period_ms, quantity, hold_ms
+            )
+            if allowed:
+                self.cache[key] = live
+                self.expiry[key] = time.time() + reset_ms / 1000.0
+            return allowed, remaining, retry_ms, reset_ms
+
     def delete(self, key):
         """Delete key from cache"""
         if not self.enabled:
@@ -295,6 +385,19 @@ class RedisCache:
             logger.warning(f"Redis get error for key {key}: {e}")
             return None
     
+    def get_many(self, keys):
+        """One MGET for ``keys``; missing keys are omitted from the result."""
+        keys = list(keys)
+        if not keys or not self._ensure_connected():
+            return {}
+
+        try:
+            values = self.redis_client.mget(keys)
+            return {key: json.loads(value) for key, value in zip(keys, values) if value}
+        except Exception as e:
+            logger.warning(f"Redis mget error for {len(keys)} keys: {e}")
+            return {}
+
     def set(self, key, value, ttl=DEFAULT_CACHE_TTL):
         """Set value in cache with TTL"""
         if not self._ensure_connected():
@@ -323,6 +426,28 @@ class RedisCache:
             logger.warning(f"Redis incr error for key {key}: {e}")
             return None
     
+    def sliding_window(self, key, limit, period_ms, quantity=1, hold_ms=0):
+        """Spend ``quantity`` from a sliding window in one server-side script call.
+
+        Returns ``(allowed, remaining, retry_after_ms, reset_after_ms)``, or
+        ``None`` when Redis is unavailable.
+        """
+        if not self._ensure_connected():
+            return None
+
+        try:
+            if getattr(self, "_sliding_window_script", None) is None:
+                self._sliding_window_script = self.redis_client.register_script(_SLIDING_WINDOW_LUA)
+            allowed, remaining, retry_ms, reset_ms = self._sliding_window_script(
+                keys=[key],
+                args=[int(limit), int(period_ms), int(quantity), int(hold_ms)],
+                client=self.redis_client,
+            )
+            return bool(int(allowed)), int(remaining), int(retry_ms), int(reset_ms)
+        except Exception as e:
+            logger.warning(f"Redis sliding_window error for key {key}: {e}")
+            return None
+
     def delete(self, key):
         """Delete key from cache"""
         if not self._ensure_connected():
@@ -442,6 +567,10 @@ def steve_dm_typing_key(viewer, peer):
     """Viewer-specific Steve typing indicator key for 1:1 DM threads."""
     return f"steve_dm_typing:{viewer}:{peer}"
 
+def steve_dm_stream_key(viewer, peer):
+    """Viewer-specific partial-text state for a streaming Steve DM reply."""
+    return f"steve_dm_stream:{viewer}:{peer}"
+
 def steve_dm_inflight_key(user_a, user_b):
     """Single in-flight Steve DM turn per sorted human pair (direct Steve or @Steve in peer DM)."""
     pair = sorted([(user_a or "").lower(), (user_b or "").lower()])
@@ -450,6 +579,33 @@ def steve_dm_inflight_key(user_a, user_b):
 def steve_group_typing_key(group_id):
     return f"steve_group_typing:{group_id}"
 
+def chat_window_dm_key(user_a, user_b):
+    """Shared recent-message window for one DM pair (viewer-independent)."""
+    pair = sorted([(user_a or "").lower(), (user_b or "").lower()])
+    return f"chat_window:dm:{pair[0]}:{pair[1]}"
+
+def chat_window_dm_seq_key(user_a, user_b):
+    """Write counter the DM window must match to be served."""
+    pair = sorted([(user_a or "").lower(), (user_b or "").lower()])
+    return f"chat_window_seq:dm:{pair[0]}:{pair[1]}"
+
+def chat_window_group_key(group_id):
+    return f"chat_window:group:{int(group_id)}"
+
+def chat_window_group_seq_key(group_id):
+    return f"chat_window_seq:group:{int(group_id)}"
+
+def user_id_username_key(user_id):
+    return f"user_id_username:{user_id}"
+
+def steve_tool_router_decision_key(text_hash):
+    """Cached hosted-tool router flags for one normalized message."""
+    return f"steve_tool_router:decision:{text_hash}"
+
+def steve_tool_router_model_key():
+    """Trained local tool-router classifier shared across instances."""
+    return "steve_tool_router:model:v1"
+
 def community_feed_cache_key(community_id, page=1):
     return f"community_feed:{community_id}:page:{page}"
 
@@ -459,9 +615,33 @@ def user_communities_cache_key(username):
 def community_feed_user_cache_key(community_id, username):
     return f"community_feed:{community_id}:user:{username}"
 
+def community_feed_version_key(community_id):
+    """Write counter for a community's shared feed payload (bumped, never deleted)."""
+    return f"community_feed_version:{community_id}"
+
+def community_feed_shared_key(community_id, version):
+    """Viewer-independent feed payload for one version of a community."""
+    return f"community_feed_shared:{community_id}:v{int(version)}"
+
 def user_parent_dashboard_cache_key(username):
     return f"user_parent_dashboard:{username}"
 
+def dashboard_root_summary_key(root_id):
+    """Shared dashboard summary (counts, last activity, tree) for one root network."""
+    return f"dashboard_root_summary:{int(root_id)}"
+
+def community_root_key(community_id):
+    """Root network a community was last summarised under."""
+    return f"community_root:{int(community_id)}"
+
+def story_tray_snapshot_key(community_id):
+    """Viewer-independent story tray (active stories + reactions) for one community."""
+    return f"story_tray:{int(community_id)}"
+
+def story_seen_key(username, community_id):
+    """Story ids one viewer has seen in one community's tray."""
+    return f"story_seen:{int(community_id)}:{(username or '').lower()}"
+
 
 # --- Post detail cache keys (viewer-scoped, versioned) -----------------------
 
@@ -475,6 +655,11 @@ def post_detail_group_cache_key(post_id, viewer):
     return f"post_detail:{POST_DETAIL_CACHE_VERSION}:group:{int(post_id)}:viewer:{(viewer or '_anon').lower()}"
 
 
+def post_detail_community_shared_key(post_id):
+    """Viewer-independent part of a community post detail, shared by every viewer."""
+    return f"post_detail:{POST_DETAIL_CACHE_VERSION}:community:{int(post_id)}:shared"
+
+
 def post_detail_community_cache_pattern(post_id):
     """Wildcard pattern for invalidating every viewer of one community post."""
     return f"post_detail:{POST_DETAIL_CACHE_VERSION}:community:{int(post_id)}:viewer:*"
@@ -545,11 +730,33 @@ def invalidate_community_cache(community_id):
     """Invalidate community-related cache"""
     cache.delete(community_cache_key(community_id))
     cache.delete(community_members_cache_key(community_id))
-    cache.delete_pattern(f"community_feed:{community_id}:*")
+    try:
+        from backend.services.community_feed_payload import bump_community_feed_version
+        from backend.services.feature_flags import community_feed_shared_payload_enabled
+
+        bump_community_feed_version(community_id)
+        shared_feed = community_feed_shared_payload_enabled()
+    except Exception as e:
+        logger.warning(f"community feed version bump failed for {community_id}: {e}")
+        shared_feed = False
+    if not shared_feed:
+        # Per-viewer feed keys only exist when the shared payload is off.
+        cache.delete_pattern(f"community_feed:{community_id}:*")
+    try:
+        from backend.services.community_dashboard_summary import drop_root_summary_for_community
+
+        drop_root_summary_for_community(community_id)
+    except Exception as e:
+        logger.warning(f"dashboard root summary drop failed for {community_id}: {e}")
     logger.debug(f"🗑️ Invalidated community cache: {community_id}")
 
-def invalidate_message_cache(username1, username2):
-    """Invalidate message cache between two users"""
+def invalidate_message_cache(username1, username2, message_ids=None):
+    """Invalidate message cache between two users.
+
+    The pair's shared recent-message window is synced in place rather than
+    dropped: new rows are appended and ``message_ids`` (edited / deleted rows)
+    are re-read.
+    """
     # Symmetric thread cache
     cache.delete(messages_cache_key(username1, username2))
     # Viewer-specific message lists (avoid stale 'sent' perspective)
@@ -558,6 +765,11 @@ def invalidate_message_cache(username1, username2):
     # Thread lists
     cache.delete(chat_threads_cache_key(username1))
     cache.delete(chat_threads_cache_key(username2))
+    try:
+        from backend.services.chat_recent_window import sync_dm_window
+        sync_dm_window(username1, username2, message_ids=message_ids)
+    except Exception as e:
+        logger.warning(f"DM recent window sync failed for {username1} ↔ {username2}: {e}")
     logger.debug(f"🗑️ Invalidated message cache: {username1} ↔ {username2}")
 
 # Performance monitoring
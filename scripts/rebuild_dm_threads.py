@@ -0,0 +1,70 @@
+"""Rebuild or verify the ``dm_threads`` summary behind /api/chat_threads.
+
+Usage:
+    python scripts/rebuild_dm_threads.py --user alice
+    python scripts/rebuild_dm_threads.py --all --batch 500
+    python scripts/rebuild_dm_threads.py --verify --user alice
+    python scripts/rebuild_dm_threads.py --verify --all
+
+Run ``--all`` once before enabling ``DM_THREADS_SUMMARY_READS``; write paths
+keep the table current afterwards. ``--verify`` exits non-zero on any drift.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.services.dm_thread_summary import (
+    iter_dm_usernames,
+    rebuild_dm_threads,
+    verify_dm_threads_for_user,
+)
+
+
+def _usernames(args) -> list[str]:
+    if args.user:
+        return list(args.user)
+    out: list[str] = []
+    after = ""
+    while True:
+        page = iter_dm_usernames(after=after, limit=max(1, args.batch))
+        if not page:
+            return out
+        out.extend(page)
+        after = page[-1]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Rebuild / verify the dm_threads summary table.")
+    parser.add_argument("--user", action="append", help="Username to process (repeatable).")
+    parser.add_argument("--all", action="store_true", help="Process every username that appears in messages.")
+    parser.add_argument("--batch", type=int, default=500, help="Usernames per page when scanning --all.")
+    parser.add_argument("--verify", action="store_true", help="Compare stored rows to messages; do not write.")
+    args = parser.parse_args()
+    if not args.user and not args.all:
+        parser.error("pass --user NAME or --all")
+
+    usernames = _usernames(args)
+    if args.verify:
+        drift = {}
+        for username in usernames:
+            mismatches = verify_dm_threads_for_user(username)
+            if mismatches:
+                drift[username] = mismatches
+        print(json.dumps({"users": len(usernames), "drifted": drift}, indent=2, sort_keys=True, default=str))
+        return 0 if not drift else 1
+
+    result = rebuild_dm_threads(usernames)
+    print(json.dumps(result, indent=2, sort_keys=True, default=str))
+    return 0 if not result.get("failed") else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
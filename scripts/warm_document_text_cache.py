@@ -0,0 +1,35 @@
+"""Extract and cache PDF text for existing useful_docs rows.
+
+Usage:
+    python scripts/warm_document_text_cache.py --limit 500
+
+Records land in the local cache directory and in R2 (when enabled), so
+later Steve turns and document-memory indexing reuse them without parsing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.services.document_text_cache import warm_useful_docs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Warm the extracted-text cache from useful_docs.")
+    parser.add_argument("--limit", type=int, default=500, help="Maximum useful_docs rows to scan (newest first).")
+    args = parser.parse_args()
+
+    result = warm_useful_docs(limit=max(1, args.limit))
+    print(json.dumps(result, indent=2, sort_keys=True, default=str))
+    return 0 if int(result.get("failed") or 0) == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -14,8 +14,20 @@ judge as an unreadably narrow strip.
 Design notes:
 - **Private service** — every request must carry the shared secret (mirrors the
   `/api/cron/*` `X-Cron-Secret` pattern). Fails closed if no secret is set.
-- **Stateless, fresh browser per request** — build volume is low and async, so
-  the ~1s launch cost is worth the crash isolation (no shared-browser zombies).
+- **Warm browser pool, fresh context per request** — `RENDER_POOL_SIZE` worker
+  threads each own a pre-launched Chromium and render every request in a new,
+  isolated browser context (no shared cookies, storage or cache between
+  renders). A worker relaunches its browser after `RENDER_RECYCLE_AFTER`
+  renders, when the health check finds it disconnected, after any render
+  failure, and after a render that overran its budget — so a crashed or wedged
+  browser never serves a second request. `RENDER_POOL_SIZE=0` restores the old
+  fresh-browser-per-request mode.
+- **Bounded queue with backpressure** — at most `RENDER_MAX_QUEUE` renders wait
+  for a worker; beyond that `/render` answers 503 `busy` with `Retry-After`.
+  Every response carries `X-Render-Pool-*` headers and `/healthz` reports the
+  pool, so the main app can see saturation and shed load.
+- **Per-render budget** — `RENDER_BUDGET_SECONDS` covers queue wait plus the
+  render; navigation, idle wait and screenshot timeouts are cut to what is left.
 - Renders never raise to the caller: a render failure returns HTTP 200 with
   `error` set so the builder degrades gracefully instead of failing a build.
 """
@@ -26,6 +38,10 @@ import base64
 import hmac
 import logging
 import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
 
 from flask import Flask, jsonify, request
 from playwright.sync_api import sync_playwright
@@ -40,6 +56,13 @@ _MAX_HTML_BYTES = 5 * 1024 * 1024          # generous ceiling; artifacts are ~te
 _DEFAULT_W, _DEFAULT_H = 420, 760          # mobile-first, matches the app's play surface
 _NAV_TIMEOUT_MS = 15000
 _IDLE_TIMEOUT_MS = 4000
+_LAUNCH_ARGS = ["--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu"]
+
+_POOL_SIZE = int(os.environ.get("RENDER_POOL_SIZE", "2"))
+_MAX_QUEUE = int(os.environ.get("RENDER_MAX_QUEUE", "2"))
+_RECYCLE_AFTER = int(os.environ.get("RENDER_RECYCLE_AFTER", "50"))
+_RENDER_BUDGET_S = float(os.environ.get("RENDER_BUDGET_SECONDS", "40"))
+_BUSY_RETRY_AFTER_S = 5
 
 
 def _authorized(req) -> bool:
@@ -48,9 +71,229 @@ def _authorized(req) -> bool:
     return bool(_SECRET) and hmac.compare_digest(got, _SECRET)
 
 
+@dataclass
+class _RenderSpec:
+    html: str
+    width: int
+    height: int
+    full_page: bool
+    scale: int
+    max_fp_height: int
+
+
+def _render_page(browser, spec: _RenderSpec, deadline: float) -> dict:
+    """Render ``spec`` in a fresh context of ``browser``; raises on failure."""
+
+    def _remaining_ms(cap: int) -> int:
+        return max(1, min(cap, int((deadline - time.monotonic()) * 1000)))
+
+    console_errors: list[str] = []
+
+    def _on_console(msg) -> None:
+        if msg.type == "error":
+            console_errors.append(f"console.error: {msg.text}"[:300])
+
+    context = browser.new_context(
+        viewport={"width": spec.width, "height": spec.height},
+        device_scale_factor=spec.scale,
+    )
+    try:
+        context.set_default_timeout(_remaining_ms(_NAV_TIMEOUT_MS + _IDLE_TIMEOUT_MS))
+        page = context.new_page()
+        page.on("console", _on_console)
+        page.on("pageerror", lambda e: console_errors.append(f"pageerror: {e}"[:300]))
+        page.set_content(spec.html, wait_until="load", timeout=_remaining_ms(_NAV_TIMEOUT_MS))
+        try:
+            page.wait_for_load_state("networkidle", timeout=_remaining_ms(_IDLE_TIMEOUT_MS))
+        except Exception:
+            pass  # animations / timers may keep the page non-idle — that's fine
+        metrics = page.evaluate(
+            "() => ({"
+            " sh: document.body ? document.body.scrollHeight : 0,"
+            " sw: document.body ? document.body.scrollWidth : 0,"
+            " text: (document.body ? document.body.innerText : '').trim().length,"
+            " nodes: document.querySelectorAll('body *').length })"
+        )
+        if spec.full_page and spec.max_fp_height and metrics.get("sh", 0) > spec.max_fp_height:
+            # Clip a too-tall page so the judge receives a readable image
+            # (Playwright's clip captures beyond the viewport).
+            try:
+                shot = page.screenshot(
+                    type="png",
+                    clip={"x": 0, "y": 0, "width": spec.width, "height": spec.max_fp_height},
+                )
+            except Exception:
+                shot = page.screenshot(full_page=True, type="png")
+        else:
+            shot = page.screenshot(full_page=spec.full_page, type="png")
+    finally:
+        context.close()
+
+    blank = metrics.get("text", 0) == 0 and metrics.get("nodes", 0) <= 2
+    overflow = metrics.get("sw", 0) > spec.width + 4
+    return {
+        "screenshot": base64.b64encode(shot).decode("ascii"),
+        "console_errors": console_errors[:30],
+        "dimensions": {
+            "scroll_height": metrics.get("sh", 0),
+            "scroll_width": metrics.get("sw", 0),
+            "viewport": {"width": spec.width, "height": spec.height},
+        },
+        "blank": blank,
+        "overflow": overflow,
+    }
+
+
+def _render_fresh_browser(spec: _RenderSpec) -> dict:
+    """Pool disabled: launch, render and close a dedicated Chromium."""
+    deadline = time.monotonic() + _RENDER_BUDGET_S
+    with sync_playwright() as p:
+        browser = p.chromium.launch(args=_LAUNCH_ARGS)
+        try:
+            return _render_page(browser, spec, deadline)
+        finally:
+            browser.close()
+
+
+# ── Warm browser pool ─────────────────────────────────────────────────────
+
+
+class _Job:
+    def __init__(self, spec: _RenderSpec, deadline: float) -> None:
+        self.spec = spec
+        self.deadline = deadline
+        self.done = threading.Event()
+        self.result: dict | None = None
+        self.abandoned = False
+
+
+_jobs: "queue.Queue[_Job]" = queue.Queue(maxsize=max(1, _MAX_QUEUE))
+_stats_lock = threading.Lock()
+_stats = {"busy": 0, "alive": 0, "renders": 0, "recycles": 0, "rejected": 0, "timeouts": 0}
+_workers: list = []
+_pool_lock = threading.Lock()
+
+
+def _bump(name: str, delta: int = 1) -> None:
+    with _stats_lock:
+        _stats[name] += delta
+
+
+def _pool_status() -> dict:
+    with _stats_lock:
+        status = dict(_stats)
+    status.update(size=_POOL_SIZE, queued=_jobs.qsize(), max_queue=_MAX_QUEUE)
+    status["saturated"] = status["busy"] >= _POOL_SIZE and status["queued"] >= _MAX_QUEUE
+    return status
+
+
+class _BrowserWorker(threading.Thread):
+    """Owns one Chromium (Playwright's sync API is bound to its thread)."""
+
+    def __init__(self, index: int) -> None:
+        super().__init__(name=f"render-worker-{index}", daemon=True)
+        self._playwright = None
+        self._browser = None
+        self._renders = 0
+
+    def _launch(self) -> None:
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+        self._browser = self._playwright.chromium.launch(args=_LAUNCH_ARGS)
+        self._renders = 0
+        _bump("alive")
+
+    def _recycle(self, reason: str) -> None:
+        logger.info("%s: recycling browser (%s)", self.name, reason)
+        _bump("recycles")
+        browser, self._browser = self._browser, None
+        if browser is not None:
+            _bump("alive", -1)
+            try:
+                browser.close()
+            except Exception:
+                pass
+
+    def _healthy_browser(self):
+        if self._browser is not None and not self._browser.is_connected():
+            self._recycle("disconnected")
+        if self._browser is None:
+            self._launch()
+        return self._browser
+
+    def run(self) -> None:
+        try:
+            self._launch()  # warm before the first request arrives
+        except Exception as e:
+            logger.warning("%s: initial launch failed: %s", self.name, e)
+        while True:
+            job = _jobs.get()
+            if job.abandoned or time.monotonic() >= job.deadline:
+                job.result = {"error": "render_timeout", "detail": "expired while queued"}
+                job.done.set()
+                continue
+            _bump("busy")
+            try:
+                job.result = _render_page(self._healthy_browser(), job.spec, job.deadline)
+                self._renders += 1
+                _bump("renders")
+            except Exception as e:
+                logger.warning("render failed: %s", e)
+                job.result = {"error": "render_failed", "detail": str(e)[:300]}
+                self._recycle("render_failed")
+            finally:
+                _bump("busy", -1)
+                job.done.set()
+            if job.abandoned:
+                self._recycle("overran budget")
+            elif self._renders >= _RECYCLE_AFTER:
+                self._recycle(f"{self._renders} renders")
+
+
+def _ensure_pool() -> None:
+    if _POOL_SIZE <= 0 or _workers:
+        return
+    with _pool_lock:
+        if _workers:
+            return
+        for i in range(_POOL_SIZE):
+            worker = _BrowserWorker(i)
+            worker.start()
+            _workers.append(worker)
+
+
+def _pool_headers() -> dict:
+    status = _pool_status()
+    return {
+        "X-Render-Pool-Size": str(status["size"]),
+        "X-Render-Pool-Busy": str(status["busy"]),
+        "X-Render-Pool-Queued": str(status["queued"]),
+    }
+
+
+def _render_pooled(spec: _RenderSpec):
+    _ensure_pool()
+    job = _Job(spec, time.monotonic() + _RENDER_BUDGET_S)
+    try:
+        _jobs.put_nowait(job)
+    except queue.Full:
+        _bump("rejected")
+        headers = {**_pool_headers(), "Retry-After": str(_BUSY_RETRY_AFTER_S)}
+        return jsonify(error="busy", pool=_pool_status()), 503, headers
+    if not job.done.wait(_RENDER_BUDGET_S + 1):
+        job.abandoned = True
+        _bump("timeouts")
+        return jsonify(error="render_timeout"), 200, _pool_headers()
+    result = job.result or {"error": "render_failed"}
+    return jsonify(**result), 200, _pool_headers()
+
+
 @app.get("/healthz")
 def healthz():
-    return jsonify(ok=True)
+    if _POOL_SIZE <= 0:
+        return jsonify(ok=True)
+    _ensure_pool()
+    return jsonify(ok=True, pool=_pool_status())
 
 
 @app.post("/render")
@@ -81,67 +324,18 @@ def render():
     except (TypeError, ValueError):
         max_fp_height = 0
 
-    console_errors: list[str] = []
-
-    def _on_console(msg) -> None:
-        if msg.type == "error":
-            console_errors.append(f"console.error: {msg.text}"[:300])
-
+    spec = _RenderSpec(html, width, height, full_page, scale, max_fp_height)
+    if _POOL_SIZE > 0:
+        return _render_pooled(spec)
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(
-                args=["--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu"],
-            )
-            try:
-                page = browser.new_page(
-                    viewport={"width": width, "height": height},
-                    device_scale_factor=scale,
-                )
-                page.on("console", _on_console)
-                page.on("pageerror", lambda e: console_errors.append(f"pageerror: {e}"[:300]))
-                page.set_content(html, wait_until="load", timeout=_NAV_TIMEOUT_MS)
-                try:
-                    page.wait_for_load_state("networkidle", timeout=_IDLE_TIMEOUT_MS)
-                except Exception:
-                    pass  # animations / timers may keep the page non-idle — that's fine
-                metrics = page.evaluate(
-                    "() => ({"
-                    " sh: document.body ? document.body.scrollHeight : 0,"
-                    " sw: document.body ? document.body.scrollWidth : 0,"
-                    " text: (document.body ? document.body.innerText : '').trim().length,"
-                    " nodes: document.querySelectorAll('body *').length })"
-                )
-                if full_page and max_fp_height and metrics.get("sh", 0) > max_fp_height:
-                    # Clip a too-tall page so the judge receives a readable image
-                    # (Playwright's clip captures beyond the viewport).
-                    try:
-                        shot = page.screenshot(
-                            type="png",
-                            clip={"x": 0, "y": 0, "width": width, "height": max_fp_height},
-                        )
-                    except Exception:
-                        shot = page.screenshot(full_page=True, type="png")
-                else:
-                    shot = page.screenshot(full_page=full_page, type="png")
-            finally:
-                browser.close()
+        result = _render_fresh_browser(spec)
     except Exception as e:  # never raise to the caller
         logger.warning("render failed: %s", e)
         return jsonify(error="render_failed", detail=str(e)[:300]), 200
+    return jsonify(**result)
 
-    blank = metrics.get("text", 0) == 0 and metrics.get("nodes", 0) <= 2
-    overflow = metrics.get("sw", 0) > width + 4
-    return jsonify(
-        screenshot=base64.b64encode(shot).decode("ascii"),
-        console_errors=console_errors[:30],
-        dimensions={
-            "scroll_height": metrics.get("sh", 0),
-            "scroll_width": metrics.get("sw", 0),
-            "viewport": {"width": width, "height": height},
-        },
-        blank=blank,
-        overflow=overflow,
-    )
+
+_ensure_pool()
 
 
 if __name__ == "__main__":
@@ -453,6 +453,8 @@ _TRUNCATE_TABLES: List[str] = [
     "lifecycle_email_sends",
     "pending_signups",
     "messages",
+    "dm_threads",
+    "message_outbox",
     "group_chats",
     "group_chat_members",
     "group_chat_messages",
@@ -0,0 +1,157 @@
+"""Tests for the shared per-thread recent-message window."""
+
+from __future__ import annotations
+
+import pytest
+
+from backend.services import chat_recent_window as crw
+from redis_cache import (
+    cache,
+    chat_window_dm_key,
+    chat_window_dm_seq_key,
+    chat_window_group_key,
+    chat_window_group_seq_key,
+)
+
+
+@pytest.fixture(autouse=True)
+def _window_enabled(monkeypatch):
+    monkeypatch.setenv("CHAT_RECENT_WINDOW", "1")
+    cache.flush_all()
+    yield
+    cache.flush_all()
+
+
+def _seed(key: str, seq_key: str, window: dict, seq: int = 3) -> None:
+    cache.set(seq_key, seq, 3600)
+    window["seq"] = seq
+    cache.set(key, window, 3600)
+
+
+def _dm(mid: int, sender: str, time: str = "2026-01-01T10:00:00Z") -> dict:
+    return {"id": mid, "sender": sender, "text": f"m{mid}", "time": time}
+
+
+def test_merge_rows_trims_and_raises_floor(monkeypatch):
+    monkeypatch.setattr(crw, "CHAT_RECENT_WINDOW_SIZE", 3)
+    window = {"messages": [_dm(1, "a"), _dm(2, "b"), _dm(3, "a")], "floor_id": 0}
+    crw._merge_rows(window, [_dm(4, "b"), _dm(5, "a")], removed_ids=[2])
+    assert [m["id"] for m in window["messages"]] == [3, 4, 5]
+    assert window["floor_id"] == 1
+
+
+def test_dm_window_shapes_sent_flag_and_delta():
+    _seed(
+        chat_window_dm_key("Alice", "bob"),
+        chat_window_dm_seq_key("Alice", "bob"),
+        {"messages": [_dm(10, "alice"), _dm(11, "Bob")], "floor_id": 0, "deleted_at": {}},
+    )
+    full = crw.dm_window_messages("alice", "Bob")
+    assert [(m["id"], m["sent"]) for m in full] == [(10, True), (11, False)]
+    assert all("sender" not in m for m in full)
+    assert [m["id"] for m in crw.dm_window_messages("bob", "alice", since_id=10)] == [11]
+    assert crw.dm_window_messages("bob", "alice", since_id=11) == []
+
+
+def test_dm_window_falls_back_when_partial_or_flag_off(monkeypatch):
+    _seed(
+        chat_window_dm_key("alice", "bob"),
+        chat_window_dm_seq_key("alice", "bob"),
+        {"messages": [_dm(10, "alice"), _dm(11, "bob")], "floor_id": 9, "deleted_at": {}},
+    )
+    assert crw.dm_window_messages("alice", "bob") is None
+    assert crw.dm_window_messages("alice", "bob", since_id=5) is None
+    assert [m["id"] for m in crw.dm_window_messages("alice", "bob", since_id=9)] == [10, 11]
+    monkeypatch.setenv("CHAT_RECENT_WINDOW", "0")
+    assert crw.dm_window_messages("alice", "bob", since_id=9) is None
+
+
+def test_dm_window_applies_viewer_clear_cutoff():
+    _seed(
+        chat_window_dm_key("alice", "bob"),
+        chat_window_dm_seq_key("alice", "bob"),
+        {
+            "messages": [
+                _dm(10, "alice", "2026-01-01T10:00:00Z"),
+                _dm(11, "bob", "2026-01-02T10:00:00Z"),
+            ],
+            "floor_id": 0,
+            "deleted_at": {"alice": "2026-01-01 12:00:00"},
+        },
+    )
+    assert [m["id"] for m in crw.dm_window_messages("alice", "bob")] == [11]
+    assert [m["id"] for m in crw.dm_window_messages("bob", "alice")] == [10, 11]
+
+
+def test_patch_updates_in_place_and_bumps_seq():
+    key, seq_key = chat_window_dm_key("alice", "bob"), chat_window_dm_seq_key("alice", "bob")
+    _seed(key, seq_key, {"messages": [_dm(10, "alice")], "floor_id": 0, "deleted_at": {}})
+    crw.patch_dm_window_message("bob", "alice", 10, text="edited")
+    window = cache.get(key)
+    assert window["seq"] == 4 and int(cache.get(seq_key)) == 4
+    assert crw.dm_window_messages("alice", "bob")[0]["text"] == "edited"
+
+
+def test_write_against_stale_window_drops_it():
+    key, seq_key = chat_window_dm_key("alice", "bob"), chat_window_dm_seq_key("alice", "bob")
+    _seed(key, seq_key, {"messages": [_dm(10, "alice")], "floor_id": 0, "deleted_at": {}})
+    cache.set(seq_key, 7, 3600)  # a write the window never saw
+    crw.remove_dm_window_message("alice", "bob", 10)
+    assert cache.get(key) is None
+
+
+def test_drop_forces_rebuild(monkeypatch):
+    key, seq_key = chat_window_dm_key("alice", "bob"), chat_window_dm_seq_key("alice", "bob")
+    _seed(key, seq_key, {"messages": [_dm(10, "alice")], "floor_id": 0, "deleted_at": {}})
+    crw.drop_dm_window("alice", "bob")
+    loads = []
+
+    def _fake_load(a, b):
+        loads.append((a, b))
+        return {"messages": [_dm(12, "bob")], "floor_id": 0, "deleted_at": {}}
+
+    monkeypatch.setattr(crw, "_load_dm_window", _fake_load)
+    assert [m["id"] for m in crw.dm_window_messages("alice", "bob")] == [12]
+    assert [m["id"] for m in crw.dm_window_messages("alice", "bob")] == [12]
+    assert len(loads) == 1
+
+
+def _group_window() -> dict:
+    msgs = [{"id": i, "sender": "alice", "text": f"g{i}"} for i in range(20, 26)]
+    return {
+        "messages": msgs,
+        "floor_id": 19,
+        "members": {"alice": 0, "bob": 22},
+        "reactions": {"24": {"bob": "🔥", "alice": "👍"}},
+    }
+
+
+def test_group_window_membership_clear_and_reactions():
+    _seed(chat_window_group_key(7), chat_window_group_seq_key(7), _group_window())
+    assert crw.group_window_messages("mallory", 7) is None
+
+    msgs, has_more = crw.group_window_messages("Bob", 7, limit=50)
+    assert [m["id"] for m in msgs] == [23, 24, 25]
+    assert not has_more
+    assert [m["reaction"] for m in msgs] == [None, "🔥", None]
+
+    msgs, _ = crw.group_window_messages("alice", 7, since_id=23, limit=50)
+    assert [(m["id"], m["reaction"]) for m in msgs] == [(24, "👍"), (25, None)]
+
+
+def test_group_window_falls_back_past_floor():
+    _seed(chat_window_group_key(7), chat_window_group_seq_key(7), _group_window())
+    # alice can see everything, but the window only starts after id 19.
+    assert crw.group_window_messages("alice", 7, limit=50) is None
+    assert crw.group_window_messages("alice", 7, since_id=10, limit=50) is None
+    msgs, has_more = crw.group_window_messages("alice", 7, limit=4)
+    assert [m["id"] for m in msgs] == [22, 23, 24, 25] and has_more
+
+
+def test_group_reaction_and_removal_update_in_place():
+    _seed(chat_window_group_key(7), chat_window_group_seq_key(7), _group_window())
+    crw.set_group_window_reaction(7, 25, "Bob", "❤️")
+    crw.set_group_window_reaction(7, 24, "bob", None)
+    crw.remove_group_window_messages(7, [23])
+    msgs, _ = crw.group_window_messages("bob", 7, limit=50)
+    assert [(m["id"], m["reaction"]) for m in msgs] == [(24, None), (25, "❤️")]
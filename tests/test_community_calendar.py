@@ -281,3 +281,127 @@ def test_format_event_ics_with_utc_instants():
     )
     assert "DTSTART:20260608T090000Z" in body
     assert "DTEND:20260608T103000Z" in body
+
+
+def _calendar_sqlite():
+    import sqlite3
+
+    from backend.services import community_calendar
+
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    c = conn.cursor()
+    c.executescript(
+        """
+        CREATE TABLE calendar_events (id INTEGER PRIMARY KEY, username TEXT, title TEXT, date TEXT,
+            end_date TEXT, start_time TEXT, end_time TEXT, time TEXT, description TEXT, created_at TEXT,
+            community_id INTEGER, group_id INTEGER, timezone TEXT, meeting_url TEXT,
+            starts_at_utc TEXT, ends_at_utc TEXT);
+        CREATE TABLE event_rsvps (id INTEGER PRIMARY KEY, event_id INTEGER, username TEXT, response TEXT,
+            responded_at TEXT, note TEXT, UNIQUE(event_id, username));
+        CREATE TABLE event_invitations (id INTEGER PRIMARY KEY, event_id INTEGER, invited_username TEXT,
+            invited_by TEXT, invited_at TEXT, viewed INTEGER DEFAULT 0, UNIQUE(event_id, invited_username));
+        """
+    )
+    community_calendar.ensure_event_rsvp_counters_table(c)
+    for eid in (1, 2, 3):
+        c.execute(
+            "INSERT INTO calendar_events (id, username, title, date, community_id) VALUES (?, 'owner', ?, '2026-09-01', 1)",
+            (eid, f"Event {eid}"),
+        )
+    c.executemany(
+        "INSERT INTO event_invitations (event_id, invited_username, invited_by, invited_at) VALUES (?, ?, 'owner', '')",
+        [(1, "alice"), (1, "bob"), (1, "carol"), (2, "alice")],
+    )
+    c.executemany(
+        "INSERT INTO event_rsvps (event_id, username, response, responded_at) VALUES (?, ?, ?, '')",
+        [(1, "alice", "going"), (1, "bob", "maybe"), (1, "owner", "going"), (2, "alice", "not_going")],
+    )
+    return conn, c
+
+
+class _CountingCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.statements = 0
+
+    def execute(self, *args):
+        self.statements += 1
+        return self._cursor.execute(*args)
+
+    def executemany(self, *args):
+        self.statements += 1
+        return self._cursor.executemany(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def test_shape_events_matches_per_row_shaping_in_fixed_queries():
+    from backend.services import community_calendar
+
+    _conn, c = _calendar_sqlite()
+    c.execute("SELECT * FROM calendar_events ORDER BY id")
+    rows = c.fetchall()
+
+    legacy = [community_calendar.shape_event(row, c, "alice") for row in rows]
+    counting = _CountingCursor(c)
+    batched = community_calendar.shape_events(rows, counting, "alice")
+    assert batched == legacy
+    assert batched[0]["rsvp_counts"] == {
+        "going": 2, "maybe": 1, "not_going": 0, "no_response": 1, "total_invited": 4,
+    }
+    assert [e["user_rsvp"] for e in batched] == ["going", "not_going", None]
+    # counters read + two bulk aggregates + backfill + viewer RSVPs, whatever the page size.
+    assert counting.statements == 5
+
+    counting.statements = 0
+    assert community_calendar.shape_events(rows, counting, "alice") == legacy
+    assert counting.statements == 2
+
+
+def test_rsvp_counter_refresh_keeps_batched_tallies_current():
+    from backend.services import community_calendar
+
+    _conn, c = _calendar_sqlite()
+    c.execute("SELECT * FROM calendar_events WHERE id = 1")
+    rows = c.fetchall()
+    community_calendar.shape_events(rows, c, "carol")
+
+    c.execute("INSERT INTO event_rsvps (event_id, username, response, responded_at) VALUES (1, 'carol', 'not_going', '')")
+    counts = community_calendar._refresh_rsvp_counters(c, 1)
+    assert counts == {"going": 2, "maybe": 1, "not_going": 1, "no_response": 0, "total_invited": 4}
+    event = community_calendar.shape_events(rows, c, "carol")[0]
+    assert event["rsvp_counts"] == counts and event["user_rsvp"] == "not_going"
+    assert event == community_calendar.shape_event(rows[0], c, "carol")
+
+
+def test_interleaved_rsvps_apply_relative_counter_updates(monkeypatch):
+    from backend.services import community_calendar
+
+    conn, c = _calendar_sqlite()
+    monkeypatch.setattr(community_calendar, "get_db_connection", lambda: conn)
+    c.execute("SELECT * FROM calendar_events WHERE id = 1")
+    rows = c.fetchall()
+    community_calendar.shape_events(rows, c, "carol")  # backfill the counter row
+
+    real_bump = community_calendar._bump_rsvp_counters
+    interleaved = []
+
+    def bump_after_another_request(cursor, event_id, **kwargs):
+        if not interleaved:
+            interleaved.append("bob")
+            # Bob cancels after Carol's RSVP row is written but before her counter update.
+            community_calendar.cancel_rsvp("bob", 1)
+        real_bump(cursor, event_id, **kwargs)
+
+    monkeypatch.setattr(community_calendar, "_bump_rsvp_counters", bump_after_another_request)
+    community_calendar.rsvp_event("carol", 1, "going")
+    community_calendar.rsvp_event("carol", 1, "maybe")
+    result = community_calendar.rsvp_event("carol", 1, "maybe", note="same answer")
+
+    live = community_calendar._counts_payload(community_calendar._live_rsvp_tallies(c, [1])[1])
+    assert result["counts"] == live == {
+        "going": 2, "maybe": 1, "not_going": 0, "no_response": 1, "total_invited": 4,
+    }
+    assert community_calendar.cancel_rsvp("carol", 1)["counts"]["maybe"] == 0
@@ -0,0 +1,75 @@
+"""Tests for shared per-root dashboard summaries."""
+
+from __future__ import annotations
+
+import pytest
+
+from backend.services import community_dashboard_summary as cds
+from redis_cache import cache, community_root_key, dashboard_root_summary_key
+
+
+@pytest.fixture(autouse=True)
+def _flush_cache():
+    cache.flush_all()
+    yield
+    cache.flush_all()
+
+
+def test_root_summaries_are_built_once_and_shared(monkeypatch):
+    builds = []
+
+    def fake_build(c, root_ids):
+        builds.append(list(root_ids))
+        return {rid: {"id": rid, "member_count": 3, "tree_ids": [rid, rid * 10]} for rid in root_ids}
+
+    monkeypatch.setattr(cds, "build_root_summaries", fake_build)
+
+    first = cds.get_root_summaries(None, [2, 1])
+    assert builds == [[1, 2]]
+    second = cds.get_root_summaries(None, [1, 2, 3])
+    assert builds == [[1, 2], [3]]
+    assert second[1] == first[1]
+    assert cache.get(community_root_key(20)) == 2
+
+
+def test_drop_for_community_uses_root_map():
+    cache.set(dashboard_root_summary_key(5), {"id": 5}, 60)
+    cache.set(community_root_key(51), 5, 60)
+    cds.drop_root_summary_for_community(51)
+    assert cache.get(dashboard_root_summary_key(5)) is None
+
+    # Unmapped communities fall back to dropping their own id (a root).
+    cache.set(dashboard_root_summary_key(7), {"id": 7}, 60)
+    cds.drop_root_summary_for_community(7)
+    assert cache.get(dashboard_root_summary_key(7)) is None
+
+
+def test_shared_dashboard_matches_legacy(mysql_dsn, monkeypatch):
+    from backend.services import community as community_svc
+    from backend.services.database import get_db_connection, get_sql_placeholder
+    from tests.fixtures import make_community, make_user
+
+    make_user("dash_owner", subscription="premium")
+    make_user("dash_member", subscription="premium")
+    root = make_community("dash-root", tier="free", creator_username="dash_owner")
+    child = make_community("dash-child", tier="free", creator_username="dash_owner", parent_community_id=root)
+    ph = get_sql_placeholder()
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(f"SELECT id FROM users WHERE username = {ph}", ("dash_member",))
+        row = c.fetchone()
+        user_id = row["id"] if hasattr(row, "keys") else row[0]
+        c.execute(
+            f"INSERT INTO user_communities (user_id, community_id, role) VALUES ({ph}, {ph}, {ph})",
+            (user_id, child, "member"),
+        )
+        conn.commit()
+
+    monkeypatch.delenv("DASHBOARD_ROOT_SUMMARY", raising=False)
+    legacy = community_svc.get_user_dashboard_communities("dash_member")
+    monkeypatch.setenv("DASHBOARD_ROOT_SUMMARY", "1")
+    shared = community_svc.get_user_dashboard_communities("dash_member")
+
+    assert [c["id"] for c in shared] == [c["id"] for c in legacy] == [root]
+    for key in ("member_count", "is_owner", "is_admin", "unread_posts_count"):
+        assert shared[0][key] == legacy[0][key]
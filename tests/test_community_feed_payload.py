@@ -0,0 +1,131 @@
+"""Tests for the shared community feed payload + viewer overlay."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from backend.services import community_feed_payload as cfp
+from redis_cache import (
+    cache,
+    community_feed_shared_key,
+    community_feed_user_cache_key,
+    invalidate_community_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def _flush_cache():
+    cache.flush_all()
+    yield
+    cache.flush_all()
+
+
+def test_shared_payload_is_built_once_per_version(monkeypatch):
+    builds = []
+
+    def fake_build(community_id):
+        builds.append(community_id)
+        return {"community": {"id": community_id}, "posts": [{"id": len(builds)}]}
+
+    monkeypatch.setattr(cfp, "build_shared_feed_payload", fake_build)
+
+    first = cfp.get_shared_feed_payload(3)
+    assert cfp.get_shared_feed_payload(3) is first
+    assert len(builds) == 1
+
+    cfp.bump_community_feed_version(3)
+    second = cfp.get_shared_feed_payload(3)
+    assert len(builds) == 2
+    assert second["posts"][0]["id"] == 2
+    assert cache.get(community_feed_shared_key(3, 1)) is not None
+
+
+def test_invalidate_community_cache_bumps_version_instead_of_deleting(monkeypatch):
+    monkeypatch.setenv("COMMUNITY_FEED_SHARED_PAYLOAD", "1")
+    assert cfp.community_feed_version(8) == 0
+    invalidate_community_cache(8)
+    invalidate_community_cache(8)
+    assert cfp.community_feed_version(8) == 2
+
+
+def test_invalidate_community_cache_flag_off_still_drops_viewer_keys(monkeypatch):
+    monkeypatch.delenv("COMMUNITY_FEED_SHARED_PAYLOAD", raising=False)
+    key = community_feed_user_cache_key(8, "alice")
+    cache.set(key, {"success": True}, 60)
+    invalidate_community_cache(8)
+    assert cache.get(key) is None
+    assert cfp.community_feed_version(8) == 1
+
+
+def test_display_timestamp_normalizes_formats():
+    assert cfp._display_timestamp({"timestamp": "2026-03-01T10:11:12"}) == "2026-03-01 10:11:12"
+    assert cfp._display_timestamp({"timestamp": "01-03-2026 10:11"}) == "2026-03-01 10:11:00"
+    assert cfp._display_timestamp({"timestamp": "0000-00-00 00:00:00"}) == ""
+
+
+def test_overlay_filters_hidden_posts_and_keeps_shared_untouched(mysql_dsn):
+    from backend.services.database import get_db_connection, get_sql_placeholder
+    from tests.fixtures import make_community, make_user
+
+    make_user("feed_author", subscription="premium")
+    make_user("feed_viewer", subscription="premium")
+    community_id = make_community("shared-feed", tier="free", creator_username="feed_author")
+    ph = get_sql_placeholder()
+    ts = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        ids = []
+        for text in ("first", "second"):
+            c.execute(
+                f"INSERT INTO posts (username, content, timestamp, community_id) VALUES ({ph}, {ph}, {ph}, {ph})",
+                ("feed_author", text, ts, community_id),
+            )
+            ids.append(int(c.lastrowid))
+        c.execute(
+            f"INSERT INTO reactions (post_id, username, reaction_type) VALUES ({ph}, {ph}, {ph})",
+            (ids[1], "feed_viewer", "heart"),
+        )
+        c.execute(
+            f"INSERT INTO hidden_posts (username, post_id, hidden_at) VALUES ({ph}, {ph}, {ph})",
+            ("feed_viewer", ids[0], ts),
+        )
+        conn.commit()
+
+    shared = cfp.get_shared_feed_payload(community_id)
+    assert [p["id"] for p in shared["posts"]] == [ids[1], ids[0]]
+
+    with get_db_connection() as conn:
+        viewer = cfp.apply_feed_viewer_overlay(conn, shared, community_id, "feed_viewer")
+        author = cfp.apply_feed_viewer_overlay(conn, shared, community_id, "feed_author")
+
+    assert [p["id"] for p in viewer["posts"]] == [ids[1]]
+    assert viewer["posts"][0]["user_reaction"] == "heart"
+    assert viewer["posts"][0]["reactions"] == {"heart": 1}
+    assert [p["id"] for p in author["posts"]] == [ids[1], ids[0]]
+    assert author["posts"][0]["user_reaction"] is None
+    assert "user_reaction" not in shared["posts"][0]
+
+
+def test_post_view_does_not_bump_shared_feed_version(mysql_dsn, monkeypatch):
+    from backend.services.database import get_db_connection, get_sql_placeholder
+    from backend.services.post_views import record_community_post_view
+    from tests.fixtures import make_community, make_user
+
+    monkeypatch.setenv("COMMUNITY_FEED_SHARED_PAYLOAD", "1")
+    make_user("view_author", subscription="premium")
+    community_id = make_community("view-feed", tier="free", creator_username="view_author")
+    ph = get_sql_placeholder()
+    ts = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            f"INSERT INTO posts (username, content, timestamp, community_id) VALUES ({ph}, {ph}, {ph}, {ph})",
+            ("view_author", "hi", ts, community_id),
+        )
+        post_id = int(c.lastrowid)
+        conn.commit()
+
+    assert record_community_post_view("view_author", post_id)["success"] is True
+    assert cfp.community_feed_version(community_id) == 0
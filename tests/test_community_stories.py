@@ -138,3 +138,65 @@ def test_story_upload_list_interactions_and_delete(mysql_dsn, monkeypatch):
     delete_story_resp = client.delete(f"/api/community_stories/{story_id}")
     assert delete_story_resp.status_code == 200
     assert delete_story_resp.get_json()["success"] is True
+
+
+def test_story_seen_set_is_served_from_cache(monkeypatch):
+    from backend.services import community_stories
+    from redis_cache import cache, story_seen_key
+
+    class NoSqlCursor:
+        def execute(self, *args, **kwargs):
+            raise AssertionError("seen set should come from the cache")
+
+    key = story_seen_key("Viewer", 77)
+    cache.delete(key)
+    # No cached set yet: a view must not create a partial one.
+    community_stories._remember_story_seen("viewer", 77, 5)
+    assert cache.get(key) is None
+
+    cache.set(key, [1], 60)
+    community_stories._remember_story_seen("VIEWER", 77, 5)
+    assert community_stories._seen_story_ids(NoSqlCursor(), "viewer", 77, [1, 5, 9]) == {1, 5}
+    cache.delete(key)
+
+
+def test_story_tray_snapshot_invalidates_on_writes(mysql_dsn, monkeypatch):
+    import bodybuilding_app
+    from backend.services import community_stories
+
+    monkeypatch.setenv("STORY_TRAY_SNAPSHOT", "true")
+    monkeypatch.setattr(
+        community_stories,
+        "save_uploaded_file",
+        lambda file, subfolder=None, allowed_extensions=None: f"{subfolder}/story-snap.jpg",
+    )
+    monkeypatch.setattr(community_stories, "send_push_to_user", lambda username, payload: None)
+    monkeypatch.setattr(community_stories, "create_notification", lambda *args, **kwargs: None)
+
+    make_user("snap_owner", subscription="premium")
+    community_id = make_community("story-snapshot-community", tier="free", creator_username="snap_owner")
+    client = bodybuilding_app.app.test_client()
+    _login(client, "snap_owner")
+
+    assert client.get(f"/api/community_stories/{community_id}").get_json()["stories"] == []
+    created = client.post(
+        "/api/community_stories",
+        data={"community_id": str(community_id), "media": (BytesIO(b"img"), "story.jpg")},
+        content_type="multipart/form-data",
+    ).get_json()
+    story_id = created["story"]["id"]
+
+    listed = client.get(f"/api/community_stories/{community_id}").get_json()
+    assert [s["id"] for s in listed["stories"]] == [story_id]
+    assert listed["has_new"] is True
+
+    client.post("/api/community_stories/view", json={"story_id": story_id})
+    client.post("/api/community_stories/react", json={"story_id": story_id, "reaction": "🔥"})
+    listed = client.get(f"/api/community_stories/{community_id}").get_json()
+    assert listed["has_new"] is False
+    assert listed["stories"][0]["user_reaction"] == "🔥"
+    assert listed["stories"][0]["reactions"] == {"🔥": 1}
+    assert "reactors" not in listed["stories"][0]
+
+    client.delete(f"/api/community_stories/{story_id}")
+    assert client.get(f"/api/community_stories/{community_id}").get_json()["stories"] == []
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import pytest
+
+from backend.services import community as community_svc
+from backend.services.community_unread import compact_marks
+from backend.services.database import get_db_connection, get_sql_placeholder
+from backend.services.post_views import upsert_post_view
+
+
+def test_compact_marks_folds_contiguous_views():
+    assert compact_marks(10, {11, 12, 15}, [11, 12, 14, 15]) == (12, {15})
+    assert compact_marks(10, {14}, [11, 14]) == (10, {14})
+    # Entries at or below the mark (e.g. after a delete) are dropped.
+    assert compact_marks(10, {9, 11}, [11]) == (11, set())
+
+
+@pytest.fixture
+def marks_on(monkeypatch):
+    monkeypatch.setenv("COMMUNITY_UNREAD_MARKS", "true")
+
+
+def _insert_post(community_id: int, username: str) -> int:
+    from backend.services.community_unread import note_post_created
+
+    ph = get_sql_placeholder()
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            f"INSERT INTO posts (community_id, username, content, timestamp) VALUES ({ph}, {ph}, {ph}, NOW())",
+            (community_id, username, "hello"),
+        )
+        pid = int(c.lastrowid)
+        note_post_created(c, community_id, pid, username)
+        conn.commit()
+    return pid
+
+
+def _counts(cids, username):
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        out = community_svc.count_unread_posts_by_community_ids(c, cids, username)
+        conn.commit()
+    return out
+
+
+def _view(post_id: int, username: str) -> None:
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        upsert_post_view(c, post_id, username)
+        conn.commit()
+
+
+@pytest.mark.usefixtures("mysql_dsn")
+def test_counters_follow_create_view_and_delete(marks_on):
+    from backend.services.post_deletion import delete_post_cascade
+    from tests.fixtures import make_community, make_user
+
+    make_user("marks_reader", subscription="free")
+    cid = make_community("marks-a", creator_username="marks_reader")
+
+    p1 = _insert_post(cid, "bob")
+    p2 = _insert_post(cid, "bob")
+    _insert_post(cid, "marks_reader")
+    assert _counts([cid], "marks_reader") == {cid: 2}
+
+    p3 = _insert_post(cid, "bob")
+    _view(p2, "MARKS_READER")
+    assert _counts([cid], "marks_reader") == {cid: 2}
+
+    _view(p1, "marks_reader")
+    _view(p1, "marks_reader")
+    assert _counts([cid], "marks_reader") == {cid: 1}
+
+    delete_post_cascade(p3, actor="admin")
+    assert _counts([cid], "marks_reader") == {}
+
+
+@pytest.mark.usefixtures("mysql_dsn")
+def test_read_catches_up_posts_created_without_hook(marks_on):
+    from tests.fixtures import make_community, make_user
+
+    make_user("marks_late", subscription="free")
+    cid = make_community("marks-b", creator_username="marks_late")
+    _insert_post(cid, "bob")
+    assert _counts([cid], "marks_late") == {cid: 1}
+
+    ph = get_sql_placeholder()
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            f"INSERT INTO posts (community_id, username, content, timestamp) VALUES ({ph}, {ph}, {ph}, NOW())",
+            (cid, "carol", "no hook"),
+        )
+        conn.commit()
+    assert _counts([cid], "marks_late") == {cid: 2}
+
+
+@pytest.mark.usefixtures("mysql_dsn")
+def test_account_purge_drops_deleted_authors_posts_from_counters(marks_on):
+    from backend.services.account_deletion import _purge_user_posts_admin
+    from tests.fixtures import make_community, make_user
+
+    make_user("marks_stay", subscription="free")
+    cid = make_community("marks-c", creator_username="marks_stay")
+    _insert_post(cid, "gone_author")
+    _insert_post(cid, "gone_author")
+    _insert_post(cid, "carol")
+    assert _counts([cid], "marks_stay") == {cid: 3}
+
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        _purge_user_posts_admin(c, get_sql_placeholder(), "gone_author")
+        conn.commit()
+    assert _counts([cid], "marks_stay") == {cid: 1}
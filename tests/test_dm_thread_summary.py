@@ -0,0 +1,141 @@
+"""``dm_threads`` summary: maintained rows must match the message-scan payload.
+
+Write-path helpers (``record_*``) keep one row per ``(viewer, peer)``; the
+summary read path (``DM_THREADS_SUMMARY_READS``) must render exactly what the
+legacy ``messages`` scan renders, and ``verify_dm_threads_for_user`` must
+report no drift after every mutation.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from backend.services import dm_thread_summary as summary
+from backend.services.database import get_db_connection, get_sql_placeholder
+from backend.services.dm_chat_threads import build_chat_threads_payload
+from backend.services.dm_human_thread import human_pair_thread_key
+from redis_cache import cache
+from tests.fixtures import make_user
+from tests.test_chat_threads_batch import _ensure_tables
+
+
+@pytest.fixture()
+def needs_mysql(mysql_dsn):
+    return mysql_dsn
+
+
+def _send(
+    sender: str,
+    receiver: str,
+    text: str,
+    ts: str,
+    *,
+    pair: tuple[str, str] | None = None,
+) -> int:
+    thr = human_pair_thread_key(*pair) if pair else None
+    ph = get_sql_placeholder()
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            f"""INSERT INTO messages (sender, receiver, message, timestamp, is_read, human_dm_thread)
+                VALUES ({ph}, {ph}, {ph}, {ph}, 0, {ph})""",
+            (sender, receiver, text, ts, thr),
+        )
+        mid = c.lastrowid
+        if pair:
+            summary.record_steve_thread_message(c, peer_a=pair[0], peer_b=pair[1], message_id=mid)
+        else:
+            summary.record_dm_message(c, sender=sender, receiver=receiver, message_id=mid)
+        conn.commit()
+    return int(mid)
+
+
+def _payloads(monkeypatch, username: str) -> tuple[list, list]:
+    cache.delete(f"chat_threads:{username}")
+    monkeypatch.setenv("DM_THREADS_SUMMARY_READS", "false")
+    legacy = build_chat_threads_payload(username)
+    cache.delete(f"chat_threads:{username}")
+    monkeypatch.setenv("DM_THREADS_SUMMARY_READS", "true")
+    fast = build_chat_threads_payload(username)
+    cache.delete(f"chat_threads:{username}")
+    assert legacy["success"] and fast["success"]
+    return legacy["threads"], fast["threads"]
+
+
+def test_send_path_rows_match_legacy_scan(needs_mysql, monkeypatch):
+    _ensure_tables()
+    for u in ("dts_a", "dts_b", "dts_c", "steve"):
+        make_user(u)
+
+    _send("dts_a", "dts_b", "hi b", "2026-07-10 09:00:00")
+    _send("dts_b", "dts_a", "hey a", "2026-07-10 09:01:00")
+    _send("dts_c", "dts_a", "from c", "2026-07-10 09:05:00")
+    _send("steve", "dts_b", "in-thread", "2026-07-10 09:06:00", pair=("dts_a", "dts_b"))
+
+    assert summary.verify_dm_threads_for_user("dts_a") == []
+    assert summary.verify_dm_threads_for_user("dts_b") == []
+
+    legacy, fast = _payloads(monkeypatch, "dts_a")
+    assert fast == legacy
+    by_peer = {t["other_username"]: t for t in fast}
+    assert by_peer["dts_b"]["last_message_text"] == "in-thread"
+    assert by_peer["dts_b"]["unread_count"] == 1
+    assert by_peer["dts_c"]["unread_count"] == 1
+
+
+def test_read_delete_and_archive_keep_summary_in_sync(needs_mysql, monkeypatch):
+    _ensure_tables()
+    for u in ("dts_d", "dts_e"):
+        make_user(u)
+
+    _send("dts_e", "dts_d", "first", "2026-07-10 09:00:00")
+    last = _send("dts_e", "dts_d", "second", "2026-07-10 09:01:00")
+
+    ph = get_sql_placeholder()
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(f"DELETE FROM messages WHERE id = {ph}", (last,))
+        summary.refresh_dm_thread_pair(c, "dts_e", "dts_d")
+        c.execute(
+            f"UPDATE messages SET is_read = 1 WHERE sender = {ph} AND receiver = {ph}",
+            ("dts_e", "dts_d"),
+        )
+        summary.record_dm_read(c, reader="dts_d", peer="dts_e")
+        conn.commit()
+
+    assert summary.verify_dm_threads_for_user("dts_d") == []
+    legacy, fast = _payloads(monkeypatch, "dts_d")
+    assert fast == legacy
+    assert fast[0]["last_message_text"] == "first"
+    assert fast[0]["unread_count"] == 0
+
+    from backend.services.dm_thread_archive import archive_dm_thread
+
+    archive_dm_thread("dts_d", other_username="dts_e")
+    assert summary.verify_dm_threads_for_user("dts_d") == []
+    legacy, fast = _payloads(monkeypatch, "dts_d")
+    assert fast == legacy == []
+
+
+def test_rebuild_backfills_rows_written_before_the_summary(needs_mysql, monkeypatch):
+    _ensure_tables()
+    for u in ("dts_f", "dts_g"):
+        make_user(u)
+
+    ph = get_sql_placeholder()
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            f"""INSERT INTO messages (sender, receiver, message, timestamp, is_read)
+                VALUES ({ph}, {ph}, {ph}, {ph}, 0)""",
+            ("dts_g", "dts_f", "legacy row", "2026-07-10 08:00:00"),
+        )
+        conn.commit()
+
+    assert summary.verify_dm_threads_for_user("dts_f") != []
+    result = summary.rebuild_dm_threads_for_user("dts_f")
+    assert result["threads"] == 1
+    assert summary.verify_dm_threads_for_user("dts_f") == []
+
+    legacy, fast = _payloads(monkeypatch, "dts_f")
+    assert fast == legacy
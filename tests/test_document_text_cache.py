@@ -0,0 +1,139 @@
+"""Tests for the content-addressed extracted-PDF-text cache."""
+
+from __future__ import annotations
+
+import pytest
+
+from backend.services import document_text_cache as dtc
+
+
+def _pdf(*page_texts: str) -> bytes:
+    """Minimal text PDF (Helvetica, one line per page) with a valid xref."""
+    n = len(page_texts)
+    page_ids = [4 + 2 * i for i in range(n)]
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % i for i in page_ids) + b"] /Count %d >>" % n,
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for pid, text in zip(page_ids, page_texts):
+        stream = b"BT /F1 12 Tf 72 720 Td (" + text.encode("latin-1") + b") Tj ET"
+        objects[pid] = (b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                        b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (pid + 1))
+        objects[pid + 1] = b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for num in sorted(objects):
+        offsets[num] = len(out)
+        out += b"%d 0 obj\n" % num + objects[num] + b"\nendobj\n"
+    xref = len(out)
+    size = max(objects) + 1
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % size
+    for num in range(1, size):
+        out += b"%010d 00000 n \n" % offsets[num]
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref)
+    return bytes(out)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(dtc, "CACHE_DIR", str(tmp_path / "doc_text"))
+    monkeypatch.setattr(dtc, "POOL_WORKERS", 0)
+    monkeypatch.setattr(dtc, "_write_r2", lambda key, body: None)
+    monkeypatch.setattr(dtc, "_read_r2", lambda key: None)
+
+
+def _count_parses(monkeypatch):
+    calls = []
+    real = dtc._extract_worker
+    monkeypatch.setattr(dtc, "_extract_worker", lambda *a: calls.append(1) or real(*a))
+    return calls
+
+
+def test_same_bytes_are_parsed_once(monkeypatch):
+    calls = _count_parses(monkeypatch)
+    data = _pdf("Quarterly plan", "Second page")
+
+    first = dtc.extract_pages(data=data)
+    second = dtc.extract_pages(data=data)
+
+    assert calls == [1]
+    assert first.status == dtc.STATUS_READABLE and first.page_count == 2
+    assert "Quarterly plan" in first.pages[0]["text"]
+    assert second.from_cache and second.pages == first.pages
+    assert second.cache_key == dtc.content_key(data)
+
+
+def test_local_upload_alias_skips_reading_the_file(tmp_path, monkeypatch):
+    from backend.services import steve_document_memory as docmem
+
+    pdf_path = tmp_path / "handbook.pdf"
+    pdf_path.write_bytes(_pdf("Handbook"))
+    monkeypatch.setattr(docmem, "_normalize_local_candidates", lambda value: [str(pdf_path)])
+    assert dtc.extract_pages("uploads/handbook.pdf").status == dtc.STATUS_READABLE
+
+    monkeypatch.setattr(docmem, "load_pdf_bytes", lambda value: pytest.fail("re-read a cached upload"))
+    cached = dtc.extract_pages("uploads/handbook.pdf")
+    assert cached.from_cache and "Handbook" in cached.pages[0]["text"]
+
+    # New bytes at the same path change the alias, so the file is read again.
+    pdf_path.write_bytes(_pdf("Handbook v2", "Appendix"))
+    monkeypatch.setattr(docmem, "load_pdf_bytes", lambda value: (pdf_path.read_bytes(), None))
+    assert dtc.extract_pages("uploads/handbook.pdf").page_count == 2
+
+
+def test_page_budget_truncates_and_unpersisted_calls_leave_no_record(monkeypatch):
+    monkeypatch.setattr(dtc, "MAX_PAGES", 2)
+    data = _pdf("one", "two", "three")
+
+    capped = dtc.extract_pages(data=data)
+    assert capped.truncated and capped.page_count == 3 and len(capped.pages) == 2
+
+    private = dtc.extract_pages(data=_pdf("cv text"), max_pages=1, persist=False)
+    assert private.status == dtc.STATUS_READABLE and private.cache_key is None
+    assert dtc._load(dtc.content_key(_pdf("cv text"))) is None
+
+
+def test_extraction_pool_parses_in_a_worker_process(monkeypatch):
+    monkeypatch.setattr(dtc, "POOL_WORKERS", 1)
+    monkeypatch.setattr(dtc, "_pool", None)
+    try:
+        result = dtc.extract_pages(data=_pdf("from the pool"))
+    finally:
+        pool = dtc._pool
+        if pool is not None:
+            pool.shutdown(wait=True)
+            dtc._pool = None
+    assert result.status == dtc.STATUS_READABLE
+    assert "from the pool" in result.pages[0]["text"]
+
+
+def test_waiting_for_a_busy_pool_is_transient(monkeypatch):
+    import threading
+
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()  # the only worker is parsing someone else's PDF
+    monkeypatch.setattr(dtc, "_get_pool", lambda: object())
+    monkeypatch.setattr(dtc, "_slots", slots)
+    monkeypatch.setattr(dtc, "_SLOT_WAIT_SECONDS", 0.01)
+    monkeypatch.setattr(dtc, "_discard_pool", lambda pool: pytest.fail("killed a healthy pool"))
+    data = _pdf("valid but queued")
+
+    result = dtc.extract_pages(data=data)
+    assert result.status == dtc.STATUS_FAILED and result.error == "extract_busy"
+    assert dtc._load(dtc.content_key(data)) is None
+
+
+def test_failure_records_stay_local_and_expire(monkeypatch):
+    calls = _count_parses(monkeypatch)
+    r2_writes = []
+    monkeypatch.setattr(dtc, "_write_r2", lambda key, body: r2_writes.append(key))
+    data = b"%PDF-1.4 not really a pdf"
+
+    assert dtc.extract_pages(data=data).status == dtc.STATUS_FAILED
+    assert dtc.extract_pages(data=data).from_cache
+    assert calls == [1] and r2_writes == []
+
+    monkeypatch.setattr(dtc, "FAILED_TTL_SECONDS", -1)
+    assert not dtc.extract_pages(data=data).from_cache
+    assert calls == [1, 1]
@@ -0,0 +1,169 @@
+"""Batched email stage — transport batching/retries and the batched sweeps.
+
+The transport tests run anywhere (stub provider / fake session); the sweep
+tests use MySQL like ``test_lifecycle_email.py`` and run with
+``EMAIL_PROVIDER=stub`` + ``EMAIL_BATCH_SEND=1``.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.services import transactional_email as tx
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    monkeypatch.setenv("EMAIL_PROVIDER", "stub")
+    tx.stub_provider.reset()
+    yield tx.stub_provider
+    tx.stub_provider.reset()
+
+
+def _msg(to: str) -> tx.OutboundEmail:
+    return tx.OutboundEmail(to_email=to, subject="s", html="<p>h</p>")
+
+
+def test_send_batch_chunks_and_reports_per_message(stub, monkeypatch):
+    monkeypatch.setenv("EMAIL_BATCH_SIZE", "2")
+    stub.fail_for.add("bad@test.local")
+    statuses = tx.send_batch([_msg("a@test.local"), _msg("b@test.local"), _msg("bad@test.local")])
+    assert statuses == [tx.STATUS_SENT, tx.STATUS_SENT, tx.STATUS_FAILED]
+    # Two chunks, then the rejected one-message chunk is not re-split.
+    assert stub.batch_calls == 2
+    assert [m.to_email for m in stub.sent] == ["a@test.local", "b@test.local"]
+
+
+def test_rejected_chunk_falls_back_to_single_sends(stub):
+    stub.fail_for.add("bad@test.local")
+    statuses = tx.send_batch([_msg("a@test.local"), _msg("bad@test.local"), _msg("c@test.local")])
+    # One bad address rejects the batch; the valid recipients are still mailed.
+    assert statuses == [tx.STATUS_SENT, tx.STATUS_FAILED, tx.STATUS_SENT]
+    assert stub.batch_calls == 1 + 3
+    assert [m.to_email for m in stub.sent] == ["a@test.local", "c@test.local"]
+
+
+def test_resend_chunk_retries_throttling_but_not_rejections(monkeypatch):
+    class _Resp:
+        def __init__(self, code):
+            self.status_code = code
+            self.headers = {"Retry-After": "0"}
+            self.text = ""
+
+    class _Session:
+        def __init__(self, codes):
+            self.codes = list(codes)
+            self.keys = []
+
+        def post(self, url, headers=None, json=None, timeout=None):
+            self.keys.append(headers["Idempotency-Key"])
+            return _Resp(self.codes.pop(0))
+
+    monkeypatch.delenv("EMAIL_PROVIDER", raising=False)
+    monkeypatch.setattr(tx, "RESEND_API_KEY", "k")
+    monkeypatch.setattr(tx.time, "sleep", lambda _s: None)
+
+    session = _Session([429, 503, 200])
+    monkeypatch.setattr(tx, "_http", lambda: session)
+    assert tx.send_batch([_msg("a@test.local")]) == [tx.STATUS_SENT]
+    assert len(set(session.keys)) == 1 and len(session.keys) == 3
+
+    session = _Session([422, 200])
+    monkeypatch.setattr(tx, "_http", lambda: session)
+    assert tx.send_batch([_msg("a@test.local")]) == [tx.STATUS_FAILED]
+    assert len(session.keys) == 1
+
+    # A rejected batch is re-sent per message with the same retry path:
+    # a throttled single send comes back retryable, not failed.
+    session = _Session([422, 200, 429, 429, 429, 422])
+    monkeypatch.setattr(tx, "_http", lambda: session)
+    monkeypatch.setenv("EMAIL_BATCH_CONCURRENCY", "1")
+    statuses = tx.send_batch([_msg("a@test.local"), _msg("b@test.local"), _msg("bad@test.local")])
+    assert statuses == [tx.STATUS_SENT, tx.STATUS_RETRYABLE, tx.STATUS_FAILED]
+
+
+def _join_community(username: str, community_id: int) -> None:
+    from backend.services.database import get_db_connection, get_sql_placeholder
+
+    ph = get_sql_placeholder()
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            f"""
+            INSERT INTO user_communities (user_id, community_id, role)
+            SELECT id, {ph}, 'member' FROM users WHERE username = {ph}
+            """,
+            (community_id, username),
+        )
+        conn.commit()
+
+
+def _sends_rows():
+    from backend.services.database import get_db_connection
+
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute("SELECT recipient, kind FROM lifecycle_email_sends ORDER BY id")
+        return [(r["recipient"], r["kind"]) for r in c.fetchall() or []]
+
+
+@pytest.fixture
+def batched(monkeypatch, stub):
+    for flag in (
+        "LIFECYCLE_EMAIL_ENABLED", "WELCOME_EMAIL_ENABLED",
+        "ACTIVATION_NUDGE_EMAIL_ENABLED", "EMAIL_BATCH_SEND",
+    ):
+        monkeypatch.setenv(flag, "1")
+    return stub
+
+
+def test_batched_welcome_sweep_reserves_in_bulk(mysql_dsn, batched):
+    from backend.services import email_preferences
+    from backend.services import lifecycle_email_dispatch as dispatch
+    from tests.fixtures import make_community, make_user
+
+    make_user("batch_owner")
+    make_user("batch_member")
+    make_user("batch_optout")
+    cid = make_community("Batch Club", creator_username="someone")
+    _join_community("batch_member", cid)
+    row = email_preferences.get_or_create("batch_optout", "batch_optout@test.local")
+    email_preferences.set_lifecycle_optout_by_token(row["unsubscribe_token"], True)
+
+    out = dispatch.run_welcome_sweep()
+    assert out["sent"] == 2
+    assert out["skipped_suppressed"] == 1
+    assert batched.batch_calls == 1
+    by_to = {m.to_email: m for m in batched.sent}
+    assert "Batch Club" in by_to["batch_member@test.local"].subject
+    assert "List-Unsubscribe" in by_to["batch_owner@test.local"].headers
+    rows = _sends_rows()
+    assert ("batch_owner", "welcome") in rows
+    assert ("batch_optout", "welcome") not in rows
+
+    assert dispatch.run_welcome_sweep()["candidates"] == 0
+
+
+def test_batched_nudges_keep_contact_gap(mysql_dsn, batched):
+    from backend.services import lifecycle_email_dispatch as dispatch
+    from backend.services.database import get_db_connection, get_sql_placeholder
+    from tests.fixtures import make_user
+
+    make_user("gap_batch", created_at=datetime.utcnow() - timedelta(days=3))
+    make_user("idle_batch", created_at=datetime.utcnow() - timedelta(days=3))
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        dispatch._ensure_sends_table(c)
+        ph = get_sql_placeholder()
+        c.execute(
+            f"INSERT INTO lifecycle_email_sends (recipient, kind, sent_at) VALUES ({ph}, 'welcome', {ph})",
+            ("gap_batch", (datetime.utcnow() - timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S")),
+        )
+        conn.commit()
+
+    out = dispatch.run_activation_nudge_sweep()
+    assert out["no_community"]["sent"] == 1
+    assert out["no_community"]["skipped"] == 1
+    assert [m.to_email for m in batched.sent] == ["idle_batch@test.local"]
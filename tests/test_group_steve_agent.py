@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import openai
 import pytest
 
 from tests.fixtures import make_community, make_user
@@ -389,7 +390,7 @@ def test_group_steve_does_not_build_community_context(monkeypatch, mysql_dsn):
         responses = _R()
 
     monkeypatch.setattr(ba, "XAI_API_KEY", "test-key")
-    monkeypatch.setattr(ba, "OpenAI", _Client)
+    monkeypatch.setattr(openai, "OpenAI", _Client)
 
     def _forbidden(*args, **kwargs):
         raise AssertionError("_build_steve_community_context must not run for group Steve")
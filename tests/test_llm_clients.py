@@ -0,0 +1,125 @@
+"""Shared LLM client registry: caching, pool metrics, stub provider."""
+
+from __future__ import annotations
+
+import openai
+import pytest
+
+from backend.services import llm_clients
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry():
+    llm_clients.reset_llm_clients()
+    yield
+    llm_clients.reset_llm_clients()
+
+
+def _chat_completion(text: str) -> dict:
+    return {
+        "id": "cmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "grok-test",
+        "choices": [
+            {"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}
+        ],
+    }
+
+
+def _metered_client(handler, provider=llm_clients.PROVIDER_XAI):
+    httpx_mod = llm_clients._httpx_module_for(openai)
+    transport_cls, _ = llm_clients._metered_classes(httpx_mod)
+    transport = transport_cls(httpx_mod.MockTransport(handler), llm_clients._provider_state(provider))
+    return openai.OpenAI(
+        api_key="k",
+        base_url=llm_clients.XAI_BASE_URL,
+        max_retries=2,
+        http_client=openai.DefaultHttpxClient(transport=transport),
+    ), httpx_mod
+
+
+def test_clients_are_shared_per_provider_and_key():
+    a = llm_clients.get_llm_client(llm_clients.PROVIDER_XAI, api_key="key-1")
+    b = llm_clients.get_llm_client(llm_clients.PROVIDER_XAI, api_key="key-1")
+    c = llm_clients.get_llm_client(llm_clients.PROVIDER_XAI, api_key="key-2")
+    assert a is b
+    assert a is not c
+    assert str(a.base_url).startswith(llm_clients.XAI_BASE_URL)
+    # One keep-alive pool serves every key for the same provider endpoint.
+    assert llm_clients.llm_client_metrics()["http_pools"] == 1
+
+
+def test_patched_sdk_class_is_not_cached(monkeypatch):
+    built = []
+
+    class _Fake:
+        def __init__(self, **kwargs):
+            built.append(kwargs)
+
+    monkeypatch.setattr(openai, "OpenAI", _Fake)
+    llm_clients.get_llm_client(llm_clients.PROVIDER_OPENAI, api_key="x")
+    llm_clients.get_llm_client(llm_clients.PROVIDER_OPENAI, api_key="x")
+    assert len(built) == 2
+    assert "http_client" not in built[0]
+
+
+def test_metrics_count_calls_retries_and_429s():
+    calls = {"n": 0}
+
+    def handler(request):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            return httpx_mod.Response(429, headers={"retry-after": "0"}, json={"error": {"message": "slow down"}})
+        return httpx_mod.Response(200, json=_chat_completion("hi"))
+
+    client, httpx_mod = _metered_client(handler)
+    resp = client.chat.completions.create(model="grok-test", messages=[{"role": "user", "content": "x"}])
+
+    assert resp.choices[0].message.content == "hi"
+    snap = llm_clients.llm_client_metrics()["providers"]["xai"]
+    assert snap["calls"] == 2
+    assert snap["retries"] == 1
+    assert snap["rate_limited"] == 1
+    assert snap["in_flight"] == 0
+    assert snap["latency_ms"]["samples"] == 2
+    assert snap["latency_ms"]["p50"] is not None
+
+
+def test_concurrency_slot_released_after_transport_error():
+    def handler(request):
+        raise httpx_mod.ConnectError("down", request=request)
+
+    client, httpx_mod = _metered_client(handler)
+    client = client.with_options(max_retries=0)
+    with pytest.raises(openai.APIConnectionError):
+        client.chat.completions.create(model="grok-test", messages=[{"role": "user", "content": "x"}])
+
+    state = llm_clients._provider_state(llm_clients.PROVIDER_XAI)
+    snap = state.metrics.snapshot()
+    assert snap["errors"] == 1
+    assert snap["in_flight"] == 0
+    # All slots are free again.
+    acquired = [state.semaphore.acquire(blocking=False) for _ in range(snap["max_concurrency"])]
+    assert all(acquired)
+
+
+def test_stub_client_answers_every_surface():
+    stub = llm_clients.set_stub_client(llm_clients.StubLLMClient(reply="canned"))
+    client = llm_clients.get_llm_client(llm_clients.PROVIDER_XAI)
+    assert client is stub
+
+    assert client.responses.create(model="m", input=[]).output_text == "canned"
+    assert client.chat.completions.create(model="m", messages=[]).choices[0].message.content == "canned"
+    vec = client.embeddings.create(model="e", input=["hello"]).data[0].embedding
+    assert len(vec) == llm_clients.STUB_EMBEDDING_DIMENSIONS
+    assert client.messages.create(model="c", messages=[]).content[0].text == "canned"
+    events = list(client.responses.create(model="m", input=[], stream=True))
+    assert events[-1].type == "response.completed"
+    assert [surface for surface, _ in stub.calls] == ["responses", "chat", "embeddings", "messages", "responses"]
+
+
+def test_stub_provider_env(monkeypatch):
+    monkeypatch.setenv("LLM_STUB_PROVIDER", "1")
+    client = llm_clients.get_llm_client(llm_clients.PROVIDER_OPENAI, api_key="real")
+    assert isinstance(client, llm_clients.StubLLMClient)
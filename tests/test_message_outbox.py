@@ -0,0 +1,245 @@
+"""Message outbox: sends enqueue side effects, the dispatcher coalesces them.
+
+With ``MESSAGE_OUTBOX_ENABLED`` on, a DM send must only write the message and
+its outbox rows; push / Firestore happen on drain, once per (recipient,
+sender) burst. Failed rows back off and are dead-lettered after
+``OUTBOX_MAX_ATTEMPTS``.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from backend.services import message_outbox
+from backend.services.database import get_db_connection
+from backend.services.dm_send_message import send_dm_text_message
+from redis_cache import cache
+from tests.fixtures import make_user
+from tests.test_dm_send_message import _ensure_messages_table, _recipient_id
+
+
+@pytest.fixture()
+def needs_mysql(mysql_dsn):
+    return mysql_dsn
+
+
+@pytest.fixture(autouse=True)
+def _clean_outbox(needs_mysql):
+    message_outbox.ensure_message_outbox_table()
+    yield
+
+
+def _outbox_rows() -> list[dict]:
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute("SELECT id, kind, attempts, dead, last_error FROM message_outbox ORDER BY id")
+        return [dict(r) for r in c.fetchall()]
+
+
+@patch("backend.services.message_outbox.kick_outbox_dispatcher")
+@patch("backend.services.dm_send_message.kick_outbox_dispatcher")
+@patch("backend.services.dm_send_message.send_push_to_user")
+def test_dm_send_enqueues_and_drain_coalesces_push(mock_push, _kick, _kick2, monkeypatch):
+    cache.flush_all()
+    _ensure_messages_table()
+    make_user("obx_a", subscription="premium")
+    make_user("obx_b", subscription="premium")
+    monkeypatch.setenv("MESSAGE_OUTBOX_ENABLED", "true")
+
+    for text in ("one", "two", "three"):
+        out = send_dm_text_message("obx_a", recipient_id=_recipient_id("obx_b"), message=text)
+        assert out["success"] is True
+
+    # The sender's thread list is dropped inline; the recipient's waits for the drain.
+    cache.set("chat_threads:obx_a", {"threads": []}, 60)
+    cache.set("chat_threads:obx_b", {"threads": []}, 60)
+    send_dm_text_message("obx_a", recipient_id=_recipient_id("obx_b"), message="three")
+    assert cache.get("chat_threads:obx_a") is None
+    assert cache.get("chat_threads:obx_b") is not None
+
+    kinds = sorted(r["kind"] for r in _outbox_rows())
+    assert kinds == ["dm_notify"] * 4 + ["firestore"] * 4
+    mock_push.assert_not_called()
+
+    with patch("backend.services.firestore_writes.write_batch", return_value=3) as mock_batch:
+        result = message_outbox.drain_outbox()
+
+    assert result["delivered"] == 8
+    assert _outbox_rows() == []
+    mock_batch.assert_called_once()
+    assert len(mock_batch.call_args[0][0]) == 4
+    assert mock_push.call_count == 1
+    assert mock_push.call_args[0][1]["body"] == "three"
+
+
+@patch("backend.services.dm_send_message.kick_outbox_dispatcher")
+def test_failed_enqueue_rolls_back_the_message(_kick, monkeypatch):
+    _ensure_messages_table()
+    make_user("obx_c", subscription="premium")
+    make_user("obx_d", subscription="premium")
+    monkeypatch.setenv("MESSAGE_OUTBOX_ENABLED", "true")
+
+    def boom(cursor, events):
+        raise RuntimeError("outbox down")
+
+    monkeypatch.setattr("backend.services.dm_send_message.enqueue_outbox_events", boom)
+    out = send_dm_text_message("obx_c", recipient_id=_recipient_id("obx_d"), message="lost?")
+    assert out["success"] is False
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute("SELECT COUNT(*) AS n FROM messages WHERE sender = 'obx_c'")
+        assert c.fetchone()["n"] == 0
+
+
+def test_failed_rows_back_off_then_dead_letter(monkeypatch):
+    monkeypatch.setattr(message_outbox, "OUTBOX_MAX_ATTEMPTS", 2)
+    monkeypatch.setitem(
+        message_outbox._HANDLERS,
+        message_outbox.KIND_POST_NOTIFY,
+        lambda rows: {r["id"]: "boom" for r in rows},
+    )
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        message_outbox.enqueue_outbox_events(c, [(message_outbox.KIND_POST_NOTIFY, {"post_id": 1})])
+        conn.commit()
+
+    assert message_outbox.drain_outbox()["retried"] == 1
+    row = _outbox_rows()[0]
+    assert row["attempts"] == 1 and row["dead"] == 0 and row["last_error"] == "boom"
+    # Backoff keeps the row out of the next claim.
+    assert message_outbox.claim_outbox_batch() == []
+
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute("UPDATE message_outbox SET available_at = '2000-01-01 00:00:00'")
+        conn.commit()
+    assert message_outbox.drain_outbox()["dead_lettered"] == 1
+    assert _outbox_rows()[0]["dead"] == 1
+
+    stats = message_outbox.outbox_stats()
+    assert stats["pending"] == 0 and stats["dead"] == 1
+
+
+def test_claim_leases_rows_to_one_worker():
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        message_outbox.enqueue_outbox_events(
+            c, [(message_outbox.KIND_POST_NOTIFY, {"post_id": i}) for i in range(3)]
+        )
+        conn.commit()
+
+    first = message_outbox.claim_outbox_batch(limit=2)
+    second = message_outbox.claim_outbox_batch(limit=10)
+    assert len(first) == 2
+    assert len(second) == 1
+    assert {r["id"] for r in first}.isdisjoint({r["id"] for r in second})
+
+
+def test_reclaimed_weekly_push_is_not_sent_twice(monkeypatch):
+    sent = []
+    monkeypatch.setattr(
+        "backend.services.member_digest.deliver_queued_digest", lambda p: sent.append(p["n"])
+    )
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        message_outbox.enqueue_outbox_events(
+            c, [(message_outbox.KIND_WEEKLY_PUSH, {"event": "member_digest", "n": i}) for i in range(2)]
+        )
+        conn.commit()
+
+    stale = message_outbox.claim_outbox_batch()
+    # The lease lapsed and another dispatcher re-claimed (and will deliver) the first row.
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            "UPDATE message_outbox SET lease_token = 'other' WHERE id = %s", (stale[0]["id"],)
+        )
+        conn.commit()
+
+    message_outbox.dispatch_outbox_batch(stale)
+    assert sent == [1]
+    assert [r["id"] for r in _outbox_rows()] == [stale[0]["id"]]
+
+
+def test_firestore_batch_creates_with_stored_time_and_keeps_existing_docs(monkeypatch):
+    from datetime import datetime
+
+    from backend.services import firestore_writes
+
+    class _Ref:
+        def __init__(self, path):
+            self.path = path
+
+        def collection(self, name):
+            return _Col(f"{self.path}/{name}")
+
+    class _Col(_Ref):
+        def document(self, doc_id):
+            return _Ref(f"{self.path}/{doc_id}")
+
+    class _Batch:
+        def __init__(self, writes):
+            self.writes = writes
+
+        def set(self, ref, data, merge=False):
+            self.writes.append(("set", ref.path, data))
+
+        def create(self, ref, data):
+            self.writes.append(("create", ref.path, data))
+
+        def commit(self):
+            pass
+
+    class _Fs:
+        def __init__(self):
+            self.writes = []
+
+        def collection(self, name):
+            return _Col(name)
+
+        def batch(self):
+            return _Batch(self.writes)
+
+        def get_all(self, refs):
+            for ref in refs:
+                yield type("S", (), {"reference": ref, "exists": ref.path == "posts/1"})()
+
+    fs = _Fs()
+    monkeypatch.setattr(firestore_writes, "USE_FIRESTORE_WRITES", True)
+    monkeypatch.setattr(firestore_writes, "_get_client", lambda: fs)
+    sent_at = datetime(2026, 1, 2, 3, 4, 5)
+    firestore_writes.write_batch([
+        ("post", {"post_id": 1, "username": "a", "content": "edited since"}),
+        ("group_chat_message", {"group_id": 7, "message_id": 9, "sender": "a", "timestamp": sent_at}),
+    ])
+
+    assert [(verb, path) for verb, path, _ in fs.writes] == [
+        ("set", "group_chats/7"),
+        ("create", "group_chats/7/messages/9"),
+    ]
+    assert fs.writes[1][2]["created_at"] == sent_at
+
+
+def test_dm_notify_failure_only_retries_the_failing_burst(monkeypatch):
+    pushed = []
+
+    def deliver(c, *, sender, recipient, preview, message_id=None):
+        if recipient == "obx_down":
+            raise RuntimeError("push down")
+        pushed.append(recipient)
+
+    monkeypatch.setattr("backend.services.dm_send_message.deliver_dm_notification", deliver)
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        message_outbox.enqueue_outbox_events(c, [
+            (message_outbox.KIND_DM_NOTIFY, {"sender": "obx_s", "receiver": "obx_up", "message_id": 1}),
+            (message_outbox.KIND_DM_NOTIFY, {"sender": "obx_s", "receiver": "obx_down", "message_id": 2}),
+        ])
+        conn.commit()
+
+    result = message_outbox.drain_outbox()
+    assert pushed == ["obx_up"]
+    assert result["retried"] == 1
+    assert [r["last_error"] for r in _outbox_rows()] == ["dm_notify: push down"]
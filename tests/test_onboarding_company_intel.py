@@ -20,7 +20,7 @@ def test_fetch_company_intel_xai_success(monkeypatch: pytest.MonkeyPatch) -> Non
     inst = MagicMock()
     inst.responses.create.return_value = resp
 
-    with patch.object(oci, "OpenAI", return_value=inst):
+    with patch("openai.OpenAI", return_value=inst):
         text, r, mid = fetch_company_intel_blurb("Acme")
 
     assert text == "Acme makes widgets."
@@ -39,7 +39,7 @@ def test_fetch_company_intel_openai_only(monkeypatch: pytest.MonkeyPatch) -> Non
     inst = MagicMock()
     inst.responses.create.return_value = resp
 
-    with patch.object(oci, "OpenAI", return_value=inst):
+    with patch("openai.OpenAI", return_value=inst):
         text, r, mid = fetch_company_intel_blurb("Contoso")
 
     assert text == "OpenAI-only blurb."
@@ -69,7 +69,7 @@ def test_fetch_company_intel_openai_fallback_when_xai_empty(monkeypatch: pytest.
             return xai_inst
         return oai_inst
 
-    with patch.object(oci, "OpenAI", side_effect=client_factory):
+    with patch("openai.OpenAI", side_effect=client_factory):
         text, r, mid = fetch_company_intel_blurb("Fabrikam", role="Engineer")
 
     assert text == "Recovered via OpenAI."
@@ -98,7 +98,7 @@ def test_fetch_company_intel_both_paths_fail_returns_empty_model(
             return xai_inst
         return oai_inst
 
-    with patch.object(oci, "OpenAI", side_effect=client_factory):
+    with patch("openai.OpenAI", side_effect=client_factory):
         text, r, mid = fetch_company_intel_blurb("UnknownCo")
 
     assert text == ""
@@ -51,7 +51,7 @@ def test_run_onboarding_chat_completion_openai_only(monkeypatch: pytest.MonkeyPa
     mock_resp = MagicMock()
     mock_resp.choices = [MagicMock(message=MagicMock(content="ok"))]
 
-    with patch("backend.services.onboarding_llm.OpenAI") as mock_openai:
+    with patch("openai.OpenAI") as mock_openai:
         inst = MagicMock()
         mock_openai.return_value = inst
         inst.chat.completions.create.return_value = mock_resp
@@ -83,7 +83,7 @@ def test_run_onboarding_chat_completion_xai_fails_then_openai(monkeypatch: pytes
             return xai_inst
         return oai_inst
 
-    with patch("backend.services.onboarding_llm.OpenAI", side_effect=client_factory):
+    with patch("openai.OpenAI", side_effect=client_factory):
         r, mid = run_onboarding_chat_completion(
             [{"role": "user", "content": "hi"}],
             max_tokens=10,
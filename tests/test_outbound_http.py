@@ -0,0 +1,141 @@
+"""Shared outbound HTTP layer: response cache, revalidation, negative cache, stale-if-error."""
+
+from __future__ import annotations
+
+import time as _real_time
+
+import pytest
+import requests
+
+from backend.services import outbound_http
+from redis_cache import cache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = _real_time.time()
+
+    def time(self) -> float:
+        return self.now
+
+    def perf_counter(self) -> float:
+        return _real_time.perf_counter()
+
+
+class _Resp:
+    def __init__(self, status: int, text: str = "", headers=None) -> None:
+        self.status_code = status
+        self.text = text
+        self.headers = headers or {}
+
+
+class _Session:
+    def __init__(self, *responses) -> None:
+        self.responses = list(responses)
+        self.calls = []
+
+    def request(self, method, url, headers=None, timeout=None, allow_redirects=True):
+        self.calls.append((method, url, dict(headers or {})))
+        nxt = self.responses.pop(0)
+        if isinstance(nxt, Exception):
+            raise nxt
+        return nxt
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = _Clock()
+    monkeypatch.setattr(outbound_http, "time", c)
+    return c
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state():
+    cache.flush_all()
+    outbound_http.reset_outbound_http()
+    yield
+    cache.flush_all()
+    outbound_http.reset_outbound_http()
+
+
+def _use(monkeypatch, session: _Session) -> _Session:
+    monkeypatch.setattr(outbound_http, "_http", lambda: session)
+    return session
+
+
+def test_fresh_hit_then_etag_revalidation(monkeypatch, clock):
+    s = _use(monkeypatch, _Session(
+        _Resp(200, '{"data": [1]}', {"ETag": '"v1"', "Content-Type": "application/json"}),
+        _Resp(304),
+    ))
+    url = "https://api.example.com/gifs?q=cat"
+
+    first = outbound_http.fetch(url, ttl=60)
+    second = outbound_http.fetch(url, ttl=60)
+    assert first.json() == {"data": [1]} and not first.from_cache
+    assert second.from_cache and second.json() == {"data": [1]}
+    assert len(s.calls) == 1
+
+    clock.now += 61
+    third = outbound_http.fetch(url, ttl=60)
+    assert s.calls[1][2]["If-None-Match"] == '"v1"'
+    assert third.json() == {"data": [1]} and third.from_cache
+
+    host = outbound_http.outbound_http_metrics()["hosts"]["api.example.com"]
+    assert host["requests"] == 2 and host["hits"] == 1 and host["revalidated"] == 1
+
+
+def test_client_errors_are_negatively_cached_with_body(monkeypatch, clock):
+    s = _use(monkeypatch, _Session(_Resp(404, '{"message": "nope"}'), _Resp(200, "back")))
+    url = "https://example.org/gone"
+
+    first = outbound_http.fetch(url, negative_ttl=30)
+    again = outbound_http.fetch(url, negative_ttl=30)
+    assert first.status_code == again.status_code == 404
+    assert again.from_cache and again.json() == {"message": "nope"}
+    assert len(s.calls) == 1
+
+    clock.now += 31
+    assert outbound_http.fetch(url, negative_ttl=30).text == "back"
+
+
+def test_upstream_failure_serves_stale_copy(monkeypatch, clock):
+    s = _use(monkeypatch, _Session(
+        _Resp(200, "good"),
+        _Resp(503, "down"),
+        requests.ConnectionError("reset"),
+    ))
+    url = "https://example.net/a"
+
+    outbound_http.fetch(url, ttl=10, stale_ttl=100)
+    clock.now += 11
+    stale = outbound_http.fetch(url, ttl=10, stale_ttl=100)
+    assert stale.stale and stale.ok and stale.text == "good"
+    failed = outbound_http.fetch("https://example.net/b", ttl=10)
+    assert failed.error and not failed.ok
+    assert len(s.calls) == 3
+    assert outbound_http.outbound_http_metrics()["hosts"]["example.net"]["stale_served"] == 1
+
+
+def test_cached_lookup_caches_values_and_errors(clock):
+    calls = []
+
+    def ok():
+        calls.append("ok")
+        return "transcript", None
+
+    def broken():
+        calls.append("broken")
+        return None, "disabled"
+
+    assert outbound_http.cached_lookup("yt", "abc", ok, ttl=60) == ("transcript", None)
+    assert outbound_http.cached_lookup("yt", "abc", ok, ttl=60) == ("transcript", None)
+    assert outbound_http.cached_lookup("yt", "xyz", broken, ttl=60, negative_ttl=5) == (None, "disabled")
+    assert outbound_http.cached_lookup("yt", "xyz", broken, ttl=60, negative_ttl=5) == (None, "disabled")
+    assert calls == ["ok", "broken"]
+
+    clock.now += 61
+    # Past ttl but inside stale_ttl: a failing refresh keeps the last value.
+    outbound_http.cached_lookup("yt", "keep", ok, ttl=60, stale_ttl=600)
+    clock.now += 61
+    assert outbound_http.cached_lookup("yt", "keep", broken, ttl=60, stale_ttl=600) == ("transcript", None)
@@ -176,3 +176,46 @@ def test_invalid_post_id_bypasses_cache():
         post_detail_cache.get_cached_community_post_detail(0, "alice")
 
     assert calls["n"] == 2
+
+
+def test_single_source_shares_body_and_overlays_per_viewer(monkeypatch):
+    from backend.services import post_detail_cache
+
+    monkeypatch.setenv("POST_DETAIL_SINGLE_SOURCE", "1")
+    builds = {"n": 0}
+    overlaid = []
+
+    def fake_build(post_id):
+        builds["n"] += 1
+        return {"id": post_id, "content": "shared", "replies": []}
+
+    def fake_overlay(shared, username):
+        overlaid.append(username)
+        post = dict(shared)
+        post["is_starred"] = username == "alice"
+        return {"success": True, "post": post}, 200
+
+    with patch(
+        "backend.services.post_detail_read.build_community_post_shared", side_effect=fake_build
+    ), patch(
+        "backend.services.post_detail_read.apply_community_viewer_overlay", side_effect=fake_overlay
+    ):
+        alice, _ = post_detail_cache.get_cached_community_post_detail(5, "alice")
+        bob, _ = post_detail_cache.get_cached_community_post_detail(5, "bob")
+        post_detail_cache.get_cached_community_post_detail(5, "bob")
+
+    assert builds["n"] == 1
+    assert overlaid == ["alice", "bob"]
+    assert alice["post"]["is_starred"] is True
+    assert bob["post"]["is_starred"] is False
+
+
+def test_invalidate_post_detail_drops_shared_body(monkeypatch):
+    from backend.services import post_detail_cache
+    from redis_cache import post_detail_community_shared_key
+
+    cache.set(post_detail_community_shared_key(9), {"id": 9}, 60)
+    post_detail_cache.invalidate_post_detail_viewer(9, "alice")
+    assert cache.get(post_detail_community_shared_key(9)) is not None
+    post_detail_cache.invalidate_post_detail(9)
+    assert cache.get(post_detail_community_shared_key(9)) is None
@@ -199,3 +199,72 @@ def test_read_group_post_detail_invalid_id_returns_400_payload(mysql_dsn):
 
     body, status = read_group_post_detail(0, "anyone")
     assert body["success"] is False
+
+
+def _insert_reply(post_id: int, username: str, content: str, parent_reply_id=None) -> int:
+    ph = get_sql_placeholder()
+    ts = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            f"""
+            INSERT INTO replies (post_id, username, content, timestamp, parent_reply_id)
+            VALUES ({ph}, {ph}, {ph}, {ph}, {ph})
+            """,
+            (post_id, username, content, ts, parent_reply_id),
+        )
+        reply_id = int(c.lastrowid)
+        try:
+            conn.commit()
+        except Exception:
+            pass
+        return reply_id
+
+
+def test_single_source_read_matches_legacy_body(mysql_dsn, monkeypatch):
+    from backend.services.post_detail_read import read_community_post_detail
+
+    make_user("pd_ss_author", subscription="premium")
+    make_user("pd_ss_viewer", subscription="premium")
+    community_id = make_community("pd-single-source", tier="free", creator_username="pd_ss_author")
+    _join_community("pd_ss_viewer", community_id)
+    post_id = _insert_post(community_id, "pd_ss_author", "single source")
+    _insert_poll(post_id, "pd_ss_viewer")
+    root = _insert_reply(post_id, "pd_ss_author", "root")
+    _insert_reply(post_id, "pd_ss_viewer", "child", parent_reply_id=root)
+    ph = get_sql_placeholder()
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            f"INSERT INTO reply_reactions (reply_id, username, reaction_type) VALUES ({ph}, {ph}, {ph})",
+            (root, "pd_ss_viewer", "heart"),
+        )
+        conn.commit()
+
+    with patch("backend.services.firestore_reads.USE_FIRESTORE_READS", False):
+        legacy, legacy_status = read_community_post_detail(post_id, "pd_ss_viewer")
+        monkeypatch.setenv("POST_DETAIL_SINGLE_SOURCE", "1")
+        single, single_status = read_community_post_detail(post_id, "pd_ss_viewer")
+
+    assert legacy_status == single_status == 200
+    assert single == legacy
+    reply = single["post"]["replies"][0]
+    assert reply["reactions"] == {"heart": 1}
+    assert reply["user_reaction"] == "heart"
+    assert reply["reply_count"] == 1
+    assert single["post"]["poll"]["user_vote"] is not None
+
+
+def test_single_source_read_keeps_membership_gate(mysql_dsn, monkeypatch):
+    from backend.services.post_detail_read import read_community_post_detail
+
+    make_user("pd_ss_owner", subscription="premium")
+    make_user("pd_ss_outsider", subscription="premium")
+    community_id = make_community("pd-ss-private", tier="free", creator_username="pd_ss_owner")
+    post_id = _insert_post(community_id, "pd_ss_owner", "members only")
+
+    monkeypatch.setenv("POST_DETAIL_SINGLE_SOURCE", "1")
+    body, status = read_community_post_detail(post_id, "pd_ss_outsider")
+
+    assert status == 404
+    assert "post" not in body
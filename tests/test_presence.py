@@ -0,0 +1,68 @@
+"""Tests for the cache-backed presence / typing store."""
+
+from __future__ import annotations
+
+import pytest
+
+from backend.services import presence
+from redis_cache import cache
+
+
+@pytest.fixture(autouse=True)
+def _clean_cache():
+    cache.flush_all()
+    presence._local.clear()
+    yield
+    cache.flush_all()
+    presence._local.clear()
+
+
+def test_viewing_group_is_one_bulk_lookup_and_case_insensitive(monkeypatch):
+    presence.touch_group_presence("Alice", 7)
+    presence.touch_group_presence("carol", 8)
+
+    calls = []
+    real_get_many = cache.get_many
+    monkeypatch.setattr(cache, "get_many", lambda keys: calls.append(list(keys)) or real_get_many(keys))
+
+    assert presence.viewing_group(7, ["alice", "Bob", "carol"]) == {"alice"}
+    assert len(calls) == 1 and len(calls[0]) == 3
+    assert presence.is_viewing_group("ALICE", 7) is True
+    assert presence.is_viewing_group("alice", 8) is False
+
+
+def test_stale_heartbeats_and_cleared_typing_read_as_absent(monkeypatch):
+    presence.touch_dm_presence("alice", "bob")
+    presence.set_typing("alice", "bob", True)
+    assert presence.is_viewing_dm("alice", "bob") is True
+    assert presence.is_viewing_dm("bob", "alice") is False
+    assert presence.is_typing("alice", "bob") is True
+
+    presence.set_typing("alice", "bob", False)
+    assert presence.is_typing("alice", "bob") is False
+
+    # A stamp older than the window is ignored even if the key is still live.
+    cache.set(presence.dm_presence_key("alice", "bob"), 0, 60)
+    assert presence.viewing_dm("bob", ["alice"]) == set()
+
+
+def test_local_store_answers_when_shared_cache_misses(monkeypatch):
+    monkeypatch.setattr(presence, "_mirrored", lambda: True)
+    presence.touch_group_presence("alice", 3)
+    cache.flush_all()  # shared cache lost the key (e.g. Redis unavailable)
+
+    assert presence.viewing_group(3, ["alice", "bob"]) == {"alice"}
+
+
+def test_record_active_chat_skips_sql_when_flag_on(monkeypatch):
+    from backend.services import dm_active_chat
+
+    monkeypatch.setenv("PRESENCE_CACHE", "true")
+
+    def _no_db():
+        raise AssertionError("presence heartbeat touched the database")
+
+    monkeypatch.setattr(dm_active_chat, "get_db_connection", _no_db)
+    body, status = dm_active_chat.record_active_chat("alice", peer="bob")
+    assert status == 200 and body["success"] is True
+    assert presence.is_viewing_dm("alice", "bob") is True
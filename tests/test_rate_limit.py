@@ -2,11 +2,14 @@
 
 Pure unit tests — the limiter is exercised against a stub cache, no MySQL
 or Redis required. Covers the fixed-window count, the fail-open contract
-when the cache is unavailable, and identity normalisation.
+when the cache is unavailable, identity normalisation, and the sliding-window
+log (``check``) against the in-process ``MemoryCache``.
 """
 
 from __future__ import annotations
 
+import pytest
+
 import backend.services.rate_limit as rate_limit
 import redis_cache
 
@@ -56,3 +59,106 @@ def test_blank_identity_and_degenerate_limits_allow():
     assert rate_limit.allow("report_post", "", max_events=1, window_seconds=3600)
     assert rate_limit.allow("report_post", "alice", max_events=0, window_seconds=3600)
     assert rate_limit.allow("report_post", "alice", max_events=1, window_seconds=0)
+
+
+# ── Sliding window ──────────────────────────────────────────────────
+
+
+class _Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class _CountingCache(redis_cache.MemoryCache):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def sliding_window(self, *args, **kwargs):
+        self.calls += 1
+        return super().sliding_window(*args, **kwargs)
+
+
+def _sliding_cache(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(redis_cache, "time", clock)
+    monkeypatch.setattr(rate_limit, "time", clock)
+    cache = _CountingCache()
+    monkeypatch.setattr(redis_cache, "cache", cache)
+    rate_limit.reset_leases()
+    return cache, clock
+
+
+def _max_in_any_window(admitted, window_seconds):
+    return max(
+        sum(1 for t in admitted if start <= t <= start + window_seconds) for start in admitted
+    )
+
+
+@pytest.mark.parametrize("lease", [0, 4])
+def test_no_window_ever_admits_more_than_max_events(monkeypatch, lease):
+    _, clock = _sliding_cache(monkeypatch)
+    admitted = []
+    # A steady stream well above the limit for three hours, with a burst
+    # right at every hour edge.
+    for step in range(3 * 3600 // 30):
+        for _ in range(20 if step % 120 in (119, 0) else 1):
+            if rate_limit.check("report_post", "alice", max_events=15, window_seconds=3600, lease=lease).allowed:
+                admitted.append(clock.now)
+        clock.now += 30
+    assert _max_in_any_window(admitted, 3600) <= 15
+    if not lease:
+        assert len(admitted) >= 3 * 15
+    else:
+        # Sparse traffic lets most leased units lapse unspent: stricter, never looser.
+        assert admitted
+
+
+def test_denial_reports_remaining_and_retry_after(monkeypatch):
+    _, clock = _sliding_cache(monkeypatch)
+    spent = []
+    for _ in range(5):
+        clock.now += 10
+        spent.append(rate_limit.check("report_post", "alice", max_events=4, window_seconds=60))
+    assert [r.allowed for r in spent] == [True, True, True, True, False]
+    assert [r.remaining for r in spent[:4]] == [3, 2, 1, 0]
+    denied = spent[-1]
+    # The first event (40 s ago) leaves the window in just over 20 s.
+    assert 20 < denied.retry_after <= 21
+    assert denied.headers()["Retry-After"] == "21"
+    assert denied.headers()["RateLimit-Remaining"] == "0"
+
+    clock.now += 21
+    assert rate_limit.check("report_post", "alice", max_events=4, window_seconds=60).allowed
+    assert not rate_limit.check("report_post", "alice", max_events=4, window_seconds=60).allowed
+
+
+def test_allow_uses_sliding_window_behind_flag(monkeypatch):
+    _sliding_cache(monkeypatch)
+    monkeypatch.setenv("RATE_LIMIT_SLIDING_WINDOW", "true")
+    results = [rate_limit.allow("report_post", "Alice", max_events=2, window_seconds=60) for _ in range(3)]
+    assert results == [True, True, False]
+
+
+def test_lease_serves_hot_action_locally_without_overspending(monkeypatch):
+    cache, _ = _sliding_cache(monkeypatch)
+    results = [
+        rate_limit.check("send_message", "alice", max_events=10, window_seconds=60, lease=4)
+        for _ in range(10)
+    ]
+    assert all(r.allowed for r in results)
+    assert not rate_limit.check("send_message", "alice", max_events=10, window_seconds=60, lease=4).allowed
+    # Two leases of 4, then the last 2 one by one once a lease of 4 is refused.
+    assert cache.calls < 10
+
+
+def test_sliding_window_fails_open_without_cache(monkeypatch):
+    monkeypatch.setattr(redis_cache, "cache", _StubCache(fail=True))
+    result = rate_limit.check("report_post", "alice", max_events=1, window_seconds=60)
+    assert result.allowed and "Retry-After" not in result.headers()
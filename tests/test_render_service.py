@@ -0,0 +1,56 @@
+"""render_service client: pool headers and shedding on worker backpressure."""
+
+from __future__ import annotations
+
+import pytest
+
+from backend.services import render_service
+
+
+class _Resp:
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.headers = headers or {}
+
+    def json(self):
+        return self._payload
+
+
+@pytest.fixture(autouse=True)
+def _configured(monkeypatch):
+    monkeypatch.setenv("RENDER_SERVICE_URL", "https://render.test")
+    monkeypatch.setattr(render_service, "_id_token", lambda audience: None)
+    render_service._reset_pool_state()
+    yield
+    render_service._reset_pool_state()
+
+
+def test_busy_worker_sheds_renders_for_retry_window(monkeypatch):
+    calls = []
+
+    def fake_post(url, **kwargs):
+        calls.append(url)
+        return _Resp(503, {"error": "busy"}, {"Retry-After": "5", "X-Render-Pool-Size": "2",
+                                               "X-Render-Pool-Busy": "2", "X-Render-Pool-Queued": "2"})
+
+    monkeypatch.setattr(render_service.requests, "post", fake_post)
+    assert render_service.render("<html></html>") is None
+    assert render_service.is_saturated() is True
+    assert render_service.pool_status() == {"size": 2, "busy": 2, "queued": 2, "saturated": True}
+
+    # Inside the Retry-After window the client does not call the worker at all.
+    assert render_service.render("<html></html>") is None
+    assert len(calls) == 1
+
+
+def test_successful_render_records_pool_occupancy(monkeypatch):
+    monkeypatch.setattr(
+        render_service.requests,
+        "post",
+        lambda url, **kw: _Resp(200, {"screenshot": "abc", "blank": False},
+                                {"X-Render-Pool-Size": "2", "X-Render-Pool-Busy": "1",
+                                 "X-Render-Pool-Queued": "0"}),
+    )
+    assert render_service.render("<html></html>")["screenshot"] == "abc"
+    assert render_service.pool_status() == {"size": 2, "busy": 1, "queued": 0, "saturated": False}
@@ -0,0 +1,126 @@
+"""Shared due-time queue: deadline math, leasing and per-kind dispatch."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.services import scheduled_work as sw
+
+
+def test_poll_due_times_start_each_window_inside_24h_horizon():
+    created = datetime(2026, 5, 1, 0, 0, 0)
+    # Ten-hour poll: every window is inside the last 24h.
+    assert sw.poll_reminder_due_times(created, created + timedelta(hours=10)) == [
+        created + timedelta(hours=2),
+        created + timedelta(hours=4, minutes=30),
+        created + timedelta(hours=7, minutes=30),
+    ]
+    # Ten-day poll: early windows close before the horizon opens.
+    expires = created + timedelta(days=10)
+    assert sw.poll_reminder_due_times(created, expires) == []
+    # Two-day poll: the 45% window opens late (at the horizon), 75% on time.
+    expires = created + timedelta(days=2)
+    assert sw.poll_reminder_due_times(created, expires) == [
+        expires - timedelta(hours=24),
+        created + timedelta(hours=36),
+    ]
+
+
+def test_poll_due_times_ignore_bad_dates():
+    assert sw.poll_reminder_due_times(None, "2026-05-02 00:00:00") == []
+    assert sw.poll_reminder_due_times("2026-05-02 00:00:00", "2026-05-01 00:00:00") == []
+
+
+def test_event_due_times_follow_preferences_and_skip_closed_windows():
+    now = datetime(2026, 5, 1, 12, 0, 0)
+    start = now + timedelta(days=10)
+    created = now
+    assert sw.event_reminder_due_times(created, start, "all", now) == [
+        start - timedelta(hours=168),
+        start - timedelta(hours=24),
+        start - timedelta(hours=1),
+        created + (start - created) * 0.75,
+    ]
+    assert sw.event_reminder_due_times(created, start, "1_day", now) == [start - timedelta(hours=24)]
+    assert sw.event_reminder_due_times(created, start, "none", now) == []
+    # Two days out: the 1-week window is already open and fires at once.
+    soon = now + timedelta(days=2)
+    assert sw.event_reminder_due_times(now, soon, "1_week", now) == [soon - timedelta(hours=168)]
+    # Started events get nothing.
+    assert sw.event_reminder_due_times(created, now - timedelta(hours=1), "all", now) == []
+
+
+def test_run_kind_coalesces_refs_and_reports_failures(monkeypatch):
+    calls = []
+
+    def handler(ref_id):
+        calls.append(ref_id)
+        if ref_id == 2:
+            raise RuntimeError("boom")
+        return 3
+
+    monkeypatch.setitem(sw._HANDLERS, "test_kind", handler)
+    rows = [
+        {"id": 10, "kind": "test_kind", "ref_id": 1},
+        {"id": 11, "kind": "test_kind", "ref_id": 1},
+        {"id": 12, "kind": "test_kind", "ref_id": 2},
+    ]
+    failures, handled = sw._run_kind("test_kind", rows)
+    assert sorted(calls) == [1, 2]
+    assert handled == 3
+    assert set(failures) == {12}
+
+    failures, handled = sw._run_kind("missing_kind", rows[:1])
+    assert handled == 0 and set(failures) == {10}
+
+
+@pytest.fixture()
+def needs_mysql(mysql_dsn):
+    sw.ensure_scheduled_work_table()
+    return mysql_dsn
+
+
+def test_claim_leases_only_due_rows_once(needs_mysql):
+    now = datetime.utcnow().replace(microsecond=0)
+    sw.schedule_work(None, [
+        (sw.KIND_POLL_REMINDER, 901, now - timedelta(minutes=1)),
+        (sw.KIND_POLL_REMINDER, 901, now - timedelta(minutes=1)),
+        (sw.KIND_POLL_REMINDER, 902, now + timedelta(hours=1)),
+    ])
+    first = sw.claim_due_work(kinds=[sw.KIND_POLL_REMINDER])
+    assert [r["ref_id"] for r in first] == [901]
+    assert sw.claim_due_work(kinds=[sw.KIND_POLL_REMINDER]) == []
+
+
+def test_dispatch_retries_then_dead_letters(needs_mysql, monkeypatch):
+    monkeypatch.setattr(sw, "SCHEDULED_WORK_MAX_ATTEMPTS", 1)
+
+    def failing(ref_id):
+        raise RuntimeError("nope")
+
+    monkeypatch.setitem(sw._HANDLERS, sw.KIND_EVENT_REMINDER, failing)
+    sw.schedule_work(None, [(sw.KIND_EVENT_REMINDER, 903, datetime.utcnow() - timedelta(minutes=1))])
+    result = sw.dispatch_due_work(kinds=[sw.KIND_EVENT_REMINDER])
+    assert result["claimed"] == 1
+    assert result["dead_lettered"] == 1
+    assert sw.scheduled_work_stats()[sw.KIND_EVENT_REMINDER]["dead"] >= 1
+
+
+def test_dispatch_claims_at_most_a_pool_wave_per_kind(monkeypatch):
+    claims = []
+
+    def fake_claim(limit, *, kinds=None, lease_seconds=None):
+        claims.append((tuple(kinds), limit))
+        if len(claims) > 3:
+            return []
+        return [{"id": i, "kind": kinds[0], "ref_id": i, "attempts": 1} for i in range(limit)]
+
+    monkeypatch.setattr(sw, "claim_due_work", fake_claim)
+    monkeypatch.setattr(sw, "_run_kind", lambda kind, rows: ({}, len(rows)))
+    monkeypatch.setattr(sw, "_settle", lambda rows, failures: {"done": len(rows), "retried": 0, "dead_lettered": 0})
+    result = sw.dispatch_due_work(kinds=[sw.KIND_CONTENT_JOB])
+    # Content jobs are leased one pool-full (2) at a time, never a 200-row batch.
+    assert {limit for _, limit in claims} == {sw.KIND_CONCURRENCY[sw.KIND_CONTENT_JOB]}
+    assert result["claimed"] == 6 and result["handled"] == {sw.KIND_CONTENT_JOB: 6}
@@ -0,0 +1,103 @@
+"""schema_migrations runner and the "schema is current" gate on ensure_* helpers."""
+
+from __future__ import annotations
+
+import pytest
+
+from backend.services import database, schema_migrations
+from backend.services.schema_migrations import Migration
+
+pytestmark = pytest.mark.skipif(database.USE_MYSQL, reason="runs against a throwaway SQLite file")
+
+
+@pytest.fixture
+def fresh_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "SQLITE_DB_PATH", tmp_path / "schema.db")
+    schema_migrations.reset_schema_state()
+    yield
+    schema_migrations.reset_schema_state()
+
+
+class _NoDdlCursor:
+    def execute(self, *args, **kwargs):
+        raise AssertionError("gated helper issued SQL")
+
+
+def test_apply_runs_pending_in_order_and_stops_at_first_failure(fresh_db, monkeypatch):
+    monkeypatch.setenv("SCHEMA_VERSION_GATE", "true")
+    calls = []
+
+    def ok(name):
+        def run(cursor):
+            # Helpers called from a migration must not short-circuit.
+            assert schema_migrations.schema_is_current() is False
+            calls.append(name)
+        return run
+
+    def boom(cursor):
+        raise RuntimeError("ddl failed")
+
+    first = schema_migrations.apply_migrations([
+        Migration(2, "second", ok("second")),
+        Migration(1, "first", ok("first")),
+        Migration(3, "broken", boom),
+        Migration(4, "after", ok("after")),
+    ])
+    assert calls == ["first", "second"]
+    assert first["applied"] == [1, 2]
+    assert first["version"] == 2
+    assert "broken" in first["error"]
+    assert schema_migrations.recorded_version() == 2
+
+    second = schema_migrations.apply_migrations([
+        Migration(1, "first", ok("first")),
+        Migration(2, "second", ok("second")),
+        Migration(3, "fixed", ok("fixed")),
+    ])
+    assert second["applied"] == [3]
+    assert calls == ["first", "second", "fixed"]
+
+
+def test_gate_makes_ensure_helpers_no_ops_once_current(fresh_db, monkeypatch):
+    from backend.services import client_ui_flags
+
+    monkeypatch.setenv("SCHEMA_VERSION_GATE", "true")
+    assert schema_migrations.schema_is_current() is False  # nothing recorded yet
+
+    schema_migrations.apply_migrations([
+        Migration(schema_migrations.SCHEMA_VERSION, "stand_in", lambda cursor: None),
+    ])
+    assert schema_migrations.schema_is_current() is True
+    client_ui_flags.ensure_community_ui_columns(_NoDdlCursor())
+    client_ui_flags.ensure_user_ui_columns(_NoDdlCursor())
+
+    monkeypatch.setenv("SCHEMA_VERSION_GATE", "false")
+    assert schema_migrations.schema_is_current() is False
+
+
+def test_registered_migrations_apply_on_a_fresh_database(fresh_db):
+    with database.get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT)")
+        c.execute("CREATE TABLE communities (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.commit()
+
+    result = schema_migrations.apply_migrations()
+    assert result["error"] is None
+    assert result["version"] == schema_migrations.SCHEMA_VERSION
+    with database.get_db_connection() as conn:
+        c = conn.cursor()
+        assert "owner_upgrade_prompt_dismissed_at" in schema_migrations._existing_columns(c, "communities")
+        assert "communities_spotlight_tour_seen" in schema_migrations._existing_columns(c, "users")
+        assert {"client_key", "file_path", "audio_summary"} <= schema_migrations._existing_columns(
+            c, "group_chat_messages"
+        )
+        assert "cleared_before_message_id" in schema_migrations._existing_columns(c, "group_chat_read_receipts")
+
+
+def test_failed_ddl_is_not_recorded_as_applied(fresh_db):
+    # No communities table: the ALTER in migration 1 fails and must surface.
+    result = schema_migrations.apply_migrations(schema_migrations.MIGRATIONS[:1])
+    assert result["applied"] == []
+    assert "community_ui_columns" in result["error"]
+    assert schema_migrations.recorded_version() == 0
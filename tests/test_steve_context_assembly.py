@@ -0,0 +1,117 @@
+"""Concurrent Steve context assembly: deadlines, degradation, timings."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from backend.services.steve_context_assembly import (
+    STATUS_ERROR,
+    STATUS_OK,
+    STATUS_TIMEOUT,
+    ContextSource,
+    assemble_context,
+)
+
+
+def _sleepy(value, seconds):
+    def _fn():
+        time.sleep(seconds)
+        return value
+
+    return _fn
+
+
+def test_parallel_latency_is_max_not_sum():
+    started = time.perf_counter()
+    out = assemble_context(
+        [
+            ContextSource("a", _sleepy("A", 0.2), deadline_seconds=2),
+            ContextSource("b", _sleepy("B", 0.2), deadline_seconds=2),
+            ContextSource("c", _sleepy("C", 0.2), deadline_seconds=2),
+        ],
+        label="test",
+        parallel=True,
+    )
+    elapsed = time.perf_counter() - started
+    assert out.values == {"a": "A", "b": "B", "c": "C"}
+    assert elapsed < 0.5
+    assert all(t["status"] == STATUS_OK for t in out.timings.values())
+
+
+def test_late_source_degrades_to_default():
+    started = time.perf_counter()
+    out = assemble_context(
+        [
+            ContextSource("fast", _sleepy("ok", 0.01), deadline_seconds=1),
+            ContextSource("slow", _sleepy("late", 1.0), default="fallback", deadline_seconds=0.1),
+        ],
+        label="test",
+        parallel=True,
+    )
+    assert time.perf_counter() - started < 0.6
+    assert out.get("fast") == "ok"
+    assert out.get("slow") == "fallback"
+    assert out.timings["slow"]["status"] == STATUS_TIMEOUT
+    assert out.degraded() == ["slow"]
+
+
+def test_failing_source_uses_default_in_both_modes():
+    def boom():
+        raise RuntimeError("source down")
+
+    for parallel in (True, False):
+        out = assemble_context(
+            [
+                ContextSource("ok", lambda: 1),
+                ContextSource("broken", boom, default=[]),
+            ],
+            label="test",
+            parallel=parallel,
+        )
+        assert out.get("ok") == 1
+        assert out.get("broken") == []
+        assert out.timings["broken"]["status"] == STATUS_ERROR
+
+
+def test_skipped_sources_and_declaration_order():
+    out = assemble_context(
+        [
+            ContextSource("second", _sleepy(2, 0.05), deadline_seconds=1),
+            None,
+            ContextSource("first", lambda: 1, deadline_seconds=0.5),
+        ],
+        label="test",
+        parallel=True,
+    )
+    assert list(out.timings) == ["second", "first"]
+    assert "second=" in out.summary()
+
+
+def test_deadline_env_override(monkeypatch):
+    monkeypatch.setenv("STEVE_CONTEXT_DEADLINE_HISTORY", "0.25")
+    assert ContextSource("history", lambda: None).deadline() == 0.25
+
+
+def test_required_source_is_awaited_and_its_failure_aborts():
+    out = assemble_context(
+        [
+            ContextSource("fast", _sleepy("ok", 0.01), deadline_seconds=0.05),
+            ContextSource("pool", _sleepy({"alice"}, 0.2), required=True),
+        ],
+        label="test",
+        parallel=True,
+    )
+    assert out.get("pool") == {"alice"} and out.degraded() == []
+
+    def boom():
+        raise RuntimeError("members unavailable")
+
+    for parallel in (True, False):
+        with pytest.raises(RuntimeError):
+            assemble_context(
+                [ContextSource("other", _sleepy(1, 0.01)), ContextSource("pool", boom, required=True)],
+                label="test",
+                parallel=parallel,
+            )
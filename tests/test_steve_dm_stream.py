@@ -0,0 +1,103 @@
+"""Streaming Steve DM replies: event consumption, throttled writes, metrics.
+
+Unit-level: the Grok stream is a list of fake Responses events and the row /
+Firestore writers are recorded callables, so no DB or provider is needed.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from backend.services import steve_dm_stream as sds
+
+
+def _delta(text: str) -> SimpleNamespace:
+    return SimpleNamespace(type="response.output_text.delta", delta=text)
+
+
+def _completed(text: str) -> SimpleNamespace:
+    return SimpleNamespace(type="response.completed", response=SimpleNamespace(output_text=text))
+
+
+def _writer(calls: dict) -> sds.DmReplyStreamWriter:
+    calls.setdefault("created", [])
+    calls.setdefault("published", [])
+
+    def _create(body):
+        calls["created"].append(body)
+        return 42
+
+    return sds.DmReplyStreamWriter(
+        sender_username="paulo",
+        peer_username="steve",
+        create_row=_create,
+        publish=lambda mid, body, streaming: calls["published"].append((mid, body, streaming)),
+        invalidate=lambda: None,
+    )
+
+
+def test_consume_stream_records_ttft_and_final_text():
+    seen = []
+    events = [SimpleNamespace(type="response.created"), _delta("Hel"), _delta("lo"), _completed("Hello!")]
+    result = sds.consume_response_stream(iter(events), on_delta=seen.append, deadline=float("inf"))
+    assert seen == ["Hel", "lo"]
+    assert result.text == "Hello!"
+    assert result.ttft_ms is not None and result.ttft_ms <= result.elapsed_ms
+    assert result.timed_out is False
+
+
+def test_consume_stream_stops_at_deadline_with_partial_text():
+    events = [_delta("partial "), _delta("answer"), _completed("never reached")]
+    result = sds.consume_response_stream(iter(events), on_delta=lambda _d: None, deadline=0.0)
+    assert result.timed_out is True
+    assert result.text == "partial "
+
+
+@patch.object(sds, "set_dm_stream_state")
+@patch.object(sds, "update_steve_reply_text")
+def test_writer_creates_row_on_first_token_and_throttles(mock_update, _state, monkeypatch):
+    monkeypatch.setattr(sds, "STREAM_FLUSH_INTERVAL_SECONDS", 3600)
+    calls: dict = {}
+    writer = _writer(calls)
+    writer.feed("Hi")
+    for _ in range(50):
+        writer.feed(" more")
+    assert calls["created"] == ["Hi"]
+    # Interval not elapsed: nothing rewritten mid-stream.
+    mock_update.assert_not_called()
+
+    writer.finish("Hi, final.")
+    mock_update.assert_called_once_with(42, "Hi, final.")
+    assert calls["published"] == [(42, "Hi, final.", False)]
+
+
+@patch.object(sds, "set_dm_stream_state")
+@patch.object(sds, "update_steve_reply_text")
+def test_writer_flushes_when_interval_and_size_allow(mock_update, _state, monkeypatch):
+    monkeypatch.setattr(sds, "STREAM_FLUSH_INTERVAL_SECONDS", 0)
+    calls: dict = {}
+    writer = _writer(calls)
+    writer.feed("x")
+    writer.feed("y" * sds.STREAM_FLUSH_MIN_CHARS)
+    mock_update.assert_called_once()
+    assert calls["published"][-1][2] is True
+
+
+def test_writer_create_failure_falls_back_to_single_insert():
+    writer = sds.DmReplyStreamWriter(
+        sender_username="paulo",
+        peer_username="steve",
+        create_row=lambda _body: None,
+        publish=lambda *_a: None,
+        invalidate=lambda: None,
+    )
+    writer.feed("a")
+    writer.feed("b")
+    assert writer.message_id is None and writer.create_failed is True
+
+
+def test_tokens_per_second_uses_decode_window():
+    assert sds.tokens_per_second(100, 500, 2500) == 50.0
+    assert sds.tokens_per_second(None, None, 2500) is None
+    assert sds.tokens_per_second(None, 0, 1000, text="x" * 400) == 100.0
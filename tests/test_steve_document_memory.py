@@ -311,3 +311,70 @@ def test_build_doc_memory_context_splits_dossier_and_chunk_budget(monkeypatch):
     assert "Document dossier" in context
     assert "Relevant document excerpts" in context
     assert len(context) <= 3100
+
+
+def test_hybrid_chunk_index_finds_excerpts_deep_in_long_documents(monkeypatch):
+    from backend.services import steve_doc_chunk_index
+
+    fs = _FakeFirestore()
+    monkeypatch.setattr(docmem, "_get_firestore_client", lambda: fs)
+    monkeypatch.setattr(docmem, "_compute_embedding_safe", lambda text: None)
+    monkeypatch.setenv("STEVE_DOC_HYBRID_INDEX", "true")
+    steve_doc_chunk_index.clear()
+
+    filler = "Routine operating procedures and general administrative guidance. " * 45
+    pages = [{"page": i, "text": f"Section {i}. {filler}"} for i in range(1, 121)]
+    pages[109]["text"] = "Section 110. Quarantine protocol for imported livestock. " + filler
+    monkeypatch.setattr(docmem, "extract_pdf_pages", lambda file_path: (pages, docmem.TEXT_STATUS_READABLE, None, len(pages)))
+    indexed = docmem.index_useful_doc(_row(12, 60, "Farm handbook"), compute_embeddings=False)
+    assert indexed.chunk_count > 80
+
+    chunks = docmem.retrieve_doc_chunks("what is the quarantine protocol for livestock?", community_id=60, limit=3)
+    assert chunks and "Quarantine protocol" in chunks[0]["text"]
+    assert chunks[0]["page_start"] >= 100
+
+    # Re-indexing drops the cached index, so new text is searchable at once.
+    pages[5]["text"] = "Section 6. Beekeeping schedule. " + filler
+    docmem.index_useful_doc(_row(12, 60, "Farm handbook"), force=True, compute_embeddings=False)
+    chunks = docmem.retrieve_doc_chunks("beekeeping schedule", community_id=60, limit=1)
+    assert "Beekeeping schedule" in chunks[0]["text"]
+
+
+def test_scope_index_skips_and_does_not_cache_partially_written_docs():
+    from backend.services import steve_doc_chunk_index
+
+    steve_doc_chunk_index.clear()
+    fs = _FakeFirestore()
+    docs = ("steve_doc_memory", "community:70", "docs")
+    manifest = [
+        {"doc_id": 1, "title": "Done", "text_status": docmem.TEXT_STATUS_READABLE, "chunk_count": 1, "indexed_at": "t1"},
+        {"doc_id": 2, "title": "Writing", "text_status": docmem.TEXT_STATUS_READABLE, "chunk_count": 2, "indexed_at": "t1"},
+    ]
+    fs.docs[docs + ("1", "chunks", "c0001")] = {"chunk_id": "c0001", "text": "finished doc"}
+    fs.docs[docs + ("2", "chunks", "c0001")] = {"chunk_id": "c0001", "text": "first half"}
+
+    index = steve_doc_chunk_index.get_scope_index(fs, "community:70", manifest)
+    assert [c["doc_id"] for c in index.chunks] == [1]
+
+    fs.docs[docs + ("2", "chunks", "c0002")] = {"chunk_id": "c0002", "text": "second half"}
+    index = steve_doc_chunk_index.get_scope_index(fs, "community:70", manifest)
+    assert [c["doc_id"] for c in index.chunks] == [1, 2, 2]
+
+
+def test_scope_chunk_index_fuses_lexical_and_vector_rankings():
+    from backend.services.steve_doc_chunk_index import ScopeChunkIndex
+
+    index = ScopeChunkIndex([
+        {"doc_id": 1, "chunk_id": "c0001", "text": "Budget table for the spring season", "embedding": [1.0, 0.0]},
+        {"doc_id": 1, "chunk_id": "c0002", "text": "Hiring plan and onboarding", "embedding": [0.0, 1.0]},
+        {"doc_id": 2, "chunk_id": "c0001", "text": "Spring budget approvals", "embedding": [0.9, 0.1]},
+    ])
+
+    assert index.lexical_ranking("spring budget", 10)[:2] in ([0, 2], [2, 0])
+    assert index.vector_ranking([0.0, 1.0], 1) == [1]
+    fused = index.search("spring budget", [1.0, 0.0], limit=2)
+    assert {c["text"] for c in fused} == {"Budget table for the spring season", "Spring budget approvals"}
+    assert "embedding" not in fused[0]
+    # Chunks of a document the query names are added after direct lexical hits.
+    named = index.search("hiring", None, limit=3, matched_doc_ids=[2])
+    assert [(c["doc_id"], c["chunk_id"]) for c in named] == [(1, "c0002"), (2, "c0001")]
@@ -419,5 +419,46 @@ class TestAdminFeedback(unittest.TestCase):
         self.assertFalse(result)
 
 
+class TestWeeklySweep(unittest.TestCase):
+    """Fingerprint-gated weekly synthesis sweep."""
+
+    def test_fingerprint_tracks_inputs(self):
+        from backend.services.steve_knowledge_base import synthesis_input_fingerprint
+        a = synthesis_input_fingerprint("posts", "")
+        self.assertEqual(a, synthesis_input_fingerprint("posts", ""))
+        self.assertNotEqual(a, synthesis_input_fingerprint("posts!", ""))
+        self.assertNotEqual(a, synthesis_input_fingerprint("posts", "fix career"))
+
+    @patch("backend.services.steve_knowledge_base.USE_KNOWLEDGE_BASE_V1", True)
+    @patch("backend.services.steve_knowledge_base._run_prepared_synthesis")
+    @patch("backend.services.steve_knowledge_base.get_synthesis_fingerprint")
+    @patch("backend.services.steve_knowledge_base._prepare_member_synthesis")
+    def test_sweep_skips_unchanged_and_sums_cost(self, mock_prep, mock_stored, mock_run):
+        from backend.services.steve_knowledge_base import run_kb_weekly_sweep
+
+        def prep(username):
+            if username == "ghost":
+                return None, {"code": "no_profile"}
+            return {"fingerprint": "fp-" + username}, None
+
+        def run(username, prep_data, usage_out=None):
+            usage_out["cost_usd"] = 0.25
+            return (username != "broken"), (None if username != "broken" else {"code": "grok_failed"})
+
+        mock_prep.side_effect = prep
+        mock_stored.side_effect = lambda u: "fp-same" if u == "same" else "stale"
+        mock_run.side_effect = run
+
+        summary = run_kb_weekly_sweep(["same", "changed", "broken", "ghost"], max_workers=2)
+
+        self.assertEqual(summary["skipped"], 1)
+        self.assertEqual(summary["synthesized"], 1)
+        self.assertEqual(summary["failed"], 2)
+        self.assertEqual(summary["failures"], {"broken": "grok_failed", "ghost": "no_profile"})
+        self.assertAlmostEqual(summary["cost_usd"], 0.5)
+        called = sorted(call.args[0] for call in mock_run.call_args_list)
+        self.assertEqual(called, ["broken", "changed"])
+
+
 if __name__ == '__main__':
     unittest.main()
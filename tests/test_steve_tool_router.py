@@ -4,12 +4,29 @@ from __future__ import annotations
 
 from types import SimpleNamespace
 
+import pytest
+
+from backend.services import steve_tool_router_cache as router_cache
 from backend.services.steve_tool_router import (
     resolve_steve_hosted_tools,
     steve_tool_router_ambiguous_public_web_intent,
 )
 
 
+@pytest.fixture(autouse=True)
+def _isolated_router_cache(monkeypatch):
+    """Keep these tests DB-free and start each with empty stats / no model."""
+    logged = []
+    monkeypatch.setattr(
+        "backend.services.steve_tool_router.record_router_decision",
+        lambda normalized, flags: logged.append((normalized, dict(flags))),
+    )
+    router_cache.reset_router_stats()
+    router_cache.set_router_classifier(None)
+    yield logged
+    router_cache.set_router_classifier(None)
+
+
 def _cfg_explicit_only():
     return SimpleNamespace(
         external_search_explicit_only=True,
@@ -164,3 +181,96 @@ def test_default_attach_fast_path_skips_router_when_disabled(monkeypatch):
         config=_cfg_explicit_only(),
     )
     assert out == [{"type": "web_search"}]
+
+
+def _ambiguous(topic: str) -> str:
+    return (
+        f"Walk through how {topic} vendors position themselves; "
+        "pull examples from the public web please."
+    )
+
+
+def test_repeat_message_served_from_decision_cache(monkeypatch, _isolated_router_cache):
+    monkeypatch.setenv("STEVE_LEGACY_TOOL_GATING", "1")
+    calls = []
+
+    def _router(text):
+        calls.append(text)
+        return {"web_search": True, "x_search": False}, None
+
+    monkeypatch.setattr("backend.services.steve_tool_router._call_router_llm", _router)
+    msg = _ambiguous("regional payroll software")
+    first = resolve_steve_hosted_tools(msg, username="alice", surface="group", config=_cfg_explicit_only())
+    # Same text, different mention / casing → same normalized cache key.
+    second = resolve_steve_hosted_tools(
+        "@Steve " + msg.upper(), username="bob", surface="group", config=_cfg_explicit_only()
+    )
+    assert first == second == [{"type": "web_search"}]
+    assert len(calls) == 1
+    assert len(_isolated_router_cache) == 1
+    stats = router_cache.router_stats()
+    assert stats["cache_hits"] == 1 and stats["llm_calls"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_unparsed_router_reply_is_not_cached_or_recorded(monkeypatch, _isolated_router_cache):
+    monkeypatch.setenv("STEVE_LEGACY_TOOL_GATING", "1")
+    calls = []
+
+    def _router(text):
+        calls.append(text)
+        return None, None  # no API key / garbled JSON
+
+    monkeypatch.setattr("backend.services.steve_tool_router._call_router_llm", _router)
+    msg = _ambiguous("industrial shelving")
+    for _ in range(2):
+        assert resolve_steve_hosted_tools(msg, username="alice", surface="group", config=_cfg_explicit_only()) == []
+    assert len(calls) == 2
+    assert _isolated_router_cache == []
+
+
+def test_classifier_abstains_without_enough_samples():
+    model = router_cache.RouterClassifier.fit(
+        [(["weather", "today"], {"web_search": True, "x_search": False})] * 5
+    )
+    assert model.classify("weather today", x_requested=False) is None
+
+
+def _trained_model():
+    rows = []
+    for i in range(40):
+        rows.append((["latest", "pricing", "public", "web", f"co{i}"], {"web_search": True, "x_search": False}))
+        rows.append((["brainstorm", "names", "team", "offsite", f"idea{i}"], {"web_search": False, "x_search": False}))
+    return router_cache.RouterClassifier.fit(rows)
+
+
+def test_trained_classifier_decides_confident_cases_only():
+    model = _trained_model()
+    assert model.classify("latest pricing public web", x_requested=False) == {
+        "web_search": True,
+        "x_search": False,
+    }
+    assert model.classify("brainstorm names team offsite", x_requested=False) == {
+        "web_search": False,
+        "x_search": False,
+    }
+    # Only unseen tokens → defer to the LLM.
+    assert model.classify("quantum gardening", x_requested=False) is None
+
+
+def test_classifier_replaces_llm_when_flag_on(monkeypatch):
+    monkeypatch.setenv("STEVE_LEGACY_TOOL_GATING", "1")
+    monkeypatch.setenv("STEVE_TOOL_ROUTER_LOCAL_CLASSIFIER", "1")
+    router_cache.set_router_classifier(_trained_model())
+
+    def _boom(_text):
+        raise AssertionError("router LLM must not run for a confident prediction")
+
+    monkeypatch.setattr("backend.services.steve_tool_router._call_router_llm", _boom)
+    msg = (
+        "Give me the latest pricing for regional analytics vendors; check the "
+        "public web and compare tiers please."
+    )
+    out = resolve_steve_hosted_tools(msg, username="alice", surface="group", config=_cfg_explicit_only())
+    assert out == [{"type": "web_search"}]
+    assert router_cache.router_stats()["classifier_hits"] == 1
@@ -0,0 +1,28 @@
+"""Retention of the tool-router decision log (``steve_tool_router_decisions``)."""
+
+from __future__ import annotations
+
+from backend.services import steve_tool_router_cache as router_cache
+from backend.services.database import get_db_connection
+
+
+def test_train_purges_decisions_past_retention(mysql_dsn):
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        router_cache.ensure_router_decisions_table(c)
+        c.execute("DELETE FROM steve_tool_router_decisions")
+        conn.commit()
+    router_cache.record_router_decision("latest pricing for vendors", {"web_search": True})
+    router_cache.record_router_decision("brainstorm offsite names", {"web_search": False})
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            "UPDATE steve_tool_router_decisions SET updated_at = '2000-01-01 00:00:00' WHERE text_hash = %s",
+            (router_cache.router_text_hash("brainstorm offsite names"),),
+        )
+        conn.commit()
+
+    result = router_cache.train_router_classifier()
+    assert result["purged"] == 1
+    assert result["samples"] == 1
+    router_cache.set_router_classifier(None)
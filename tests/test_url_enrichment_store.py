@@ -0,0 +1,69 @@
+"""Community URL enrichment store and the staged enrichment path."""
+
+from __future__ import annotations
+
+import pytest
+
+from backend.services import steve_content_enrichment as enrichment
+from backend.services import url_enrichment_store
+from redis_cache import cache
+
+
+@pytest.fixture(autouse=True)
+def _clean_cache():
+    cache.flush_all()
+    yield
+    cache.flush_all()
+
+
+def test_canonical_url_drops_tracking_and_cosmetic_differences():
+    a = url_enrichment_store.canonical_url("https://www.Example.com/post/?utm_source=x&b=2&a=1#top")
+    b = url_enrichment_store.canonical_url("https://example.com/post?a=1&b=2&fbclid=abc")
+    assert a == b == "https://example.com/post?a=1&b=2"
+
+
+def test_staged_enrichment_reuses_store_across_members(monkeypatch):
+    fetched = []
+
+    def fake_article(url):
+        fetched.append(url)
+        return "Long article body " * 20, None
+
+    def fake_whisper(url):
+        fetched.append(url)
+        return None, "Whisper error: boom"
+
+    monkeypatch.setattr(enrichment, "_fetch_article_text", fake_article)
+    monkeypatch.setattr(enrichment, "_whisper_direct_audio_url", fake_whisper)
+
+    items = [
+        ("https://news.example.com/a?utm_campaign=z", "read this", "2026-01-02"),
+        ("https://cdn.example.com/ep1.mp3", "", "2026-01-01"),
+        ("https://open.spotify.com/episode/1", "", "2026-01-01"),
+    ]
+    first = enrichment._enrich_urls_staged(items)
+    assert "--- Article text (excerpt) ---" in first[items[0][0]][0]
+    assert first[items[1][0]][1] == {"url": items[1][0], "error": "Whisper error: boom"}
+    assert "Podcast page" in first[items[2][0]][1]["error"]
+    assert sorted(fetched) == ["https://cdn.example.com/ep1.mp3", items[0][0]]
+
+    # Another member sharing the same links (different tracking params) fetches nothing.
+    again = enrichment._enrich_urls_staged([
+        ("https://www.news.example.com/a", "", "2026-02-01"),
+        ("https://cdn.example.com/ep1.mp3", "", "2026-02-01"),
+    ])
+    assert len(fetched) == 2
+    block, err, src = again["https://www.news.example.com/a"]
+    assert err is None and src["success"] is True and "Long article body" in block
+    assert again["https://cdn.example.com/ep1.mp3"][2]["success"] is False
+
+
+def test_youtube_link_forms_share_one_record(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        enrichment, "_fetch_youtube_transcript", lambda vid: calls.append(vid) or ("hello world", None)
+    )
+    enrichment._enrich_urls_staged([("https://youtu.be/abcdefghijk", "", "2026-01-01")])
+    out = enrichment._enrich_urls_staged([("https://www.youtube.com/watch?v=abcdefghijk&t=30", "", "2026-01-01")])
+    assert calls == ["abcdefghijk"]
+    assert "--- YouTube transcript (excerpt) ---" in out["https://www.youtube.com/watch?v=abcdefghijk&t=30"][0]
@@ -0,0 +1,223 @@
+"""Set-based weekly sweeps (WEEKLY_DIGEST_SET_BASED).
+
+The rollup + ranked candidate query must pick the same member/community
+pairs as the legacy per-member join; the MySQL run reserves in one statement
+and delivers through ``weekly_push`` outbox rows.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.services.database import get_db_connection, get_sql_placeholder
+from tests.fixtures import make_community, make_user
+
+CRON_SECRET = "test-cron-secret"
+
+
+def _sqlite_schema(c) -> None:
+    c.executescript(
+        """
+        CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT);
+        CREATE TABLE communities (id INTEGER PRIMARY KEY, name TEXT, creator_username TEXT,
+                                  parent_community_id INTEGER);
+        CREATE TABLE user_communities (id INTEGER PRIMARY KEY, user_id INTEGER, community_id INTEGER);
+        CREATE TABLE posts (id INTEGER PRIMARY KEY, community_id INTEGER, username TEXT, timestamp TEXT);
+        """
+    )
+
+
+def test_ranked_candidates_match_legacy_selection(monkeypatch):
+    from backend.services import community_post_rollups, member_digest
+
+    monkeypatch.setattr(community_post_rollups, "_table_ready", False)
+    conn = sqlite3.connect(":memory:")
+    c = conn.cursor()
+    _sqlite_schema(c)
+    now = datetime.now(timezone.utc)
+    recent = now.strftime("%Y-%m-%d %H:%M:%S")
+    old = (now - timedelta(days=30)).strftime("%Y-%m-%d %H:%M:%S")
+
+    users = ["Owner", "alice", "bob", "carol", "admin"]
+    c.executemany("INSERT INTO users (id, username) VALUES (?, ?)", list(enumerate(users, 1)))
+    c.executemany(
+        "INSERT INTO communities (id, name, creator_username) VALUES (?, ?, ?)",
+        [(1, "Big", "owner"), (2, "Small", "bob"), (3, "Stale", "owner")],
+    )
+    memberships = [(uid, cid) for uid in range(1, 6) for cid in (1, 2, 3)]
+    c.executemany("INSERT INTO user_communities (user_id, community_id) VALUES (?, ?)", memberships)
+    posts = (
+        [(1, "ALICE", recent)] * 4 + [(1, "bob", recent)] * 2
+        + [(2, "carol", recent)] * 3 + [(3, "carol", old)] * 9
+    )
+    c.executemany("INSERT INTO posts (community_id, username, timestamp) VALUES (?, ?, ?)", posts)
+
+    since_day = community_post_rollups.window_start_day(7)
+    community_post_rollups.refresh_post_count_rollups(c, since_day)
+    c.execute(member_digest._ranked_candidates_sql("?"), (since_day, since_day))
+    got = {(r[0], r[1], r[3]) for r in c.fetchall()}
+
+    week_ago = (now - timedelta(days=7)).strftime("%Y-%m-%d %H:%M:%S")
+    c.execute(
+        f"""
+        SELECT u.username, co.id, COUNT(p.id)
+        FROM user_communities uc
+        JOIN users u ON u.id = uc.user_id
+        JOIN communities co ON co.id = uc.community_id
+        JOIN posts p ON p.community_id = co.id AND p.timestamp >= ?
+            AND LOWER(COALESCE(p.username, '')) <> LOWER(u.username)
+        WHERE LOWER(u.username) <> 'admin'
+          AND LOWER(COALESCE(co.creator_username, '')) <> LOWER(u.username)
+        GROUP BY u.username, co.id
+        HAVING COUNT(p.id) >= {member_digest.MIN_NEW_POSTS}
+        """,
+        (week_ago,),
+    )
+    best = {}
+    for username, cid, n in c.fetchall():
+        if username not in best or (n, -cid) > (best[username][2], -best[username][1]):
+            best[username] = (username, cid, n)
+    assert got == set(best.values())
+    # Own posts don't count: alice sees only bob's 2 in Big, so Small wins.
+    assert ("alice", 2, 3) in got
+    # Case-insensitive creator exclusion: "Owner" owns Big/Stale, not Small.
+    assert ("Owner", 2, 3) in got
+    assert not [g for g in got if g[0] == "admin" or (g[0] == "Owner" and g[1] != 2)]
+
+
+def test_set_based_reservations_run_on_sqlite(monkeypatch):
+    from backend.services import community_post_rollups, member_digest, message_outbox, owner_pulse
+
+    for mod in (community_post_rollups, member_digest, owner_pulse):
+        monkeypatch.setattr(mod, "USE_MYSQL", False)
+    monkeypatch.setattr(community_post_rollups, "_table_ready", False)
+    monkeypatch.setattr(member_digest, "_batch_columns_ready", False)
+    monkeypatch.setattr(owner_pulse, "_batch_column_ready", False)
+    monkeypatch.setenv("MEMBER_DIGEST_ENABLED", "true")
+    monkeypatch.setenv("OWNER_PULSE_ENABLED", "true")
+    queued = []
+    monkeypatch.setattr(
+        message_outbox, "enqueue_weekly_pushes",
+        lambda conn, c, event, wk, rows: queued.extend((event, r["community_id"]) for r in rows) or len(rows),
+    )
+    conn = sqlite3.connect(":memory:")
+    c = conn.cursor()
+    _sqlite_schema(c)
+    c.executescript(
+        """
+        CREATE TABLE community_visit_history (community_id INTEGER, username TEXT, visit_time TEXT);
+        CREATE TABLE replies (community_id INTEGER, username TEXT, timestamp TEXT);
+        CREATE TABLE groups (id INTEGER PRIMARY KEY, community_id INTEGER);
+        CREATE TABLE group_posts (id INTEGER PRIMARY KEY, group_id INTEGER, username TEXT, created_at TEXT);
+        CREATE TABLE group_replies (group_post_id INTEGER, username TEXT, created_at TEXT);
+        """
+    )
+    recent = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    c.executemany("INSERT INTO users (id, username) VALUES (?, ?)", [(1, "owner"), (2, "alice"), (3, "bob")])
+    c.execute("INSERT INTO communities (id, name, creator_username) VALUES (1, 'Gym', 'owner')")
+    c.executemany("INSERT INTO user_communities (user_id, community_id) VALUES (?, 1)", [(1,), (2,), (3,)])
+    c.executemany("INSERT INTO posts (community_id, username, timestamp) VALUES (1, 'bob', ?)", [(recent,)] * 3)
+    member_digest._ensure_dedup_table(c)
+    owner_pulse._ensure_dedup_table(c)
+    wk = owner_pulse.week_key()
+
+    for run in range(2):
+        digest = {"candidates": 0, "queued": 0}
+        member_digest._run_set_based(conn, c, "?", wk, digest, dry_run=False, max_sends=10)
+        pulse = {"candidates": 0, "queued": 0}
+        owner_pulse._run_set_based(conn, c, "?", wk, pulse, dry_run=False)
+        if run == 0:
+            assert (digest["queued"], pulse["queued"]) == (1, 1)  # bob's own posts don't count
+        else:
+            assert (digest["queued"], digest["skipped_dedup"]) == (0, 1)
+            assert (pulse["queued"], pulse["skipped_dedup"]) == (0, 1)
+    assert sorted(queued) == [("member_digest", 1), ("owner_pulse", 1)]
+    c.execute("SELECT username FROM member_digest_sends WHERE batch_id IS NOT NULL")
+    assert [r[0] for r in c.fetchall()] == ["alice"]
+
+
+def test_weekly_push_handler_dispatches_by_event(monkeypatch):
+    from backend.services import member_digest, message_outbox, owner_pulse
+
+    seen = []
+    monkeypatch.setattr(member_digest, "deliver_queued_digest", lambda p: seen.append(("digest", p["username"])))
+    monkeypatch.setattr(owner_pulse, "deliver_queued_pulse", lambda p: seen.append(("pulse", p["owner"])))
+    monkeypatch.setattr(message_outbox, "_take_leased_rows", lambda rows: rows)
+    rows = [
+        {"id": 1, "payload": {"event": "member_digest", "username": "m1"}},
+        {"id": 2, "payload": {"event": "owner_pulse", "owner": "o1"}},
+        {"id": 3, "payload": {"event": "nope"}},
+    ]
+    assert message_outbox._handle_weekly_push(rows) == {}
+    assert sorted(seen) == [("digest", "m1"), ("pulse", "o1")]
+
+
+@pytest.fixture
+def _set_based_env(monkeypatch):
+    monkeypatch.setenv("CRON_SHARED_SECRET", CRON_SECRET)
+    monkeypatch.setenv("MEMBER_DIGEST_ENABLED", "true")
+    monkeypatch.setenv("WEEKLY_DIGEST_SET_BASED", "true")
+    monkeypatch.setattr("backend.services.message_outbox.kick_outbox_dispatcher", lambda: None)
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        for table in ("member_digest_sends", "message_outbox", "retention_events"):
+            try:
+                c.execute(f"DELETE FROM {table}")
+            except Exception:
+                pass
+        conn.commit()
+    yield
+
+
+def _join(username: str, community_id: int) -> None:
+    ph = get_sql_placeholder()
+    with get_db_connection() as conn:
+        c = conn.cursor()
+        c.execute(f"SELECT id FROM users WHERE username = {ph}", (username,))
+        row = c.fetchone()
+        uid = row["id"] if hasattr(row, "keys") else row[0]
+        c.execute(
+            f"INSERT INTO user_communities (user_id, community_id, role) VALUES ({ph}, {ph}, 'member')",
+            (uid, community_id),
+        )
+        for _ in range(3 if username.startswith("sb_poster") else 0):
+            c.execute(
+                f"INSERT INTO posts (community_id, username, content) VALUES ({ph}, {ph}, 'hi')",
+                (community_id, username),
+            )
+        conn.commit()
+
+
+def test_set_based_digest_reserves_in_bulk_and_delivers_via_outbox(mysql_dsn, _set_based_env, monkeypatch):
+    import backend.services.notifications as notif
+    import bodybuilding_app
+    from backend.services.message_outbox import drain_outbox
+
+    sent = []
+    monkeypatch.setattr(notif, "send_push_to_user", lambda u, p: sent.append({"username": u, **p}))
+    for name in ("sb_owner", "sb_member1", "sb_member2", "sb_poster"):
+        make_user(name)
+    cid = make_community("Set Based", creator_username="sb_owner")
+    for name in ("sb_member1", "sb_member2", "sb_poster"):
+        _join(name, cid)
+
+    client = bodybuilding_app.app.test_client()
+    headers = {"X-Cron-Secret": CRON_SECRET}
+    body = client.post("/api/cron/member-weekly-digest?max_sends=1", headers=headers).get_json()
+    assert body["candidates"] == 2
+    assert body["queued"] == 1
+    assert body["skipped_cap"] == 1
+    assert sent == []  # nothing pushed inside the cron request
+
+    drain_outbox()
+    assert [s["username"] for s in sent] in (["sb_member1"], ["sb_member2"])
+    assert sent[0]["url"] == f"/community_feed_react/{cid}?source=weekly_digest_push"
+
+    body2 = client.post("/api/cron/member-weekly-digest", headers=headers).get_json()
+    assert body2["queued"] == 1
+    assert body2["skipped_dedup"] == 1
+    drain_outbox()
+    assert sorted(s["username"] for s in sent) == ["sb_member1", "sb_member2"]